@@ -13,6 +13,7 @@ import asyncio
 import hashlib
 import logging
 import os
+import time
 from datetime import datetime, timedelta
 
 from bot.automation.ssh_handler import SSHHandler
@@ -42,6 +43,22 @@ def get_file_size(file_path: str) -> int:
     return os.path.getsize(file_path)
 
 
+def _hash_or_none(file_path: str) -> str | None:
+    """calculate_file_hash for the thread pool: a vanished file is None."""
+    try:
+        return calculate_file_hash(file_path)
+    except OSError as e:
+        logger.warning(f"Could not calculate hash for {file_path}: {e}")
+        return None
+
+
+def _row_values(row, *keys) -> tuple:
+    """A fetched row as a tuple; dict rows (test doubles) are read by key."""
+    if isinstance(row, dict):
+        return tuple(row.get(key) for key in keys)
+    return tuple(row)
+
+
 def is_primary_stats_filename(filename: str) -> bool:
     """Return whether *filename* belongs to the primary stats pipeline.
 
@@ -104,43 +121,10 @@ class FileTracker:
             # This prevents importing very old files on bot restart while allowing
             # files from recent history (default: 7 days before startup)
             # SKIP this check if ignore_startup_time=True (manual sync commands)
-            if not ignore_startup_time:
-                try:
-                    # Parse datetime from filename: YYYY-MM-DD-HHMMSS-...
-                    datetime_str = filename[:17]  # Get YYYY-MM-DD-HHMMSS
-                    file_datetime = datetime.strptime(datetime_str, "%Y-%m-%d-%H%M%S")  # noqa: DTZ007 local-naive convention for CET-time filename and match_id parsing
-
-                    # Get lookback window (default: 7 days = 168 hours)
-                    lookback_hours = getattr(self.config, 'STARTUP_LOOKBACK_HOURS', 168)
-                    cutoff_time = self.bot_startup_time - timedelta(hours=lookback_hours)
-
-                    # Skip files older than the lookback window
-                    if file_datetime < cutoff_time:
-                        time_diff_hours = (cutoff_time - file_datetime).total_seconds() / 3600
-                        time_diff_days = time_diff_hours / 24
-                        logger.debug(
-                            f"⏭️ {filename} created {time_diff_days:.1f} days before lookback window "
-                            f"(cutoff: {lookback_hours}h before startup, skip very old files)"
-                        )
-                        self.processed_files.add(filename)
-                        await self.mark_processed(filename, success=True)
-                        return False
-                    else:
-                        # File is within lookback window or after bot startup
-                        if file_datetime < self.bot_startup_time:
-                            time_diff = (self.bot_startup_time - file_datetime).total_seconds() / 3600
-                            logger.debug(
-                                f"✅ {filename} within {lookback_hours}h lookback window "
-                                f"({time_diff:.1f}h before startup, will process)"
-                            )
-                        else:
-                            time_diff = (file_datetime - self.bot_startup_time).total_seconds() / 60
-                            logger.debug(
-                                f"✅ {filename} created {time_diff:.1f}m after bot startup (process as new file)"
-                            )
-                except ValueError:
-                    # If datetime parsing fails, continue with other checks
-                    logger.warning(f"⚠️ Could not parse datetime from filename: {filename}")
+            if not ignore_startup_time and self._is_before_lookback(filename):
+                self.processed_files.add(filename)
+                await self.mark_processed(filename, success=True)
+                return False
 
             # 2. Check in-memory cache (only if not checking DB only)
             if not check_db_only and filename in self.processed_files:
@@ -176,6 +160,48 @@ class FileTracker:
             logger.warning(f"DB error checking if should process {filename}: {e} — processing file anyway (import is idempotent)")
             return True  # Process on DB error — import uses ON CONFLICT so duplicates are safe
 
+    def _is_before_lookback(self, filename: str) -> bool:
+        """Whether *filename* was written before the startup lookback window.
+
+        Unparseable names are never "too old" — they fall through to the
+        database checks.
+        """
+        try:
+            # Parse datetime from filename: YYYY-MM-DD-HHMMSS-...
+            datetime_str = filename[:17]  # Get YYYY-MM-DD-HHMMSS
+            file_datetime = datetime.strptime(datetime_str, "%Y-%m-%d-%H%M%S")  # noqa: DTZ007 local-naive convention for CET-time filename and match_id parsing
+        except ValueError:
+            logger.warning(f"⚠️ Could not parse datetime from filename: {filename}")
+            return False
+
+        # Get lookback window (default: 7 days = 168 hours)
+        lookback_hours = getattr(self.config, 'STARTUP_LOOKBACK_HOURS', 168)
+        cutoff_time = self.bot_startup_time - timedelta(hours=lookback_hours)
+
+        # Skip files older than the lookback window
+        if file_datetime < cutoff_time:
+            time_diff_hours = (cutoff_time - file_datetime).total_seconds() / 3600
+            time_diff_days = time_diff_hours / 24
+            logger.debug(
+                f"⏭️ {filename} created {time_diff_days:.1f} days before lookback window "
+                f"(cutoff: {lookback_hours}h before startup, skip very old files)"
+            )
+            return True
+
+        # File is within lookback window or after bot startup
+        if file_datetime < self.bot_startup_time:
+            time_diff = (self.bot_startup_time - file_datetime).total_seconds() / 3600
+            logger.debug(
+                f"✅ {filename} within {lookback_hours}h lookback window "
+                f"({time_diff:.1f}h before startup, will process)"
+            )
+        else:
+            time_diff = (file_datetime - self.bot_startup_time).total_seconds() / 60
+            logger.debug(
+                f"✅ {filename} created {time_diff:.1f}m after bot startup (process as new file)"
+            )
+        return False
+
     async def _is_in_processed_files_table(self, filename: str) -> bool:
         """Check if filename exists in processed_files table (success OR failed)"""
         try:
@@ -231,6 +257,165 @@ class FileTracker:
             logger.warning(f"⚠️ DB error checking session in DB (assuming not exists): {e}")
             return False
 
+    async def filter_new_files(
+        self, filenames: list[str], ignore_startup_time: bool = False,
+        check_db_only: bool = False,
+    ) -> list[str]:
+        """
+        should_process_file for a whole listing, in two queries
+
+        Same layers and the same answers as calling should_process_file per
+        filename, but processed_files and rounds are each read once for the
+        batch, and the files found to be done already are recorded with one
+        bulk upsert. Used when a poll or !sync returns the full remote
+        listing, which after an outage is thousands of files.
+
+        Args:
+            filenames: Candidate filenames, in the order they should be returned
+            ignore_startup_time: As for should_process_file
+            check_db_only: As for should_process_file
+
+        Returns:
+            The filenames that should be processed, in input order
+        """
+        async with self._process_lock:
+            candidates = []
+            done = []
+            for filename in dict.fromkeys(filenames):
+                if not ignore_startup_time and self._is_before_lookback(filename):
+                    self.processed_files.add(filename)
+                    done.append(filename)
+                elif check_db_only or filename not in self.processed_files:
+                    candidates.append(filename)
+
+            try:
+                untracked = []
+                if candidates:
+                    tracked = await self._tracked_filenames(candidates)
+                    self.processed_files.update(tracked)
+                    untracked = [f for f in candidates if f not in tracked]
+                if untracked:
+                    imported = await self._session_files_in_db(untracked)
+                    self.processed_files.update(imported)
+                    done.extend(imported)
+                    untracked = [f for f in untracked if f not in imported]
+            except Exception as e:
+                logger.warning(
+                    f"DB error filtering {len(candidates)} files: {e} — "
+                    "processing them anyway (import is idempotent)"
+                )
+                return candidates
+
+            await self._mark_processed_many([(f, None, None, None) for f in done])
+            return untracked
+
+    async def _tracked_filenames(self, filenames: list[str]) -> set[str]:
+        """The subset of *filenames* with a processed_files row (success OR failed)"""
+        try:
+            rows = await self.db_adapter.fetch_all(
+                "SELECT filename FROM processed_files WHERE filename = ANY(?::text[])",
+                (filenames,),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ DB error checking processed_files table (assuming unprocessed): {e}")
+            return set()
+        return {_row_values(row, "filename")[0] for row in rows or []}
+
+    async def _session_files_in_db(self, filenames: list[str]) -> set[str]:
+        """
+        The subset of *filenames* whose round is already in the rounds table
+
+        One query over the files' dates, matched in Python on the same
+        (date, map, round number, HHMMSS) key _session_exists_in_db uses.
+        """
+        keys = {}
+        for filename in filenames:
+            info = SSHHandler.parse_gamestats_filename(filename)
+            if info:
+                keys[filename] = (
+                    info["date"], info["map_name"], info["round_number"], info["time"]
+                )
+        if not keys:
+            return set()
+
+        try:
+            rows = await self.db_adapter.fetch_all(
+                """
+                SELECT round_date, map_name, round_number,
+                       REPLACE(CAST(round_time AS TEXT), ':', '') AS round_time
+                FROM rounds
+                WHERE round_date = ANY(?::text[])
+                """,
+                (sorted({key[0] for key in keys.values()}),),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ DB error checking session in DB (assuming not exists): {e}")
+            return set()
+
+        sessions = {
+            _row_values(row, "round_date", "map_name", "round_number", "round_time")
+            for row in rows or []
+        }
+        return {filename for filename, key in keys.items() if key in sessions}
+
+    async def _mark_processed_many(self, rows: list[tuple]) -> None:
+        """
+        mark_processed(success=True) for many files, in one batch
+
+        Args:
+            rows: (filename, file_hash, file_size, file_mtime) per file; a
+                  None hash or stat leaves an already stored value in place
+        """
+        if not rows:
+            return
+        now = datetime.now()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
+        try:
+            await self.db_adapter.executemany(
+                """
+                INSERT INTO processed_files
+                (filename, file_hash, success, error_message, processed_at,
+                 file_size, file_mtime)
+                VALUES ($1, $2, TRUE, NULL, $3, $4, $5)
+                ON CONFLICT (filename) DO UPDATE SET
+                    file_hash = COALESCE(EXCLUDED.file_hash, processed_files.file_hash),
+                    success = EXCLUDED.success,
+                    error_message = EXCLUDED.error_message,
+                    processed_at = EXCLUDED.processed_at,
+                    file_size = COALESCE(EXCLUDED.file_size, processed_files.file_size),
+                    file_mtime = COALESCE(EXCLUDED.file_mtime, processed_files.file_mtime)
+                """,
+                [(name, file_hash, now, size, mtime)
+                 for name, file_hash, size, mtime in rows],
+            )
+        except Exception as e:
+            logger.error(f"Error marking {len(rows)} files as processed: {e}")
+
+    async def _store_file_stats(self, rows: list[tuple]) -> None:
+        """
+        Record the stat (and, for legacy rows, the hash) of tracked files
+
+        Leaves success, error_message and processed_at alone, and never
+        replaces a stored hash: a mismatch stays visible to the next check.
+
+        Args:
+            rows: (filename, file_hash, file_size, file_mtime) per file
+        """
+        if not rows:
+            return
+        try:
+            await self.db_adapter.executemany(
+                """
+                UPDATE processed_files SET
+                    file_hash = COALESCE(file_hash, $2),
+                    file_size = $3,
+                    file_mtime = $4
+                WHERE filename = $1
+                """,
+                rows,
+            )
+        except Exception as e:
+            logger.error(f"Error storing file stats for {len(rows)} files: {e}")
+
     async def mark_processed(
         self, filename: str, success: bool = True, error_msg: str | None = None,
         file_path: str | None = None
@@ -246,22 +431,27 @@ class FileTracker:
         """
         try:
             # Calculate file hash if path provided
-            file_hash = None
+            file_hash = file_size = file_mtime = None
             if file_path and os.path.exists(file_path):
                 try:
+                    stat = os.stat(file_path)
                     file_hash = calculate_file_hash(file_path)
+                    file_size, file_mtime = stat.st_size, stat.st_mtime
                 except Exception as e:
                     logger.warning(f"Could not calculate hash for {filename}: {e}")
 
             query = """
                 INSERT INTO processed_files
-                (filename, file_hash, success, error_message, processed_at)
-                VALUES ($1, $2, $3, $4, $5)
+                (filename, file_hash, success, error_message, processed_at,
+                 file_size, file_mtime)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
                 ON CONFLICT (filename) DO UPDATE SET
                     file_hash = COALESCE(EXCLUDED.file_hash, processed_files.file_hash),
                     success = EXCLUDED.success,
                     error_message = EXCLUDED.error_message,
-                    processed_at = EXCLUDED.processed_at
+                    processed_at = EXCLUDED.processed_at,
+                    file_size = COALESCE(EXCLUDED.file_size, processed_files.file_size),
+                    file_mtime = COALESCE(EXCLUDED.file_mtime, processed_files.file_mtime)
             """
             await self.db_adapter.execute(
                 query,
@@ -271,6 +461,8 @@ class FileTracker:
                     success,
                     error_msg,
                     datetime.now(),  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
+                    file_size,
+                    file_mtime,
                 ),
             )
 
@@ -329,6 +521,14 @@ class FileTracker:
         This scans local_stats/ and alerts if there are files that haven't been
         imported to the database yet. Does NOT mark them as processed - just reports.
 
+        In the same pass it reconciles the files that are tracked or imported:
+        - a tracked file whose (size, mtime) matches processed_files is trusted
+          without reading it; any other is rehashed (in worker threads) and
+          compared to the stored hash
+        - a file whose round is already in the database but has no
+          processed_files row is recorded, hash and stat included, in one
+          bulk upsert
+
         Files should be imported via:
         - SSH monitor automatic download + import
         - Manual !import command
@@ -339,10 +539,20 @@ class FileTracker:
             if not os.path.exists(local_dir):
                 return
 
-            text_files = [f for f in os.listdir(local_dir) if f.endswith(".txt")]
-            files = [f for f in text_files if is_primary_stats_filename(f)]
+            started = time.perf_counter()
+            local = {}  # filename -> (path, size, mtime)
+            ignored_count = 0
+            with os.scandir(local_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".txt") or not entry.is_file():
+                        continue
+                    if not is_primary_stats_filename(entry.name):
+                        ignored_count += 1
+                        continue
+                    stat = entry.stat()
+                    local[entry.name] = (entry.path, stat.st_size, stat.st_mtime)
+            files = sorted(local)
 
-            ignored_count = len(text_files) - len(files)
             if ignored_count:
                 logger.debug(
                     "Ignoring %d non-primary sidecar/unsupported files in %s",
@@ -356,15 +566,57 @@ class FileTracker:
             # One bounded lookup avoids thousands of sequential round-trips at
             # startup while keeping the comparison scoped to local primary files.
             existing_rows = await self.db_adapter.fetch_all(
-                "SELECT filename FROM processed_files "
+                "SELECT filename, file_hash, file_size, file_mtime FROM processed_files "
                 "WHERE filename = ANY(?::text[])",
                 (files,),
             )
-            tracked = {
-                row[0] if isinstance(row, (list, tuple)) else row["filename"]
-                for row in existing_rows
-            }
-            unimported = [filename for filename in files if filename not in tracked]
+            stored = {}  # filename -> (file_hash, file_size, file_mtime)
+            for row in existing_rows or []:
+                filename, file_hash, size, mtime = _row_values(
+                    row, "filename", "file_hash", "file_size", "file_mtime"
+                )
+                stored[filename] = (file_hash, size, mtime)
+
+            untracked = [filename for filename in files if filename not in stored]
+            imported = await self._session_files_in_db(untracked) if untracked else set()
+            unimported = [filename for filename in untracked if filename not in imported]
+
+            # Rehash only what the stat cannot vouch for.
+            to_hash = [
+                filename for filename in files
+                if filename in imported
+                or (filename in stored and stored[filename][1:] != local[filename][1:])
+            ]
+            hashes = await asyncio.gather(*(
+                asyncio.to_thread(_hash_or_none, local[filename][0]) for filename in to_hash
+            ))
+
+            refreshed, newly_tracked, mismatched = [], [], []
+            for filename, file_hash in zip(to_hash, hashes):
+                if file_hash is None:
+                    continue
+                row = (filename, file_hash, *local[filename][1:])
+                if filename in imported:
+                    newly_tracked.append(row)
+                elif stored[filename][0] and stored[filename][0] != file_hash:
+                    mismatched.append(filename)
+                else:
+                    refreshed.append(row)
+
+            await self._store_file_stats(refreshed)
+            await self._mark_processed_many(newly_tracked)
+            self.processed_files.update(imported)
+
+            logger.info(
+                f"🔍 Reconciled {len(files)} local stats files in "
+                f"{(time.perf_counter() - started) * 1000:.0f}ms "
+                f"({len(to_hash)} rehashed, {len(newly_tracked)} newly tracked)"
+            )
+            if mismatched:
+                logger.warning(
+                    f"FILE INTEGRITY MISMATCH for {len(mismatched)} local stats files! "
+                    f"Stored hash differs from the file, e.g. {', '.join(mismatched[:3])}"
+                )
 
             # Report findings
             if unimported:
@@ -489,6 +489,22 @@ class AutomationCommands(commands.Cog):
             else:
                 embed.add_field(name="🔧 DB Maintenance", value="❌ **Not initialized**", inline=True)
 
+            # File discovery: who found each file first, and how late
+            if hasattr(self.bot, 'file_discovery'):
+                sources = self.bot.file_discovery.get_status()['sources']
+                lines = []
+                for name, src in sources.items():
+                    latency = src['latency']
+                    median = f"{latency['median_s']:.0f}s" if latency else "-"
+                    lines.append(f"`{name}` first `{src['first']}` · median `{median}`")
+                    if src['reconnects']:
+                        lines[-1] += f" · recovered `{src['recovered']}`"
+                embed.add_field(
+                    name="📡 File Discovery",
+                    value="\n".join(lines) or "No files discovered yet",
+                    inline=False,
+                )
+
             # Bot info
             monitoring_status = "✅ **Enabled**" if getattr(self.bot, 'monitoring', False) else "❌ **Disabled**"
             automation_status = "✅ **Enabled**" if getattr(self.bot, 'automation_enabled', False) else "❌ **Disabled**"
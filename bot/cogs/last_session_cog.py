@@ -28,7 +28,7 @@ from bot.services.session_embed_builder import SessionEmbedBuilder
 from bot.services.session_graph_generator import SessionGraphGenerator
 from bot.services.session_stats_aggregator import SessionStatsAggregator
 from bot.services.session_timing_shadow_service import SessionTimingShadowService
-from bot.services.session_view_handlers import SessionViewHandlers
+from bot.services.session_view_handlers import VIEW_CACHE_TTL, SessionViewHandlers
 from bot.services.stopwatch_scoring_service import StopwatchScoringService
 from bot.stats import StatsCalculator
 
@@ -725,7 +725,7 @@ class LastSessionCog(commands.Cog):
             WHERE round_id IN ({placeholders})
             ORDER BY round_id, id
         """
-        awards_rows = await self.bot.db_adapter.fetch_all(awards_query, tuple(session_ids))
+        awards_rows = await self.bot.db_adapter.fetch_all(awards_query, tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         awards_by_round: dict[int, list[dict[str, Any]]] = {}
         for round_id, award_name, player_name, award_value, award_numeric in awards_rows:
@@ -28,6 +28,14 @@ from bot.stats import StatsCalculator
 
 logger = logging.getLogger(__name__)
 
+# Leaderboard pages are flipped back and forth; cached reads are dropped on
+# every round import anyway (see DatabaseAdapter.bump_data_version).
+LEADERBOARD_CACHE_TTL = 60
+# Pages fetched per query: one aggregation serves this many page flips. The
+# sort keys are aggregates, so a keyset cursor would not skip the GROUP BY
+# work; fetching a window of rows does.
+LEADERBOARD_WINDOW_PAGES = 5
+
 
 class LeaderboardCog(commands.Cog, name="Leaderboard"):
     """Player statistics and rankings system"""
@@ -435,7 +443,7 @@ class LeaderboardCog(commands.Cog, name="Leaderboard"):
                 SELECT COUNT(DISTINCT player_guid)
                 FROM player_comprehensive_stats
             """
-            total_count = await self.bot.db_adapter.fetch_one(count_query)
+            total_count = await self.bot.db_adapter.fetch_one(count_query, cache_ttl=LEADERBOARD_CACHE_TTL)
             if not total_count:
                 await ctx.send("❌ No player data found")
                 return
@@ -443,6 +451,10 @@ class LeaderboardCog(commands.Cog, name="Leaderboard"):
             total_players = total_count[0]
             total_pages = max(1, (total_players + 9) // 10)  # 10 per page
 
+            # Rows per window of LEADERBOARD_WINDOW_PAGES pages, shared by
+            # every page of this view
+            window_rows: dict[int, list] = {}
+
             # Create page fetcher - reuses existing leaderboard logic
             async def get_page(page_num: int) -> discord.Embed | None:
                 """Fetch a single leaderboard page
@@ -734,17 +746,23 @@ class LeaderboardCog(commands.Cog, name="Leaderboard"):
                 if not query:
                     return None
 
-                # Format query with pagination values
-                query = query.format(
-                    players_per_page=players_per_page,
-                    offset=offset
-                )
-
-                try:
-                    results = await self.bot.db_adapter.fetch_all(query)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch leaderboard page {page_num}: {e}")
-                    return None
+                # One query per window of pages; later pages slice it
+                window_size = players_per_page * LEADERBOARD_WINDOW_PAGES
+                window = offset // window_size
+                if window not in window_rows:
+                    query = query.format(
+                        players_per_page=window_size,
+                        offset=window * window_size
+                    )
+                    try:
+                        window_rows[window] = await self.bot.db_adapter.fetch_all(
+                            query, cache_ttl=LEADERBOARD_CACHE_TTL
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch leaderboard page {page_num}: {e}")
+                        return None
+                start = offset - window * window_size
+                results = window_rows[window][start:start + players_per_page]
 
                 if not results:
                     return None
@@ -902,10 +920,11 @@ class LeaderboardCog(commands.Cog, name="Leaderboard"):
             )
 
             # Get and send first page (0-indexed for LazyPaginationView)
-            first_page = await get_page(0)
+            first_page = await view.get_page(0)
             if first_page:
                 message = await ctx.send(embed=first_page, view=view)
                 view.message = message
+                view.schedule_prefetch()
             else:
                 await ctx.send(
                     f"❌ No data found for leaderboard type: {stat_type}"
@@ -15,6 +15,9 @@ from pathlib import Path
 
 from discord.ext import tasks
 
+from website.backend.services.proximity_features import refresh_round_features
+from website.backend.services.reinforcement_clock_batch import refresh_round_clocks
+
 try:
     from proximity.parser import ProximityParserV4
     _PARSER_AVAILABLE = True
@@ -115,6 +118,32 @@ class _ProximityIngestionMixin:
         except Exception as e:
             logger.warning(f"Correlation notify failed (non-fatal): {e}")
 
+    async def _refresh_round_clock(self, round_id: int | None) -> None:
+        """Store the imported round's reinforcement clock (migration 083).
+
+        The website would compute it on first read anyway; doing it here keeps
+        that read a single-row lookup. Non-fatal: a miss is recomputed there.
+        """
+        if round_id is None:
+            return
+        try:
+            await refresh_round_clocks(self.bot.db_adapter, [int(round_id)])
+        except Exception as e:
+            logger.warning(f"Reinforcement clock refresh failed (non-fatal): {e}")
+
+    async def _refresh_round_features(self, round_id: int | None) -> None:
+        """Store the imported round's proximity feature rows (migration 085).
+
+        Runs after _refresh_round_clock, whose stored clock the clutch
+        features read. Non-fatal: the website recomputes a miss on read.
+        """
+        if round_id is None:
+            return
+        try:
+            await refresh_round_features(self.bot.db_adapter, [int(round_id)])
+        except Exception as e:
+            logger.warning(f"Proximity feature refresh failed (non-fatal): {e}")
+
     def _load_objective_coords(self) -> dict:
         template_path = Path("proximity/objective_coords_template.json")
         if not template_path.exists():
@@ -354,6 +383,8 @@ class _ProximityIngestionMixin:
                 await self._notify_correlation(filepath.name)
 
                 stats = parser.get_stats()
+                await self._refresh_round_clock(stats.get('round_id'))
+                await self._refresh_round_features(stats.get('round_id'))
                 if self.debug_log:
                     logger.info(
                         f"✅ Imported {filepath.name}: "
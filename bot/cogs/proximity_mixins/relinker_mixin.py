@@ -129,6 +129,19 @@ _DETECTION_EXEMPT_TABLES: dict[str, str] = {
         "file-ingestion bookkeeping; round_id is best-effort provenance and "
         "the row carries no map/round identity columns to relink by"
     ),
+    "round_reinforcement_clocks": (
+        "derived per-round cache (migration 083), keyed BY round_id and only "
+        "ever written for an already-linked round; never NULL, nothing to "
+        "relink"
+    ),
+    "proximity_round_features": (
+        "derived per-round cache (migration 085), keyed BY round_id; a relink "
+        "changes the round's source row count, which reads as a miss"
+    ),
+    "proximity_player_round_features": (
+        "derived per-(round, player) rows of proximity_round_features, "
+        "replaced with it"
+    ),
 }
 
 
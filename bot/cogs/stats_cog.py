@@ -95,6 +95,14 @@ class StatsCog(
                 value=f"{cache_info['ttl_seconds']}s",
                 inline=True,
             )
+            result_cache = getattr(self.bot.db_adapter, "query_cache", None)
+            if result_cache is not None:
+                rc = result_cache.stats()
+                embed.add_field(
+                    name="Result Cache",
+                    value=f"{rc['entries']} entries · {rc['hit_rate_pct']}% hits",
+                    inline=True,
+                )
 
             await ctx.send(embed=embed)
 
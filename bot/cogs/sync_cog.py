@@ -167,12 +167,9 @@ class SyncCog(commands.Cog, name="Sync Commands"):
             # Use ignore_startup_time=True to allow historical files
             # Use check_db_only=True to check ONLY database, not local files
             # This allows re-importing local files that were wiped from DB
-            files_to_process = [
-                filename for filename in remote_files
-                if await self.bot.file_tracker.should_process_file(
-                    filename, ignore_startup_time=True, check_db_only=True
-                )
-            ]
+            files_to_process = await self.bot.file_tracker.filter_new_files(
+                remote_files, ignore_startup_time=True, check_db_only=True
+            )
 
             if not files_to_process:
                 await status_msg.edit(
@@ -107,6 +107,131 @@ C0RNP0RN3_WEAPONS = {
     27: "WS_SYRINGE",
 }
 
+# (name, mask bit) per weapon id in file order, for the per-line weapon loop.
+_WEAPON_SLOTS = tuple(
+    (C0RNP0RN3_WEAPONS.get(weapon_id, f"UNKNOWN_{weapon_id}"), 1 << weapon_id)
+    for weapon_id in range(28)
+)
+
+# =============================================================================
+# EXTENDED FIELD SCHEMA
+# The TAB-separated section after the weapon block, in file order: TAB[i] is
+# EXTENDED_FIELDS[i]. A missing or malformed field reads as its type's zero
+# (0 / 0.0), never as an error. TAB[0..8] double as the player's top-level
+# "additional" stats.
+# =============================================================================
+EXTENDED_FIELDS: tuple[tuple[str, type], ...] = (
+    ('damage_given', int),            # TAB[0]
+    ('damage_received', int),         # TAB[1]
+    ('team_damage_given', int),       # TAB[2]
+    ('team_damage_received', int),    # TAB[3]
+    ('gibs', int),                    # TAB[4]
+    ('self_kills', int),              # TAB[5]
+    ('team_kills', int),              # TAB[6]
+    ('team_gibs', int),               # TAB[7]
+    ('time_played_percent', float),   # TAB[8]
+    ('xp', int),                      # TAB[9]
+    ('killing_spree', int),           # TAB[10]
+    ('death_spree', int),             # TAB[11]
+    ('kill_assists', int),            # TAB[12]
+    ('kill_steals', int),             # TAB[13]
+    ('headshot_kills', int),          # TAB[14]
+    ('objectives_stolen', int),       # TAB[15]
+    ('objectives_returned', int),     # TAB[16]
+    ('dynamites_planted', int),       # TAB[17]
+    ('dynamites_defused', int),       # TAB[18]
+    ('times_revived', int),           # TAB[19]
+    ('bullets_fired', int),           # TAB[20]
+    ('dpm', float),                   # TAB[21]
+    ('time_played_minutes', float),   # TAB[22]
+    ('tank_meatshield', float),       # TAB[23]
+    ('time_dead_ratio', float),       # TAB[24]
+    ('time_dead_minutes', float),     # TAB[25]
+    ('kd_ratio', float),              # TAB[26]
+    ('useful_kills', int),            # TAB[27]
+    ('denied_playtime', int),         # TAB[28]
+    ('multikill_2x', int),            # TAB[29]
+    ('multikill_3x', int),            # TAB[30]
+    ('multikill_4x', int),            # TAB[31]
+    ('multikill_5x', int),            # TAB[32]
+    ('multikill_6x', int),            # TAB[33]
+    ('useless_kills', int),           # TAB[34]
+    ('full_selfkills', int),          # TAB[35]
+    ('repairs_constructions', int),   # TAB[36]
+    ('revives_given', int),           # TAB[37]
+)
+ADDITIONAL_FIELD_COUNT = 9
+_EXTENDED_NAMES = tuple(name for name, _ in EXTENDED_FIELDS)
+_EXTENDED_CASTS = tuple(cast for _, cast in EXTENDED_FIELDS)
+_EXTENDED_ZEROS = tuple(cast() for cast in _EXTENDED_CASTS)
+_TAB = {name: index for index, name in enumerate(_EXTENDED_NAMES)}
+
+
+def convert_extended_fields(tab_fields: list[str]) -> list:
+    """Typed values for EXTENDED_FIELDS from one line's TAB fields, in one pass.
+
+    Well-formed lines take a single comprehension; only a line with a bad
+    field pays for the per-field fallback.
+    """
+    try:
+        values = [cast(raw) for cast, raw in zip(_EXTENDED_CASTS, tab_fields)]
+    except (ValueError, TypeError):
+        values = []
+        for cast, raw in zip(_EXTENDED_CASTS, tab_fields):
+            try:
+                values.append(cast(raw))
+            except (ValueError, TypeError):
+                values.append(cast())
+    if len(values) < len(_EXTENDED_CASTS):
+        values.extend(_EXTENDED_ZEROS[len(values):])
+    return values
+
+
+# R2 differential plan. Cumulative counters drop only when a player's Lua
+# counters restarted (reconnect); any drop sends the player to the R2-raw
+# fallback. (label, whether the field lives in objective_stats, field).
+_RESET_CHECKS: tuple[tuple[str, bool, str], ...] = (
+    ("kills", False, 'kills'),
+    ("deaths", False, 'deaths'),
+    ("damage_given", False, 'damage_given'),
+    ("damage_received", False, 'damage_received'),
+    ("objective.time_played_minutes", True, 'time_played_minutes'),
+    ("objective.damage_given", True, 'damage_given'),
+    ("objective.damage_received", True, 'damage_received'),
+)
+_DIFF_COUNTERS = ('kills', 'deaths', 'headshots', 'damage_given', 'damage_received')
+_WEAPON_COUNTERS = ('hits', 'shots', 'kills', 'deaths', 'headshots')
+_NO_WEAPON = dict.fromkeys(_WEAPON_COUNTERS, 0)
+
+
+def _round_1_candidates(
+    search_dir: str, names: list[str], day: str, map_name: str
+) -> list[str]:
+    """The paths glob("<day>-*-<map>-round-1.txt") would return from ``names``.
+
+    Plain prefix/suffix tests instead of a compiled pattern per call, and a
+    map name is matched literally (glob would read ``[`` as a character class).
+    """
+    prefix, suffix = f"{day}-", f"-{map_name}-round-1.txt"
+    shortest = len(prefix) + len(suffix)
+    return [
+        os.path.join(search_dir, name)
+        for name in names
+        if len(name) >= shortest and name.startswith(prefix) and name.endswith(suffix)
+    ]
+
+
+def _copy_nested(value):
+    """deepcopy for parsed stats (dicts, lists, scalars), without its memo cost."""
+    if isinstance(value, dict):
+        return {
+            k: _copy_nested(v) if isinstance(v, (dict, list)) else v
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_copy_nested(v) if isinstance(v, (dict, list)) else v for v in value]
+    return value
+
 
 def is_bot_dominated_round(bot_player_count: int, human_player_count: int) -> bool:
     """A round is a "bot round" when bots are the only players OR the strict
@@ -466,7 +591,6 @@ class C0RNP0RN3StatsParser:
         2. Try same-day match (within configurable window before) - for most cases
         3. Try previous-day match (midnight-crossing) - for sessions crossing midnight
         """
-        import glob
         from datetime import datetime, timedelta
 
         filename = os.path.basename(round_2_file_path)
@@ -502,13 +626,21 @@ class C0RNP0RN3StatsParser:
         same_day_pattern = f"{date}-*-{map_name}-round-1.txt"
         logger.debug(f"  → Looking for same-day match: {same_day_pattern}")
 
+        # Each directory is listed once for both dates below; on a full
+        # local_stats corpus the listing, not the parse, is what an R2 costs.
+        listings = {}
         for search_dir in search_dirs:
             if os.path.exists(search_dir):
-                pattern_path = os.path.join(search_dir, same_day_pattern)
-                found = glob.glob(pattern_path)
-                if found:
-                    logger.debug(f"  → Found {len(found)} same-day Round 1 file(s)")
-                potential_files.extend(found)
+                try:
+                    listings[search_dir] = os.listdir(search_dir)
+                except OSError:
+                    continue
+
+        for search_dir, names in listings.items():
+            found = _round_1_candidates(search_dir, names, date, map_name)
+            if found:
+                logger.debug(f"  → Found {len(found)} same-day Round 1 file(s)")
+            potential_files.extend(found)
 
         # STEP 3: ALWAYS also check the previous date (midnight-crossing). This
         # used to be gated on `not potential_files`, but on a re-import/backfill
@@ -525,13 +657,11 @@ class C0RNP0RN3StatsParser:
 
             logger.debug(f"  → Also checking previous date (midnight-crossing): {prev_pattern}")
 
-            for search_dir in search_dirs:
-                if os.path.exists(search_dir):
-                    pattern_path = os.path.join(search_dir, prev_pattern)
-                    found = glob.glob(pattern_path)
-                    if found:
-                        logger.debug(f"  → Found {len(found)} previous-day file(s) (midnight-crossing)")
-                    potential_files.extend(found)
+            for search_dir, names in listings.items():
+                found = _round_1_candidates(search_dir, names, prev_date, map_name)
+                if found:
+                    logger.debug(f"  → Found {len(found)} previous-day file(s) (midnight-crossing)")
+                potential_files.extend(found)
         except ValueError:  # nosec B110
             pass  # Invalid date format, skip this file
 
@@ -625,11 +755,10 @@ class C0RNP0RN3StatsParser:
         # FIX: R2_ONLY_FIELDS (xp, headshot_kills, kill_assists, etc.) reset between
         # rounds in ET:Legacy Lua, so R2 raw only contains R2's per-round value.
         # The match summary must add R1 + R2 for these fields to get the true match total.
-        import copy
         r1_players_by_guid = {p['guid']: p for p in round_1_result.get('players', [])}
         fixed_players = []
         for ms_player in match_summary.get('players', []):
-            player_copy = copy.deepcopy(ms_player)
+            player_copy = _copy_nested(ms_player)
             r1_player = r1_players_by_guid.get(player_copy.get('guid'))
             if r1_player:
                 r1_obj = r1_player.get('objective_stats', {})
@@ -670,34 +799,13 @@ class C0RNP0RN3StatsParser:
         In cumulative mode, R2 values should never be lower than R1 for the same player.
         If they drop, assume this player reset/reconnected and use safe R2-raw fallback.
         """
-        dropped_fields: list[str] = []
-
         r1_obj = r1_player.get('objective_stats', {}) or {}
         r2_obj = r2_player.get('objective_stats', {}) or {}
 
-        checks = [
-            ("kills", r1_player.get('kills', 0), r2_player.get('kills', 0)),
-            ("deaths", r1_player.get('deaths', 0), r2_player.get('deaths', 0)),
-            ("damage_given", r1_player.get('damage_given', 0), r2_player.get('damage_given', 0)),
-            ("damage_received", r1_player.get('damage_received', 0), r2_player.get('damage_received', 0)),
-            (
-                "objective.time_played_minutes",
-                r1_obj.get('time_played_minutes', 0),
-                r2_obj.get('time_played_minutes', 0),
-            ),
-            (
-                "objective.damage_given",
-                r1_obj.get('damage_given', 0),
-                r2_obj.get('damage_given', 0),
-            ),
-            (
-                "objective.damage_received",
-                r1_obj.get('damage_received', 0),
-                r2_obj.get('damage_received', 0),
-            ),
-        ]
-
-        for field_name, r1_value, r2_value in checks:
+        dropped_fields: list[str] = []
+        for field_name, in_objective, key in _RESET_CHECKS:
+            r1_value = (r1_obj if in_objective else r1_player).get(key, 0)
+            r2_value = (r2_obj if in_objective else r2_player).get(key, 0)
             try:
                 if float(r2_value) < float(r1_value):
                     dropped_fields.append(field_name)
@@ -772,34 +880,18 @@ class C0RNP0RN3StatsParser:
                 )
 
             # Calculate differential for this player
-            kills = max(0, r2_player['kills']) if use_r2_raw else max(0, r2_player['kills'] - r1_player['kills'])
-            deaths = max(0, r2_player['deaths']) if use_r2_raw else max(0, r2_player['deaths'] - r1_player['deaths'])
-            headshots = (
-                max(0, r2_player.get('headshots', 0))
-                if use_r2_raw
-                else max(0, r2_player.get('headshots', 0) - r1_player.get('headshots', 0))
-            )
-            damage_given = (
-                max(0, r2_player.get('damage_given', 0))
-                if use_r2_raw
-                else max(0, r2_player.get('damage_given', 0) - r1_player.get('damage_given', 0))
-            )
-            damage_received = (
-                max(0, r2_player.get('damage_received', 0))
-                if use_r2_raw
-                else max(0, r2_player.get('damage_received', 0) - r1_player.get('damage_received', 0))
-            )
+            counters = {
+                key: max(0, r2_player.get(key, 0)) if use_r2_raw
+                else max(0, r2_player.get(key, 0) - r1_player.get(key, 0))
+                for key in _DIFF_COUNTERS
+            }
 
             differential_player = {
                 # FIX: Include GUID for database operations
                 'guid': r2_player.get('guid', 'UNKNOWN'),
                 'name': player_name,
                 'team': r2_player['team'],
-                'kills': kills,
-                'deaths': deaths,
-                'headshots': headshots,
-                'damage_given': damage_given,
-                'damage_received': damage_received,
+                **counters,
                 'weapon_stats': {},
                 'objective_stats': {},  # Will populate below
                 'r2_counter_reset_fallback': use_r2_raw,
@@ -897,26 +989,16 @@ class C0RNP0RN3StatsParser:
             differential_player['time_display'] = f"{minutes}:{seconds:02d}"
 
             # Calculate differential weapon stats
+            r1_weapons = r1_player.get('weapon_stats', {})
             for weapon_name, r2_weapon in r2_player.get('weapon_stats', {}).items():
-                r1_weapon = r1_player.get('weapon_stats', {}).get(
-                    weapon_name, {'hits': 0, 'shots': 0, 'kills': 0, 'deaths': 0, 'headshots': 0}
-                )
-
                 if use_r2_raw:
                     differential_weapon = {
-                        'hits': max(0, r2_weapon.get('hits', 0)),
-                        'shots': max(0, r2_weapon.get('shots', 0)),
-                        'kills': max(0, r2_weapon.get('kills', 0)),
-                        'deaths': max(0, r2_weapon.get('deaths', 0)),
-                        'headshots': max(0, r2_weapon.get('headshots', 0)),
+                        key: max(0, r2_weapon.get(key, 0)) for key in _WEAPON_COUNTERS
                     }
                 else:
+                    r1_weapon = r1_weapons.get(weapon_name, _NO_WEAPON)
                     differential_weapon = {
-                        'hits': max(0, r2_weapon['hits'] - r1_weapon['hits']),
-                        'shots': max(0, r2_weapon['shots'] - r1_weapon['shots']),
-                        'kills': max(0, r2_weapon['kills'] - r1_weapon['kills']),
-                        'deaths': max(0, r2_weapon['deaths'] - r1_weapon['deaths']),
-                        'headshots': max(0, r2_weapon['headshots'] - r1_weapon['headshots']),
+                        key: max(0, r2_weapon[key] - r1_weapon[key]) for key in _WEAPON_COUNTERS
                     }
 
                 # Calculate accuracy for differential stats
@@ -972,20 +1054,21 @@ class C0RNP0RN3StatsParser:
             diff_dead_minutes = differential_player['objective_stats'].get('time_dead_minutes', 0)
 
             # [TIME DEBUG] Log Round 2 differential values + raw cumulative for validation
-            diff_denied = differential_player['objective_stats'].get('denied_playtime', 0)
-            raw = differential_player.get('objective_stats_raw', {})
-            logger.info(
-                f"[TIME DEBUG] {player_name} R2 DIFF: "
-                f"played={diff_time_minutes:.2f}m dead={diff_dead_minutes:.2f}m "
-                f"ratio={differential_player['objective_stats'].get('time_dead_ratio', 0):.1f}% "
-                f"denied={diff_denied}s | "
-                f"RAW R1: played={raw.get('time_played_minutes_r1', 0):.2f}m "
-                f"dead={raw.get('time_dead_minutes_r1', 0):.2f}m "
-                f"ratio={raw.get('time_dead_ratio_r1', 0):.1f}% denied={raw.get('denied_playtime_r1', 0)}s | "
-                f"RAW R2: played={raw.get('time_played_minutes_r2', 0):.2f}m "
-                f"dead={raw.get('time_dead_minutes_r2', 0):.2f}m "
-                f"ratio={raw.get('time_dead_ratio_r2', 0):.1f}% denied={raw.get('denied_playtime_r2', 0)}s"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                diff_denied = differential_player['objective_stats'].get('denied_playtime', 0)
+                raw = differential_player.get('objective_stats_raw', {})
+                logger.info(
+                    f"[TIME DEBUG] {player_name} R2 DIFF: "
+                    f"played={diff_time_minutes:.2f}m dead={diff_dead_minutes:.2f}m "
+                    f"ratio={differential_player['objective_stats'].get('time_dead_ratio', 0):.1f}% "
+                    f"denied={diff_denied}s | "
+                    f"RAW R1: played={raw.get('time_played_minutes_r1', 0):.2f}m "
+                    f"dead={raw.get('time_dead_minutes_r1', 0):.2f}m "
+                    f"ratio={raw.get('time_dead_ratio_r1', 0):.1f}% denied={raw.get('denied_playtime_r1', 0)}s | "
+                    f"RAW R2: played={raw.get('time_played_minutes_r2', 0):.2f}m "
+                    f"dead={raw.get('time_dead_minutes_r2', 0):.2f}m "
+                    f"ratio={raw.get('time_dead_ratio_r2', 0):.1f}% denied={raw.get('denied_playtime_r2', 0)}s"
+                )
 
             round_2_only_players.append(differential_player)
 
@@ -1225,33 +1308,27 @@ class C0RNP0RN3StatsParser:
             stats_index = 1  # Start after weapon mask
 
             # Process each weapon (0-27) using c0rnp0rn3 mapping
-            for weapon_id in range(28):
-                if weapon_mask & (1 << weapon_id):  # Check if weapon bit is set
-                    weapon_name = C0RNP0RN3_WEAPONS.get(weapon_id, f"UNKNOWN_{weapon_id}")
-
-                    if stats_index + 4 < len(stats_parts):
-                        hits = int(stats_parts[stats_index])
-                        shots = int(stats_parts[stats_index + 1])
-                        kills = int(stats_parts[stats_index + 2])
-                        deaths = int(stats_parts[stats_index + 3])
-                        headshots = int(stats_parts[stats_index + 4])
-
-                        accuracy = (hits / shots * 100) if shots > 0 else 0
-
-                        weapon_stats[weapon_name] = {
-                            'hits': hits,
-                            'shots': shots,
-                            'kills': kills,
-                            'deaths': deaths,
-                            'headshots': headshots,
-                            'accuracy': accuracy,
-                        }
-
-                        total_kills += kills
-                        total_deaths += deaths
-                        total_headshots += headshots
-
-                        stats_index += 5
+            n_parts = len(stats_parts)
+            for weapon_name, bit in _WEAPON_SLOTS:
+                if not weapon_mask & bit:  # weapon bit not set
+                    continue
+                if stats_index + 4 >= n_parts:
+                    break  # truncated weapon block: no later weapon fits either
+                hits, shots, kills, deaths, headshots = map(
+                    int, stats_parts[stats_index:stats_index + 5]
+                )
+                weapon_stats[weapon_name] = {
+                    'hits': hits,
+                    'shots': shots,
+                    'kills': kills,
+                    'deaths': deaths,
+                    'headshots': headshots,
+                    'accuracy': (hits / shots * 100) if shots > 0 else 0,
+                }
+                total_kills += kills
+                total_deaths += deaths
+                total_headshots += headshots
+                stats_index += 5
 
             # Calculate additional metrics
             kd_ratio = total_kills / total_deaths if total_deaths > 0 else total_kills
@@ -1261,97 +1338,28 @@ class C0RNP0RN3StatsParser:
             total_hits = sum(w['hits'] for w in weapon_stats.values())
             total_accuracy = (total_hits / total_shots * 100) if total_shots > 0 else 0
 
-            # Extract additional stats (after weapon data)
-            # After weapon stats come TAB-separated fields (0-35) = 36 fields
+            # Extract additional stats (after weapon data): the TAB-separated
+            # fields of EXTENDED_FIELDS, converted in one pass
             additional_stats = {}
             objective_stats = {}  # NEW: Store objective/support stats
 
             if extended_section:
-                # Extended stats are already TAB-separated
-                tab_fields = extended_section.split('\t')
-
-                # Helper: safe cast functions to avoid IndexError/ValueError
-                def safe_int(lst, idx, default=0):
-                    try:
-                        return int(lst[idx])
-                    except (ValueError, TypeError, IndexError):
-                        return default
-
-                def safe_float(lst, idx, default=0.0):
-                    try:
-                        return float(lst[idx])
-                    except (ValueError, TypeError, IndexError):
-                        return default
-
-                # Populate additional_stats and objective_stats using safe accessors
-                try:
-                    additional_stats = {
-                        'damage_given': safe_int(tab_fields, 0),
-                        'damage_received': safe_int(tab_fields, 1),
-                        'team_damage_given': safe_int(tab_fields, 2),
-                        'team_damage_received': safe_int(tab_fields, 3),
-                        'gibs': safe_int(tab_fields, 4),
-                        'self_kills': safe_int(tab_fields, 5),
-                        'team_kills': safe_int(tab_fields, 6),
-                        'team_gibs': safe_int(tab_fields, 7),
-                        'time_played_percent': safe_float(tab_fields, 8),
-                    }
-
-                    objective_stats = {
-                        'damage_given': safe_int(tab_fields, 0),
-                        'damage_received': safe_int(tab_fields, 1),
-                        'team_damage_given': safe_int(tab_fields, 2),
-                        'team_damage_received': safe_int(tab_fields, 3),
-                        'gibs': safe_int(tab_fields, 4),
-                        'self_kills': safe_int(tab_fields, 5),
-                        'team_kills': safe_int(tab_fields, 6),
-                        'team_gibs': safe_int(tab_fields, 7),
-                        'time_played_percent': safe_float(tab_fields, 8),
-                        'xp': safe_int(tab_fields, 9),
-                        'killing_spree': safe_int(tab_fields, 10),
-                        'death_spree': safe_int(tab_fields, 11),
-                        'kill_assists': safe_int(tab_fields, 12),
-                        'kill_steals': safe_int(tab_fields, 13),
-                        'headshot_kills': safe_int(tab_fields, 14),
-                        'objectives_stolen': safe_int(tab_fields, 15),
-                        'objectives_returned': safe_int(tab_fields, 16),
-                        'dynamites_planted': safe_int(tab_fields, 17),
-                        'dynamites_defused': safe_int(tab_fields, 18),
-                        'times_revived': safe_int(tab_fields, 19),
-                        'bullets_fired': safe_int(tab_fields, 20),
-                        'dpm': safe_float(tab_fields, 21),
-                        'time_played_minutes': safe_float(tab_fields, 22),
-                        'tank_meatshield': safe_float(tab_fields, 23),
-                        'time_dead_ratio': safe_float(tab_fields, 24),
-                        'time_dead_minutes': safe_float(tab_fields, 25),
-                        'kd_ratio': safe_float(tab_fields, 26),
-                        'useful_kills': safe_int(tab_fields, 27),
-                        'denied_playtime': safe_int(tab_fields, 28),
-                        'multikill_2x': safe_int(tab_fields, 29),
-                        'multikill_3x': safe_int(tab_fields, 30),
-                        'multikill_4x': safe_int(tab_fields, 31),
-                        'multikill_5x': safe_int(tab_fields, 32),
-                        'multikill_6x': safe_int(tab_fields, 33),
-                        'useless_kills': safe_int(tab_fields, 34),
-                        'full_selfkills': safe_int(tab_fields, 35),
-                        'repairs_constructions': safe_int(tab_fields, 36),
-                        'revives_given': safe_int(tab_fields, 37),
-                    }
+                values = convert_extended_fields(extended_section.split('\t'))
+                objective_stats = dict(zip(_EXTENDED_NAMES, values))
+                additional_stats = dict(
+                    zip(_EXTENDED_NAMES[:ADDITIONAL_FIELD_COUNT], values)
+                )
 
-                    # [TIME DEBUG] Log raw values from Lua for debugging time stat issues
-                    logger.info(f"[TIME DEBUG] {clean_name} RAW from Lua: "
-                        f"time_played_min={safe_float(tab_fields, 22)}, "
-                        f"time_dead_ratio={safe_float(tab_fields, 24)}, "
-                        f"time_dead_min={safe_float(tab_fields, 25)}, "
-                        f"denied_playtime_sec={safe_int(tab_fields, 28)}")
-
-                except Exception as e:
-                    # Defensive fallback: ensure we always have at least basic numbers
-                    logger.warning(f"Could not fully parse extended fields, falling back: {e}")
-                    additional_stats = {
-                        'damage_given': safe_int(tab_fields, 0),
-                        'damage_received': safe_int(tab_fields, 1),
-                    }
+                # [TIME DEBUG] Log raw values from Lua for debugging time stat issues
+                logger.info(
+                    "[TIME DEBUG] %s RAW from Lua: time_played_min=%s, "
+                    "time_dead_ratio=%s, time_dead_min=%s, denied_playtime_sec=%s",
+                    clean_name,
+                    values[_TAB['time_played_minutes']],
+                    values[_TAB['time_dead_ratio']],
+                    values[_TAB['time_dead_minutes']],
+                    values[_TAB['denied_playtime']],
+                )
 
             # Calculate efficiency
             efficiency = 0
@@ -262,6 +262,9 @@ class BotConfig:
         self.website_public_base: str = self._get_config('WEBSITE_PUBLIC_BASE', 'https://www.slomix.fyi').rstrip('/')
         # Skip digest for stub sessions (false session-end trigger guard).
         self.session_digest_min_rounds: int = int(self._get_config('SESSION_DIGEST_MIN_ROUNDS', '4'))
+        # Post-session precompute pipeline: how many stages may hit the
+        # website at once (the web runs a single uvicorn worker).
+        self.post_session_pipeline_concurrency: int = int(self._get_config('POST_SESSION_PIPELINE_CONCURRENCY', '3'))
 
         # ==================== "ON THIS DAY" DAILY POST (VISION_2026 S6 SPOMIN) ====================
         # A daily throwback embed: sessions/results from the same calendar day in
@@ -390,6 +393,8 @@ class BotConfig:
                 "falling back to 'stats_ready_only'"
             )
             self.webhook_trigger_mode = 'stats_ready_only'
+        # Concurrent sessions in the STATS_READY queue (rounds of one session stay ordered)
+        self.webhook_queue_workers: int = int(self._get_config('WEBHOOK_QUEUE_WORKERS', '2'))
 
         # Webhook ID whitelist (REQUIRED for security)
         webhook_whitelist_raw = self._get_config('WEBHOOK_TRIGGER_WHITELIST', '')
@@ -4,12 +4,28 @@ Simplified to PostgreSQL-only (SQLite support removed)
 """
 import asyncio
 import contextvars
+import functools
+import json
 import logging
 import time
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import Any
 
+from bot.core.query_batch import (
+    DEFAULT_BATCH_CONCURRENCY,
+    KIND_ALL,
+    KIND_METHODS,
+    KIND_ONE,
+    MODE_PARALLEL,
+    MODE_SNAPSHOT,
+    QueryBatch,
+    as_batch_queries,
+)
+from bot.core.query_cache import QueryCache, cache_key
+from bot.core.query_profiler import QueryProfiler
+
 # PostgreSQL support
 try:
     import asyncpg
@@ -21,6 +37,8 @@ except ImportError:
 
 logger = logging.getLogger('DatabaseAdapter')
 
+_UNCACHED = object()  # _cached_read sentinel: cache not applicable to this call
+
 
 class DatabaseAdapter(ABC):
     """Abstract base class for database adapters."""
@@ -47,21 +65,45 @@ class DatabaseAdapter(ABC):
         """Execute a query for each tuple in params_list (batch insert/update)."""
 
     @abstractmethod
-    async def fetch_one(self, query: str, params: tuple | None = None) -> Any | None:
+    async def fetch_one(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> Any | None:
         """Fetch a single row."""
 
     @abstractmethod
-    async def fetch_all(self, query: str, params: tuple | None = None) -> list[Any]:
+    async def fetch_all(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> list[Any]:
         """Fetch all rows."""
 
     @abstractmethod
-    async def fetch_val(self, query: str, params: tuple | None = None) -> Any:
+    async def fetch_val(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> Any:
         """Fetch a single value from first row."""
 
+    def bump_data_version(self, reason: str = "") -> None:
+        """Invalidate cached reads (``cache_ttl=``) after new data is written."""
+        cache = getattr(self, "query_cache", None)
+        if cache is not None:
+            cache.bump(reason)
+
     def translate_query(self, query: str) -> str:
         """Translate query syntax if needed (override in subclasses)."""
         return query
 
+    async def fetch_many(self, queries, *, mode: str = MODE_SNAPSHOT,
+                         concurrency: int | None = None) -> list:
+        """Run independent reads and return their results in order.
+
+        *queries* holds ``BatchQuery`` objects or ``(query, params)`` tuples
+        (fetch_all). See bot/core/query_batch.py for the modes; this default
+        runs them one after another through the regular methods.
+        """
+        return [await getattr(self, KIND_METHODS[item.kind])(item.query, item.params)
+                for item in as_batch_queries(queries)]
+
+    def batch(self, *, mode: str = MODE_SNAPSHOT, concurrency: int | None = None) -> QueryBatch:
+        """Builder for ``fetch_many``."""
+        return QueryBatch(self, mode=mode, concurrency=concurrency)
+
     @asynccontextmanager
     async def advisory_lock(self, key: int):
         """Best-effort mutual-exclusion lock, yielding True when acquired.
@@ -115,6 +157,9 @@ class PostgreSQLAdapter(DatabaseAdapter):
         self.pool = None
         self._pool_lock = asyncio.Lock()  # Prevents race condition on pool init
         self._active_tx_conn = contextvars.ContextVar("active_tx_conn", default=None)
+        self.profiler = QueryProfiler.from_env()
+        self._plan_tasks: set[asyncio.Task] = set()
+        self.query_cache = QueryCache()
 
         ssl_status = "SSL disabled" if ssl_mode == 'disable' else f"SSL mode: {ssl_mode}"
         logger.debug(f"📦 PostgreSQL Adapter initialized: {host}:{port}/{database} ({ssl_status})")
@@ -162,7 +207,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 ssl=ssl_context,
                 min_size=self.min_pool_size,
                 max_size=self.max_pool_size,
-                command_timeout=120  # 2 minutes for complex aggregation queries
+                command_timeout=120,  # 2 minutes for complex aggregation queries
             )
             logger.debug(f"✅ PostgreSQL pool created: {self.host}:{self.port}/{self.database}")
             logger.info(f"✅ PostgreSQL pool created (pool size: {self.min_pool_size}-{self.max_pool_size})")
@@ -219,9 +264,16 @@ class PostgreSQLAdapter(DatabaseAdapter):
     @asynccontextmanager
     async def connection(self):
         """Provide PostgreSQL connection from pool."""
+        async with self._acquire() as (conn, _wait_s):
+            yield conn
+
+    @asynccontextmanager
+    async def _acquire(self):
+        """Yield ``(conn, pool_wait_seconds)``; the active transaction's
+        connection (wait 0) when inside ``transaction()``."""
         active_conn = self._active_tx_conn.get()
         if active_conn is not None:
-            yield active_conn
+            yield active_conn, 0.0
             return
 
         # Thread-safe pool initialization with double-check locking
@@ -230,9 +282,11 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 if not self.pool:  # Double-check after acquiring lock
                     await self.connect()
 
+        wait_start = time.monotonic()
         conn = await self.pool.acquire()
+        wait_s = time.monotonic() - wait_start
         try:
-            yield conn
+            yield conn, wait_s
         finally:
             await self.pool.release(conn)
 
@@ -323,9 +377,12 @@ class PostgreSQLAdapter(DatabaseAdapter):
         params = self._normalize_params(params)
 
         start = time.monotonic()
+        wait_s, rows, failed = 0.0, None, True
         try:
-            async with self.connection() as conn:
+            async with self._acquire() as (conn, wait_s):
                 result = await conn.execute(query, *(params or ()))
+            failed = False
+            rows = _status_row_count(result)
             duration_ms = (time.monotonic() - start) * 1000
             if duration_ms > 3000:
                 logger.warning("SLOW QUERY (%.0fms): %.200s", duration_ms, query)
@@ -344,6 +401,8 @@ class PostgreSQLAdapter(DatabaseAdapter):
         except Exception:
             logger.error("Query failed (%.100s)", query, exc_info=True)
             raise
+        finally:
+            self._profile("execute", query, params, start, wait_s, rows, failed)
 
     async def executemany(self, query: str, params_list: list[tuple]) -> None:
         """Batch execute a query for each tuple in params_list."""
@@ -351,24 +410,39 @@ class PostgreSQLAdapter(DatabaseAdapter):
             return
         query = self._translate_placeholders(query)
         start = time.monotonic()
+        wait_s, failed = 0.0, True
         try:
-            async with self.connection() as conn:
+            async with self._acquire() as (conn, wait_s):
                 await conn.executemany(query, params_list)
+            failed = False
             duration_ms = (time.monotonic() - start) * 1000
             logger.debug("executemany %d rows (%.0fms): %.100s", len(params_list), duration_ms, query)
         except Exception:
             logger.error("executemany failed (%d rows, %.100s)", len(params_list), query, exc_info=True)
             raise
+        finally:
+            self._profile("executemany", query, None, start, wait_s, len(params_list), failed)
 
-    async def fetch_one(self, query: str, params: tuple | None = None) -> Any | None:
-        """Fetch single row from PostgreSQL."""
+    async def fetch_one(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> Any | None:
+        """Fetch single row from PostgreSQL.
+
+        ``cache_ttl`` (seconds) opts this read into the query cache.
+        """
         query = self._translate_placeholders(query)
         params = self._normalize_params(params)
+        if cache_ttl:
+            cached = await self._cached_read("fetch_one", query, params, cache_ttl)
+            if cached is not _UNCACHED:
+                return cached
 
         start = time.monotonic()
+        wait_s, rows, failed = 0.0, None, True
         try:
-            async with self.connection() as conn:
+            async with self._acquire() as (conn, wait_s):
                 result = await conn.fetchrow(query, *(params or ()))
+            failed = False
+            rows = 0 if result is None else 1
             duration_ms = (time.monotonic() - start) * 1000
             if duration_ms > 3000:
                 logger.warning("SLOW QUERY (%.0fms): %.200s", duration_ms, query)
@@ -381,16 +455,29 @@ class PostgreSQLAdapter(DatabaseAdapter):
         except Exception:
             logger.error("fetch_one failed (%.100s)", query, exc_info=True)
             raise
+        finally:
+            self._profile("fetch_one", query, params, start, wait_s, rows, failed)
 
-    async def fetch_all(self, query: str, params: tuple | None = None) -> list[Any]:
-        """Fetch all rows from PostgreSQL."""
+    async def fetch_all(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> list[Any]:
+        """Fetch all rows from PostgreSQL.
+
+        ``cache_ttl`` (seconds) opts this read into the query cache.
+        """
         query = self._translate_placeholders(query)
         params = self._normalize_params(params)
+        if cache_ttl:
+            cached = await self._cached_read("fetch_all", query, params, cache_ttl)
+            if cached is not _UNCACHED:
+                return cached
 
         start = time.monotonic()
+        wait_s, rows, failed = 0.0, None, True
         try:
-            async with self.connection() as conn:
+            async with self._acquire() as (conn, wait_s):
                 result = await conn.fetch(query, *(params or ()))
+            failed = False
+            rows = len(result)
             duration_ms = (time.monotonic() - start) * 1000
             if duration_ms > 3000:
                 logger.warning("SLOW QUERY (%.0fms, %d rows): %.200s", duration_ms, len(result), query)
@@ -403,16 +490,28 @@ class PostgreSQLAdapter(DatabaseAdapter):
         except Exception:
             logger.error("fetch_all failed (%.100s)", query, exc_info=True)
             raise
+        finally:
+            self._profile("fetch_all", query, params, start, wait_s, rows, failed)
 
-    async def fetch_val(self, query: str, params: tuple | None = None) -> Any:
-        """Fetch single value from PostgreSQL."""
+    async def fetch_val(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> Any:
+        """Fetch single value from PostgreSQL.
+
+        ``cache_ttl`` (seconds) opts this read into the query cache.
+        """
         query = self._translate_placeholders(query)
         params = self._normalize_params(params)
+        if cache_ttl:
+            cached = await self._cached_read("fetch_val", query, params, cache_ttl)
+            if cached is not _UNCACHED:
+                return cached
 
         start = time.monotonic()
+        wait_s, rows, failed = 0.0, None, True
         try:
-            async with self.connection() as conn:
+            async with self._acquire() as (conn, wait_s):
                 result = await conn.fetchval(query, *(params or ()))
+            failed = False
             duration_ms = (time.monotonic() - start) * 1000
             if duration_ms > 3000:
                 logger.warning("SLOW QUERY (%.0fms): %.200s", duration_ms, query)
@@ -425,6 +524,137 @@ class PostgreSQLAdapter(DatabaseAdapter):
         except Exception:
             logger.error("fetch_val failed (%.100s)", query, exc_info=True)
             raise
+        finally:
+            self._profile("fetch_val", query, params, start, wait_s, rows, failed)
+
+    async def _cached_read(self, op: str, query: str, params, ttl: float):
+        """Read-through the query cache; ``_UNCACHED`` means run the query normally.
+
+        Reads inside ``transaction()`` bypass the cache: they must see the
+        transaction's own uncommitted writes.
+        """
+        cache = getattr(self, "query_cache", None)
+        if cache is None or self._active_tx_conn.get() is not None:
+            return _UNCACHED
+        result = await cache.get_or_load(
+            cache_key(op, query, params), ttl,
+            lambda: getattr(self, op)(query, params),
+        )
+        # callers may sort/extend the row list; hand each one its own copy
+        return list(result) if isinstance(result, list) else result
+
+    def _profile(self, op: str, query: str, params: tuple | None, start: float,
+                 wait_s: float, rows: int | None, failed: bool) -> None:
+        """Feed one call into the query profiler (and schedule an EXPLAIN sample)."""
+        profiler = getattr(self, "profiler", None)
+        if profiler is None:
+            return
+        stats = profiler.record(op, query, time.monotonic() - start, rows=rows,
+                                pool_wait_s=wait_s, error=failed, params=params)
+        if profiler.explain_enabled and profiler.should_capture_plan(stats):
+            task = asyncio.get_running_loop().create_task(
+                self.capture_query_plans(fingerprints=[stats.fingerprint]))
+            self._plan_tasks.add(task)
+            task.add_done_callback(self._plan_tasks.discard)
+
+    async def capture_query_plans(self, limit: int = 5, timeout_ms: int = 5000,
+                                  fingerprints: list[str] | None = None) -> list[dict]:
+        """Run EXPLAIN (ANALYZE, BUFFERS) on sampled slow read-only statements.
+
+        Each plan runs the retained slowest execution (same parameters) on its
+        own pooled connection, inside a READ ONLY transaction with a local
+        statement_timeout, so a sample can neither write nor run away. Plans
+        are stored on the profiler and returned for /api/diagnostics.
+        """
+        profiler = getattr(self, "profiler", None)
+        if profiler is None or not self.pool:
+            return []
+        candidates = profiler.explain_candidates(limit, fingerprints)
+
+        captured = []
+        for stats in candidates:
+            query, params, sample_ms = stats.slow_sample
+            try:
+                async with self.pool.acquire() as conn, conn.transaction(readonly=True):
+                    await conn.execute(f"SET LOCAL statement_timeout = {max(1, int(timeout_ms))}")
+                    raw = await conn.fetchval(
+                        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, *params)
+                plan = json.loads(raw) if isinstance(raw, str) else raw
+                stats.plan = plan[0] if isinstance(plan, list) and plan else plan
+                stats.plan_captured_at = datetime.now(timezone.utc).isoformat()
+                logger.info("Captured query plan for %s (sample %.0fms): %.100s",
+                            stats.fingerprint, sample_ms, stats.statement)
+            except Exception as e:
+                # Never retry a statement that cannot be explained (e.g. timeout).
+                stats.slow_sample = None
+                logger.warning("EXPLAIN sample failed for %s: %s", stats.fingerprint, e)
+                continue
+            captured.append({"fingerprint": stats.fingerprint, "statement": stats.statement[:300],
+                             "sample_ms": round(sample_ms, 1),
+                             "captured_at": stats.plan_captured_at, "plan": stats.plan})
+        return captured
+
+    async def fetch_many(self, queries, *, mode: str = MODE_SNAPSHOT,
+                         concurrency: int | None = None) -> list:
+        """Run independent reads in one snapshot transaction or fanned out.
+
+        ``snapshot``: one connection, one REPEATABLE READ READ ONLY
+        transaction, queries back to back — one acquire and a consistent view.
+        ``parallel``: up to *concurrency* pool connections at once. Results
+        come back in input order either way.
+        """
+        items = as_batch_queries(queries)
+        if not items:
+            return []
+        if mode not in (MODE_SNAPSHOT, MODE_PARALLEL):
+            raise ValueError(f"unknown fetch_many mode '{mode}'")
+
+        # A transaction pins one connection, which cannot run queries
+        # concurrently — run the batch on it in order.
+        if mode == MODE_PARALLEL and self._active_tx_conn.get() is None:
+            limit = asyncio.Semaphore(max(1, concurrency or DEFAULT_BATCH_CONCURRENCY))
+
+            async def _one(item):
+                async with limit:
+                    return await getattr(self, KIND_METHODS[item.kind])(item.query, item.params)
+
+            return list(await asyncio.gather(*(_one(item) for item in items)))
+
+        in_transaction = self._active_tx_conn.get() is not None
+        async with self._acquire() as (conn, wait_s):
+            if in_transaction:
+                return [await self._fetch_batch_item(conn, item, wait_s if i == 0 else 0.0)
+                        for i, item in enumerate(items)]
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                return [await self._fetch_batch_item(conn, item, wait_s if i == 0 else 0.0)
+                        for i, item in enumerate(items)]
+
+    async def _fetch_batch_item(self, conn, item, wait_s: float):
+        op = KIND_METHODS[item.kind]
+        query = self._translate_placeholders(item.query)
+        params = item.params
+        if params is not None and not isinstance(params, (list, tuple)):
+            params = (params,)
+        params = self._normalize_params(params)
+
+        start = time.monotonic()
+        rows, failed = None, True
+        try:
+            if item.kind == KIND_ALL:
+                result = await conn.fetch(query, *(params or ()))
+                rows = len(result)
+            elif item.kind == KIND_ONE:
+                result = await conn.fetchrow(query, *(params or ()))
+                rows = 0 if result is None else 1
+            else:
+                result = await conn.fetchval(query, *(params or ()))
+            failed = False
+            return result
+        except Exception:
+            logger.error("fetch_many %s failed (%.100s)", op, query, exc_info=True)
+            raise
+        finally:
+            self._profile(op, query, params, start, wait_s, rows, failed)
 
     def _normalize_params(self, params: tuple | None) -> tuple | None:
         """
@@ -439,22 +669,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
 
         This allows code to use ? placeholders (portable) while using PostgreSQL.
         """
-        if '?' not in query:
-            return query
-
-        # Replace ? with $1, $2, $3, etc.
-        result = []
-        param_num = 1
-        i = 0
-        while i < len(query):
-            if query[i] == '?':
-                result.append(f'${param_num}')
-                param_num += 1
-            else:
-                result.append(query[i])
-            i += 1
-
-        return ''.join(result)
+        return translate_placeholders(query)
 
     def translate_query(self, query: str) -> str:
         """
@@ -468,6 +683,31 @@ class PostgreSQLAdapter(DatabaseAdapter):
         return self._translate_placeholders(query)
 
 
+@functools.lru_cache(maxsize=4096)
+def translate_placeholders(query: str) -> str:
+    """``?`` → ``$1, $2, …``, memoized by query string.
+
+    Every adapter call translates; the queries are a fixed set of literals, so
+    after warm-up this is a dict lookup instead of a rebuild of the string.
+    """
+    if '?' not in query:
+        return query
+    parts = query.split('?')
+    out = [parts[0]]
+    for num, part in enumerate(parts[1:], start=1):
+        out.append(f'${num}')
+        out.append(part)
+    return ''.join(out)
+
+
+def _status_row_count(status: Any) -> int | None:
+    """Row count from an asyncpg command tag ('UPDATE 3', 'INSERT 0 1')."""
+    if not isinstance(status, str):
+        return None
+    tail = status.rsplit(" ", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
 def create_adapter(db_type: str = 'postgresql', **kwargs) -> DatabaseAdapter:
     """
     Factory function to create PostgreSQL database adapter.
@@ -8,9 +8,14 @@ Perfect for: Sessions with 1000+ records, Leaderboards with 500+ players
 Features:
 - Only loads page when user clicks button
 - Memory efficient (only stores loaded pages in cache)
-- Maintains cache for recently viewed pages
+- Maintains cache for recently viewed pages (LRU, per view)
+- Prefetches the next page in the direction of travel after each press,
+  so the following flip is answered from the cache
+- A click on a page that is still loading waits for that fetch instead of
+  starting a second one
 - Auto-timeout after 3 minutes
-- Graceful handling when data fetcher is slow
+- Graceful handling when data fetcher is slow: the interaction is deferred
+  first, so a slow page never misses Discord's 3s response deadline
 
 Usage:
     async def page_fetcher(page_num: int) -> discord.Embed:
@@ -26,12 +31,15 @@ Usage:
     initial_embed = await view.get_page(0)
     message = await ctx.send(embed=initial_embed, view=view)
     view.message = message
+    view.schedule_prefetch()  # warm page 2 while the user reads page 1
 
 Author: ET:Legacy Stats Bot
 Date: November 7, 2025
 """
 
+import asyncio
 import logging
+from collections import OrderedDict
 from typing import Callable
 
 import discord
@@ -48,7 +56,8 @@ class LazyPaginationView(View):
                  ctx,
                  page_fetcher: Callable,
                  total_pages: int = 5,
-                 timeout: int = 180):
+                 timeout: int = 180,
+                 prefetch: bool = True):
         """
         Initialize lazy pagination view with memory management
 
@@ -57,6 +66,7 @@ class LazyPaginationView(View):
             page_fetcher: Async function(page_num) -> discord.Embed
             total_pages: Total number of pages available
             timeout: Seconds before buttons auto-disable
+            prefetch: Load the next page in the background after each press
         """
         super().__init__(timeout=timeout)
         self.ctx = ctx
@@ -64,9 +74,12 @@ class LazyPaginationView(View):
         self.total_pages = total_pages
         self.current_page = 0
         self.message = None
-        self.page_cache = {}  # Cache loaded pages
+        self.page_cache: OrderedDict[int, discord.Embed] = OrderedDict()  # LRU of loaded pages
         self.max_cache_size = 20  # Limit cache to prevent memory leak
         self.fetching = False  # Prevent concurrent fetches
+        self.prefetch = prefetch
+        self._loading: dict[int, asyncio.Task] = {}  # page -> in-flight fetch
+        self._direction = 1  # +1 forward, -1 back; picks the page to prefetch
 
         self.update_buttons()
 
@@ -91,23 +104,55 @@ class LazyPaginationView(View):
         page_num = max(0, min(page_num, self.total_pages - 1))
 
         if page_num in self.page_cache:
+            self.page_cache.move_to_end(page_num)
             return self.page_cache[page_num]
 
-        # Check cache size and clean if needed to prevent memory leak
-        if len(self.page_cache) >= self.max_cache_size:
-            # Remove oldest half of cache entries
-            to_remove = list(self.page_cache.keys())[:self.max_cache_size // 2]
-            for key in to_remove:
-                del self.page_cache[key]
-            logger.debug(
-                f"Cleared {len(to_remove)} cached pages to prevent memory leak"
-            )
+        # Join a prefetch that is already loading this page
+        task = self._loading.get(page_num)
+        if task is None:
+            task = self._start_load(page_num)
+        return await asyncio.shield(task)
+
+    def _start_load(self, page_num: int) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._load(page_num))
+        self._loading[page_num] = task
+        return task
 
-        # Load from data fetcher
-        embed = await self.page_fetcher(page_num)
-        self.page_cache[page_num] = embed
+    async def _load(self, page_num: int) -> discord.Embed:
+        try:
+            embed = await self.page_fetcher(page_num)
+        finally:
+            self._loading.pop(page_num, None)
+        if embed is not None:
+            self.page_cache[page_num] = embed
+            self.page_cache.move_to_end(page_num)
+            # Evict least recently viewed pages to prevent memory leak
+            while len(self.page_cache) > self.max_cache_size:
+                self.page_cache.popitem(last=False)
         return embed
 
+    def is_ready(self, page_num: int) -> bool:
+        """True when *page_num* can be shown without waiting on the fetcher."""
+        return page_num in self.page_cache
+
+    def schedule_prefetch(self) -> None:
+        """Start loading the page after the current one (direction of travel)."""
+        if not self.prefetch:
+            return
+        page_num = self.current_page + self._direction
+        if not 0 <= page_num < self.total_pages:
+            return
+        if page_num in self.page_cache or page_num in self._loading:
+            return
+        task = self._start_load(page_num)
+        # A failed prefetch is not fatal: the click retries it in the foreground
+        task.add_done_callback(self._log_prefetch_failure)
+
+    @staticmethod
+    def _log_prefetch_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Page prefetch failed: %s", task.exception())
+
     async def update_message(self, interaction: Interaction):
         """Update message with current page"""
         if self.fetching:
@@ -116,10 +161,17 @@ class LazyPaginationView(View):
         self.fetching = True
         try:
             self.update_buttons()
-            embed = await self.get_page(self.current_page)
-            await interaction.response.edit_message(embed=embed, view=self)
+            if self.is_ready(self.current_page):
+                embed = await self.get_page(self.current_page)
+                await interaction.response.edit_message(embed=embed, view=self)
+            else:
+                # Acknowledge first: the fetch may outlast the 3s deadline
+                await interaction.response.defer()
+                embed = await self.get_page(self.current_page)
+                await interaction.edit_original_response(embed=embed, view=self)
         finally:
             self.fetching = False
+        self.schedule_prefetch()
 
     @discord.ui.button(
         emoji="⏮️",
@@ -132,6 +184,7 @@ class LazyPaginationView(View):
             await interaction.response.defer()
             return
         self.current_page = 0
+        self._direction = 1
         await self.update_message(interaction)
 
     @discord.ui.button(
@@ -145,6 +198,7 @@ class LazyPaginationView(View):
             await interaction.response.defer()
             return
         self.current_page = max(0, self.current_page - 1)
+        self._direction = -1
         await self.update_message(interaction)
 
     @discord.ui.button(
@@ -158,6 +212,7 @@ class LazyPaginationView(View):
             await interaction.response.defer()
             return
         self.current_page = min(self.total_pages - 1, self.current_page + 1)
+        self._direction = 1
         await self.update_message(interaction)
 
     @discord.ui.button(
@@ -171,10 +226,13 @@ class LazyPaginationView(View):
             await interaction.response.defer()
             return
         self.current_page = self.total_pages - 1
+        self._direction = -1
         await self.update_message(interaction)
 
     async def on_timeout(self):
         """Called when view times out - disable all buttons and notify user"""
+        for task in list(self._loading.values()):
+            task.cancel()
         if self.message:
             try:
                 for child in self.children:
@@ -0,0 +1,93 @@
+"""
+Multi-query reads for page-composing endpoints.
+
+A page that issues a dozen independent ``db.fetch_all`` calls pays one pool
+acquire/release and one round trip wait per call, back to back.
+``db.fetch_many([...])`` (or the ``db.batch()`` builder) runs a list of
+independent reads in one of two modes and returns their results in order:
+
+``snapshot`` (default)
+    All queries on ONE connection inside a single ``REPEATABLE READ READ
+    ONLY`` transaction: one acquire, and every result sees the same
+    snapshot, so a page never mixes data from before and after an import.
+    Inside an active ``db.transaction()`` the queries run on that
+    transaction's connection instead.
+
+``parallel``
+    Queries fanned out across pool connections, at most ``concurrency`` at a
+    time. Wall-clock ≈ the slowest query rather than the sum; no shared
+    snapshot. Use for a few heavy, independent aggregates.
+"""
+from dataclasses import dataclass
+
+MODE_SNAPSHOT = "snapshot"
+MODE_PARALLEL = "parallel"
+DEFAULT_BATCH_CONCURRENCY = 4
+
+KIND_ALL = "all"
+KIND_ONE = "one"
+KIND_VAL = "val"
+
+# BatchQuery.kind → adapter method
+KIND_METHODS = {KIND_ALL: "fetch_all", KIND_ONE: "fetch_one", KIND_VAL: "fetch_val"}
+
+
+@dataclass(frozen=True)
+class BatchQuery:
+    """One read in a batch; ``kind`` picks fetch_all / fetch_one / fetch_val."""
+
+    query: str
+    params: tuple | None = None
+    kind: str = KIND_ALL
+
+    def __post_init__(self):
+        if self.kind not in KIND_METHODS:
+            raise ValueError(f"unknown batch query kind '{self.kind}'")
+
+
+def as_batch_queries(queries) -> list[BatchQuery]:
+    """Accept BatchQuery objects, ``(query, params)`` tuples or bare query strings."""
+    items = []
+    for item in queries:
+        if isinstance(item, BatchQuery):
+            items.append(item)
+        elif isinstance(item, str):
+            items.append(BatchQuery(item))
+        else:
+            items.append(BatchQuery(*item))
+    return items
+
+
+class QueryBatch:
+    """Builder over ``fetch_many``::
+
+        batch = db.batch()
+        batch.fetch_all(rounds_sql, (session_id,))
+        batch.fetch_val(count_sql)
+        rounds, count = await batch.run()
+    """
+
+    def __init__(self, db, *, mode: str = MODE_SNAPSHOT, concurrency: int | None = None):
+        self._db = db
+        self.mode = mode
+        self.concurrency = concurrency
+        self.queries: list[BatchQuery] = []
+
+    def _add(self, query: str, params, kind: str) -> "QueryBatch":
+        if params is not None and not isinstance(params, (list, tuple)):
+            params = (params,)
+        self.queries.append(BatchQuery(query, tuple(params) if params is not None else None, kind))
+        return self
+
+    def fetch_all(self, query: str, params: tuple | None = None) -> "QueryBatch":
+        return self._add(query, params, KIND_ALL)
+
+    def fetch_one(self, query: str, params: tuple | None = None) -> "QueryBatch":
+        return self._add(query, params, KIND_ONE)
+
+    def fetch_val(self, query: str, params: tuple | None = None) -> "QueryBatch":
+        return self._add(query, params, KIND_VAL)
+
+    async def run(self) -> list:
+        return await self._db.fetch_many(self.queries, mode=self.mode,
+                                         concurrency=self.concurrency)
@@ -0,0 +1,127 @@
+"""
+Read-through result cache for PostgreSQLAdapter.
+
+Discord commands (``!stats``, ``!leaderboard``, ``!last_session`` and the
+session view buttons) re-run the same heavy aggregations every time someone
+in a channel clicks while a session is being discussed. Those handlers opt in
+per call::
+
+    rows = await db.fetch_all(query, params, cache_ttl=120)
+
+Entries are keyed by (operation, translated query, params) and carry the
+adapter's data version at load time; ``db.bump_data_version()`` (called by
+the import path once a round is stored) makes every older entry a miss, so a
+TTL only bounds staleness from writes that do not bump. Concurrent misses for
+the same key share one in-flight query instead of stampeding the pool.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger('QueryCache')
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def cache_key(op: str, query: str, params) -> tuple:
+    """Hashable key for one read; unhashable params (lists for ANY(...)) via repr."""
+    try:
+        hash(params)
+    except TypeError:
+        params = repr(params)
+    return (op, query, params)
+
+
+class QueryCache:
+    """Bounded LRU of query results with data-version invalidation and single-flight loads."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self.data_version = 0
+        # key -> (expires_at monotonic, data_version, result)
+        self._entries: OrderedDict[tuple, tuple[float, int, Any]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def bump(self, reason: str = "") -> int:
+        """New data landed: every cached result becomes a miss."""
+        self.data_version += 1
+        self.invalidations += 1
+        self._entries.clear()
+        logger.debug("query cache invalidated (v%d): %s", self.data_version, reason or "bump")
+        return self.data_version
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, version, result = entry
+        if version != self.data_version or expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, result
+
+    def put(self, key: tuple, result: Any, ttl: float, version: int) -> None:
+        if version != self.data_version:
+            return  # loaded across an import; don't pin pre-import data
+        self._entries[key] = (time.monotonic() + ttl, version, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: tuple, ttl: float,
+                          loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached result for *key*, else run *loader* once for all concurrent callers."""
+        found, result = self.get(key)
+        if found:
+            self.hits += 1
+            return result
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            # shield: a cancelled follower must not cancel the leader's query
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                return await loader()  # the leader was cancelled; load for ourselves
+
+        self.misses += 1
+        version = self.data_version
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when no follower is waiting
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            self.put(key, result, ttl, version)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "data_version": self.data_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate_pct": round((self.hits + self.coalesced) / lookups * 100, 1) if lookups else 0.0,
+        }
@@ -0,0 +1,279 @@
+"""
+In-process query profiler for PostgreSQLAdapter.
+
+The adapter only ever logged single queries slower than 3 s, so there was no
+aggregate answer to "which of the inline queries across the cogs and routers
+dominate DB time". The profiler groups every query by a normalized
+fingerprint (literals, placeholders and IN-lists collapsed) and keeps, per
+fingerprint: call count, errors, total/max latency, a bounded reservoir of
+recent latencies for p50/p95/p99, rows returned and time spent waiting on
+the pool.
+
+Memory is bounded on every axis: at most ``max_fingerprints`` entries (later
+ones fold into one ``other`` entry), ``samples_per_fingerprint`` latencies
+each, and a capped raw-query → fingerprint cache.
+
+Metrics export is an observer hook rather than a Prometheus import, so
+bot.core stays free of the website's metrics module; the website registers
+its histograms in dependencies.init_db_pool. Only the first
+``metric_fingerprints`` fingerprints get their own label value — everything
+after that is labelled ``other`` — so label cardinality stays fixed.
+
+EXPLAIN sampling (off by default, ``DB_PROFILER_EXPLAIN_MS``): the slowest
+read-only execution of each fingerprint above the threshold is retained,
+parameters included, so ``PostgreSQLAdapter.capture_query_plans`` can run
+``EXPLAIN (ANALYZE, BUFFERS)`` on exactly that statement.
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+logger = logging.getLogger('QueryProfiler')
+
+OVERFLOW_FINGERPRINT = "other"
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|\?")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WS_RE = re.compile(r"\s+")
+_READ_ONLY_RE = re.compile(r"^\s*(select|with)\b", re.I)
+_WRITE_RE = re.compile(r"\b(insert|update|delete|merge|truncate|create|alter|drop|for\s+update|for\s+share)\b", re.I)
+
+# Observer signature: (fingerprint_label, op, duration_s, pool_wait_s, error)
+QueryObserver = Callable[[str, str, float, float, bool], None]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse a query to the shape shared by every execution of it."""
+    text = _COMMENT_RE.sub(" ", query)
+    text = _STRING_RE.sub("?", text)
+    text = _PARAM_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _WS_RE.sub(" ", text).strip()
+    return _LIST_RE.sub("(...)", text)
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8"), usedforsecurity=False).hexdigest()[:10]
+
+
+def is_read_only(normalized: str) -> bool:
+    """True for statements EXPLAIN ANALYZE may execute (plain SELECT/WITH)."""
+    return bool(_READ_ONLY_RE.match(normalized)) and not _WRITE_RE.search(normalized)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+class FingerprintStats:
+    """Aggregates for one query fingerprint."""
+
+    __slots__ = (
+        "fingerprint", "statement", "metric_label", "read_only", "ops", "count",
+        "errors", "total_ms", "max_ms", "rows", "pool_wait_ms", "samples",
+        "slow_sample", "plan", "plan_captured_at",
+    )
+
+    def __init__(self, fingerprint: str, statement: str, metric_label: str,
+                 samples: int):
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.metric_label = metric_label
+        self.read_only = is_read_only(statement)
+        self.ops: dict[str, int] = {}
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.pool_wait_ms = 0.0
+        self.samples: deque[float] = deque(maxlen=samples)
+        # (translated query, params, duration_ms) of the slowest sampled run
+        self.slow_sample: tuple[str, tuple, float] | None = None
+        self.plan: Any = None
+        self.plan_captured_at: str | None = None
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.samples)
+        count = self.count or 1
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement[:300],
+            "ops": dict(self.ops),
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 1),
+            "mean_ms": round(self.total_ms / count, 2),
+            "p50_ms": round(_percentile(ordered, 50), 2),
+            "p95_ms": round(_percentile(ordered, 95), 2),
+            "p99_ms": round(_percentile(ordered, 99), 2),
+            "max_ms": round(self.max_ms, 2),
+            "rows": self.rows,
+            "rows_per_call": round(self.rows / count, 1),
+            "pool_wait_ms": round(self.pool_wait_ms, 1),
+            "pool_wait_mean_ms": round(self.pool_wait_ms / count, 2),
+            "has_plan": self.plan is not None,
+        }
+
+
+class QueryProfiler:
+    """Bounded per-fingerprint latency profile of every adapter query."""
+
+    def __init__(self, *, enabled: bool = True, max_fingerprints: int = 500,
+                 samples_per_fingerprint: int = 256, metric_fingerprints: int = 50,
+                 explain_min_ms: float = 0.0, explain_interval_s: float = 300.0):
+        self.enabled = enabled
+        self.max_fingerprints = max(1, max_fingerprints)
+        self.samples_per_fingerprint = max(8, samples_per_fingerprint)
+        self.metric_fingerprints = max(0, metric_fingerprints)
+        self.explain_min_ms = max(0.0, explain_min_ms)
+        self.explain_interval_s = max(0.0, explain_interval_s)
+        self._observers: list[QueryObserver] = []
+        self.reset()
+
+    @classmethod
+    def from_env(cls) -> "QueryProfiler":
+        def _num(name: str, default: float) -> float:
+            try:
+                return float(os.getenv(name, default))
+            except ValueError:
+                return default
+
+        return cls(
+            enabled=os.getenv("DB_PROFILER_ENABLED", "true").lower() == "true",
+            max_fingerprints=int(_num("DB_PROFILER_MAX_FINGERPRINTS", 500)),
+            metric_fingerprints=int(_num("DB_PROFILER_METRIC_FINGERPRINTS", 50)),
+            explain_min_ms=_num("DB_PROFILER_EXPLAIN_MS", 0),
+            explain_interval_s=_num("DB_PROFILER_EXPLAIN_INTERVAL_S", 300),
+        )
+
+    def reset(self) -> None:
+        self._stats: dict[str, FingerprintStats] = {}
+        self._fingerprints: dict[str, tuple[str, str]] = {}
+        self._labelled = 0
+        self._last_plan_at: float | None = None
+        self.since = datetime.now(timezone.utc)
+
+    def add_observer(self, observer: QueryObserver) -> None:
+        self._observers.append(observer)
+
+    @property
+    def explain_enabled(self) -> bool:
+        return self.explain_min_ms > 0
+
+    def _lookup(self, query: str) -> tuple[str, str]:
+        found = self._fingerprints.get(query)
+        if found is None:
+            normalized = normalize_query(query)
+            found = (fingerprint_id(normalized), normalized)
+            if len(self._fingerprints) >= 4 * self.max_fingerprints:
+                self._fingerprints.clear()
+            self._fingerprints[query] = found
+        return found
+
+    def _entry(self, query: str) -> FingerprintStats:
+        fingerprint, normalized = self._lookup(query)
+        stats = self._stats.get(fingerprint)
+        if stats is not None:
+            return stats
+        if len(self._stats) >= self.max_fingerprints:
+            stats = self._stats.get(OVERFLOW_FINGERPRINT)
+            if stats is None:
+                stats = FingerprintStats(OVERFLOW_FINGERPRINT, "(fingerprints beyond the cap)",
+                                         OVERFLOW_FINGERPRINT, self.samples_per_fingerprint)
+                stats.read_only = False
+                self._stats[OVERFLOW_FINGERPRINT] = stats
+            return stats
+        label = OVERFLOW_FINGERPRINT
+        if self._labelled < self.metric_fingerprints:
+            label = fingerprint
+            self._labelled += 1
+        stats = FingerprintStats(fingerprint, normalized, label, self.samples_per_fingerprint)
+        self._stats[fingerprint] = stats
+        return stats
+
+    def record(self, op: str, query: str, duration_s: float, *, rows: int | None = None,
+               pool_wait_s: float = 0.0, error: bool = False,
+               params: tuple | None = None) -> FingerprintStats | None:
+        """Account one adapter call. Never raises into the query path."""
+        if not self.enabled:
+            return None
+        try:
+            stats = self._entry(query)
+            ms = duration_s * 1000
+            stats.count += 1
+            stats.ops[op] = stats.ops.get(op, 0) + 1
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+            stats.samples.append(ms)
+            stats.pool_wait_ms += pool_wait_s * 1000
+            if rows:
+                stats.rows += rows
+            if error:
+                stats.errors += 1
+            elif (self.explain_enabled and stats.read_only and ms >= self.explain_min_ms
+                  and (stats.slow_sample is None or ms > stats.slow_sample[2])):
+                stats.slow_sample = (query, tuple(params or ()), ms)
+            for observer in self._observers:
+                observer(stats.metric_label, op, duration_s, pool_wait_s, error)
+            return stats
+        except Exception:
+            logger.debug("query profiler record failed", exc_info=True)
+            return None
+
+    def should_capture_plan(self, stats: FingerprintStats | None) -> bool:
+        """Automatic sampling: one EXPLAIN per fingerprint, at most one per interval."""
+        if stats is None or stats.slow_sample is None or stats.plan is not None:
+            return False
+        now = time.monotonic()
+        if self._last_plan_at is not None and now - self._last_plan_at < self.explain_interval_s:
+            return False
+        self._last_plan_at = now
+        return True
+
+    def explain_candidates(self, limit: int,
+                           fingerprints: list[str] | None = None) -> list[FingerprintStats]:
+        """Sampled fingerprints (optionally only *fingerprints*), slowest p95 first."""
+        sampled = [s for s in self._stats.values() if s.slow_sample is not None
+                   and (fingerprints is None or s.fingerprint in fingerprints)]
+        sampled.sort(key=lambda s: _percentile(sorted(s.samples), 95), reverse=True)
+        return sampled[:max(0, limit)]
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> list[dict]:
+        rows = [stats.to_dict() for stats in self._stats.values()]
+        if rows and order_by not in rows[0]:
+            order_by = "total_ms"
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:max(0, limit)]
+
+    def plans(self) -> list[dict]:
+        return [
+            {"fingerprint": s.fingerprint, "statement": s.statement[:300],
+             "sample_ms": round(s.slow_sample[2], 1) if s.slow_sample else None,
+             "captured_at": s.plan_captured_at, "plan": s.plan}
+            for s in self._stats.values() if s.plan is not None
+        ]
+
+    def snapshot(self, limit: int = 20, order_by: str = "total_ms") -> dict:
+        total_ms = sum(s.total_ms for s in self._stats.values())
+        return {
+            "enabled": self.enabled,
+            "since": self.since.isoformat(),
+            "fingerprints": len(self._stats),
+            "queries": sum(s.count for s in self._stats.values()),
+            "total_ms": round(total_ms, 1),
+            "explain_sampling_ms": self.explain_min_ms or None,
+            "top": self.top(limit, order_by),
+        }
@@ -5,12 +5,14 @@
 This package contains all automation-related services:
 - Health monitoring
 - SSH file monitoring
+- File discovery (one claimed stream for push, webhook and poll)
 - Database maintenance
 - Error recovery
 - Logging and metrics
 """
 
 from .database_maintenance import DatabaseMaintenance
+from .file_discovery import FileDiscoveryService
 from .health_monitor import HealthMonitor
 from .metrics_logger import MetricsLogger
 from .ssh_monitor import SSHMonitor
@@ -20,4 +22,5 @@ __all__ = [
     'SSHMonitor',
     'DatabaseMaintenance',
     'MetricsLogger',
+    'FileDiscoveryService',
 ]
@@ -0,0 +1,296 @@
+"""
+File Discovery Service - one deduplicated new-file stream for every source
+
+Stats files are announced to the bot three ways:
+- ws:      StatsWebSocketClient push (VPS inotify → WebSocket)
+- webhook: the VPS / Lua Discord webhook trigger
+- poll:    the SSH listing diff (endstats_monitor, SSHMonitor)
+
+Each path used to decide on its own whether a filename was new, so a file
+could be fetched twice when two paths raced, and a push that arrived while
+the WebSocket was down was only caught by the slow SSH fallback. This service
+is the one place all of them report to:
+
+- announce(): the first source to report a filename claims it; another source
+  reporting it later is told to skip, and how far it lagged is recorded.
+  A claim is dropped with forget() when its import fails, so the next
+  sighting (usually the poll) retries it.
+- submit(): announce() plus delivery to the stream consumer, for the sources
+  that have no import path of their own (the WebSocket push, and resync).
+- resync(): after a reconnect, one remote listing; every unclaimed primary
+  stats file at or after the source's watermark is delivered as recovered.
+  The push protocol carries no sequence numbers, but filenames do the same
+  job: YYYY-MM-DD-HHMMSS-... sorts in the order the server wrote them, so a
+  source's watermark is the newest filename timestamp it reported.
+- poll_cadence(): how often to list the remote directory, from the players
+  in voice, how recently a file was discovered, and whether push is healthy.
+- get_status(): per-source counts and discovery latency, measured from the
+  timestamp in the filename (game-server local time) to the sighting.
+
+Usage:
+    discovery = FileDiscoveryService(list_remote, on_new_file=handler)
+    await discovery.submit(filename, "ws")           # push notification
+    if await discovery.announce(filename, "poll"):   # a path that imports
+        ...                                          # itself; forget() on failure
+"""
+
+import logging
+import statistics
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, NamedTuple
+
+from bot.automation.file_tracker import is_primary_stats_filename
+
+logger = logging.getLogger("bot.automation.file_discovery")
+
+DISCOVERY_SOURCES = ("ws", "webhook", "poll", "resync")
+_STAMP_FORMAT = "%Y-%m-%d-%H%M%S"
+_STAMP_LEN = 17  # len("YYYY-MM-DD-HHMMSS")
+
+
+def filename_timestamp(filename: str) -> datetime | None:
+    """The YYYY-MM-DD-HHMMSS prefix of a stats filename, or None."""
+    try:
+        return datetime.strptime(filename[:_STAMP_LEN], _STAMP_FORMAT)  # noqa: DTZ007 local-naive convention for CET-time filename and match_id parsing
+    except ValueError:
+        return None
+
+
+class PollCadence(NamedTuple):
+    """Seconds until the next remote listing, and why."""
+    seconds: int
+    mode: str
+
+
+class SourceStats:
+    """What one discovery source has reported."""
+
+    def __init__(self, samples: int = 100):
+        self.announced = 0      # distinct files this source reported
+        self.first = 0          # ... of which it was the first to report
+        self.late = 0           # ... of which another source had claimed
+        self.recovered = 0      # files found by resync after this source reconnected
+        self.reconnects = 0
+        self.watermark: str | None = None  # newest YYYY-MM-DD-HHMMSS reported
+        self.last_seen: datetime | None = None
+        self.latencies: deque[float] = deque(maxlen=samples)  # filename stamp → sighting
+        self.lags: deque[float] = deque(maxlen=samples)       # first sighting → this one
+
+    def summary(self) -> dict:
+        def _stats(samples):
+            if not samples:
+                return None
+            ordered = sorted(samples)
+            return {
+                'median_s': round(statistics.median(ordered), 1),
+                'p95_s': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                'max_s': round(ordered[-1], 1),
+            }
+
+        return {
+            'announced': self.announced,
+            'first': self.first,
+            'late': self.late,
+            'recovered': self.recovered,
+            'reconnects': self.reconnects,
+            'watermark': self.watermark,
+            'last_seen': self.last_seen.isoformat() if self.last_seen else None,
+            'latency': _stats(self.latencies),
+            'lag_behind_first': _stats(self.lags),
+        }
+
+
+class FileDiscoveryService:
+    """
+    Merges push, webhook and poll sightings into one claimed stream.
+
+    This is a SERVICE class - it downloads and imports nothing. It decides who
+    handles a file and hands push/resync files to ``on_new_file``.
+    """
+
+    def __init__(
+        self,
+        list_remote: Callable[[], Awaitable[list[str]]],
+        on_new_file: Callable[[str], Awaitable[bool | None]] | None = None,
+        *,
+        base_interval: int = 60,
+        idle_interval: int = 600,
+        active_players: int = 6,
+        grace_minutes: int = 45,
+        resync_lookback_hours: int = 6,
+        max_tracked: int = 5000,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Initialize the discovery service.
+
+        Args:
+            list_remote: Async callable returning the remote directory listing
+            on_new_file: Async consumer for submitted/recovered files. Returning
+                         False (or raising) releases the claim for a retry.
+            base_interval: Poll cadence while a session is live (seconds)
+            idle_interval: Poll cadence with nobody around, or push healthy
+            active_players: Players in voice that count as a live session
+            grace_minutes: Keep the base cadence this long after a discovery
+            resync_lookback_hours: How far back a resync looks for a source
+                                   that has not reported anything yet
+            max_tracked: Claims remembered (oldest dropped first)
+            clock: "Now" in the zone the filenames are stamped in, naive
+                   local by default; injectable for tests
+        """
+        self.list_remote = list_remote
+        self.on_new_file = on_new_file
+        self.base_interval = base_interval
+        self.idle_interval = idle_interval
+        self.active_players = active_players
+        self.grace = timedelta(minutes=grace_minutes)
+        self.resync_lookback = timedelta(hours=resync_lookback_hours)
+        self.max_tracked = max_tracked
+        self._clock = clock
+
+        # filename -> {source: first sighting}; the first key is the claim
+        self._sightings: OrderedDict[str, dict[str, datetime]] = OrderedDict()
+        self.sources: dict[str, SourceStats] = {s: SourceStats() for s in DISCOVERY_SOURCES}
+        self.last_discovery: datetime | None = None
+
+    def claimed_by(self, filename: str) -> str | None:
+        """The source that claimed *filename*, if any."""
+        seen = self._sightings.get(filename)
+        return next(iter(seen)) if seen else None
+
+    async def announce(self, filename: str, source: str) -> bool:
+        """
+        Record a sighting of *filename* from *source*.
+
+        Returns:
+            True if *source* should handle the file: nobody had claimed it, or
+            *source* itself had (a retry). False if another source owns it.
+        """
+        now = self._clock()
+        stats = self.sources.setdefault(source, SourceStats())
+        seen = self._sightings.get(filename)
+        if seen is None:
+            seen = self._sightings[filename] = {}
+            while len(self._sightings) > self.max_tracked:
+                self._sightings.popitem(last=False)
+
+        if source not in seen:
+            stats.announced += 1
+            stats.last_seen = now
+            stamp = filename_timestamp(filename)
+            if stamp is not None:
+                # the stamp is a wall clock in the clock's zone
+                stamp = stamp.replace(tzinfo=now.tzinfo)
+                stats.latencies.append((now - stamp).total_seconds())
+                key = filename[:_STAMP_LEN]
+                if stats.watermark is None or key > stats.watermark:
+                    stats.watermark = key
+            if seen:
+                stats.late += 1
+                stats.lags.append((now - next(iter(seen.values()))).total_seconds())
+            else:
+                stats.first += 1
+                self.last_discovery = now
+            seen[source] = now
+
+        owner = next(iter(seen))
+        if owner != source:
+            logger.debug(f"⏭️ {filename} already claimed by {owner} (seen via {source})")
+        return owner == source
+
+    def forget(self, filename: str) -> None:
+        """Release the claim on *filename* so the next sighting can retry it."""
+        self._sightings.pop(filename, None)
+
+    async def submit(self, filename: str, source: str) -> bool:
+        """
+        announce() and, if *source* wins, deliver to the stream consumer.
+
+        Returns:
+            True if the file was delivered and the consumer did not fail
+        """
+        if not await self.announce(filename, source):
+            return False
+        if self.on_new_file is None:
+            return True
+        try:
+            ok = await self.on_new_file(filename)
+        except Exception as e:
+            logger.error(f"❌ Discovery consumer failed for {filename} ({source}): {e}", exc_info=True)
+            ok = False
+        if ok is False:
+            self.forget(filename)
+            return False
+        return True
+
+    async def resync(self, source: str) -> list[str]:
+        """
+        Recover what *source* may have missed while it was disconnected.
+
+        Lists the remote directory once and delivers every unclaimed primary
+        stats file stamped at or after the source's watermark (or within
+        ``resync_lookback_hours`` if it has reported nothing yet).
+
+        Returns:
+            The filenames delivered, oldest first
+        """
+        stats = self.sources.setdefault(source, SourceStats())
+        stats.reconnects += 1
+        try:
+            listing = await self.list_remote()
+        except Exception as e:
+            logger.warning(f"⚠️ Resync listing for {source} failed: {e} — poll will catch up")
+            return []
+
+        floor = stats.watermark or (self._clock() - self.resync_lookback).strftime(_STAMP_FORMAT)
+        missed = sorted(
+            name for name in listing or []
+            if name[:_STAMP_LEN] >= floor
+            and name not in self._sightings
+            and is_primary_stats_filename(name)
+        )
+        if not missed:
+            logger.debug(f"🔁 Resync after {source} reconnect: nothing missed since {floor}")
+            return []
+
+        logger.info(f"🔁 Resync after {source} reconnect: {len(missed)} file(s) since {floor}")
+        delivered = [name for name in missed if await self.submit(name, "resync")]
+        stats.recovered += len(delivered)
+        return delivered
+
+    def poll_cadence(self, voice_count: int, push_healthy: bool = False) -> PollCadence:
+        """
+        How long to wait before the next remote listing.
+
+        Args:
+            voice_count: Players in the gaming voice channels, -1 if unknown
+            push_healthy: A push source is connected and delivering
+
+        Returns:
+            PollCadence: base while a session is live, idle otherwise
+        """
+        if voice_count >= self.active_players:
+            return PollCadence(self.base_interval, "ACTIVE (players)")
+        if self.last_discovery and self._clock() - self.last_discovery < self.grace:
+            return PollCadence(self.base_interval, "ACTIVE (grace period)")
+        if push_healthy:
+            return PollCadence(self.idle_interval, "IDLE (push healthy)")
+        if voice_count < 0:
+            return PollCadence(self.base_interval, "ACTIVE (voice unknown)")
+        if voice_count > 0:
+            warm = min(self.idle_interval, self.base_interval * 3)
+            return PollCadence(warm, f"WARM ({voice_count} in voice)")
+        return PollCadence(self.idle_interval, "IDLE")
+
+    def get_status(self) -> dict:
+        """Per-source discovery counts, watermarks and latency."""
+        return {
+            'tracked': len(self._sightings),
+            'last_discovery': self.last_discovery.isoformat() if self.last_discovery else None,
+            'sources': {
+                name: stats.summary()
+                for name, stats in self.sources.items()
+                if stats.announced or stats.reconnects
+            },
+        }
@@ -11,13 +11,21 @@ Features:
 - Records errors with context
 - Generates analysis reports
 - Exports metrics to JSON/CSV
+
+Writes are buffered: ``log_*`` only appends to a bounded in-memory queue,
+and a background flusher writes the queue every ``flush_interval_ms`` (or
+as soon as ``flush_batch_size`` rows are waiting) with ``executemany`` in a
+single transaction, so logging never waits on SQLite's fsync. The same
+transaction folds the batch into per-minute rollup tables, which is what
+``generate_report`` reads instead of scanning the raw tables. When the
+queue is full the oldest pending rows are dropped and counted.
 """
 
 import asyncio
 import json
 import logging
 import os
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -25,6 +33,64 @@ import aiosqlite
 
 logger = logging.getLogger("MetricsLogger")
 
+DEFAULT_FLUSH_INTERVAL_MS = 500
+DEFAULT_FLUSH_BATCH_SIZE = 200
+DEFAULT_MAX_PENDING_WRITES = 10_000
+
+# Pending-write kinds → raw table INSERT
+_INSERT_SQL = {
+    'event': """
+        INSERT INTO events (timestamp, event_type, event_data, duration_ms, success)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'error': """
+        INSERT INTO errors (timestamp, error_type, error_message, stack_trace, context)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'performance': """
+        INSERT INTO performance (timestamp, metric_name, metric_value, unit)
+        VALUES (?, ?, ?, ?)
+    """,
+    'health': """
+        INSERT INTO health_checks
+        (timestamp, status, uptime_seconds, error_count, ssh_status, db_size_mb, memory_mb, cpu_percent)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+_EVENT_ROLLUP_UPSERT = """
+    INSERT INTO event_rollups (bucket, event_type, count, success_count, duration_sum, duration_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (bucket, event_type) DO UPDATE SET
+        count = count + excluded.count,
+        success_count = success_count + excluded.success_count,
+        duration_sum = duration_sum + excluded.duration_sum,
+        duration_count = duration_count + excluded.duration_count
+"""
+
+_ERROR_ROLLUP_UPSERT = """
+    INSERT INTO error_rollups (bucket, error_type, count, last_occurrence)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (bucket, error_type) DO UPDATE SET
+        count = count + excluded.count,
+        last_occurrence = MAX(last_occurrence, excluded.last_occurrence)
+"""
+
+_PERFORMANCE_ROLLUP_UPSERT = """
+    INSERT INTO performance_rollups (bucket, metric_name, unit, count, value_sum, value_min, value_max)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (bucket, metric_name, unit) DO UPDATE SET
+        count = count + excluded.count,
+        value_sum = value_sum + excluded.value_sum,
+        value_min = MIN(value_min, excluded.value_min),
+        value_max = MAX(value_max, excluded.value_max)
+"""
+
+
+def _bucket(timestamp: str) -> str:
+    """Rollup bucket for an ISO timestamp: 'YYYY-MM-DDTHH:MM' (one minute)."""
+    return timestamp[:16]
+
 
 class MetricsLogger:
     """
@@ -38,22 +104,28 @@ class MetricsLogger:
     - Bot uptime and availability
     """
 
-    def __init__(self, db_path: str, log_dir: str = "logs/metrics"):
+    def __init__(self, db_path: str, log_dir: str = "logs/metrics",
+                 flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+                 flush_batch_size: int = DEFAULT_FLUSH_BATCH_SIZE,
+                 max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES):
         """
         Initialize metrics logger.
 
         Args:
             db_path: Path to metrics SQLite database
             log_dir: Directory for metrics logs
+            flush_interval_ms: Longest a logged row waits before it is written
+            flush_batch_size: Pending rows that trigger an early flush
+            max_pending_writes: Write queue bound; the oldest rows drop beyond it
         """
         self.db_path = db_path
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
 
-        # In-memory metrics (for fast access)
-        self.events: list[dict[str, Any]] = []
-        self.errors: list[dict[str, Any]] = []
-        self.performance: list[dict[str, Any]] = []
+        # In-memory metrics (for fast access; oldest entries fall off)
+        self.events: deque[dict[str, Any]] = deque(maxlen=1000)
+        self.errors: deque[dict[str, Any]] = deque(maxlen=500)
+        self.performance: deque[dict[str, Any]] = deque(maxlen=1000)
 
         # Counters
         self.event_counts = defaultdict(int)
@@ -74,6 +146,16 @@ class MetricsLogger:
         self._db_lock = asyncio.Lock()
         self._db_connection: aiosqlite.Connection | None = None
 
+        # Buffered writes: (kind, row) waiting for the background flusher
+        self.flush_interval_s = max(flush_interval_ms, 1) / 1000
+        self.flush_batch_size = max(flush_batch_size, 1)
+        self._pending: deque[tuple[str, tuple]] = deque(maxlen=max(max_pending_writes, 1))
+        self._flush_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+        self._closing = False
+        self.write_stats = defaultdict(int)  # flushed / dropped / flush_failures / batches
+
         logger.info(
             f"📊 Metrics Logger initialized: log_dir={self.log_dir}, db={self.metrics_db_path}"
         )
@@ -133,6 +215,42 @@ class MetricsLogger:
                     )
                 """)
 
+                # Per-minute rollups maintained by the flusher; generate_report
+                # reads these instead of scanning the raw tables.
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS event_rollups (
+                        bucket TEXT NOT NULL,
+                        event_type TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        success_count INTEGER NOT NULL,
+                        duration_sum REAL NOT NULL,
+                        duration_count INTEGER NOT NULL,
+                        PRIMARY KEY (bucket, event_type)
+                    )
+                """)
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS error_rollups (
+                        bucket TEXT NOT NULL,
+                        error_type TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        last_occurrence TEXT NOT NULL,
+                        PRIMARY KEY (bucket, error_type)
+                    )
+                """)
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS performance_rollups (
+                        bucket TEXT NOT NULL,
+                        metric_name TEXT NOT NULL,
+                        unit TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        value_sum REAL NOT NULL,
+                        value_min REAL NOT NULL,
+                        value_max REAL NOT NULL,
+                        PRIMARY KEY (bucket, metric_name, unit)
+                    )
+                """)
+                await self._backfill_rollups(db)
+
                 await db.commit()
             self._is_initialized = True
             logger.info("✅ Metrics database initialized")
@@ -155,14 +273,143 @@ class MetricsLogger:
         self._db_connection = await aiosqlite.connect(self.metrics_db_path)
         return self._db_connection
 
-    async def _execute_write(self, query: str, params: tuple) -> None:
+    async def _backfill_rollups(self, db: aiosqlite.Connection) -> None:
+        """Seed empty rollup tables from raw rows logged before rollups existed."""
+        cursor = await db.execute("SELECT EXISTS (SELECT 1 FROM event_rollups)")
+        if (await cursor.fetchone())[0]:
+            return
+        await db.execute("""
+            INSERT OR IGNORE INTO event_rollups
+            SELECT substr(timestamp, 1, 16), event_type, COUNT(*),
+                   SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END),
+                   COALESCE(SUM(duration_ms), 0), COUNT(duration_ms)
+            FROM events GROUP BY 1, 2
+        """)
+        await db.execute("""
+            INSERT OR IGNORE INTO error_rollups
+            SELECT substr(timestamp, 1, 16), error_type, COUNT(*), MAX(timestamp)
+            FROM errors GROUP BY 1, 2
+        """)
+        await db.execute("""
+            INSERT OR IGNORE INTO performance_rollups
+            SELECT substr(timestamp, 1, 16), metric_name, COALESCE(unit, ''), COUNT(*),
+                   SUM(metric_value), MIN(metric_value), MAX(metric_value)
+            FROM performance GROUP BY 1, 2, 3
+        """)
+
+    # ------------------------------------------------------------------
+    # Buffered writes
+    # ------------------------------------------------------------------
+
+    def _enqueue_write(self, kind: str, row: tuple) -> None:
+        """Queue one raw row for the flusher; never touches the database."""
+        if len(self._pending) == self._pending.maxlen:
+            self.write_stats['dropped'] += 1  # deque evicts the oldest row
+        self._pending.append((kind, row))
+        if len(self._pending) >= self.flush_batch_size:
+            self._flush_wakeup.set()
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        if self._closing or (self._flush_task is not None and not self._flush_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop yet; the next log call (or close) flushes
+        self._flush_task = loop.create_task(self._flush_loop(), name="metrics_logger_flush")
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=self.flush_interval_s)
+            except (asyncio.TimeoutError, TimeoutError):  # noqa: UP041 — Py 3.10 compat
+                pass
+            self._flush_wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything queued so far in one transaction. Returns rows written.
+
+        A failed batch is dropped and counted (metrics are best-effort); the
+        error is logged and never propagates to the caller.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch = list(self._pending)
+            self._pending.clear()
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                self.write_stats['flush_failures'] += 1
+                self.write_stats['dropped'] += len(batch)
+                logger.error(f"❌ Failed to flush {len(batch)} metrics rows: {e}")
+                return 0
+            self.write_stats['flushed'] += len(batch)
+            self.write_stats['batches'] += 1
+            return len(batch)
+
+    async def _write_batch(self, batch: list[tuple[str, tuple]]) -> None:
+        rows: dict[str, list[tuple]] = defaultdict(list)
+        for kind, row in batch:
+            rows[kind].append(row)
+
+        # Fold the batch into per-minute rollups before touching SQLite
+        event_rollups: dict[tuple, list] = {}
+        for timestamp, event_type, _data, duration_ms, success in rows['event']:
+            agg = event_rollups.setdefault((_bucket(timestamp), event_type), [0, 0, 0.0, 0])
+            agg[0] += 1
+            agg[1] += success
+            if duration_ms is not None:
+                agg[2] += duration_ms
+                agg[3] += 1
+        error_rollups: dict[tuple, list] = {}
+        for timestamp, error_type, *_rest in rows['error']:
+            agg = error_rollups.setdefault((_bucket(timestamp), error_type), [0, timestamp])
+            agg[0] += 1
+            agg[1] = max(agg[1], timestamp)
+        performance_rollups: dict[tuple, list] = {}
+        for timestamp, metric_name, value, unit in rows['performance']:
+            key = (_bucket(timestamp), metric_name, unit or '')
+            agg = performance_rollups.setdefault(key, [0, 0.0, value, value])
+            agg[0] += 1
+            agg[1] += value
+            agg[2] = min(agg[2], value)
+            agg[3] = max(agg[3], value)
+
         await self._ensure_initialized()
         db = await self._get_db_connection()
         async with self._db_lock:
-            await db.execute(query, params)
-            await db.commit()
+            try:
+                for kind, kind_rows in rows.items():
+                    if kind_rows:
+                        await db.executemany(_INSERT_SQL[kind], kind_rows)
+                if event_rollups:
+                    await db.executemany(_EVENT_ROLLUP_UPSERT,
+                                         [(*key, *agg) for key, agg in event_rollups.items()])
+                if error_rollups:
+                    await db.executemany(_ERROR_ROLLUP_UPSERT,
+                                         [(*key, *agg) for key, agg in error_rollups.items()])
+                if performance_rollups:
+                    await db.executemany(_PERFORMANCE_ROLLUP_UPSERT,
+                                         [(*key, *agg) for key, agg in performance_rollups.items()])
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
 
     async def close(self) -> None:
+        """Stop the flusher, write what is still queued, close the connection."""
+        self._closing = True
+        self._flush_wakeup.set()
+        if self._flush_task is not None:
+            try:
+                await self._flush_task
+            except Exception as e:
+                logger.error(f"❌ Metrics flusher failed during close: {e}")
+            self._flush_task = None
+        await self.flush()
         if self._db_connection is None:
             return
         async with self._db_lock:
@@ -196,16 +443,9 @@ class MetricsLogger:
             self.events.append(event)
             self.event_counts[event_type] += 1
 
-            # Keep only last 1000 events in memory
-            if len(self.events) > 1000:
-                self.events.pop(0)
-
-            # Store in database
-            await self._execute_write(
-                """
-                    INSERT INTO events (timestamp, event_type, event_data, duration_ms, success)
-                    VALUES (?, ?, ?, ?, ?)
-                """,
+            # Queue for the database (written by the background flusher)
+            self._enqueue_write(
+                'event',
                 (
                     timestamp,
                     event_type,
@@ -245,16 +485,9 @@ class MetricsLogger:
             self.errors.append(error)
             self.error_counts[error_type] += 1
 
-            # Keep only last 500 errors in memory
-            if len(self.errors) > 500:
-                self.errors.pop(0)
-
-            # Store in database
-            await self._execute_write(
-                """
-                    INSERT INTO errors (timestamp, error_type, error_message, stack_trace, context)
-                    VALUES (?, ?, ?, ?, ?)
-                """,
+            # Queue for the database (written by the background flusher)
+            self._enqueue_write(
+                'error',
                 (
                     timestamp,
                     error_type,
@@ -290,18 +523,8 @@ class MetricsLogger:
             }
             self.performance.append(metric)
 
-            # Keep only last 1000 metrics in memory
-            if len(self.performance) > 1000:
-                self.performance.pop(0)
-
-            # Store in database
-            await self._execute_write(
-                """
-                    INSERT INTO performance (timestamp, metric_name, metric_value, unit)
-                    VALUES (?, ?, ?, ?)
-                """,
-                (timestamp, metric_name, value, unit),
-            )
+            # Queue for the database (written by the background flusher)
+            self._enqueue_write('performance', (timestamp, metric_name, value, unit))
 
             logger.debug(f"📊 Performance logged: {metric_name} = {value} {unit}")
 
@@ -325,12 +548,8 @@ class MetricsLogger:
         try:
             timestamp = datetime.now().isoformat()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
 
-            await self._execute_write(
-                """
-                    INSERT INTO health_checks
-                    (timestamp, status, uptime_seconds, error_count, ssh_status, db_size_mb, memory_mb, cpu_percent)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            self._enqueue_write(
+                'health',
                 (timestamp, status, uptime_seconds, error_count, ssh_status, db_size_mb, memory_mb, cpu_percent),
             )
 
@@ -349,11 +568,14 @@ class MetricsLogger:
         Returns:
             Dictionary with analysis results
         """
+        # Rows still in the write queue belong in the report too
+        await self.flush()
         for attempt in range(2):
             try:
                 await self._ensure_initialized()
                 cutoff_time = datetime.now() - timedelta(hours=hours)  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
                 cutoff_str = cutoff_time.isoformat()
+                cutoff_bucket = _bucket(cutoff_str)
                 db = await self._get_db_connection()
 
                 report = {
@@ -367,13 +589,15 @@ class MetricsLogger:
                 }
 
                 async with self._db_lock:
-                    # Event summary
+                    # Event summary (from per-minute rollups)
                     cursor = await db.execute("""
-                        SELECT event_type, COUNT(*), AVG(duration_ms), SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END)
-                        FROM events
-                        WHERE timestamp > ?
+                        SELECT event_type, SUM(count),
+                               SUM(duration_sum) / NULLIF(SUM(duration_count), 0),
+                               SUM(success_count)
+                        FROM event_rollups
+                        WHERE bucket >= ?
                         GROUP BY event_type
-                    """, (cutoff_str,))
+                    """, (cutoff_bucket,))
 
                     events = await cursor.fetchall()
                     report['events'] = {
@@ -388,11 +612,11 @@ class MetricsLogger:
 
                     # Error summary
                     cursor = await db.execute("""
-                        SELECT error_type, COUNT(*), MAX(timestamp)
-                        FROM errors
-                        WHERE timestamp > ?
+                        SELECT error_type, SUM(count), MAX(last_occurrence)
+                        FROM error_rollups
+                        WHERE bucket >= ?
                         GROUP BY error_type
-                    """, (cutoff_str,))
+                    """, (cutoff_bucket,))
 
                     errors = await cursor.fetchall()
                     report['errors'] = {
@@ -405,11 +629,11 @@ class MetricsLogger:
 
                     # Performance metrics
                     cursor = await db.execute("""
-                        SELECT metric_name, AVG(metric_value), MIN(metric_value), MAX(metric_value), unit
-                        FROM performance
-                        WHERE timestamp > ?
+                        SELECT metric_name, SUM(value_sum) / SUM(count), MIN(value_min), MAX(value_max), unit
+                        FROM performance_rollups
+                        WHERE bucket >= ?
                         GROUP BY metric_name, unit
-                    """, (cutoff_str,))
+                    """, (cutoff_bucket,))
 
                     perf = await cursor.fetchall()
                     report['performance'] = {
@@ -521,4 +745,6 @@ class MetricsLogger:
             'error_types': len(self.error_counts),
             'most_common_event': max(self.event_counts.items(), key=lambda x: x[1])[0] if self.event_counts else None,
             'most_common_error': max(self.error_counts.items(), key=lambda x: x[1])[0] if self.error_counts else None,
+            'pending_writes': len(self._pending),
+            'dropped_writes': self.write_stats['dropped'],
         }
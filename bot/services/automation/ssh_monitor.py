@@ -28,6 +28,8 @@ from typing import Any
 
 import discord
 
+from bot.services.automation.file_discovery import FileDiscoveryService
+
 # Import services for comprehensive stats display
 from bot.services.player_badge_service import PlayerBadgeService
 from bot.services.player_display_name_service import PlayerDisplayNameService
@@ -188,6 +190,35 @@ class SSHMonitor:
             logger.debug(f"Could not get voice player count: {e}")
             return -1  # Error means we should check anyway
 
+    @property
+    def _discovery(self) -> FileDiscoveryService | None:
+        """The bot's shared FileDiscoveryService, if it has one."""
+        discovery = getattr(self.bot, 'file_discovery', None)
+        return discovery if isinstance(discovery, FileDiscoveryService) else None
+
+    def _push_healthy(self) -> bool:
+        """The bot's view of WebSocket push health; False if it has none."""
+        check = getattr(self.bot, 'push_healthy', None)
+        if not callable(check):
+            return False
+        try:
+            return check() is True
+        except Exception as e:
+            logger.debug(f"Could not read push health: {e}")
+            return False
+
+    def _next_check_delay(self, voice_count: int) -> int:
+        """
+        Seconds until the next check.
+
+        Follows the shared discovery cadence (session activity, recent files,
+        push health) when the bot has one; otherwise the fixed
+        SSH_CHECK_INTERVAL.
+        """
+        if self._discovery is None:
+            return self.check_interval
+        return self._discovery.poll_cadence(voice_count, push_healthy=self._push_healthy()).seconds
+
     def _detect_match_type(self) -> str:
         """
         Detect if match is 3v3, 6v6, or regular based on voice channel player counts.
@@ -227,11 +258,10 @@ class SSHMonitor:
         while self.is_monitoring:
             try:
                 start_time = datetime.now()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
+                voice_count = self._get_voice_player_count()
 
                 # Voice-conditional check: only check SSH if players are in voice
                 if self.voice_conditional:
-                    voice_count = self._get_voice_player_count()
-
                     if voice_count > 0:
                         # Players in voice - update activity time and check SSH
                         self.last_voice_activity_time = datetime.now()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
@@ -271,7 +301,7 @@ class SSHMonitor:
                 self.last_check_time = datetime.now()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
 
                 # Wait before next check
-                await asyncio.sleep(self.check_interval)
+                await asyncio.sleep(self._next_check_delay(voice_count))
 
             except Exception as e:
                 self.errors_count += 1
@@ -355,8 +385,10 @@ class SSHMonitor:
                     self._is_first_check = False
                 stats_files = time_filtered_files
 
-            # Find new files (not in processed set)
+            # Find new files (not in processed set, not claimed by a push source)
             new_files = [f for f in stats_files if f not in self.processed_files]
+            if self._discovery is not None:
+                new_files = [f for f in new_files if await self._discovery.announce(f, "poll")]
 
             if new_files:
                 logger.info(f"🆕 Found {len(new_files)} new file(s)")
@@ -438,6 +470,8 @@ class SSHMonitor:
 
             if not local_path:
                 logger.error(f"❌ Failed to download: {filename}")
+                if self._discovery is not None:
+                    self._discovery.forget(filename)
                 return
 
             # Wait a moment for file to fully write
@@ -448,6 +482,8 @@ class SSHMonitor:
 
             if not success:
                 logger.error(f"❌ Failed to import: {filename}")
+                if self._discovery is not None:
+                    self._discovery.forget(filename)
                 return
 
             # NOTE: Discord posting is handled by endstats_monitor + RoundPublisherService
@@ -51,7 +51,8 @@ class StatsWebSocketClient:
     def __init__(
         self,
         config,
-        on_new_file: Callable[[str], Awaitable[None]]
+        on_new_file: Callable[[str], Awaitable[None]],
+        on_connect: Callable[[], Awaitable[None]] | None = None,
     ):
         """
         Initialize WebSocket client.
@@ -60,9 +61,13 @@ class StatsWebSocketClient:
             config: BotConfig instance with WS_* settings
             on_new_file: Async callback when new file notification received.
                          Takes filename as argument.
+            on_connect: Optional async callback after every (re)connection is
+                        authenticated - the hook for recovering files pushed
+                        while disconnected (FileDiscoveryService.resync).
         """
         self.config = config
         self.on_new_file = on_new_file
+        self.on_connect = on_connect
 
         # Connection state
         self._ws: WebSocketClientProtocol | None = None
@@ -160,6 +165,13 @@ class StatsWebSocketClient:
 
                     logger.info(f"✅ Connected to VPS WebSocket (reconnects: {self.reconnect_count})")
 
+                    # Push has no replay: catch up on anything sent while down
+                    if self.on_connect:
+                        try:
+                            await self.on_connect()
+                        except Exception as e:
+                            logger.error(f"❌ Error in WebSocket reconnect hook: {e}", exc_info=True)
+
                     # Listen for file notifications
                     async for message in ws:
                         await self._handle_message(message)
@@ -45,6 +45,33 @@ logger = get_logger("bot.core")
 class _MonitorTasksMixin:
     """Discord.ext.tasks background loops for UltimateETLegacyBot."""
 
+    def push_healthy(self) -> bool:
+        """
+        True while the WebSocket push is connected and has delivered within
+        the last 5 minutes.
+
+        Both SSH pollers (endstats_monitor and SSHMonitor) pass this to
+        FileDiscoveryService.poll_cadence, which slows them to idle while it
+        holds.
+        """
+        # WebSocket support is DEPRECATED (Dec 2025) - Discord Webhook approach replaces it
+        # Keeping this check for backwards compatibility only
+        # VPS now uses stats_webhook_notify.py to POST directly to Discord
+        if not (getattr(self, 'ws_client', None) and self.config.ws_enabled):
+            return False
+        ws_active = bool(getattr(self.ws_client, 'is_connected', False))
+        # Also check if we've received data recently (within 5 min)
+        last_notif = getattr(self.ws_client, 'last_notification', None)
+        if ws_active and last_notif:
+            time_since_notif = (datetime.now() - last_notif).total_seconds()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
+            # If no notification in 5 min, WebSocket might be stale
+            if time_since_notif > 300:
+                ws_active = False
+                logger.info(
+                    f"⚠️ WebSocket connected but no data in {time_since_notif:.0f}s - using SSH fallback"
+                )
+        return ws_active
+
     @tasks.loop(seconds=60)
     async def endstats_monitor(self):
         """
@@ -53,13 +80,15 @@ class _MonitorTasksMixin:
         **Performance Optimization with File Loss Prevention:**
         - Dead Hours (02:00-11:00 CET): No SSH checks
         - Active Mode: 6+ players in voice → check every 60s
-        - Grace Period: Within 30min of last file → check every 60s (prevents file loss during player drops)
-        - Idle Mode: No players + no recent files → check every 10min (reduced from 6hr to prevent file loss)
-        - Uses counter-based intervals with grace period logic
+        - Grace Period: Within MONITORING_GRACE_PERIOD_MINUTES of the last discovery → check every 60s
+        - Warm Mode: 1-5 players in voice → check every 3min
+        - Idle Mode: No players + no recent files, or WebSocket push healthy → check every 10min
+        - Uses counter-based intervals; the cadence comes from FileDiscoveryService.poll_cadence
 
         Monitors remote game server for new stats files:
         1. Lists files on remote server via SSH
-        2. Compares with processed_files tracking
+        2. Compares with processed_files tracking, and skips files a push
+           source (webhook / WebSocket) has already claimed
         3. Downloads new files
         4. Parses and imports to database
         5. Posts Discord round summaries automatically
@@ -73,28 +102,10 @@ class _MonitorTasksMixin:
             return
 
         # ========== WEBSOCKET STATUS CHECK ==========
-        # WebSocket support is DEPRECATED (Dec 2025) - Discord Webhook approach replaces it
-        # Keeping this check for backwards compatibility only
-        # VPS now uses stats_webhook_notify.py to POST directly to Discord
-        ws_active = False
-        if hasattr(self, 'ws_client') and self.ws_client and self.config.ws_enabled:
-            ws_active = getattr(self.ws_client, 'is_connected', False)
-            # Also check if we've received data recently (within 5 min)
-            if ws_active and hasattr(self.ws_client, 'last_notification'):
-                last_notif = self.ws_client.last_notification
-                if last_notif:
-                    time_since_notif = (datetime.now() - last_notif).total_seconds()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
-                    # If no notification in 5 min, WebSocket might be stale
-                    if time_since_notif > 300:
-                        ws_active = False
-                        logger.info(
-                            f"⚠️ WebSocket connected but no data in {time_since_notif:.0f}s - using SSH fallback"
-                        )
+        ws_active = self.push_healthy()
 
-        if ws_active:
-            # WebSocket is working - skip SSH polling
-            logger.debug("🔌 WebSocket active - skipping SSH polling this cycle")
-            return
+        # A healthy WebSocket no longer skips polling outright: the poll drops
+        # to the idle cadence and stays the safety net for missed pushes.
 
         try:
             # ========== DEAD HOURS CHECK (bot/core/dead_hours.py) ==========
@@ -138,23 +149,12 @@ class _MonitorTasksMixin:
             # ========== INTERVAL-BASED CHECKING (Counter System with Grace Period) ==========
             self.ssh_check_counter += 1
 
-            # Calculate time since last file was downloaded
-            grace_period_active = False
-            grace_period_seconds = self.config.monitoring_grace_period_minutes * 60
-            if hasattr(self, 'last_file_download_time') and self.last_file_download_time:
-                time_since_last_file = (datetime.now() - self.last_file_download_time).total_seconds()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
-                grace_period_active = time_since_last_file < grace_period_seconds
-
-            if total_players >= 6 or grace_period_active:
-                # ACTIVE MODE: Check every 60 seconds (every 1 cycle)
-                # Triggered by: 6+ players in voice OR within grace period of last file
-                interval = 1
-                mode = "ACTIVE (players)" if total_players >= 6 else "ACTIVE (grace period)"
-            else:
-                # IDLE MODE: Check every 10 minutes (10 cycles at 60s each)
-                # 🔧 REDUCED from 6 hours to 10 minutes to prevent file loss
-                interval = 10
-                mode = "IDLE"
+            # Cadence from FileDiscoveryService: ACTIVE (60s) with 6+ players in
+            # voice or within the grace period of the last discovery, WARM with
+            # fewer players, IDLE (10min) with nobody around or push healthy.
+            cadence = self.file_discovery.poll_cadence(total_players, push_healthy=ws_active)
+            interval = max(1, round(cadence.seconds / 60))  # this loop ticks every 60s
+            mode = cadence.mode
 
             # Only perform SSH check when counter reaches interval
             if self.ssh_check_counter < interval:
@@ -208,16 +208,24 @@ class _MonitorTasksMixin:
 
             logger.debug(f"📂 Found {len(remote_files)} total files on remote server")
 
-            # Check each file
+            # Check each file. Stats files go through the 4-layer check as one
+            # batch (two queries for the whole listing, not two per file).
+            remote_files = sorted(remote_files)
+            new_stats_files = set(await self.file_tracker.filter_new_files(
+                [f for f in remote_files if not f.endswith('-endstats.txt')]
+            ))
             new_files_count = 0
-            for filename in sorted(remote_files):
+            for filename in remote_files:
                 is_endstats = filename.endswith('-endstats.txt')
 
                 if is_endstats:
                     should_process = await self._should_process_endstats_file(filename)
                 else:
-                    # Check if already processed (4-layer check)
-                    should_process = await self.file_tracker.should_process_file(filename)
+                    # Skip files a push source (webhook / WebSocket) already claimed
+                    should_process = (
+                        filename in new_stats_files
+                        and await self.file_discovery.announce(filename, "poll")
+                    )
 
                 if should_process:
                     new_files_count += 1
@@ -286,8 +294,10 @@ class _MonitorTasksMixin:
                                 error_msg = result.get('error', 'Unknown error') if result else 'No result'
                                 logger.warning(f"⚠️ Processing failed for {filename}: {error_msg}")
                                 logger.warning("⚠️ Skipping Discord post")
+                                self.file_discovery.forget(filename)
                     else:
                         logger.error(f"❌ Download failed for {filename}")
+                        self.file_discovery.forget(filename)
 
             # Process Lua gametimes fallback files (JSON) if enabled
             await self._process_remote_gametimes_files()
@@ -0,0 +1,368 @@
+"""
+Post-Session Pipeline - dependency-ordered precompute after a gaming session
+
+Every derived artifact the website shows for a finished session (KIS, s.effort,
+story panels, proximity panels, graph data, the session page) is computed
+lazily on first read. Without a push after session end, the first person to
+open the Story page pays for all of it.
+
+The pipeline runs named stages in dependency order with bounded concurrency:
+a stage starts as soon as everything it depends on is done, so independent
+work overlaps and dependent work never reads a half-built input. Each stage's
+status, attempt count and duration land in the `post_session_jobs` ledger, so
+a bot restart resumes unfinished stages instead of forgetting them.
+
+The ledger is best-effort: if the table is missing or the DB hiccups, stages
+still run — only resumability and the timing record are lost.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger('PostSessionPipeline')
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_BLOCKED = "blocked"  # a dependency failed; never ran
+
+# Default attempts per stage across restarts before it is left failed for
+# good. The KIS coverage reconcile loop stays the safety net for the KIS stage.
+MAX_STAGE_ATTEMPTS = 3
+DEFAULT_MAX_CONCURRENCY = 3
+# Sessions older than this are not resumed: their caches have long been
+# filled by real readers, and a week-old warm helps nobody.
+RESUME_WINDOW_HOURS = 48
+
+_LEDGER_DDL = """
+    CREATE TABLE IF NOT EXISTS post_session_jobs (
+        session_key  TEXT        NOT NULL,
+        stage        TEXT        NOT NULL,
+        status       TEXT        NOT NULL,
+        context      TEXT        NOT NULL,
+        attempts     INTEGER     NOT NULL DEFAULT 0,
+        duration_ms  INTEGER     NULL,
+        error        TEXT        NULL,
+        updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (session_key, stage)
+    )
+"""
+
+
+@dataclass(frozen=True)
+class PostSessionContext:
+    """What every stage needs to know about the finished session."""
+
+    start_date: str
+    session_dates: tuple[str, ...]
+    gaming_session_ids: tuple[int, ...] = ()
+
+    @property
+    def session_key(self) -> str:
+        if self.gaming_session_ids:
+            return "gsid:" + ",".join(str(g) for g in sorted(self.gaming_session_ids))
+        return f"date:{self.start_date}"
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "start_date": self.start_date,
+            "session_dates": list(self.session_dates),
+            "gaming_session_ids": list(self.gaming_session_ids),
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "PostSessionContext":
+        data = json.loads(raw)
+        return cls(
+            start_date=str(data["start_date"]),
+            session_dates=tuple(str(d) for d in data.get("session_dates") or ()),
+            gaming_session_ids=tuple(int(g) for g in data.get("gaming_session_ids") or ()),
+        )
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """One named unit of post-session work.
+
+    `run` returns False for a soft failure (e.g. the website answered non-200)
+    and may raise; either marks the stage failed and blocks its dependents.
+    Returning None or True marks it done.
+
+    `after` orders without depending: the stage waits for those stages to
+    finish but runs whatever their outcome. Use it where a failed predecessor
+    leaves the stage's work stale rather than wrong — a cold page is worse.
+
+    `max_attempts` counts across retries and restarts. A stage whose work
+    must not repeat (a destructive delete whose result later stages refill)
+    declares 1: once it has started, the ledger never runs it again.
+    """
+
+    name: str
+    run: Callable[[PostSessionContext], Awaitable[bool | None]]
+    depends_on: tuple[str, ...] = ()
+    max_attempts: int = MAX_STAGE_ATTEMPTS
+    after: tuple[str, ...] = ()
+
+    @property
+    def waits_for(self) -> tuple[str, ...]:
+        return self.depends_on + self.after
+
+
+@dataclass
+class StageResult:
+    stage: str
+    status: str
+    attempts: int = 0
+    duration_ms: int | None = None
+    error: str | None = None
+
+
+def order_stages(stages: list[PipelineStage]) -> list[PipelineStage]:
+    """Topologically order stages (stable on declaration order).
+
+    Raises ValueError on a duplicate name, an unknown dependency or a cycle —
+    a mis-declared pipeline should fail at bot start, not at session end.
+    """
+    by_name: dict[str, PipelineStage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"duplicate pipeline stage '{stage.name}'")
+        by_name[stage.name] = stage
+    for stage in stages:
+        for dep in stage.waits_for:
+            if dep not in by_name:
+                raise ValueError(f"stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    ordered: list[PipelineStage] = []
+    placed: set[str] = set()
+    remaining = list(stages)
+    while remaining:
+        ready = [s for s in remaining if all(d in placed for d in s.waits_for)]
+        if not ready:
+            cycle = ", ".join(s.name for s in remaining)
+            raise ValueError(f"pipeline stages form a cycle: {cycle}")
+        for stage in ready:
+            ordered.append(stage)
+            placed.add(stage.name)
+        remaining = [s for s in remaining if s.name not in placed]
+    return ordered
+
+
+class PostSessionPipeline:
+    """Runs post-session stages over a persisted job ledger."""
+
+    def __init__(self, db_adapter, stages: list[PipelineStage], *,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.db_adapter = db_adapter
+        self.stages = order_stages(stages)
+        self._by_name = {stage.name: stage for stage in self.stages}
+        self._semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+        self._active: set[str] = set()
+        self._schema_ready = False
+
+    async def start(self, ctx: PostSessionContext) -> dict[str, StageResult]:
+        """Run every stage from scratch for a freshly finalized session.
+
+        A re-finalized session (e.g. the group came back after the end timer)
+        has new rounds, so previously-done stages are reset, not skipped.
+        """
+        await self._reset_ledger(ctx)
+        return await self.run(ctx)
+
+    async def run(self, ctx: PostSessionContext) -> dict[str, StageResult]:
+        """Run the stages the ledger does not already record as done."""
+        key = ctx.session_key
+        if key in self._active:
+            logger.info("Post-session pipeline already running for %s", key)
+            return {}
+        self._active.add(key)
+        try:
+            ledger = await self._load_ledger(key)
+            results: dict[str, StageResult] = {}
+            finished = {stage.name: asyncio.Event() for stage in self.stages}
+
+            async def _drive(stage: PipelineStage) -> None:
+                try:
+                    for dep in stage.waits_for:
+                        await finished[dep].wait()
+                    results[stage.name] = await self._run_stage(
+                        stage, ctx, ledger.get(stage.name), results)
+                finally:
+                    finished[stage.name].set()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(_drive(stage) for stage in self.stages))
+            self._log_summary(key, results, time.perf_counter() - started)
+            return results
+        finally:
+            self._active.discard(key)
+
+    def _resumable(self, stage_name: str, status: str, attempts: int) -> bool:
+        """Whether a ledger row is work a resumed run could still do.
+
+        A BLOCKED row never counts on its own: it only runs again once its
+        dependency does, and that dependency's own row decides. Without this
+        a session whose dependency failed for good was picked up by every
+        restart, re-recorded as blocked and so kept inside the resume window
+        forever.
+        """
+        stage = self._by_name.get(stage_name)
+        if stage is None or status in (STATUS_DONE, STATUS_BLOCKED):
+            return False
+        return attempts < stage.max_attempts
+
+    async def resume_pending(self) -> int:
+        """Resume sessions with unfinished stages; returns how many ran."""
+        try:
+            await self._ensure_schema()
+            rows = await self.db_adapter.fetch_all(
+                "SELECT session_key, stage, status, attempts, context FROM post_session_jobs "
+                "WHERE status NOT IN (?, ?) "
+                "AND updated_at >= NOW() - make_interval(hours => ?) "
+                "ORDER BY session_key",
+                (STATUS_DONE, STATUS_BLOCKED, RESUME_WINDOW_HOURS),
+            )
+        except Exception:
+            logger.warning("Post-session ledger scan failed; nothing resumed", exc_info=True)
+            return 0
+
+        contexts: dict[str, str] = {}
+        for key, stage_name, status, attempts, context in rows or []:
+            if self._resumable(stage_name, status, int(attempts or 0)):
+                contexts.setdefault(key, context)
+
+        resumed = 0
+        for key, raw in contexts.items():
+            try:
+                ctx = PostSessionContext.from_json(raw)
+            except (TypeError, ValueError, KeyError):
+                logger.warning("Unreadable post-session context for %s", key)
+                continue
+            logger.info("Resuming post-session pipeline for %s", ctx.session_key)
+            await self.run(ctx)
+            resumed += 1
+        return resumed
+
+    async def _run_stage(self, stage: PipelineStage, ctx: PostSessionContext,
+                         prior: StageResult | None,
+                         results: dict[str, StageResult]) -> StageResult:
+        attempts = prior.attempts if prior else 0
+        if prior and prior.status == STATUS_DONE:
+            return prior
+
+        failed_deps = [d for d in stage.depends_on
+                       if results.get(d) is None or results[d].status != STATUS_DONE]
+        if failed_deps:
+            result = StageResult(stage.name, STATUS_BLOCKED, attempts,
+                                 error=f"dependency not done: {', '.join(failed_deps)}")
+            await self._record(ctx, result)
+            return result
+
+        if attempts >= stage.max_attempts:
+            # Out of attempts — including a run-once stage a crash left
+            # 'running'. Record it failed so the ledger stops offering it.
+            result = StageResult(stage.name, STATUS_FAILED, attempts,
+                                 error=prior.error if prior else None)
+            if prior is None or prior.status != STATUS_FAILED:
+                await self._record(ctx, result)
+            return result
+
+        async with self._semaphore:
+            attempts += 1
+            await self._record(ctx, StageResult(stage.name, STATUS_RUNNING, attempts))
+            started = time.perf_counter()
+            error = None
+            try:
+                ok = await stage.run(ctx)
+                status = STATUS_FAILED if ok is False else STATUS_DONE
+            except Exception as e:
+                logger.error("Post-session stage %s failed for %s: %s",
+                             stage.name, ctx.session_key, e, exc_info=True)
+                status = STATUS_FAILED
+                error = f"{type(e).__name__}: {e}"[:500]
+            duration_ms = int((time.perf_counter() - started) * 1000)
+
+        result = StageResult(stage.name, status, attempts, duration_ms, error)
+        await self._record(ctx, result)
+        return result
+
+    def _log_summary(self, key: str, results: dict[str, StageResult],
+                     elapsed_seconds: float) -> None:
+        parts = []
+        for stage in self.stages:
+            result = results.get(stage.name)
+            if result is None:
+                continue
+            timing = f" {result.duration_ms}ms" if result.duration_ms is not None else ""
+            parts.append(f"{stage.name}={result.status}{timing}")
+        logger.info("⏱️ Post-session pipeline %s finished in %.1fs: %s",
+                    key, elapsed_seconds, ", ".join(parts))
+
+    # ------------------------------------------------------------------
+    # Ledger (best-effort)
+    # ------------------------------------------------------------------
+
+    async def _ensure_schema(self) -> None:
+        # migrations/079 is the primary path; this covers a fresh dev DB.
+        # Check first: CREATE ... IF NOT EXISTS still needs CREATE privilege.
+        if self._schema_ready:
+            return
+        exists = await self.db_adapter.fetch_val(
+            "SELECT to_regclass('post_session_jobs') IS NOT NULL")
+        if not exists:
+            await self.db_adapter.execute(_LEDGER_DDL)
+        self._schema_ready = True
+
+    async def _reset_ledger(self, ctx: PostSessionContext) -> None:
+        try:
+            await self._ensure_schema()
+            await self.db_adapter.executemany(
+                "INSERT INTO post_session_jobs (session_key, stage, status, context, attempts) "
+                "VALUES (?, ?, ?, ?, 0) "
+                "ON CONFLICT (session_key, stage) DO UPDATE SET "
+                "status = EXCLUDED.status, context = EXCLUDED.context, attempts = 0, "
+                "duration_ms = NULL, error = NULL, updated_at = NOW()",
+                [(ctx.session_key, stage.name, STATUS_PENDING, ctx.to_json())
+                 for stage in self.stages],
+            )
+        except Exception:
+            logger.warning("Post-session ledger reset failed for %s", ctx.session_key,
+                           exc_info=True)
+
+    async def _load_ledger(self, key: str) -> dict[str, StageResult]:
+        try:
+            await self._ensure_schema()
+            rows = await self.db_adapter.fetch_all(
+                "SELECT stage, status, attempts, duration_ms, error "
+                "FROM post_session_jobs WHERE session_key = ?",
+                (key,),
+            )
+        except Exception:
+            logger.warning("Post-session ledger read failed for %s", key, exc_info=True)
+            return {}
+        return {
+            row[0]: StageResult(row[0], row[1], int(row[2] or 0), row[3], row[4])
+            for row in rows or []
+        }
+
+    async def _record(self, ctx: PostSessionContext, result: StageResult) -> None:
+        try:
+            await self.db_adapter.execute(
+                "INSERT INTO post_session_jobs "
+                "(session_key, stage, status, context, attempts, duration_ms, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (session_key, stage) DO UPDATE SET "
+                "status = EXCLUDED.status, context = EXCLUDED.context, "
+                "attempts = EXCLUDED.attempts, duration_ms = EXCLUDED.duration_ms, "
+                "error = EXCLUDED.error, updated_at = NOW()",
+                (ctx.session_key, result.stage, result.status, ctx.to_json(),
+                 result.attempts, result.duration_ms, result.error),
+            )
+        except Exception:
+            logger.warning("Post-session ledger write failed for %s/%s",
+                           ctx.session_key, result.stage, exc_info=True)
@@ -21,10 +21,167 @@ Mode is config-driven:
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime
 
 logger = logging.getLogger('RoundCorrelation')
 
+# completeness_pct weights. Core: R1 stats (25%) + R2 stats (25%) = 50% for
+# "complete". Bonus: lua (10% each), gametime (5% each), endstats (10% each),
+# proximity (5% each) = up to 60% bonus, capped at 100%.
+COMPLETENESS_WEIGHTS = {
+    'has_r1_stats': 25, 'has_r2_stats': 25,
+    'has_r1_lua_teams': 10, 'has_r2_lua_teams': 10,
+    'has_r1_gametime': 5, 'has_r2_gametime': 5,
+    'has_r1_endstats': 10, 'has_r2_endstats': 10,
+    'has_r1_proximity': 5, 'has_r2_proximity': 5,
+}
+
+# Orphans examined per sweep cycle (one set-based pass, not one per row).
+SWEEP_BATCH_LIMIT = 500
+
+# match_id starts with the local 'YYYY-MM-DD-HHMMSS' the Lua/stats file
+# carries. The per-event path reads it as a naive datetime, i.e. in the bot
+# host's zone; the sweep reads the wall clock zone-free (as +00, back to a
+# plain timestamp) and pins the host's zone with AT TIME ZONE, so the DB
+# session's TimeZone never shifts strategy 3's epoch comparison.
+_MATCH_TS = (
+    "((to_timestamp(substring({col} from 1 for 17) || '+00', 'YYYY-MM-DD-HH24MISSTZH')"
+    " AT TIME ZONE 'UTC') AT TIME ZONE (SELECT name FROM host_zone))"
+)
+_MATCH_TS_OK = "{col} ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}-[0-9]{{6}}'"
+
+# One pass over every sweepable orphan: the three late-merge strategies of
+# _find_nearby_correlation_id as candidate sets, ranked per orphan with
+# ROW_NUMBER (strategy order first, then distance). Targets are rows that
+# already carry stats (r1/r2_round_id), so one cycle never merges an orphan
+# into another orphan that is itself being merged away.
+_SWEEP_CANDIDATES_SQL = f"""
+    WITH host_zone AS (SELECT ?::text AS name),
+    orphans AS (
+        SELECT correlation_id, map_name,
+               CASE WHEN has_r1_proximity OR has_r1_lua_teams THEN 1 ELSE 2 END AS rn,
+               {_MATCH_TS.format(col='match_id')} AS ts
+        FROM round_correlations
+        WHERE status = 'pending'
+          AND r1_round_id IS NULL
+          AND r2_round_id IS NULL
+          AND created_at < NOW() - INTERVAL '1 hour'
+          AND (COALESCE(has_r1_proximity, FALSE) OR COALESCE(has_r1_lua_teams, FALSE))
+              <> (COALESCE(has_r2_proximity, FALSE) OR COALESCE(has_r2_lua_teams, FALSE))
+          AND {_MATCH_TS_OK.format(col='match_id')}
+        ORDER BY created_at DESC
+        LIMIT ?
+    ),
+    targets AS (
+        SELECT correlation_id, map_name, r1_round_id, r2_round_id,
+               has_r1_stats, has_r2_lua_teams,
+               {_MATCH_TS.format(col='match_id')} AS ts
+        FROM round_correlations
+        WHERE (r1_round_id IS NOT NULL OR r2_round_id IS NOT NULL)
+          AND {_MATCH_TS_OK.format(col='match_id')}
+    ),
+    candidates AS (
+        -- 1: timestamp proximity (Lua vs stats match_id a few seconds apart)
+        SELECT o.correlation_id AS source_cid, t.correlation_id AS target_cid,
+               1 AS strategy, ABS(EXTRACT(EPOCH FROM t.ts - o.ts)) AS dist
+        FROM orphans o
+        JOIN targets t ON t.map_name = o.map_name
+        WHERE ABS(EXTRACT(EPOCH FROM t.ts - o.ts)) <= ?
+        UNION ALL
+        -- 2: an R2 orphan 30-900s after an R1 that has no R2 Lua data yet
+        SELECT o.correlation_id, t.correlation_id,
+               2, EXTRACT(EPOCH FROM o.ts - t.ts)
+        FROM orphans o
+        JOIN targets t ON t.map_name = o.map_name
+        WHERE o.rn = 2
+          AND (t.has_r1_stats = TRUE OR t.r1_round_id IS NOT NULL)
+          AND t.has_r2_lua_teams = FALSE
+          AND EXTRACT(EPOCH FROM o.ts - t.ts) BETWEEN 30 AND 900
+        UNION ALL
+        -- 3: a round of the same map/number that ended or started within 90s
+        SELECT o.correlation_id, t.correlation_id,
+               3, LEAST(ABS(r.round_start_unix - EXTRACT(EPOCH FROM o.ts)),
+                        COALESCE(ABS(r.round_end_unix - EXTRACT(EPOCH FROM o.ts)), 9999999))
+        FROM orphans o
+        JOIN rounds r ON r.map_name = o.map_name
+                     AND r.round_number = o.rn
+                     AND r.round_start_unix IS NOT NULL
+        JOIN targets t ON (o.rn = 1 AND t.r1_round_id = r.id)
+                       OR (o.rn = 2 AND t.r2_round_id = r.id)
+        WHERE (r.round_end_unix IS NOT NULL
+               AND ABS(r.round_end_unix - EXTRACT(EPOCH FROM o.ts)) <= 90)
+           OR ABS(r.round_start_unix - EXTRACT(EPOCH FROM o.ts)) <= 90
+    ),
+    ranked AS (
+        SELECT source_cid, target_cid, strategy,
+               ROW_NUMBER() OVER (
+                   PARTITION BY source_cid ORDER BY strategy, dist, target_cid
+               ) AS rank
+        FROM candidates
+    )
+    SELECT source_cid, target_cid, strategy
+    FROM ranked
+    WHERE rank = 1
+"""  # nosec B608 - static SQL; only the ? params vary
+
+_FLAG_COLUMNS = tuple(COMPLETENESS_WEIGHTS)
+
+# Merge every (source, target) pair at once: OR the sources' flags into their
+# target and copy a Lua teams id only when the target has none and the id
+# still exists in lua_round_teams (the bulk form of the FK pre-check).
+_MERGE_ORPHANS_SQL = f"""
+    WITH pairs AS (
+        SELECT * FROM unnest(?::text[], ?::text[]) AS p(source_cid, target_cid)
+    ),
+    src AS (
+        SELECT p.target_cid,
+               {', '.join(f'bool_or(COALESCE(s.{c}, FALSE)) AS {c}' for c in _FLAG_COLUMNS)},
+               MIN(l1.id) AS r1_lua_teams_id,
+               MIN(l2.id) AS r2_lua_teams_id
+        FROM pairs p
+        JOIN round_correlations s ON s.correlation_id = p.source_cid
+        LEFT JOIN lua_round_teams l1 ON l1.id = s.r1_lua_teams_id
+        LEFT JOIN lua_round_teams l2 ON l2.id = s.r2_lua_teams_id
+        GROUP BY p.target_cid
+    )
+    UPDATE round_correlations t
+    SET {', '.join(f'{c} = COALESCE(t.{c}, FALSE) OR src.{c}' for c in _FLAG_COLUMNS)},
+        r1_lua_teams_id = COALESCE(t.r1_lua_teams_id, src.r1_lua_teams_id),
+        r2_lua_teams_id = COALESCE(t.r2_lua_teams_id, src.r2_lua_teams_id)
+    FROM src
+    WHERE t.correlation_id = src.target_cid
+"""  # nosec B608 - column names come from COMPLETENESS_WEIGHTS, not input
+
+# Status + completeness for many rows in one statement (same rules as
+# _recalculate_completeness).
+_RECALCULATE_COMPLETENESS_SQL = f"""
+    UPDATE round_correlations
+    SET completeness_pct = LEAST(100, {' + '.join(
+        f'CASE WHEN {c} THEN {w} ELSE 0 END' for c, w in COMPLETENESS_WEIGHTS.items())}),
+        status = CASE
+            WHEN has_r1_stats AND has_r2_stats THEN 'complete'
+            WHEN has_r1_stats OR has_r2_stats THEN 'partial'
+            ELSE 'pending'
+        END,
+        completed_at = CASE
+            WHEN has_r1_stats AND has_r2_stats THEN LOCALTIMESTAMP
+            ELSE completed_at
+        END
+    WHERE correlation_id = ANY(?::text[])
+"""  # nosec B608 - weights are constants
+
+
+def _host_timezone() -> str:
+    """Name of the zone a naive ``datetime.timestamp()`` uses on this host."""
+    tz = os.environ.get("TZ", "").lstrip(":")
+    if tz:
+        return tz
+    localtime = os.path.realpath("/etc/localtime")
+    if "/zoneinfo/" in localtime:
+        return localtime.split("/zoneinfo/", 1)[1]
+    return time.tzname[0]  # an abbreviation PostgreSQL knows (UTC, CET, ...)
+
 
 class RoundCorrelationService:
     """Tracks data arrival and completeness for R1+R2 match pairs."""
@@ -622,37 +779,9 @@ class RoundCorrelationService:
         if not row:
             return
 
-        (has_r1_stats, has_r2_stats,
-         has_r1_lua, has_r2_lua,
-         has_r1_gt, has_r2_gt,
-         has_r1_es, has_r2_es,
-         has_r1_prox, has_r2_prox) = row
-
-        # Core completeness: R1 stats (25%) + R2 stats (25%) = 50% for "complete"
-        # Bonus: lua (10% each), gametime (5% each), endstats (10% each),
-        #        proximity (5% each) = up to 60% bonus, capped at 100%
-        pct = 0
-        if has_r1_stats:
-            pct += 25
-        if has_r2_stats:
-            pct += 25
-        if has_r1_lua:
-            pct += 10
-        if has_r2_lua:
-            pct += 10
-        if has_r1_gt:
-            pct += 5
-        if has_r2_gt:
-            pct += 5
-        if has_r1_es:
-            pct += 10
-        if has_r2_es:
-            pct += 10
-        if has_r1_prox:
-            pct += 5
-        if has_r2_prox:
-            pct += 5
-        pct = min(pct, 100)
+        has_r1_stats, has_r2_stats = row[0], row[1]
+        # Column order above is COMPLETENESS_WEIGHTS' order
+        pct = min(sum(w for w, flag in zip(COMPLETENESS_WEIGHTS.values(), row, strict=True) if flag), 100)
 
         # Status determination
         if has_r1_stats and has_r2_stats:
@@ -787,55 +916,55 @@ class RoundCorrelationService:
         except Exception as e:
             logger.warning(f"[CORRELATION-SWEEP] saga timeout step failed: {e}")
 
-        rows = await self.db.fetch_all(
-            """
-            SELECT correlation_id, match_id, map_name,
-                   has_r1_proximity, has_r2_proximity,
-                   has_r1_lua_teams, has_r2_lua_teams
-            FROM round_correlations
-            WHERE status = 'pending'
-              AND r1_round_id IS NULL
-              AND r2_round_id IS NULL
-              AND created_at < NOW() - INTERVAL '1 hour'
-            ORDER BY created_at DESC
-            LIMIT 50
-            """
+        # Late merge, set-based: one query ranks a target for every orphan,
+        # one transaction applies all merges (see _SWEEP_CANDIDATES_SQL).
+        pairs = await self.db.fetch_all(
+            _SWEEP_CANDIDATES_SQL, (_host_timezone(), SWEEP_BATCH_LIMIT, 1800)
         )
-        if not rows:
+        if not pairs:
             return
 
-        merged_count = 0
-        for row in rows:
-            cid = row[0] if isinstance(row, (list, tuple)) else row.get('correlation_id')
-            mid = row[1] if isinstance(row, (list, tuple)) else row.get('match_id')
-            mn = row[2] if isinstance(row, (list, tuple)) else row.get('map_name')
-            # Detect round_number from set flags (R1 if r1_*, R2 if r2_*)
-            has_r1 = (row[3] or row[5])
-            has_r2 = (row[4] or row[6])
-            if has_r1 and not has_r2:
-                rn = 1
-            elif has_r2 and not has_r1:
-                rn = 2
-            else:
-                continue  # Ambiguous — leave for manual review
-
-            async with self._correlation_lock:
-                target_cid = await self._find_nearby_correlation_id(
-                    mid, mn, rn, window_seconds=1800
+        async with self._correlation_lock:
+            merged_count = await self._merge_orphans(
+                [(row[0], row[1]) for row in pairs]
+            )
+        if merged_count:
+            for source_cid, target_cid, strategy in pairs:
+                logger.debug(
+                    "[CORRELATION-SWEEP] Late-merged orphan %s → %s (strategy=%s)",
+                    source_cid, target_cid, strategy,
                 )
-                if not target_cid or target_cid == cid:
-                    continue
+            logger.info(f"[CORRELATION-SWEEP] Cycle done: {merged_count} orphan(s) merged")
 
-                merged = await self._merge_orphan(cid, target_cid)
-                if merged:
-                    merged_count += 1
-                    logger.info(
-                        f"[CORRELATION-SWEEP] Late-merged orphan {cid} → {target_cid} "
-                        f"(round_number={rn})"
-                    )
+    async def _merge_orphans(self, pairs: list[tuple[str, str]]) -> int:
+        """Merge many (source orphan, target) pairs in one transaction.
 
-        if merged_count:
-            logger.info(f"[CORRELATION-SWEEP] Cycle done: {merged_count} orphan(s) merged")
+        Flags are OR-ed into each target, Lua teams ids copied only where the
+        target has none and the id still exists, sources deleted, and the
+        targets' completeness recomputed in a single UPDATE. Returns the
+        number of sources merged (0 on failure; nothing is half-applied).
+        """
+        pairs = [(src, tgt) for src, tgt in pairs if src != tgt]
+        if not pairs:
+            return 0
+        sources = [src for src, _ in pairs]
+        targets = sorted({tgt for _, tgt in pairs})
+        try:
+            async with self.db.transaction():
+                await self.db.execute(
+                    _MERGE_ORPHANS_SQL, (sources, [tgt for _, tgt in pairs])
+                )
+                await self.db.execute(
+                    "DELETE FROM round_correlations WHERE correlation_id = ANY(?::text[])",
+                    (sources,),
+                )
+                await self.db.execute(_RECALCULATE_COMPLETENESS_SQL, (targets,))
+            self._record_write_success()
+            return len(sources)
+        except Exception as e:
+            self._record_write_failure("_merge_orphans", e)
+            logger.warning(f"[CORRELATION-SWEEP] Bulk merge of {len(pairs)} orphan(s) failed: {e}")
+            return 0
 
     async def _merge_orphan(self, source_cid: str, target_cid: str) -> bool:
         """Copy has_* flags from source orphan into target, then delete source.
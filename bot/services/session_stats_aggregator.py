@@ -6,12 +6,97 @@ This service manages:
 - Team statistics aggregation
 - Weapon statistics aggregation
 - DPM leaderboard calculations
+
+The per-player session totals are built incrementally: each round's
+per-player sums are fetched once and kept as a fragment, and the session view
+merges the fragments in Python. When a round lands only that round is
+queried, so refreshing the live session message late in a session costs the
+same as after the first map.
+
+The fragments live at module level, shared by every aggregator in the process
+(the web routers and the live refresh build one per call). Each is stored
+with its round's fingerprint — player and weapon row counts, one cheap
+grouped count per call — so a round that was still importing is re-read once
+its rows change. The import path also drops a round's fragment directly.
 """
 
 import logging
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger("bot.services.session_stats_aggregator")
 
+# The fingerprint sees rows being added; the TTL only bounds how long an
+# in-place correction to an old round can go unnoticed by this view.
+ROUND_FRAGMENT_TTL_SECONDS = 3600
+MAX_CACHED_ROUND_FRAGMENTS = 256
+
+# round_id -> (fingerprint, expires_at, per-player rows)
+_round_fragments: OrderedDict[int, tuple[tuple, float, list]] = OrderedDict()
+
+_ROUND_FINGERPRINT_SQL = """
+    SELECT p.round_id, COUNT(*),
+        (SELECT COUNT(*) FROM weapon_comprehensive_stats w WHERE w.round_id = p.round_id)
+    FROM player_comprehensive_stats p
+    WHERE p.round_id IN ({round_ids_str})
+    GROUP BY p.round_id
+"""
+
+# aggregate_all_player_stats row layout: 0 name, 1 guid, 2 kills, 3 deaths,
+# 4 weighted_dpm, 5.. sums (9 total_seconds, 10 total_time_dead,
+# 16 total_damage_given)
+_NAME, _GUID, _KILLS, _DPM = 0, 1, 2, 4
+_SECONDS, _TIME_DEAD, _DAMAGE_GIVEN = 9, 10, 16
+
+
+def invalidate_round_fragments(*round_ids: int) -> None:
+    """Drop the cached fragments of *round_ids*, or all of them."""
+    if not round_ids:
+        _round_fragments.clear()
+    for rid in round_ids:
+        _round_fragments.pop(rid, None)
+
+
+def _sql_sum(a, b):
+    """SUM semantics: NULLs are skipped, all-NULL stays NULL."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a + b
+
+
+def merge_round_fragments(fragments) -> list[tuple]:
+    """Merge per-round player rows into session totals.
+
+    Same rows as the single GROUP BY player_guid query: sums add up, DPM is
+    re-derived from summed damage and playtime, time dead is rounded once at
+    the end, and rows come back ordered by kills (NULLs first, like Postgres).
+    """
+    merged: dict[str, list] = {}
+    for rows in fragments:
+        for row in rows:
+            current = merged.get(row[_GUID])
+            if current is None:
+                merged[row[_GUID]] = list(row)
+                continue
+            current[_NAME] = max(current[_NAME], row[_NAME])
+            for idx in range(_KILLS, len(row)):
+                if idx != _DPM:
+                    current[idx] = _sql_sum(current[idx], row[idx])
+    players = []
+    for row in merged.values():
+        seconds, damage = row[_SECONDS], row[_DAMAGE_GIVEN]
+        if seconds is not None and seconds > 0:
+            row[_DPM] = None if damage is None else (float(damage) * 60.0) / seconds
+        else:
+            row[_DPM] = 0
+        if row[_TIME_DEAD] is not None:
+            row[_TIME_DEAD] = int(round(row[_TIME_DEAD]))
+        players.append(tuple(row))
+    players.sort(key=lambda r: (r[_KILLS] is None, r[_KILLS] or 0), reverse=True)
+    return players
+
 
 class SessionStatsAggregator:
     """Service for aggregating session statistics from database"""
@@ -58,6 +143,10 @@ class SessionStatsAggregator:
         during active playtime, excluding time spent dead.
 
         Returns: List of player stat tuples (includes NEW stats: gibs, revives, times revived, dmg received, useful kills)
+
+        Only rounds whose cached fragment is missing, stale or expired are
+        queried (grouped per round and player); the session totals are merged
+        from the fragments. ``session_ids_str`` is kept for call compatibility.
         """
         columns = await self._get_player_stats_columns()
         has_full_selfkills = "full_selfkills" in columns
@@ -78,6 +167,28 @@ class SessionStatsAggregator:
             )
             self._warned_missing_kill_assists = True
 
+        round_ids = list(dict.fromkeys(session_ids))
+        if not round_ids:
+            return []
+        fingerprints = {
+            row[0]: tuple(row[1:])
+            for row in await self.db_adapter.fetch_all(
+                _ROUND_FINGERPRINT_SQL.format(round_ids_str=",".join("?" * len(round_ids))),
+                tuple(round_ids),
+            )
+        }
+        now = time.monotonic()
+        fragments = _round_fragments
+        # Rounds without player rows yet have nothing to read or cache
+        missing = [
+            rid for rid in round_ids
+            if rid in fingerprints and (
+                rid not in fragments
+                or fragments[rid][0] != fingerprints[rid]
+                or fragments[rid][1] <= now
+            )
+        ]
+
         query = f"""
             SELECT MAX(p.player_name) as player_name,
                 p.player_guid,
@@ -96,12 +207,13 @@ class SessionStatsAggregator:
                 -- FIX (2026-02-01): Use time_dead_minutes directly instead of ratio calculation
                 -- The ratio in R2 files is calculated against cumulative time_played, but we store
                 -- differential time_played. Using time_dead_minutes is correct for both R1 and R2.
-                CAST(SUM(
+                -- Not cast here: rounded once after the per-round merge
+                SUM(
                     LEAST(
                         COALESCE(p.time_dead_minutes, 0) * 60,
                         p.time_played_seconds
                     )
-                ) AS INTEGER) as total_time_dead,
+                ) as total_time_dead,
                 SUM(p.denied_playtime) as total_denied,
                 SUM(p.gibs) as total_gibs,
                 SUM(p.revives_given) as total_revives_given,
@@ -116,7 +228,8 @@ class SessionStatsAggregator:
                 SUM(p.mega_kills) as total_mega_kills,
                 SUM(p.self_kills) as total_self_kills,
                 {full_selfkills_select},
-                {kill_assists_select}
+                {kill_assists_select},
+                p.round_id
             FROM player_comprehensive_stats p
             LEFT JOIN (
                 SELECT round_id, player_guid,
@@ -127,11 +240,32 @@ class SessionStatsAggregator:
                 WHERE weapon_name NOT IN ('WS_GRENADE', 'WS_SYRINGE', 'WS_DYNAMITE', 'WS_AIRSTRIKE', 'WS_ARTILLERY', 'WS_SATCHEL', 'WS_LANDMINE')
                 GROUP BY round_id, player_guid
             ) w ON p.round_id = w.round_id AND p.player_guid = w.player_guid
-            WHERE p.round_id IN ({session_ids_str})
-            GROUP BY p.player_guid
-            ORDER BY kills DESC
+            WHERE p.round_id IN ({{round_ids_str}})
+            GROUP BY p.round_id, p.player_guid
         """
-        return await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        if missing:
+            round_ids_str = ",".join("?" * len(missing))
+            rows = await self.db_adapter.fetch_all(
+                query.format(round_ids_str=round_ids_str), tuple(missing)
+            )
+            by_round: dict[int, list] = {rid: [] for rid in missing}
+            for row in rows:
+                by_round.setdefault(row[-1], []).append(tuple(row)[:-1])
+            # Stored under the fingerprint read before the rows: if an import
+            # landed in between, the next call sees a new count and re-reads.
+            for rid, round_rows in by_round.items():
+                fragments[rid] = (fingerprints[rid], now + ROUND_FRAGMENT_TTL_SECONDS, round_rows)
+                fragments.move_to_end(rid)
+
+        result = merge_round_fragments(
+            fragments[rid][2] for rid in round_ids if rid in fingerprints and rid in fragments
+        )
+        for rid in round_ids:
+            if rid in fragments:
+                fragments.move_to_end(rid)
+        while len(fragments) > MAX_CACHED_ROUND_FRAGMENTS:
+            fragments.popitem(last=False)
+        return result
 
     async def aggregate_team_stats(self, session_ids: list, session_ids_str: str, hardcoded_teams: dict | None = None, name_to_team: dict | None = None):
         """
@@ -27,6 +27,11 @@ from bot.stats import StatsCalculator
 
 logger = logging.getLogger("bot.services.session_view_handlers")
 
+# Session view buttons get clicked over and over while a channel discusses the
+# session; their reads go through the adapter's query cache (invalidated on
+# every round import, so this only bounds staleness from manual edits).
+VIEW_CACHE_TTL = 120
+
 
 class SessionViewHandlers(SessionTimingHelpersMixin):
     """Service for handling different view modes"""
@@ -477,7 +482,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             FROM player_comprehensive_stats
             WHERE round_id IN ({session_ids_str})
         """
-        awards_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        awards_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         if not awards_rows:
             await ctx.send("❌ No objective/support data available for latest session")
@@ -490,7 +495,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             WHERE round_id IN ({session_ids_str})
             GROUP BY player_guid
         """
-        rev_rows = await self.db_adapter.fetch_all(rev_query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        rev_rows = await self.db_adapter.fetch_all(rev_query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
         revives_map = {r[1]: (r[2] or 0) for r in rev_rows}  # r[1] is clean_name, r[2] is revives_given
 
         # Aggregate per-player across rounds
@@ -594,7 +599,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             GROUP BY p.player_guid
             ORDER BY kills DESC
         """
-        combat_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        combat_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         if not combat_rows:
             await ctx.send("❌ No combat data available for latest session")
@@ -648,7 +653,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             HAVING SUM(w.kills) > 0
             ORDER BY player_name, SUM(w.kills) DESC
         """
-        pw_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        pw_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         if not pw_rows:
             await ctx.send("❌ No weapon data available for latest session")
@@ -703,7 +708,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             GROUP BY p.player_guid
             ORDER BY revives_given DESC
         """
-        sup_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        sup_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         if not sup_rows:
             await ctx.send("❌ No support data available for latest session")
@@ -744,7 +749,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             GROUP BY p.player_guid
             ORDER BY best_spree DESC, megas DESC
         """
-        spree_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        spree_rows = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         if not spree_rows:
             await ctx.send("❌ No spree data available for latest session")
@@ -787,7 +792,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             GROUP BY p.player_guid
             ORDER BY kills DESC
         """
-        top_players = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids))
+        top_players = await self.db_adapter.fetch_all(query.format(session_ids_str=session_ids_str), tuple(session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         embed = discord.Embed(
             title=f"🏆 All Players - {latest_date}",
@@ -898,7 +903,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
             """
 
             players = await self.db_adapter.fetch_all(
-                query.format(map_ids_str=map_ids_str), tuple(map_session_ids))
+                query.format(map_ids_str=map_ids_str), tuple(map_session_ids), cache_ttl=VIEW_CACHE_TTL)
 
             if not players:
                 continue
@@ -1130,7 +1135,7 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
         """
 
         players = await self.db_adapter.fetch_all(
-            query.format(round_ids_str=round_ids_str), tuple(round_session_ids))
+            query.format(round_ids_str=round_ids_str), tuple(round_session_ids), cache_ttl=VIEW_CACHE_TTL)
 
         if not players:
             return
@@ -1299,7 +1304,8 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
 
         rows = await self.db_adapter.fetch_all(
             query.format(session_ids_str=session_ids_str),
-            tuple(session_ids)
+            tuple(session_ids),
+            cache_ttl=VIEW_CACHE_TTL,
         )
 
         if not rows:
@@ -1495,7 +1501,8 @@ class SessionViewHandlers(SessionTimingHelpersMixin):
 
         rows = await self.db_adapter.fetch_all(
             query.format(session_ids_str=session_ids_str),
-            tuple(session_ids)
+            tuple(session_ids),
+            cache_ttl=VIEW_CACHE_TTL,
         )
 
         if not rows:
@@ -20,6 +20,7 @@ from bot.core.round_contract import (
     score_confidence_state,
 )
 from bot.logging_config import get_logger
+from bot.services.session_stats_aggregator import invalidate_round_fragments
 
 logger = get_logger("bot.core")
 
@@ -450,6 +451,8 @@ class _StatsImportMixin:
                 except Exception as corr_err:
                     logger.warning(f"[CORRELATION] hook error (non-fatal): {corr_err}")
 
+            # A session view may have cached this round mid-import.
+            invalidate_round_fragments(round_id)
             return round_id
 
         except Exception as e:
@@ -12,6 +12,15 @@ Replacement for tools/stopwatch_scoring.py (sync SQLite version).
 Map score (BOX scale, owner rule 2026-07-05): 2 points to the map winner,
 1-1 on a tie (double fullhold / no completion) — matches BOXScoringService
 and the website, so every surface reports the same session totals.
+
+Stored outcomes (migration 081): each complete map pair is scored once into
+stopwatch_map_outcomes, keyed by (R1 id, R2 id, SCORING_VERSION) and checked
+against a fingerprint of the round columns it was derived from. Session
+totals fold over those outcomes. The R1 player sides are not part of an
+outcome: they are fetched on every call (one batched query) and only the
+roster attribution runs over them, so a corrected team or side applies at once.
+After a rules change, bump SCORING_VERSION and run
+``scripts/rescore_session_results.py --rebuild-map-outcomes``.
 """
 
 import json
@@ -23,6 +32,20 @@ from shared.round_time import round_duration_seconds
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the map-scoring rules change: stored outcomes of an older
+# version are ignored (and dropped by rebuild_map_outcomes).
+SCORING_VERSION = 1
+
+# Round columns an outcome is derived from — its freshness fingerprint.
+_OUTCOME_INPUTS = (
+    'defender_team', 'winner_team', 'surrender_team', 'time_limit',
+    'lua_time_limit_minutes', 'actual_time', 'actual_duration_seconds',
+)
+
+
+def _pair_fingerprint(r1: dict, r2: dict) -> str:
+    return json.dumps([[r.get(k) for k in _OUTCOME_INPUTS] for r in (r1, r2)], default=str)
+
 
 def normalize_side(value) -> int | None:
     """Normalize a game side value to canonical 1/2.
@@ -296,6 +319,454 @@ class StopwatchScoringService:
 
         return (team1_points, team2_points, desc)
 
+    # ── Stored map outcomes (migration 081) ──────────────────────────
+    # A complete map pair's outcome is a pure function of its two rounds, so
+    # it is computed once and stored. Everything that depends on who played
+    # which side (R1 player sides, the caller's rosters) happens per call in
+    # _attribute_map_outcome.
+
+    def _infer_defender_side_from_winner(self, r1_data: dict) -> int | None:
+        """Infer defender side using winner_team + measured
+        duration (fallback when the header is stale).
+
+        Surrender-aware: a recorded surrender means the round did
+        NOT complete, so the winner defended — even though the
+        measured duration is below the limit (RCA 2026-08-18).
+        """
+        winner_side = normalize_side(r1_data.get('winner_team'))
+        if winner_side is None:
+            return None
+
+        if normalize_side(r1_data.get('surrender_team')) is not None:
+            return winner_side
+
+        limit_sec = self._round_limit_secs(r1_data)
+        actual_sec = self._round_duration_secs(r1_data)
+        if limit_sec <= 0 or actual_sec <= 0:
+            return None
+
+        attackers_succeed = actual_sec < limit_sec
+        if attackers_succeed:
+            return 2 if winner_side == 1 else 1
+        return winner_side
+
+    def _compute_map_outcome(self, map_name: str, r1: dict, r2: dict) -> dict[str, Any]:
+        """Roster-independent outcome of one complete map pair.
+
+        Derived only from the two rounds' ``_OUTCOME_INPUTS`` columns, which
+        are its fingerprint. The result is JSON-safe (it is stored).
+        """
+        r1_pts, r2_pts, desc = self.calculate_map_score_from_rounds(r1, r2)
+
+        # R1 attackers are NOT the defender_team side
+        # defender_team tells us which SIDE defended
+        r1_defender_side = r1.get('defender_team', 2)
+        inferred_defender_side = self._infer_defender_side_from_winner(r1)
+        if r1_defender_side not in (1, 2):
+            r1_defender_side = inferred_defender_side or 2  # Default Allies defend
+        elif inferred_defender_side and inferred_defender_side != r1_defender_side:
+            logger.warning(
+                f"Defender side mismatch for {map_name} (R1). "
+                f"Header={r1_defender_side}, inferred={inferred_defender_side}; "
+                "using inferred value."
+            )
+            r1_defender_side = inferred_defender_side
+
+        # Displayed times — measured durations, and "fullhold" whenever the
+        # attackers did not complete (surrender-aware; an inflated
+        # actual_time no longer masquerades as a set time).
+        r1_disp = self._round_duration_str(r1) or r1['actual_time'] or "fullhold"
+        r2_disp = self._round_duration_str(r2) or r2['actual_time'] or "fullhold"
+
+        r2_winner = r2.get('winner_team')
+        return {
+            'r1_attack_points': r1_pts,
+            'r2_attack_points': r2_pts,
+            'description': desc,
+            'header_defender_side': r1.get('defender_team'),
+            'r1_defender_side': r1_defender_side,
+            # Both defenders won their rounds = double fullhold
+            'r1_defender_won': (r1.get('winner_team') == r1.get('defender_team')
+                                and r1.get('winner_team') in (1, 2)),
+            'r2_defender_won': (r2_winner == r2.get('defender_team')
+                                and r2_winner in (1, 2)),
+            'r2_winner_side': r2_winner if r2_winner in (1, 2) else None,
+            'r1_duration': self._round_duration_str(r1) or 'fullhold',
+            'r2_duration': self._round_duration_str(r2) or 'fullhold',
+            'r1_shown': "fullhold" if self._attackers_succeeded(r1) is False else r1_disp,
+            'r2_shown': "fullhold" if self._attackers_succeeded(r2) is False else r2_disp,
+        }
+
+    async def _fetch_r1_sides(self, round_ids: list[int]) -> dict[int, list]:
+        """``{round_id: [[player_guid, side], ...]}`` in one query.
+
+        Sides are normalized to 1/2. Never stored: a corrected team column
+        must change the attribution on the next call.
+        """
+        if not round_ids:
+            return {}
+        placeholders = ",".join(["?"] * len(round_ids))
+        query = f"""
+            SELECT round_id, player_guid, team
+            FROM player_comprehensive_stats
+            WHERE round_id IN ({placeholders})
+        """  # nosec B608 - safe: parameterized placeholders (adapter translates ? to $N on PostgreSQL)
+        rows = await self.db.fetch_all(query, tuple(round_ids))
+        sides: dict[int, list] = {rid: [] for rid in round_ids}
+        for rid, guid, raw_side in rows:
+            side = normalize_side(raw_side)
+            if side is not None and rid in sides:
+                sides[rid].append([guid, side])
+        return sides
+
+    async def _read_stored_outcomes(self, r1_ids: list[int]) -> dict[tuple, tuple]:
+        """``{(r1_id, r2_id): (fingerprint, outcome)}`` for the current version.
+
+        Every failure returns {}: the table is an optimisation (and may not
+        exist on a DB that predates migration 081), scoring works without it.
+        """
+        if not r1_ids:
+            return {}
+        try:
+            rows = await self.db.fetch_all(
+                """
+                SELECT r1_round_id, r2_round_id, fingerprint, outcome
+                FROM stopwatch_map_outcomes
+                WHERE scoring_version = ? AND r1_round_id = ANY(?::int[])
+                """,
+                (SCORING_VERSION, list(r1_ids)),
+            )
+        except Exception as exc:  # noqa: BLE001 — see docstring
+            logger.debug("stored map outcomes unreadable: %s", exc)
+            return {}
+        stored = {}
+        for r1_id, r2_id, fingerprint, outcome in rows or []:
+            if isinstance(outcome, str):  # asyncpg hands JSONB back as text
+                try:
+                    outcome = json.loads(outcome)
+                except ValueError:
+                    continue
+            if isinstance(outcome, dict):
+                stored[(r1_id, r2_id)] = (fingerprint, outcome)
+        return stored
+
+    async def _write_stored_outcomes(self, fresh: list[tuple]) -> None:
+        """Upsert ``[((r1_id, r2_id), fingerprint, outcome), ...]``."""
+        if not fresh:
+            return
+        await self.db.executemany(
+            """
+            INSERT INTO stopwatch_map_outcomes
+                (r1_round_id, r2_round_id, scoring_version, fingerprint, outcome, computed_at)
+            VALUES (?, ?, ?, ?, ?, NOW())
+            ON CONFLICT (r1_round_id, r2_round_id, scoring_version) DO UPDATE SET
+                fingerprint = EXCLUDED.fingerprint,
+                outcome     = EXCLUDED.outcome,
+                computed_at = NOW()
+            """,
+            [(r1_id, r2_id, SCORING_VERSION, fingerprint, json.dumps(outcome))
+             for (r1_id, r2_id), fingerprint, outcome in fresh],
+        )
+
+    def _score_map_pairs(self, maps: list[dict]) -> list[tuple]:
+        """Compute outcomes for *maps*.
+
+        Returns ``[((r1_id, r2_id), fingerprint, outcome), ...]`` in order.
+        """
+        scored = []
+        for m in maps:
+            r1, r2 = m['round1'], m['round2']
+            outcome = self._compute_map_outcome(m['map_name'], r1, r2)
+            scored.append(((r1.get('round_id'), r2.get('round_id')),
+                           _pair_fingerprint(r1, r2), outcome))
+        return scored
+
+    async def _map_outcomes(self, maps: list[dict]) -> list[dict]:
+        """Outcome per complete map, from stopwatch_map_outcomes when current.
+
+        Only pairs that are new, whose rounds changed since they were stored
+        (fingerprint mismatch) or that predate SCORING_VERSION are scored;
+        those are written back best-effort.
+        """
+        stored = await self._read_stored_outcomes(
+            [m['round1'].get('round_id') for m in maps if m['round1'].get('round_id') is not None]
+        )
+        outcomes: list[dict | None] = []
+        missing = []
+        for m in maps:
+            key = (m['round1'].get('round_id'), m['round2'].get('round_id'))
+            hit = stored.get(key)
+            if hit is not None and hit[0] == _pair_fingerprint(m['round1'], m['round2']):
+                outcomes.append(hit[1])
+            else:
+                outcomes.append(None)
+                missing.append(m)
+        if not missing:
+            return outcomes
+
+        scored = self._score_map_pairs(missing)
+        fill = iter(scored)
+        outcomes = [o if o is not None else next(fill)[2] for o in outcomes]
+        try:
+            await self._write_stored_outcomes(
+                [item for item in scored if None not in item[0]]
+            )
+        except Exception as exc:  # noqa: BLE001 — the score itself is already computed
+            logger.debug("map outcomes not stored: %s", exc)
+        return outcomes
+
+    def _attribute_map_outcome(
+        self,
+        map_data: dict,
+        outcome: dict,
+        r1_sides: list,
+        team_a_name: str,
+        team_b_name: str,
+        team_a_guids: set,
+        team_b_guids: set,
+    ) -> dict[str, Any]:
+        """Map result for persistent Team A/B from a stored outcome.
+
+        ``r1_sides`` is ``[[player_guid, side], ...]`` for the map's R1, as
+        fetched for this call. Uncounted maps (roster changed) carry 0 points
+        for both teams.
+        """
+        map_name = map_data['map_name']
+        r1 = map_data['round1']
+
+        # Count how many players from each team were on each side in R1
+        team_a_on_side = {1: 0, 2: 0}
+        team_b_on_side = {1: 0, 2: 0}
+        for player_guid, side_key in r1_sides:
+            if player_guid in team_a_guids:
+                team_a_on_side[side_key] += 1
+            elif player_guid in team_b_guids:
+                team_b_on_side[side_key] += 1
+
+        # Determine which side Team A was on in R1 (majority wins)
+        ambiguous_team_sides = False
+        team_a_r1_side = None
+        if team_a_on_side[1] > team_a_on_side[2]:
+            team_a_r1_side = 1
+        elif team_a_on_side[2] > team_a_on_side[1]:
+            team_a_r1_side = 2
+        else:
+            # Tie or no Team A players: use Team B as inverse if possible
+            if team_b_on_side[1] > team_b_on_side[2]:
+                team_a_r1_side = 2
+            elif team_b_on_side[2] > team_b_on_side[1]:
+                team_a_r1_side = 1
+            else:
+                ambiguous_team_sides = True
+
+        r1_defender_side = outcome['r1_defender_side']
+        t1_pts = outcome['r1_attack_points']
+        t2_pts = outcome['r2_attack_points']
+
+        if ambiguous_team_sides:
+            # Teams were reshuffled mid-session (e.g. a substitution), so
+            # this map's lineup doesn't map cleanly to the detected session
+            # rosters. Rather than show a blank "Unscored ⚪", we still
+            # report the map winner BY TIME (R1 attackers vs R2 attackers);
+            # we just can't attribute it to persistent Team A/B, so it does
+            # NOT add to the session map tally. The note makes that explicit.
+            if t1_pts > t2_pts:
+                side_note = f"R1 attackers won ({outcome['r1_duration']})"
+            elif t2_pts > t1_pts:
+                side_note = f"R2 attackers won ({outcome['r2_duration']})"
+            else:
+                side_note = "no completion (tie)"
+            roster_note = f"⚠ roster changed — {side_note}, not attributed to a team"
+            logger.debug(
+                "[SCORING DEBUG] %s | roster changed mid-session; "
+                "map winner by time (%s), no team attribution",
+                map_name, side_note
+            )
+            return {
+                'map': map_name,
+                'team_a_points': 0,
+                'team_b_points': 0,
+                'team_a_time': '',
+                'team_b_time': '',
+                'winner': 'tie',
+                # ⚠ (not ⚪) so consumers that read emoji-only don't
+                # mistake a roster-changed map for a plain tie/unscored.
+                'emoji': '⚠',
+                'description': roster_note,
+                # Side attribution is genuinely unknown here (that's why
+                # it's ambiguous) — don't surface the possibly-stale Lua
+                # header winner. The note carries the time-based outcome.
+                'winner_side': None,
+                'team_a_r1_side': None,
+                'team_a_r2_side': None,
+                'r1_defender_side': outcome['header_defender_side'],
+                # Keep 'ambiguous' so downstream (sessions_router) still
+                # classifies the map as incomplete/ambiguous as before.
+                'scoring_source': 'ambiguous',
+                'counted': False,
+                'note': roster_note
+            }
+
+        if team_a_r1_side is None:
+            # Fall back using defender side if team counts were inconclusive
+            if team_a_on_side.get(r1_defender_side, 0) > team_b_on_side.get(r1_defender_side, 0):
+                team_a_r1_side = r1_defender_side
+            elif team_b_on_side.get(r1_defender_side, 0) > team_a_on_side.get(r1_defender_side, 0):
+                team_a_r1_side = 1 if r1_defender_side == 2 else 2
+            else:
+                # Final fallback
+                team_a_r1_side = 1
+
+        # Was Team A attacking or defending in R1?
+        team_a_attacking_r1 = (team_a_r1_side != r1_defender_side)
+        team_a_r2_side = 2 if team_a_r1_side == 1 else 1
+
+        team_a_pts = 0
+        team_b_pts = 0
+        winner_side = None
+        if outcome['r1_defender_won'] and outcome['r2_defender_won']:
+            # Double fullhold: each team defended and won once = 1-1 draw
+            team_a_pts = 1
+            team_b_pts = 1
+            desc = "Double fullhold: 1-1 draw"
+            scoring_source = "header"
+        # Prefer header winner side from R2 (map winner in stopwatch)
+        elif outcome['r2_winner_side'] is not None:
+            winner_side = outcome['r2_winner_side']
+            if winner_side == team_a_r2_side:
+                team_a_pts = 2
+            else:
+                team_b_pts = 2
+            desc = f"Map win: side {winner_side} (R2 winner)"
+            scoring_source = "header"
+        else:
+            # Fallback to outcome/duration-based scoring.
+            # t1_pts = R1 attackers' score, t2_pts = R2 attackers' (R1 defenders)
+            desc = outcome['description']
+            if team_a_attacking_r1:
+                team_a_pts, team_b_pts = t1_pts, t2_pts
+            else:
+                team_a_pts, team_b_pts = t2_pts, t1_pts
+            scoring_source = "time"
+
+        if team_a_attacking_r1:
+            team_a_time, team_b_time = outcome['r1_shown'], outcome['r2_shown']
+        else:
+            team_a_time, team_b_time = outcome['r2_shown'], outcome['r1_shown']
+
+        # Determine map winner for emoji
+        if team_a_pts > team_b_pts:
+            winner = team_a_name
+            emoji = "🟢"
+        elif team_b_pts > team_a_pts:
+            winner = team_b_name
+            emoji = "🔴"
+        else:
+            winner = "tie"
+            emoji = "🟡"
+
+        logger.debug(
+            "[SCORING DEBUG] %s | winner_side=%s | teamA_r1_side=%s teamA_r2_side=%s | "
+            "r1_def=%s | teamA_pts=%s teamB_pts=%s | source=%s",
+            map_name,
+            winner_side,
+            team_a_r1_side,
+            team_a_r2_side,
+            r1_defender_side,
+            team_a_pts,
+            team_b_pts,
+            scoring_source
+        )
+        return {
+            'map': map_name,
+            'team_a_points': team_a_pts,
+            'team_b_points': team_b_pts,
+            'team_a_time': team_a_time,
+            'team_b_time': team_b_time,
+            'winner': winner,
+            'emoji': emoji,
+            'description': desc,
+            'winner_side': winner_side,
+            'team_a_r1_side': team_a_r1_side,
+            'team_a_r2_side': team_a_r2_side,
+            'r1_defender_side': r1_defender_side,
+            'scoring_source': scoring_source,
+            'counted': True,
+            # IMP-002: durable per-map identity (see calculate_session_scores).
+            'match_id': map_data.get('match_id'),
+            'map_play_seq': r1.get('map_play_seq'),
+            'round_start_unix': r1.get('round_start_unix'),
+        }
+
+    async def rebuild_map_outcomes(self, chunk_size: int = 500) -> int:
+        """Rescore every complete map pair in history in one pass.
+
+        For scoring-rule changes: bump SCORING_VERSION, then run this (via
+        ``rescore_session_results.py --rebuild-map-outcomes``). Stores the
+        current-version outcome of every pair and drops older versions.
+        Unlike the per-session path, failures raise. Returns pairs stored.
+        """
+        rows = await self.db.fetch_all(
+            """
+            SELECT r.id, r.map_name, r.gaming_session_id, r.round_number,
+                   r.defender_team, r.winner_team, r.time_limit, r.actual_time,
+                   r.round_date, r.round_time, r.match_id,
+                   r.round_start_unix, r.map_play_seq,
+                   r.actual_duration_seconds,
+                   l.surrender_team, l.time_limit_minutes
+            FROM rounds r
+            LEFT JOIN lua_round_teams l ON l.round_id = r.id
+            WHERE r.round_status = 'completed'
+            AND r.is_valid
+            AND r.round_number IN (1, 2)
+            ORDER BY r.gaming_session_id,
+                     r.round_date,
+                     CAST(REPLACE(r.round_time, ':', '') AS INTEGER),
+                     r.round_number
+            """
+        )
+        maps_dict: dict[str, dict] = {}
+        pending_r1: dict[str, str] = {}
+        map_play_count: dict[str, int] = {}
+        for row in rows or []:
+            (round_id, map_name, gaming_session_id, round_num,
+             defender_team, winner_team, time_limit, actual_time,
+             round_date, round_time, match_id,
+             round_start_unix, map_play_seq,
+             actual_duration_seconds, surrender_team,
+             lua_time_limit_minutes) = row
+            self._pair_round(
+                maps_dict, pending_r1, map_play_count,
+                match_id=match_id, gaming_session_id=gaming_session_id,
+                map_name=map_name, round_num=round_num,
+                round_data={
+                    'round_id': round_id,
+                    'defender_team': defender_team,
+                    'winner_team': winner_team,
+                    'time_limit': time_limit,
+                    'actual_time': actual_time,
+                    'actual_duration_seconds': actual_duration_seconds,
+                    'surrender_team': surrender_team,
+                    'lua_time_limit_minutes': lua_time_limit_minutes,
+                },
+            )
+        complete = [
+            m for m in maps_dict.values()
+            if m['round1'] is not None and m['round2'] is not None
+        ]
+
+        stored = 0
+        for start in range(0, len(complete), max(1, chunk_size)):
+            scored = self._score_map_pairs(complete[start:start + chunk_size])
+            await self._write_stored_outcomes(scored)
+            stored += len(scored)
+        await self.db.execute(
+            "DELETE FROM stopwatch_map_outcomes WHERE scoring_version <> ?",
+            (SCORING_VERSION,),
+        )
+        logger.info("Rebuilt %d stopwatch map outcomes (scoring v%d)", stored, SCORING_VERSION)
+        return stored
+
     async def calculate_session_scores(
         self,
         session_date: str,
@@ -331,7 +802,7 @@ class StopwatchScoringService:
                 # lua_round_teams.round_id is UNIQUE — see the note on the
                 # date-variant query below; same join, same reasoning.
                 rounds_query = f"""
-                    SELECT r.map_name, r.gaming_session_id, r.round_number,
+                    SELECT r.id, r.map_name, r.gaming_session_id, r.round_number,
                            r.defender_team, r.winner_team, r.time_limit, r.actual_time,
                            r.round_date, r.round_time, r.match_id,
                            r.round_start_unix, r.map_play_seq,
@@ -354,7 +825,7 @@ class StopwatchScoringService:
                 # lua_round_teams_round_id_key), so a plain LEFT JOIN cannot
                 # fan out rows and is cheaper than per-row scalar subqueries.
                 rounds_query = """
-                    SELECT r.map_name, r.gaming_session_id, r.round_number,
+                    SELECT r.id, r.map_name, r.gaming_session_id, r.round_number,
                            r.defender_team, r.winner_team, r.time_limit, r.actual_time,
                            r.round_date, r.round_time, r.match_id,
                            r.round_start_unix, r.map_play_seq,
@@ -383,13 +854,14 @@ class StopwatchScoringService:
             map_play_count: dict[str, int] = {}  # legacy fallback: plays per map
 
             for row in rows:
-                (map_name, gaming_session_id, round_num, defender, winner,
+                (round_id, map_name, gaming_session_id, round_num, defender, winner,
                  time_limit, actual_time, round_date, round_time, match_id,
                  round_start_unix, map_play_seq,
                  actual_duration_seconds, surrender_team,
                  lua_time_limit_minutes) = row
 
                 round_data = {
+                    'round_id': round_id,
                     'defender': defender,
                     'defender_team': defender,
                     'winner': winner,
@@ -580,15 +1052,14 @@ class StopwatchScoringService:
                 2: {'name': team_names_list[team_mapping[2]], 'score': 0}
             }
 
-            # Calculate scores for each map pair
+            # Fold the stored per-pair outcomes into the session total
             map_results = []
-            for map_data in maps:
+            outcomes = await self._map_outcomes(maps)
+            for map_data, outcome in zip(maps, outcomes, strict=True):
                 r1 = map_data['round1']
-                r2 = map_data['round2']
-
-                team1_pts, team2_pts, desc = self.calculate_map_score_from_rounds(
-                    r1, r2
-                )
+                team1_pts = outcome['r1_attack_points']
+                team2_pts = outcome['r2_attack_points']
+                desc = outcome['description']
 
                 teams[1]['score'] += team1_pts
                 teams[2]['score'] += team2_pts
@@ -964,269 +1435,26 @@ class StopwatchScoringService:
                 logger.debug("No map data found for %s", str(session_date).replace('\n', '')[:30])
                 return None
 
-            # For each map, determine which persistent team was attacking in R1
-            # We need to look at player stats to see which team was on which side
-            sample_query = """
-                SELECT player_guid, team
-                FROM player_comprehensive_stats
-                WHERE round_id = $1
-            """
-
-            # Initialize scores
+            # Fold the stored per-pair outcomes; the R1 sides (one batched
+            # query) and their attribution to the persistent teams are
+            # computed per call.
             team_a_maps = 0
             team_b_maps = 0
             map_results = []
-
-            for map_data in complete_maps:
-                r1 = map_data['round1']
-                r2 = map_data['round2']
-                map_name = map_data['map_name']
-
-                # Get player→side mapping for R1 to determine team→side
-                r1_players = await self.db.fetch_all(sample_query, (r1['round_id'],))
-
-                # Count how many players from each team were on each side in R1
-                team_a_on_side = {1: 0, 2: 0}
-                team_b_on_side = {1: 0, 2: 0}
-
-                for player_guid, side in r1_players:
-                    side_key = normalize_side(side)
-                    if side_key is None:
-                        continue
-                    if player_guid in team_a_guids:
-                        team_a_on_side[side_key] = team_a_on_side.get(side_key, 0) + 1
-                    elif player_guid in team_b_guids:
-                        team_b_on_side[side_key] = team_b_on_side.get(side_key, 0) + 1
-
-                # Determine which side Team A was on in R1 (majority wins)
-                ambiguous_team_sides = False
-                team_a_r1_side = None
-                if team_a_on_side[1] > team_a_on_side[2]:
-                    team_a_r1_side = 1
-                elif team_a_on_side[2] > team_a_on_side[1]:
-                    team_a_r1_side = 2
-                else:
-                    # Tie or no Team A players: use Team B as inverse if possible
-                    if team_b_on_side[1] > team_b_on_side[2]:
-                        team_a_r1_side = 2
-                    elif team_b_on_side[2] > team_b_on_side[1]:
-                        team_a_r1_side = 1
-                    else:
-                        ambiguous_team_sides = True
-
-                def _infer_defender_side_from_winner(r1_data):
-                    """Infer defender side using winner_team + measured
-                    duration (fallback when the header is stale).
-
-                    Surrender-aware: a recorded surrender means the round did
-                    NOT complete, so the winner defended — even though the
-                    measured duration is below the limit (RCA 2026-08-18).
-                    """
-                    winner_side = normalize_side(r1_data.get('winner_team'))
-                    if winner_side is None:
-                        return None
-
-                    if normalize_side(r1_data.get('surrender_team')) is not None:
-                        return winner_side
-
-                    limit_sec = self._round_limit_secs(r1_data)
-                    actual_sec = self._round_duration_secs(r1_data)
-                    if limit_sec <= 0 or actual_sec <= 0:
-                        return None
-
-                    attackers_succeed = actual_sec < limit_sec
-                    if attackers_succeed:
-                        return 2 if winner_side == 1 else 1
-                    return winner_side
-
-                # R1 attackers are NOT the defender_team side
-                # defender_team tells us which SIDE defended
-                r1_defender_side = r1.get('defender_team', 2)
-                inferred_defender_side = _infer_defender_side_from_winner(r1)
-
-                if r1_defender_side not in (1, 2):
-                    r1_defender_side = inferred_defender_side or 2  # Default Allies defend
-                elif inferred_defender_side and inferred_defender_side != r1_defender_side:
-                    logger.warning(
-                        f"Defender side mismatch for {map_name} (R1). "
-                        f"Header={r1_defender_side}, inferred={inferred_defender_side}; "
-                        "using inferred value."
-                    )
-                    r1_defender_side = inferred_defender_side
-
-                if ambiguous_team_sides:
-                    # Teams were reshuffled mid-session (e.g. a substitution), so
-                    # this map's lineup doesn't map cleanly to the detected session
-                    # rosters. Rather than show a blank "Unscored ⚪", we still
-                    # report the map winner BY TIME (R1 attackers vs R2 attackers);
-                    # we just can't attribute it to persistent Team A/B, so it does
-                    # NOT add to the session map tally. The note makes that explicit.
-                    t1_pts, t2_pts, _time_desc = self.calculate_map_score_from_rounds(
-                        r1, r2
-                    )
-                    r1_t = self._round_duration_str(r1) or 'fullhold'
-                    r2_t = self._round_duration_str(r2) or 'fullhold'
-                    if t1_pts > t2_pts:
-                        side_note = f"R1 attackers won ({r1_t})"
-                    elif t2_pts > t1_pts:
-                        side_note = f"R2 attackers won ({r2_t})"
-                    else:
-                        side_note = "no completion (tie)"
-                    roster_note = f"⚠ roster changed — {side_note}, not attributed to a team"
-                    map_results.append({
-                        'map': map_name,
-                        'team_a_points': 0,
-                        'team_b_points': 0,
-                        'team_a_time': '',
-                        'team_b_time': '',
-                        'winner': 'tie',
-                        # ⚠ (not ⚪) so consumers that read emoji-only don't
-                        # mistake a roster-changed map for a plain tie/unscored.
-                        'emoji': '⚠',
-                        'description': roster_note,
-                        # Side attribution is genuinely unknown here (that's why
-                        # it's ambiguous) — don't surface the possibly-stale Lua
-                        # header winner. The note carries the time-based outcome.
-                        'winner_side': None,
-                        'team_a_r1_side': None,
-                        'team_a_r2_side': None,
-                        'r1_defender_side': r1.get('defender_team'),
-                        # Keep 'ambiguous' so downstream (sessions_router) still
-                        # classifies the map as incomplete/ambiguous as before.
-                        'scoring_source': 'ambiguous',
-                        'counted': False,
-                        'note': roster_note
-                    })
-                    logger.debug(
-                        "[SCORING DEBUG] %s | roster changed mid-session; "
-                        "map winner by time (%s), no team attribution",
-                        map_name, side_note
-                    )
-                    continue
-
-                if team_a_r1_side is None:
-                    # Fall back using defender side if team counts were inconclusive
-                    if team_a_on_side.get(r1_defender_side, 0) > team_b_on_side.get(r1_defender_side, 0):
-                        team_a_r1_side = r1_defender_side
-                    elif team_b_on_side.get(r1_defender_side, 0) > team_a_on_side.get(r1_defender_side, 0):
-                        team_a_r1_side = 1 if r1_defender_side == 2 else 2
-                    else:
-                        # Final fallback
-                        team_a_r1_side = 1
-
-                # Was Team A attacking or defending in R1?
-                team_a_attacking_r1 = (team_a_r1_side != r1_defender_side)
-
-                team_a_pts = 0
-                team_b_pts = 0
-
-                # Detect double fullhold: both defenders won their rounds = map tie
-                r1_defender_won = (r1.get('winner_team') == r1.get('defender_team')
-                                   and r1.get('winner_team') in (1, 2))
-                r2_defender_won = (r2.get('winner_team') == r2.get('defender_team')
-                                   and r2.get('winner_team') in (1, 2))
-
-                if r1_defender_won and r2_defender_won:
-                    # Double fullhold: each team defended and won once = 1-1 draw
-                    team_a_pts = 1
-                    team_b_pts = 1
-                    desc = "Double fullhold: 1-1 draw"
-                    scoring_source = "header"
-                    winner_side = None
-                # Prefer header winner side from R2 (map winner in stopwatch)
-                elif (r2.get('winner_team') in (1, 2)
-                      and team_a_r1_side in (1, 2)):
-                    winner_side = r2.get('winner_team')
-                    team_a_r2_side = 2 if team_a_r1_side == 1 else 1
-                    if winner_side == team_a_r2_side:
-                        team_a_pts = 2
-                        desc = f"Map win: side {winner_side} (R2 winner)"
-                    else:
-                        team_b_pts = 2
-                        desc = f"Map win: side {winner_side} (R2 winner)"
-                    scoring_source = "header"
-                else:
-                    # Fallback to outcome/duration-based scoring
-                    team1_pts, team2_pts, desc = self.calculate_map_score_from_rounds(
-                        r1, r2
-                    )
-
-                    # team1_pts = R1 attackers' score, team2_pts = R2 attackers' (R1 defenders)
-                    # Map back to persistent teams
-                    if team_a_attacking_r1:
-                        # Team A attacked R1, so team1_pts goes to Team A
-                        team_a_pts = team1_pts
-                        team_b_pts = team2_pts
-                    else:
-                        # Team B attacked R1, so team1_pts goes to Team B
-                        team_a_pts = team2_pts
-                        team_b_pts = team1_pts
-                    scoring_source = "time"
-
-                team_a_maps += team_a_pts
-                team_b_maps += team_b_pts
-
-                # Format timing for display — measured durations, and
-                # "fullhold" whenever the attackers did not complete
-                # (surrender-aware; an inflated actual_time no longer
-                # masquerades as a set time).
-                r1_disp = self._round_duration_str(r1) or r1['actual_time'] or "fullhold"
-                r2_disp = self._round_duration_str(r2) or r2['actual_time'] or "fullhold"
-                r1_shown = "fullhold" if self._attackers_succeeded(r1) is False else r1_disp
-                r2_shown = "fullhold" if self._attackers_succeeded(r2) is False else r2_disp
-
-                # Build timing display
-                if team_a_attacking_r1:
-                    team_a_time = r1_shown
-                    team_b_time = r2_shown
-                else:
-                    team_a_time = r2_shown
-                    team_b_time = r1_shown
-
-                # Determine map winner for emoji
-                if team_a_pts > team_b_pts:
-                    winner = team_a_name
-                    emoji = "🟢"
-                elif team_b_pts > team_a_pts:
-                    winner = team_b_name
-                    emoji = "🔴"
-                else:
-                    winner = "tie"
-                    emoji = "🟡"
-
-                map_results.append({
-                    'map': map_name,
-                    'team_a_points': team_a_pts,
-                    'team_b_points': team_b_pts,
-                    'team_a_time': team_a_time,
-                    'team_b_time': team_b_time,
-                    'winner': winner,
-                    'emoji': emoji,
-                    'description': desc,
-                    'winner_side': winner_side,
-                    'team_a_r1_side': team_a_r1_side,
-                    'team_a_r2_side': 2 if team_a_r1_side == 1 else 1,
-                    'r1_defender_side': r1_defender_side,
-                    'scoring_source': scoring_source,
-                    'counted': True,
-                    # IMP-002: durable per-map identity (see path-1 comment).
-                    'match_id': map_data.get('match_id'),
-                    'map_play_seq': r1.get('map_play_seq'),
-                    'round_start_unix': r1.get('round_start_unix'),
-                })
-
-                logger.debug(
-                    "[SCORING DEBUG] %s | winner_side=%s | teamA_r1_side=%s teamA_r2_side=%s | "
-                    "r1_def=%s | teamA_pts=%s teamB_pts=%s | source=%s",
-                    map_name,
-                    winner_side,
-                    team_a_r1_side,
-                    2 if team_a_r1_side == 1 else 1,
-                    r1_defender_side,
-                    team_a_pts,
-                    team_b_pts,
-                    scoring_source
+            outcomes = await self._map_outcomes(complete_maps)
+            r1_sides = await self._fetch_r1_sides([
+                m['round1']['round_id'] for m in complete_maps
+                if m['round1'].get('round_id') is not None
+            ])
+            for map_data, outcome in zip(complete_maps, outcomes, strict=True):
+                map_result = self._attribute_map_outcome(
+                    map_data, outcome,
+                    r1_sides.get(map_data['round1'].get('round_id'), []),
+                    team_a_name, team_b_name, team_a_guids, team_b_guids,
                 )
+                team_a_maps += map_result['team_a_points']
+                team_b_maps += map_result['team_b_points']
+                map_results.append(map_result)
 
             # Add incomplete maps as not-counted entries (R1 only)
             for map_data in incomplete_maps:
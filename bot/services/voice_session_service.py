@@ -17,6 +17,11 @@ from datetime import datetime, timedelta
 
 import discord
 
+from bot.services.post_session_pipeline import (
+    PipelineStage,
+    PostSessionContext,
+    PostSessionPipeline,
+)
 from bot.services.session_data_service import SessionDataService
 from bot.services.session_embed_builder import SessionEmbedBuilder
 from bot.services.session_stats_aggregator import SessionStatsAggregator
@@ -410,9 +415,8 @@ class VoiceSessionService:
 
             start_date = await self._session_start_date(session_ids)
 
-            # KIS cache invalidation: scheduled as soon as session_ids are
-            # known, NOT gated on the scoring-finalization block below — a
-            # scoring exception must not leave a stale mid-session KIS
+            # KIS cache invalidation is NOT gated on the scoring-finalization
+            # block below — a scoring exception must not leave a stale mid-session KIS
             # snapshot in place (codex, PR #482, "Don't gate KIS invalidation
             # on scoring finalization success"). Invalidates EVERY distinct
             # calendar date this session's rounds touch, not just the start
@@ -428,16 +432,45 @@ class VoiceSessionService:
             # leaving the cache empty with nothing to refill it (Codex #546).
             session_gsids = await self._session_gsids(session_ids)
             session_dates = await self._session_dates_touched(session_ids)
+
+            # Scoring has its own error boundary so a scoring exception can
+            # never keep the post-session pipeline (KIS invalidation first of
+            # all) from being scheduled.
+            await self._save_session_scores(
+                scoring_service, data_service, latest_date, session_ids)
+
+            # Everything derived from the finished session — KIS invalidate +
+            # warm, s.effort persist (scoped to the session START date,
+            # midnight-safe: the endpoint ranks sessions by MIN(round_date)),
+            # story/proximity panels, graph data, the session page — runs as
+            # one dependency-ordered background pipeline with a persisted
+            # ledger, so a slow/unreachable website never holds teardown and
+            # a bot restart resumes what did not finish. s.effort runs
+            # REGARDLESS of stopwatch scoring success (player stats can be
+            # valid without a team result).
+            ctx = PostSessionContext(
+                start_date=start_date or str(latest_date),
+                session_dates=tuple(session_dates or [start_date or str(latest_date)]),
+                gaming_session_ids=tuple(session_gsids),
+            )
             # _safe_create_task, not asyncio.create_task: a bare task drops its
             # exception on the floor, so a failed KIS refresh left the session
             # scoreless AND silent. The bot's reconcile loop is the net that
             # catches it afterwards, but the log line is what says why.
-            for sd in (session_dates or [start_date or str(latest_date)]):
-                self._background_task(
-                    self._invalidate_kis_cache(sd, gsids=session_gsids),
-                    name="kis-cache-invalidate",
-                )
+            self._post_session_task = self._background_task(
+                self._post_session_pipeline().start(ctx),
+                name="post-session-pipeline",
+            )
+
+        except Exception as e:
+            logger.error(f"❌ Error finalizing session results: {e}", exc_info=True)
 
+    async def _save_session_scores(self, scoring_service, data_service,
+                                   latest_date, session_ids) -> None:
+        """Calculate and persist the session's stopwatch result, then resolve
+        predictions. Never raises: the post-session pipeline is scheduled
+        after this regardless of the outcome."""
+        try:
             # Try team-aware scoring first
             hardcoded_teams = await data_service.get_hardcoded_teams(session_ids)
             scoring_result = None
@@ -470,26 +503,156 @@ class VoiceSessionService:
                         except Exception:
                             logger.error("auto_resolve_predictions failed",
                                          exc_info=True)
-
-
                 else:
                     logger.warning(f"⚠️ Failed to finalize session results for {latest_date}")
             else:
                 logger.debug(f"No scoring data available for session {latest_date}")
+        except Exception as e:
+            logger.error(f"❌ Error scoring session {latest_date}: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Post-session precompute pipeline
+    # ------------------------------------------------------------------
+
+    def _post_session_pipeline(self) -> PostSessionPipeline:
+        """The service's pipeline, built on first use (tests construct this
+        service with __new__, so it cannot live only in __init__)."""
+        pipeline = getattr(self, "_pipeline", None)
+        if pipeline is None:
+            pipeline = PostSessionPipeline(
+                self.db_adapter,
+                self._post_session_stages(),
+                max_concurrency=getattr(self.config, "post_session_pipeline_concurrency", 3),
+            )
+            self._pipeline = pipeline
+        return pipeline
+
+    def _post_session_stages(self) -> list[PipelineStage]:
+        """Post-session stages and what each must wait for.
+
+        KIS feeds the story panels (narrative, moments, win contribution read
+        storytelling_kill_impact) and the session page's MVP ranking, so those
+        wait for it. Proximity panels and graph data read only round/proximity
+        tables and start immediately.
+
+        The KIS delete is its own run-once stage: a retry or a restart that
+        repeated it would wipe rows the warm (or any reader) had already
+        recomputed. Only the warm is retried. The warm runs after the delete
+        but does not depend on it: if the single delete fails, the pages are
+        still warmed (from the old rows, as before the delete existed) and the
+        KIS coverage reconcile loop catches the stale rows.
+        """
+        return [
+            PipelineStage("kis_invalidate", self._stage_kis_invalidate, max_attempts=1),
+            PipelineStage("kis", self._stage_kis, after=("kis_invalidate",)),
+            PipelineStage("s_effort", self._stage_s_effort),
+            PipelineStage("prox_panels", self._stage_prox_panels),
+            PipelineStage("session_graphs", self._stage_session_graphs),
+            PipelineStage("story_panels", self._stage_story_panels, depends_on=("kis",)),
+            PipelineStage("session_page", self._stage_session_page,
+                          depends_on=("kis", "s_effort")),
+        ]
 
-            # s.effort session persist: the endpoint computes AND persists
-            # scope='session' rows. Runs REGARDLESS of stopwatch scoring
-            # success (player stats can be valid without a team result),
-            # scoped to the session START date (midnight-safe — the endpoint
-            # ranks sessions by MIN(round_date)), and fired as a background
-            # task so a slow/unreachable website can never hold teardown.
-            self._background_task(
-                self._persist_s_effort(start_date or str(latest_date)),
-                name="s-effort-persist",
+    async def resume_post_session_pipeline(self) -> int:
+        """Resume ledger stages a previous bot process did not finish. Runs
+        once per process (on_ready fires again on every reconnect)."""
+        if getattr(self, "_post_session_resumed", False):
+            return 0
+        self._post_session_resumed = True
+        return await self._post_session_pipeline().resume_pending()
+
+    async def _stage_kis_invalidate(self, ctx: PostSessionContext) -> bool:
+        # Invalidates EVERY calendar date the session touched (KIS is cached
+        # per session_date), each scoped to the gsids resolved at finalize.
+        gsids = list(ctx.gaming_session_ids)
+        ok = True
+        for sd in ctx.session_dates:
+            ok = await self._invalidate_kis_cache(sd, gsids=gsids) and ok
+        return ok
+
+    async def _stage_kis(self, ctx: PostSessionContext) -> bool:
+        # Warm the SAME scope that was just deleted. Warming by gaming
+        # session id also sidesteps the ambiguous-date 409 the story-scope
+        # contract raises when one calendar date holds two sessions.
+        # A skipped warm (no secret) is None, so only a real failure retries.
+        scopes = [(sd, gsid) for sd in ctx.session_dates
+                  for gsid in (ctx.gaming_session_ids or (None,))]
+        results = [await self.warm_kis_cache(sd, gaming_session_id=gsid)
+                   if gsid is not None else await self.warm_kis_cache(sd)
+                   for sd, gsid in scopes]
+        return False not in results
+
+    async def _stage_s_effort(self, ctx: PostSessionContext) -> bool | None:
+        return await self._persist_s_effort(ctx.start_date)
+
+    def _story_scopes(self, ctx: PostSessionContext) -> list[dict]:
+        # Same query the Story page sends: gsid-native, date only for legacy
+        # rounds that never got a gaming_session_id.
+        if ctx.gaming_session_ids:
+            return [{"gaming_session_id": gsid} for gsid in ctx.gaming_session_ids]
+        return [{"session_date": ctx.start_date}]
+
+    async def _stage_story_panels(self, ctx: PostSessionContext) -> bool:
+        requests = []
+        for scope in self._story_scopes(ctx):
+            requests.extend(
+                (f"/storytelling/{panel}", scope)
+                for panel in ("narrative", "momentum", "synergy", "win-contribution", "box-score")
             )
+            # moment detection: the Story page asks for 10, session detail for 5
+            requests.append(("/storytelling/moments", {**scope, "limit": 10}))
+            requests.append(("/storytelling/moments", {**scope, "limit": 5}))
+            if "gaming_session_id" in scope:
+                requests.append(("/storytelling/momentum-session", scope))
+        return await self._warm_http_cache(requests)
+
+    async def _stage_prox_panels(self, ctx: PostSessionContext) -> bool:
+        requests = [
+            (f"/storytelling/{panel}", scope)
+            for scope in self._story_scopes(ctx)
+            for panel in ("gravity", "space-created", "enabler", "lurker-profile")
+        ]
+        return await self._warm_http_cache(requests)
+
+    async def _stage_session_graphs(self, ctx: PostSessionContext) -> bool:
+        requests = [(f"/sessions/{ctx.start_date}/graphs", {})]
+        requests += [(f"/sessions/{ctx.start_date}/graphs", {"gaming_session_id": gsid})
+                     for gsid in ctx.gaming_session_ids]
+        return await self._warm_http_cache(requests)
 
+    async def _stage_session_page(self, ctx: PostSessionContext) -> bool:
+        return await self._warm_http_cache([(f"/sessions/{ctx.start_date}", {})])
+
+    async def _warm_http_cache(self, requests: list[tuple[str, dict]]) -> bool:
+        """GET public endpoints so the website's HTTP cache holds the answer.
+
+        Deliberately anonymous — HTTPCacheMiddleware does not cache requests
+        carrying Authorization/Cookie, and these are public reads anyway. The
+        middleware keys on the sorted query string, so the params here only
+        have to match the page's params, not their order. True only when
+        every request came back 200. Best-effort; must never raise.
+        """
+        ok = True
+        try:
+            import aiohttp
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(timeout=timeout) as sess:
+                for path, params in requests:
+                    url = f"{self.config.website_api_base}{path}"
+                    try:
+                        async with sess.get(url, params=params or None) as resp:
+                            if resp.status != 200:
+                                ok = False
+                                logger.warning("Post-session warm HTTP %s for %s %s",
+                                               resp.status, path, params)
+                    except Exception as e:
+                        ok = False
+                        logger.warning("Post-session warm failed for %s %s: %s",
+                                       path, params, e)
         except Exception as e:
-            logger.error(f"❌ Error finalizing session results: {e}", exc_info=True)
+            logger.warning("Post-session warm could not start: %s", e)
+            return False
+        return ok
 
     async def _session_gsids(self, round_ids) -> list[int]:
         """Distinct gaming_session_id values behind this session's rounds.
@@ -535,9 +698,10 @@ class VoiceSessionService:
             logger.warning("session dates-touched lookup failed", exc_info=True)
             return []
 
-    async def _invalidate_kis_cache(self, session_date: str, gsids=None) -> None:
-        """Delete stale storytelling_kill_impact rows for session_date, then
-        proactively warm the cache with a fresh compute.
+    async def _invalidate_kis_cache(self, session_date: str, gsids=None) -> bool:
+        """Delete stale storytelling_kill_impact rows for session_date; the
+        pipeline's `kis` stage then proactively warms the cache with a fresh
+        compute. True when the delete went through.
 
         SINGLE delete only — a first attempt at this also re-ran the delete
         after a delay to catch an in-flight compute that finishes late, but
@@ -559,7 +723,7 @@ class VoiceSessionService:
         left them with ZERO KIS data for as long as SESSION_DIGEST_ENABLED
         is off or its HTTP call fails, since nothing else naturally
         refreshes the cache (codex, "Warm direct KIS readers after
-        deleting the cache"). The warm call below mirrors
+        deleting the cache"). The warm call (`_stage_kis`) mirrors
         session_digest_service.py's _fetch_kis_top: a plain GET to the
         existing public endpoint, whose own cache-miss path recomputes for
         real now that the session has ended and every kill is in
@@ -578,17 +742,11 @@ class VoiceSessionService:
         the website's compute path — deliberately deferred: those are the
         same files an in-flight internal-auth PR is touching, and this
         bot-only change should not race with that (codex, "Serialize KIS
-        invalidation with in-flight computes"). Best-effort; must never
+        invalidation with in-flight computes"). The same hazard is why the
+        pipeline runs this delete once and never retries it: a retry would
+        land after the warm had refilled the table. Best-effort; must never
         raise."""
-        await self._delete_kis_rows(session_date, gsids=gsids)
-        # Warm the SAME scope that was just deleted. Warming by gaming
-        # session id also sidesteps the ambiguous-date 409 the story-scope
-        # contract raises when one calendar date holds two sessions.
-        if gsids:
-            for gsid in gsids:
-                await self.warm_kis_cache(session_date, gaming_session_id=gsid)
-        else:
-            await self.warm_kis_cache(session_date)
+        return await self._delete_kis_rows(session_date, gsids=gsids)
 
 
     def _background_task(self, coro, *, name=None):
@@ -616,7 +774,8 @@ class VoiceSessionService:
         task.add_done_callback(_log_failure)
         return task
 
-    async def warm_kis_cache(self, session_date: str, gaming_session_id: int | None = None) -> bool:
+    async def warm_kis_cache(self, session_date: str,
+                             gaming_session_id: int | None = None) -> bool | None:
         """Trigger a KIS compute for one session. PUBLIC: two callers need it —
         the voice-session end path below, and the bot's KIS coverage reconcile
         loop, which is the safety net for every way this trigger can be missed.
@@ -626,10 +785,11 @@ class VoiceSessionService:
         session_digest_service.py's _fetch_kis_top call pattern.
         Best-effort; must never raise.
 
-        Returns True only when a compute actually ran (HTTP 200). A missing
-        secret, an unreachable website or a non-200 answer all return False:
-        the reconcile loop counts retries, and counting one for a call that
-        never reached the compute would exhaust a session's attempts during a
+        Returns True only when a compute actually ran (HTTP 200). An
+        unreachable website or a non-200 answer return False, and a missing
+        secret returns None (skipped — retrying cannot help). Neither counts
+        as an attempt in the reconcile loop: counting a call that never
+        reached the compute would exhaust a session's attempts during a
         website restart and abandon it until the bot itself restarts."""
         # Warming's whole job is to TRIGGER a compute, which now requires a
         # valid internal token. Without a secret the call can only ever come
@@ -639,7 +799,7 @@ class VoiceSessionService:
         if not secret:
             logger.warning("KIS cache warm skipped for %s: INTERNAL_API_SECRET "
                            "not configured on the bot", session_date)
-            return False
+            return None
         url = "(unbuilt)"
         try:
             import aiohttp
@@ -667,7 +827,7 @@ class VoiceSessionService:
                             session_date, url, e)
             return False
 
-    async def _delete_kis_rows(self, session_date: str, gsids=None) -> None:
+    async def _delete_kis_rows(self, session_date: str, gsids=None) -> bool:
         """Delete THIS session's cached KIS rows for session_date.
 
         A bare `WHERE session_date = ?` wiped every gaming session sharing
@@ -686,7 +846,7 @@ class VoiceSessionService:
         removed and immediately rescored by the warm, while rows belonging
         to the neighbour, or to no resolvable round at all, survive.
         Without `gsids` the delete falls back to the old date-wide
-        behaviour."""
+        behaviour. Returns False when the delete failed."""
         try:
             sd = datetime.fromisoformat(str(session_date)[:10]).date()
             if gsids:
@@ -714,8 +874,10 @@ class VoiceSessionService:
                     (sd,),
                 )
             logger.info("✅ KIS cache invalidated for %s (recomputes on next read)", session_date)
+            return True
         except Exception as e:
             logger.warning("KIS cache invalidation failed for %s: %s", session_date, e)
+            return False
 
     async def _session_start_date(self, round_ids) -> str | None:
         """MIN(round_date) over the session's rounds — the s.effort endpoint
@@ -745,10 +907,12 @@ class VoiceSessionService:
             logger.warning("session start-date lookup failed", exc_info=True)
             return None
 
-    async def _persist_s_effort(self, session_date: str) -> None:
+    async def _persist_s_effort(self, session_date: str) -> bool | None:
         """Best-effort GET to /skill/s-effort so the session's pool-adjusted
         ratings land in player_skill_history right at session end. Runs as a
-        background task; must never raise."""
+        post-session pipeline stage; must never raise. True only on HTTP 200;
+        None when skipped for a missing secret, so the stage is not retried
+        and does not block the session page."""
         # s.effort persist is internal-only (it writes player_skill_history via
         # the write-through GET). Without a secret it can only return 401, so
         # skip with one clear warning rather than failing noisily each session.
@@ -756,7 +920,7 @@ class VoiceSessionService:
         if not secret:
             logger.warning("s.effort persist skipped for %s: INTERNAL_API_SECRET "
                            "not configured on the bot", session_date)
-            return
+            return None
         url = "(unbuilt)"
         try:
             import aiohttp
@@ -768,13 +932,15 @@ class VoiceSessionService:
                     sess.get(url, headers=headers) as resp:
                 if resp.status == 200:
                     logger.info("✅ s.effort persisted for %s", session_date)
-                else:
-                    logger.warning("s.effort persist HTTP %s for %s "
-                                   "(old website build without the endpoint?)",
-                                   resp.status, session_date)
+                    return True
+                logger.warning("s.effort persist HTTP %s for %s "
+                               "(old website build without the endpoint?)",
+                               resp.status, session_date)
+                return False
         except Exception:
             logger.warning("s.effort persist call failed (non-fatal): %s",
                            url, exc_info=True)
+            return False
 
     async def auto_end_session(self):
         """
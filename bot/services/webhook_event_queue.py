@@ -7,32 +7,49 @@ pattern on every webhook. With the queue:
   spawned by `_safe_create_task` still returns quickly — no change to
   Discord gateway responsiveness — but we no longer fan out N parallel
   SSH fetches when webhooks burst.
-- A single dedicated worker coroutine drains the queue and processes
-  rounds sequentially: fetch stats → store Lua → delete webhook msg.
-  Sequential ordering prevents SSH overload and makes intra-second
-  STATS_READY bursts deterministic.
+- Work is partitioned by gaming session: a round joins the partition of
+  any queued round that ended within the session gap of it, and each
+  partition is handled strictly in arrival order. Rounds of one session
+  must not import concurrently — the import assigns `gaming_session_id`
+  from the previous round (or MAX+1) and rebuilds the session's teams, so
+  two maps of one night racing through it could split the session.
+  Separate sessions (a replayed backlog, a second night) run concurrently
+  on a small worker pool (`workers`, default 2), which also bounds
+  parallel SSH fetches.
+
+  The trade-off: one night's session is processed serially. The old
+  per-map partitions let two maps of the same night import side by side;
+  now a burst of that night's rounds drains one at a time, and the worker
+  pool only adds parallelism across sessions. Rounds arrive minutes apart
+  during play, so this only lengthens the drain of a backlog (a restart
+  replay, an SSH outage catching up) within a single session.
 - Dedup on `(map, round_number, round_end_unix)` with a short TTL —
   a Lua retry after a Discord blip hits the dedup set and skips the
   redundant fetch instead of racing with the in-flight one.
-
-Future: per-server workers once we scale past one game server, and a
-Redis- or DB-backed queue once restart survivability matters. This
-in-process asyncio.Queue is the minimal safe step for today's single
-server.
+- Durable when given a `WebhookQueueStore`: every accepted round is
+  written to `webhook_round_queue`, claimed with `FOR UPDATE SKIP LOCKED`
+  before the handler runs, and marked done/failed after. On startup
+  `replay()` re-enqueues rounds a crashed process accepted but never
+  finished. The store is best-effort — if the table is missing or the DB
+  hiccups the queue keeps working in memory, exactly as before.
+
+The accept itself stays synchronous (the row insert is scheduled, and
+the worker waits for it before claiming), so a crash inside the few
+milliseconds between accept and insert can still lose a round; the
+SSH-poll path covers that window like it always has.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable
 
 from bot.logging_config import get_logger
 
-if TYPE_CHECKING:
-    pass
-
 logger = get_logger("bot.webhook_queue")
 
 # Dedup TTL is tight on purpose: Lua's realistic retry window after a
@@ -41,6 +58,38 @@ logger = get_logger("bot.webhook_queue")
 # with handler-raises-on-soft-fail, 2 min is defense-in-depth.
 DEDUP_TTL_SECONDS = 120
 DEFAULT_QUEUE_SIZE = 50   # generous headroom; peak is ~1 webhook / 3 min today
+DEFAULT_WORKERS = 2       # concurrent sessions; each one means one SSH fetch in flight
+# Rounds that end within this of each other share a session partition. The
+# bot passes its widest session gap; grouping too much only costs concurrency.
+DEFAULT_SESSION_GAP_SECONDS = 60 * 60
+
+# A 'processing' row older than this belongs to a process that died
+# mid-round; replay takes it over. Longer than the slowest endstats retry.
+REPLAY_STALE_SECONDS = 600
+# Finished rows are kept this long for lag/audit queries, then pruned.
+DONE_RETENTION_DAYS = 7
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_QUEUE_DDL = """
+    CREATE TABLE IF NOT EXISTS webhook_round_queue (
+        id            BIGSERIAL   PRIMARY KEY,
+        partition_key TEXT        NOT NULL,
+        dedup_key     TEXT        NULL,
+        metadata      TEXT        NOT NULL,
+        channel_id    BIGINT      NULL,
+        message_id    BIGINT      NULL,
+        status        TEXT        NOT NULL DEFAULT 'pending',
+        attempts      INTEGER     NOT NULL DEFAULT 0,
+        last_error    TEXT        NULL,
+        enqueued_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        claimed_at    TIMESTAMPTZ NULL,
+        finished_at   TIMESTAMPTZ NULL
+    )
+"""
 
 
 class WebhookHandlerSoftFail(Exception):
@@ -60,6 +109,9 @@ class QueuedRound:
     metadata: dict
     message: Any  # discord.Message — kept as Any so tests don't need discord.py
     received_at: float = field(default_factory=time.time)
+    row_id: int | None = None
+    persist_task: asyncio.Task | None = None
+    partition: str = ""  # assigned by the queue on push
 
 
 def _dedup_key(metadata: dict) -> str | None:
@@ -85,11 +137,80 @@ def _dedup_key(metadata: dict) -> str | None:
     )
 
 
+class WebhookQueueStore:
+    """`webhook_round_queue` persistence for WebhookEventQueue (best-effort)."""
+
+    def __init__(self, db_adapter):
+        self.db_adapter = db_adapter
+        self._schema_ready = False
+
+    async def ensure_schema(self) -> None:
+        # migrations/080 is the primary path; this covers a fresh dev DB.
+        if self._schema_ready:
+            return
+        exists = await self.db_adapter.fetch_val(
+            "SELECT to_regclass('webhook_round_queue') IS NOT NULL")
+        if not exists:
+            await self.db_adapter.execute(_QUEUE_DDL)
+        self._schema_ready = True
+
+    async def insert(self, item: QueuedRound) -> int | None:
+        await self.ensure_schema()
+        message = item.message
+        channel = getattr(message, 'channel', None)
+        return await self.db_adapter.fetch_val(
+            "INSERT INTO webhook_round_queue "
+            "(partition_key, dedup_key, metadata, channel_id, message_id) "
+            "VALUES (?, ?, ?, ?, ?) RETURNING id",
+            (item.partition, _dedup_key(item.metadata),
+             json.dumps(item.metadata, default=str),
+             getattr(channel, 'id', None), getattr(message, 'id', None)),
+        )
+
+    async def claim(self, row_id: int) -> bool:
+        """Take the row for this process; False if another process holds it."""
+        claimed = await self.db_adapter.fetch_val(
+            "UPDATE webhook_round_queue SET status = ?, claimed_at = NOW(), "
+            "attempts = attempts + 1 "
+            "WHERE id = (SELECT id FROM webhook_round_queue WHERE id = ? "
+            "AND (status = ? OR (status = ? AND claimed_at < NOW() - make_interval(secs => ?))) "
+            "FOR UPDATE SKIP LOCKED) RETURNING id",
+            (STATUS_PROCESSING, row_id, STATUS_PENDING, STATUS_PROCESSING,
+             REPLAY_STALE_SECONDS),
+        )
+        return claimed is not None
+
+    async def finish(self, row_id: int, status: str, error: str | None = None) -> None:
+        await self.db_adapter.execute(
+            "UPDATE webhook_round_queue SET status = ?, last_error = ?, finished_at = NOW() "
+            "WHERE id = ?",
+            (status, error, row_id),
+        )
+
+    async def unfinished(self) -> list[tuple]:
+        """Rows a previous process accepted but never finished, oldest first."""
+        await self.ensure_schema()
+        await self.db_adapter.execute(
+            "DELETE FROM webhook_round_queue WHERE status IN (?, ?) "
+            "AND finished_at < NOW() - make_interval(days => ?)",
+            (STATUS_DONE, STATUS_FAILED, DONE_RETENTION_DAYS),
+        )
+        return await self.db_adapter.fetch_all(
+            "SELECT id, metadata, channel_id, message_id FROM webhook_round_queue "
+            "WHERE status = ? "
+            "OR (status = ? AND claimed_at < NOW() - make_interval(secs => ?)) "
+            "ORDER BY id",
+            (STATUS_PENDING, STATUS_PROCESSING, REPLAY_STALE_SECONDS),
+        )
+
+
 class WebhookEventQueue:
-    """Bounded queue + single worker for STATS_READY webhook processing.
+    """Bounded, session-partitioned queue + worker pool for STATS_READY processing.
 
     Usage:
-        queue = WebhookEventQueue(bot, handler=bot._process_stats_ready_round)
+        queue = WebhookEventQueue(bot, handler=bot._process_stats_ready_round,
+                                  store=WebhookQueueStore(bot.db_adapter))
+        await queue.replay()               # re-enqueue rounds a crash left behind
         queue.start()
         ...
         queue.enqueue(metadata, message)   # from webhook receive
@@ -103,13 +224,28 @@ class WebhookEventQueue:
         handler: Callable[[dict, Any], Awaitable[None]],
         maxsize: int = DEFAULT_QUEUE_SIZE,
         dedup_ttl_seconds: int = DEDUP_TTL_SECONDS,
+        store: WebhookQueueStore | None = None,
+        workers: int = DEFAULT_WORKERS,
+        session_gap_seconds: int = DEFAULT_SESSION_GAP_SECONDS,
     ):
         self._bot = bot
         self._handler = handler
-        self._q: asyncio.Queue[QueuedRound] = asyncio.Queue(maxsize=maxsize)
+        self._store = store
+        self._maxsize = maxsize
+        self._workers = max(1, workers)
+        self._session_gap = max(0, session_gap_seconds)
+        # partition -> rounds in arrival order; a partition is in `_ready`
+        # (and so owned by at most one worker) only while it has work and
+        # nobody is processing it.
+        self._partitions: dict[str, deque[QueuedRound]] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._busy: set[str] = set()
+        # partition -> [first, last] round_end_unix of the rounds it holds
+        self._sessions: dict[str, list[int]] = {}
+        self._depth = 0
         self._seen: dict[str, float] = {}
         self._dedup_ttl = dedup_ttl_seconds
-        self._worker_task: asyncio.Task | None = None
+        self._worker_tasks: list[asyncio.Task] = []
         self._shutdown = asyncio.Event()
         self._stats = {
             "enqueued": 0,
@@ -118,6 +254,9 @@ class WebhookEventQueue:
             "processed": 0,
             "handler_failures": 0,
             "soft_fails": 0,
+            "replayed": 0,
+            "claimed_elsewhere": 0,
+            "store_errors": 0,
         }
 
     # ------------------------------------------------------------------
@@ -143,16 +282,42 @@ class WebhookEventQueue:
         if key is not None and key in self._seen:
             self._stats["deduped"] += 1
             return (False, "duplicate")
-        try:
-            self._q.put_nowait(QueuedRound(metadata=metadata, message=message))
-        except asyncio.QueueFull:
+        if self._depth >= self._maxsize:
             self._stats["dropped_full"] += 1
             return (False, "queue_full")
+        item = QueuedRound(metadata=metadata, message=message)
+        self._push(item)
+        if self._store is not None:
+            item.persist_task = asyncio.get_running_loop().create_task(self._persist(item))
         if key is not None:
             self._seen[key] = time.monotonic() + self._dedup_ttl
         self._stats["enqueued"] += 1
         return (True, "ok")
 
+    def _session_partition(self, metadata: dict) -> str:
+        """Partition of the queued session this round belongs to, or a new one.
+
+        A round without `round_end_unix` is placed by its arrival time — a
+        live webhook fires at round end.
+        """
+        end_unix = int(metadata.get('round_end_unix', 0) or 0) or int(time.time())
+        for partition, span in self._sessions.items():
+            if span[0] - self._session_gap <= end_unix <= span[1] + self._session_gap:
+                span[0] = min(span[0], end_unix)
+                span[1] = max(span[1], end_unix)
+                return partition
+        partition = f"session@{end_unix}"
+        self._sessions[partition] = [end_unix, end_unix]
+        return partition
+
+    def _push(self, item: QueuedRound) -> None:
+        partition = item.partition = self._session_partition(item.metadata)
+        pending = self._partitions.setdefault(partition, deque())
+        pending.append(item)
+        self._depth += 1
+        if len(pending) == 1 and partition not in self._busy:
+            self._ready.put_nowait(partition)
+
     def _prune_seen(self) -> None:
         now = time.monotonic()
         # Prune lazily on every enqueue. For dozens of entries / 10 min
@@ -162,95 +327,225 @@ class WebhookEventQueue:
         for k in expired:
             self._seen.pop(k, None)
 
+    async def replay(self) -> int:
+        """Re-enqueue rounds persisted by a previous process but never finished.
+
+        Call before `start()`. Replayed rounds keep their original order
+        within each session and re-enter the dedup set, so a late Lua retry of
+        the same round collapses onto the replay.
+        """
+        if self._store is None:
+            return 0
+        try:
+            rows = await self._store.unfinished()
+        except Exception:
+            self._stats["store_errors"] += 1
+            logger.warning("webhook queue replay scan failed; nothing replayed", exc_info=True)
+            return 0
+        replayed = 0
+        for row_id, raw_metadata, channel_id, message_id in rows or []:
+            try:
+                metadata = json.loads(raw_metadata)
+            except (TypeError, ValueError):
+                logger.warning("webhook queue row %s has unreadable metadata; skipping", row_id)
+                continue
+            item = QueuedRound(metadata=metadata,
+                               message=self._replay_message(channel_id, message_id),
+                               row_id=row_id)
+            self._push(item)
+            key = _dedup_key(metadata)
+            if key is not None:
+                self._seen[key] = time.monotonic() + self._dedup_ttl
+            replayed += 1
+        if replayed:
+            self._stats["replayed"] += replayed
+            logger.info("webhook queue replayed %d unfinished round(s)", replayed)
+        return replayed
+
+    def _replay_message(self, channel_id, message_id):
+        # The handler only needs the message to delete it once the round is
+        # stored; a PartialMessage can do that without an API fetch.
+        if not channel_id or not message_id or self._bot is None:
+            return None
+        try:
+            channel = self._bot.get_channel(int(channel_id))
+            if channel is None:
+                return None
+            return channel.get_partial_message(int(message_id))
+        except Exception:  # noqa: BLE001 — cosmetic: the round still replays
+            return None
+
     # ------------------------------------------------------------------
     # Worker lifecycle
     # ------------------------------------------------------------------
 
     def start(self) -> None:
-        if self._worker_task is not None and not self._worker_task.done():
+        if any(not task.done() for task in self._worker_tasks):
             return
         self._shutdown.clear()
-        self._worker_task = asyncio.create_task(
-            self._worker_loop(), name="webhook_event_queue_worker"
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"webhook_event_queue_worker_{i}")
+            for i in range(self._workers)
+        ]
+        logger.info(
+            "webhook event queue started (maxsize=%d, workers=%d, durable=%s)",
+            self._maxsize, self._workers, self._store is not None,
         )
-        logger.info("webhook event queue worker started (maxsize=%d)", self._q.maxsize)
 
     async def stop(self, timeout: float = 10.0) -> None:
-        """Request shutdown and wait for the worker to drain + exit.
+        """Request shutdown and wait for the workers to drain + exit.
 
-        The worker loop keeps consuming while the queue has items even
+        The worker loops keep consuming while the queue has items even
         after `_shutdown` is set, so pending STATS_READY events aren't
-        lost on a graceful restart. If the timeout fires the worker is
-        cancelled as a last resort.
+        lost on a graceful restart. If the timeout fires the workers are
+        cancelled as a last resort (durable rounds replay on next start).
         """
         self._shutdown.set()
-        task = self._worker_task
-        if task is None:
+        tasks = [task for task in self._worker_tasks if not task.done()]
+        if not tasks:
+            self._worker_tasks = []
             return
         try:
-            await asyncio.wait_for(task, timeout=timeout)
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=timeout)
         except (asyncio.TimeoutError, TimeoutError):  # noqa: UP041 — Py 3.10 compat
             logger.warning(
-                "webhook event queue worker did not drain within %ss (%d items left) — cancelling",
-                timeout, self._q.qsize(),
+                "webhook event queue workers did not drain within %ss (%d items left) — cancelling",
+                timeout, self._depth,
             )
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                # Expected — we just cancelled it.
-                pass
-            except Exception:  # noqa: BLE001 — already logged inside worker loop
-                logger.exception("webhook queue worker raised during cancel")
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+                    logger.error("webhook queue worker raised during cancel: %s", result)
         finally:
-            self._worker_task = None
+            self._worker_tasks = []
 
     async def _worker_loop(self) -> None:
         # Drain-on-stop: keep consuming while the queue has items even
         # after shutdown is requested, so a graceful restart doesn't
         # drop STATS_READY events that already made it into the queue.
         while True:
-            if self._shutdown.is_set() and self._q.empty():
+            if self._shutdown.is_set() and self._depth == 0:
                 break
             try:
-                item = await asyncio.wait_for(self._q.get(), timeout=1.0)
+                partition = await asyncio.wait_for(self._ready.get(), timeout=1.0)
             except (asyncio.TimeoutError, TimeoutError):  # noqa: UP041 — Py 3.10 compat
                 continue
-            key = _dedup_key(item.metadata)
+            pending = self._partitions.get(partition)
+            if not pending:
+                continue
+            self._busy.add(partition)
+            item = pending.popleft()
             try:
-                await self._handler(item.metadata, item.message)
-                self._stats["processed"] += 1
-            except WebhookHandlerSoftFail as exc:
-                # Expected transient outcome (e.g. stats file not ready yet):
-                # clear the dedup entry so a Lua retry is allowed through,
-                # but log quietly and don't count it as a handler failure.
-                self._stats["soft_fails"] += 1
-                if key is not None:
-                    self._seen.pop(key, None)
-                logger.debug(
-                    "webhook queue soft-fail for %s — dedup cleared, awaiting retry: %s",
-                    key,
-                    exc,
-                )
-            except Exception:
-                # Handler failure: drop the dedup entry so the next Lua
-                # retry for this round is allowed through. Keeping the
-                # entry would lock the round out of recovery until the
-                # TTL expires.
-                self._stats["handler_failures"] += 1
-                if key is not None:
-                    self._seen.pop(key, None)
-                logger.exception(
-                    "webhook queue handler raised for %s — dedup cleared, continuing",
-                    key,
-                )
+                await self._process(item)
             finally:
-                self._q.task_done()
+                self._depth -= 1
+                self._busy.discard(partition)
+                if pending:
+                    # Back of the line: other sessions get a turn between rounds.
+                    self._ready.put_nowait(partition)
+                else:
+                    self._partitions.pop(partition, None)
+                    self._sessions.pop(partition, None)
+
+    async def _process(self, item: QueuedRound) -> None:
+        key = _dedup_key(item.metadata)
+        if not await self._claim(item):
+            self._stats["claimed_elsewhere"] += 1
+            logger.info("webhook queue round %s claimed by another process; skipping", key)
+            return
+        try:
+            await self._handler(item.metadata, item.message)
+            self._stats["processed"] += 1
+            await self._finish(item, STATUS_DONE)
+        except WebhookHandlerSoftFail as exc:
+            # Expected transient outcome (e.g. stats file not ready yet):
+            # clear the dedup entry so a Lua retry is allowed through,
+            # but log quietly and don't count it as a handler failure.
+            self._stats["soft_fails"] += 1
+            if key is not None:
+                self._seen.pop(key, None)
+            logger.debug(
+                "webhook queue soft-fail for %s — dedup cleared, awaiting retry: %s",
+                key,
+                exc,
+            )
+            await self._finish(item, STATUS_FAILED, f"soft-fail: {exc}")
+        except Exception as exc:
+            # Handler failure: drop the dedup entry so the next Lua
+            # retry for this round is allowed through. Keeping the
+            # entry would lock the round out of recovery until the
+            # TTL expires.
+            self._stats["handler_failures"] += 1
+            if key is not None:
+                self._seen.pop(key, None)
+            logger.exception(
+                "webhook queue handler raised for %s — dedup cleared, continuing",
+                key,
+            )
+            await self._finish(item, STATUS_FAILED, f"{type(exc).__name__}: {exc}")
+
+    # ------------------------------------------------------------------
+    # Durability (best-effort)
+    # ------------------------------------------------------------------
+
+    async def _persist(self, item: QueuedRound) -> None:
+        try:
+            item.row_id = await self._store.insert(item)
+        except Exception:
+            self._stats["store_errors"] += 1
+            logger.warning("webhook queue persist failed; round stays in memory only",
+                           exc_info=True)
+
+    async def _claim(self, item: QueuedRound) -> bool:
+        if item.persist_task is not None:
+            await item.persist_task
+        if self._store is None or item.row_id is None:
+            return True
+        try:
+            return await self._store.claim(item.row_id)
+        except Exception:
+            # DB blip: process anyway — a duplicate fetch is harmless, a
+            # dropped round is not.
+            self._stats["store_errors"] += 1
+            logger.warning("webhook queue claim failed for row %s; processing anyway",
+                           item.row_id, exc_info=True)
+            return True
+
+    async def _finish(self, item: QueuedRound, status: str, error: str | None = None) -> None:
+        if self._store is None or item.row_id is None:
+            return
+        try:
+            await self._store.finish(item.row_id, status, error[:500] if error else None)
+        except Exception:
+            self._stats["store_errors"] += 1
+            logger.warning("webhook queue finish failed for row %s", item.row_id, exc_info=True)
 
     # ------------------------------------------------------------------
     # Observability
     # ------------------------------------------------------------------
 
-    def stats(self) -> dict[str, int]:
+    def partition_lag(self) -> dict[str, dict[str, float]]:
+        """Per-session depth and age of the oldest waiting round (seconds)."""
+        now = time.time()
+        return {
+            partition: {
+                "depth": len(pending),
+                "lag_seconds": round(now - pending[0].received_at, 1),
+                "busy": partition in self._busy,
+            }
+            for partition, pending in self._partitions.items()
+            if pending
+        }
+
+    def stats(self) -> dict[str, Any]:
         """Snapshot of counters. Cheap, safe to call from diagnostics."""
-        return {**self._stats, "queue_depth": self._q.qsize(), "seen_keys": len(self._seen)}
+        partitions = self.partition_lag()
+        return {
+            **self._stats,
+            "queue_depth": self._depth,
+            "seen_keys": len(self._seen),
+            "partitions": partitions,
+            "max_lag_seconds": max((p["lag_seconds"] for p in partitions.values()), default=0.0),
+        }
@@ -294,6 +294,13 @@ class _WebhookHandlerMixin:
                     logger.debug("Discord notification failed (non-critical)")
                 return
 
+            # A WebSocket push or the SSH poll may already be fetching it
+            if not await self.file_discovery.announce(filename, "webhook"):
+                webhook_logger.info(
+                    f"⏭️ {filename} already claimed by {self.file_discovery.claimed_by(filename)}"
+                )
+                return
+
             # IMMEDIATELY mark as being processed to prevent race with polling
             self.file_tracker.processed_files.add(filename)
             added_processing_marker = True
@@ -317,6 +324,7 @@ class _WebhookHandlerMixin:
                 webhook_logger.error(f"❌ Failed to download: {filename}")
                 if added_processing_marker:
                     self.file_tracker.processed_files.discard(filename)
+                    self.file_discovery.forget(filename)
                 # React to trigger with failure indicator
                 try:
                     await trigger_message.add_reaction('❌')
@@ -362,6 +370,7 @@ class _WebhookHandlerMixin:
                 webhook_logger.warning(f"⚠️ Processing failed for {filename}: {error_msg}")
                 if added_processing_marker:
                     self.file_tracker.processed_files.discard(filename)
+                    self.file_discovery.forget(filename)
                 # Notify trigger channel of processing failure
                 try:
                     await trigger_message.add_reaction('⚠️')
@@ -377,6 +386,7 @@ class _WebhookHandlerMixin:
         except Exception as e:
             if added_processing_marker:
                 self.file_tracker.processed_files.discard(filename)
+                self.file_discovery.forget(filename)
             webhook_logger.error(f"❌ Error processing webhook-triggered file: {e}", exc_info=True)
             # Notify trigger channel of critical error
             try:
@@ -29,6 +29,7 @@ from bot.core.team_manager import TeamManager
 from bot.core.utils import sanitize_error_message
 from bot.repositories import FileRepository
 from bot.services.admin_alert_mixin import _AdminAlertMixin
+from bot.services.automation.file_discovery import FileDiscoveryService
 from bot.services.endstats_pipeline_mixin import _EndstatsPipelineMixin
 from bot.services.lua_round_storage_mixin import _LuaRoundStorageMixin
 from bot.services.monitor_tasks_mixin import _MonitorTasksMixin
@@ -172,6 +173,15 @@ class UltimateETLegacyBot(
         )
         logger.info("✅ Core systems initialized (cache, seasons, achievements, file_tracker)")
 
+        # One claimed stream for files announced by WebSocket push, the webhook
+        # trigger and the SSH poll; push and post-reconnect resync deliveries
+        # are handled by _handle_ws_file_notification.
+        self.file_discovery = FileDiscoveryService(
+            self._list_remote_stats_files,
+            on_new_file=self._handle_ws_file_notification,
+            grace_minutes=self.config.monitoring_grace_period_minutes,
+        )
+
         # Gametimes fallback tracking (Lua webhook JSON files)
         self._load_gametimes_index()
 
@@ -360,6 +370,12 @@ class UltimateETLegacyBot(
         except Exception as e:
             logger.error(f"⚠️ Error stopping monitoring service: {e}")
 
+        try:
+            if getattr(self, 'metrics', None) is not None:
+                await self.metrics.close()  # flushes buffered metrics rows
+        except Exception as e:
+            logger.error(f"⚠️ Error closing metrics logger: {e}")
+
         try:
             if hasattr(self, 'db_adapter'):
                 await self.db_adapter.close()
@@ -791,15 +807,28 @@ class UltimateETLegacyBot(
         # Sync existing local files to processed_files table
         await self.file_tracker.sync_local_files_to_processed_table()
 
-        # Webhook event queue — sequentialises STATS_READY processing so
-        # burst webhooks don't fan out into N parallel SSH fetches, and
-        # deduplicates on (map, round_number, round_end_unix) for Lua
-        # retries. Worker calls _process_stats_ready_round() on each
+        # Webhook event queue — partitions STATS_READY processing by gaming
+        # session (rounds ending within session_gap_seconds of a queued
+        # round share a partition, handled strictly in order; separate
+        # sessions run in parallel) so burst webhooks don't fan out into N
+        # parallel SSH fetches and one night's maps never race through the
+        # import. A live night is therefore serial; only a replayed backlog
+        # or a second session gets concurrency. Deduplicates on
+        # (map, round_number, round_end_unix) for Lua retries. Accepted rounds are persisted and replayed here after a
+        # restart. Workers call _process_stats_ready_round() on each
         # dequeue; see bot/services/webhook_event_queue.py.
-        from bot.services.webhook_event_queue import WebhookEventQueue
+        from bot.services.webhook_event_queue import WebhookEventQueue, WebhookQueueStore
         self.webhook_event_queue = WebhookEventQueue(
             self, handler=self._process_stats_ready_round,
+            store=WebhookQueueStore(self.db_adapter),
+            workers=getattr(self.config, 'webhook_queue_workers', 2),
+            # The competitive gap can extend a session while players sit in voice.
+            session_gap_seconds=60 * max(
+                getattr(self.config, 'session_gap_minutes', 60),
+                getattr(self.config, 'competitive_session_gap_minutes', 180),
+            ),
         )
+        await self.webhook_event_queue.replay()
         self.webhook_event_queue.start()
         logger.info("✅ Webhook event queue worker started")
 
@@ -845,7 +874,8 @@ class UltimateETLegacyBot(
             try:
                 self.ws_client = StatsWebSocketClient(
                     self.config,
-                    on_new_file=self._handle_ws_file_notification
+                    on_new_file=lambda filename: self.file_discovery.submit(filename, "ws"),
+                    on_connect=lambda: self.file_discovery.resync("ws"),
                 )
                 self.ws_client.start()
                 logger.info("🔌 WebSocket client started")
@@ -874,15 +904,20 @@ class UltimateETLegacyBot(
             f"📋 Commands available: {[cmd.name for cmd in self.commands]}"
         )
 
-    async def _handle_ws_file_notification(self, filename: str):
+    async def _handle_ws_file_notification(self, filename: str) -> bool:
         """
         Handle file notification from WebSocket push.
 
-        Called by StatsWebSocketClient when VPS notifies of new file.
-        Downloads file via SSH, processes, and posts to Discord.
+        Called through FileDiscoveryService for WebSocket pushes and for files
+        recovered after a reconnect. Downloads file via SSH, processes, and
+        posts to Discord.
 
         Args:
             filename: Name of the new stats file on remote server
+
+        Returns:
+            False when the file could not be imported, so the discovery claim
+            is released and the SSH poll retries it
         """
         try:
             logger.info(f"📥 WebSocket notification: {filename}")
@@ -891,7 +926,7 @@ class UltimateETLegacyBot(
             # should_process_file returns True if file needs processing
             if not await self.file_tracker.should_process_file(filename):
                 logger.debug(f"⏭️ File already processed: {filename}")
-                return
+                return True
 
             # Build SSH config
             ssh_config = {
@@ -909,7 +944,7 @@ class UltimateETLegacyBot(
 
             if not local_path:
                 logger.error(f"❌ Failed to download: {filename}")
-                return
+                return False
 
             # Track download time for grace period logic (fallback SSH uses this)
             self.last_file_download_time = datetime.now()  # noqa: DTZ005 naive datetime intentional — local/UTC mix is project convention (CET game server + UTC prod). See PR #216 rationale
@@ -937,9 +972,22 @@ class UltimateETLegacyBot(
                     await self.track_error("discord_posting", f"Failed to post {filename}: {post_err}", max_consecutive=2)
             else:
                 logger.warning(f"⚠️ File processed but no stats: {filename}")
+                return False
 
         except Exception as e:
             logger.error(f"❌ WebSocket file handler error: {e}", exc_info=True)
+            return False
+        return True
+
+    async def _list_remote_stats_files(self) -> list[str]:
+        """The remote stats directory listing (FileDiscoveryService resync)."""
+        return await SSHHandler.list_remote_files({
+            "host": self.config.ssh_host,
+            "port": self.config.ssh_port,
+            "user": self.config.ssh_user,
+            "key_path": self.config.ssh_key_path,
+            "remote_path": self.config.ssh_remote_path,
+        })
 
     async def initialize_database(self):
         # Verify critical tables exist
@@ -1158,6 +1206,9 @@ class UltimateETLegacyBot(
                 if override_metadata:
                     await self._apply_round_metadata_override(filename, override_metadata)
 
+                # New round is committed: drop cached command reads
+                self.db_adapter.bump_data_version(f"imported {filename}")
+
                 # Live achievements: announce new milestones (non-blocking)
                 if stats_data:
                     self._safe_create_task(self._post_live_achievements(stats_data), name="live_achievements")
@@ -1199,6 +1250,7 @@ class UltimateETLegacyBot(
 
                 # Reset error tracking on success
                 self.reset_error_tracking("file_processing")
+                self.db_adapter.bump_data_version(f"imported {filename}")
 
                 # Live achievements: announce new milestones (non-blocking)
                 if stats_data:
@@ -2138,6 +2190,13 @@ class UltimateETLegacyBot(
         # 🆕 AUTO-DETECT ACTIVE GAMING SESSION ON STARTUP
         await self.voice_session_service.check_startup_voice_state()
 
+        # Resume post-session precompute stages a previous process left
+        # unfinished (bot restarted between session end and the warm).
+        self._safe_create_task(
+            self.voice_session_service.resume_post_session_pipeline(),
+            name="post-session-resume",
+        )
+
         # 📊 Start monitoring service (server + voice history)
         if self.monitoring_enabled:
             try:
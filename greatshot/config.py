@@ -22,6 +22,16 @@ class GreatshotConfig:
 
     analysis_queue_workers: int = 1
     render_queue_workers: int = 1
+    # "inline" runs the workers inside the web process; "pool" leaves the jobs
+    # to `python -m greatshot.worker` processes (see greatshot/worker/pool.py).
+    job_mode: str = "inline"
+    # Per-demo-SHA-256 cache of the normalized UDT timeline
+    # (scanner/timeline_artifact.py). None disables it for direct scanner use;
+    # the web job service passes <storage_root>/timeline_cache explicitly.
+    timeline_cache_dir: Path | None = None
+    # Size cap for that cache; least recently used artifacts are pruned after
+    # each write. 0 disables pruning.
+    timeline_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
 
     udt_json_bin: str | None = None
     udt_cutter_bin: str | None = None
@@ -59,6 +69,13 @@ CONFIG = GreatshotConfig(
     render_timeout_seconds=int(_env("GREATSHOT_RENDER_TIMEOUT_SECONDS", "DEMOS_RENDER_TIMEOUT_SECONDS", "100")),
     analysis_queue_workers=max(1, int(_env("GREATSHOT_ANALYSIS_WORKERS", "DEMOS_ANALYSIS_WORKERS", "1"))),
     render_queue_workers=max(1, int(_env("GREATSHOT_RENDER_WORKERS", "DEMOS_RENDER_WORKERS", "1"))),
+    job_mode=(_env("GREATSHOT_JOB_MODE", default="inline") or "inline").strip().lower(),
+    timeline_cache_dir=(
+        Path(_env("GREATSHOT_TIMELINE_CACHE_DIR")).expanduser()
+        if _env("GREATSHOT_TIMELINE_CACHE_DIR")
+        else None
+    ),
+    timeline_cache_max_bytes=int(_env("GREATSHOT_TIMELINE_CACHE_MAX_BYTES", default=str(2 * 1024 * 1024 * 1024))),
     udt_json_bin=_env("GREATSHOT_UDT_JSON_BIN", "DEMOS_UDT_JSON_BIN") or os.getenv("UDT_JSON_BIN"),
     udt_cutter_bin=_env("GREATSHOT_UDT_CUTTER_BIN", "DEMOS_UDT_CUTTER_BIN") or os.getenv("UDT_CUTTER_BIN"),
     etlegacy_client_path=_env("GREATSHOT_ETLEGACY_CLIENT_PATH", "DEMOS_ETLEGACY_CLIENT_PATH"),
@@ -1,5 +1,5 @@
 """Highlight detectors for demo timelines."""
 
-from greatshot.highlights.detectors import detect_highlights
+from greatshot.highlights.detectors import detect_highlights, detect_highlights_from_artifact
 
-__all__ = ["detect_highlights"]
+__all__ = ["detect_highlights", "detect_highlights_from_artifact"]
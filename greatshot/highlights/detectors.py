@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from typing import Any, Iterable
+from functools import partial
+from typing import Any, Callable, Iterable, NamedTuple
+
+import numpy as np
 
 from greatshot.config import HIGHLIGHT_DEFAULTS
 from greatshot.contracts.types import Highlight
@@ -78,11 +81,23 @@ def _event_window_signature(highlight: Highlight) -> tuple[str, str, int, int]:
     )
 
 
-def _detect_multi_kills(kills: list[dict[str, Any]], cfg: dict[str, int]) -> list[Highlight]:
-    by_player: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for event in kills:
-        by_player[event["attacker"]].append(event)
+class _PlayerKills(NamedTuple):
+    """One attacker's kills in time order, as the detectors consume them.
+
+    ``spree_starts[i]`` is the index of the first kill of the spree kill ``i``
+    belongs to (kills since the player last died). ``segment(lo, hi)``
+    materializes kills ``lo..hi`` inclusive as detector dicts, so only the
+    kills that end up in a highlight are ever decoded.
+    """
 
+    player: str
+    times: list[int]
+    heads: list[bool]
+    spree_starts: list[int]
+    segment: Callable[[list[int]], list[dict[str, Any]]]
+
+
+def _detect_multi_kills(kills: _PlayerKills, cfg: dict[str, int]) -> list[Highlight]:
     highlights: list[Highlight] = []
 
     windows = [
@@ -90,127 +105,170 @@ def _detect_multi_kills(kills: list[dict[str, Any]], cfg: dict[str, int]) -> lis
         (cfg["multi_kill_big_window_ms"], cfg["multi_kill_big_min"], "burst_multi_kill"),
     ]
 
-    for player, events in by_player.items():
-        times = [item["t_ms"] for item in events]
-        for window_ms, min_kills, kind in windows:
-            left = 0
-            for right in range(len(times)):
-                while left <= right and times[right] - times[left] > window_ms:
-                    left += 1
-                count = right - left + 1
-                if count < min_kills:
-                    continue
-
-                segment = events[left : right + 1]
-                hs_count = sum(1 for item in segment if item.get("hit_region") == "head")
-                score = float(count * 10 + hs_count * 2)
-                base_meta = {
-                    "kill_count": count,
-                    "headshots": hs_count,
-                    "window_ms": window_ms,
-                }
-                highlights.append(
-                    Highlight(
-                        highlight_type=kind,
-                        player=player,
-                        start_ms=segment[0]["t_ms"],
-                        end_ms=segment[-1]["t_ms"],
-                        score=score,
-                        explanation=(
-                            f"{count} kills in {(segment[-1]['t_ms'] - segment[0]['t_ms']) / 1000:.2f}s"
-                        ),
-                        meta=_build_enriched_meta(segment, base_meta),
-                    )
+    times = kills.times
+    for window_ms, min_kills, kind in windows:
+        left = 0
+        for right in range(len(times)):
+            while left <= right and times[right] - times[left] > window_ms:
+                left += 1
+            count = right - left + 1
+            if count < min_kills:
+                continue
+
+            segment = kills.segment(list(range(left, right + 1)))
+            hs_count = sum(kills.heads[left : right + 1])
+            score = float(count * 10 + hs_count * 2)
+            base_meta = {
+                "kill_count": count,
+                "headshots": hs_count,
+                "window_ms": window_ms,
+            }
+            highlights.append(
+                Highlight(
+                    highlight_type=kind,
+                    player=kills.player,
+                    start_ms=times[left],
+                    end_ms=times[right],
+                    score=score,
+                    explanation=f"{count} kills in {(times[right] - times[left]) / 1000:.2f}s",
+                    meta=_build_enriched_meta(segment, base_meta),
                 )
+            )
 
     return highlights
 
 
-def _detect_sprees(kills: list[dict[str, Any]], cfg: dict[str, int]) -> list[Highlight]:
-    spree_count: dict[str, int] = defaultdict(int)
-    spree_start: dict[str, int] = {}
-    spree_events: dict[str, list[dict[str, Any]]] = defaultdict(list)
+def _detect_sprees(kills: _PlayerKills, cfg: dict[str, int]) -> list[Highlight]:
     highlights: list[Highlight] = []
 
-    for event in kills:
-        attacker = event["attacker"]
-        victim = event["victim"]
-        t_ms = int(event["t_ms"])
-
-        if spree_count[attacker] == 0:
-            spree_start[attacker] = t_ms
-            spree_events[attacker] = []
-        spree_count[attacker] += 1
-        spree_events[attacker].append(event)
-
-        if spree_count[attacker] >= cfg["spree_min"]:
-            segment = list(spree_events[attacker])
-            base_meta = {"kills_without_death": spree_count[attacker]}
-            highlights.append(
-                Highlight(
-                    highlight_type="spree",
-                    player=attacker,
-                    start_ms=spree_start.get(attacker, t_ms),
-                    end_ms=t_ms,
-                    score=float(spree_count[attacker] * 7),
-                    explanation=f"{spree_count[attacker]} kills without dying",
-                    meta=_build_enriched_meta(segment, base_meta),
-                )
+    for index, start in enumerate(kills.spree_starts):
+        count = index - start + 1
+        if count < cfg["spree_min"]:
+            continue
+        segment = kills.segment(list(range(start, index + 1)))
+        base_meta = {"kills_without_death": count}
+        highlights.append(
+            Highlight(
+                highlight_type="spree",
+                player=kills.player,
+                start_ms=kills.times[start],
+                end_ms=kills.times[index],
+                score=float(count * 7),
+                explanation=f"{count} kills without dying",
+                meta=_build_enriched_meta(segment, base_meta),
             )
-
-        spree_count[victim] = 0
-        spree_start.pop(victim, None)
-        spree_events.pop(victim, None)
+        )
 
     return highlights
 
 
-def _detect_quick_headshots(kills: list[dict[str, Any]], cfg: dict[str, int]) -> list[Highlight]:
-    by_player: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for event in kills:
-        if event.get("hit_region") == "head":
-            by_player[event["attacker"]].append(event)
+def _detect_quick_headshots(kills: _PlayerKills, cfg: dict[str, int]) -> list[Highlight]:
+    headshots = [index for index, head in enumerate(kills.heads) if head]
+    times = [kills.times[index] for index in headshots]
 
     highlights: list[Highlight] = []
     window_ms = cfg["quick_headshot_window_ms"]
 
-    for player, headshots in by_player.items():
-        headshots.sort(key=lambda item: item["t_ms"])
-        left = 0
-        for right in range(len(headshots)):
-            while left <= right and headshots[right]["t_ms"] - headshots[left]["t_ms"] > window_ms:
-                left += 1
-            count = right - left + 1
-            if count < cfg["quick_headshot_min"]:
-                continue
+    left = 0
+    for right in range(len(times)):
+        while left <= right and times[right] - times[left] > window_ms:
+            left += 1
+        count = right - left + 1
+        if count < cfg["quick_headshot_min"]:
+            continue
 
-            segment = headshots[left : right + 1]
-            start_ms = int(segment[0]["t_ms"])
-            end_ms = int(segment[-1]["t_ms"])
-            duration = max(1, end_ms - start_ms)
-            is_aim_moment = count >= cfg["aim_moment_headshots"]
-            h_type = "aim_moment" if is_aim_moment else "quick_headshot_chain"
-            explanation = (
-                f"{count} headshot kills in {duration / 1000:.2f}s"
-                if is_aim_moment
-                else f"Headshot burst: {count} in {duration / 1000:.2f}s"
-            )
-            base_meta = {"headshots": count, "window_ms": duration}
-            highlights.append(
-                Highlight(
-                    highlight_type=h_type,
-                    player=player,
-                    start_ms=start_ms,
-                    end_ms=end_ms,
-                    score=float(count * (9 if is_aim_moment else 6)),
-                    explanation=explanation,
-                    meta=_build_enriched_meta(segment, base_meta),
-                )
+        segment = kills.segment(headshots[left : right + 1])
+        start_ms = times[left]
+        end_ms = times[right]
+        duration = max(1, end_ms - start_ms)
+        is_aim_moment = count >= cfg["aim_moment_headshots"]
+        h_type = "aim_moment" if is_aim_moment else "quick_headshot_chain"
+        explanation = (
+            f"{count} headshot kills in {duration / 1000:.2f}s"
+            if is_aim_moment
+            else f"Headshot burst: {count} in {duration / 1000:.2f}s"
+        )
+        base_meta = {"headshots": count, "window_ms": duration}
+        highlights.append(
+            Highlight(
+                highlight_type=h_type,
+                player=kills.player,
+                start_ms=start_ms,
+                end_ms=end_ms,
+                score=float(count * (9 if is_aim_moment else 6)),
+                explanation=explanation,
+                meta=_build_enriched_meta(segment, base_meta),
             )
+        )
 
     return highlights
 
 
+def _pick(items: list[dict[str, Any]], indices: list[int]) -> list[dict[str, Any]]:
+    return [items[index] for index in indices]
+
+
+def _players_from_events(kills: list[dict[str, Any]]) -> list[_PlayerKills]:
+    """Group time-ordered kill dicts by attacker, tracking where sprees start."""
+    by_player: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    spree_starts: dict[str, list[int]] = defaultdict(list)
+    spree_from: dict[str, int] = {}
+    for event in kills:
+        attacker = event["attacker"]
+        own = by_player[attacker]
+        spree_starts[attacker].append(spree_from.setdefault(attacker, len(own)))
+        own.append(event)
+        spree_from.pop(event["victim"], None)
+
+    return [
+        _PlayerKills(
+            player=player,
+            times=[item["t_ms"] for item in events],
+            heads=[item.get("hit_region") == "head" for item in events],
+            spree_starts=spree_starts[player],
+            segment=partial(_pick, events),
+        )
+        for player, events in by_player.items()
+    ]
+
+
+def _players_from_artifact(artifact) -> list[_PlayerKills]:
+    """Per-attacker kills straight off the artifact's kill index and columns."""
+    columns = artifact.columns
+    ranks = artifact.kill_ranks()
+    valid = np.flatnonzero(ranks >= 0)
+    ranked_victims = np.empty(valid.size, dtype=columns["victim"].dtype)
+    ranked_victims[ranks[valid]] = columns["victim"][valid]
+    head = artifact.string_id("head")
+
+    players: list[_PlayerKills] = []
+    for player_id in artifact.kill_attackers():
+        rows = artifact.kill_rows_for(artifact.strings[player_id])
+        rows = rows[ranks[rows] >= 0]
+        if not rows.size:
+            continue
+        rows = rows[np.argsort(ranks[rows], kind="stable")]
+        kill_ranks = ranks[rows]
+        # A spree starts after the player's last death ranked before the kill;
+        # a suicide ranks level with its own kill, so it ends that spree.
+        death_ranks = np.flatnonzero(ranked_victims == player_id)
+        last_death = np.concatenate(([-1], death_ranks))[np.searchsorted(death_ranks, kill_ranks)]
+        players.append(
+            _PlayerKills(
+                player=artifact.strings[player_id],
+                times=columns["t_ms"][rows].tolist(),
+                heads=(columns["hit_region"][rows] == head).tolist(),
+                spree_starts=np.searchsorted(kill_ranks, last_death, side="right").tolist(),
+                segment=partial(_pick_rows, artifact, rows),
+            )
+        )
+    return players
+
+
+def _pick_rows(artifact, rows: np.ndarray, indices: list[int]) -> list[dict[str, Any]]:
+    return artifact.kill_events(rows[indices])
+
+
 def detect_highlights(
     events: Iterable[dict[str, Any]],
     thresholds: dict[str, int] | None = None,
@@ -220,14 +278,37 @@ def detect_highlights(
     if thresholds:
         cfg.update({k: int(v) for k, v in thresholds.items()})
 
-    kills = _kill_events(events)
-    if not kills:
+    return _detect_from_players(_players_from_events(_kill_events(events)), cfg, player_stats)
+
+
+def detect_highlights_from_artifact(
+    artifact,
+    thresholds: dict[str, int] | None = None,
+    player_stats: dict[str, dict[str, Any]] | None = None,
+) -> list[Highlight]:
+    """``detect_highlights`` over a cached ``TimelineArtifact``.
+
+    Walks the artifact's per-attacker kill index over the integer columns;
+    only the kills that land in a highlight are decoded into dicts.
+    """
+    cfg = dict(HIGHLIGHT_DEFAULTS)
+    if thresholds:
+        cfg.update({k: int(v) for k, v in thresholds.items()})
+    return _detect_from_players(_players_from_artifact(artifact), cfg, player_stats)
+
+
+def _detect_from_players(
+    players: list[_PlayerKills],
+    cfg: dict[str, int],
+    player_stats: dict[str, dict[str, Any]] | None,
+) -> list[Highlight]:
+    if not players:
         return []
 
     candidates: list[Highlight] = []
-    candidates.extend(_detect_multi_kills(kills, cfg))
-    candidates.extend(_detect_sprees(kills, cfg))
-    candidates.extend(_detect_quick_headshots(kills, cfg))
+    for detector in (_detect_multi_kills, _detect_sprees, _detect_quick_headshots):
+        for kills in players:
+            candidates.extend(detector(kills, cfg))
 
     # Attach attacker_stats from match-level player stats
     if player_stats:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import bisect
+import logging
 import re
 from collections import defaultdict
 from pathlib import Path
@@ -11,9 +12,17 @@ from typing import Any, Iterable
 from greatshot.config import CONFIG
 from greatshot.contracts.profiles.profile_detector import detect_profile
 from greatshot.contracts.types import AnalysisResult, DemoEvent, Highlight
-from greatshot.highlights.detectors import detect_highlights
+from greatshot.highlights.detectors import detect_highlights, detect_highlights_from_artifact
 from greatshot.scanner.adapters import run_udt_json_parser
 from greatshot.scanner.errors import DemoScanError, UnsupportedDemoError
+from greatshot.scanner.timeline_artifact import (
+    TimelineArtifact,
+    artifact_path,
+    demo_sha256,
+    prune_timeline_cache,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def sniff_demo_header_bytes(header_bytes: bytes) -> dict[str, int]:
@@ -428,35 +437,19 @@ def _summarize_stats(timeline: Iterable[DemoEvent], players: list[dict[str, Any]
     }
 
 
-def analyze_demo(
-    demo_path: str | Path,
-    scanner_options: dict[str, Any] | None = None,
-) -> AnalysisResult:
-    opts = scanner_options or {}
-    demo_path = Path(demo_path)
-
-    if not demo_path.exists():
-        raise DemoScanError(f"Demo file not found: {demo_path}")
-
-    extension = demo_path.suffix.lower()
-    allowed = set(CONFIG.allow_extensions)
-    if extension not in allowed:
-        raise UnsupportedDemoError(
-            f"Unsupported demo extension '{extension}'. Allowed: {sorted(allowed)}"
-        )
-
-    with demo_path.open("rb") as handle:
-        header = sniff_demo_header_bytes(handle.read(32))
-
-    timeout_seconds = int(opts.get("timeout_seconds", CONFIG.scanner_timeout_seconds))
-    max_output_bytes = int(opts.get("max_output_bytes", CONFIG.scanner_max_output_bytes))
-    max_events = int(opts.get("max_events", CONFIG.scanner_max_events))
-
+def _parse_timeline_artifact(
+    demo_path: Path,
+    *,
+    timeout_seconds: int,
+    max_output_bytes: int,
+    binary_path: str | None,
+) -> TimelineArtifact:
+    """Run UDT_json once and normalize everything detectors and stats need."""
     raw = run_udt_json_parser(
         demo_path=demo_path,
         timeout_seconds=timeout_seconds,
         max_output_bytes=max_output_bytes,
-        binary_path=opts.get("udt_json_bin"),
+        binary_path=binary_path,
     )
 
     game_states = raw.get("gameStates", []) or []
@@ -478,15 +471,6 @@ def analyze_demo(
     timeline = _normalize_timeline(
         chat, obituaries, profile, raw.get("rawCommands", []) or []
     )
-    warnings: list[str] = []
-    if len(timeline) > max_events:
-        warnings.append(
-            f"Timeline truncated to {max_events} events (received {len(timeline)})."
-        )
-        timeline = timeline[:max_events]
-
-    stats = _summarize_stats(timeline, players)
-    player_stats = _extract_player_stats(match_stats, timeline)
 
     rounds = []
     for item in match_stats:
@@ -505,10 +489,7 @@ def analyze_demo(
     if duration_ms <= 0:
         duration_ms = max(0, int(primary_state.get("endTime") or 0) - int(primary_state.get("startTime") or 0))
 
-    metadata = {
-        "filename": demo_path.name,
-        "file_size_bytes": demo_path.stat().st_size,
-        "extension": extension,
+    summary = {
         "profile": profile.profile_id,
         "profile_name": profile.profile_name,
         "map": primary_match.get("map") or config_values.get("mapname") or "unknown",
@@ -522,16 +503,123 @@ def analyze_demo(
         "start_ms": int(primary_state.get("startTime") or primary_match.get("startTime") or 0),
         "end_ms": int(primary_state.get("endTime") or primary_match.get("endTime") or 0),
         "rounds": rounds,
+    }
+
+    return TimelineArtifact.from_events(
+        timeline,
+        players=players,
+        match_stats=match_stats,
+        summary=summary,
+        raw_sections={
+            "game_states": len(game_states),
+            "chat": len(chat),
+            "obituaries": len(obituaries),
+            "match_stats": len(match_stats),
+        },
+    )
+
+
+def redetect_highlights(
+    content_sha256: str,
+    thresholds: dict[str, int] | None = None,
+    *,
+    timeline_cache_dir: str | Path | None = None,
+) -> list[Highlight] | None:
+    """Re-run highlight detection from a cached timeline artifact.
+
+    For threshold/profile tuning: no parser run, no demo file needed. Returns
+    None when the demo has no artifact (analyze it once first).
+    """
+    cache_dir = timeline_cache_dir or CONFIG.timeline_cache_dir
+    if not cache_dir:
+        return None
+    artifact = TimelineArtifact.load(artifact_path(cache_dir, content_sha256))
+    if artifact is None:
+        return None
+    player_stats = _extract_player_stats(artifact.match_stats, artifact.events())
+    return detect_highlights_from_artifact(artifact, thresholds, player_stats=player_stats)
+
+
+def analyze_demo(
+    demo_path: str | Path,
+    scanner_options: dict[str, Any] | None = None,
+) -> AnalysisResult:
+    opts = scanner_options or {}
+    demo_path = Path(demo_path)
+
+    if not demo_path.exists():
+        raise DemoScanError(f"Demo file not found: {demo_path}")
+
+    extension = demo_path.suffix.lower()
+    allowed = set(CONFIG.allow_extensions)
+    if extension not in allowed:
+        raise UnsupportedDemoError(
+            f"Unsupported demo extension '{extension}'. Allowed: {sorted(allowed)}"
+        )
+
+    with demo_path.open("rb") as handle:
+        header = sniff_demo_header_bytes(handle.read(32))
+
+    timeout_seconds = int(opts.get("timeout_seconds", CONFIG.scanner_timeout_seconds))
+    max_output_bytes = int(opts.get("max_output_bytes", CONFIG.scanner_max_output_bytes))
+    max_events = int(opts.get("max_events", CONFIG.scanner_max_events))
+
+    artifact = None
+    cache_path = None
+    cache_dir = opts.get("timeline_cache_dir") or CONFIG.timeline_cache_dir
+    if cache_dir:
+        content_sha256 = opts.get("content_hash_sha256") or demo_sha256(demo_path)
+        cache_path = artifact_path(cache_dir, content_sha256)
+        artifact = TimelineArtifact.load(cache_path)
+    if artifact is not None:
+        logger.info("Timeline artifact hit for %s; UDT parse skipped", demo_path.name)
+    else:
+        artifact = _parse_timeline_artifact(
+            demo_path,
+            timeout_seconds=timeout_seconds,
+            max_output_bytes=max_output_bytes,
+            binary_path=opts.get("udt_json_bin"),
+        )
+        if cache_path is not None:
+            try:
+                artifact.save(cache_path)
+            except OSError as exc:
+                logger.warning("Could not persist timeline artifact %s: %s", cache_path, exc)
+            else:
+                prune_timeline_cache(
+                    cache_dir,
+                    int(opts.get("timeline_cache_max_bytes", CONFIG.timeline_cache_max_bytes)),
+                )
+
+    players = artifact.players
+    timeline = artifact.events()
+    warnings: list[str] = []
+    truncated = len(timeline) > max_events
+    if truncated:
+        warnings.append(
+            f"Timeline truncated to {max_events} events (received {len(timeline)})."
+        )
+        timeline = timeline[:max_events]
+
+    stats = _summarize_stats(timeline, players)
+    player_stats = _extract_player_stats(artifact.match_stats, timeline)
+
+    metadata = {
+        "filename": demo_path.name,
+        "file_size_bytes": demo_path.stat().st_size,
+        "extension": extension,
+        **artifact.summary,
         "header": header,
     }
 
-    highlight_dicts = [
-        item.to_dict()
-        for item in detect_highlights(
+    if truncated:
+        detected = detect_highlights(
             [event.to_dict() for event in timeline],
             player_stats=player_stats,
         )
-    ]
+    else:
+        detected = detect_highlights_from_artifact(artifact, player_stats=player_stats)
+    highlight_dicts = [item.to_dict() for item in detected]
     highlights = [
         Highlight(
             highlight_type=item["type"],
@@ -554,12 +642,7 @@ def analyze_demo(
         warnings=warnings,
         parser={
             "name": "UDT_json",
-            "raw_sections": {
-                "game_states": len(game_states),
-                "chat": len(chat),
-                "obituaries": len(obituaries),
-                "match_stats": len(match_stats),
-            },
+            "raw_sections": dict(artifact.raw_sections),
             "timeout_seconds": timeout_seconds,
         },
         player_stats=player_stats,
@@ -0,0 +1,297 @@
+"""Columnar, per-demo cache of the normalized UDT timeline.
+
+UDT_json plus timeline normalization is the expensive part of a scan; highlight
+detection over the result is cheap. ``analyze_demo`` therefore persists what
+normalization produced, keyed by the demo's SHA-256, so a re-analysis (new
+detector thresholds, a new profile) never runs the parser twice for the same
+bytes.
+
+One ``.npz`` per demo: every timeline event as parallel integer columns over a
+shared string table (``-1`` is None), a per-attacker CSR index over the kill
+rows, and a small JSON block with the parse-derived players, raw match stats
+and match metadata. Loaded with ``allow_pickle=False``; a version bump or an
+unreadable file is a cache miss, never an error.
+
+The directory is capped by ``prune_timeline_cache``: a hit refreshes the
+file's mtime, and the least recently used artifacts go first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from greatshot.contracts.types import DemoEvent
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever normalization output changes (profiles, weapon/team maps,
+# hit-region revival) so stale artifacts are re-parsed instead of trusted.
+TIMELINE_ARTIFACT_VERSION = 3
+
+_FLAG_TEAM_CHAT = 1
+_FLAG_XPGAIN_REGION = 2
+
+_STRING_COLUMNS = (
+    "type",
+    "attacker",
+    "victim",
+    "weapon",
+    "hit_region",
+    "team",
+    "message",
+    "attacker_team",
+    "victim_team",
+    "raw_weapon",
+)
+
+
+def demo_sha256(demo_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with Path(demo_path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_path(cache_dir: str | Path, content_sha256: str) -> Path:
+    return Path(cache_dir) / content_sha256[:2] / f"{content_sha256}.npz"
+
+
+@dataclass
+class TimelineArtifact:
+    """The parse-derived half of an analysis, ready for detectors."""
+
+    columns: dict[str, np.ndarray]
+    strings: list[str]
+    players: list[dict[str, Any]]
+    match_stats: list[dict[str, Any]]
+    summary: dict[str, Any]
+    raw_sections: dict[str, int]
+    _kill_ranks: np.ndarray | None = field(default=None, repr=False)
+    _string_ids: dict[str, int] | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_events(
+        cls,
+        timeline: list[DemoEvent],
+        *,
+        players: list[dict[str, Any]],
+        match_stats: list[dict[str, Any]],
+        summary: dict[str, Any],
+        raw_sections: dict[str, int],
+    ) -> TimelineArtifact:
+        strings: list[str] = []
+        string_ids: dict[str, int] = {}
+
+        def sid(value: str | None) -> int:
+            if value is None:
+                return -1
+            found = string_ids.get(value)
+            if found is None:
+                found = len(strings)
+                string_ids[value] = found
+                strings.append(value)
+            return found
+
+        size = len(timeline)
+        columns = {name: np.empty(size, dtype=np.int32) for name in _STRING_COLUMNS}
+        columns["t_ms"] = np.empty(size, dtype=np.int64)
+        columns["flags"] = np.zeros(size, dtype=np.uint8)
+        for row, event in enumerate(timeline):
+            meta = event.meta or {}
+            columns["t_ms"][row] = int(event.t_ms)
+            columns["type"][row] = sid(event.type)
+            columns["attacker"][row] = sid(event.attacker)
+            columns["victim"][row] = sid(event.victim)
+            columns["weapon"][row] = sid(event.weapon)
+            columns["hit_region"][row] = sid(event.hit_region)
+            columns["team"][row] = sid(event.team)
+            columns["message"][row] = sid(event.message)
+            columns["attacker_team"][row] = sid(meta.get("attacker_team"))
+            columns["victim_team"][row] = sid(meta.get("victim_team"))
+            columns["raw_weapon"][row] = sid(meta.get("raw_weapon"))
+            flags = 0
+            if meta.get("team_chat"):
+                flags |= _FLAG_TEAM_CHAT
+            if meta.get("hit_region_source") == "xpgain":
+                flags |= _FLAG_XPGAIN_REGION
+            columns["flags"][row] = flags
+
+        # Per-attacker CSR index over kill rows, in timeline order.
+        kill_type = string_ids.get("kill", -2)
+        kill_rows = np.flatnonzero(columns["type"] == kill_type)
+        attackers = columns["attacker"][kill_rows]
+        order = np.argsort(attackers, kind="stable")
+        columns["kill_rows_by_attacker"] = kill_rows[order].astype(np.int32)
+        columns["kill_attacker_offsets"] = np.searchsorted(
+            attackers[order], np.arange(len(strings) + 1), side="left"
+        ).astype(np.int32)
+
+        return cls(
+            columns=columns,
+            strings=strings,
+            players=players,
+            match_stats=match_stats,
+            summary=summary,
+            raw_sections=raw_sections,
+        )
+
+    def string_id(self, value: str) -> int:
+        """Index of *value* in the string table, or -2 (matches no column)."""
+        if self._string_ids is None:
+            self._string_ids = {text: index for index, text in enumerate(self.strings)}
+        return self._string_ids.get(value, -2)
+
+    def _string(self, value: int) -> str | None:
+        return None if value < 0 else self.strings[value]
+
+    def _event(self, row: int) -> DemoEvent:
+        columns = self.columns
+        event_type = self._string(int(columns["type"][row]))
+        flags = int(columns["flags"][row])
+        if event_type == "kill":
+            meta: dict[str, Any] = {
+                "attacker_team": self._string(int(columns["attacker_team"][row])),
+                "victim_team": self._string(int(columns["victim_team"][row])),
+                "raw_weapon": self._string(int(columns["raw_weapon"][row])),
+            }
+            if flags & _FLAG_XPGAIN_REGION:
+                meta["hit_region_source"] = "xpgain"
+        elif event_type == "chat":
+            meta = {"team_chat": bool(flags & _FLAG_TEAM_CHAT)}
+        else:
+            meta = {}
+        return DemoEvent(
+            t_ms=int(columns["t_ms"][row]),
+            type=event_type or "",
+            attacker=self._string(int(columns["attacker"][row])),
+            victim=self._string(int(columns["victim"][row])),
+            weapon=self._string(int(columns["weapon"][row])),
+            hit_region=self._string(int(columns["hit_region"][row])),
+            team=self._string(int(columns["team"][row])),
+            message=self._string(int(columns["message"][row])),
+            meta=meta,
+        )
+
+    def events(self) -> list[DemoEvent]:
+        return [self._event(row) for row in range(len(self.columns["t_ms"]))]
+
+    def kill_ranks(self) -> np.ndarray:
+        """Each row's position among the detector kills in time order, else -1.
+
+        Detector kills are kill rows naming both an attacker and a victim;
+        ties on ``t_ms`` keep timeline order. Built once.
+        """
+        if self._kill_ranks is None:
+            columns = self.columns
+            blank = self.string_id("")
+            valid = (
+                (columns["type"] == self.string_id("kill"))
+                & (columns["attacker"] >= 0)
+                & (columns["attacker"] != blank)
+                & (columns["victim"] >= 0)
+                & (columns["victim"] != blank)
+            )
+            rows = np.flatnonzero(valid)
+            ranks = np.full(len(columns["t_ms"]), -1, dtype=np.int64)
+            ranks[rows[np.argsort(columns["t_ms"][rows], kind="stable")]] = np.arange(rows.size)
+            self._kill_ranks = ranks
+        return self._kill_ranks
+
+    def kill_attackers(self) -> list[int]:
+        """String ids of players with at least one row in the kill index."""
+        return np.flatnonzero(np.diff(self.columns["kill_attacker_offsets"])).tolist()
+
+    def kill_rows_for(self, player: str) -> np.ndarray:
+        """Timeline rows of *player*'s kills, via the per-attacker index."""
+        player_id = self.string_id(player)
+        if player_id < 0:
+            return np.empty(0, dtype=np.int32)
+        offsets = self.columns["kill_attacker_offsets"]
+        return self.columns["kill_rows_by_attacker"][offsets[player_id] : offsets[player_id + 1]]
+
+    def kill_events(self, rows: np.ndarray) -> list[dict[str, Any]]:
+        """Detector input dicts for *rows*, in the order given."""
+        return [self._event(int(row)).to_dict() for row in rows]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "version": TIMELINE_ARTIFACT_VERSION,
+            "strings": self.strings,
+            "players": self.players,
+            "match_stats": self.match_stats,
+            "summary": self.summary,
+            "raw_sections": self.raw_sections,
+        }
+        header_bytes = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as handle:
+            np.savez_compressed(handle, _header=header_bytes, **self.columns)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> TimelineArtifact | None:
+        if not path.is_file():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                header = json.loads(data["_header"].tobytes().decode("utf-8"))
+                if header.get("version") != TIMELINE_ARTIFACT_VERSION:
+                    return None
+                columns = {name: data[name] for name in data.files if name != "_header"}
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable timeline artifact %s: %s", path, exc)
+            return None
+        try:
+            os.utime(path)  # LRU order for prune_timeline_cache
+        except OSError:
+            pass
+        return cls(
+            columns=columns,
+            strings=list(header["strings"]),
+            players=header["players"],
+            match_stats=header["match_stats"],
+            summary=header["summary"],
+            raw_sections=header["raw_sections"],
+        )
+
+
+def prune_timeline_cache(cache_dir: str | Path, max_bytes: int) -> int:
+    """Delete least recently used artifacts until the cache fits *max_bytes*.
+
+    Returns the number of files removed. A file another process removes or
+    replaces mid-scan is skipped; a non-positive cap disables pruning.
+    """
+    if max_bytes <= 0:
+        return 0
+    entries = []
+    total = 0
+    for path in Path(cache_dir).glob("*/*.npz"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        logger.info("Pruned %d timeline artifacts from %s", removed, cache_dir)
+    return removed
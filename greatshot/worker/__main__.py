@@ -0,0 +1,13 @@
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Same env files as the web process, loaded before greatshot.config reads them.
+_ROOT = Path(__file__).resolve().parents[2]
+_WEBSITE_ENV = _ROOT / "website" / ".env"
+load_dotenv(_WEBSITE_ENV if _WEBSITE_ENV.exists() else _ROOT / ".env")
+
+from greatshot.worker.pool import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Process-isolated worker pool for Greatshot analysis and render jobs.
+
+With ``GREATSHOT_JOB_MODE=pool`` the web process only inserts demo/render rows;
+this pool claims them from Postgres with ``FOR UPDATE SKIP LOCKED`` and runs
+them in separate processes, so a burst of uploads after a cup night never
+competes with API latency in the single uvicorn worker.
+
+Each job class has its own concurrency limit: one process per slot, each
+running one job at a time (the UDT parser and the renderer are heavy external
+processes — two in one interpreter buys nothing). The supervisor restarts a
+slot whose process dies; the claim it held is reclaimed by the lease sweep.
+
+    python -m greatshot.worker --analysis-workers 2 --render-workers 1 --metrics-port 9310
+
+Metrics (job counts, durations, in-progress, queue depth per status) are
+served per process on ``--metrics-port + slot``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from greatshot.config import CONFIG
+
+logger = logging.getLogger("greatshot.worker.pool")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+JOB_CLASSES = ("analysis", "render")
+
+# A claim older than this is presumed orphaned by a dead process. Worst case
+# for one job is every retry hitting its timeout, plus the retry sleeps.
+ANALYSIS_LEASE_SECONDS = CONFIG.scanner_timeout_seconds * 3 + 60
+RENDER_LEASE_SECONDS = (CONFIG.cutter_timeout_seconds + CONFIG.render_timeout_seconds) * 2 + 60
+
+# Lease sweep and depth gauges run every N idle polls, not every claim.
+_MAINTENANCE_EVERY_POLLS = 15
+
+
+@dataclass(frozen=True)
+class WorkerSlot:
+    job_class: str
+    index: int
+    poll_seconds: float
+    metrics_port: int | None
+
+
+async def _process_one(service, slot: WorkerSlot) -> bool:
+    """Claim and run one job of the slot's class; False when none was queued."""
+    from website.backend.metrics import (
+        GREATSHOT_JOB_DURATION,
+        GREATSHOT_JOBS,
+        GREATSHOT_JOBS_IN_PROGRESS,
+    )
+
+    if slot.job_class == "analysis":
+        claimed = await service.claim_next_analysis()
+        if claimed is None:
+            return False
+        demo_id, demo_path = claimed
+        run = service.run_claimed_analysis(slot.index, demo_id, demo_path)
+    else:
+        render_id = await service.claim_next_render()
+        if render_id is None:
+            return False
+        run = service.run_claimed_render(slot.index, render_id)
+
+    started = time.perf_counter()
+    GREATSHOT_JOBS_IN_PROGRESS.labels(job_class=slot.job_class).inc()
+    success = False
+    try:
+        success = await run
+    finally:
+        GREATSHOT_JOBS_IN_PROGRESS.labels(job_class=slot.job_class).dec()
+        GREATSHOT_JOB_DURATION.labels(job_class=slot.job_class).observe(time.perf_counter() - started)
+        GREATSHOT_JOBS.labels(
+            job_class=slot.job_class, outcome="success" if success else "failure"
+        ).inc()
+    return True
+
+
+async def _maintenance(service) -> None:
+    from website.backend.metrics import GREATSHOT_QUEUE_DEPTH
+
+    await service.requeue_expired_claims(ANALYSIS_LEASE_SECONDS, RENDER_LEASE_SECONDS)
+    for job_class, by_status in (await service.queue_depths()).items():
+        for status, count in by_status.items():
+            GREATSHOT_QUEUE_DEPTH.labels(job_class=job_class, status=status).set(count)
+
+
+async def run_worker(service, slot: WorkerSlot, stop: asyncio.Event) -> None:
+    """Poll-claim-run loop for one slot until *stop* is set."""
+    idle_polls = 0
+    while not stop.is_set():
+        try:
+            if idle_polls % _MAINTENANCE_EVERY_POLLS == 0:
+                await _maintenance(service)
+            worked = await _process_one(service, slot)
+        except Exception:
+            logger.exception("[%s:%s] worker iteration failed", slot.job_class, slot.index)
+            worked = False
+        if worked:
+            idle_polls = 0
+            continue
+        idle_polls += 1
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=slot.poll_seconds)
+        except TimeoutError:
+            pass
+
+
+async def _worker_main(slot: WorkerSlot) -> None:
+    from website.backend.dependencies import close_db_pool, init_db_pool
+    from website.backend.services.greatshot_jobs import GreatshotJobService
+    from website.backend.services.greatshot_store import get_greatshot_storage
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    db = await init_db_pool()
+    try:
+        storage = get_greatshot_storage(PROJECT_ROOT)
+        storage.ensure_storage_tree()
+        service = GreatshotJobService(db, storage)
+        logger.info("[%s:%s] worker ready", slot.job_class, slot.index)
+        await run_worker(service, slot, stop)
+    finally:
+        await close_db_pool()
+        logger.info("[%s:%s] worker stopped", slot.job_class, slot.index)
+
+
+def _worker_process(slot: WorkerSlot) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s [{slot.job_class}:{slot.index}] %(levelname)s %(name)s: %(message)s",
+    )
+    if slot.metrics_port is not None:
+        try:
+            from prometheus_client import start_http_server
+
+            start_http_server(slot.metrics_port)
+        except Exception:
+            logger.warning("metrics endpoint on port %s unavailable", slot.metrics_port, exc_info=True)
+    asyncio.run(_worker_main(slot))
+
+
+def build_slots(
+    analysis_workers: int,
+    render_workers: int,
+    *,
+    poll_seconds: float,
+    metrics_port: int | None,
+) -> list[WorkerSlot]:
+    counts = {"analysis": max(0, analysis_workers), "render": max(0, render_workers)}
+    slots: list[WorkerSlot] = []
+    for job_class in JOB_CLASSES:
+        for index in range(counts[job_class]):
+            port = None if metrics_port is None else metrics_port + len(slots)
+            slots.append(WorkerSlot(job_class, index, poll_seconds, port))
+    return slots
+
+
+def run_pool(slots: list[WorkerSlot], *, restart_delay_seconds: float = 5.0) -> None:
+    """Supervise one process per slot until SIGTERM/SIGINT."""
+    ctx = multiprocessing.get_context("spawn")
+    stopping = False
+
+    def _request_stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    processes: dict[WorkerSlot, multiprocessing.process.BaseProcess] = {}
+
+    def _spawn(slot: WorkerSlot) -> None:
+        process = ctx.Process(
+            target=_worker_process,
+            args=(slot,),
+            name=f"greatshot-{slot.job_class}-{slot.index}",
+        )
+        process.start()
+        processes[slot] = process
+
+    for slot in slots:
+        _spawn(slot)
+    logger.info("Greatshot worker pool started: %s", ", ".join(p.name for p in processes.values()))
+
+    while not stopping:
+        time.sleep(1.0)
+        for slot, process in list(processes.items()):
+            if process.is_alive() or stopping:
+                continue
+            logger.warning("%s exited with %s; restarting in %.0fs", process.name, process.exitcode, restart_delay_seconds)
+            time.sleep(restart_delay_seconds)
+            if not stopping:
+                _spawn(slot)
+
+    for process in processes.values():
+        if process.is_alive():
+            process.terminate()
+    for process in processes.values():
+        process.join(timeout=30)
+    logger.info("Greatshot worker pool stopped")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Greatshot analysis/render worker pool")
+    parser.add_argument("--analysis-workers", type=int, default=CONFIG.analysis_queue_workers)
+    parser.add_argument("--render-workers", type=int, default=CONFIG.render_queue_workers)
+    parser.add_argument("--poll-seconds", type=float, default=2.0)
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="first per-process Prometheus port (slot N serves on port+N)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    slots = build_slots(
+        args.analysis_workers,
+        args.render_workers,
+        poll_seconds=max(0.1, args.poll_seconds),
+        metrics_port=args.metrics_port,
+    )
+    if not slots:
+        parser.error("at least one analysis or render worker is required")
+    run_pool(slots)
@@ -0,0 +1,33 @@
+-- 079: job ledger for the post-session precompute pipeline.
+--
+-- WHY
+-- Every derived artifact of a finished session (KIS, s.effort, story and
+-- proximity panels, graph data, the session page) used to be computed on first
+-- read, and the bot's session-end hooks were fire-and-forget tasks: a restart
+-- between session end and the warm lost them silently. The pipeline
+-- (bot/services/post_session_pipeline.py) records one row per (session, stage)
+-- so a restarted bot resumes what did not finish, and keeps each stage's
+-- duration for "how long until the story page is warm".
+--
+-- session_key is 'gsid:<ids>' (or 'date:<start date>' for legacy rounds with
+-- no gaming_session_id); context is the JSON the stages need to re-run.
+-- Derived bookkeeping only: safe to TRUNCATE.
+--
+-- OWNERSHIP NOTE: written by the BOT process. Apply with
+-- POSTGRES_USER=etlegacy_user.
+
+CREATE TABLE IF NOT EXISTS post_session_jobs (
+    session_key  TEXT        NOT NULL,
+    stage        TEXT        NOT NULL,
+    status       TEXT        NOT NULL,
+    context      TEXT        NOT NULL,
+    attempts     INTEGER     NOT NULL DEFAULT 0,
+    duration_ms  INTEGER     NULL,
+    error        TEXT        NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (session_key, stage)
+);
+
+CREATE INDEX IF NOT EXISTS idx_post_session_jobs_unfinished
+    ON post_session_jobs (updated_at)
+    WHERE status <> 'done';
@@ -0,0 +1,41 @@
+-- 080: durable log for the STATS_READY webhook queue.
+--
+-- WHY
+-- The webhook event queue (bot/services/webhook_event_queue.py) used to live
+-- only in memory: a bot restart between "webhook accepted" and "round
+-- imported" dropped the round until the SSH poll happened to notice it. Each
+-- accepted round is now one row here; a worker claims it with
+-- FOR UPDATE SKIP LOCKED before processing and marks it done/failed after,
+-- and a restarted bot replays rows left 'pending' (or 'processing' for longer
+-- than the stale threshold).
+--
+-- partition_key is the queue's gaming-session partition (rounds of one
+-- session are processed in order); dedup_key is
+-- '<map>:<round>:<round_end_unix>' or NULL; metadata is the parsed
+-- STATS_READY payload as JSON. Finished rows are pruned after 7 days.
+--
+-- OWNERSHIP NOTE: written by the BOT process. Apply with
+-- POSTGRES_USER=etlegacy_user.
+
+CREATE TABLE IF NOT EXISTS webhook_round_queue (
+    id            BIGSERIAL   PRIMARY KEY,
+    partition_key TEXT        NOT NULL,
+    dedup_key     TEXT        NULL,
+    metadata      TEXT        NOT NULL,
+    channel_id    BIGINT      NULL,
+    message_id    BIGINT      NULL,
+    status        TEXT        NOT NULL DEFAULT 'pending',
+    attempts      INTEGER     NOT NULL DEFAULT 0,
+    last_error    TEXT        NULL,
+    enqueued_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    claimed_at    TIMESTAMPTZ NULL,
+    finished_at   TIMESTAMPTZ NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_webhook_round_queue_unfinished
+    ON webhook_round_queue (id)
+    WHERE status IN ('pending', 'processing');
+
+CREATE INDEX IF NOT EXISTS idx_webhook_round_queue_finished
+    ON webhook_round_queue (finished_at)
+    WHERE finished_at IS NOT NULL;
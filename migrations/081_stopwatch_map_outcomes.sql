@@ -0,0 +1,57 @@
+-- 081: stored stopwatch outcome per map pair (R1 round, R2 round).
+--
+-- WHY
+-- StopwatchScoringService re-paired and re-scored every round of a session on
+-- every call — the bot embeds, the website session pages and
+-- scripts/rescore_session_results.py all recomputed the same finished maps, and
+-- the team-aware path ran one player_comprehensive_stats query per map to find
+-- which side each roster played. A map pair's outcome is a pure function of its
+-- two rounds, so it is computed once and stored here; a session total is a fold
+-- over its stored outcomes plus the roster attribution.
+--
+-- outcome holds only facts derived from the two rounds: points for the R1/R2
+-- attackers, the inferred R1 defender side, the header winner side and the
+-- displayed times. The R1 player sides are NOT stored: the team-aware path
+-- fetches them on every call (one batched player_comprehensive_stats query for
+-- the whole session) and decides which persistent team each side was at read
+-- time, so a corrected team/side or a roster change never needs a rescore.
+--
+-- FRESHNESS
+-- fingerprint is the JSON of the round columns the outcome is derived from
+-- (defender/winner/surrender side, time limits, actual times). A read compares
+-- it with the rounds just fetched; anything different means recompute.
+-- scoring_version is bumped in code (SCORING_VERSION) when the scoring rules
+-- change; `rescore_session_results.py --rebuild-map-outcomes` then rescores the
+-- whole history in one pass and drops rows of older versions.
+--
+-- OWNERSHIP NOTE: written by both the BOT and the WEB process (website/.env
+-- connects as website_app) — hence the explicit grants. Apply with
+-- POSTGRES_USER=etlegacy_user.
+
+CREATE TABLE IF NOT EXISTS stopwatch_map_outcomes (
+    r1_round_id      INTEGER     NOT NULL,
+    r2_round_id      INTEGER     NOT NULL,
+    scoring_version  INTEGER     NOT NULL,
+    fingerprint      TEXT        NOT NULL,
+    outcome          JSONB       NOT NULL,
+    computed_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (r1_round_id, r2_round_id, scoring_version)
+);
+
+COMMENT ON TABLE stopwatch_map_outcomes IS
+    'Stored stopwatch outcome per map pair. Derived data only: safe to TRUNCATE, '
+    'every row rebuilds itself the next time its session is scored.';
+COMMENT ON COLUMN stopwatch_map_outcomes.scoring_version IS
+    'Bumped in code (SCORING_VERSION) when the scoring rules change; rows from '
+    'an older version are ignored and recomputed.';
+
+-- Grant each role only if it exists (same pattern as migration 077).
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'website_app') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON stopwatch_map_outcomes TO website_app;
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'etlegacy_user') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON stopwatch_map_outcomes TO etlegacy_user;
+  END IF;
+END $$;
@@ -0,0 +1,53 @@
+-- 082: derived_artifacts — the database tier of the shared artifact store.
+--
+-- WHY
+-- Every expensive derived view on the website (objective pressure, session
+-- moments, the true-aim lifetime summary) kept its own cache with its own
+-- eviction rule, and most of them lost everything on a web restart. They now
+-- go through one get_or_compute (website/backend/services/artifact_store.py)
+-- backed by an in-process LRU and this table, so an analytic is computed once
+-- per input change and the answer survives restarts and is shared by workers.
+--
+-- FRESHNESS, the 077 way
+-- One row per (kind, scope). input_fingerprint is the caller's cheap aggregate
+-- over exactly the rows the artifact is derived from, and formula_version is
+-- bumped in code when the computation changes. A read matches both; anything
+-- else is a miss and the fresh answer replaces the row. payload wraps the value
+-- as {"value": ...} so any JSON value round-trips.
+--
+-- player_aim_summary (077) is superseded by kind 'player_aim_summary' here. It
+-- is left in place, unused, rather than dropped in the same release that stops
+-- reading it.
+--
+-- OWNERSHIP NOTE: written by the WEB process (website/.env connects as
+-- website_app) — hence the explicit grants. Apply with
+-- POSTGRES_USER=etlegacy_user.
+
+CREATE TABLE IF NOT EXISTS derived_artifacts (
+    kind               TEXT        NOT NULL,
+    scope              TEXT        NOT NULL,
+    formula_version    INTEGER     NOT NULL,
+    input_fingerprint  TEXT        NOT NULL,
+    payload            JSONB       NOT NULL,
+    compute_ms         INTEGER     NULL,
+    computed_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (kind, scope)
+);
+
+COMMENT ON TABLE derived_artifacts IS
+    'Artifact store database tier. Derived data only: safe to TRUNCATE, every '
+    'row rebuilds itself on the next read of its kind and scope.';
+COMMENT ON COLUMN derived_artifacts.input_fingerprint IS
+    'Canonical JSON of the caller''s input fingerprint; a row is served only '
+    'while it equals the fingerprint the caller computes now.';
+
+-- Grant each role only if it exists (same pattern as migration 077).
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'website_app') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON derived_artifacts TO website_app;
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'etlegacy_user') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON derived_artifacts TO etlegacy_user;
+  END IF;
+END $$;
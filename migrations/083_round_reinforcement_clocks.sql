@@ -0,0 +1,45 @@
+-- 083: round_reinforcement_clocks — every round's reinforcement-clock verdicts,
+-- stored once.
+--
+-- WHY
+-- The clock (website/backend/services/reinforcement_clock.py) was recomputed on
+-- every request that needed it: the round web snapshot, and the man-advantage
+-- and clutch timelines once per round in range, each reading every life's
+-- whole path to find its last event. The answer only changes when a round's
+-- proximity data is imported, so it is now computed by the columnar engine in
+-- website/backend/services/reinforcement_clock_batch.py and stored here.
+--
+-- FRESHNESS
+-- One row per round. protocol_version is CLOCK_PROTOCOL_VERSION at compute
+-- time; a row of another version is never served, so a protocol change needs no
+-- migration — it reads as a miss until rebuilt. clocks holds the per-team
+-- ClockValidation fields keyed by team; {} means "computed, no timing rows".
+-- The bot refreshes a round after each proximity import; everything else with
+-- scripts/rebuild_reinforcement_clocks.py.
+--
+-- OWNERSHIP NOTE: written by the BOT after an import and by the WEB process on
+-- a miss (website/.env connects as website_app) — hence the explicit grants.
+-- Apply with POSTGRES_USER=etlegacy_user.
+
+CREATE TABLE IF NOT EXISTS round_reinforcement_clocks (
+    round_id          INTEGER     NOT NULL PRIMARY KEY,
+    protocol_version  TEXT        NOT NULL,
+    clocks            JSONB       NOT NULL,
+    computed_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE round_reinforcement_clocks IS
+    'Stored reinforcement-clock verdicts per round. Derived data only: safe to '
+    'TRUNCATE, rows rebuild on the next read or with '
+    'rebuild_reinforcement_clocks.py.';
+
+-- Grant each role only if it exists (same pattern as migration 077).
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'website_app') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON round_reinforcement_clocks TO website_app;
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'etlegacy_user') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON round_reinforcement_clocks TO etlegacy_user;
+  END IF;
+END $$;
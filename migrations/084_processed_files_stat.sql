@@ -0,0 +1,24 @@
+-- 084: processed_files.file_size / file_mtime — the stat the stored hash was
+-- taken from.
+--
+-- WHY
+-- The startup sync (FileTracker.sync_local_files_to_processed_table) checks
+-- every file in local_stats/ against processed_files. With the size and mtime
+-- recorded beside file_hash, a file whose stat is unchanged is trusted without
+-- reading it; only new or changed files are rehashed, so catching up on the
+-- whole history costs one SELECT and a directory scan instead of a SHA256 per
+-- file.
+--
+-- Both columns are filled by mark_processed(file_path=...) and by the startup
+-- sync; NULL means "not recorded yet" and only costs one rehash.
+--
+-- IDEMPOTENT (035-style): ADD COLUMN IF NOT EXISTS, re-runnable with no effect.
+-- Purely additive — existing rows read as NULL.
+
+BEGIN;
+
+ALTER TABLE public.processed_files
+    ADD COLUMN IF NOT EXISTS file_size BIGINT,
+    ADD COLUMN IF NOT EXISTS file_mtime DOUBLE PRECISION;
+
+COMMIT;
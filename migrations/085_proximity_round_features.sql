@@ -0,0 +1,88 @@
+-- 085: proximity_round_features + proximity_player_round_features — the
+-- canonical per-round, per-player proximity features, stored once.
+--
+-- WHY
+-- First blood, man-advantage, clutch and the trade endpoints recomputed the
+-- same per-player, per-round numbers from the raw event tables on every request
+-- and every scope: man-advantage and clutch pull every life and kill in range
+-- into Python, first blood re-sorts every kill, trades re-expand every JSON
+-- successes array. None of it changes until the round's proximity data does,
+-- so website/backend/services/proximity_features.py computes it once per round
+-- and the routers aggregate these rows instead.
+--
+-- FRESHNESS
+-- proximity_round_features is the marker: one row per round, written after its
+-- player rows. A round is served only when its feature_version is the current
+-- FEATURE_VERSION (which embeds CLOCK_PROTOCOL_VERSION) and source_rows still
+-- equals the round's player_track + proximity_spawn_timing +
+-- proximity_trade_event row count — a re-import or a relink changes the count
+-- and reads as a miss. winner_team is checked too, against the rounds table's
+-- decided winner for the round_start_unix (valid rounds only), because a
+-- backfill that flips is_valid or corrects winner_team changes no proximity
+-- row. The bot refreshes a round after each proximity import; everything else
+-- with scripts/rebuild_proximity_features.py.
+--
+-- OWNERSHIP NOTE: written by the BOT after an import and by the WEB process on
+-- a miss (website/.env connects as website_app) — hence the explicit grants.
+-- Apply with POSTGRES_USER=etlegacy_user.
+
+CREATE TABLE IF NOT EXISTS proximity_round_features (
+    round_id          INTEGER     NOT NULL PRIMARY KEY,
+    feature_version   TEXT        NOT NULL,
+    source_rows       INTEGER     NOT NULL,
+    round_start_unix  INTEGER     DEFAULT 0,
+    has_lives         BOOLEAN     NOT NULL DEFAULT FALSE,
+    has_kills         BOOLEAN     NOT NULL DEFAULT FALSE,
+    has_clocks        BOOLEAN     NOT NULL DEFAULT FALSE,
+    first_blood_team  VARCHAR(10),
+    winner_team       VARCHAR(10),
+    advantage         JSONB       NOT NULL DEFAULT '{}'::jsonb,
+    computed_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS proximity_player_round_features (
+    round_id               INTEGER          NOT NULL,
+    player_guid            VARCHAR(32)      NOT NULL,
+    feature_version        TEXT             NOT NULL,
+    player_name            VARCHAR(64),
+    first_picks            INTEGER          NOT NULL DEFAULT 0,
+    first_deaths           INTEGER          NOT NULL DEFAULT 0,
+    first_pick_converted   INTEGER          NOT NULL DEFAULT 0,
+    trade_events           INTEGER          NOT NULL DEFAULT 0,
+    trade_opportunities    INTEGER          NOT NULL DEFAULT 0,
+    trade_attempts         INTEGER          NOT NULL DEFAULT 0,
+    trade_successes        INTEGER          NOT NULL DEFAULT 0,
+    trade_missed           INTEGER          NOT NULL DEFAULT 0,
+    isolation_deaths       INTEGER          NOT NULL DEFAULT 0,
+    avenged_count          INTEGER          NOT NULL DEFAULT 0,
+    avenger_events         INTEGER          NOT NULL DEFAULT 0,
+    avenger_damage         DOUBLE PRECISION NOT NULL DEFAULT 0,
+    advantage_conversions  INTEGER          NOT NULL DEFAULT 0,
+    clutch_situations      INTEGER          NOT NULL DEFAULT 0,
+    clutch_wins            INTEGER          NOT NULL DEFAULT 0,
+    clutch_best_enemies    INTEGER,
+    clutch_best_kills      INTEGER,
+    clutch_best_survived   BOOLEAN,
+    PRIMARY KEY (round_id, player_guid)
+);
+
+COMMENT ON TABLE proximity_round_features IS
+    'Per-round proximity features and the freshness marker for '
+    'proximity_player_round_features. Derived data only: safe to TRUNCATE, '
+    'rows rebuild on the next read or with rebuild_proximity_features.py.';
+COMMENT ON TABLE proximity_player_round_features IS
+    'Per-(round, player) proximity feature vectors. Derived data only: safe to '
+    'TRUNCATE together with proximity_round_features.';
+
+-- Grant each role only if it exists (same pattern as migration 077).
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'website_app') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON proximity_round_features TO website_app;
+    GRANT SELECT, INSERT, UPDATE, DELETE ON proximity_player_round_features TO website_app;
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'etlegacy_user') THEN
+    GRANT SELECT, INSERT, UPDATE, DELETE ON proximity_round_features TO etlegacy_user;
+    GRANT SELECT, INSERT, UPDATE, DELETE ON proximity_player_round_features TO etlegacy_user;
+  END IF;
+END $$;
@@ -0,0 +1,23 @@
+-- 086: greatshot_demos.claim_attempts / greatshot_renders.claim_attempts — how
+-- many times the worker pool has claimed each job.
+--
+-- WHY
+-- In pool mode (GREATSHOT_JOB_MODE=pool) a claim whose worker process died is
+-- handed back once its lease expires. A demo or render that crashes its worker
+-- every time was re-claimed through FOR UPDATE SKIP LOCKED forever. Each claim
+-- now increments the counter, and the lease sweep dead-letters a job already
+-- claimed MAX_CLAIM_ATTEMPTS times (website/backend/services/greatshot_jobs.py)
+-- as 'failed' instead of requeueing it.
+--
+-- IDEMPOTENT (035-style): ADD COLUMN IF NOT EXISTS, re-runnable with no effect.
+-- Purely additive — existing rows read as 0. GreatshotStorageService also adds
+-- the columns on start when its role owns the tables.
+
+BEGIN;
+
+ALTER TABLE public.greatshot_demos
+    ADD COLUMN IF NOT EXISTS claim_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE public.greatshot_renders
+    ADD COLUMN IF NOT EXISTS claim_attempts INTEGER NOT NULL DEFAULT 0;
+
+COMMIT;
@@ -38,21 +38,22 @@ Sections:
     J  verdict against thresholds set before the numbers were seen
 
 Usage:
-    PGPASSWORD=... venv/bin/python3 scripts/backtest_carrier_context.py
+    PGPASSWORD=... venv/bin/python3 scripts/backtest_carrier_context.py [--export-snapshot NAME]
+    venv/bin/python3 scripts/backtest_carrier_context.py --snapshot NAME
 """
 from __future__ import annotations
 
+import argparse
 import asyncio
 import math
 import os
-import random
 import sys
 from collections import defaultdict
 
-import asyncpg
 import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from backtest_engine import cluster_bootstrap  # noqa: E402 - path set above
 from backtest_kis_v6 import (  # noqa: E402 - path set above
     CARRIER_TRACK_SQL,
     CARRY_SQL,
@@ -62,6 +63,7 @@ from backtest_kis_v6 import (  # noqa: E402 - path set above
     V5_VERSION,
     Axes,
     CarrierIndex,
+    _boot_logit,
     _logit_fit,
     _man_adv,
     _pct,
@@ -69,6 +71,7 @@ from backtest_kis_v6 import (  # noqa: E402 - path set above
     _side,
     _won,
 )
+from backtest_snapshot import add_snapshot_args, fetch_queries  # noqa: E402 - path set above
 
 # Pre-registered thresholds (plan, 2026-08-19) — written before the numbers.
 ACCEPT_MIN_N = 200            # an axis needs this many kills to be judged at all
@@ -103,6 +106,18 @@ GROUP BY 1
 """
 
 
+# Everything the report reads, fetched live or replayed from a query snapshot.
+QUERIES = {
+    "kills": (KILLS_SQL, V5_VERSION),
+    "carries": (CARRY_SQL,),
+    "tracks": (CARRIER_TRACK_SQL,),
+    "damage": (DAMAGE_SQL,),
+    "shots": (SHOTS_SQL,),
+    "revenge": (REVENGE_SQL,),
+    "reaction": (REACTION_SQL,),
+}
+
+
 def _dist(a, b) -> float:
     return math.dist(a, b)
 
@@ -118,22 +133,15 @@ def _even(rows):
     return [r for r in rows if abs(_man_adv(r)) <= 1]
 
 
-async def main() -> int:  # noqa: PLR0915 - a report, read top to bottom
-    conn = await asyncpg.connect(
-        host=os.environ.get("POSTGRES_HOST", "127.0.0.1"),
-        port=int(os.environ.get("POSTGRES_PORT", "5432")),
-        database=os.environ.get("POSTGRES_DATABASE", "etlegacy"),
-        user=os.environ.get("POSTGRES_USER", "etlegacy_user"),
-        password=os.environ.get("POSTGRES_PASSWORD") or os.environ.get("PGPASSWORD", ""))
-    await conn.execute("SET default_transaction_read_only = on")
-    kills = await conn.fetch(KILLS_SQL, V5_VERSION)
-    carries = await conn.fetch(CARRY_SQL)
-    tracks = await conn.fetch(CARRIER_TRACK_SQL)
-    damage = await conn.fetch(DAMAGE_SQL)
-    shots = await conn.fetch(SHOTS_SQL)
-    revenge_rows = await conn.fetch(REVENGE_SQL)
-    reaction_rows = await conn.fetch(REACTION_SQL)
-    await conn.close()
+async def main(argv=None) -> int:  # noqa: PLR0915 - a report, read top to bottom
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_snapshot_args(parser)
+    args = parser.parse_args(argv)
+    data = await fetch_queries(QUERIES, snapshot=args.snapshot, export=args.export_snapshot,
+                               root=args.snapshot_root)
+    kills, carries, tracks = data["kills"], data["carries"], data["tracks"]
+    damage, shots = data["damage"], data["shots"]
+    revenge_rows, reaction_rows = data["revenge"], data["reaction"]
 
     kills = [k for k in kills if k["attacker_team"]]
     idx = CarrierIndex(carries, tracks)
@@ -456,20 +464,12 @@ async def main() -> int:  # noqa: PLR0915 - a report, read top to bottom
         y = np.array([_won(k) for k in sub])
         rids = np.array([k["rid"] for k in sub])
         beta = _logit_fit(X, y)
-        uniq = sorted(set(rids.tolist()))
-        by_rid = {u: np.where(rids == u)[0] for u in uniq}
-        rng = random.Random(20260819)  # noqa: S311 - statistical control, not crypto
-        boots = []
-        for _ in range(BOOTSTRAP_ROUNDS):
-            ii = np.concatenate([by_rid[uniq[rng.randrange(len(uniq))]] for _ in range(len(uniq))])
-            try:
-                boots.append(_logit_fit(X[ii], y[ii], iters=25))
-            except np.linalg.LinAlgError:
-                continue
-        if not boots:
+        uniq = np.unique(rids)
+        B = cluster_bootstrap(_boot_logit, rids, (X, y),
+                              n_resamples=BOOTSTRAP_ROUNDS, seed=20260819)
+        if not len(B):
             print(f"\n  --- {role}: every bootstrap fit failed — no CIs to report")
             continue
-        B = np.array(boots)
         print(f"\n  --- {role}  (n={len(sub)} kills, {len(uniq)} rounds, "
               f"baseline {_pct(y.mean())})")
         print(f"  {'axis':<15}{'coef':>8}{'95% CI':>22}{'odds':>7}  n_fires  verdict")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Resampling engine shared by the backtest scripts.
+
+Every backtest asks the same three robustness questions, and each script used
+to answer them with its own ``random.Random`` loop — a Python list of cluster
+picks per draw, one draw at a time, on one core:
+
+  CLUSTER BOOTSTRAP  resample ROUNDS (or players) with replacement, because the
+                     outcome is shared by every kill in a round — kills are not n
+  SPLIT-HALF         per-group reliability: shuffle each player's values, split
+                     in two, correlate the half means, Spearman-Brown correct;
+                     its bootstrap over players is one batched permutation
+  LEAVE-ONE-OUT      recompute without one map (or player) at a time
+
+Here the resample index matrix is drawn once, up front, with
+``numpy.random.default_rng(seed)``: the answer for a seed is the same whether
+the draws then run inline or across a process pool, and the same on every
+machine. ``workers`` fans the draws out with ``ProcessPoolExecutor``; the data
+is shipped to each worker once (pool initializer), never per draw.
+
+Statistics that reduce to per-cluster sums (rates, means, win shares) need no
+per-draw work at all — ``cluster_bootstrap_ratio`` folds the whole bootstrap
+into one matrix product.
+
+A statistic is a module-level ``fn(data, rows) -> float | ndarray | None``
+(module-level so a worker can unpickle it); ``rows`` indexes the rows of the
+resample, ``None`` marks a draw that failed (a singular fit) and is dropped.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+Statistic = Callable[[Any, np.ndarray], Any]
+
+# Below this many draws a pool costs more to start than it saves.
+MIN_DRAWS_FOR_POOL = 32
+
+
+def default_workers() -> int:
+    """BACKTEST_WORKERS, else every core but one."""
+    env = os.environ.get("BACKTEST_WORKERS")
+    if env:
+        return max(1, int(env))
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+@dataclass(frozen=True)
+class ClusterIndex:
+    """Rows grouped by cluster label, for turning cluster picks into row sets.
+
+    ``order`` lists row indices cluster by cluster; cluster ``c`` owns
+    ``order[starts[c]:starts[c] + counts[c]]``. ``labels`` are the distinct
+    cluster labels in sorted order, ``codes`` each row's cluster number.
+    """
+
+    labels: np.ndarray
+    codes: np.ndarray
+    order: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def of(cls, clusters) -> ClusterIndex:
+        labels, codes = np.unique(np.asarray(clusters), return_inverse=True)
+        codes = codes.astype(np.int64, copy=False)
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(labels))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return cls(labels, codes, order, starts, counts)
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.labels)
+
+    def rows(self, picks: np.ndarray) -> np.ndarray:
+        """Row indices of a resample that drew ``picks`` (cluster numbers)."""
+        sizes = self.counts[picks]
+        total = int(sizes.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        # position k of the output is row (start of its cluster) + (k - where
+        # that cluster's run began in the output)
+        run_starts = np.cumsum(sizes) - sizes
+        offsets = np.arange(total) - np.repeat(run_starts, sizes)
+        return self.order[np.repeat(self.starts[picks], sizes) + offsets]
+
+
+def resample_matrix(n_clusters: int, n_resamples: int, seed: int) -> np.ndarray:
+    """(n_resamples, n_clusters) cluster picks, with replacement."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n_clusters, size=(n_resamples, n_clusters), dtype=np.int64)
+
+
+def percentile_ci(samples, level: float = 0.95) -> tuple:
+    """The central ``level`` interval of bootstrap samples, per column."""
+    tail = (1.0 - level) / 2.0 * 100.0
+    lo, hi = np.percentile(np.asarray(samples), [tail, 100.0 - tail], axis=0)
+    return lo, hi
+
+
+# ── execution ─────────────────────────────────────────────────────────────────
+
+_worker: dict[str, Any] = {}
+
+
+def _init_worker(statistic: Statistic, data: Any, index: ClusterIndex | None) -> None:
+    _worker.update(statistic=statistic, data=data, index=index)
+
+
+def _run_picks(picks: np.ndarray) -> list:
+    statistic, data, index = _worker["statistic"], _worker["data"], _worker["index"]
+    return [statistic(data, index.rows(p)) for p in picks]
+
+
+def _run_rows(row_sets: list[np.ndarray]) -> list:
+    statistic, data = _worker["statistic"], _worker["data"]
+    return [statistic(data, rows) for rows in row_sets]
+
+
+def _fan_out(run, tasks: list, statistic: Statistic, data: Any,
+             index: ClusterIndex | None, workers: int) -> list:
+    """Run ``run`` over ``tasks`` in order, inline or across a process pool."""
+    if workers <= 1:
+        _init_worker(statistic, data, index)
+        try:
+            return [out for task in tasks for out in run(task)]
+        finally:
+            _worker.clear()
+    workers = min(workers, len(tasks))
+    chunks = [tasks[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(statistic, data, index)) as pool:
+        results = list(pool.map(_run_chunk, [run] * len(chunks), chunks))
+    # chunks were dealt round-robin; deal the answers back the same way
+    merged: list = [None] * len(tasks)
+    for i, chunk_out in enumerate(results):
+        merged[i::workers] = chunk_out
+    return [out for task_out in merged for out in task_out]
+
+
+def _run_chunk(run, chunk: list) -> list:
+    return [run(task) for task in chunk]
+
+
+def _stack(results: list) -> np.ndarray:
+    kept = [np.asarray(r, dtype=float) for r in results if r is not None]
+    return np.stack(kept) if kept else np.empty(0)
+
+
+# ── the three questions ──────────────────────────────────────────────────────
+
+
+def cluster_bootstrap(statistic: Statistic, clusters, data: Any = None, *,
+                      n_resamples: int, seed: int, workers: int | None = None,
+                      batch: int = 16) -> np.ndarray:
+    """``statistic`` over ``n_resamples`` cluster-resampled row sets.
+
+    Returns the successful draws stacked — shape (kept, *statistic shape) — in
+    draw order. Failed draws (statistic returned None) are dropped, so
+    ``len(result) < n_resamples`` says how many fits did not converge.
+    """
+    index = ClusterIndex.of(clusters)
+    picks = resample_matrix(index.n_clusters, n_resamples, seed)
+    workers = default_workers() if workers is None else workers
+    if n_resamples < MIN_DRAWS_FOR_POOL:
+        workers = 1
+    tasks = [picks[i:i + batch] for i in range(0, n_resamples, batch)]
+    return _stack(_fan_out(_run_picks, tasks, statistic, data, index, workers))
+
+
+def cluster_bootstrap_ratio(numerator, denominator, clusters, *, n_resamples: int,
+                            seed: int) -> np.ndarray:
+    """Bootstrap of sum(numerator) / sum(denominator) with whole clusters resampled.
+
+    Equal to ``cluster_bootstrap`` of that ratio for the same seed, without a
+    single per-draw Python call: each draw is a vector of cluster multiplicities,
+    and the whole bootstrap is one (n_resamples, n_clusters) matrix product.
+    A mean is ``denominator = ones``; a rate is successes over attempts.
+    """
+    index = ClusterIndex.of(clusters)
+    c = index.n_clusters
+    num = np.bincount(index.codes, weights=np.asarray(numerator, dtype=float), minlength=c)
+    den = np.bincount(index.codes, weights=np.asarray(denominator, dtype=float), minlength=c)
+    picks = resample_matrix(c, n_resamples, seed)
+    flat = (np.arange(n_resamples)[:, None] * c + picks).ravel()
+    multiplicity = np.bincount(flat, minlength=n_resamples * c).reshape(n_resamples, c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (multiplicity @ num) / (multiplicity @ den)
+
+
+def split_half_reliability(values, groups, *, repeats: int, seed: int,
+                           min_per_group: int = 4) -> float:
+    """Spearman-Brown corrected split-half reliability of each group's mean.
+
+    Per repeat, every group's values are shuffled and split into a first half
+    of ``n // 2`` and the rest; the Pearson correlation of the two half means
+    across groups is averaged over repeats and corrected to full length.
+    Groups with fewer than ``min_per_group`` values sit out. All repeats are
+    one (repeats, n) sort — no per-group Python loop.
+    """
+    min_per_group = max(min_per_group, 2)  # both halves need a value
+    values = np.asarray(values, dtype=float)
+    labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+    counts = np.bincount(codes, minlength=len(labels))
+    keep = counts[codes] >= min_per_group
+    values, codes = values[keep], codes[keep]
+    if not len(values):
+        return float("nan")
+    _, codes = np.unique(codes, return_inverse=True)
+    counts = np.bincount(codes)
+    if len(counts) < 3:
+        return float("nan")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    half = counts // 2
+
+    rng = np.random.default_rng(seed)
+    # group code + a uniform key in [0, 1): sorting it shuffles within groups
+    # and keeps the groups in code order, so sorted position -> group is fixed
+    order = np.argsort(codes[None, :] + rng.random((repeats, len(values))), axis=1)
+    shuffled = values[order]
+    sorted_codes = np.repeat(np.arange(len(counts)), counts)
+    in_first = (np.arange(len(values)) - starts[sorted_codes]) < half[sorted_codes]
+
+    first_sum = np.add.reduceat(np.where(in_first, shuffled, 0.0), starts, axis=1)
+    total = np.add.reduceat(values[np.argsort(codes, kind="stable")], starts)
+    a = first_sum / half
+    b = (total - first_sum) / (counts - half)
+
+    a_c = a - a.mean(axis=1, keepdims=True)
+    b_c = b - b.mean(axis=1, keepdims=True)
+    den = np.sqrt((a_c ** 2).sum(axis=1) * (b_c ** 2).sum(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = float(np.mean((a_c * b_c).sum(axis=1) / den))
+    return 2 * r / (1 + r) if r > -1 else float("nan")
+
+
+# Cap on the (draws, copies, values) key block split_half_bootstrap sorts at once.
+SPLIT_CHUNK_ELEMENTS = 1 << 21
+
+
+def split_half_bootstrap(values, groups, *, n_resamples: int, seed: int,
+                         min_per_group: int = 4) -> np.ndarray:
+    """Split-half reliability over ``n_resamples`` draws of the GROUPS.
+
+    Each draw resamples the groups with replacement and splits every pick once,
+    by the rules of ``split_half_reliability``; a group picked twice is split
+    twice, independently. Returns the Spearman-Brown corrected r of each draw
+    in draw order, NaN draws (fewer than three usable picks, no spread) dropped.
+
+    The picks are one (n_resamples, n_groups) matrix; the splits are a batched
+    permutation — one sort of (draws, copies, values) keys, where ``copies`` is
+    the most times any draw picked one group — chunked to bound memory.
+    """
+    min_per_group = max(min_per_group, 2)
+    values = np.asarray(values, dtype=float)
+    labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+    n_groups = len(labels)
+    counts = np.bincount(codes, minlength=n_groups)
+    usable = counts >= min_per_group
+    if not usable.any():
+        return np.empty(0)
+    # usable groups' values, contiguous in group order; slot[g] = -1 sits out
+    slot = np.where(usable, np.cumsum(usable) - 1, -1)
+    keep = usable[codes]
+    u_values = values[keep][np.argsort(codes[keep], kind="stable")]
+    u_counts = counts[usable]
+    u_codes = np.repeat(np.arange(len(u_counts)), u_counts)
+    u_starts = np.concatenate(([0], np.cumsum(u_counts)[:-1]))
+    u_half = u_counts // 2
+    u_total = np.add.reduceat(u_values, u_starts)
+    in_first = (np.arange(len(u_values)) - u_starts[u_codes]) < u_half[u_codes]
+
+    rng = np.random.default_rng(seed)
+    picks = np.sort(rng.integers(0, n_groups, size=(n_resamples, n_groups)), axis=1)
+    # k-th copy of a group within a draw: position minus where its run began
+    pos = np.arange(n_groups)
+    run_start = np.where(np.diff(picks, axis=1, prepend=-1) != 0, pos, 0)
+    copy = pos - np.maximum.accumulate(run_start, axis=1)
+    copies = int(copy.max()) + 1
+    chunk = max(1, SPLIT_CHUNK_ELEMENTS // (copies * len(u_values)))
+
+    out = []
+    for lo in range(0, n_resamples, chunk):
+        draw_picks, draw_copy = picks[lo:lo + chunk], copy[lo:lo + chunk]
+        m = len(draw_picks)
+        # group code + a uniform key: sorting shuffles within each group
+        order = np.argsort(u_codes + rng.random((m, copies, len(u_values))), axis=-1)
+        first_sum = np.add.reduceat(np.where(in_first, u_values[order], 0.0), u_starts, axis=-1)
+
+        g = slot[draw_picks]
+        ok = g >= 0
+        g = np.where(ok, g, 0)
+        first = first_sum[np.arange(m)[:, None], draw_copy, g]
+        a = first / u_half[g]
+        b = (u_total[g] - first) / (u_counts[g] - u_half[g])
+
+        n = ok.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a_c = np.where(ok, a - (a * ok).sum(axis=1, keepdims=True) / n[:, None], 0.0)
+            b_c = np.where(ok, b - (b * ok).sum(axis=1, keepdims=True) / n[:, None], 0.0)
+            r = (a_c * b_c).sum(axis=1) / np.sqrt((a_c ** 2).sum(axis=1) * (b_c ** 2).sum(axis=1))
+            r = np.where((n >= 3) & (r > -1), 2 * r / (1 + r), np.nan)
+        out.append(r)
+    draws = np.concatenate(out)
+    return draws[~np.isnan(draws)]
+
+
+def leave_one_out(statistic: Statistic, groups, data: Any = None, *, min_rows: int = 0,
+                  workers: int | None = None) -> dict:
+    """``statistic`` recomputed without each group in turn, keyed by the group.
+
+    Groups whose removal leaves fewer than ``min_rows`` rows are skipped, as
+    are draws the statistic rejects (None).
+    """
+    index = ClusterIndex.of(groups)
+    everything = np.arange(len(index.codes))
+    held_out, row_sets = [], []
+    for code, label in enumerate(index.labels.tolist()):
+        rows = everything[index.codes != code]
+        if len(rows) >= min_rows:
+            held_out.append(label)
+            row_sets.append(rows)
+    workers = 1 if workers is None else workers
+    tasks = [[rows] for rows in row_sets]
+    results = _fan_out(_run_rows, tasks, statistic, data, None, workers)
+    return {label: out for label, out in zip(held_out, results) if out is not None}
@@ -46,10 +46,12 @@ Sections:
        after J/K/L, because it reads them)
 
 Usage:
-    PGPASSWORD=... venv/bin/python3 scripts/backtest_kis_v6.py
+    PGPASSWORD=... venv/bin/python3 scripts/backtest_kis_v6.py [--export-snapshot NAME]
+    venv/bin/python3 scripts/backtest_kis_v6.py --snapshot NAME
 """
 from __future__ import annotations
 
+import argparse
 import asyncio
 import bisect
 import json
@@ -61,9 +63,17 @@ import statistics
 import sys
 from collections import defaultdict
 
-import asyncpg
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from backtest_engine import (  # noqa: E402 - path set above
+    cluster_bootstrap,
+    percentile_ci,
+    split_half_bootstrap,
+    split_half_reliability,
+)
+from backtest_snapshot import add_snapshot_args, fetch_queries  # noqa: E402 - path set above
+
 # The formula version these scripts AUDIT. It is deliberately the old one:
 # every measurement here compares a candidate against what production stores.
 # ⚠️ When kis-v6 ships, change this — otherwise the audit silently keeps
@@ -128,11 +138,6 @@ def _spearman(xs: list[float], ys: list[float]) -> float:
     return _pearson(ranks(xs), ranks(ys))
 
 
-def _spearman_brown(r: float) -> float:
-    """Correct a split-half correlation back to full test length."""
-    return 2 * r / (1 + r) if r > -1 else float("nan")
-
-
 # One row per kill, with everything any candidate axis needs.
 # Filters, stated explicitly (owner rule: always attach the filters):
 #   - rounds.is_valid, not a bot round, winner_team AND defender_team known
@@ -323,6 +328,15 @@ def _logit_fit(X: np.ndarray, y: np.ndarray, iters: int = 40) -> np.ndarray:
     return beta
 
 
+def _boot_logit(data, rows):
+    """One cluster-bootstrap draw of _logit_fit; None when the draw is singular."""
+    X, y = data
+    try:
+        return _logit_fit(X[rows], y[rows], iters=25)
+    except np.linalg.LinAlgError:
+        return None
+
+
 class Axes:
     """The candidate axes, and the inputs the v6 scorer is calibrated on.
 
@@ -520,33 +534,32 @@ def _v6_scorer(axes: Axes, weights: dict[str, dict[str, float]]):
     return score
 
 
-def _split_halves(players, value_of, cell_mean, rng):
-    """One random split of every player's kills into two halves.
+def _measured(players, value_of, cell_mean):
+    """Every measured kill's value and its owner, for the split-half kernels.
 
     A metric may return None for a kill it cannot measure (no position, no
     denied time). Those kills are SKIPPED, not counted as zero: zero-filling
     would drag the mean of whichever player has more missing data and call it
     a difference in play (CodeRabbit, and it is right).
     """
-    first, second = [], []
-    for _guid, kills in players:
-        vals = [value_of(r) - (cell_mean(r) if cell_mean else 0.0)
-                for r in kills if value_of(r) is not None]
-        if len(vals) < 4:
-            continue
-        rng.shuffle(vals)
-        half = len(vals) // 2
-        first.append(sum(vals[:half]) / half)
-        second.append(sum(vals[half:]) / len(vals[half:]))
-    return first, second
+    values, owners = [], []
+    for guid, kills in players:
+        for r in kills:
+            v = value_of(r)
+            if v is not None:
+                values.append(v - (cell_mean(r) if cell_mean else 0.0))
+                owners.append(guid)
+    return values, owners
 
 
 def _reliability(players, value_of, cell_mean=None, seed=1) -> float:
-    """Split-half reliability of a per-kill metric's player mean."""
-    rng = random.Random(seed)  # noqa: S311 - statistical resampling, not crypto
-    rs = [_pearson(*_split_halves(players, value_of, cell_mean, rng))
-          for _ in range(SPLIT_HALF_REPEATS)]
-    return _spearman_brown(sum(rs) / len(rs))
+    """Split-half reliability of a per-kill metric's player mean.
+
+    Unmeasurable kills skipped, players with fewer than four values sit out,
+    all repeats drawn in one NumPy pass.
+    """
+    values, owners = _measured(players, value_of, cell_mean)
+    return split_half_reliability(values, owners, repeats=SPLIT_HALF_REPEATS, seed=seed)
 
 
 def _reliability_ci(players, value_of, cell_mean=None, seed=1, draws=300):
@@ -554,40 +567,38 @@ def _reliability_ci(players, value_of, cell_mean=None, seed=1, draws=300):
 
     With ~15 players the split-half correlation is itself a noisy statistic —
     two runs of the 20-repeat version landed on 0.735 and 0.662. The point
-    estimate alone is not a decision; the interval is.
+    estimate alone is not a decision; the interval is. Both come from the
+    engine's split-half kernel, the interval from one batched draw.
     """
-    rng = random.Random(seed)  # noqa: S311 - statistical resampling, not crypto
-    point = _reliability(players, value_of, cell_mean, seed)
-    vals = []
-    for _ in range(draws):
-        sample = [players[rng.randrange(len(players))] for _ in range(len(players))]
-        a, b = _split_halves(sample, value_of, cell_mean, rng)
-        v = _spearman_brown(_pearson(a, b))
-        if not math.isnan(v):
-            vals.append(v)
-    lo = float(np.percentile(vals, 2.5)) if vals else float("nan")
-    hi = float(np.percentile(vals, 97.5)) if vals else float("nan")
-    return point, lo, hi
-
-
-async def main() -> int:  # noqa: PLR0915 - a report, read top to bottom
-    conn = await asyncpg.connect(
-        host=os.environ.get("POSTGRES_HOST", "127.0.0.1"),
-        port=int(os.environ.get("POSTGRES_PORT", "5432")),
-        database=os.environ.get("POSTGRES_DATABASE", "etlegacy"),
-        user=os.environ.get("POSTGRES_USER", "etlegacy_user"),
-        password=os.environ.get("POSTGRES_PASSWORD") or os.environ.get("PGPASSWORD", ""))
-    try:
-        await conn.execute("SET default_transaction_read_only = on")
-        rows = await conn.fetch(KILLS_SQL, V5_VERSION)
-        total_v5 = await conn.fetchval(
-            "SELECT COUNT(*) FROM storytelling_kill_impact WHERE formula_version = $1",
-            V5_VERSION)
-        revenge_rows = await conn.fetch(REVENGE_SQL)
-        reaction_rows = await conn.fetch(REACTION_SQL)
-        carry_rows = await conn.fetch(CARRY_SQL)
-    finally:
-        await conn.close()   # a raised query used to leak the connection
+    values, owners = _measured(players, value_of, cell_mean)
+    point = split_half_reliability(values, owners, repeats=SPLIT_HALF_REPEATS, seed=seed)
+    vals = split_half_bootstrap(values, owners, n_resamples=draws, seed=seed)
+    if not len(vals):
+        return point, float("nan"), float("nan")
+    lo, hi = percentile_ci(vals)
+    return point, float(lo), float(hi)
+
+
+# Everything the report reads, fetched live or replayed from a query snapshot.
+QUERIES = {
+    "kills": (KILLS_SQL, V5_VERSION),
+    "v5_total": ("SELECT COUNT(*) AS n FROM storytelling_kill_impact WHERE formula_version = $1",
+                 V5_VERSION),
+    "revenge": (REVENGE_SQL,),
+    "reaction": (REACTION_SQL,),
+    "carry": (CARRY_SQL,),
+}
+
+
+async def main(argv=None) -> int:  # noqa: PLR0915 - a report, read top to bottom
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_snapshot_args(parser)
+    args = parser.parse_args(argv)
+    data = await fetch_queries(QUERIES, snapshot=args.snapshot, export=args.export_snapshot,
+                               root=args.snapshot_root)
+    rows = data["kills"]
+    total_v5 = data["v5_total"][0]["n"]
+    revenge_rows, reaction_rows, carry_rows = data["revenge"], data["reaction"], data["carry"]
 
     rows = [r for r in rows if r["attacker_team"]]
     axes = Axes(rows)
@@ -723,18 +734,9 @@ async def main() -> int:  # noqa: PLR0915 - a report, read top to bottom
         y = np.array([_won(r) for r in sub])
         rids = np.array([r["rid"] for r in sub])
         beta = _logit_fit(X, y)
-        uniq = sorted(set(rids.tolist()))
-        idx_by = {u: np.where(rids == u)[0] for u in uniq}
-        rng = random.Random(20260819)  # noqa: S311 - statistical control, not crypto
-        boots = []
-        for _ in range(BOOTSTRAP_ROUNDS):
-            pick = [idx_by[uniq[rng.randrange(len(uniq))]] for _ in range(len(uniq))]
-            ii = np.concatenate(pick)
-            try:
-                boots.append(_logit_fit(X[ii], y[ii], iters=25))
-            except np.linalg.LinAlgError:
-                continue
-        B = np.array(boots)
+        uniq = np.unique(rids)
+        B = cluster_bootstrap(_boot_logit, rids, (X, y),
+                              n_resamples=BOOTSTRAP_ROUNDS, seed=20260819)
         print(f"\n  --- {role}  (n={len(sub)} kills, {len(uniq)} rounds, "
               f"baseline {_pct(y.mean())})")
         print(f"  {'axis':<12}{'coef':>8}{'95% CI':>22}{'odds':>7}  kept?")
@@ -34,10 +34,12 @@ any formula ships, five questions need answers.
      night on it.
 
 Usage:
-    PGPASSWORD=... venv/bin/python3 scripts/backtest_metric_foundations.py
+    PGPASSWORD=... venv/bin/python3 scripts/backtest_metric_foundations.py [--export-snapshot NAME]
+    venv/bin/python3 scripts/backtest_metric_foundations.py --snapshot NAME
 """
 from __future__ import annotations
 
+import argparse
 import asyncio
 import math
 import os
@@ -46,7 +48,6 @@ import statistics
 import sys
 from collections import defaultdict
 
-import asyncpg
 import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -64,6 +65,7 @@ from backtest_kis_v6 import (  # noqa: E402 - path set above
     _side,
     _won,
 )
+from backtest_snapshot import add_snapshot_args, fetch_queries  # noqa: E402 - path set above
 
 MIN_KILLS_FOR_PLAYER = 200
 CV_FOLDS = 5
@@ -90,6 +92,15 @@ WHERE r.is_valid AND NOT COALESCE(r.is_bot_round, FALSE)
 ORDER BY pcs.round_id, pcs.player_guid
 """
 
+# Everything the report reads, fetched live or replayed from a query snapshot.
+QUERIES = {
+    "kills": (KILLS_SQL, V5_VERSION),
+    "revenge": (REVENGE_SQL,),
+    "reaction": (REACTION_SQL,),
+    "carry": (CARRY_SQL,),
+    "roster": (ROSTER_SQL,),
+}
+
 
 def _reliability_vc(groups: list[list[float]]) -> tuple[float, float, float]:
     """Reliability of player means by variance decomposition.
@@ -154,20 +165,14 @@ def _round_accuracy(rows, scores: dict, side_of, won_of, map_of) -> float:
     return sum(1 for m, d, w in diffs if ((d - means[m]) > 0) == (w == 1)) / len(diffs)
 
 
-async def main() -> int:  # noqa: PLR0915 - a report, read top to bottom
-    conn = await asyncpg.connect(
-        host=os.environ.get("POSTGRES_HOST", "127.0.0.1"),
-        port=int(os.environ.get("POSTGRES_PORT", "5432")),
-        database=os.environ.get("POSTGRES_DATABASE", "etlegacy"),
-        user=os.environ.get("POSTGRES_USER", "etlegacy_user"),
-        password=os.environ.get("POSTGRES_PASSWORD") or os.environ.get("PGPASSWORD", ""))
-    await conn.execute("SET default_transaction_read_only = on")
-    kills = await conn.fetch(KILLS_SQL, V5_VERSION)
-    revenge_rows = await conn.fetch(REVENGE_SQL)
-    reaction_rows = await conn.fetch(REACTION_SQL)
-    carry_rows = await conn.fetch(CARRY_SQL)
-    roster = await conn.fetch(ROSTER_SQL)
-    await conn.close()
+async def main(argv=None) -> int:  # noqa: PLR0915 - a report, read top to bottom
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_snapshot_args(parser)
+    args = parser.parse_args(argv)
+    data = await fetch_queries(QUERIES, snapshot=args.snapshot, export=args.export_snapshot,
+                               root=args.snapshot_root)
+    kills, roster = data["kills"], data["roster"]
+    revenge_rows, reaction_rows, carry_rows = data["revenge"], data["reaction"], data["carry"]
 
     kills = [k for k in kills if k["attacker_team"]]
     axes = Axes(kills)
@@ -70,6 +70,12 @@ class _Adapter:
         async with self.pool.acquire() as conn:
             return await conn.fetchrow(query, *params)
 
+    async def fetch_many(self, queries):
+        # (query, params) reads, as the detectors batch them; run like the
+        # adapter's parallel mode, one pooled connection each.
+        return list(await asyncio.gather(
+            *(self.fetch_all(query, params) for query, params in queries)))
+
 
 async def main():
     async def _init(conn):
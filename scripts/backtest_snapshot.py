@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Export the backtest dataset once, read it offline many times.
+
+Every backtest script opened its own connection and re-ran the same joins —
+seconds to minutes of database time per run, and two runs a day apart were not
+even measuring the same rows. A snapshot freezes the dataset:
+
+    BACKTEST_SNAPSHOT_DIR/<name>/
+        manifest.json              format version, filters, per-column dtype,
+                                   row counts and a content digest
+        <table>.<column>.npy       one NumPy array per column
+        <table>.<column>.null.npy  validity mask, only for columns with NULLs
+
+Columns load memory-mapped and pickle-free (``allow_pickle=False``), so a
+script touching three columns of the kill table reads three files.
+
+TABLES (same row filters as the backtests: valid, non-bot rounds)
+
+  rounds    one row per round: identity, map, session, timing
+  outcomes  one row per round: defender / winner side, tie, end reason
+  kills     one row per proximity kill outcome, with the killer's side and
+            man count from proximity_combat_position
+  tracks    one row per (round, player): lives, samples, distance, time alive
+
+QUERY SNAPSHOTS. A backtest that runs its own SQL (backtest_kis_v6 and the
+scripts built on it) freezes its own query results instead: a live run with
+``--export-snapshot NAME`` stores each query's rows as a table named after the
+query, and ``--snapshot NAME`` replays them — same column names, NULLs back to
+None — without a database. The manifest keeps a digest of each query's SQL
+and arguments; a snapshot exported by different SQL is refused, not misread.
+
+Usage:
+    PGPASSWORD=... venv/bin/python3 scripts/backtest_snapshot.py export [--name NAME]
+    venv/bin/python3 scripts/backtest_snapshot.py show NAME
+    PGPASSWORD=... venv/bin/python3 scripts/backtest_kis_v6.py --export-snapshot NAME
+    venv/bin/python3 scripts/backtest_kis_v6.py --snapshot NAME
+
+    from backtest_snapshot import load_snapshot
+    snap = load_snapshot("2026-10-19")
+    rid, won = snap["kills"]["round_id"], snap["outcomes"]["winner_team"]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+
+# Bump when a table, column or the on-disk layout changes; load_snapshot refuses
+# a snapshot written by another version rather than misreading it.
+SNAPSHOT_FORMAT_VERSION = 2
+
+DEFAULT_DIR = Path(os.environ.get(
+    "BACKTEST_SNAPSHOT_DIR",
+    Path(__file__).resolve().parent.parent / "backtest_snapshots",
+))
+
+_ROUND_FILTER = "r.is_valid AND NOT COALESCE(r.is_bot_round, FALSE)"
+
+TABLES: dict[str, tuple[str, list[tuple[str, str]]]] = {
+    "rounds": (
+        f"""
+        SELECT r.id, r.gaming_session_id, r.map_name, r.round_number, r.round_date,
+               r.round_start_unix, r.actual_duration_seconds, r.map_play_seq
+        FROM rounds r
+        WHERE {_ROUND_FILTER}
+        ORDER BY r.id
+        """,
+        [("id", "int"), ("gaming_session_id", "int"), ("map_name", "str"),
+         ("round_number", "int"), ("round_date", "str"), ("round_start_unix", "int"),
+         ("actual_duration_seconds", "int"), ("map_play_seq", "int")],
+    ),
+    "outcomes": (
+        f"""
+        SELECT r.id, r.defender_team, r.winner_team, r.is_tied, r.round_outcome,
+               r.end_reason, r.time_to_beat_seconds
+        FROM rounds r
+        WHERE {_ROUND_FILTER}
+        ORDER BY r.id
+        """,
+        [("round_id", "int"), ("defender_team", "int"), ("winner_team", "int"),
+         ("is_tied", "bool"), ("round_outcome", "str"), ("end_reason", "str"),
+         ("time_to_beat_seconds", "int")],
+    ),
+    # the combat-position join carries victim_guid too: two kills sharing an
+    # event_time would otherwise fan out (see KILLS_SQL in backtest_kis_v6.py)
+    "kills": (
+        f"""
+        SELECT ko.id, ko.round_id, ko.kill_time, ko.killer_guid, ko.victim_guid,
+               ko.kill_mod, ko.outcome, ko.delta_ms, ko.effective_denied_ms,
+               cp.attacker_team, cp.axis_alive, cp.allies_alive,
+               sqrt(power(cp.attacker_x - cp.victim_x, 2)
+                  + power(cp.attacker_y - cp.victim_y, 2)
+                  + power(cp.attacker_z - cp.victim_z, 2)) AS kill_distance
+        FROM proximity_kill_outcome ko
+        JOIN rounds r ON r.id = ko.round_id
+        LEFT JOIN proximity_combat_position cp
+          ON cp.round_id = ko.round_id AND cp.event_type = 'kill'
+         AND cp.attacker_guid = ko.killer_guid AND cp.victim_guid = ko.victim_guid
+         AND cp.event_time = ko.kill_time
+        WHERE {_ROUND_FILTER}
+          AND ko.killer_guid NOT LIKE 'OMNIBOT%'
+          AND ko.victim_guid NOT LIKE 'OMNIBOT%'
+        ORDER BY ko.round_id, ko.kill_time, ko.id
+        """,
+        [("id", "int"), ("round_id", "int"), ("kill_time", "int"),
+         ("killer_guid", "str"), ("victim_guid", "str"), ("kill_mod", "int"),
+         ("outcome", "str"), ("delta_ms", "int"), ("effective_denied_ms", "int"),
+         ("attacker_team", "str"), ("axis_alive", "int"), ("allies_alive", "int"),
+         ("kill_distance", "float")],
+    ),
+    "tracks": (
+        f"""
+        SELECT pt.round_id, pt.player_guid, MIN(pt.team) AS team,
+               COUNT(*) AS lives, SUM(pt.sample_count) AS samples,
+               SUM(pt.total_distance) AS distance,
+               SUM(pt.duration_ms) AS alive_ms
+        FROM player_track pt
+        JOIN rounds r ON r.id = pt.round_id
+        WHERE {_ROUND_FILTER}
+          AND pt.player_guid NOT LIKE 'OMNIBOT%'
+        GROUP BY pt.round_id, pt.player_guid
+        ORDER BY pt.round_id, pt.player_guid
+        """,
+        [("round_id", "int"), ("player_guid", "str"), ("team", "str"),
+         ("lives", "int"), ("samples", "int"), ("distance", "float"),
+         ("alive_ms", "int")],
+    ),
+}
+
+# Column kinds: "int" (int64), "float" (float64), "bool", "str" (fixed-width
+# unicode), "json" (a list or dict, stored as its JSON text). NULLs become
+# 0 / NaN / False / "" plus a validity mask.
+_FILL = {"int": 0, "float": float("nan"), "bool": False, "str": "", "json": ""}
+_DTYPE = {"int": np.int64, "float": np.float64, "bool": np.bool_, "str": np.str_,
+          "json": np.str_}
+
+
+def to_columns(rows, columns: list[tuple[str, str]]) -> dict[str, np.ndarray]:
+    """Row tuples -> {column: array}, plus ``<column>.null`` masks where needed."""
+    out: dict[str, np.ndarray] = {}
+    for i, (name, kind) in enumerate(columns):
+        raw = [row[i] for row in rows]
+        null = np.fromiter((v is None for v in raw), dtype=bool, count=len(raw))
+        filled = [_FILL[kind] if v is None else v for v in raw]
+        if kind == "json":
+            filled = [v if isinstance(v, str) else json.dumps(v) for v in filled]
+        if kind in ("str", "json"):
+            out[name] = np.array([str(v) for v in filled], dtype=np.str_)
+        else:
+            out[name] = np.array(filled, dtype=_DTYPE[kind])
+        if null.any():
+            out[f"{name}.null"] = null
+    return out
+
+
+def _digest(arrays: dict[str, np.ndarray]) -> str:
+    h = hashlib.sha256()
+    for key in sorted(arrays):
+        h.update(key.encode())
+        h.update(str(arrays[key].dtype).encode())
+        h.update(np.ascontiguousarray(arrays[key]).tobytes())
+    return h.hexdigest()[:16]
+
+
+def infer_columns(rows) -> list[tuple[str, str]]:
+    """(name, kind) of each column of fetched rows, from its first non-NULL value.
+
+    NUMERIC (Decimal) is stored as float. Dates and other types keep their
+    text form.
+    """
+    if not rows:
+        return []
+    columns = []
+    for name in rows[0].keys():  # noqa: SIM118 - iterating a Record yields values
+        value = next((r[name] for r in rows if r[name] is not None), None)
+        if isinstance(value, bool):
+            kind = "bool"
+        elif isinstance(value, int):
+            kind = "int"
+        elif isinstance(value, (float, Decimal)):
+            kind = "float"
+        elif isinstance(value, (list, dict)):
+            kind = "json"
+        else:
+            kind = "str"
+        columns.append((name, kind))
+    return columns
+
+
+def write_snapshot(tables: dict[str, dict[str, np.ndarray]], path: Path, *,
+                   source: str = "", queries: dict | None = None) -> dict:
+    """Write column arrays and a manifest under ``path``; returns the manifest.
+
+    ``queries`` (query snapshots) maps each table to its query's digest and
+    column kinds.
+    """
+    path.mkdir(parents=True, exist_ok=False)
+    manifest: dict = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source,
+        "filters": _ROUND_FILTER,
+        "tables": {},
+    }
+    if queries is not None:
+        manifest["queries"] = queries
+    for table, arrays in tables.items():
+        rows = {len(a) for a in arrays.values()}
+        if len(rows) > 1:
+            raise ValueError(f"{table}: columns of different lengths {sorted(rows)}")
+        for column, array in arrays.items():
+            np.save(path / f"{table}.{column}.npy", array, allow_pickle=False)
+        manifest["tables"][table] = {
+            "rows": rows.pop() if rows else 0,
+            "columns": {c: str(a.dtype) for c, a in arrays.items() if not c.endswith(".null")},
+            "nullable": sorted(c[:-5] for c in arrays if c.endswith(".null")),
+            "digest": _digest(arrays),
+        }
+    (path / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+@dataclass
+class Snapshot:
+    """A loaded snapshot: ``snap[table][column]`` is a read-only array."""
+
+    path: Path
+    manifest: dict
+    tables: dict[str, dict[str, np.ndarray]]
+
+    def __getitem__(self, table: str) -> dict[str, np.ndarray]:
+        return self.tables[table]
+
+    def null(self, table: str, column: str) -> np.ndarray:
+        """True where ``column`` was NULL in the database."""
+        mask = self.tables[table].get(f"{column}.null")
+        if mask is None:
+            return np.zeros(self.manifest["tables"][table]["rows"], dtype=bool)
+        return mask
+
+    def rows(self, table: str) -> list[Row]:
+        """A query snapshot's table as the rows the query returned, NULLs as None."""
+        names = list(self.manifest["tables"][table]["columns"])
+        kinds = self.manifest.get("queries", {}).get(table, {}).get("kinds", {})
+        row_type = type("Row", (Row,), {"__slots__": (), "columns": {n: i for i, n in enumerate(names)}})
+        columns = []
+        for name in names:
+            values = np.asarray(self.tables[table][name]).tolist()
+            if kinds.get(name) == "json":
+                values = [json.loads(v) if v else v for v in values]
+            null = self.null(table, name).tolist()
+            columns.append([None if n else v for v, n in zip(values, null)])
+        return [row_type(r) for r in zip(*columns)]
+
+
+class Row(tuple):
+    """A replayed row, indexed by position like a tuple or by column name like
+    an asyncpg Record. ``Snapshot.rows`` makes one subclass per table."""
+
+    __slots__ = ()
+    columns: dict[str, int] = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self.columns[key])
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return self.columns.keys()
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self.columns else default
+
+
+def load_snapshot(name_or_path, *, root: Path = DEFAULT_DIR, mmap: bool = True) -> Snapshot:
+    """Open a snapshot by name (under ``root``) or by path."""
+    path = Path(name_or_path)
+    if not path.is_dir():
+        path = Path(root) / str(name_or_path)
+    manifest = json.loads((path / "manifest.json").read_text())
+    version = manifest.get("format_version")
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"snapshot {path.name} is format {version}, this build reads "
+            f"{SNAPSHOT_FORMAT_VERSION} — export a fresh one"
+        )
+    tables: dict[str, dict[str, np.ndarray]] = {}
+    for table, meta in manifest["tables"].items():
+        names = list(meta["columns"]) + [f"{c}.null" for c in meta["nullable"]]
+        tables[table] = {
+            c: np.load(path / f"{table}.{c}.npy", mmap_mode="r" if mmap else None,
+                       allow_pickle=False)
+            for c in names
+        }
+    return Snapshot(path, manifest, tables)
+
+
+async def export_snapshot(conn, path: Path, *, source: str = "") -> dict:
+    """Run every TABLES query on ``conn`` (asyncpg) and write the snapshot."""
+    tables = {}
+    for table, (sql, columns) in TABLES.items():
+        rows = await conn.fetch(sql)
+        tables[table] = to_columns([tuple(r) for r in rows], columns)
+    return write_snapshot(tables, path, source=source)
+
+
+def _query_digest(sql: str, args: tuple) -> str:
+    return hashlib.sha256(json.dumps([sql, [str(a) for a in args]]).encode()).hexdigest()[:16]
+
+
+def _source() -> str:
+    return f"{os.environ.get('POSTGRES_HOST', '127.0.0.1')}/" \
+           f"{os.environ.get('POSTGRES_DATABASE', 'etlegacy')}"
+
+
+async def connect():
+    """A read-only asyncpg connection from the POSTGRES_* environment."""
+    import asyncpg
+
+    conn = await asyncpg.connect(
+        host=os.environ.get("POSTGRES_HOST", "127.0.0.1"),
+        port=int(os.environ.get("POSTGRES_PORT", "5432")),
+        database=os.environ.get("POSTGRES_DATABASE", "etlegacy"),
+        user=os.environ.get("POSTGRES_USER", "etlegacy_user"),
+        password=os.environ.get("POSTGRES_PASSWORD") or os.environ.get("PGPASSWORD", ""))
+    await conn.execute("SET default_transaction_read_only = on")
+    return conn
+
+
+async def fetch_queries(queries: dict[str, tuple], *, snapshot: str | None = None,
+                        export: str | None = None, root: Path = DEFAULT_DIR) -> dict[str, list]:
+    """Each named ``(sql, *args)`` query's rows.
+
+    With ``snapshot`` they are replayed from that query snapshot, and no
+    connection is opened. Otherwise they are fetched live; ``export`` then
+    freezes them under that name for the next run.
+    """
+    digests = {name: _query_digest(sql, tuple(args)) for name, (sql, *args) in queries.items()}
+    if snapshot:
+        snap = load_snapshot(snapshot, root=root)
+        recorded = snap.manifest.get("queries", {})
+        stale = sorted(n for n in queries if recorded.get(n, {}).get("digest") != digests[n])
+        if stale:
+            raise ValueError(
+                f"snapshot {snap.path.name} was not exported by these queries "
+                f"({', '.join(stale)}) — export a fresh one"
+            )
+        return {name: snap.rows(name) for name in queries}
+
+    conn = await connect()
+    try:
+        fetched = {name: await conn.fetch(sql, *args) for name, (sql, *args) in queries.items()}
+    finally:
+        await conn.close()
+    if export:
+        tables, recorded = {}, {}
+        for name, rows in fetched.items():
+            columns = infer_columns(rows)
+            names = [c for c, _ in columns]
+            tables[name] = to_columns([[r[c] for c in names] for r in rows], columns)
+            recorded[name] = {"digest": digests[name], "kinds": dict(columns)}
+        manifest = write_snapshot(tables, Path(root) / export, source=_source(), queries=recorded)
+        _print(export, manifest)
+    return fetched
+
+
+def add_snapshot_args(parser: argparse.ArgumentParser) -> None:
+    """``--snapshot`` / ``--export-snapshot`` for a backtest built on fetch_queries."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--snapshot", metavar="NAME",
+                       help="replay a query snapshot instead of querying the database")
+    group.add_argument("--export-snapshot", metavar="NAME",
+                       help="run live and freeze this run's query results as NAME")
+    parser.add_argument("--snapshot-root", default=str(DEFAULT_DIR), type=Path)
+
+
+async def _export(args) -> int:
+    conn = await connect()
+    try:
+        name = args.name or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H%M%S")
+        manifest = await export_snapshot(conn, Path(args.root) / name, source=_source())
+    finally:
+        await conn.close()
+    _print(name, manifest)
+    return 0
+
+
+def _print(name: str, manifest: dict) -> None:
+    print(f"snapshot {name}  (format {manifest['format_version']}, "
+          f"{manifest['created_at']}, {manifest['source'] or 'unknown source'})")
+    for table, meta in manifest["tables"].items():
+        print(f"  {table:<10}{meta['rows']:>10,} rows  {len(meta['columns']):>3} cols  "
+              f"digest {meta['digest']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--root", default=str(DEFAULT_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="query the database and write a snapshot")
+    export.add_argument("--name", help="directory name (default: UTC timestamp)")
+    show = sub.add_parser("show", help="print a snapshot's manifest summary")
+    show.add_argument("name")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        return asyncio.run(_export(args))
+    snap = load_snapshot(args.name, root=Path(args.root))
+    _print(snap.path.name, snap.manifest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark W5b S5 scheduler search over the installed ET asset corpus.
+
+Runs ``search_symbolic_schedule`` for every ready cross-frontier seed the S5
+real-asset contract measures and reports states/sec and peak RSS. Nothing is
+checkpointed or published; use ``analyze_map_stage_scheduler.py`` for
+evidence runs. The per-seed metrics digest lets two runs (before and after a
+search change) prove they explored the same states.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import resource
+import time
+from pathlib import Path
+
+from website.backend.map_geometry.pk3_index import Pk3GeometryIndex
+from website.backend.map_geometry.stage_measurement import (
+    asset_manifest_sha256,
+    iter_cross_frontiers,
+    measure_seed,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--etmain-dir", type=Path, default=Path("/home/samba/share/etmain"))
+    parser.add_argument("--work-limit", type=int, default=64)
+    parser.add_argument("--max-paths", type=int, default=16)
+    parser.add_argument("--map", dest="maps", action="append", default=[])
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    geometry_index = Pk3GeometryIndex.scan(args.etmain_dir)
+    map_names = tuple(
+        resolution.map_name
+        for resolution in geometry_index.resolve_many(args.maps or geometry_index.map_names)
+    )
+    manifest = asset_manifest_sha256(geometry_index, map_names)
+
+    measured: dict[str, dict[str, object]] = {}
+    states_created = 0
+    search_seconds = 0.0
+    for occurrence in iter_cross_frontiers(
+        geometry_index,
+        map_names,
+        asset_manifest=manifest,
+        max_paths=args.max_paths,
+    ):
+        if not occurrence.adaptation.ready or occurrence.seed_id in measured:
+            continue
+        started = time.perf_counter()
+        result = measure_seed(occurrence, work_limit=args.work_limit)
+        search_seconds += time.perf_counter() - started
+        measured[occurrence.seed_id] = result
+        states_created += int(result["metrics"]["states_created"])
+
+    digest = hashlib.sha256(
+        json.dumps(measured, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    report = {
+        "asset_manifest_sha256": manifest,
+        "maps": len(map_names),
+        "seeds": len(measured),
+        "work_limit": args.work_limit,
+        "states_created": states_created,
+        "search_seconds": round(search_seconds, 6),
+        "states_per_second": round(states_created / search_seconds, 1) if search_seconds else None,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "seed_results_sha256": digest,
+    }
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""rebuild_proximity_features.py — store every round's proximity feature rows.
+
+Fills proximity_round_features / proximity_player_round_features (migration
+085) with website/backend/services/proximity_features.py: first blood, trades,
+man-advantage and clutch per round and player, five queries per batch of
+rounds. Run it once after applying 085, and again after a FEATURE_VERSION
+change; between those the bot refreshes each round as its proximity data is
+imported, and the website recomputes any round it finds missing or stale.
+
+    python scripts/rebuild_proximity_features.py                  # every round
+    python scripts/rebuild_proximity_features.py --missing        # not yet current
+    python scripts/rebuild_proximity_features.py --from 9000 --to 9500 --batch 200
+
+Prints the rounds and player rows written, so the run itself is the evidence.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from bot.config import load_config  # noqa: E402
+from bot.core.database_adapter import create_adapter  # noqa: E402
+from website.backend.services.proximity_features import (  # noqa: E402
+    FEATURE_VERSION,
+    compute_round_features,
+    fetch_round_inputs,
+    store_round_features,
+)
+
+
+async def _round_ids(adapter, first: int | None, last: int | None, missing: bool) -> list[int]:
+    rows = await adapter.fetch_all(
+        """
+        SELECT round_id FROM (
+            SELECT round_id FROM player_track
+            UNION SELECT round_id FROM proximity_spawn_timing
+            UNION SELECT round_id FROM proximity_trade_event
+        ) linked
+        WHERE round_id IS NOT NULL
+          AND ($1::int IS NULL OR round_id >= $1)
+          AND ($2::int IS NULL OR round_id <= $2)
+          AND (NOT $3::bool OR NOT EXISTS (
+              SELECT 1 FROM proximity_round_features f
+              WHERE f.round_id = linked.round_id AND f.feature_version = $4))
+        ORDER BY round_id
+        """,
+        (first, last, missing, FEATURE_VERSION),
+    )
+    return [int(row[0]) for row in (rows or [])]
+
+
+async def _run(first: int | None, last: int | None, batch: int, missing: bool) -> int:
+    config = load_config()
+    adapter = create_adapter(**config.get_database_adapter_kwargs())
+    await adapter.connect()
+    try:
+        round_ids = await _round_ids(adapter, first, last, missing)
+        print(f"{len(round_ids)} rounds with proximity rows "
+              f"(features {FEATURE_VERSION}).")
+        rounds_written = player_rows = failed = 0
+        started = time.perf_counter()
+        for i in range(0, len(round_ids), batch):
+            chunk = round_ids[i:i + batch]
+            computed = [
+                compute_round_features(inputs)
+                for inputs in (await fetch_round_inputs(adapter, chunk)).values()
+            ]
+            written = await store_round_features(adapter, computed)
+            if written:
+                rounds_written += written
+                player_rows += sum(len(players) for _, players in computed)
+            else:
+                failed += len(computed)
+            print(f"  rounds {chunk[0]}..{chunk[-1]}: {written} stored")
+        elapsed = time.perf_counter() - started
+        print(f"Done in {elapsed:.1f}s: {rounds_written} rounds, "
+              f"{player_rows} player rows, {failed} not stored.")
+        return 1 if failed else 0
+    finally:
+        await adapter.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--from", dest="first", type=int, default=None,
+                    help="first round id (inclusive)")
+    ap.add_argument("--to", dest="last", type=int, default=None,
+                    help="last round id (inclusive)")
+    ap.add_argument("--batch", type=int, default=250,
+                    help="rounds per query batch (default 250)")
+    ap.add_argument("--missing", action="store_true",
+                    help="only rounds without rows of the current FEATURE_VERSION")
+    args = ap.parse_args()
+    if args.batch < 1:
+        ap.error("--batch must be at least 1")
+    return asyncio.run(_run(args.first, args.last, args.batch, args.missing))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
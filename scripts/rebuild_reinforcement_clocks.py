@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""rebuild_reinforcement_clocks.py — store every round's reinforcement clock.
+
+Fills round_reinforcement_clocks (migration 083) with the columnar engine in
+website/backend/services/reinforcement_clock_batch.py: three queries and one
+NumPy pass per batch of rounds, instead of one validate_round_clocks per round
+per request. Run it once after applying 083, and again after a change to
+CLOCK_PROTOCOL_VERSION; between those the bot refreshes each round as its
+proximity data is imported.
+
+    python scripts/rebuild_reinforcement_clocks.py                  # every round
+    python scripts/rebuild_reinforcement_clocks.py --from 9000 --to 9500
+    python scripts/rebuild_reinforcement_clocks.py --batch 200
+
+Prints a status tally per team verdict, so the run itself is the evidence.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from bot.config import load_config  # noqa: E402
+from bot.core.database_adapter import create_adapter  # noqa: E402
+from website.backend.services.reinforcement_clock import CLOCK_PROTOCOL_VERSION  # noqa: E402
+from website.backend.services.reinforcement_clock_batch import refresh_round_clocks  # noqa: E402
+
+
+async def _round_ids(adapter, first: int | None, last: int | None) -> list[int]:
+    rows = await adapter.fetch_all(
+        """
+        SELECT DISTINCT round_id FROM proximity_spawn_timing
+        WHERE round_id IS NOT NULL
+          AND ($1::int IS NULL OR round_id >= $1)
+          AND ($2::int IS NULL OR round_id <= $2)
+        ORDER BY round_id
+        """,
+        (first, last),
+    )
+    return [int(row[0]) for row in (rows or [])]
+
+
+async def _run(first: int | None, last: int | None, batch: int) -> int:
+    config = load_config()
+    adapter = create_adapter(**config.get_database_adapter_kwargs())
+    await adapter.connect()
+    try:
+        round_ids = await _round_ids(adapter, first, last)
+        print(f"{len(round_ids)} rounds with spawn-timing rows "
+              f"(protocol {CLOCK_PROTOCOL_VERSION}).")
+        tally: Counter[str] = Counter()
+        started = time.perf_counter()
+        for i in range(0, len(round_ids), batch):
+            chunk = round_ids[i:i + batch]
+            clocks = await refresh_round_clocks(adapter, chunk)
+            tally.update(v.status for teams in clocks.values() for v in teams.values())
+            print(f"  rounds {chunk[0]}..{chunk[-1]}: {len(clocks)} computed")
+        elapsed = time.perf_counter() - started
+        print(f"Done in {elapsed:.1f}s.")
+        for status, count in sorted(tally.items()):
+            print(f"  {status:<36} {count}")
+        return 0
+    finally:
+        await adapter.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--from", dest="first", type=int, default=None,
+                    help="first round id (inclusive)")
+    ap.add_argument("--to", dest="last", type=int, default=None,
+                    help="last round id (inclusive)")
+    ap.add_argument("--batch", type=int, default=500,
+                    help="rounds per query batch (default 500)")
+    args = ap.parse_args()
+    if args.batch < 1:
+        ap.error("--batch must be at least 1")
+    return asyncio.run(_run(args.first, args.last, args.batch))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+# Release config for v1.41.0 — post-session precompute, durable webhook queue.
+# EIGHT new migrations (079-086): carries the 045..086 range so straight upgrades
+# from older tags still apply everything; the ledger skips applied ones.
+#
+# Ships:
+#   post-session precompute pipeline: named stages with explicit dependencies,
+#        bounded concurrency and a post_session_jobs ledger the bot resumes
+#        on restart (POST_SESSION_PIPELINE_CONCURRENCY, default 3)
+#   durable STATS_READY queue: accepted rounds persisted to webhook_round_queue
+#        and replayed after a restart; sessions processed in parallel, rounds
+#        of one session in order (WEBHOOK_QUEUE_WORKERS, default 2)
+#   stored stopwatch outcomes: each finished map pair is scored once into
+#        stopwatch_map_outcomes; session totals fold over the stored rows
+#   shared artifact store: objective pressure, session moments and the aim
+#        summary computed once per input change into derived_artifacts
+#        (ARTIFACT_STORE_MAX_ENTRIES, default 512, for the in-process tier)
+#   startup file sync: local_stats/ reconciled against processed_files in one
+#        query; only files whose size or mtime changed are rehashed
+#   stored proximity features: first blood, trades, man-advantage and clutch
+#        computed once per round and player after each import; the
+#        competitive and trade endpoints aggregate the stored rows
+#   greatshot pool dead-letter: each worker-pool claim is counted and a job
+#        whose worker keeps dying is failed after MAX_CLAIM_ATTEMPTS claims
+# shellcheck shell=bash
+# shellcheck disable=SC2034
+MIGRATIONS=(
+  "045_drop_orphan_monitoring_tables.sql"
+  "046_fix_proximity_round_id_exact_match.sql"
+  "047_orphan_recovery_null_round_id.sql"
+  "048_orphan_recovery_drift_tolerance.sql"
+  "049_add_round_canonical_id.sql"
+  "050_round_canonical_id_unique.sql"
+  "051_add_audit_indexes.sql"
+  "052_composite_indexes_proximity.sql"
+  "053_add_weapon_stats_mv.sql"
+  "054_add_storytelling_kis_shadow_audit.sql"
+  "055_add_proximity_shot_fired.sql"
+  "056_add_player_links_locale_twitch.sql"
+  "057_add_rounds_is_valid.sql"
+  "058_add_proximity_v7_tables.sql"
+  "059_add_rounds_start_unix_index.sql"
+  "060_add_kis_formula_version.sql"
+  "061_prediction_shadow_v2.sql"
+  "062_proximity_processed_files_capabilities.sql"
+  "063_kis_gaming_session_id.sql"
+  "064_backfill_kis_gaming_session_id.sql"
+  "065_dedup_revive_weapon_accuracy.sql"
+  "066_drop_orphan_monitoring_tables_tolerant.sql"
+  "067_repair_lua_round_links.sql"
+  "068_add_relinker_unlinked_indexes.sql"
+  "069_add_shot_fired_relinker_index.sql"
+  "070_uploads_expires_at.sql"
+  # 071 ships with this tag (PR #645).
+  # (copied from this one) ships it, and so the no-orphan-migration contract
+  # test covers it. A checkout of the v1.30.1 TAG does not see this line.
+  "071_add_round_id_coverage_indexes.sql"
+  "072_repair_miscancelled_complete_rounds.sql"
+  "073_player_identity_links.sql"
+  "074_seed_ownator_sick_leave.sql"
+  "075_canonical_guid_function.sql"
+  "076_uploads_poster.sql"
+  # 077 ships with this tag: player_aim_summary, the cached true-aim summary
+  # (PR #746). Derived data only — safe to TRUNCATE, every row rebuilds itself
+  # on the next profile read.
+  "077_player_aim_summary.sql"
+  # 078 ships with this tag: the player_match_stats VIEW (PR for the R0
+  # retirement). Derived only — it holds no rows of its own, so applying it on
+  # a host that already has it is a no-op CREATE OR REPLACE.
+  "078_player_match_stats_view.sql"
+  # 079 ships with this tag: post_session_jobs, the post-session precompute
+  # pipeline's ledger. Bookkeeping only — safe to TRUNCATE; the bot also
+  # creates it on first use when it has the privilege.
+  "079_post_session_jobs.sql"
+  # 080 ships with this tag: webhook_round_queue, the STATS_READY queue's
+  # durable log. Operational state — rows older than a week are pruned by the
+  # bot; pending rows are replayed on start, so do not TRUNCATE while the bot
+  # is mid-session.
+  "080_webhook_round_queue.sql"
+  # 081 ships with this tag: stopwatch_map_outcomes, one stored outcome per
+  # map pair. Derived only — safe to TRUNCATE; rows rebuild on the next score,
+  # or all at once with rescore_session_results.py --rebuild-map-outcomes.
+  "081_stopwatch_map_outcomes.sql"
+  # 082 ships with this tag: derived_artifacts, the artifact store's database
+  # tier. Derived only — safe to TRUNCATE; rows rebuild on the next read.
+  # Supersedes 077's player_aim_summary, which is left in place unused.
+  "082_derived_artifacts.sql"
+  # 083 ships with this tag: round_reinforcement_clocks, stored clock verdicts
+  # per round. Derived only — safe to TRUNCATE; rows rebuild on the next read,
+  # or all at once with rebuild_reinforcement_clocks.py.
+  "083_round_reinforcement_clocks.sql"
+  # 084 ships with this tag: processed_files.file_size / file_mtime, the stat
+  # behind each stored hash. Additive only; NULL rows are rehashed once by the
+  # startup sync and then skipped while the file is unchanged.
+  "084_processed_files_stat.sql"
+  # 085 ships with this tag: proximity_round_features and
+  # proximity_player_round_features, the per-round feature vectors. Derived
+  # only — safe to TRUNCATE; rows rebuild on the next read, or all at once
+  # with rebuild_proximity_features.py.
+  "085_proximity_round_features.sql"
+  # 086 ships with this tag: greatshot_demos / greatshot_renders.claim_attempts,
+  # the worker pool's claim counter. Additive only; existing rows read as 0.
+  "086_greatshot_claim_attempts.sql"
+)
+FLAGS=(
+  "TRUSTED_HOSTS=www.slomix.fyi,slomix.fyi,localhost,127.0.0.1"
+)
+RELEASE_NOTES="Every derived view of a finished session is warm minutes after the last round: the bot runs a dependency-ordered post-session pipeline (KIS, s.effort, story and proximity panels, graph data, the session page) and resumes it after a restart. STATS_READY rounds accepted before a bot restart are no longer lost: the webhook queue persists them and replays them on start, and rounds of different maps are processed in parallel."
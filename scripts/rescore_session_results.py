@@ -13,6 +13,11 @@ ON CONFLICT list makes it overwrite everything the scorer computes.
 
 Prints the session_results row before and after, so the run itself is the
 evidence. Uses the bot's own scoring service — no scoring logic lives here.
+
+After a change to the map-scoring rules (SCORING_VERSION bumped), rescore the
+stored per-map outcomes of the whole history in one pass first:
+
+    python scripts/rescore_session_results.py --rebuild-map-outcomes
 """
 
 from __future__ import annotations
@@ -30,6 +35,7 @@ if str(_REPO_ROOT) not in sys.path:
 from bot.config import load_config  # noqa: E402
 from bot.core.database_adapter import create_adapter  # noqa: E402
 from bot.services.stopwatch_scoring_service import (  # noqa: E402
+    SCORING_VERSION,
     StopwatchScoringService,
 )
 
@@ -61,6 +67,19 @@ async def _show_row(adapter, session_date: str, gsid: int | None) -> None:
     print(f"  team_2_guids: {g2}")
 
 
+async def _rebuild_map_outcomes() -> int:
+    config = load_config()
+    adapter = create_adapter(**config.get_database_adapter_kwargs())
+    await adapter.connect()
+    try:
+        stored = await StopwatchScoringService(adapter).rebuild_map_outcomes()
+        print(f"Stored {stored} map outcomes (scoring v{SCORING_VERSION}); "
+              "older versions dropped.")
+        return 0
+    finally:
+        await adapter.close()
+
+
 async def _run(session_date: str, gsid: int | None) -> int:
     config = load_config()
     adapter = create_adapter(**config.get_database_adapter_kwargs())
@@ -94,10 +113,17 @@ async def _run(session_date: str, gsid: int | None) -> int:
 
 def main() -> int:
     ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
-    ap.add_argument("session_date", help="YYYY-MM-DD of the session to re-score")
+    ap.add_argument("session_date", nargs="?",
+                    help="YYYY-MM-DD of the session to re-score")
     ap.add_argument("--gsid", type=int, default=None,
                     help="expected gaming_session_id (safety check + row display)")
+    ap.add_argument("--rebuild-map-outcomes", action="store_true",
+                    help="rescore every stored map outcome (after a SCORING_VERSION bump)")
     args = ap.parse_args()
+    if args.rebuild_map_outcomes:
+        return asyncio.run(_rebuild_map_outcomes())
+    if not args.session_date:
+        ap.error("session_date is required unless --rebuild-map-outcomes is given")
     return asyncio.run(_run(args.session_date, args.gsid))
 
 
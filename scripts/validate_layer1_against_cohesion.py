@@ -45,10 +45,8 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from website.backend.dependencies import get_db_pool, init_db_pool  # noqa: E402
-from website.backend.services.round_web_service import (  # noqa: E402
-    build_snapshot,
-    load_round_tracks,
-)
+from website.backend.services.round_web_cube import build_round_cube  # noqa: E402
+from website.backend.services.round_web_service import load_round_tracks  # noqa: E402
 
 STRAGGLER_DISTANCE = 800.0  # config.teamplay.straggler_distance
 MIN_TEAM_SIZE = 2           # config.teamplay.min_team_size
@@ -129,8 +127,11 @@ async def main() -> int:
         chosen = random.sample(list(samples or []),
                                min(args.samples_per_round, len(samples or [])))
 
+        # One cube per round over the sampled moments, sliced per sample, rather
+        # than a full build_snapshot per moment; the answers are the same.
+        cube = build_round_cube(tracks, [int(c[0]) for c in chosen])
         for t_ms, team, their_alive, cx, cy, disp, spr, strag in chosen:
-            snap = build_snapshot(tracks, int(t_ms))
+            snap = cube.snapshot(int(t_ms))
             ours = aggregates([
                 p for p in snap.players.values()
                 if p.alive and (p.team or "") == team
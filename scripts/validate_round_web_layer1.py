@@ -24,7 +24,10 @@ see and a relational layer cannot survive, so none of them is taken on trust:
    and it fails the run rather than printing a note (CodeRabbit, PR #792).
 
 Also measures cost per snapshot, against the 27 ms / 51 ms baseline the spec
-recorded for `get_player_positions`.
+recorded for `get_player_positions` — both for `build_snapshot` one moment at a
+time and for the whole-round cube (`round_web_cube`) built once over the
+sampled ticks and sliced. Every cube slice is compared to `build_snapshot`; a
+disagreement fails the run, because the cube is only allowed to be faster.
 """
 
 from __future__ import annotations
@@ -44,6 +47,7 @@ if str(ROOT) not in sys.path:
 
 from website.backend.dependencies import get_db_pool, init_db_pool  # noqa: E402
 from website.backend.services import replay_service  # noqa: E402
+from website.backend.services.round_web_cube import build_round_cube  # noqa: E402
 from website.backend.services.round_web_service import (  # noqa: E402
     VELOCITY_SPEED_TOLERANCE,
     build_snapshot,
@@ -105,6 +109,8 @@ async def main() -> int:
     gaps_total = 0
     gap_reasons: Counter[str] = Counter()
     durations: list[float] = []
+    cube_durations: list[float] = []
+    cube_mismatches = 0
     player_counts: list[int] = []
 
     for round_id in round_ids:
@@ -121,9 +127,13 @@ async def main() -> int:
         if t_hi <= t_lo:
             continue
 
-        for _ in range(args.ticks):
-            # Sampling ticks to probe, not generating anything secret.
-            t_ms = random.randint(t_lo, t_hi)  # noqa: S311
+        # Sampling ticks to probe, not generating anything secret.
+        ticks = [random.randint(t_lo, t_hi) for _ in range(args.ticks)]  # noqa: S311
+        started = time.perf_counter()
+        cube = build_round_cube(tracks, ticks)
+        cube_build_ms = (time.perf_counter() - started) * 1000.0
+
+        for t_ms in ticks:
 
             # 1. old vs new life choice
             for lst in tracks.values():
@@ -138,6 +148,17 @@ async def main() -> int:
             started = time.perf_counter()
             snap = build_snapshot(tracks, t_ms, engagements=engagements)
             durations.append((time.perf_counter() - started) * 1000.0)
+            started = time.perf_counter()
+            sliced = cube.snapshot(t_ms, engagements=engagements)
+            cube_durations.append((time.perf_counter() - started) * 1000.0
+                                  + cube_build_ms / len(ticks))
+            if (sliced.gaps != snap.gaps or list(sliced.players) != list(snap.players)
+                    or [p.stale_ms for p in sliced.players.values()]
+                    != [p.stale_ms for p in snap.players.values()]
+                    or [p.velocity_reason for p in sliced.players.values()]
+                    != [p.velocity_reason for p in snap.players.values()]
+                    or len(sliced.edges) != len(snap.edges)):
+                cube_mismatches += 1
             player_counts.append(len(snap.players))
             conflicts_total += snap.overlap_conflicts
             gaps_total += len(snap.gaps)
@@ -202,6 +223,11 @@ async def main() -> int:
               f"p95 {durations[int(len(durations) * 0.95)]:.2f} ms   "
               f"max {durations[-1]:.2f} ms")
         print("    (izhodišče get_player_positions po specu: 27 ms / 51 ms)")
+        cube_durations.sort()
+        print(f"    kocka (gradnja razdeljena na tike + rez): "
+              f"mediana {cube_durations[len(cube_durations) // 2]:.2f} ms   "
+              f"p95 {cube_durations[int(len(cube_durations) * 0.95)]:.2f} ms")
+        print(f"    ⭐ kocka proti build_snapshot: {cube_mismatches} neujemanj")
 
     # The floor helper on its own, against the module it replaces.
     print("\n  === floor proti nearest (sintetično) ===")
@@ -215,7 +241,8 @@ async def main() -> int:
         print(f"    t={target:5d}  floor={f_sample['time']:5d} (stale {stale:4d})"
               f"   nearest={n_sample['time']:5d} {flag}")
 
-    return 0 if (future_violations == 0 and velocity_mismatches == 0) else 1
+    ok = future_violations == 0 and velocity_mismatches == 0 and cube_mismatches == 0
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+"""Run the set-based correlation sweep against PostgreSQL.
+
+The unit tests pin the statements' shape; this executes them: the candidate
+ranking of _SWEEP_CANDIDATES_SQL with its real parameters, the bool_or flag
+merge, the Lua teams FK guard, the deletes and the completeness recompute.
+The session runs in a different zone than the bot host, so strategy 3 only
+matches if the match_id wall clock is pinned to the host's zone.
+"""
+
+# ruff: noqa: SLF001
+
+import os
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from bot.core.database_adapter import translate_placeholders  # noqa: E402
+from bot.services import round_correlation_service as rcs  # noqa: E402
+
+TEST_DB = {
+    "host": os.getenv("POSTGRES_TEST_HOST", "localhost"),
+    "port": int(os.getenv("POSTGRES_TEST_PORT", "5432")),
+    "database": os.getenv("POSTGRES_TEST_DATABASE", "etlegacy_test"),
+    "user": os.getenv("POSTGRES_TEST_USER", "etlegacy_user"),
+    "password": os.getenv("POSTGRES_TEST_PASSWORD", "etlegacy_test_password"),
+}
+
+HOST_ZONE = "Europe/Ljubljana"
+
+
+def _host_unix(wall: str) -> int:
+    """What the per-event path's naive ``.timestamp()`` gives on the host."""
+    naive = datetime.strptime(wall, "%Y-%m-%d-%H%M%S")  # noqa: DTZ007 - match_id wall clock
+    return int(naive.replace(tzinfo=ZoneInfo(HOST_ZONE)).timestamp())
+
+
+class _ConnDb:
+    """The adapter surface the sweep uses, over one asyncpg connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def transaction(self):
+        async with self.conn.transaction():
+            yield self
+
+    async def execute(self, query, params=None):
+        return await self.conn.execute(translate_placeholders(query), *(params or ()))
+
+    async def fetch_all(self, query, params=None):
+        return await self.conn.fetch(translate_placeholders(query), *(params or ()))
+
+
+async def _connect_or_skip():
+    try:
+        return await asyncpg.connect(timeout=5, **TEST_DB)
+    except (TimeoutError, OSError, asyncpg.PostgresError) as exc:
+        pytest.skip(f"test PostgreSQL unavailable: {exc}")
+
+
+@pytest.fixture
+async def pg(monkeypatch):
+    monkeypatch.setenv("TZ", HOST_ZONE)
+    conn = await _connect_or_skip()
+    try:
+        # Temporary tables shadow the production ones for this connection.
+        await conn.execute(
+            """
+            SET TimeZone = 'America/New_York';
+            CREATE TEMP TABLE rounds (
+                id INTEGER PRIMARY KEY,
+                map_name TEXT,
+                round_number INTEGER,
+                round_start_unix BIGINT,
+                round_end_unix BIGINT
+            );
+            CREATE TEMP TABLE lua_round_teams (id INTEGER PRIMARY KEY);
+            CREATE TEMP TABLE round_correlations (
+                correlation_id VARCHAR(64) PRIMARY KEY,
+                match_id VARCHAR(128) NOT NULL,
+                map_name VARCHAR(64) NOT NULL,
+                r1_round_id INTEGER,
+                r2_round_id INTEGER,
+                r1_lua_teams_id INTEGER,
+                r2_lua_teams_id INTEGER,
+                has_r1_stats BOOLEAN DEFAULT FALSE,
+                has_r2_stats BOOLEAN DEFAULT FALSE,
+                has_r1_lua_teams BOOLEAN DEFAULT FALSE,
+                has_r2_lua_teams BOOLEAN DEFAULT FALSE,
+                has_r1_gametime BOOLEAN DEFAULT FALSE,
+                has_r2_gametime BOOLEAN DEFAULT FALSE,
+                has_r1_endstats BOOLEAN DEFAULT FALSE,
+                has_r2_endstats BOOLEAN DEFAULT FALSE,
+                has_r1_proximity BOOLEAN DEFAULT FALSE,
+                has_r2_proximity BOOLEAN DEFAULT FALSE,
+                status VARCHAR(20) DEFAULT 'pending',
+                completeness_pct INTEGER DEFAULT 0,
+                completed_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT LOCALTIMESTAMP - INTERVAL '2 hours'
+            );
+            """
+        )
+        yield conn
+    finally:
+        await conn.close()
+
+
+async def _seed(pg):
+    await pg.execute("INSERT INTO lua_round_teams (id) VALUES (1)")
+    await pg.executemany(
+        "INSERT INTO rounds VALUES ($1, $2, $3, $4, $5)",
+        [
+            (10, "supply", 1, _host_unix("2026-06-08-225500"), _host_unix("2026-06-08-230738")),
+            (20, "radar", 1, _host_unix("2026-06-08-235000"), _host_unix("2026-06-09-000000")),
+        ],
+    )
+    await pg.executemany(
+        "INSERT INTO round_correlations (correlation_id, match_id, map_name, r1_round_id, "
+        "r1_lua_teams_id, r2_lua_teams_id, has_r1_stats, has_r1_lua_teams, has_r1_proximity, "
+        "has_r2_proximity, created_at) "
+        "VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, "
+        "LOCALTIMESTAMP - make_interval(mins => $11))",
+        [
+            # stats-backed targets
+            ("2026-06-08-230738:supply", "2026-06-08-230738", "supply", 10,
+             None, None, True, False, False, False, 120),
+            # radar's stats row carries a match_id hours off: only the
+            # round start/end (strategy 3) can find it
+            ("2026-06-08-200000:radar", "2026-06-08-200000", "radar", 20,
+             None, None, True, False, False, False, 120),
+            # R1 Lua orphan 3 s after the supply stats: strategy 1
+            ("2026-06-08-230741-lua:supply", "2026-06-08-230741", "supply", None,
+             1, None, False, True, False, False, 120),
+            # R2 proximity orphan on supply; its Lua teams id no longer exists
+            ("2026-06-08-231500-prox:supply", "2026-06-08-231500", "supply", None,
+             None, 99, False, False, False, True, 120),
+            # R1 proximity flush 2 s before radar's round end: strategy 3
+            ("2026-06-08-235958-prox:radar", "2026-06-08-235958", "radar", None,
+             None, None, False, False, True, False, 120),
+            # nothing to merge into
+            ("2026-06-08-220000-lua:goldrush", "2026-06-08-220000", "goldrush", None,
+             None, None, False, True, False, False, 120),
+            # too young to sweep
+            ("2026-06-08-230745-lua:supply", "2026-06-08-230745", "supply", None,
+             None, None, False, True, False, False, 5),
+        ],
+    )
+
+
+def _svc(pg):
+    svc = rcs.RoundCorrelationService(
+        _ConnDb(pg), dry_run=False, require_schema_check=False, write_error_threshold=5,
+    )
+    svc._initialized = True
+    svc.preflight_ok = True
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_candidates_rank_one_target_per_orphan(pg):
+    await _seed(pg)
+
+    rows = await _ConnDb(pg).fetch_all(
+        rcs._SWEEP_CANDIDATES_SQL, (rcs._host_timezone(), rcs.SWEEP_BATCH_LIMIT, 1800),
+    )
+
+    assert sorted(tuple(r) for r in rows) == [
+        ("2026-06-08-230741-lua:supply", "2026-06-08-230738:supply", 1),
+        ("2026-06-08-231500-prox:supply", "2026-06-08-230738:supply", 1),
+        ("2026-06-08-235958-prox:radar", "2026-06-08-200000:radar", 3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sweep_merges_flags_guards_lua_ids_and_recomputes(pg):
+    await _seed(pg)
+
+    await _svc(pg)._sweep_once()
+
+    rows = {
+        r["correlation_id"]: r
+        for r in await pg.fetch("SELECT * FROM round_correlations")
+    }
+    assert sorted(rows) == [
+        "2026-06-08-200000:radar",
+        "2026-06-08-220000-lua:goldrush",
+        "2026-06-08-230738:supply",
+        "2026-06-08-230745-lua:supply",
+    ]
+    supply = rows["2026-06-08-230738:supply"]
+    # Both orphans' flags OR-ed in; the live Lua id copied, the dangling one not.
+    assert (supply["has_r1_stats"], supply["has_r1_lua_teams"], supply["has_r2_proximity"]) == (
+        True, True, True,
+    )
+    assert (supply["r1_lua_teams_id"], supply["r2_lua_teams_id"]) == (1, None)
+    assert (supply["completeness_pct"], supply["status"]) == (25 + 10 + 5, "partial")
+    radar = rows["2026-06-08-200000:radar"]
+    assert radar["has_r1_proximity"] is True
+    assert radar["completeness_pct"] == 25 + 5
+    assert rows["2026-06-08-220000-lua:goldrush"]["status"] == "pending"
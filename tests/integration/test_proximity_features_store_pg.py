@@ -0,0 +1,126 @@
+"""Store proximity features from two writers at once, against PostgreSQL.
+
+The bot refreshes a round after its proximity import while a website request
+that missed the same round recomputes it. The second writer's transaction
+waits on the first one's rows and must then update them, not fail on the
+primary key and drop the request back to the raw tables.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from website.backend.services import proximity_features as features  # noqa: E402
+
+TEST_DB = {
+    "host": os.getenv("POSTGRES_TEST_HOST", "localhost"),
+    "port": int(os.getenv("POSTGRES_TEST_PORT", "5432")),
+    "database": os.getenv("POSTGRES_TEST_DATABASE", "etlegacy_test"),
+    "user": os.getenv("POSTGRES_TEST_USER", "etlegacy_user"),
+    "password": os.getenv("POSTGRES_TEST_PASSWORD", "etlegacy_test_password"),
+}
+
+MIGRATION = Path(__file__).resolve().parents[2] / "migrations" / "085_proximity_round_features.sql"
+
+
+class _ConnDb:
+    """The adapter surface store_round_features uses, over one connection.
+
+    ``pause_before`` holds the writer just before that statement, inside its
+    transaction, until ``resume`` is set.
+    """
+
+    def __init__(self, conn, pause_before: str | None = None):
+        self.conn = conn
+        self.pause_before = pause_before
+        self.paused = asyncio.Event()
+        self.resume = asyncio.Event()
+
+    @asynccontextmanager
+    async def transaction(self):
+        async with self.conn.transaction():
+            yield self
+
+    async def execute(self, query, params=None):
+        return await self.conn.execute(query, *(params or ()))
+
+    async def executemany(self, query, rows):
+        if self.pause_before and self.pause_before in query:
+            self.paused.set()
+            await self.resume.wait()
+        return await self.conn.executemany(query, rows)
+
+
+async def _connect_or_skip():
+    try:
+        return await asyncpg.connect(timeout=5, **TEST_DB)
+    except (TimeoutError, OSError, asyncpg.PostgresError) as exc:
+        pytest.skip(f"test PostgreSQL unavailable: {exc}")
+
+
+@pytest.fixture
+async def writers():
+    first = await _connect_or_skip()
+    second = await asyncpg.connect(timeout=5, **TEST_DB)
+    namespace = f"proxfeat_{uuid.uuid4().hex[:8]}"
+    await first.execute(f"CREATE SCHEMA {namespace}")
+    for conn in (first, second):
+        await conn.execute(f"SET search_path TO {namespace}")
+    await first.execute(MIGRATION.read_text(encoding="utf-8"))
+    yield first, second
+    await first.execute(f"DROP SCHEMA {namespace} CASCADE")
+    await first.close()
+    await second.close()
+
+
+def _computed(name: str):
+    inputs = features.RoundInputs(
+        round_id=7,
+        round_start_unix=1_780_000_000,
+        kills=[(1_000, "AXIS", "A" * 32, name, "ALLIES", "B" * 32, "victim")],
+        source_rows=1,
+    )
+    return [features.compute_round_features(inputs)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_of_one_round_both_store(writers):
+    first, second = writers
+    bot = _ConnDb(first, pause_before="INTO proximity_round_features")
+    web = _ConnDb(second)
+
+    bot_store = asyncio.create_task(features.store_round_features(bot, _computed("bot")))
+    await bot.paused.wait()  # the bot holds its player rows, uncommitted
+    web_store = asyncio.create_task(features.store_round_features(web, _computed("web")))
+    await asyncio.sleep(0.3)  # the web writer is now blocked on those rows
+    assert not web_store.done()
+    bot.resume.set()
+
+    assert await asyncio.gather(bot_store, web_store) == [1, 1]
+    rows = await first.fetch(
+        "SELECT player_guid, player_name FROM proximity_player_round_features"
+        " WHERE round_id = 7 ORDER BY player_guid"
+    )
+    assert [tuple(r) for r in rows] == [("A" * 32, "web"), ("B" * 32, "victim")]
+    assert await first.fetchval("SELECT COUNT(*) FROM proximity_round_features") == 1
+
+
+@pytest.mark.asyncio
+async def test_a_player_gone_from_the_round_is_dropped(writers):
+    first, _ = writers
+    db = _ConnDb(first)
+    assert await features.store_round_features(db, _computed("bot")) == 1
+
+    inputs = features.RoundInputs(round_id=7, round_start_unix=1_780_000_000, source_rows=0)
+    assert await features.store_round_features(db, [features.compute_round_features(inputs)]) == 1
+
+    assert await first.fetchval("SELECT COUNT(*) FROM proximity_player_round_features") == 0
@@ -59,6 +59,34 @@ class TestParserPerformance:
         assert elapsed < 10.0, \
             f"Batch parse of {len(files)} files took {elapsed:.3f}s (limit: 10.0s)"
 
+    @pytest.mark.slow
+    @pytest.mark.timeout(600)
+    def test_corpus_throughput_with_r2_differential(self, parser):
+        """Every file in local_stats, R2s through the differential: >= 2000 lines/s.
+
+        The figure that matters for a re-import or backfill. Prints the rate
+        so a run doubles as the measurement.
+        """
+        if not LOCAL_STATS_DIR.exists():
+            pytest.skip("local_stats directory not found")
+        files = sorted(LOCAL_STATS_DIR.glob("*-round-[12].txt"))
+        if len(files) < 10:
+            pytest.skip(f"Not enough stats files for a corpus benchmark ({len(files)} found)")
+
+        lines = 0
+        start = time.monotonic()
+        for filepath in files:
+            if parser.is_round_2_file(str(filepath)):
+                result = parser.parse_round_2_with_differential(str(filepath))
+            else:
+                result = parser.parse_regular_stats_file(str(filepath))
+            lines += result.get("total_players", 0) + 1
+        elapsed = time.monotonic() - start
+
+        rate = lines / elapsed if elapsed > 0 else float("inf")
+        print(f"\n{len(files)} files, {lines} lines in {elapsed:.2f}s: {rate:,.0f} lines/s")
+        assert rate >= 2000, f"corpus parse ran at {rate:,.0f} lines/s (floor: 2000)"
+
     def test_parser_instantiation_is_fast(self):
         """Parser instantiation should be near-instant (< 50ms)."""
         start = time.monotonic()
@@ -15,15 +15,19 @@ import pytest
 from website.backend.routers import players_profile_router as P
 from website.backend.routers.players_profile_router import (
     _AIM_FORMULA_VERSION,
+    AIM_ARTIFACT_KIND,
     _fetch_aim_summary,
 )
+from website.backend.services.artifact_store import artifact_store, canonical
 
 
 class FakeDB:
-    """Minimal stand-in: canned rows per query fragment, plus a call log."""
+    """Minimal stand-in for derived_artifacts: one stored row, matched the way
+    the WHERE clause matches it, plus a call log."""
 
     def __init__(self, *, cache_row=None, fingerprint=(10, 500, 1234), fail_read=False,
                  fail_write=False):
+        # cache_row: (payload, shot_count, last_event_time, round_id_sum)
         self.cache_row = cache_row
         self.fingerprint = fingerprint
         self.fail_read = fail_read
@@ -33,21 +37,42 @@ class FakeDB:
     async def fetch_one(self, query, params=()):
         if "FROM proximity_shot_fired" in query:
             return self.fingerprint
-        if "FROM player_aim_summary" in query:
+        if "FROM derived_artifacts" in query:
             if self.fail_read:
-                raise RuntimeError("relation \"player_aim_summary\" does not exist")
-            return self.cache_row
+                raise RuntimeError("relation \"derived_artifacts\" does not exist")
+            if self.cache_row is None:
+                return None
+            payload, *stored = self.cache_row
+            kind, scope, version, fingerprint = params[:4]
+            if (kind, version, fingerprint) != (
+                AIM_ARTIFACT_KIND, _AIM_FORMULA_VERSION, canonical(list(stored)),
+            ):
+                return None
+            return (payload,)
         raise AssertionError(f"unexpected query: {query[:60]}")
 
     async def execute(self, query, params=()):
         if self.fail_write:
-            raise RuntimeError("permission denied for table player_aim_summary")
+            raise RuntimeError("permission denied for table derived_artifacts")
         self.writes.append(params)
 
 
 SUMMARY = {"available": True, "lifetime": {"n": 10}, "flick": {"available": False}}
 
 
+def _stored(value):
+    """A derived_artifacts payload as the store writes it."""
+    return json.dumps({"value": value})
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memory_tier():
+    """Every test reads through to the fake table, not the in-process LRU."""
+    artifact_store.invalidate(AIM_ARTIFACT_KIND)
+    yield
+    artifact_store.invalidate(AIM_ARTIFACT_KIND)
+
+
 @pytest.fixture
 def no_compute(monkeypatch):
     """Fail loudly if the expensive path runs when it should not."""
@@ -68,22 +93,22 @@ def counted_compute(monkeypatch):
 
 
 async def test_a_current_row_is_served_without_computing(no_compute):
-    db = FakeDB(cache_row=(json.dumps(SUMMARY), 10, 500, 1234))
+    db = FakeDB(cache_row=(_stored(SUMMARY), 10, 500, 1234))
 
     assert await _fetch_aim_summary(db, "D8423F90") == SUMMARY
 
 
 async def test_payload_already_decoded_is_accepted(no_compute):
     """asyncpg may hand JSONB back as a dict or as text depending on codecs."""
-    db = FakeDB(cache_row=(SUMMARY, 10, 500, 1234))
+    db = FakeDB(cache_row=({"value": SUMMARY}, 10, 500, 1234))
 
     assert await _fetch_aim_summary(db, "D8423F90") == SUMMARY
 
 
 @pytest.mark.parametrize("stored,label", [
-    ((json.dumps(SUMMARY), 11, 500, 1234), "a shot was added or removed"),
-    ((json.dumps(SUMMARY), 10, 501, 1234), "a newer shot exists"),
-    ((json.dumps(SUMMARY), 10, 500, 9999), "shots were re-linked to other rounds"),
+    ((_stored(SUMMARY), 11, 500, 1234), "a shot was added or removed"),
+    ((_stored(SUMMARY), 10, 501, 1234), "a newer shot exists"),
+    ((_stored(SUMMARY), 10, 500, 9999), "shots were re-linked to other rounds"),
 ])
 async def test_every_fingerprint_column_invalidates(counted_compute, stored, label):
     """round_id_sum is not decoration: the flick window is partitioned by round,
@@ -103,15 +128,25 @@ async def test_a_missing_row_computes_and_stores(counted_compute):
     await _fetch_aim_summary(db, "D8423F90")
 
     assert counted_compute["n"] == 1
-    written = db.writes[0]
-    assert written[0] == "D8423F90"
-    assert written[1] == _AIM_FORMULA_VERSION
-    assert written[2:5] == (10, 500, 1234)
-    assert json.loads(written[5]) == SUMMARY
+    kind, scope, version, fingerprint, payload, _compute_ms = db.writes[0]
+    assert (kind, scope) == (AIM_ARTIFACT_KIND, "D8423F90")
+    assert version == _AIM_FORMULA_VERSION
+    assert json.loads(fingerprint) == [10, 500, 1234]
+    assert json.loads(payload) == {"value": SUMMARY}
+
+
+async def test_a_second_request_is_served_from_memory(counted_compute):
+    db = FakeDB(cache_row=None)
+
+    await _fetch_aim_summary(db, "D8423F90")
+    db.fail_read = True  # the database tier is not consulted again
+
+    assert await _fetch_aim_summary(db, "D8423F90") == SUMMARY
+    assert counted_compute["n"] == 1
 
 
 async def test_an_unreadable_cache_never_breaks_the_profile(counted_compute):
-    """The table arrives with migration 077; the endpoint predates it, and a
+    """The table arrives with migration 082; the endpoint predates it, and a
     profile that 500s over a derived table would be a worse product than a slow
     one."""
     db = FakeDB(fail_read=True)
@@ -134,7 +169,7 @@ async def test_a_corrupt_payload_is_recomputed_not_served(counted_compute):
 
 
 async def test_a_payload_that_is_not_an_object_is_rejected(counted_compute):
-    db = FakeDB(cache_row=(json.dumps([1, 2, 3]), 10, 500, 1234))
+    db = FakeDB(cache_row=(_stored([1, 2, 3]), 10, 500, 1234))
 
     assert await _fetch_aim_summary(db, "D8423F90") == SUMMARY
     assert counted_compute["n"] == 1
@@ -147,16 +182,16 @@ async def test_the_formula_version_is_part_of_the_lookup(no_compute):
 
     class VersionDB(FakeDB):
         async def fetch_one(self, query, params=()):
-            if "FROM player_aim_summary" in query:
+            if "FROM derived_artifacts" in query:
                 captured["query"] = query
                 captured["params"] = params
             return await super().fetch_one(query, params)
 
-    db = VersionDB(cache_row=(json.dumps(SUMMARY), 10, 500, 1234))
+    db = VersionDB(cache_row=(_stored(SUMMARY), 10, 500, 1234))
     await _fetch_aim_summary(db, "D8423F90")
 
-    assert "formula_version = $2" in captured["query"]
-    assert captured["params"][1] == _AIM_FORMULA_VERSION
+    assert "formula_version = $3" in captured["query"]
+    assert captured["params"][2] == _AIM_FORMULA_VERSION
 
 
 async def test_a_player_with_no_shots_has_a_zero_fingerprint(counted_compute):
@@ -164,4 +199,4 @@ async def test_a_player_with_no_shots_has_a_zero_fingerprint(counted_compute):
 
     await _fetch_aim_summary(db, "NOSHOTS0")
 
-    assert db.writes[0][2:5] == (0, None, None)
+    assert json.loads(db.writes[0][3]) == [0, None, None]
@@ -0,0 +1,265 @@
+"""ArtifactStore: one get_or_compute for every fingerprinted analytic.
+
+An entry is served only for the fingerprint and formula version it was
+computed from; concurrent misses share one compute; the database tier is an
+optimisation whose every failure is a miss, never an error.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from website.backend.services import artifact_store as store_module
+from website.backend.services.artifact_store import ArtifactStore, canonical
+
+
+class _TableDB:
+    """derived_artifacts as a dict keyed (kind, scope), matched like the WHERE."""
+
+    def __init__(self, *, fail=False):
+        self.rows: dict[tuple[str, str], tuple[int, str, str]] = {}
+        self.fail = fail
+        self.reads = 0
+
+    async def fetch_one(self, query, params=()):
+        assert "FROM derived_artifacts" in query
+        self.reads += 1
+        if self.fail:
+            raise RuntimeError('relation "derived_artifacts" does not exist')
+        kind, scope, version, fingerprint = params[:4]
+        row = self.rows.get((kind, scope))
+        if row is None or row[:2] != (version, fingerprint):
+            return None
+        return (row[2],)
+
+    async def execute(self, query, params=()):
+        if self.fail:
+            raise RuntimeError("permission denied for table derived_artifacts")
+        kind, scope, version, fingerprint, payload, _compute_ms = params
+        self.rows[(kind, scope)] = (version, fingerprint, payload)
+
+
+def _counted(value):
+    calls = {"n": 0}
+
+    async def compute():
+        calls["n"] += 1
+        return value
+    return compute, calls
+
+
+def test_canonical_is_stable_across_container_types():
+    assert canonical("2026-10-01") == "2026-10-01"
+    assert canonical((1, "supply")) == canonical([1, "supply"])
+    assert canonical({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+
+
+async def test_memory_hit_skips_compute_and_database():
+    store, db = ArtifactStore(), _TableDB()
+    compute, calls = _counted({"x": 1})
+
+    assert await store.get_or_compute("k", "s", 1, compute, db=db) == {"x": 1}
+    assert await store.get_or_compute("k", "s", 1, compute, db=db) == {"x": 1}
+
+    assert calls["n"] == 1
+    assert db.reads == 1
+    assert store.stats()["kinds"]["k"]["memory_hits"] == 1
+
+
+async def test_database_hit_survives_a_restart():
+    db = _TableDB()
+    compute, calls = _counted([1, 2, 3])
+    await ArtifactStore().get_or_compute("k", "s", 1, compute, db=db)
+
+    fresh = ArtifactStore()  # a new process: empty memory tier
+    assert await fresh.get_or_compute("k", "s", 1, compute, db=db) == [1, 2, 3]
+    assert calls["n"] == 1
+    assert fresh.stats()["kinds"]["k"]["db_hits"] == 1
+
+
+@pytest.mark.parametrize("fingerprint,version", [(2, 1), (1, 2)])
+async def test_a_moved_fingerprint_or_version_recomputes(fingerprint, version):
+    store, db = ArtifactStore(), _TableDB()
+    compute, calls = _counted("v")
+    await store.get_or_compute("k", "s", 1, compute, db=db, formula_version=1)
+
+    await store.get_or_compute("k", "s", fingerprint, compute, db=db, formula_version=version)
+
+    assert calls["n"] == 2
+    assert db.rows[("k", "s")][:2] == (version, canonical(fingerprint))
+
+
+async def test_concurrent_misses_share_one_compute():
+    store = ArtifactStore()
+    calls = {"n": 0}
+
+    async def slow():
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls["n"]}
+
+    results = await asyncio.gather(
+        *(store.get_or_compute("k", "s", 1, slow) for _ in range(8))
+    )
+
+    assert calls["n"] == 1
+    assert all(r == {"n": 1} for r in results)
+    assert store.stats()["kinds"]["k"]["coalesced"] == 7
+
+
+async def test_a_failed_compute_reaches_every_waiter_and_is_not_cached():
+    store = ArtifactStore()
+
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(store.get_or_compute("k", "s", 1, broken) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+    compute, calls = _counted("ok")
+    assert await store.get_or_compute("k", "s", 1, compute) == "ok"
+    assert calls["n"] == 1
+
+
+async def test_ttl_expires_the_memory_tier(monkeypatch):
+    store = ArtifactStore()
+    compute, calls = _counted("v")
+    await store.get_or_compute("k", "s", 1, compute, ttl=60)
+
+    real = store_module.time.monotonic
+    monkeypatch.setattr(store_module.time, "monotonic", lambda: real() + 61)
+    await store.get_or_compute("k", "s", 1, compute, ttl=60)
+
+    assert calls["n"] == 2
+
+
+async def test_ttl_bounds_the_database_read():
+    captured = {}
+
+    class _Spy(_TableDB):
+        async def fetch_one(self, query, params=()):
+            captured["query"], captured["params"] = query, params
+            return await super().fetch_one(query, params)
+
+    compute, _ = _counted("v")
+    await ArtifactStore().get_or_compute("k", "s", 1, compute, db=_Spy(), ttl=300)
+
+    assert "make_interval(secs => $5)" in captured["query"]
+    assert captured["params"][4] == 300.0
+
+
+async def test_database_failures_are_misses_not_errors():
+    store, db = ArtifactStore(), _TableDB(fail=True)
+    compute, calls = _counted({"x": 1})
+
+    assert await store.get_or_compute("k", "s", 1, compute, db=db) == {"x": 1}
+    assert calls["n"] == 1
+    assert store.stats()["kinds"]["k"]["db_errors"] == 2  # the read and the write
+
+
+async def test_corrupt_or_rejected_rows_are_recomputed():
+    db = _TableDB()
+    db.rows[("k", "s")] = (1, "1", "{not json")
+    compute, calls = _counted({"x": 1})
+    await ArtifactStore().get_or_compute("k", "s", 1, compute, db=db)
+
+    db.rows[("k", "s")] = (1, "1", json.dumps({"value": [1]}))
+    await ArtifactStore().get_or_compute(
+        "k", "s", 1, compute, db=db, validate=lambda v: isinstance(v, dict),
+    )
+
+    assert calls["n"] == 2
+
+
+async def test_a_non_json_value_stays_in_memory_only():
+    store, db = ArtifactStore(), _TableDB()
+    compute, calls = _counted({1, 2})  # a set: not JSON
+
+    assert await store.get_or_compute("k", "s", 1, compute, db=db) == {1, 2}
+    assert await store.get_or_compute("k", "s", 1, compute, db=db) == {1, 2}
+    assert calls["n"] == 1
+    assert db.rows == {}
+
+
+async def test_the_memory_tier_is_a_bounded_lru():
+    store = ArtifactStore(max_entries=2)
+    compute, calls = _counted("v")
+    for scope in ("a", "b"):
+        await store.get_or_compute("k", scope, 1, compute)
+    await store.get_or_compute("k", "a", 1, compute)  # touch: "b" is now oldest
+    await store.get_or_compute("k", "c", 1, compute)
+
+    assert store.stats()["entries"] == 2
+    await store.get_or_compute("k", "a", 1, compute)
+    assert calls["n"] == 3
+    await store.get_or_compute("k", "b", 1, compute)
+    assert calls["n"] == 4
+
+
+async def test_invalidate_drops_one_kind():
+    store = ArtifactStore()
+    compute, _ = _counted("v")
+    await store.get_or_compute("a", "s", 1, compute)
+    await store.get_or_compute("b", "s", 1, compute)
+
+    assert store.invalidate("a") == 1
+    assert store.stats()["entries"] == 1
+
+
+class _BatchDB(_TableDB):
+    """_TableDB plus the batch read and write."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_reads = 0
+
+    async def fetch_all(self, query, params=()):
+        assert "scope = ANY($3::text[])" in query
+        self.batch_reads += 1
+        if self.fail:
+            raise RuntimeError('relation "derived_artifacts" does not exist')
+        kind, version, scopes = params[:3]
+        return [(scope, fp, payload) for (k, scope), (v, fp, payload) in self.rows.items()
+                if k == kind and v == version and scope in scopes]
+
+    async def executemany(self, query, rows):
+        for row in rows:
+            await self.execute(query, row)
+
+
+async def test_a_batch_computes_only_its_misses_in_one_call():
+    store, db = ArtifactStore(), _BatchDB()
+    asked = []
+
+    async def compute(scopes):
+        asked.append(sorted(scopes))
+        return {scope: f"v{scope}" for scope in scopes}
+
+    await store.get_many_or_compute("k", {1: "a", 2: "a"}, compute, db=db)
+    fresh = ArtifactStore()  # a restart: 1 and 2 come back from the database
+    values = await fresh.get_many_or_compute("k", {1: "a", 2: "b", 3: "a"}, compute, db=db)
+
+    assert values == {1: "v1", 2: "v2", 3: "v3"}
+    assert asked == [[1, 2], [2, 3]]  # 2's fingerprint moved
+    assert db.batch_reads == 2
+    assert fresh.stats()["kinds"]["k"]["db_hits"] == 1
+    assert await fresh.get_many_or_compute("k", {1: "a", 3: "a"}, compute) == {1: "v1", 3: "v3"}
+    assert len(asked) == 2
+
+
+async def test_a_batch_survives_a_dead_database_tier():
+    store, db = ArtifactStore(), _BatchDB(fail=True)
+
+    async def compute(scopes):
+        return {scopes[0]: [1]}  # leaves the second scope out
+
+    assert await store.get_many_or_compute("k", {"a": 1, "b": 1}, compute, db=db) == {
+        "a": [1], "b": None,
+    }
+    assert store.stats()["kinds"]["k"]["db_errors"] == 2  # one read, one write
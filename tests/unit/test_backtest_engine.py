@@ -0,0 +1,258 @@
+"""Backtest toolkit: the resampling engine and the on-disk snapshot.
+
+The engine's promise is reproducibility — a seed fixes the answer whether the
+draws run inline or on a pool — and its fast paths must agree with the
+straightforward per-draw computation they replace.
+"""
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from scripts import backtest_snapshot as snapshot
+from scripts.backtest_engine import (
+    ClusterIndex,
+    cluster_bootstrap,
+    cluster_bootstrap_ratio,
+    leave_one_out,
+    percentile_ci,
+    resample_matrix,
+    split_half_bootstrap,
+    split_half_reliability,
+)
+
+
+def _mean_rate(data, rows):
+    wins, attempts = data
+    return wins[rows].sum() / attempts[rows].sum()
+
+
+def _column_means(data, rows):
+    return data[rows].mean(axis=0)
+
+
+def _singular_when_small(data, rows):
+    return None if len(np.unique(data[rows])) < 3 else float(data[rows].mean())
+
+
+def _fixture(seed=0, rounds=40):
+    rng = np.random.default_rng(seed)
+    clusters = np.repeat(rng.permutation(rounds) * 7, rng.integers(1, 9, rounds))
+    wins = rng.integers(0, 2, len(clusters)).astype(float)
+    return clusters, wins, np.ones(len(clusters))
+
+
+def test_cluster_rows_match_a_concatenation_loop():
+    clusters = np.array([5, 3, 5, 9, 3, 5])
+    index = ClusterIndex.of(clusters)
+    picks = np.array([2, 0, 0, 1])  # 9, 3, 3, 5
+
+    expected = np.concatenate([np.where(clusters == index.labels[p])[0] for p in picks])
+    assert index.rows(picks).tolist() == expected.tolist()
+
+
+def test_a_seed_fixes_the_draws():
+    assert (resample_matrix(10, 5, 3) == resample_matrix(10, 5, 3)).all()
+    assert not (resample_matrix(10, 5, 3) == resample_matrix(10, 5, 4)).all()
+
+
+def test_pool_and_inline_runs_agree():
+    clusters, wins, ones = _fixture()
+    inline = cluster_bootstrap(_mean_rate, clusters, (wins, ones),
+                               n_resamples=64, seed=11, workers=1)
+    pooled = cluster_bootstrap(_mean_rate, clusters, (wins, ones),
+                               n_resamples=64, seed=11, workers=3, batch=5)
+
+    assert inline.shape == (64,)
+    assert np.array_equal(inline, pooled)
+
+
+def test_the_ratio_fast_path_equals_the_per_draw_bootstrap():
+    clusters, wins, ones = _fixture(seed=2)
+    slow = cluster_bootstrap(_mean_rate, clusters, (wins, ones),
+                             n_resamples=50, seed=7, workers=1)
+    fast = cluster_bootstrap_ratio(wins, ones, clusters, n_resamples=50, seed=7)
+
+    assert fast == pytest.approx(slow)
+
+
+def test_vector_statistics_stack_and_failed_draws_drop():
+    rng = np.random.default_rng(4)
+    data = rng.normal(size=(30, 3))
+    out = cluster_bootstrap(_column_means, np.arange(30) // 3, data,
+                            n_resamples=20, seed=1, workers=1)
+    assert out.shape == (20, 3)
+    lo, hi = percentile_ci(out)
+    assert lo.shape == hi.shape == (3,) and (lo <= hi).all()
+
+    few = np.array([0.0, 0.0, 1.0, 2.0])
+    kept = cluster_bootstrap(_singular_when_small, np.arange(4), few,
+                             n_resamples=40, seed=2, workers=1)
+    assert 0 < len(kept) < 40
+
+
+def test_split_half_separates_signal_from_noise():
+    rng = np.random.default_rng(5)
+    groups = np.repeat(np.arange(20), 40)
+    signal = np.repeat(rng.normal(0, 5, 20), 40) + rng.normal(0, 0.1, len(groups))
+    noise = rng.normal(0, 1, len(groups))
+
+    assert split_half_reliability(signal, groups, repeats=30, seed=1) > 0.99
+    assert abs(split_half_reliability(noise, groups, repeats=200, seed=1)) < 0.3
+    assert split_half_reliability(signal, groups, repeats=30, seed=1) == \
+        split_half_reliability(signal, groups, repeats=30, seed=1)
+
+
+def test_split_half_halves_are_floor_and_rest():
+    """Constant-within-group values make both half means the group value, so
+    any split that keeps every value in exactly one half gives r = 1."""
+    groups = np.repeat(np.arange(6), [4, 5, 7, 9, 4, 3])  # the 3-value group sits out
+    values = groups.astype(float) ** 2
+
+    assert split_half_reliability(values, groups, repeats=3, seed=0) == pytest.approx(1.0)
+    assert np.isnan(split_half_reliability([1.0, 2.0], ["a", "a"], repeats=3, seed=0))
+
+
+def test_split_half_bootstrap_draws_players_and_splits_each_pick():
+    rng = np.random.default_rng(5)
+    groups = np.repeat(np.arange(20), 40)
+    signal = np.repeat(rng.normal(0, 5, 20), 40) + rng.normal(0, 0.1, len(groups))
+    noise = rng.normal(0, 1, len(groups))
+
+    draws = split_half_bootstrap(signal, groups, n_resamples=200, seed=1)
+    assert len(draws) == 200 and draws.min() > 0.99
+    assert abs(np.median(split_half_bootstrap(noise, groups, n_resamples=200, seed=1))) < 0.3
+    np.testing.assert_array_equal(
+        draws, split_half_bootstrap(signal, groups, n_resamples=200, seed=1))
+
+
+def test_split_half_bootstrap_follows_the_kernel_rules(monkeypatch):
+    """Floor-and-rest halves and the sit-out rule, also when the draws are
+    chunked and a group is picked more than once."""
+    import scripts.backtest_engine as engine
+
+    monkeypatch.setattr(engine, "SPLIT_CHUNK_ELEMENTS", 1)
+    groups = np.repeat(np.arange(6), [4, 5, 7, 9, 4, 3])  # the 3-value group sits out
+    values = groups.astype(float) ** 2
+
+    draws = split_half_bootstrap(values, groups, n_resamples=50, seed=0)
+    assert 0 < len(draws) <= 50
+    np.testing.assert_allclose(draws, 1.0)
+    assert len(split_half_bootstrap([1.0, 2.0, 3.0], ["a"] * 3, n_resamples=5, seed=0)) == 0
+
+
+def test_leave_one_out_drops_each_group_once():
+    groups = np.array(["supply", "supply", "radar", "goldrush", "radar"])
+    values = np.array([1.0, 3.0, 10.0, 100.0, 20.0])
+
+    out = leave_one_out(_column_means, groups, values, min_rows=3)
+
+    assert out == {
+        "goldrush": pytest.approx(8.5),
+        "radar": pytest.approx(104 / 3),
+        "supply": pytest.approx(130 / 3),
+    }
+    assert "supply" in leave_one_out(_column_means, groups, values, min_rows=3, workers=2)
+
+
+def test_snapshot_round_trips_columns_and_nulls(tmp_path):
+    rows = [(1, "G1", None, 2.5, True), (2, None, 7, None, None)]
+    cols = [("id", "int"), ("guid", "str"), ("n", "int"), ("d", "float"), ("ok", "bool")]
+    manifest = snapshot.write_snapshot({"kills": snapshot.to_columns(rows, cols)},
+                                       tmp_path / "snap", source="test")
+
+    snap = snapshot.load_snapshot(tmp_path / "snap")
+
+    kills = snap["kills"]
+    assert kills["id"].tolist() == [1, 2]
+    assert kills["guid"].tolist() == ["G1", ""]
+    assert snap.null("kills", "guid").tolist() == [False, True]
+    assert snap.null("kills", "id").tolist() == [False, False]
+    assert np.isnan(kills["d"][1]) and kills["n"][0] == 0
+    assert manifest["tables"]["kills"]["rows"] == 2
+    assert manifest["tables"]["kills"]["nullable"] == ["d", "guid", "n", "ok"]
+
+
+def test_snapshot_of_another_format_is_refused(tmp_path):
+    snapshot.write_snapshot({"rounds": snapshot.to_columns([], [("id", "int")])},
+                            tmp_path / "old")
+    manifest = json.loads((tmp_path / "old" / "manifest.json").read_text())
+    manifest["format_version"] = snapshot.SNAPSHOT_FORMAT_VERSION + 1
+    (tmp_path / "old" / "manifest.json").write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError, match="export a fresh one"):
+        snapshot.load_snapshot("old", root=tmp_path)
+
+
+async def test_export_runs_every_table_query(tmp_path):
+    class _Conn:
+        def __init__(self):
+            self.queries = []
+
+        async def fetch(self, sql):
+            self.queries.append(sql)
+            return []
+
+    conn = _Conn()
+    manifest = await snapshot.export_snapshot(conn, tmp_path / "s")
+
+    assert len(conn.queries) == len(snapshot.TABLES)
+    assert set(manifest["tables"]) == {"rounds", "outcomes", "kills", "tracks"}
+    assert all("is_valid" in q for q in conn.queries)
+
+
+class _Live:
+    """What ``snapshot.connect`` returns: asyncpg-style fetch over canned rows."""
+
+    def __init__(self, results):
+        self.results = results
+        self.closed = False
+
+    async def fetch(self, sql, *args):
+        return self.results[sql]
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_a_query_snapshot_replays_what_the_live_run_fetched(tmp_path, monkeypatch):
+    results = {
+        "SELECT kills": [
+            {"rid": 1, "guid": "G1", "impact": Decimal("1.5"), "path": [{"x": 1}], "ok": True},
+            {"rid": 2, "guid": None, "impact": None, "path": None, "ok": None},
+        ],
+        "SELECT nothing": [],
+    }
+    live = _Live(results)
+
+    async def connect():
+        return live
+
+    monkeypatch.setattr(snapshot, "connect", connect)
+    queries = {"kills": ("SELECT kills", "kis-v5"), "empty": ("SELECT nothing",)}
+
+    fetched = await snapshot.fetch_queries(queries, export="run", root=tmp_path)
+    replayed = await snapshot.fetch_queries(queries, snapshot="run", root=tmp_path)
+
+    assert fetched["kills"] is results["SELECT kills"] and live.closed
+    first, second = replayed["kills"]
+    assert first["impact"] == 1.5 and first["path"] == [{"x": 1}] and first["ok"] is True
+    assert tuple(first) == (1, "G1", 1.5, [{"x": 1}], True)
+    assert second["guid"] is None and second["impact"] is None and second["path"] is None
+    assert list(second.keys()) == ["rid", "guid", "impact", "path", "ok"]
+    assert replayed["empty"] == []
+
+
+async def test_a_query_snapshot_of_other_sql_is_refused(tmp_path, monkeypatch):
+    async def connect():
+        return _Live({"SELECT kills": [{"rid": 1}]})
+
+    monkeypatch.setattr(snapshot, "connect", connect)
+    await snapshot.fetch_queries({"kills": ("SELECT kills", "kis-v5")}, export="run", root=tmp_path)
+
+    with pytest.raises(ValueError, match=r"\(kills\) — export a fresh one"):
+        await snapshot.fetch_queries({"kills": ("SELECT kills", "kis-v6")},
+                                     snapshot="run", root=tmp_path)
@@ -0,0 +1,120 @@
+"""Set-based orphan sweep for RoundCorrelationService.
+
+One query ranks a merge target for every orphan; all merges, the orphan
+deletes and the targets' completeness recompute run as three statements in
+one transaction — no per-orphan lookups, no per-target re-reads.
+"""
+# ruff: noqa: SLF001 — the sweep internals and its SQL are the unit under test
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from bot.services import round_correlation_service as rcs
+from bot.services.round_correlation_service import RoundCorrelationService
+
+
+class _BulkFakeDb:
+    def __init__(self, pairs, *, fail_on=None):
+        self.pairs = pairs
+        self.fail_on = fail_on
+        self.fetched: list[tuple[str, tuple]] = []
+        self.executed: list[tuple[str, tuple, bool]] = []
+        self.in_tx = False
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        self.in_tx = True
+        try:
+            yield self
+        finally:
+            self.in_tx = False
+
+    async def execute(self, query, params=None, *extra):
+        q = str(query)
+        if self.fail_on and self.fail_on in q:
+            raise RuntimeError("simulated FK violation")
+        self.executed.append((q, params, self.in_tx))
+        return "UPDATE 0"
+
+    async def fetch_all(self, query, params=None):
+        self.fetched.append((str(query), params))
+        if "ROW_NUMBER() OVER" in str(query):
+            return self.pairs
+        return []
+
+    async def fetch_one(self, query, params=None):
+        return None
+
+
+def _svc(db):
+    svc = RoundCorrelationService(
+        db, dry_run=False, require_schema_check=False, write_error_threshold=5,
+    )
+    svc._initialized = True
+    svc.preflight_ok = True
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_sweep_merges_every_orphan_in_one_transaction(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Ljubljana")
+    db = _BulkFakeDb([
+        ("2026-06-08-230741-lua:supply", "2026-06-08-230738:supply", 1),
+        ("2026-06-08-231500-lua:supply", "2026-06-08-230738:supply", 2),
+        ("2026-06-08-240000-lua:radar", "2026-06-08-235958:radar", 3),
+    ])
+    svc = _svc(db)
+
+    await svc._sweep_once()
+
+    candidate_queries = [p for q, p in db.fetched if "ROW_NUMBER() OVER" in q]
+    assert candidate_queries == [("Europe/Ljubljana", rcs.SWEEP_BATCH_LIMIT, 1800)]
+    assert db.transactions == 1
+    merge, delete, recalc = [e for e in db.executed if "incomplete" not in e[0]]
+    assert all(in_tx for _, _, in_tx in (merge, delete, recalc))
+    assert "bool_or" in merge[0] and "lua_round_teams" in merge[0]
+    sources = [
+        "2026-06-08-230741-lua:supply",
+        "2026-06-08-231500-lua:supply",
+        "2026-06-08-240000-lua:radar",
+    ]
+    assert merge[1] == (sources, [
+        "2026-06-08-230738:supply", "2026-06-08-230738:supply", "2026-06-08-235958:radar",
+    ])
+    assert "DELETE FROM round_correlations" in delete[0] and delete[1] == (sources,)
+    assert "completeness_pct" in recalc[0]
+    assert recalc[1] == (["2026-06-08-230738:supply", "2026-06-08-235958:radar"],)
+
+
+@pytest.mark.asyncio
+async def test_bulk_merge_failure_rolls_back_and_counts_a_write_failure():
+    db = _BulkFakeDb([], fail_on="DELETE FROM round_correlations")
+    svc = _svc(db)
+
+    merged = await svc._merge_orphans([("a:supply", "b:supply"), ("c:supply", "c:supply")])
+
+    assert merged == 0
+    assert svc.write_error_count == 1
+    assert db.executed[0][1] == (["a:supply"], ["b:supply"])  # self-pairs dropped
+
+
+def test_bulk_completeness_uses_the_same_weights():
+    sql = rcs._RECALCULATE_COMPLETENESS_SQL
+    for column, weight in rcs.COMPLETENESS_WEIGHTS.items():
+        assert f"WHEN {column} THEN {weight} ELSE 0" in sql
+    assert sum(rcs.COMPLETENESS_WEIGHTS.values()) > 100  # hence the LEAST(100, ...)
+    assert "LEAST(100," in sql
+
+
+def test_match_timestamps_are_pinned_to_the_host_zone(monkeypatch):
+    """Strategy 3 compares match_id against epoch columns: the wall clock is
+    read zone-free and placed in the bot host's zone, never the DB session's."""
+    sql = rcs._SWEEP_CANDIDATES_SQL
+    assert "AT TIME ZONE (SELECT name FROM host_zone)" in sql
+    assert sql.index("host_zone AS (SELECT ?::text") < sql.index("LIMIT ?")
+    monkeypatch.setenv("TZ", ":America/New_York")
+    assert rcs._host_timezone() == "America/New_York"
@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import pytest
 
-from bot.core.database_adapter import PostgreSQLAdapter
+from bot.core.database_adapter import PostgreSQLAdapter, translate_placeholders
 
 
 @pytest.fixture
@@ -116,6 +116,16 @@ def test_translate_query_delegates_to_translate_placeholders(adapter):
     assert adapter.translate_query(same_input) == adapter._translate_placeholders(same_input)
 
 
+def test_translation_is_memoized_and_numbers_every_placeholder():
+    """Hot paths translate the same SQL thousands of times per import: the
+    rewrite is cached by query string."""
+    query = "SELECT * FROM t WHERE a = ? AND b IN (?, ?) -- ?"
+    assert translate_placeholders(query) == "SELECT * FROM t WHERE a = $1 AND b IN ($2, $3) -- $4"
+    hits = translate_placeholders.cache_info().hits
+    translate_placeholders(query)
+    assert translate_placeholders.cache_info().hits == hits + 1
+
+
 # ---------------------------------------------------------------------------
 # _normalize_params — passthrough contract
 # ---------------------------------------------------------------------------
@@ -0,0 +1,252 @@
+"""FileDiscoveryService: one claimed stream for push, webhook and poll.
+
+The service's promises:
+
+- the first source to report a file owns it; the others skip it, and a
+  failed import releases it so the poll can retry;
+- after a push reconnect, a listing delta from the source's watermark
+  recovers exactly the files pushed while it was down;
+- the poll cadence follows voice activity, recent discoveries and push health.
+
+The end-to-end test runs the real StatsWebSocketClient against a local
+WebSocket server, with a dict-backed remote directory standing in for SFTP.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.services.automation.file_discovery import FileDiscoveryService, filename_timestamp
+
+websockets_server = pytest.importorskip("websockets.asyncio.server")
+
+NOW = datetime(2026, 5, 7, 21, 0, 0, tzinfo=timezone.utc)
+
+
+def _name(minutes_ago: int, map_name: str = "supply", round_n: int = 1) -> str:
+    stamp = (NOW - timedelta(minutes=minutes_ago)).strftime("%Y-%m-%d-%H%M%S")
+    return f"{stamp}-{map_name}-round-{round_n}.txt"
+
+
+class _FakeRemoteDir:
+    """The game server's stats directory, as the SSH listing sees it."""
+
+    def __init__(self, *names):
+        self.names = list(names)
+        self.listings = 0
+        self.fail = False
+
+    async def list(self):
+        self.listings += 1
+        if self.fail:
+            raise ConnectionError("ssh: connect to host vps port 22: Connection refused")
+        return list(self.names)
+
+
+class _Consumer:
+    """The stream consumer; files in ``failing`` report an import failure."""
+
+    def __init__(self, failing=()):
+        self.received = []
+        self.failing = set(failing)
+        self.event = asyncio.Event()
+
+    async def __call__(self, filename):
+        self.received.append(filename)
+        self.event.set()
+        return filename not in self.failing
+
+
+def _service(remote=None, consumer=None, clock=None):
+    return FileDiscoveryService(
+        (remote or _FakeRemoteDir()).list,
+        on_new_file=consumer,
+        clock=clock or (lambda: NOW),
+    )
+
+
+async def test_the_first_source_claims_and_later_ones_skip():
+    now = [NOW]
+    discovery = _service(clock=lambda: now[0])
+    name = _name(3)
+
+    assert await discovery.announce(name, "webhook") is True
+    now[0] += timedelta(seconds=40)
+    assert await discovery.announce(name, "poll") is False
+    assert await discovery.announce(name, "webhook") is True  # a retry by the owner
+
+    status = discovery.get_status()["sources"]
+    assert discovery.claimed_by(name) == "webhook"
+    assert status["webhook"]["first"] == 1 and status["webhook"]["announced"] == 1
+    assert status["webhook"]["latency"]["median_s"] == 180.0
+    assert status["poll"]["late"] == 1
+    assert status["poll"]["lag_behind_first"]["max_s"] == 40.0
+
+
+async def test_a_failed_import_releases_the_claim_for_the_poll():
+    consumer = _Consumer(failing={_name(1)})
+    discovery = _service(consumer=consumer)
+
+    assert await discovery.submit(_name(1), "ws") is False
+    assert discovery.claimed_by(_name(1)) is None
+    assert await discovery.announce(_name(1), "poll") is True
+
+    async def boom(_filename):
+        raise RuntimeError("download failed")
+
+    discovery.on_new_file = boom
+    assert await discovery.submit(_name(2), "ws") is False
+    assert discovery.claimed_by(_name(2)) is None
+
+
+async def test_resync_delivers_unclaimed_files_since_the_watermark():
+    remote = _FakeRemoteDir(
+        _name(30, "radar"),                    # before the watermark
+        _name(20, "supply"),                   # the watermark itself, already pushed
+        _name(20, "goldrush"),                 # same second, missed
+        _name(10, "supply", 2),                # missed
+        _name(5, "supply", 2).replace(".txt", "-endstats.txt"),
+        _name(4, "oasis"),                     # already claimed by the webhook
+    )
+    consumer = _Consumer()
+    discovery = _service(remote, consumer)
+    await discovery.submit(_name(20, "supply"), "ws")
+    await discovery.announce(_name(4, "oasis"), "webhook")
+    consumer.received.clear()
+
+    recovered = await discovery.resync("ws")
+
+    assert recovered == [_name(20, "goldrush"), _name(10, "supply", 2)]
+    assert consumer.received == recovered
+    assert {discovery.claimed_by(n) for n in recovered} == {"resync"}
+    ws = discovery.get_status()["sources"]["ws"]
+    assert ws["reconnects"] == 1 and ws["recovered"] == 2
+    assert await discovery.resync("ws") == []
+
+
+async def test_resync_without_a_watermark_looks_back_and_survives_a_dead_listing():
+    remote = _FakeRemoteDir(_name(60 * 7), _name(60 * 5))
+    discovery = _service(remote, _Consumer())
+
+    assert await discovery.resync("ws") == [_name(60 * 5)]
+
+    remote.fail = True
+    assert await discovery.resync("ws") == []
+
+
+@pytest.mark.parametrize(
+    ("voice", "push", "recent", "expected"),
+    [
+        (8, True, False, (60, "ACTIVE (players)")),
+        (0, False, True, (60, "ACTIVE (grace period)")),
+        (0, True, False, (600, "IDLE (push healthy)")),
+        (-1, False, False, (60, "ACTIVE (voice unknown)")),
+        (3, False, False, (180, "WARM (3 in voice)")),
+        (0, False, False, (600, "IDLE")),
+    ],
+)
+async def test_poll_cadence_follows_session_activity(voice, push, recent, expected):
+    discovery = _service()
+    if recent:
+        await discovery.announce(_name(1), "poll")
+
+    assert tuple(discovery.poll_cadence(voice, push_healthy=push)) == expected
+
+
+async def test_claims_are_bounded_oldest_first():
+    discovery = _service()
+    discovery.max_tracked = 3
+    names = [_name(m) for m in range(5, 0, -1)]
+    for name in names:
+        await discovery.announce(name, "poll")
+
+    assert [discovery.claimed_by(n) for n in names] == [None, None, "poll", "poll", "poll"]
+    assert filename_timestamp("not-a-stats-file.txt") is None
+
+
+class _FakePushServer:
+    """The VPS push server: token auth, then one filename per message."""
+
+    TOKEN = "test-token"  # noqa: S105 - local fake server
+
+    def __init__(self):
+        self.clients = set()
+        self.connected = asyncio.Event()
+        self.server = None
+
+    async def _handler(self, ws):
+        if await ws.recv() != self.TOKEN:
+            await ws.send("AUTH_FAILED")
+            return
+        await ws.send("AUTH_OK")
+        self.clients.add(ws)
+        self.connected.set()
+        try:
+            await ws.wait_closed()
+        finally:
+            self.clients.discard(ws)
+
+    async def __aenter__(self):
+        self.server = await websockets_server.serve(self._handler, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def push(self, filename):
+        for ws in list(self.clients):
+            await ws.send(filename)
+
+    async def drop(self):
+        self.connected.clear()
+        for ws in list(self.clients):
+            await ws.close()
+
+
+async def test_push_gap_is_recovered_after_a_reconnect():
+    from bot.services.automation.ws_client import StatsWebSocketClient
+
+    remote = _FakeRemoteDir()
+    consumer = _Consumer()
+    discovery = FileDiscoveryService(remote.list, on_new_file=consumer)
+
+    async with _FakePushServer() as server:
+        config = MagicMock(ws_scheme="ws", ws_host="127.0.0.1", ws_port=server.port,
+                           ws_auth_token=server.TOKEN, ws_reconnect_delay=0, ws_enabled=True)
+        client = StatsWebSocketClient(
+            config,
+            on_new_file=lambda f: discovery.submit(f, "ws"),
+            on_connect=lambda: discovery.resync("ws"),
+        )
+        client.start()
+        try:
+            await asyncio.wait_for(server.connected.wait(), 5)
+            pushed = _name(0, "supply")
+            remote.names.append(pushed)
+            await server.push(pushed)
+            await asyncio.wait_for(consumer.event.wait(), 5)
+
+            # Written while the push connection is down: never pushed.
+            await server.drop()
+            missed = [_name(-1, "supply", 2), _name(-2, "goldrush")]
+            remote.names.extend(missed)
+            await asyncio.wait_for(server.connected.wait(), 5)
+            for _ in range(100):
+                if len(consumer.received) == 3:
+                    break
+                await asyncio.sleep(0.02)
+
+            await server.push(missed[0])   # a late duplicate push
+            await asyncio.sleep(0.05)
+        finally:
+            client.stop()
+
+    assert consumer.received == [pushed, *sorted(missed)]
+    assert client.reconnect_count >= 1
+    assert discovery.get_status()["sources"]["ws"]["recovered"] == 2
+    assert discovery.claimed_by(missed[0]) == "resync"
@@ -33,7 +33,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from bot.automation.file_tracker import FileTracker
+from bot.automation.file_tracker import FileTracker, calculate_file_hash
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -432,10 +432,13 @@ async def test_sync_ignores_sidecars_and_batches_primary_lookup(
     with caplog.at_level(logging.DEBUG, logger="bot.automation.file_tracker"):
         await tracker.sync_local_files_to_processed_table()
 
-    db.fetch_all.assert_awaited_once()
-    query, params = db.fetch_all.await_args.args
+    # processed_files once for every primary file, rounds once for the untracked
+    assert db.fetch_all.await_count == 2
+    query, params = db.fetch_all.await_args_list[0].args
     assert "filename = ANY(?::text[])" in query
     assert set(params[0]) == {tracked, missing}
+    query, params = db.fetch_all.await_args_list[1].args
+    assert "FROM rounds" in query and params == (["2026-05-07"],)
     db.fetch_one.assert_not_awaited()
     assert "Found 1 unimported recent files" in caplog.text
     assert "total primary files: 2" in caplog.text
@@ -461,3 +464,139 @@ async def test_sync_with_only_sidecars_does_not_query_or_warn(
     db.fetch_all.assert_not_awaited()
     db.fetch_one.assert_not_awaited()
     assert "unimported" not in caplog.text.lower()
+
+
+def _stat(path):
+    st = path.stat()
+    return st.st_size, st.st_mtime
+
+
+@pytest.mark.asyncio
+async def test_sync_trusts_unchanged_stat_and_rehashes_the_rest(
+    tracker, db, tmp_path, monkeypatch, caplog
+):
+    local_stats = tmp_path / "local_stats"
+    local_stats.mkdir()
+    same = local_stats / "2026-05-07-110000-oasis-round-1.txt"
+    touched = local_stats / "2026-05-07-113000-oasis-round-2.txt"
+    legacy = local_stats / "2026-05-07-120000-supply-round-1.txt"
+    corrupt = local_stats / "2026-05-07-123000-supply-round-2.txt"
+    for f in (same, touched, legacy, corrupt):
+        f.write_text(f.name)
+    digest = {f.name: hashlib.sha256(f.name.encode()).hexdigest()
+              for f in (same, touched, legacy, corrupt)}
+
+    db.fetch_all.return_value = [
+        {"filename": same.name, "file_hash": "not-read", "file_size": _stat(same)[0],
+         "file_mtime": _stat(same)[1]},
+        {"filename": touched.name, "file_hash": digest[touched.name], "file_size": 1,
+         "file_mtime": 0.0},
+        {"filename": legacy.name, "file_hash": None, "file_size": None, "file_mtime": None},
+        {"filename": corrupt.name, "file_hash": "0" * 64, "file_size": None,
+         "file_mtime": None},
+    ]
+    hashed = []
+    monkeypatch.setattr(
+        "bot.automation.file_tracker.calculate_file_hash",
+        lambda p: hashed.append(p) or calculate_file_hash(p),
+    )
+    monkeypatch.chdir(tmp_path)
+
+    with caplog.at_level(logging.INFO, logger="bot.automation.file_tracker"):
+        await tracker.sync_local_files_to_processed_table()
+
+    assert sorted(hashed) == sorted(
+        str(p.relative_to(tmp_path)) for p in (touched, legacy, corrupt)
+    )
+    db.fetch_all.assert_awaited_once()  # everything tracked: no rounds lookup
+    query, rows = db.executemany.await_args.args
+    assert query.lstrip().startswith("UPDATE processed_files")
+    assert {row[0]: row[1] for row in rows} == {
+        touched.name: digest[touched.name], legacy.name: digest[legacy.name],
+    }
+    assert "INTEGRITY MISMATCH for 1 local stats files" in caplog.text
+    assert corrupt.name in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sync_records_imported_untracked_files_in_one_upsert(
+    tracker, db, tmp_path, monkeypatch
+):
+    local_stats = tmp_path / "local_stats"
+    local_stats.mkdir()
+    imported = local_stats / "2026-05-07-110000-oasis-round-1.txt"
+    pending = local_stats / "2026-05-07-113000-oasis-round-2.txt"
+    imported.write_text("r1")
+    pending.write_text("r2")
+
+    db.fetch_all.side_effect = [
+        [],
+        [("2026-05-07", "oasis", 1, "110000"), ("2026-05-07", "oasis", 2, "999999")],
+    ]
+    monkeypatch.chdir(tmp_path)
+
+    await tracker.sync_local_files_to_processed_table()
+
+    query, rows = db.executemany.await_args.args
+    assert "INSERT INTO processed_files" in query
+    assert rows[0][0] == imported.name
+    assert rows[0][1] == hashlib.sha256(b"r1").hexdigest()
+    assert rows[0][3:] == _stat(imported)
+    assert len(rows) == 1
+    assert imported.name in tracker.processed_files
+    assert pending.name not in tracker.processed_files
+
+
+# ---------------------------------------------------------------------------
+# filter_new_files
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_filter_new_files_matches_the_per_file_check(db, startup_time):
+    recent = startup_time - timedelta(hours=2)
+    names = {
+        "old": _make_filename(startup_time - timedelta(hours=400)),
+        "cached": _make_filename(recent, "radar"),
+        "tracked": _make_filename(recent, "supply"),
+        "imported": _make_filename(recent, "oasis", 2),
+        "new": _make_filename(recent, "goldrush"),
+        "odd": "not-a-stats-file.txt",
+    }
+    rounds = [(recent.strftime("%Y-%m-%d"), "oasis", 2, recent.strftime("%H%M%S"))]
+
+    def tracker_with_state():
+        config = SimpleNamespace(STARTUP_LOOKBACK_HOURS=168)
+        t = FileTracker(db, config, startup_time, {names["cached"]})
+        return t
+
+    async def fetch_one(query, params):
+        if "processed_files" in query:
+            return (1,) if params[0] == names["tracked"] else None
+        date, map_name, round_n, _, hhmmss = params
+        return (1,) if (date, map_name, round_n, hhmmss) == rounds[0] else None
+
+    async def fetch_all(query, params):
+        if "processed_files" in query:
+            return [(n,) for n in params[0] if n == names["tracked"]]
+        return rounds
+
+    db.fetch_one = AsyncMock(side_effect=fetch_one)
+    db.fetch_all = AsyncMock(side_effect=fetch_all)
+
+    for kwargs in ({}, {"ignore_startup_time": True, "check_db_only": True}):
+        one_by_one = tracker_with_state()
+        expected = [n for n in names.values()
+                    if await one_by_one.should_process_file(n, **kwargs)]
+        batched = tracker_with_state()
+
+        assert await batched.filter_new_files(list(names.values()), **kwargs) == expected
+        assert batched.processed_files == one_by_one.processed_files
+
+
+@pytest.mark.asyncio
+async def test_filter_new_files_fails_open_on_db_error(tracker, db, startup_time):
+    names = [_make_filename(startup_time + timedelta(minutes=m)) for m in (1, 2)]
+    tracker._tracked_filenames = AsyncMock(side_effect=RuntimeError("DB down"))
+
+    assert await tracker.filter_new_files(names) == names
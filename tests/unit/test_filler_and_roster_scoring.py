@@ -39,8 +39,9 @@ class _FakeDB:
     """Minimal async db_adapter stub for StopwatchScoringService.
 
     Dispatches fetch_all by query content: the rounds query returns one
-    complete map (R1+R2); the player-side sample query returns players whose
+    complete map (R1+R2); the R1 player-side query returns players whose
     GUIDs are NOT in either roster (so both teams tie at 0 → ambiguous sides).
+    No outcome is stored yet, and storing one is a no-op.
     """
 
     def __init__(self, rounds_rows, player_rows):
@@ -48,10 +49,15 @@ class _FakeDB:
         self._players = player_rows
 
     async def fetch_all(self, query, params=()):
+        if "FROM stopwatch_map_outcomes" in query:
+            return []
         if "FROM player_comprehensive_stats" in query:
-            return self._players
+            return [(1, guid, side) for guid, side in self._players]
         return self._rounds
 
+    async def executemany(self, query, params_list):
+        pass
+
 
 def _rounds_one_map():
     # (id, map_name, gaming_session_id, round_number, defender_team,
@@ -0,0 +1,186 @@
+"""Per-demo timeline artifact cache.
+
+The artifact replaces a UDT parse on re-analysis, so the tests pin that the
+cached path yields the exact analysis the parser path does, that the parser is
+not invoked on a hit, and that a stale artifact version is a plain miss.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import greatshot.scanner.api as scanner_api
+import greatshot.scanner.timeline_artifact as timeline_artifact
+from greatshot.contracts.types import DemoEvent
+from greatshot.highlights.detectors import detect_highlights, detect_highlights_from_artifact
+from greatshot.scanner.timeline_artifact import (
+    TimelineArtifact,
+    artifact_path,
+    demo_sha256,
+    prune_timeline_cache,
+)
+
+FIXTURES = Path("greatshot/tests/fixtures")
+
+
+@pytest.fixture
+def parser_calls(monkeypatch):
+    sample = json.loads((FIXTURES / "sample_udt_output.json").read_text(encoding="utf-8"))
+    calls: list[dict] = []
+
+    def fake_parser(**kwargs):
+        calls.append(kwargs)
+        return sample
+
+    monkeypatch.setattr(scanner_api, "run_udt_json_parser", fake_parser)
+    return calls
+
+
+@pytest.fixture
+def demo_path(tmp_path: Path) -> Path:
+    path = tmp_path / "gold.dm_84"
+    header = (1).to_bytes(4, "little", signed=True) + (64).to_bytes(4, "little", signed=True)
+    path.write_bytes(header + (b"\x00" * 128))
+    return path
+
+
+def test_cached_analysis_matches_parser_and_skips_it(parser_calls, demo_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    uncached = scanner_api.analyze_demo(demo_path).to_dict()
+    first = scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir}).to_dict()
+    second = scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir}).to_dict()
+
+    assert len(parser_calls) == 2  # uncached + first miss; the hit never parses
+    assert artifact_path(cache_dir, demo_sha256(demo_path)).is_file()
+    assert first == uncached
+    assert second == uncached
+
+
+def test_artifact_round_trip_preserves_events(parser_calls, demo_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    result = scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir})
+    loaded = TimelineArtifact.load(artifact_path(cache_dir, demo_sha256(demo_path)))
+
+    assert loaded is not None
+    assert [e.to_dict() for e in loaded.events()] == [e.to_dict() for e in result.timeline]
+    for player in {e.attacker for e in result.timeline if e.type == "kill" and e.attacker}:
+        rows = loaded.kill_rows_for(player)
+        assert rows.size > 0
+        assert all(loaded.events()[int(row)].attacker == player for row in rows)
+    assert loaded.kill_rows_for("nobody").size == 0
+
+
+def test_artifact_detectors_match_the_event_detectors():
+    def kill(t_ms, attacker, victim, head=False):
+        return DemoEvent(
+            t_ms=t_ms,
+            type="kill",
+            attacker=attacker,
+            victim=victim,
+            weapon="mp40",
+            hit_region="head" if head else "body",
+        )
+
+    # Out of time order, a same-tick trade, a suicide mid-spree, a kill
+    # without a victim and a headshot chain.
+    timeline = [
+        kill(5000, "A", "C", head=True),
+        kill(1000, "A", "B", head=True),
+        kill(2000, "A", "C", head=True),
+        kill(2000, "B", "A"),
+        kill(2500, "A", "D", head=True),
+        kill(3000, "A", "E", head=True),
+        kill(3200, "A", "A"),
+        kill(3300, "B", "C"),
+        kill(3400, "B", "D"),
+        kill(3500, "B", "E"),
+        kill(3600, "B", None),
+        kill(3700, "B", "F"),
+        kill(5100, "A", "B", head=True),
+        DemoEvent(t_ms=4000, type="chat", attacker="A", message="gg"),
+    ]
+    artifact = TimelineArtifact.from_events(
+        timeline, players=[], match_stats=[], summary={}, raw_sections={}
+    )
+    thresholds = {"spree_min": 2, "multi_kill_min": 2, "quick_headshot_min": 2}
+
+    expected = detect_highlights([e.to_dict() for e in timeline], thresholds)
+    actual = detect_highlights_from_artifact(artifact, thresholds)
+
+    assert expected
+    assert {item.highlight_type for item in expected} >= {"spree", "multi_kill", "quick_headshot_chain"}
+    assert [item.to_dict() for item in actual] == [item.to_dict() for item in expected]
+
+
+def test_a_supplied_content_hash_keys_the_cache(parser_calls, demo_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    opts = {"timeline_cache_dir": cache_dir, "content_hash_sha256": "ab" * 32}
+    monkeypatch.setattr(scanner_api, "demo_sha256", lambda path: pytest.fail("demo re-hashed"))
+
+    scanner_api.analyze_demo(demo_path, opts)
+    scanner_api.analyze_demo(demo_path, opts)
+
+    assert len(parser_calls) == 1
+    assert artifact_path(cache_dir, "ab" * 32).is_file()
+
+
+def test_redetect_with_new_thresholds_uses_artifact_only(parser_calls, demo_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir})
+    sha = demo_sha256(demo_path)
+    demo_path.unlink()
+
+    default = scanner_api.redetect_highlights(sha, timeline_cache_dir=cache_dir)
+    strict = scanner_api.redetect_highlights(
+        sha, {"multi_kill_min": 99, "spree_min": 99}, timeline_cache_dir=cache_dir
+    )
+
+    assert len(parser_calls) == 1
+    assert default is not None and strict is not None
+    assert len(strict) <= len(default)
+    assert scanner_api.redetect_highlights("0" * 64, timeline_cache_dir=cache_dir) is None
+
+
+def test_version_mismatch_is_a_miss(parser_calls, demo_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir})
+    monkeypatch.setattr(timeline_artifact, "TIMELINE_ARTIFACT_VERSION", 999)
+
+    scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir})
+    assert len(parser_calls) == 2
+
+
+def test_unreadable_artifact_is_a_miss(tmp_path):
+    path = tmp_path / "ab" / "broken.npz"
+    path.parent.mkdir()
+    path.write_bytes(b"not a zip")
+    assert TimelineArtifact.load(path) is None
+
+
+def test_prune_drops_least_recently_used_artifacts_first(tmp_path):
+    paths = []
+    for index, sha in enumerate(("aa" * 32, "bb" * 32, "cc" * 32)):
+        path = artifact_path(tmp_path, sha)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + index, 1000 + index))
+        paths.append(path)
+
+    assert prune_timeline_cache(tmp_path, 250) == 1
+    assert [p.is_file() for p in paths] == [False, True, True]
+    assert prune_timeline_cache(tmp_path, 0) == 0
+
+
+def test_a_write_prunes_the_cache_to_its_cap(parser_calls, demo_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    stale = artifact_path(cache_dir, "00" * 32)
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"x" * 100)
+    os.utime(stale, (1000, 1000))
+
+    scanner_api.analyze_demo(demo_path, {"timeline_cache_dir": cache_dir, "timeline_cache_max_bytes": 1})
+
+    assert not stale.exists()
@@ -0,0 +1,200 @@
+"""Greatshot worker-pool mode.
+
+In pool mode the web process must only enqueue (rows are the queue) and the
+worker processes claim with SKIP LOCKED, run with the inline retry policy, and
+reclaim leases a dead process left behind.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+from greatshot.worker.pool import WorkerSlot, _process_one, build_slots, run_worker
+from website.backend.services.greatshot_jobs import (
+    JOB_MODE_POOL,
+    MAX_CLAIM_ATTEMPTS,
+    GreatshotJobService,
+)
+
+
+class FakeConn:
+    def __init__(self, row):
+        self.row = row
+        self.queries: list[str] = []
+
+    async def fetchrow(self, query, *args):
+        self.queries.append(query)
+        return self.row
+
+    async def execute(self, query, *args):
+        self.queries.append(query)
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakeDB:
+    def __init__(self, row=None):
+        self.conn = FakeConn(row)
+        self.fetch_all_calls: list[tuple[str, tuple | None]] = []
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+    async def fetch_all(self, query, params=None):
+        self.fetch_all_calls.append((query, params))
+        return []
+
+
+class FakeStorage:
+    def ensure_storage_tree(self):
+        pass
+
+    async def ensure_schema(self, db):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_pool_mode_start_runs_no_inline_workers_and_enqueue_is_noop():
+    svc = GreatshotJobService(db=FakeDB(), storage=FakeStorage())
+    await svc.start(job_mode=JOB_MODE_POOL)
+
+    await svc.enqueue_analysis("demo-1")
+    await svc.enqueue_render("render-1")
+
+    assert svc.started
+    assert svc.analysis_workers == [] and svc.render_workers == []
+    assert svc.analysis_queue.qsize() == 0 and svc.render_queue.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_next_analysis_uses_skip_locked_and_flips_to_scanning():
+    db = FakeDB(row={"id": "demo-1", "stored_path": "/data/demo-1.dm_84"})
+    svc = GreatshotJobService(db=db, storage=None)
+
+    claimed = await svc.claim_next_analysis()
+
+    assert claimed == ("demo-1", Path("/data/demo-1.dm_84"))
+    select, update = db.conn.queries
+    assert "FOR UPDATE SKIP LOCKED" in select and "status = 'uploaded'" in select
+    assert "status = 'scanning'" in update
+    assert "claim_attempts = claim_attempts + 1" in update
+
+
+@pytest.mark.asyncio
+async def test_claim_next_render_returns_none_on_empty_queue():
+    db = FakeDB(row=None)
+    svc = GreatshotJobService(db=db, storage=None)
+
+    assert await svc.claim_next_render() is None
+    assert len(db.conn.queries) == 1  # no UPDATE without a claimed row
+
+
+@pytest.mark.asyncio
+async def test_requeue_expired_claims_passes_leases():
+    db = FakeDB()
+    svc = GreatshotJobService(db=db, storage=None)
+
+    assert await svc.requeue_expired_claims(240, 350) == (0, 0)
+    assert [params for _, params in db.fetch_all_calls] == [
+        (240.0, MAX_CLAIM_ATTEMPTS), (350.0, MAX_CLAIM_ATTEMPTS),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_a_job_that_keeps_killing_its_worker_is_dead_lettered():
+    class _Leases(FakeDB):
+        """One demo whose worker dies on every claim; the sweep applies the CASE."""
+
+        def __init__(self):
+            super().__init__(row={"id": "demo-1", "stored_path": "/x"})
+            self.demo = {"status": "uploaded", "claim_attempts": 0}
+
+        async def fetch_all(self, query, params=None):
+            await super().fetch_all(query, params)
+            if "greatshot_demos" not in query or self.demo["status"] != "scanning":
+                return []
+            failed = self.demo["claim_attempts"] >= params[1]
+            self.demo["status"] = "failed" if failed else "uploaded"
+            return [("demo-1", self.demo["status"])]
+
+    db = _Leases()
+    svc = GreatshotJobService(db=db, storage=None)
+    requeued = []
+    while db.demo["status"] == "uploaded":
+        assert await svc.claim_next_analysis() is not None
+        assert "claim_attempts = claim_attempts + 1" in db.conn.queries[-1]
+        db.demo["claim_attempts"] += 1
+        db.demo["status"] = "scanning"  # ...and the worker process dies
+        requeued.append(await svc.requeue_expired_claims(240, 350))
+
+    assert requeued == [(1, 0)] * (MAX_CLAIM_ATTEMPTS - 1) + [(0, 0)]
+    assert db.demo == {"status": "failed", "claim_attempts": MAX_CLAIM_ATTEMPTS}
+
+
+class FakeService:
+    def __init__(self, analysis_ids):
+        self.analysis_ids = list(analysis_ids)
+        self.ran: list[tuple[int, str]] = []
+        self.maintenance = 0
+
+    async def claim_next_analysis(self):
+        if not self.analysis_ids:
+            return None
+        return self.analysis_ids.pop(0), Path("/x")
+
+    async def run_claimed_analysis(self, worker_id, demo_id, demo_path):
+        self.ran.append((worker_id, demo_id))
+        return True
+
+    async def requeue_expired_claims(self, analysis_lease, render_lease):
+        self.maintenance += 1
+        return 0, 0
+
+    async def queue_depths(self):
+        return {"analysis": {"uploaded": len(self.analysis_ids)}, "render": {}}
+
+
+@pytest.mark.asyncio
+async def test_process_one_claims_and_runs_until_queue_is_empty():
+    service = FakeService(["a", "b"])
+    slot = WorkerSlot("analysis", 3, 0.01, None)
+
+    assert await _process_one(service, slot) is True
+    assert await _process_one(service, slot) is True
+    assert await _process_one(service, slot) is False
+    assert service.ran == [(3, "a"), (3, "b")]
+
+
+@pytest.mark.asyncio
+async def test_run_worker_drains_queue_then_stops():
+    service = FakeService(["a", "b", "c"])
+    stop = asyncio.Event()
+    slot = WorkerSlot("analysis", 0, 0.01, None)
+
+    task = asyncio.create_task(run_worker(service, slot, stop))
+    for _ in range(100):
+        if len(service.ran) == 3:
+            break
+        await asyncio.sleep(0.01)
+    stop.set()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert [demo for _, demo in service.ran] == ["a", "b", "c"]
+    assert service.maintenance >= 1
+
+
+def test_build_slots_gives_each_job_class_its_own_limit_and_port():
+    slots = build_slots(2, 1, poll_seconds=1.0, metrics_port=9310)
+
+    assert [(s.job_class, s.index, s.metrics_port) for s in slots] == [
+        ("analysis", 0, 9310),
+        ("analysis", 1, 9311),
+        ("render", 0, 9312),
+    ]
+    assert build_slots(0, 0, poll_seconds=1.0, metrics_port=None) == []
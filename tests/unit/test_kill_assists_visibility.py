@@ -20,6 +20,9 @@ class _AggDB:
         q = " ".join(query.split())
         if "information_schema.columns" in q and "player_comprehensive_stats" in q:
             return [(col,) for col in self.columns]
+        if "COUNT(*)" in q:
+            # Round fingerprints: every round has rows to read
+            return [(rid, 1, 0) for rid in params]
         self.last_query = query
         self.last_params = params
         return []
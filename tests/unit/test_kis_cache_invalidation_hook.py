@@ -25,6 +25,7 @@ from unittest.mock import patch
 
 import pytest
 
+from bot.services.post_session_pipeline import PostSessionContext
 from bot.services.voice_session_service import VoiceSessionService
 
 
@@ -32,6 +33,13 @@ def _svc():
     return VoiceSessionService.__new__(VoiceSessionService)
 
 
+async def _delete_then_warm(svc, session_date, gsids=None):
+    """The pipeline's run-once `kis_invalidate` stage, then its `kis` warm."""
+    ctx = PostSessionContext(session_date, (session_date,), tuple(gsids or ()))
+    await svc._stage_kis_invalidate(ctx)  # noqa: SLF001
+    return await svc._stage_kis(ctx)  # noqa: SLF001
+
+
 class _FakeAdapter:
     def __init__(self, raise_exc=None, gsid_rows=None):
         self._raise = raise_exc
@@ -178,7 +186,7 @@ async def test_invalidate_deletes_once_then_warms():
         warmed.append(sd)
     svc.warm_kis_cache = _warm  # noqa: SLF001
 
-    await svc._invalidate_kis_cache("2026-07-07")  # noqa: SLF001
+    await _delete_then_warm(svc, "2026-07-07")
 
     assert len(adapter.calls) == 1
     assert adapter.calls[0][1] == (dt.date(2026, 7, 7),)
@@ -191,8 +199,7 @@ async def test_invalidate_never_raises_on_db_failure():
     svc.db_adapter = _FakeAdapter(raise_exc=RuntimeError("db down"))
     svc.warm_kis_cache = lambda sd: _noop()  # noqa: SLF001
 
-    await svc._invalidate_kis_cache("2026-07-07")  # noqa: SLF001
-    # reaching here without an exception IS the assertion
+    assert await svc._invalidate_kis_cache("2026-07-07") is False  # noqa: SLF001
 
 
 async def _noop():
@@ -276,8 +283,15 @@ async def test_warm_skipped_when_secret_unset():
     misleading 'warmed' on a public read-only response (Copilot PR #487)."""
     sess = _Sess(status=200)
     with patch("aiohttp.ClientSession", return_value=sess):
-        await _warm_svc_no_secret().warm_kis_cache("2026-07-07")  # noqa: SLF001
+        skipped = await _warm_svc_no_secret().warm_kis_cache("2026-07-07")  # noqa: SLF001
     assert sess.requested is None  # no HTTP call made
+    # None, not False: a skip is not a failure the pipeline should retry,
+    # nor one that should block the story panels behind it.
+    assert skipped is None
+    svc = _warm_svc_no_secret()
+    with patch("aiohttp.ClientSession", return_value=sess):
+        assert await svc._stage_kis(  # noqa: SLF001
+            PostSessionContext("2026-07-07", ("2026-07-07",), (137,))) is True
 
 
 @pytest.mark.asyncio
@@ -366,7 +380,7 @@ async def test_two_sessions_one_date_warms_by_gsid_and_spares_the_neighbour():
         warmed.append((sd, gaming_session_id))
     svc.warm_kis_cache = _warm  # noqa: SLF001
 
-    await svc._invalidate_kis_cache("2026-03-25", gsids=[137])  # noqa: SLF001
+    await _delete_then_warm(svc, "2026-03-25", [137])
 
     query, params = adapter.calls[0]
     assert "gaming_session_id IN" in query
@@ -391,7 +405,7 @@ async def test_every_resolved_gsid_gets_warmed():
         warmed.append((sd, gaming_session_id))
     svc.warm_kis_cache = _warm  # noqa: SLF001
 
-    await svc._invalidate_kis_cache("2026-03-25", gsids=[137, 138])  # noqa: SLF001
+    await _delete_then_warm(svc, "2026-03-25", [137, 138])
 
     assert warmed == [("2026-03-25", 137), ("2026-03-25", 138)]
 
@@ -408,7 +422,7 @@ async def test_warm_without_gsid_falls_back_to_the_date():
         warmed.append((sd, gaming_session_id))
     svc.warm_kis_cache = _warm  # noqa: SLF001
 
-    await svc._invalidate_kis_cache("2026-03-25", gsids=[])  # noqa: SLF001
+    await _delete_then_warm(svc, "2026-03-25", [])
 
     assert warmed == [("2026-03-25", None)]
 
@@ -440,3 +454,13 @@ async def test_session_gsids_never_raises():
 
     svc.db_adapter = _Raising()
     assert await svc._session_gsids([9001]) == []  # noqa: SLF001
+
+
+def test_a_failed_invalidate_does_not_leave_the_session_pages_cold():
+    """The warm waits for the run-once delete but does not depend on it: a
+    transient delete failure must not block kis, story_panels and session_page."""
+    stages = {s.name: s for s in _svc()._post_session_stages()}  # noqa: SLF001
+
+    assert stages["kis_invalidate"].max_attempts == 1
+    assert stages["kis"].after == ("kis_invalidate",)
+    assert "kis_invalidate" not in stages["kis"].depends_on
@@ -0,0 +1,101 @@
+"""LazyPaginationView page cache, shared in-flight loads and prefetch.
+
+After each press the next page (in the direction of travel) loads in the
+background, so the following flip is answered from the view's cache; a press
+on a page that is still loading joins that fetch instead of starting another,
+and a page that is not ready defers the interaction before fetching.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+
+from bot.core.lazy_pagination_view import LazyPaginationView
+
+
+def _ctx():
+    return SimpleNamespace(author=SimpleNamespace(id=1))
+
+
+def _interaction():
+    return SimpleNamespace(
+        response=SimpleNamespace(edit_message=AsyncMock(), defer=AsyncMock()),
+        edit_original_response=AsyncMock(),
+    )
+
+
+class Fetcher:
+    def __init__(self, delay: float = 0.0):
+        self.calls: list[int] = []
+        self.delay = delay
+
+    async def __call__(self, page_num: int):
+        self.calls.append(page_num)
+        await asyncio.sleep(self.delay)
+        return discord.Embed(title=f"page {page_num}")
+
+
+@pytest.mark.asyncio
+async def test_next_press_prefetches_the_following_page():
+    fetcher = Fetcher()
+    view = LazyPaginationView(_ctx(), fetcher, total_pages=4)
+    await view.get_page(0)
+    view.schedule_prefetch()
+    await asyncio.sleep(0.01)
+    assert fetcher.calls == [0, 1]
+
+    interaction = _interaction()
+    await view.next_button.callback(interaction)
+    # page 1 came from the cache: answered directly, no defer
+    interaction.response.edit_message.assert_awaited_once()
+    assert interaction.response.edit_message.await_args.kwargs["embed"].title == "page 1"
+    interaction.response.defer.assert_not_awaited()
+    await asyncio.sleep(0.01)
+    assert fetcher.calls == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_uncached_page_defers_then_edits_and_prefetch_follows_direction():
+    fetcher = Fetcher()
+    view = LazyPaginationView(_ctx(), fetcher, total_pages=10)
+
+    interaction = _interaction()
+    await view.last_button.callback(interaction)
+
+    interaction.response.defer.assert_awaited_once()
+    assert interaction.edit_original_response.await_args.kwargs["embed"].title == "page 9"
+    await asyncio.sleep(0.01)
+    assert fetcher.calls == [9, 8]  # moving backwards: warm the previous page
+
+
+@pytest.mark.asyncio
+async def test_press_during_prefetch_joins_the_inflight_load():
+    fetcher = Fetcher(delay=0.05)
+    view = LazyPaginationView(_ctx(), fetcher, total_pages=3)
+    view.schedule_prefetch()
+    embeds = await asyncio.gather(view.get_page(1), view.get_page(1))
+
+    assert fetcher.calls == [1]
+    assert embeds[0] is embeds[1]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_lru_bounded_and_failed_prefetch_is_retried():
+    fetcher = Fetcher()
+    view = LazyPaginationView(_ctx(), fetcher, total_pages=30, prefetch=False)
+    view.max_cache_size = 3
+    for page in (0, 1, 2):
+        await view.get_page(page)
+    await view.get_page(0)  # touch: page 1 is now the least recently used
+    await view.get_page(3)
+    assert list(view.page_cache) == [2, 0, 3]
+
+    failing = AsyncMock(side_effect=[RuntimeError("db down"), discord.Embed(title="ok")])
+    view = LazyPaginationView(_ctx(), failing, total_pages=3)
+    view.schedule_prefetch()
+    await asyncio.sleep(0.01)
+    assert (await view.get_page(1)).title == "ok"
@@ -56,6 +56,7 @@ from website.backend.map_geometry.stage_scheduler import (
     SymbolicWaitBranch,
     SymbolicWakeConstraint,
     _async_start_sequence_is_feasible,
+    _InternedScheduleKeys,
     _path_async_lifecycles,
     adapt_symbolic_temporal_frontier,
     search_symbolic_schedule,
@@ -3113,6 +3114,20 @@ def test_s4_bounded_search_runs_one_schedule_to_completion():
     )
 
 
+def test_s4_interned_keys_are_dense_and_stable_per_canonical_state():
+    index, initial, _, _ = _s2_program_index()
+    keys = _InternedScheduleKeys()
+
+    initial_id = keys.intern(initial.canonical_key)
+    step = step_symbolic_schedule(index, initial, decision_limit=8)
+    successor_ids = [keys.intern(decision.state.canonical_key) for decision in step.decisions]
+
+    assert initial_id == 0
+    assert keys.intern(initial.canonical_key) == initial_id
+    assert successor_ids and all(key_id > initial_id for key_id in successor_ids)
+    assert sorted(set(successor_ids)) == list(range(1, 1 + len(set(successor_ids))))
+
+
 def test_s4_global_budget_retains_the_unexpanded_frontier():
     index, initial, _, _ = _s2_program_index()
 
@@ -8,8 +8,9 @@ report. A regression silently:
 - Mis-counts event/error types → operator triage broken.
 - get_summary picks wrong "most common" → wrong rootcause shown.
 
-DB calls are stubbed with AsyncMock so we test the in-memory side
-effects only.
+The batch writer is stubbed with AsyncMock so we test the in-memory side
+effects only; the buffered flush + rollups are covered at the bottom
+against a real tmp SQLite file.
 """
 from __future__ import annotations
 
@@ -22,12 +23,14 @@ from bot.services.automation.metrics_logger import MetricsLogger
 
 
 @pytest.fixture
-def logger_(tmp_path):
+async def logger_(tmp_path):
     """Build a logger with tmp paths so we don't pollute the repo."""
-    return MetricsLogger(
+    m = MetricsLogger(
         db_path=str(tmp_path / "metrics.db"),
         log_dir=str(tmp_path / "logs"),
     )
+    yield m
+    await m.close()
 
 
 # ---------------------------------------------------------------------------
@@ -52,9 +55,9 @@ def test_init_creates_db_dir(tmp_path):
 
 def test_init_starts_with_empty_in_memory_buffers(logger_):
     """Fresh instance has empty events/errors/performance lists."""
-    assert logger_.events == []
-    assert logger_.errors == []
-    assert logger_.performance == []
+    assert list(logger_.events) == []
+    assert list(logger_.errors) == []
+    assert list(logger_.performance) == []
 
 
 def test_init_starts_with_empty_counters(logger_):
@@ -96,7 +99,7 @@ def test_init_falls_back_to_log_dir_default_when_db_path_empty(tmp_path):
 
 @pytest.mark.asyncio
 async def test_log_event_appends_to_memory(logger_):
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         await logger_.log_event("file_processed", {"file": "x.txt"})
     assert len(logger_.events) == 1
     assert logger_.events[0]["type"] == "file_processed"
@@ -105,7 +108,7 @@ async def test_log_event_appends_to_memory(logger_):
 @pytest.mark.asyncio
 async def test_log_event_increments_counter(logger_):
     """event_counts[type] += 1 each call."""
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         await logger_.log_event("ssh_check")
         await logger_.log_event("ssh_check")
         await logger_.log_event("file_processed")
@@ -116,7 +119,7 @@ async def test_log_event_increments_counter(logger_):
 @pytest.mark.asyncio
 async def test_log_event_caps_in_memory_buffer_at_1000(logger_):
     """Pin the 1000-event cap — without it, a 24/7 bot leaks memory."""
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         for _ in range(1500):
             await logger_.log_event("test")
     assert len(logger_.events) == 1000
@@ -125,7 +128,7 @@ async def test_log_event_caps_in_memory_buffer_at_1000(logger_):
 @pytest.mark.asyncio
 async def test_log_event_drops_oldest_when_capping(logger_):
     """When cap hits, OLDEST events drop off (FIFO)."""
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         for i in range(1100):
             await logger_.log_event("test", {"idx": i})
     # First event should be idx=100 (first 100 dropped)
@@ -138,10 +141,13 @@ async def test_log_event_failure_does_not_crash(logger_):
     """DB write fails → exception swallowed (logged only). Pin so a
     full DB doesn't crash the bot's main task loop."""
     with patch.object(
-        logger_, "_execute_write", AsyncMock(side_effect=RuntimeError("disk full"))
+        logger_, "_write_batch", AsyncMock(side_effect=RuntimeError("disk full"))
     ):
         # Should NOT raise
         await logger_.log_event("test")
+        assert await logger_.flush() == 0
+    assert logger_.write_stats["flush_failures"] == 1
+    assert logger_.write_stats["dropped"] == 1
 
 
 # ---------------------------------------------------------------------------
@@ -153,7 +159,7 @@ async def test_log_event_failure_does_not_crash(logger_):
 async def test_log_error_caps_at_500(logger_):
     """Errors capped at 500 in memory (smaller than events — pin the
     half-cap so error storms don't OOM the bot)."""
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         for _ in range(700):
             await logger_.log_error("ssh", "boom")
     assert len(logger_.errors) == 500
@@ -161,7 +167,7 @@ async def test_log_error_caps_at_500(logger_):
 
 @pytest.mark.asyncio
 async def test_log_error_increments_counter(logger_):
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         await logger_.log_error("ssh_connection", "boom")
         await logger_.log_error("ssh_connection", "boom2")
         await logger_.log_error("database", "down")
@@ -173,9 +179,11 @@ async def test_log_error_increments_counter(logger_):
 async def test_log_error_db_failure_does_not_crash(logger_):
     """Same fail-safe contract as log_event."""
     with patch.object(
-        logger_, "_execute_write", AsyncMock(side_effect=RuntimeError("oops"))
+        logger_, "_write_batch", AsyncMock(side_effect=RuntimeError("oops"))
     ):
         await logger_.log_error("test", "msg")  # no raise
+        await logger_.flush()  # no raise
+    assert logger_.write_stats["flush_failures"] == 1
 
 
 # ---------------------------------------------------------------------------
@@ -185,7 +193,7 @@ async def test_log_error_db_failure_does_not_crash(logger_):
 
 @pytest.mark.asyncio
 async def test_log_performance_caps_at_1000(logger_):
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         for i in range(1200):
             await logger_.log_performance("metric", float(i))
     assert len(logger_.performance) == 1000
@@ -193,14 +201,14 @@ async def test_log_performance_caps_at_1000(logger_):
 
 @pytest.mark.asyncio
 async def test_log_performance_default_unit_is_ms(logger_):
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         await logger_.log_performance("ssh_time", 250.0)
     assert logger_.performance[0]["unit"] == "ms"
 
 
 @pytest.mark.asyncio
 async def test_log_performance_custom_unit(logger_):
-    with patch.object(logger_, "_execute_write", AsyncMock()):
+    with patch.object(logger_, "_write_batch", AsyncMock()):
         await logger_.log_performance("file_size", 1024.0, unit="bytes")
     assert logger_.performance[0]["unit"] == "bytes"
 
@@ -297,3 +305,80 @@ def test_summary_uptime_grows_over_time(logger_, monkeypatch):
     assert out["uptime_seconds"] == 120
     # Suppress unused import warning
     _ = real_dt
+
+
+# ---------------------------------------------------------------------------
+# Buffered writes + rollups (real tmp SQLite)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_logging_only_queues_and_flush_writes_one_batch(logger_):
+    """log_* never touches SQLite; one flush writes every queued row in
+    one transaction and folds it into the rollups."""
+    logger_.flush_interval_s = 60  # keep the background flusher out of the way
+    await logger_.log_event("ssh_check", duration_ms=10.0)
+    await logger_.log_event("ssh_check", duration_ms=30.0, success=False)
+    await logger_.log_error("ssh", "timeout")
+    await logger_.log_performance("ssh_time", 5.0)
+    assert logger_._db_connection is None
+    assert logger_.get_summary()["pending_writes"] == 4
+
+    assert await logger_.flush() == 4
+    assert logger_.write_stats["batches"] == 1
+
+    db = logger_._db_connection
+    cursor = await db.execute("SELECT COUNT(*) FROM events")
+    assert (await cursor.fetchone())[0] == 2
+    cursor = await db.execute(
+        "SELECT count, success_count, duration_sum, duration_count FROM event_rollups"
+    )
+    assert await cursor.fetchall() == [(2, 1, 40.0, 2)]
+
+
+@pytest.mark.asyncio
+async def test_report_reads_rollups(logger_):
+    for value in (10.0, 20.0, 60.0):
+        await logger_.log_event("file_processed", duration_ms=value)
+        await logger_.log_performance("download", value)
+    await logger_.log_event("file_processed", success=False)
+    await logger_.log_error("parse", "bad header")
+
+    report = await logger_.generate_report(hours=1)
+
+    assert report["events"]["file_processed"]["count"] == 4
+    assert report["events"]["file_processed"]["success_count"] == 3
+    assert report["events"]["file_processed"]["avg_duration_ms"] == pytest.approx(30.0)
+    assert report["performance"]["download"] == {"avg": 30.0, "min": 10.0, "max": 60.0, "unit": "ms"}
+    assert report["errors"]["parse"]["count"] == 1
+    assert report["summary"]["total_events"] == 4
+
+
+@pytest.mark.asyncio
+async def test_rollups_backfill_from_raw_rows(tmp_path):
+    """A metrics DB written before rollups existed still reports."""
+    db_path = str(tmp_path / "old.db")
+    old = MetricsLogger(db_path=db_path, log_dir=str(tmp_path / "logs"))
+    await old.log_event("ssh_check", duration_ms=4.0)
+    await old.close()
+    db = await old._get_db_connection()
+    await db.execute("DELETE FROM event_rollups")
+    await db.commit()
+    await db.close()
+
+    fresh = MetricsLogger(db_path=db_path, log_dir=str(tmp_path / "logs"))
+    report = await fresh.generate_report(hours=1)
+    await fresh.close()
+    assert report["events"]["ssh_check"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_write_queue_drops_oldest_and_counts(tmp_path):
+    m = MetricsLogger(db_path=str(tmp_path / "m.db"), log_dir=str(tmp_path / "logs"),
+                      flush_interval_ms=60_000, flush_batch_size=1000, max_pending_writes=3)
+    for i in range(5):
+        await m.log_performance("x", float(i))
+    assert m.get_summary()["dropped_writes"] == 2
+    assert [row[2] for _kind, row in m._pending] == [2.0, 3.0, 4.0]
+    await m.close()
+    assert m.write_stats["flushed"] == 3
@@ -2,26 +2,34 @@
 
 Cover the pure geometry (_zone_index — 3D) and the per-round credit rule
 (_accumulate_round — contested + teammate-supported, the §F.1/§F.2 refinements),
-which is where the metric's meaning lives. The DB glue in
+which is where the metric's meaning lives. _accumulate_round is an array
+kernel; TestArrayKernelMatchesLoop holds it equal to the per-sample loop it
+replaced on randomized rounds. The DB glue in
 compute_objective_pressure is exercised by the backtest against real data.
 """
 from __future__ import annotations
 
 import json
+import random
 import sys
 from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+from website.backend.services.artifact_store import artifact_store
 from website.backend.services.objective_pressure_service import (
-    _CACHE,
+    ARTIFACT_KIND,
     BUCKET_MS,
+    SAMPLE_CAP_MS,
     _accumulate_round,
+    _decode_samples,
     _load_zones,
     _zone_index,
+    _zone_membership,
     compute_objective_pressure,
 )
 
@@ -136,19 +144,114 @@ class TestAccumulateRound:
         assert round(pressure["a1"], 2) == 0.6
 
 
+def _accumulate_round_loop(rtracks, zones, pressure):
+    """The per-sample loop the array kernel replaced, kept as the oracle."""
+    presence: dict = defaultdict(lambda: defaultdict(set))
+    marked = []
+    for team, key, samples in rtracks:
+        zis = []
+        for tm, x, y, z in samples:
+            zi = _zone_index(x, y, z, zones)
+            zis.append(zi)
+            if zi >= 0:
+                presence[(tm // BUCKET_MS, zi)][team].add(key)
+        marked.append((team, key, samples, zis))
+    for team, key, samples, zis in marked:
+        for i in range(len(samples) - 1):
+            zi = zis[i]
+            if zi < 0:
+                continue
+            here = presence[(samples[i][0] // BUCKET_MS, zi)]
+            enemy = any(keys for tm2, keys in here.items() if tm2 != team and keys)
+            if not enemy or len(here.get(team, ())) < 2:
+                continue
+            dt = samples[i + 1][0] - samples[i][0]
+            pressure[key] += min(max(dt, 0), SAMPLE_CAP_MS) / 1000.0
+
+
+class TestArrayKernelMatchesLoop:
+    ZONES = [(0.0, 0.0, 0.0, 300.0), (200.0, 0.0, 0.0, 300.0), (2000.0, 0.0, 64.0, 250)]
+
+    @staticmethod
+    def _round(rng):
+        rtracks = []
+        for n in range(10):
+            team = rng.choice(["AXIS", "ALLIES", None])
+            key = f"p{n % 7}"  # some keys own two lives in the round
+            path, t = [], rng.randint(0, 400)
+            for _ in range(rng.randint(0, 60)):
+                cx = rng.choice([0.0, 200.0, 2000.0, 5000.0])
+                path.append({"time": t, "x": cx + rng.uniform(-350, 350),
+                             "y": rng.uniform(-250, 250), "z": rng.choice([0.0, 64.0, 400.0])})
+                if rng.random() < 0.1:
+                    path.append(dict(path[-1], x=cx + 300.0, y=0.0, z=0.0))  # on the surface, same t
+                t += rng.choice([0, 100, 200, 200, 900])
+            if rng.random() < 0.1:
+                path.append({"time": t, "x": 0.0})  # no y: dropped
+            rng.shuffle(path)
+            rtracks.append((team, key, path))
+        return rtracks
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_same_credit_as_the_per_sample_loop(self, seed):
+        rng = random.Random(seed)  # noqa: S311 - synthetic fixtures, not secrets
+        raw = self._round(rng)
+        as_tuples = [
+            (team, key, sorted(
+                (int(s["time"]), float(s["x"]), float(s["y"]), float(s.get("z", 0.0)))
+                for s in path if "time" in s and "x" in s and "y" in s))
+            for team, key, path in raw
+        ]
+        as_arrays = [(team, key, _decode_samples(path)) for team, key, path in raw]
+        for (_, _, want), (_, _, got) in zip(as_tuples, as_arrays, strict=True):
+            assert got.tolist() == [list(map(float, row)) for row in want]
+
+        expected: dict = defaultdict(float)
+        _accumulate_round_loop(as_tuples, self.ZONES, expected)
+        actual: dict = defaultdict(float)
+        _accumulate_round(as_arrays, self.ZONES, actual)
+
+        assert set(actual) == set(expected)
+        assert actual == pytest.approx(expected)
+
+    def test_points_on_the_sphere_surface_match_zone_index(self):
+        rng = random.Random(7)  # noqa: S311 - synthetic fixtures, not secrets
+        points = [(rng.choice([-300.0, 300.0, 500.0, 0.0]), 0.0, rng.choice([0.0, 300.0]))
+                  for _ in range(50)]
+        got = _zone_membership(np.array(points), self.ZONES).tolist()
+        assert got == [_zone_index(*p, self.ZONES) for p in points]
+
+
 class _FakeRow(dict):
     """dict that also supports r["col"] access like an asyncpg Record."""
 
 
 class _FakeDB:
-    """Routes the two compute queries: player_track vs proximity_combat_position."""
+    """Routes the two compute queries: player_track vs proximity_combat_position.
 
-    def __init__(self, tracks, kills):
+    The fingerprint read answers from `fingerprint`; there is no
+    derived_artifacts table, so the store's database tier always misses.
+    """
+
+    def __init__(self, tracks, kills, fingerprint=(3, 30, 2)):
         self._tracks = tracks
         self._kills = kills
+        self.fingerprint = fingerprint
+        self.track_reads = 0
+
+    async def fetch_one(self, query, params=()):
+        if "FROM derived_artifacts" in query:
+            return None
+        return self.fingerprint
 
     async def fetch_all(self, query, params=()):
-        return self._tracks if "FROM player_track" in query else self._kills
+        if "FROM player_track" in query:
+            self.track_reads += 1
+            return self._tracks
+        return self._kills
+
+    async def execute(self, query, params=()):
+        return "INSERT 0 1"
 
 
 def _track(guid, team, name, coord):
@@ -165,7 +268,7 @@ class TestComputeReturnsShortGuids:
         # Two ALLIES (supported) + one AXIS (contesting) on a real 'supply'
         # objective coord so the ALLIES pair earns pressure; verify the emitted
         # GUIDs are the 8-char profile-routable form, not the 32-char one.
-        _CACHE.clear()
+        artifact_store.invalidate(ARTIFACT_KIND)
         zones = _load_zones()["supply"]
         coord = (zones[0][0], zones[0][1], zones[0][2])  # inside the first objective
         g1 = "1C747DF1A037D2AFECCB6ED063DF44E7"
@@ -185,4 +288,22 @@ class TestComputeReturnsShortGuids:
         assert all(len(g) == 8 for g in out["top_fragger_guids"])
         # the 32-char guid is shortened to its 8-char prefix
         assert any(p["guid"] == "1C747DF1" for p in out["players"])
-        _CACHE.clear()
+        artifact_store.invalidate(ARTIFACT_KIND)
+
+    @pytest.mark.asyncio
+    async def test_leaderboard_is_recomputed_only_when_the_fingerprint_moves(self):
+        artifact_store.invalidate(ARTIFACT_KIND)
+        coord = _load_zones()["supply"][0][:3]
+        db = _FakeDB([_track("A" * 32, "ALLIES", "a", coord),
+                      _track("B" * 32, "ALLIES", "b", coord),
+                      _track("C" * 32, "AXIS", "c", coord)], [])
+
+        first = await compute_objective_pressure(db, "2099-01-02", limit=1)
+        full = await compute_objective_pressure(db, "2099-01-02", limit=10)
+        assert db.track_reads == 1
+        assert len(first["players"]) == 1 and len(full["players"]) == 2
+
+        db.fingerprint = (4, 31, 2)  # a late proximity file landed
+        await compute_objective_pressure(db, "2099-01-02")
+        assert db.track_reads == 2
+        artifact_store.invalidate(ARTIFACT_KIND)
@@ -0,0 +1,253 @@
+"""Post-session precompute pipeline (bot/services/post_session_pipeline.py).
+
+Stages run in dependency order with bounded concurrency, a failed stage blocks
+only its dependents, and the ledger lets a restarted bot resume exactly the
+stages that did not finish.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.services.post_session_pipeline import (
+    STATUS_BLOCKED,
+    STATUS_DONE,
+    STATUS_FAILED,
+    PipelineStage,
+    PostSessionContext,
+    PostSessionPipeline,
+    order_stages,
+)
+
+CTX = PostSessionContext("2026-07-07", ("2026-07-07", "2026-07-08"), (137,))
+
+
+class LedgerDB:
+    """In-memory post_session_jobs keyed like the real PRIMARY KEY."""
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str], dict] = {}
+
+    async def fetch_val(self, query, params=None):
+        return True
+
+    async def execute(self, query, params=None):
+        key, stage, status, context, attempts, duration_ms, error = params
+        self.rows[(key, stage)] = {
+            "status": status, "context": context, "attempts": attempts,
+            "duration_ms": duration_ms, "error": error,
+        }
+
+    async def executemany(self, query, params_list):
+        for key, stage, status, context in params_list:
+            self.rows[(key, stage)] = {
+                "status": status, "context": context, "attempts": 0,
+                "duration_ms": None, "error": None,
+            }
+
+    async def fetch_all(self, query, params=None):
+        if "NOT IN" in query:
+            return sorted(
+                (key, stage, r["status"], r["attempts"], r["context"])
+                for (key, stage), r in self.rows.items()
+                if r["status"] not in params[:2]
+            )
+        (key,) = params
+        return [
+            (stage, r["status"], r["attempts"], r["duration_ms"], r["error"])
+            for (k, stage), r in self.rows.items() if k == key
+        ]
+
+
+def _recorder(log, name, result=None, delay=0.0):
+    async def _run(ctx):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return result
+    return _run
+
+
+def test_order_stages_rejects_unknown_dependency_and_cycles():
+    noop = _recorder([], "x")
+    with pytest.raises(ValueError, match="unknown stage"):
+        order_stages([PipelineStage("a", noop, depends_on=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        order_stages([
+            PipelineStage("a", noop, depends_on=("b",)),
+            PipelineStage("b", noop, depends_on=("a",)),
+        ])
+    ordered = order_stages([
+        PipelineStage("story", noop, depends_on=("kis",)),
+        PipelineStage("kis", noop),
+    ])
+    assert [s.name for s in ordered] == ["kis", "story"]
+
+
+@pytest.mark.asyncio
+async def test_dependents_wait_and_independent_stages_overlap():
+    log: list = []
+    db = LedgerDB()
+    pipeline = PostSessionPipeline(db, [
+        PipelineStage("kis", _recorder(log, "kis", delay=0.02)),
+        PipelineStage("graphs", _recorder(log, "graphs", delay=0.02)),
+        PipelineStage("story", _recorder(log, "story"), depends_on=("kis",)),
+    ], max_concurrency=2)
+
+    results = await pipeline.start(CTX)
+
+    assert {r.status for r in results.values()} == {STATUS_DONE}
+    assert log.index(("start", "graphs")) < log.index(("end", "kis"))  # overlapped
+    assert log.index(("end", "kis")) < log.index(("start", "story"))   # waited
+    row = db.rows[("gsid:137", "kis")]
+    assert row["status"] == STATUS_DONE and row["attempts"] == 1
+    assert row["duration_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    running = 0
+    peak = 0
+
+    async def _stage(ctx):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    pipeline = PostSessionPipeline(
+        LedgerDB(), [PipelineStage(f"s{i}", _stage) for i in range(5)], max_concurrency=2)
+    await pipeline.start(CTX)
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_blocks_only_dependents_and_resume_retries_them():
+    log: list = []
+    db = LedgerDB()
+    website_up = False
+
+    async def _kis(ctx):
+        log.append("kis")
+        return website_up
+
+    stages = [
+        PipelineStage("kis", _kis),
+        PipelineStage("s_effort", _recorder(log, "s_effort")),
+        PipelineStage("story", _recorder(log, "story"), depends_on=("kis",)),
+    ]
+    results = await PostSessionPipeline(db, stages).start(CTX)
+
+    assert results["kis"].status == STATUS_FAILED
+    assert results["story"].status == STATUS_BLOCKED
+    assert results["s_effort"].status == STATUS_DONE
+
+    # "restart": a new pipeline over the same ledger re-runs only what is unfinished
+    log.clear()
+    website_up = True
+    assert await PostSessionPipeline(db, stages).resume_pending() == 1
+
+    assert log == ["kis", ("start", "story"), ("end", "story")]
+    assert db.rows[("gsid:137", "kis")]["attempts"] == 2
+    assert {r["status"] for r in db.rows.values()} == {STATUS_DONE}
+    assert await PostSessionPipeline(db, stages).resume_pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_a_run_once_stage_is_never_repeated_and_blocked_rows_are_not_revived():
+    log: list = []
+    db = LedgerDB()
+
+    async def _warm(ctx):
+        log.append("warm")
+        return False
+
+    stages = [
+        PipelineStage("delete", _recorder(log, "delete"), max_attempts=1),
+        PipelineStage("warm", _warm, depends_on=("delete",)),
+        PipelineStage("story", _recorder(log, "story"), depends_on=("warm",)),
+    ]
+    await PostSessionPipeline(db, stages).start(CTX)
+    for _ in range(4):  # restarts: only the warm is retried, and only while it has attempts
+        await PostSessionPipeline(db, stages).resume_pending()
+
+    assert log.count(("start", "delete")) == 1
+    assert log.count("warm") == 3
+    assert db.rows[("gsid:137", "story")]["status"] == STATUS_BLOCKED
+    assert await PostSessionPipeline(db, stages).resume_pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_a_stage_ordered_after_a_failed_one_still_runs():
+    log: list = []
+    db = LedgerDB()
+
+    async def _delete(ctx):
+        log.append("delete")
+        raise ConnectionError("connection reset")
+
+    stages = [
+        PipelineStage("delete", _delete, max_attempts=1),
+        PipelineStage("warm", _recorder(log, "warm"), after=("delete",)),
+        PipelineStage("story", _recorder(log, "story"), depends_on=("warm",)),
+    ]
+    results = await PostSessionPipeline(db, stages).start(CTX)
+
+    assert log == ["delete", ("start", "warm"), ("end", "warm"), ("start", "story"), ("end", "story")]
+    assert results["delete"].status == STATUS_FAILED
+    assert results["warm"].status == results["story"].status == STATUS_DONE
+    assert await PostSessionPipeline(db, stages).resume_pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_a_run_once_stage_interrupted_mid_run_is_not_restarted():
+    log: list = []
+    db = LedgerDB()
+    stages = [PipelineStage("delete", _recorder(log, "delete"), max_attempts=1)]
+    db.rows[("gsid:137", "delete")] = {
+        "status": "running", "context": CTX.to_json(), "attempts": 1,
+        "duration_ms": None, "error": None,
+    }
+
+    assert await PostSessionPipeline(db, stages).resume_pending() == 0
+    results = await PostSessionPipeline(db, stages).run(CTX)
+
+    assert log == []
+    assert results["delete"].status == STATUS_FAILED
+    assert db.rows[("gsid:137", "delete")]["status"] == STATUS_FAILED
+
+
+@pytest.mark.asyncio
+async def test_exception_is_recorded_and_ledger_outage_does_not_stop_stages():
+    async def _boom(ctx):
+        raise RuntimeError("web down")
+
+    class BrokenDB:
+        async def fetch_val(self, *a):
+            raise RuntimeError("db down")
+
+        async def execute(self, *a):
+            raise RuntimeError("db down")
+
+    ran = []
+    pipeline = PostSessionPipeline(BrokenDB(), [
+        PipelineStage("boom", _boom),
+        PipelineStage("ok", lambda ctx: _append(ran, "ok")),
+    ])
+    results = await pipeline.start(CTX)
+
+    assert results["boom"].status == STATUS_FAILED
+    assert "RuntimeError" in results["boom"].error
+    assert results["ok"].status == STATUS_DONE and ran == ["ok"]
+
+
+async def _append(items, value):
+    items.append(value)
+
+
+def test_context_round_trips_through_the_ledger_json():
+    assert PostSessionContext.from_json(CTX.to_json()) == CTX
+    assert PostSessionContext("2026-07-07", ("2026-07-07",)).session_key == "date:2026-07-07"
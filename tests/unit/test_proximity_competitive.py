@@ -6,7 +6,9 @@ detection vs history.
 """
 from __future__ import annotations
 
+import json
 import sys
+from dataclasses import asdict
 from datetime import date
 from pathlib import Path
 from unittest.mock import AsyncMock
@@ -20,6 +22,7 @@ from website.backend.routers.proximity_competitive import (
     get_personal_bests,
     get_wave_cycles,
 )
+from website.backend.services.reinforcement_clock import ClockValidation
 
 A1, A2 = "AXISGUID1" + "0" * 23, "AXISGUID2" + "0" * 23
 B1, B2 = "ALLYGUID1" + "0" * 23, "ALLYGUID2" + "0" * 23
@@ -176,7 +179,10 @@ async def test_first_blood_conversion_math() -> None:
         (2000, 2),  # ALLIES wins -> not converted
         (3000, 1),  # AXIS wins -> fb ALLIES not converted
     ]
-    db.fetch_all = AsyncMock(side_effect=[fb_rows, win_rows])
+    # Each player's name on their latest kill row in scope.
+    name_rows = [(A1, "Aone"), (A2, "Atwo"), (B1, "Bone"), (B2, "Btwo")]
+    # An unlinked row in scope keeps the raw-table path (no stored features).
+    db.fetch_all = AsyncMock(side_effect=[[(None, 1)], fb_rows, win_rows, name_rows])
 
     res = await get_first_blood_conversion(session_date="2026-06-09", db=db)
 
@@ -189,6 +195,7 @@ async def test_first_blood_conversion_math() -> None:
     assert by_guid[A1]["fp_converted"] == 1
     assert by_guid[B1]["first_picks"] == 1
     assert by_guid[B1]["first_deaths"] == 1
+    assert by_guid[B2]["name"] == "Btwo"
 
 
 @pytest.mark.asyncio
@@ -397,7 +404,12 @@ async def test_timeline_fetch_builds_clocks_from_separate_exact_track_query() ->
                 0.5,
             )
         )
-    db.fetch_all = AsyncMock(side_effect=[base_tracks, base_kills, clock_tracks, []])
+    # batched clock inputs: round_id, victim_team, kill_time, interval, ttn,
+    # score, killer guid/name — in fetch_clock_columns' column order
+    timing_rows = [(r[0], r[9], r[5], r[10], r[11], r[14], r[7], r[8]) for r in base_kills]
+    db.fetch_all = AsyncMock(
+        side_effect=[base_tracks, base_kills, [], timing_rows, clock_tracks, []]
+    )
 
     rounds = await _fetch_round_lives_and_kills(
         db,
@@ -408,6 +420,28 @@ async def test_timeline_fetch_builds_clocks_from_separate_exact_track_query() ->
 
     data = rounds[("round_id", 101)]
     assert data["clocks"] == {"ALLIES": (0, 10_000), "AXIS": (0, 10_000)}
-    assert db.fetch_all.await_count == 4
+    assert db.fetch_all.await_count == 6
     assert "path ->" not in db.fetch_all.await_args_list[0].args[0]
-    assert "path ->" in db.fetch_all.await_args_list[2].args[0]
+    assert "round_reinforcement_clocks" in db.fetch_all.await_args_list[2].args[0]
+    assert "path ->" in db.fetch_all.await_args_list[4].args[0]
+    # the reconstructed round is stored for the next request
+    stored = db.executemany.await_args.args[1]
+    assert [row[0] for row in stored] == [101]
+
+
+@pytest.mark.asyncio
+async def test_timeline_fetch_serves_stored_clocks_without_reading_paths() -> None:
+    db = AsyncMock()
+    base_tracks = [(101, date(2026, 7, 1), "supply", 1, 123, A1, "AXIS", 0, 10_000)]
+    stored = ClockValidation("AXIS", "validated", 10_000, 0, 6, 3, 6, 0, 3, 1.0, (0, 0, 0))
+    db.fetch_all = AsyncMock(side_effect=[
+        base_tracks, [], [(101, json.dumps({"AXIS": asdict(stored)}))],
+    ])
+
+    rounds = await _fetch_round_lives_and_kills(
+        db, "WHERE TRUE", [], include_clocks=True,
+    )
+
+    assert rounds[("round_id", 101)]["clocks"] == {"AXIS": (0, 10_000)}
+    assert db.fetch_all.await_count == 3
+    assert not any("path ->" in c.args[0] for c in db.fetch_all.await_args_list)
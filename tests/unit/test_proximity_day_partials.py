@@ -0,0 +1,311 @@
+"""Per-day partials against the raw window queries they replace.
+
+A date-window scope of the dashboard summary and the kill-outcome card must
+answer exactly what the raw query answers for the same rows. `_WindowDB` holds
+synthetic combat_engagement / proximity_kill_outcome / v5 rows over six weeks
+and answers both the raw window queries and the per-day partial queries the
+way Postgres would; with `day_window` patched out the endpoint takes its raw
+path, which is the reference.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from website.backend.routers import proximity_dashboard as dashboard
+from website.backend.services import proximity_day_partials as partials
+from website.backend.services.artifact_store import artifact_store
+
+TODAY = datetime.now(timezone.utc).replace(tzinfo=None).date()
+MAPS = ("supply", "radar", "goldrush")
+V5_TABLES = dashboard._V5_COUNT_TABLES  # noqa: SLF001
+BAD_ROUNDS = {3, 7}  # bot / rejected rounds: gated out
+
+
+class _WindowDB:
+    """Raw proximity rows by table, plus derived_artifacts, queried by shape."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.artifacts: dict[tuple[str, str], tuple[int, str, str]] = {}
+        self.queries: list[tuple[str, tuple]] = []
+
+    def _gated(self, rows):
+        return [r for r in rows if r["round_id"] is None or r["round_id"] not in BAD_ROUNDS]
+
+    def _table(self, q):
+        return next(t for t in self.tables if f"FROM {t} " in q)
+
+    def _raw_scope(self, q, params):
+        rows = self._gated(self.tables[self._table(q)])
+        if "session_date = $1" in q:
+            rows = [r for r in rows if r["session_date"] == params[0]]
+        else:
+            rows = [r for r in rows if r["session_date"] >= params[0]]
+        if "map_name = $2" in q:
+            rows = [r for r in rows if r["map_name"] == params[1]]
+        return rows
+
+    def _day_scope(self, q, params):
+        days = set(params[0]) if "ANY($1::date[])" in q else set()
+        tail = params[-1] if "session_date >= $" in q else None
+        return [r for r in self._gated(self.tables[self._table(q)])
+                if r["session_date"] in days or (tail is not None and r["session_date"] >= tail)]
+
+    def _partial_rows(self, q, rows):
+        groups: dict[tuple, list] = {}
+        outcome_keyed = "map_name, outcome," in q
+        for r in rows:
+            key = (r["session_date"], r["map_name"]) + ((r["outcome"],) if outcome_keyed else ())
+            groups.setdefault(key, []).append(r)
+        result = []
+        for key, group in groups.items():
+            if "FROM combat_engagement" in q:
+                real = [r for r in group if r["killer_guid"] != r["target_guid"]]
+                values = (
+                    len(real),
+                    sum(r["distance_traveled"] for r in real) if real else None,
+                    sum(r["duration_ms"] for r in real) if real else None,
+                    sum(r["num_attackers"] for r in real) if real else None,
+                    sum(r["is_crossfire"] for r in real),
+                    sum(r["outcome"] == "escaped" for r in real),
+                    sum(r["outcome"] == "killed" for r in real),
+                    len({(r["session_date"], r["round_number"], r["round_start_unix"]) for r in group}),
+                )
+            elif "FROM proximity_kill_outcome" in q:
+                values = (len(group), sum(r["delta_ms"] for r in group),
+                          sum(r["effective_denied_ms"] for r in group))
+            else:
+                values = (len(group),)
+            result.append((*key, *values))
+        return result
+
+    async def fetch_all(self, query, params=()):
+        q = " ".join(query.split())
+        self.queries.append((q, tuple(params)))
+        if "FROM derived_artifacts" in q:
+            kind, version, scopes = params[:3]
+            return [(scope, fp, payload) for (k, scope), (v, fp, payload) in self.artifacts.items()
+                    if k == kind and v == version and scope in scopes]
+        if "COUNT(round_id)" in q:
+            first, last = params
+            counts: dict[date, list[int]] = {}
+            for r in self.tables[self._table(q)]:
+                if first <= r["session_date"] <= last:
+                    c = counts.setdefault(r["session_date"], [0, 0])
+                    c[0] += 1
+                    c[1] += r["round_id"] is not None
+            return [(day, *c) for day, c in counts.items()]
+        if "GROUP BY session_date, map_name" in q:
+            return self._partial_rows(q, self._day_scope(q, params))
+        if "FROM proximity_kill_outcome" in q and "GROUP BY outcome" in q:
+            by_outcome: dict[str, list] = {}
+            for r in self._raw_scope(q, params):
+                by_outcome.setdefault(r["outcome"], []).append(r)
+
+            def _round(values):
+                avg = Decimal(sum(values)) / Decimal(len(values))
+                return avg.quantize(Decimal(1), rounding=ROUND_HALF_UP)
+            return sorted(
+                ((o, len(g), _round([r["delta_ms"] for r in g]),
+                  _round([r["effective_denied_ms"] for r in g])) for o, g in by_outcome.items()),
+                key=lambda row: -row[1],
+            )
+        return []  # event listings, duos, names: the same on both paths
+
+    async def fetch_one(self, query, params=()):
+        q = " ".join(query.split())
+        self.queries.append((q, tuple(params)))
+        if "AVG(distance_traveled)" in q:
+            real = [r for r in self._raw_scope(q, params) if r["killer_guid"] != r["target_guid"]]
+            if not real:
+                return (0, None, None, None, None, None, None)
+            n = len(real)
+            return (
+                n,
+                sum(r["distance_traveled"] for r in real) / n,
+                Decimal(sum(r["duration_ms"] for r in real)) / Decimal(n),
+                Decimal(sum(r["num_attackers"] for r in real)) / Decimal(n),
+                sum(r["is_crossfire"] for r in real),
+                sum(r["outcome"] == "escaped" for r in real),
+                sum(r["outcome"] == "killed" for r in real),
+            )
+        return None
+
+    async def fetch_val(self, query, params=()):
+        q = " ".join(query.split())
+        self.queries.append((q, tuple(params)))
+        if "COUNT(DISTINCT (session_date" in q:
+            return len({(r["session_date"], r["round_number"], r["round_start_unix"])
+                        for r in self._raw_scope(q, params)})
+        if q.startswith("SELECT COUNT(*) FROM"):
+            return len(self._raw_scope(q, params))
+        return 0
+
+    async def executemany(self, query, rows):
+        assert "INSERT INTO derived_artifacts" in query
+        for kind, scope, version, fingerprint, payload, _ms in rows:
+            self.artifacts[(kind, scope)] = (version, fingerprint, payload)
+
+    def partial_queries(self):
+        return [(q, p) for q, p in self.queries if "GROUP BY session_date, map_name" in q]
+
+
+def _rows(seed: int) -> dict[str, list[dict]]:
+    rng = random.Random(seed)  # noqa: S311 - synthetic fixtures, not secrets
+    guids = [f"{i:08d}".ljust(32, "0") for i in range(6)]
+    tables: dict[str, list[dict]] = {"combat_engagement": [], "proximity_kill_outcome": []}
+    tables.update({t: [] for t in V5_TABLES})
+    round_id = 0
+    for back in range(45, -2, -1):  # six weeks, and a round dated tomorrow
+        day = TODAY - timedelta(days=back)
+        if back % 5 == 2:
+            continue  # no session that day
+        for map_name in rng.sample(MAPS, 2):
+            for round_number in (1, 2):
+                round_id += 1
+                rid = None if rng.random() < 0.15 else round_id
+                base = {"session_date": day, "map_name": map_name, "round_id": rid,
+                        "round_number": round_number, "round_start_unix": 1_000 * round_id}
+                for _ in range(rng.randint(0, 9)):
+                    killer, target = rng.choice(guids), rng.choice(guids)
+                    tables["combat_engagement"].append({
+                        **base, "killer_guid": killer, "target_guid": target,
+                        "distance_traveled": rng.randint(0, 4000) / 4,
+                        "duration_ms": rng.randint(50, 9000),
+                        "num_attackers": rng.randint(1, 4),
+                        "is_crossfire": rng.random() < 0.3,
+                        "outcome": rng.choice(("escaped", "killed", "unknown")),
+                    })
+                for _ in range(rng.randint(0, 6)):
+                    tables["proximity_kill_outcome"].append({
+                        **base, "outcome": rng.choice(("gibbed", "revived", "tapped_out", "expired")),
+                        "delta_ms": rng.randint(0, 30000),
+                        "effective_denied_ms": rng.randint(0, 30000),
+                    })
+                for table in V5_TABLES:
+                    tables[table].extend(dict(base) for _ in range(rng.randint(0, 3)))
+    return tables
+
+
+@pytest.fixture(autouse=True)
+def _empty_store():
+    artifact_store.invalidate()
+    yield
+    artifact_store.invalidate()
+
+
+async def _both(monkeypatch, endpoint, db, **scope):
+    via_days = await endpoint(db=db, **scope)
+    with monkeypatch.context() as m:
+        m.setattr(dashboard, "day_window", lambda params, scope: None)
+        raw = await endpoint(db=db, **scope)
+    for payload in (via_days, raw):
+        payload.pop("generated_at", None)
+    return via_days, raw
+
+
+SCOPES = [
+    {"range_days": 30},
+    {"range_days": 30, "map_name": "supply"},
+    {"range_days": 7, "map_name": " radar "},
+    {"range_days": 3650},
+    {"session_date": (TODAY - timedelta(days=11)).isoformat()},
+    {"session_date": TODAY.isoformat(), "map_name": "goldrush"},
+]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("scope", SCOPES, ids=lambda s: "-".join(f"{k}={v}" for k, v in s.items()))
+async def test_day_partials_answer_what_the_raw_window_answers(monkeypatch, seed, scope):
+    db = _WindowDB(_rows(seed))
+    for endpoint, extra in ((dashboard.get_proximity_summary, {}),
+                            (dashboard.get_proximity_kill_outcomes, {"player_guid": None})):
+        defaults = {"range_days": 30, "session_date": None, "map_name": None,
+                    "round_number": None, "round_start_unix": None, **extra}
+        for _ in range(2):  # cold, then warm from the store
+            via_days, raw = await _both(monkeypatch, endpoint, db, **{**defaults, **scope})
+            assert via_days == raw
+    assert db.partial_queries()
+
+
+async def test_every_map_filter_reuses_the_closed_days():
+    db = _WindowDB(_rows(4))
+    window = partials.day_window([TODAY - timedelta(days=30)], {})
+
+    await partials.window_totals(db, dashboard._KILL_OUTCOME_DAYS, window)  # noqa: SLF001
+    cold = db.partial_queries()
+    assert len(cold) == 1  # the misses and the open days in one query
+    db.queries.clear()
+    for map_name in MAPS:
+        scoped = partials.DayWindow(window.first_day, None, map_name)
+        await partials.window_totals(db, dashboard._KILL_OUTCOME_DAYS, scoped)  # noqa: SLF001
+
+    warm = db.partial_queries()
+    assert len(warm) == len(MAPS)
+    open_from = TODAY - timedelta(days=partials.OPEN_DAYS - 1)
+    assert all("ANY(" not in q and p == (open_from,) for q, p in warm)
+
+    artifact_store.invalidate()  # a restart: the database tier still has them
+    db.queries.clear()
+    await partials.window_totals(db, dashboard._KILL_OUTCOME_DAYS, window)  # noqa: SLF001
+    assert [p for _, p in db.partial_queries()] == [(open_from,)]
+
+
+async def test_a_closed_day_with_new_rows_is_recomputed_alone():
+    db = _WindowDB(_rows(5))
+    window = partials.day_window([TODAY - timedelta(days=30)], {})
+    await partials.window_totals(db, dashboard._KILL_OUTCOME_DAYS, window)  # noqa: SLF001
+
+    late = TODAY - timedelta(days=9)
+    db.tables["proximity_kill_outcome"].append({
+        "session_date": late, "map_name": "supply", "round_id": None, "round_number": 1,
+        "round_start_unix": 1, "outcome": "gibbed", "delta_ms": 1, "effective_denied_ms": 1,
+    })
+    db.queries.clear()
+    totals = await partials.window_totals(db, dashboard._KILL_OUTCOME_DAYS, window)  # noqa: SLF001
+
+    [(query, params)] = db.partial_queries()
+    assert params[0] == [late]
+    gibbed = [r for r in db._gated(db.tables["proximity_kill_outcome"])  # noqa: SLF001
+              if r["outcome"] == "gibbed" and r["session_date"] >= window.first_day]
+    assert totals[("gibbed",)][0] == len(gibbed)
+    stored = json.loads(db.artifacts[("proximity_day:kill_outcomes", json.dumps(str(late)))][2])
+    supply_gibbed = [r for r in gibbed if r["session_date"] == late and r["map_name"] == "supply"]
+    assert [row[2] for row in stored["value"] if row[:2] == ["supply", "gibbed"]] == [len(supply_gibbed)]
+
+
+async def test_v5_row_counts_are_one_query_per_table():
+    db = _WindowDB(_rows(6))
+    await dashboard.get_proximity_summary(
+        range_days=30, session_date=None, map_name=None,
+        round_number=None, round_start_unix=None, db=db,
+    )
+    for table in V5_TABLES:
+        [query] = [q for q, _ in db.queries if f"FROM {table} " in q]
+        assert query.startswith(f"SELECT COUNT(*) FROM {table} WHERE ")
+
+
+@pytest.mark.parametrize("scope", [
+    {"round_number": 1}, {"round_start_unix": 1_700_000_000}, {"player_guid": "abc"},
+])
+def test_exact_rounds_and_players_keep_the_raw_query(scope):
+    assert partials.day_window([TODAY], {"session_date": None, **scope}) is None
+
+
+def test_fold_sums_per_key_and_keeps_an_empty_sum_empty():
+    days = {
+        date(2026, 1, 1): [["supply", "gibbed", 2, None], ["radar", "gibbed", 1, 5]],
+        date(2026, 1, 2): [["supply", "gibbed", 3, 4], ["supply", "revived", 1, None]],
+    }
+    assert partials.fold_partials(days, None, keys=1) == {
+        ("gibbed",): [6, 9], ("revived",): [1, None],
+    }
+    assert partials.fold_partials(days, "supply", keys=1) == {
+        ("gibbed",): [5, 4], ("revived",): [1, None],
+    }
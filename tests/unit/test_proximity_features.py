@@ -0,0 +1,393 @@
+"""Stored per-round proximity features against the raw-table endpoints.
+
+Each endpoint that aggregates proximity_round_features /
+proximity_player_round_features must answer exactly what its raw-table path
+answers for the same rows. `_ProximityDB` holds one session of synthetic raw
+rows and the two feature tables, and answers each endpoint query the way
+Postgres would for that scope; with the feature tables "missing" the endpoint
+takes its raw path, which is the reference.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import asdict, fields
+from datetime import date
+
+import pytest
+
+from website.backend.routers.proximity_competitive import (
+    get_clutches,
+    get_first_blood_conversion,
+    get_man_advantage,
+)
+from website.backend.routers.proximity_trades import (
+    get_proximity_trades_player_stats,
+    get_proximity_trades_summary,
+)
+from website.backend.services import proximity_features as features
+from website.backend.services.reinforcement_clock import CLOCK_PROTOCOL_VERSION, ClockValidation
+
+SESSION = date(2026, 7, 1)
+PLAYERS = {
+    team: [f"{team[:2]}{i:06d}".ljust(32, "0") for i in range(4)]
+    for team in ("AXIS", "ALLIES")
+}
+TEAM_OF = {guid: team for team, guids in PLAYERS.items() for guid in guids}
+ENEMY = {"AXIS": "ALLIES", "ALLIES": "AXIS"}
+
+
+def _name(guid: str) -> str:
+    return f"^3{guid[:8].lower()}"
+
+
+def _killer_name(kill: dict) -> str:
+    return kill.get("killer_name", _name(kill["killer"]))
+
+
+def _victim_name(kill: dict) -> str:
+    return kill.get("victim_name", _name(kill["victim"]))
+
+
+class _ProximityDB:
+    """One session's raw proximity rows plus the feature tables, queried by shape."""
+
+    def __init__(self):
+        self.tracks: list[tuple] = []   # round_id, date, map, round, rsu, guid, team, spawn, death
+        self.kills: list[dict] = []
+        self.trades: list[dict] = []
+        self.winners: list[tuple] = []  # round_start_unix, winner_team
+        self.clocks: dict[int, str] = {}
+        self.round_rows: dict[int, tuple] = {}
+        self.player_rows: dict[tuple, tuple] = {}
+        self.features_missing = False
+        self.fail_writes_to: str | None = None
+        self.queries: list[str] = []
+
+    def _features(self, q):
+        if self.features_missing and "round_features" in q:
+            raise RuntimeError('relation "proximity_round_features" does not exist')
+
+    async def fetch_all(self, query, params=()):
+        q = " ".join(query.split())
+        self.queries.append(q)
+        self._features(q)
+        if "COUNT(*) FROM (" in q:
+            ids = [t[0] for t in self.tracks] + [k["meta"][0] for k in self.kills] \
+                + [t["meta"][0] for t in self.trades]
+            return list(Counter(ids).items())
+        if "FROM proximity_player_round_features p" in q:
+            ids, version = params
+            rows = [r for key, r in self.player_rows.items()
+                    if key[0] in ids and r[2] == version
+                    and self.round_rows.get(key[0], (None, None))[1] == version]
+            return sorted(rows, key=lambda r: (self.round_rows[r[0]][3], r[0], r[1]))
+        if "source_rows, round_start_unix, winner_team FROM proximity_round_features" in q:
+            ids, version = params
+            return [(rid, r[2], r[3], r[8]) for rid, r in self.round_rows.items()
+                    if rid in ids and r[1] == version]
+        if "FROM proximity_round_features" in q:
+            ids, version = params
+            rows = [r for rid, r in self.round_rows.items() if rid in ids and r[1] == version]
+            return sorted(rows, key=lambda r: (r[3], r[0]))
+        if "round_reinforcement_clocks" in q:
+            ids, version = params
+            assert version == CLOCK_PROTOCOL_VERSION
+            return [(rid, self.clocks[rid]) for rid in ids if rid in self.clocks]
+        if "FROM rounds WHERE round_start_unix = ANY" in q:
+            return [w for w in self.winners if w[0] in params[0]]
+        if "FROM player_track" in q:
+            if "round_id = ANY" in q:
+                return [(t[0], *t[4:]) for t in self.tracks if t[0] in params[0]]
+            return list(self.tracks)
+        if "DISTINCT ON (round_start_unix)" in q:
+            first: dict[int, dict] = {}
+            for k in sorted(self.kills, key=lambda k: k["time"]):
+                rsu = k["meta"][4]
+                if rsu > 0 and k["killer"] != k["victim"]:
+                    first.setdefault(rsu, k)
+            return [(rsu, k["killer"], _killer_name(k), TEAM_OF[k["killer"]],
+                     k["victim"], _victim_name(k), k["time"])
+                    for rsu, k in sorted(first.items())]
+        if "DISTINCT ON (guid)" in q:
+            latest: dict[str, tuple] = {}
+            for k in self.kills:
+                if k["killer"] == k["victim"]:
+                    continue
+                order = (k["meta"][4], k["meta"][0], k["time"])
+                for guid, name in ((k["killer"], _killer_name(k)), (k["victim"], _victim_name(k))):
+                    if name and order >= latest.get(guid, ((), None))[0]:
+                        latest[guid] = (order, name)
+            return [(guid, name) for guid, (_, name) in latest.items()]
+        if "FROM proximity_spawn_timing" in q and "enemy_spawn_interval" in q:
+            return [(*k["meta"], k["time"], TEAM_OF[k["killer"]], k["killer"], _killer_name(k),
+                     TEAM_OF[k["victim"]], 30_000, 15_000, k["victim"], _victim_name(k), 0.5)
+                    for k in self.kills]
+        if "FROM proximity_spawn_timing WHERE round_id = ANY" in q:
+            return [(k["meta"][0], k["meta"][4], k["time"], TEAM_OF[k["killer"]], k["killer"],
+                     _killer_name(k), TEAM_OF[k["victim"]], k["victim"], _victim_name(k))
+                    for k in self.kills if k["meta"][0] in params[0]]
+        if "jsonb_array_elements" in q:
+            groups: dict[tuple, list] = {}
+            for t in self.trades:
+                for s in t["successes"]:
+                    g = groups.setdefault((s["guid"], s["name"]), [0, set(), 0])
+                    g[0] += 1
+                    g[1].add(t["id"])
+                    g[2] += s["damage"] or 0
+            return [(guid, name, n, len(ev), dmg) for (guid, name), (n, ev, dmg) in groups.items()]
+        if "GROUP BY victim_guid, victim_name" in q:
+            groups = {}
+            for t in self.trades:
+                g = groups.setdefault((t["victim"], _name(t["victim"])), [0, 0, 0, 0, 0])
+                for i, v in enumerate(t["counts"]):
+                    g[i] += v
+                g[4] += 1 if t["isolated"] else 0
+            return [(*key, *vals) for key, vals in groups.items()]
+        if "FROM proximity_trade_event WHERE round_id = ANY" in q:
+            return [(t["meta"][0], t["meta"][4], t["id"], t["victim"], _name(t["victim"]), *t["counts"],
+                     t["isolated"], json.dumps(t["successes"]))
+                    for t in sorted(self.trades, key=lambda t: t["id"])
+                    if t["meta"][0] in params[0]]
+        raise AssertionError(f"unexpected query: {q}")
+
+    async def fetch_one(self, query, params=()):
+        q = " ".join(query.split())
+        self.queries.append(q)
+        if "SELECT COUNT(*) AS events" in q:
+            if not self.trades:
+                return (0, None, None, None, None, None)
+            sums = [sum(t["counts"][i] for t in self.trades) for i in range(4)]
+            return (len(self.trades), *sums, sum(1 for t in self.trades if t["isolated"]))
+        if "FROM proximity_support_summary" in q:
+            return (None, None)
+        raise AssertionError(f"unexpected query: {q}")
+
+    @asynccontextmanager
+    async def transaction(self):
+        snapshot = dict(self.round_rows), dict(self.player_rows)
+        try:
+            yield self
+        except BaseException:
+            self.round_rows, self.player_rows = snapshot
+            raise
+
+    async def execute(self, query, params=()):
+        self._features(query)
+        ids = params[0]
+        if "DELETE FROM proximity_player_round_features" in query:
+            self.player_rows = {k: v for k, v in self.player_rows.items() if k[0] not in ids}
+
+    async def executemany(self, query, rows):
+        self._features(query)
+        assert "ON CONFLICT" in query
+        if self.fail_writes_to and self.fail_writes_to in query:
+            raise RuntimeError("connection reset")
+        for row in rows:
+            if "INTO proximity_player_round_features" in query:
+                self.player_rows[(row[0], row[1])] = tuple(row)
+            elif "INTO proximity_round_features" in query:
+                self.round_rows[row[0]] = tuple(row)
+
+
+def _landing(t: int, offset: int, interval: int) -> int:
+    return -((-(t + offset)) // interval) * interval - offset
+
+
+def _session(seed: int, n_rounds: int = 8) -> _ProximityDB:
+    """Wave-structured rounds: lives, kills (some self-kills), trades, winners, clocks."""
+    rng = random.Random(seed)  # noqa: S311 - synthetic fixtures, not secrets
+    db = _ProximityDB()
+    trade_id = 0
+    for n in range(n_rounds):
+        round_id = 500 + n
+        # The round_start_unix 0 round is the oldest, so raw and stored agree on round order.
+        meta = (round_id, SESSION, "supply", n % 2 + 1, 0 if n == 0 else 1_780_000_000 + n * 1_000)
+        clocks = {team: (rng.randrange(interval), interval)
+                  for team, interval in (("AXIS", 30_000), ("ALLIES", 20_000))}
+        deaths = []
+        for guid, team in TEAM_OF.items():
+            offset, interval = clocks[team]
+            t = rng.randrange(0, 3_000)
+            while True:
+                death = t + rng.randrange(3_000, 60_000)
+                if death >= 240_000 or rng.random() < 0.05:
+                    db.tracks.append((*meta, guid, team, t, None))
+                    break
+                db.tracks.append((*meta, guid, team, t, death))
+                deaths.append((death, guid))
+                t = _landing(death + 1, offset, interval)
+        for death, victim in deaths:
+            killer = victim if rng.random() < 0.05 else rng.choice(PLAYERS[ENEMY[TEAM_OF[victim]]])
+            db.kills.append({"meta": meta, "time": death, "killer": killer, "victim": victim})
+            if rng.random() < 0.4:
+                trade_id += 1
+                mates = [g for g in PLAYERS[TEAM_OF[victim]] if g != victim]
+                db.trades.append({
+                    "meta": meta, "id": trade_id, "victim": victim,
+                    "counts": [rng.randrange(4), rng.randrange(3), rng.randrange(2), rng.randrange(2)],
+                    "isolated": rng.random() < 0.3,
+                    "successes": [
+                        {"guid": g, "name": _name(g), "damage": rng.choice((None, 40, 95))}
+                        for g in rng.sample(mates, rng.randrange(0, 3))
+                    ],
+                })
+        if n % 4 != 2:
+            db.winners.append((meta[4], rng.choice((1, 2))))
+        db.clocks[round_id] = json.dumps({} if n == 5 else {  # round 505: no usable clock
+            team: asdict(ClockValidation(team, "validated", interval, offset, 6, 3, 6, 0, 3, 1.0, ()))
+            for team, (offset, interval) in clocks.items()
+        })
+    return db
+
+
+def _by_guid(value):
+    """Player lists compared as guid-keyed maps: tie order is not part of the contract.
+
+    The response timestamp is dropped as well.
+    """
+    if isinstance(value, list) and value and all(isinstance(v, dict) and "guid" in v for v in value):
+        return {v["guid"]: _by_guid(v) for v in value}
+    if isinstance(value, dict):
+        return {k: _by_guid(v) for k, v in value.items() if k != "generated_at"}
+    return value
+
+
+_ENDPOINTS = {
+    "first-blood": get_first_blood_conversion,
+    "man-advantage": get_man_advantage,
+    "clutch": get_clutches,
+    "trades-summary": get_proximity_trades_summary,
+    "trades-player-stats": get_proximity_trades_player_stats,
+}
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("endpoint", list(_ENDPOINTS))
+async def test_stored_features_answer_like_the_raw_tables(endpoint, seed):
+    handler = _ENDPOINTS[endpoint]
+    db = _session(seed)
+
+    db.features_missing = True
+    raw = await handler(session_date=SESSION.isoformat(), db=db)
+    db.features_missing = False
+    computed = await handler(session_date=SESSION.isoformat(), db=db)
+    db.queries.clear()
+    served = await handler(session_date=SESSION.isoformat(), db=db)
+
+    assert raw.get("status") == "ok"
+    assert _by_guid(computed) == _by_guid(raw)
+    assert _by_guid(served) == _by_guid(raw)
+    assert len(db.round_rows) == 8
+    # served from the stored rows: no raw row is read again
+    assert not any("round_id = ANY" in q and "FROM player_track" in q for q in db.queries)
+    assert not any("enemy_spawn_interval" in q or "DISTINCT ON" in q for q in db.queries)
+
+
+async def test_the_fixtures_exercise_every_feature():
+    col = [f.name for f in fields(features.PlayerRoundFeatures)].index
+    stored, unarmed_clutches = [], 0
+    for seed in range(4):  # the seeds the parity test runs
+        db = _session(seed)
+        await get_man_advantage(session_date=SESSION.isoformat(), db=db)
+        stored += db.player_rows.values()
+        killers = {(k["meta"][0], k["killer"]) for k in db.kills if k["killer"] != k["victim"]}
+        unarmed_clutches += sum(1 for row in db.player_rows.values()
+                                if row[col("clutch_situations")] and (row[0], row[1]) not in killers)
+
+    for column in ("first_pick_converted", "isolation_deaths", "avenger_damage",
+                   "advantage_conversions", "clutch_wins"):
+        assert any(row[col(column)] for row in stored), column
+    assert any(row[col("clutch_situations")] > row[col("clutch_wins")] for row in stored)
+    # A clutch survivor without a kill of their own in the round.
+    assert unarmed_clutches
+
+
+async def test_unlinked_rows_keep_the_raw_path():
+    db = _session(1)
+    db.tracks.append((None, SESSION, "supply", 1, 0, PLAYERS["AXIS"][0], "AXIS", 0, None))
+
+    assert await features.scoped_feature_round_ids(db, "WHERE TRUE", []) is None
+    await get_clutches(session_date=SESSION.isoformat(), db=db)
+    assert db.round_rows == {}
+
+
+async def test_a_changed_round_is_recomputed_alone():
+    db = _session(2)
+    await get_first_blood_conversion(session_date=SESSION.isoformat(), db=db)
+    first = min(db.kills, key=lambda k: k["time"] if k["meta"][0] == 503 else 10**9)
+    # A re-import lands an earlier kill in round 503: a new first blood.
+    killer = PLAYERS[ENEMY[TEAM_OF[first["killer"]]]][0]
+    db.kills.append({"meta": first["meta"], "time": first["time"] - 1,
+                     "killer": killer, "victim": first["killer"]})
+    db.queries.clear()
+
+    served = await get_first_blood_conversion(session_date=SESSION.isoformat(), db=db)
+    db.features_missing = True
+    raw = await get_first_blood_conversion(session_date=SESSION.isoformat(), db=db)
+
+    assert _by_guid(served) == _by_guid(raw)
+    recomputed = [q for q in db.queries if "FROM player_track WHERE round_id = ANY" in q]
+    assert len(recomputed) == 1
+    assert db.round_rows[503][2] == sum(1 for t in db.tracks if t[0] == 503) \
+        + sum(1 for k in db.kills if k["meta"][0] == 503) \
+        + sum(1 for t in db.trades if t["meta"][0] == 503)
+
+
+async def test_a_changed_winner_is_recomputed_without_a_proximity_change():
+    db = _session(3)
+    await get_first_blood_conversion(session_date=SESSION.isoformat(), db=db)
+    decided = next(w for w in db.winners if w[0] == 1_780_001_000)
+    # A backfill marks round 501 invalid: no proximity row changes.
+    db.winners.remove(decided)
+    db.queries.clear()
+
+    served = await get_first_blood_conversion(session_date=SESSION.isoformat(), db=db)
+    db.features_missing = True
+    raw = await get_first_blood_conversion(session_date=SESSION.isoformat(), db=db)
+
+    assert _by_guid(served) == _by_guid(raw)
+    recomputed = [q for q in db.queries if "FROM player_track WHERE round_id = ANY" in q]
+    assert len(recomputed) == 1
+    assert db.round_rows[501][8] is None
+
+
+async def test_a_failed_store_leaves_the_previous_rows_whole():
+    db = _session(1)
+    await get_clutches(session_date=SESSION.isoformat(), db=db)
+    rounds, players = dict(db.round_rows), dict(db.player_rows)
+    inputs = await features.fetch_round_inputs(db, [503])
+    db.fail_writes_to = "INTO proximity_round_features"
+
+    stored = await features.store_round_features(
+        db, [features.compute_round_features(inputs[503])],
+    )
+
+    assert stored == 0
+    assert db.round_rows == rounds
+    assert db.player_rows == players
+
+
+@pytest.mark.parametrize("endpoint", ["first-blood", "man-advantage", "clutch"])
+async def test_a_renamed_player_is_named_alike_on_both_paths(endpoint):
+    handler = _ENDPOINTS[endpoint]
+    db = _session(0)
+    # The player renames every minute, so the first-blood row, the round's
+    # last kill and the scope's last kill all carry different names; the
+    # latest kill row's name is the one both paths show.
+    for kill in db.kills:
+        alias = f"^1alias{kill['meta'][0]}.{kill['time'] // 60_000}"
+        if kill["killer"] == PLAYERS["AXIS"][0]:
+            kill["killer_name"] = alias
+        if kill["victim"] == PLAYERS["AXIS"][0]:
+            kill["victim_name"] = alias
+
+    db.features_missing = True
+    raw = await handler(session_date=SESSION.isoformat(), db=db)
+    db.features_missing = False
+    served = await handler(session_date=SESSION.isoformat(), db=db)
+
+    assert _by_guid(served) == _by_guid(raw)
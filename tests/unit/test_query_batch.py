@@ -0,0 +1,118 @@
+"""``db.fetch_many`` / ``db.batch()`` multi-query reads.
+
+Snapshot mode runs every read on one connection inside one READ ONLY
+REPEATABLE READ transaction; parallel mode fans out with a concurrency cap.
+Either way results come back typed and in input order.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from bot.core.database_adapter import PostgreSQLAdapter
+from bot.core.query_batch import BatchQuery
+
+
+class FakeConn:
+    def __init__(self, log):
+        self.log = log
+
+    async def fetch(self, query, *args):
+        self.log.append(("fetch", query, args))
+        await asyncio.sleep(0.01)
+        return [(query, args)]
+
+    async def fetchrow(self, query, *args):
+        self.log.append(("fetchrow", query, args))
+        return (1, 2)
+
+    async def fetchval(self, query, *args):
+        self.log.append(("fetchval", query, args))
+        return 42
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        self.log.append(("BEGIN", tuple(sorted(kwargs.items())), None))
+        yield
+        self.log.append(("COMMIT", None, None))
+
+
+class FakePool:
+    def __init__(self):
+        self.log: list = []
+        self.acquired = 0
+        self.in_use = 0
+        self.peak = 0
+
+    async def acquire(self):
+        self.acquired += 1
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return FakeConn(self.log)
+
+    async def release(self, conn):
+        self.in_use -= 1
+
+
+def _adapter():
+    adapter = PostgreSQLAdapter("localhost", 5432, "db", "u", "p")
+    adapter.pool = FakePool()
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_snapshot_mode_uses_one_connection_and_one_read_only_transaction():
+    adapter = _adapter()
+
+    rounds, row, count = await adapter.fetch_many([
+        ("SELECT * FROM rounds WHERE id = ?", (1,)),
+        BatchQuery("SELECT a, b FROM t", kind="one"),
+        BatchQuery("SELECT COUNT(*) FROM t WHERE x = ?", (5,), kind="val"),
+    ])
+
+    assert rounds == [("SELECT * FROM rounds WHERE id = $1", (1,))]
+    assert row == (1, 2) and count == 42
+    assert adapter.pool.acquired == 1
+    log = adapter.pool.log
+    assert log[0] == ("BEGIN", (("isolation", "repeatable_read"), ("readonly", True)), None)
+    assert log[-1][0] == "COMMIT"
+    assert adapter.profiler.snapshot()["queries"] == 3
+
+
+@pytest.mark.asyncio
+async def test_parallel_mode_fans_out_with_a_cap_and_keeps_order():
+    adapter = _adapter()
+    queries = [(f"SELECT {i} FROM t", None) for i in range(6)]
+
+    results = await adapter.fetch_many(queries, mode="parallel", concurrency=2)
+
+    assert [r[0][0] for r in results] == [f"SELECT {i} FROM t" for i in range(6)]
+    assert adapter.pool.acquired == 6
+    assert adapter.pool.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_inside_a_transaction_the_batch_reuses_its_connection():
+    adapter = _adapter()
+    async with adapter.transaction():
+        await adapter.fetch_many([("SELECT 1", None), ("SELECT 2", None)], mode="parallel")
+
+    assert adapter.pool.acquired == 1
+    begins = [entry for entry in adapter.pool.log if entry[0] == "BEGIN"]
+    assert len(begins) == 1  # the outer transaction only; no nested read-only one
+
+
+@pytest.mark.asyncio
+async def test_batch_builder_and_validation():
+    adapter = _adapter()
+    batch = adapter.batch()
+    batch.fetch_all("SELECT * FROM t WHERE id = ?", 3).fetch_val("SELECT 1")
+
+    assert await batch.run() == [[("SELECT * FROM t WHERE id = $1", (3,))], 42]
+    assert await adapter.fetch_many([]) == []
+    with pytest.raises(ValueError, match="kind"):
+        BatchQuery("SELECT 1", kind="many")
+    with pytest.raises(ValueError, match="mode"):
+        await adapter.fetch_many(["SELECT 1"], mode="pipelined")
@@ -0,0 +1,136 @@
+"""Read-through query cache behind ``fetch_*(..., cache_ttl=...)``.
+
+Opted-in reads are served from memory until the TTL runs out or the import
+path bumps the data version; concurrent misses share one query; reads inside
+a transaction and calls without ``cache_ttl`` always hit the database.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from bot.core.database_adapter import PostgreSQLAdapter
+from bot.core.query_cache import QueryCache
+
+
+class FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetch(self, query, *args):
+        self.pool.queries.append((query, args))
+        await asyncio.sleep(0.01)
+        return [(len(self.pool.queries),)]
+
+    async def fetchrow(self, query, *args):
+        self.pool.queries.append((query, args))
+        return None
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        yield
+
+
+class FakePool:
+    def __init__(self):
+        self.queries: list = []
+
+    async def acquire(self):
+        return FakeConn(self)
+
+    async def release(self, conn):
+        pass
+
+
+def _adapter():
+    adapter = PostgreSQLAdapter("localhost", 5432, "db", "u", "p")
+    adapter.pool = FakePool()
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_opted_in_reads_are_cached_until_the_data_version_bumps():
+    adapter = _adapter()
+    query = "SELECT kills FROM player_comprehensive_stats WHERE round_id = ?"
+
+    first = await adapter.fetch_all(query, (1,), cache_ttl=60)
+    first.append("caller mutation")
+    assert await adapter.fetch_all(query, (1,), cache_ttl=60) == [(1,)]
+    assert await adapter.fetch_all(query, (2,), cache_ttl=60) == [(2,)]
+    assert len(adapter.pool.queries) == 2
+
+    adapter.bump_data_version("imported round")
+    assert await adapter.fetch_all(query, (1,), cache_ttl=60) == [(3,)]
+    stats = adapter.query_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3 and stats["data_version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_query():
+    adapter = _adapter()
+    results = await asyncio.gather(*[
+        adapter.fetch_all("SELECT 1 FROM rounds", cache_ttl=30) for _ in range(5)
+    ])
+
+    assert results == [[(1,)]] * 5
+    assert len(adapter.pool.queries) == 1
+    assert adapter.query_cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_none_results_are_cached_and_uncached_calls_bypass():
+    adapter = _adapter()
+    assert await adapter.fetch_one("SELECT * FROM t WHERE id = ?", (9,), cache_ttl=30) is None
+    assert await adapter.fetch_one("SELECT * FROM t WHERE id = ?", (9,), cache_ttl=30) is None
+    await adapter.fetch_one("SELECT * FROM t WHERE id = ?", (9,))
+    assert len(adapter.pool.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_inside_a_transaction_skip_the_cache():
+    adapter = _adapter()
+    async with adapter.transaction():
+        await adapter.fetch_all("SELECT 1", cache_ttl=30)
+        await adapter.fetch_all("SELECT 1", cache_ttl=30)
+    assert len(adapter.pool.queries) == 2
+    assert adapter.query_cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_lru_bound_and_failed_loads():
+    cache = QueryCache(max_entries=2)
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        return value
+
+    await cache.get_or_load(("a",), 0, lambda: load("a"))
+    await cache.get_or_load(("a",), 0, lambda: load("a"))  # ttl 0: expired at once
+    assert calls == ["a", "a"]
+
+    for key in ("x", "y", "z"):
+        await cache.get_or_load((key,), 60, lambda key=key: load(key))
+    assert cache.stats()["entries"] == 2
+    assert cache.get(("x",)) == (False, None)
+
+    async def boom():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load(("b",), 60, boom)
+    assert await cache.get_or_load(("b",), 60, lambda: load("b")) == "b"
+
+
+@pytest.mark.asyncio
+async def test_result_loaded_across_a_bump_is_not_stored():
+    cache = QueryCache()
+
+    async def load_during_import():
+        cache.bump("import committed mid-query")
+        return "stale"
+
+    assert await cache.get_or_load(("k",), 60, load_during_import) == "stale"
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,178 @@
+"""Per-fingerprint query profiler (bot/core/query_profiler.py).
+
+Every adapter call is grouped by normalized query shape, memory stays bounded
+however many distinct statements arrive, and the Prometheus label set is
+capped so a new query shape can never explode cardinality.
+"""
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from bot.core.database_adapter import PostgreSQLAdapter
+from bot.core.query_profiler import (
+    OVERFLOW_FINGERPRINT,
+    QueryProfiler,
+    is_read_only,
+    normalize_query,
+)
+
+
+def test_normalize_query_collapses_literals_placeholders_and_in_lists():
+    a = normalize_query("SELECT * FROM rounds WHERE id = 42 AND map = 'supply' -- note")
+    b = normalize_query("select  * FROM rounds\n WHERE id = $1 AND map = ?")
+    assert a == "SELECT * FROM rounds WHERE id = ? AND map = ?"
+    assert b.lower() == a.lower()
+    assert normalize_query("SELECT 1 FROM t WHERE x IN (?, ?, ?)") == \
+        normalize_query("SELECT 1 FROM t WHERE x IN ($1,$2)")
+    # identifiers with digits survive
+    assert "round_v2" in normalize_query("SELECT col1 FROM round_v2")
+
+
+def test_read_only_detection_guards_explain_analyze():
+    assert is_read_only("SELECT a FROM t WHERE b = ?")
+    assert is_read_only("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not is_read_only("WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x")
+    assert not is_read_only("SELECT * FROM t FOR UPDATE")
+    assert not is_read_only("UPDATE t SET a = ?")
+
+
+def test_record_aggregates_latency_rows_and_errors_per_fingerprint():
+    profiler = QueryProfiler()
+    for ms in range(1, 101):
+        profiler.record("fetch_all", f"SELECT * FROM rounds WHERE id = {ms}", ms / 1000,
+                        rows=2, pool_wait_s=0.001)
+    profiler.record("fetch_all", "SELECT * FROM rounds WHERE id = 7", 0.5, error=True)
+
+    (row,) = profiler.top(5)
+    assert row["count"] == 101 and row["errors"] == 1
+    assert row["rows"] == 200
+    assert row["p50_ms"] == 51.0 and row["p95_ms"] == 96.0
+    assert row["max_ms"] == 500.0
+    assert row["pool_wait_ms"] == pytest.approx(100.0)
+    assert row["ops"] == {"fetch_all": 101}
+
+
+def test_memory_and_metric_labels_are_bounded():
+    labels = []
+    profiler = QueryProfiler(max_fingerprints=10, metric_fingerprints=3,
+                             samples_per_fingerprint=8)
+    profiler.add_observer(lambda label, op, *_: labels.append(label))
+
+    for i in range(50):
+        for _ in range(20):
+            profiler.record("fetch_one", f"SELECT c{i} FROM t WHERE id = ?", 0.001)
+
+    snapshot = profiler.snapshot(limit=100)
+    assert snapshot["fingerprints"] == 11  # 10 + one "other"
+    assert snapshot["queries"] == 1000
+    other = next(r for r in snapshot["top"] if r["fingerprint"] == OVERFLOW_FINGERPRINT)
+    assert other["count"] == 40 * 20
+    assert all(len(s.samples) <= 8 for s in profiler._stats.values())
+    assert len(set(labels)) == 4  # three fingerprint labels + "other"
+
+
+def test_explain_sample_keeps_slowest_read_only_execution():
+    profiler = QueryProfiler(explain_min_ms=10)
+    profiler.record("fetch_all", "SELECT * FROM t WHERE a = $1", 0.005, params=(1,))
+    profiler.record("fetch_all", "SELECT * FROM t WHERE a = $1", 0.050, params=(2,))
+    profiler.record("fetch_all", "SELECT * FROM t WHERE a = $1", 0.020, params=(3,))
+    profiler.record("execute", "UPDATE t SET a = $1", 0.500, params=(4,))
+
+    (candidate,) = profiler.explain_candidates(5)
+    assert candidate.slow_sample[:2] == ("SELECT * FROM t WHERE a = $1", (2,))
+
+
+class FakeConn:
+    def __init__(self):
+        self.calls: list[tuple[str, tuple]] = []
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        if "boom" in query:
+            raise RuntimeError("boom")
+        return [(1,), (2,), (3,)]
+
+    async def execute(self, query, *args):
+        self.calls.append((query, args))
+        return "UPDATE 4"
+
+    async def fetchval(self, query, *args):
+        self.calls.append((query, args))
+        return json.dumps([{"Plan": {"Node Type": "Seq Scan"}, "Execution Time": 1.5}])
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        self.calls.append(("BEGIN", tuple(sorted(kwargs.items()))))
+        yield
+
+
+class _Acquire:
+    """Like asyncpg's PoolAcquireContext: awaitable and an async context."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __await__(self):
+        yield from []
+        return self.conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return _Acquire(self.conn)
+
+    async def release(self, conn):
+        pass
+
+
+def _adapter(conn, **profiler_kwargs):
+    adapter = PostgreSQLAdapter("localhost", 5432, "db", "u", "p")
+    adapter.profiler = QueryProfiler(**profiler_kwargs)
+    adapter.pool = FakePool(conn)
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_adapter_records_every_op_with_rows_and_errors():
+    adapter = _adapter(FakeConn())
+
+    await adapter.fetch_all("SELECT a FROM t WHERE b = ?", (1,))
+    await adapter.execute("UPDATE t SET a = ? WHERE b = ?", (1, 2))
+    with pytest.raises(RuntimeError):
+        await adapter.fetch_all("SELECT boom FROM t")
+
+    rows = {r["statement"]: r for r in adapter.profiler.top(10)}
+    assert rows["SELECT a FROM t WHERE b = ?"]["rows"] == 3
+    assert rows["UPDATE t SET a = ? WHERE b = ?"]["rows"] == 4
+    assert rows["SELECT boom FROM t"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_capture_query_plans_runs_read_only_explain_with_sample_params():
+    conn = FakeConn()
+    adapter = _adapter(conn, explain_min_ms=0.0001, explain_interval_s=3600)
+    await adapter.fetch_all("SELECT a FROM t WHERE b = ?", (9,))
+    # the first sample is explained automatically in the background
+    for task in list(adapter._plan_tasks):
+        await task
+    assert adapter.profiler.top(1)[0]["has_plan"] is True
+
+    plans = await adapter.capture_query_plans(limit=3)
+
+    assert ("BEGIN", (("readonly", True),)) in conn.calls
+    explain = [c for c in conn.calls if c[0].startswith("EXPLAIN")][-1]
+    assert explain == ("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT a FROM t WHERE b = $1", (9,))
+    assert plans[0]["plan"]["Plan"]["Node Type"] == "Seq Scan"
+    assert adapter.profiler.plans()[0]["fingerprint"] == plans[0]["fingerprint"]
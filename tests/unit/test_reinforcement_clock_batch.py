@@ -0,0 +1,180 @@
+"""The columnar clock engine, and the per-round store behind it.
+
+`reconstruct_round_clocks` restates `validate_round_clocks` over NumPy columns;
+the randomised rounds below are built to hit every rule the scalar protocol
+has — overlapping lives, non-death terminals, team changes, revive gaps,
+duplicate players in one wave, unusable timing rows, odd team names — and the
+two must agree verdict for verdict.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from website.backend.services import reinforcement_clock_batch as batch
+from website.backend.services.reinforcement_clock import (
+    CLOCK_PROTOCOL_VERSION,
+    PlayerLife,
+    ReviveObservation,
+    TimingObservation,
+    validate_round_clocks,
+)
+from website.backend.services.reinforcement_clock_batch import (
+    ClockColumns,
+    reconstruct_round_clocks,
+)
+
+_DEATHS = ("killed", "killed", "killed", "selfkill", "fallen", "teamkill", "world",
+           "disconnect", "shutdown", "round_end", None)
+
+
+def _round(rng: random.Random):
+    """One synthetic round: wave-structured spawns plus the edge cases."""
+    timings, lives, revives = [], [], []
+    row_id = 0
+    for team in ("AXIS", "ALLIES"):
+        interval = rng.choice((10_000, 20_000, 30_000))
+        offset = rng.randrange(interval)
+        landings = [w * interval - offset for w in range(1, 12) if w * interval - offset > 0]
+        for _ in range(rng.randrange(0, 6)):
+            kill = rng.randrange(0, 300_000)
+            ttn = interval - ((offset + kill) % interval)
+            mangle = rng.random()
+            if mangle < 0.05:
+                ttn = None
+            elif mangle < 0.08:
+                ttn = interval + 1
+            elif mangle < 0.12:
+                kill = -kill - 1
+            timings.append(TimingObservation(
+                team if rng.random() > 0.03 else rng.choice(("SPECTATOR", "")),
+                kill, interval if rng.random() > 0.04 else interval // 2, ttn,
+                rng.choice((0.5, 0.8, None, 0.0)) if rng.random() < 0.2 else 0.5,
+            ))
+        for p in range(rng.randrange(1, 7)):
+            guid = f"G{team[0]}{p}" if rng.random() > 0.05 else "GSHARED"
+            t = rng.randrange(0, 5_000)
+            for _ in range(rng.randrange(1, 8)):
+                death = t + rng.randrange(1_000, 40_000)
+                row_id += 1
+                lives.append(PlayerLife(
+                    row_id, guid,
+                    team if rng.random() > 0.05 else rng.choice(("AXIS", "ALLIES", "")),
+                    t, death if rng.random() > 0.03 else None, rng.choice(_DEATHS),
+                ))
+                if rng.random() < 0.2:
+                    revives.append(ReviveObservation(guid, death + rng.randrange(0, 4_000)))
+                later = [w for w in landings if w > death]
+                if not later:
+                    break
+                t = later[0] + rng.randrange(-300, 300)
+                if rng.random() < 0.04:
+                    t = death - rng.randrange(1, 500)      # overlapping lives
+    return timings, lives, revives
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_columnar_reconstruction_equals_the_scalar_protocol(seed):
+    rng = random.Random(seed)  # noqa: S311 - synthetic fixtures, not secrets
+    rounds = {round_id: _round(rng) for round_id in range(1, 31)}
+
+    batched = reconstruct_round_clocks(ClockColumns.from_rounds(rounds))
+
+    assert batched == {
+        round_id: validate_round_clocks(timings, lives, revives)
+        for round_id, (timings, lives, revives) in rounds.items()
+    }
+
+
+def test_the_fixtures_reach_every_verdict():
+    rng = random.Random(0)  # noqa: S311 - synthetic fixtures, not secrets
+    rounds = {round_id: _round(rng) for round_id in range(1, 121)}
+    statuses = {
+        verdict.status
+        for clocks in reconstruct_round_clocks(ClockColumns.from_rounds(rounds)).values()
+        for verdict in clocks.values()
+    }
+    assert statuses == {"validated", "validation_failed", "inconsistent", "insufficient",
+                        "internally_consistent_unvalidated"}
+
+
+def test_rounds_without_timing_rows_map_to_no_teams():
+    lives = [PlayerLife(1, "G", "AXIS", 0, 900, "killed")]
+    cols = ClockColumns.from_rounds({7: ([], lives, []), 8: ([], [], [])})
+
+    assert reconstruct_round_clocks(cols) == {7: {}}
+    assert reconstruct_round_clocks(ClockColumns.from_rows([], [], [])) == {}
+
+
+class _ClockTable:
+    """round_reinforcement_clocks as a dict, matched like the WHERE."""
+
+    def __init__(self, *, fail=False):
+        self.rows: dict[int, tuple[str, str]] = {}
+        self.fail = fail
+
+    async def executemany(self, query, rows):
+        if self.fail:
+            raise RuntimeError('relation "round_reinforcement_clocks" does not exist')
+        for round_id, version, clocks in rows:
+            self.rows[round_id] = (version, clocks)
+
+    async def fetch_all(self, query, params=()):
+        if self.fail:
+            raise RuntimeError('relation "round_reinforcement_clocks" does not exist')
+        ids, version = params
+        return [(rid, self.rows[rid][1]) for rid in ids
+                if rid in self.rows and self.rows[rid][0] == version]
+
+
+async def test_stored_clocks_round_trip():
+    rng = random.Random(3)  # noqa: S311 - synthetic fixtures, not secrets
+    rounds = {round_id: _round(rng) for round_id in range(1, 9)}
+    clocks = reconstruct_round_clocks(ClockColumns.from_rounds(rounds))
+    db = _ClockTable()
+
+    assert await batch.store_round_clocks(db, clocks) == len(clocks)
+    assert await batch.load_stored_round_clocks(db, clocks) == clocks
+    assert all(json.loads(v[1]) is not None for v in db.rows.values())
+
+
+async def test_another_protocol_version_is_a_miss():
+    db = _ClockTable()
+    db.rows[5] = ("reinforcement-clock-v0", json.dumps({}))
+    db.rows[6] = (CLOCK_PROTOCOL_VERSION, json.dumps({}))
+
+    assert await batch.load_stored_round_clocks(db, [5, 6]) == {6: {}}
+
+
+async def test_a_missing_table_degrades_to_computing():
+    db = _ClockTable(fail=True)
+
+    assert await batch.store_round_clocks(db, {1: {}}) == 0
+    assert await batch.load_stored_round_clocks(db, [1]) == {}
+
+
+async def test_round_clock_validations_computes_once_then_reads(monkeypatch):
+    db = _ClockTable()
+    calls = {"n": 0}
+    observations = [TimingObservation("AXIS", t, 30_000, 30_000 - ((6_000 + t) % 30_000), 0.5)
+                    for t in (1_000, 9_000, 21_000)]
+
+    async def fake_timings(_db, _round_id):
+        calls["n"] += 1
+        return observations
+
+    async def fake_lives(_db, _round_id):
+        return [], [], 0
+
+    monkeypatch.setattr(batch, "fetch_timing_observations", fake_timings)
+    monkeypatch.setattr(batch, "fetch_clock_lives_and_revives", fake_lives)
+
+    first = await batch.round_clock_validations(db, 42)
+    second = await batch.round_clock_validations(db, 42)
+
+    assert first == second == validate_round_clocks(observations, [], [])
+    assert first["AXIS"].status == "internally_consistent_unvalidated"
+    assert calls["n"] == 1
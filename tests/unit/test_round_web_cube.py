@@ -0,0 +1,127 @@
+"""The whole-round cube must answer exactly what build_snapshot answers.
+
+build_snapshot is the reference; these tests hold RoundCube.snapshot equal to
+it tick by tick on synthetic rounds that hit every life rule, gap reason and
+velocity refusal — including the paths the cube routes back to the scalar
+functions (times that go backwards).
+"""
+from __future__ import annotations
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from website.backend.services.round_web_cube import build_round_cube
+from website.backend.services.round_web_service import (
+    build_snapshot,
+    nearest_teammate_separation,
+)
+
+
+def _path(rng, start, end, *, shuffle=False):
+    samples, t, x, y = [], start, rng.uniform(-500, 500), rng.uniform(-500, 500)
+    while t <= end:
+        x += rng.uniform(-60, 60)
+        y += rng.uniform(-60, 60)
+        sample = {"time": t, "x": x, "y": y, "z": rng.choice([0.0, 12.5, 40.0]),
+                  "health": rng.randint(1, 100), "weapon": 8, "stance": 0,
+                  "speed": rng.choice([None, 0, 150.0, 300.0])}
+        roll = rng.random()
+        if roll < 0.05:
+            sample["z"] = None
+        elif roll < 0.08:
+            del sample["y"]
+        elif roll < 0.1:
+            sample["x"] += 900.0  # a teleport: over the sanity cap
+        samples.append(sample)
+        if rng.random() < 0.15:
+            samples.append(dict(sample, x=x + 1.0))  # duplicate timestamp
+        t += rng.choice([200, 200, 200, 400, 1500])
+    if shuffle and len(samples) > 3:
+        samples[1], samples[2] = samples[2], samples[1]
+    return samples
+
+
+def _round(seed):
+    rng = random.Random(seed)  # noqa: S311 - synthetic fixtures, not secrets
+    tracks = {}
+    next_id = 1
+    for n in range(8):
+        guid = f"G{n}"
+        lives, t = [], rng.randint(0, 3000)
+        for _ in range(rng.randint(1, 4)):
+            death = t + rng.randint(2000, 20000)
+            spawn = t - rng.choice([0, 0, 0, 1500])  # some lives overlap
+            path = _path(rng, spawn + rng.choice([0, 0, 700]), death,
+                         shuffle=rng.random() < 0.2)
+            last = rng.random() < 0.15
+            lives.append((
+                guid, f"^1p{n}", rng.choice(["AXIS", "ALLIES", None]), "medic",
+                spawn, None if last else death,
+                json.dumps(path) if rng.random() < 0.5 else path,
+                "supply", None if rng.random() < 0.05 else next_id,
+            ))
+            next_id += 1
+            if last:
+                break
+            t = death + rng.randint(0, 4000)
+        tracks[guid] = lives
+    tracks["G_empty"] = []
+    return tracks
+
+
+def _assert_same(ref, got):
+    assert got.t_ms == ref.t_ms
+    assert got.gaps == ref.gaps
+    assert got.overlap_conflicts == ref.overlap_conflicts
+    assert list(got.players) == list(ref.players)
+    for guid, want in ref.players.items():
+        have = got.players[guid]
+        for attr in ("name", "team", "player_class", "x", "y", "z", "health", "weapon",
+                     "stance", "speed", "alive", "track_id", "stale_ms",
+                     "overlap_conflict", "velocity_stale_ms", "velocity_reason"):
+            assert getattr(have, attr) == getattr(want, attr), (guid, attr)
+        for attr in ("vx", "vy", "vz"):
+            assert getattr(have, attr) == pytest.approx(getattr(want, attr)), (guid, attr)
+    assert [(e.a_guid, e.b_guid, e.kind, e.recently_contested) for e in got.edges] == [
+        (e.a_guid, e.b_guid, e.kind, e.recently_contested) for e in ref.edges
+    ]
+    assert [e.distance for e in got.edges] == pytest.approx([e.distance for e in ref.edges])
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize(("max_stale_ms", "velocity_max_dt_ms"), [(None, None), (600, 500)])
+def test_cube_snapshots_match_build_snapshot(seed, max_stale_ms, velocity_max_dt_ms):
+    tracks = _round(seed)
+    engagements = [(4000, 9000, "G1", json.dumps([{"first_hit_ms": 5000}]))]
+    grid = list(range(0, 40_000, 250))
+    cube = build_round_cube(tracks, grid, velocity_max_dt_ms=velocity_max_dt_ms)
+
+    for t_ms in grid:
+        ref = build_snapshot(tracks, t_ms, engagements=engagements,
+                             max_stale_ms=max_stale_ms,
+                             velocity_max_dt_ms=velocity_max_dt_ms)
+        got = cube.snapshot(t_ms, engagements=engagements, max_stale_ms=max_stale_ms)
+        _assert_same(ref, got)
+        separation = cube.nearest_teammate_separation(t_ms, max_stale_ms=max_stale_ms)
+        expected = nearest_teammate_separation(ref)
+        assert list(separation) == list(expected)
+        assert separation == pytest.approx(expected)
+
+
+def test_cube_exposes_whole_grid_arrays():
+    path = [{"time": 0, "x": 0.0, "y": 0.0, "z": 0.0, "speed": 100.0},
+            {"time": 200, "x": 20.0, "y": 0.0, "z": 0.0, "speed": 100.0}]
+    tracks = {"A": [("A", "a", "AXIS", None, 0, 1000, path, "supply", 1)]}
+    cube = build_round_cube(tracks, [1500, 100, 300, 300])
+
+    assert cube.t_grid.tolist() == [100, 300, 1500]
+    assert cube.alive[:, 0].tolist() == [True, True, False]
+    assert cube.stale_ms[:, 0].tolist() == [100, 100, 1300]  # dead: against t
+    assert cube.vx[:, 0].tolist()[1] == pytest.approx(100.0)
+    assert np.isnan(cube.vx[2, 0]) and cube.velocity_reason[2, 0] == "not_alive"
+    assert cube.velocity_reason[0, 0] == "no_causal_predecessor"
+    with pytest.raises(KeyError):
+        cube.snapshot(200)
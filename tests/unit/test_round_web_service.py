@@ -483,14 +483,24 @@ class TestCapturePolicyWithSeveralManifests:
 
 
 class _ClockStubDb:
-    """Answers `fetch_timing_observations`, then tracks, then revives."""
+    """Answers `fetch_timing_observations`, then tracks, then revives.
+
+    The stored-clock table (migration 083) is always empty here, so every
+    call computes; what it writes back is kept in `stored`.
+    """
 
     def __init__(self, timing, tracks=(), revives=()):
         self._queue = [list(timing), list(tracks), list(revives)]
+        self.stored: list[tuple] = []
 
-    async def fetch_all(self, _sql, _params=None):
+    async def fetch_all(self, sql, _params=None):
+        if "round_reinforcement_clocks" in sql:
+            return []
         return self._queue.pop(0) if self._queue else []
 
+    async def executemany(self, _sql, rows):
+        self.stored.extend(rows)
+
 
 #: Fixtures are written in terms of LANDINGS, the thing that physically
 #: happens, and the offset is derived from them — never the other way round.
@@ -558,6 +568,8 @@ class TestLoadRoundClock:
         # 12 s past a landing on a 20 s wheel: 8 s until the next one.
         assert axis["phase_ms"] == 12_000
         assert axis["time_to_next_wave_ms"] == 8_000
+        # computed once, then stored for the next snapshot of this round
+        assert [row[0] for row in db.stored] == [1]
 
     @pytest.mark.asyncio
     async def test_a_team_without_observations_is_unavailable_not_absent(self):
@@ -48,7 +48,7 @@ class _Sess:
     async def __aexit__(self, *a):
         return False
 
-    def get(self, url, headers=None):
+    def get(self, url, params=None, headers=None):
         self.requested = url
         self.headers = headers
         if self._raise:
@@ -84,8 +84,9 @@ async def test_persist_skipped_when_secret_unset():
     (Copilot PR #487 review)."""
     sess = _Sess(status=200)
     with patch("aiohttp.ClientSession", return_value=sess):
-        await _svc_no_secret()._persist_s_effort("2026-07-07")  # noqa: SLF001
+        skipped = await _svc_no_secret()._persist_s_effort("2026-07-07")  # noqa: SLF001
     assert sess.requested is None  # no HTTP call made
+    assert skipped is None  # a skip, so the session_page stage is not blocked
 
 
 @pytest.mark.asyncio
@@ -156,11 +157,11 @@ def _fakes(save_ok=True, order=None):
 
 
 async def _run_finalize(svc):
-    import asyncio
     await svc._finalize_session_results()  # noqa: SLF001
-    # the persist + KIS-invalidate calls run as background tasks — let them
-    # get scheduled and complete (both are a single fast DB call, no delay).
-    await asyncio.sleep(0)
+    # the persist + KIS-invalidate calls run as post-session pipeline stages
+    # in a background task — wait for it, with the website faked as up.
+    with patch("aiohttp.ClientSession", return_value=_Sess(status=200)):
+        await svc._post_session_task  # noqa: SLF001
 
 
 @pytest.mark.asyncio
@@ -31,6 +31,9 @@ class _FakeSessionDetailDB:
             return self._player_rows
         return []
 
+    async def fetch_many(self, queries, **_kwargs):
+        return [await self.fetch_all(query, params) for query, params in queries]
+
 
 @pytest.mark.asyncio
 async def test_session_detail_returns_dual_alive_pct_fields(monkeypatch):
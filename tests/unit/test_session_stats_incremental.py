@@ -0,0 +1,117 @@
+"""Incremental per-player session totals in SessionStatsAggregator.
+
+Each round's per-player sums are fetched once and cached as a fragment,
+shared by every aggregator in the process and keyed on the round's row
+counts; the session view merges fragments, so a new round costs one
+single-round query no matter how long the session already is.
+"""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from bot.services import session_stats_aggregator as agg_mod
+from bot.services.session_stats_aggregator import SessionStatsAggregator, merge_round_fragments
+
+
+def _row(name, guid, kills, seconds, damage, time_dead=0.0, round_id=None):
+    # 25 columns like aggregate_all_player_stats: name, guid, kills, deaths,
+    # weighted_dpm, hits, shots, hs, hsk, total_seconds, time_dead, denied,
+    # gibs, revives, times_revived, dmg_received, dmg_given, useful, 2x..mega,
+    # self_kills, full_selfkills, kill_assists
+    row = [name, guid, kills, 1, -1.0, 10, 20, 2, 1, seconds, time_dead, 0,
+           1, 0, 0, 50, damage, 1, 0, 0, 0, 0, 0, 0, 0, 2]
+    return (*row, round_id) if round_id is not None else tuple(row)
+
+
+class FragmentDB:
+    """Answers the fingerprint count and the per-round player query."""
+
+    def __init__(self, rows_by_round):
+        self.rows_by_round = rows_by_round
+        self.params: list[tuple] = []
+
+    async def fetch_all(self, query, params=None):
+        if "information_schema.columns" in query:
+            return [("kill_assists",), ("full_selfkills",)]
+        if "COUNT(*)" in query:
+            return [(rid, len(self.rows_by_round[rid]), 0)
+                    for rid in params if self.rows_by_round.get(rid)]
+        self.params.append(params)
+        return [row for rid in params for row in self.rows_by_round.get(rid, [])]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_fragments():
+    agg_mod.invalidate_round_fragments()
+    yield
+    agg_mod.invalidate_round_fragments()
+
+
+def test_merge_matches_single_group_by_totals():
+    merged = merge_round_fragments([
+        [_row("alice", "A", 10, 600, 3000, time_dead=30.4), _row("bob", "B", 4, 600, 1200)],
+        [_row("alice", "A", 5, 300, 1500, time_dead=30.4), _row("carl", "C", None, 0, None)],
+    ])
+
+    alice, bob, carl = (dict(zip(("name", "guid", "kills"), r[:3], strict=True)) | {"row": r}
+                        for r in sorted(merged, key=lambda r: r[1]))
+    assert [r[1] for r in merged] == ["C", "A", "B"]  # NULL kills first, then kills DESC
+    assert alice["kills"] == 15 and alice["row"][9] == 900 and alice["row"][16] == 4500
+    assert alice["row"][4] == pytest.approx(4500 * 60.0 / 900)
+    assert alice["row"][10] == 61  # 60.8 rounded once, after the merge
+    assert alice["row"][-1] == 4  # kill_assists summed
+    assert bob["row"][4] == pytest.approx(120.0)
+    assert carl["row"][4] == 0  # no playtime → 0 DPM, like the SQL CASE
+
+
+@pytest.mark.asyncio
+async def test_only_new_rounds_are_queried_across_aggregator_instances():
+    db = FragmentDB({
+        1: [_row("alice", "A", 10, 600, 3000, round_id=1)],
+        2: [_row("alice", "A", 5, 600, 3000, round_id=2)],
+        3: [_row("alice", "A", 1, 600, 3000, round_id=3), _row("bob", "B", 7, 600, 600, round_id=3)],
+    })
+
+    # The routers build an aggregator per request; the fragments are shared.
+    first = await SessionStatsAggregator(db).aggregate_all_player_stats([1, 2], "?,?")
+    assert first[0][2] == 15
+    later = await SessionStatsAggregator(db).aggregate_all_player_stats([1, 2, 3], "?,?,?")
+
+    assert db.params == [(1, 2), (3,)]
+    assert {r[1]: r[2] for r in later} == {"A": 16, "B": 7}
+
+
+@pytest.mark.asyncio
+async def test_partly_imported_round_is_reread_when_its_rows_change():
+    db = FragmentDB({})
+    service = SessionStatsAggregator(db)
+
+    assert await service.aggregate_all_player_stats([5], "?") == []
+    db.rows_by_round[5] = [_row("alice", "A", 3, 60, 60, round_id=5)]
+    assert (await service.aggregate_all_player_stats([5], "?"))[0][2] == 3
+    # The import is still running: a second player lands.
+    db.rows_by_round[5].append(_row("bob", "B", 4, 60, 60, round_id=5))
+    assert {r[1] for r in await service.aggregate_all_player_stats([5], "?")} == {"A", "B"}
+    await service.aggregate_all_player_stats([5], "?")
+
+    assert db.params == [(5,), (5,)]
+
+
+@pytest.mark.asyncio
+async def test_fragments_expire_and_import_invalidates_them(monkeypatch):
+    db = FragmentDB({5: [_row("alice", "A", 3, 60, 60, round_id=5)]})
+    service = SessionStatsAggregator(db)
+    await service.aggregate_all_player_stats([5], "?")
+
+    agg_mod.invalidate_round_fragments(5)  # what the import path calls
+    await service.aggregate_all_player_stats([5], "?")
+    await service.aggregate_all_player_stats([5], "?")
+    assert db.params == [(5,), (5,)]
+
+    later = time.monotonic() + agg_mod.ROUND_FRAGMENT_TTL_SECONDS + 1
+    monkeypatch.setattr(agg_mod.time, "monotonic", lambda: later)
+    await service.aggregate_all_player_stats([5], "?")  # expired: re-read once
+    await service.aggregate_all_player_stats([5], "?")
+    assert db.params == [(5,), (5,), (5,)]
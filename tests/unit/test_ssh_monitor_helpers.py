@@ -24,6 +24,7 @@ from unittest.mock import MagicMock
 import discord
 import pytest
 
+from bot.services.automation.file_discovery import FileDiscoveryService
 from bot.services.automation.ssh_monitor import SSHMonitor
 
 
@@ -313,6 +314,31 @@ def test_sanitize_accepts_at_255_boundary():
     assert SSHMonitor._sanitize_stats_filename(f) == f
 
 
+# ---------------------------------------------------------------------------
+# _next_check_delay — shared discovery cadence
+# ---------------------------------------------------------------------------
+
+
+async def _no_listing():
+    return []
+
+
+@pytest.mark.parametrize(("push", "expected"), [(True, 600), (False, 180), (None, 180)])
+def test_next_check_delay_backs_off_while_push_is_healthy(push, expected):
+    """The SSH poller follows the same cadence as endstats_monitor: a healthy
+    push slows it to idle. A bot without push health (None) polls as before."""
+    bot = _make_bot()
+    bot.file_discovery = FileDiscoveryService(_no_listing)
+    bot.push_healthy = None if push is None else (lambda: push)
+    m = SSHMonitor(bot)
+    assert m._next_check_delay(3) == expected  # noqa: SLF001 - the cadence hook
+
+
+def test_next_check_delay_without_discovery_uses_fixed_interval(monitor):
+    monitor.bot.file_discovery = None
+    assert monitor._next_check_delay(3) == 60  # noqa: SLF001 - the cadence hook
+
+
 # ---------------------------------------------------------------------------
 # get_stats — admin status payload
 # ---------------------------------------------------------------------------
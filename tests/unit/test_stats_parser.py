@@ -13,7 +13,15 @@ from pathlib import Path
 
 import pytest
 
-from bot.community_stats_parser import C0RNP0RN3StatsParser, _parse_side_fields
+from bot.community_stats_parser import (
+    ADDITIONAL_FIELD_COUNT,
+    EXTENDED_FIELDS,
+    C0RNP0RN3StatsParser,
+    _copy_nested,
+    _parse_side_fields,
+    _round_1_candidates,
+    convert_extended_fields,
+)
 
 
 class TestStatsParserBasics:
@@ -517,6 +525,65 @@ class TestWeaponStatsParsing:
             assert len(parser.weapon_emojis[weapon]) > 0, f"Empty emoji for {weapon}"
 
 
+class TestExtendedFieldSchema:
+    """The compiled TAB schema and the helpers on the R2 differential path"""
+
+    def test_well_formed_fields_follow_the_schema_types(self):
+        raw = [("1.5" if cast is float else "7") for _, cast in EXTENDED_FIELDS]
+
+        values = convert_extended_fields(raw)
+
+        assert [type(v) for v in values] == [cast for _, cast in EXTENDED_FIELDS]
+        assert values[8] == 1.5 and values[0] == 7
+
+    def test_short_and_malformed_fields_read_as_zero(self):
+        values = convert_extended_fields(["100", "oops", "3"])
+
+        assert len(values) == len(EXTENDED_FIELDS)
+        assert values[:3] == [100, 0, 3]
+        assert values[ADDITIONAL_FIELD_COUNT - 1] == 0.0
+        assert isinstance(values[ADDITIONAL_FIELD_COUNT - 1], float)
+
+    def test_player_line_maps_tab_fields_by_name(self):
+        parser = C0RNP0RN3StatsParser()
+        tab = [str(i) for i in range(len(EXTENDED_FIELDS))]
+        # WS_KNIFE only: hits shots kills deaths headshots
+        line = "GUID1234\\^1Player\\0\\1\\1 4 9 2 1 0\t" + "\t".join(tab)
+
+        player = parser.parse_player_line(line)
+
+        assert player["weapon_stats"]["WS_KNIFE"]["kills"] == 2
+        assert list(player["objective_stats"]) == [name for name, _ in EXTENDED_FIELDS]
+        assert player["objective_stats"]["revives_given"] == 37
+        assert player["objective_stats"]["dpm"] == 21.0
+        assert player["damage_given"] == 0 and player["damage_received"] == 1
+
+    def test_round_1_candidates_match_the_glob_pattern(self):
+        names = [
+            "2025-12-17-120000-goldrush-round-1.txt",
+            "2025-12-17-130000-goldrush-round-2.txt",
+            "2025-12-17-140000-te_escape2-round-1.txt",
+            "2025-12-16-120000-goldrush-round-1.txt",
+            "2025-12-17--goldrush-round-1.txt",
+        ]
+
+        found = _round_1_candidates("/stats", names, "2025-12-17", "goldrush")
+
+        assert found == [
+            "/stats/2025-12-17-120000-goldrush-round-1.txt",
+            "/stats/2025-12-17--goldrush-round-1.txt",
+        ]
+
+    def test_copy_nested_shares_no_containers(self):
+        original = {"players": [{"name": "a", "weapon_stats": {"WS_MP40": {"kills": 1}}}]}
+
+        copied = _copy_nested(original)
+        copied["players"][0]["weapon_stats"]["WS_MP40"]["kills"] = 9
+
+        assert copied != original
+        assert original["players"][0]["weapon_stats"]["WS_MP40"]["kills"] == 1
+
+
 @pytest.mark.integration
 class TestParserIntegrationWithRealFiles:
     """Integration tests using real stats file structure"""
@@ -0,0 +1,156 @@
+"""Stored per-map-pair stopwatch outcomes (migration 081).
+
+A complete map pair is scored once into stopwatch_map_outcomes; later calls
+fold the stored outcome and only redo the R1 sides query and the roster
+attribution. A changed round (fingerprint mismatch) is rescored, a corrected
+side applies without a rescore, and rebuild_map_outcomes rescores the whole
+history in one pass.
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from bot.services import stopwatch_scoring_service as sw
+from bot.services.stopwatch_scoring_service import StopwatchScoringService
+
+ROSTERS = {"Team A": ["AAA"], "Team B": ["BBB"]}
+
+
+def _rounds(r2_winner=2):
+    # same column order as the rounds queries (id first)
+    return [
+        (1, "etl_adlernest", 99, 1, 2, 1, "0", "10:00", "2026-06-08", "230738",
+         "m-adler-1", 1749416858, 1, None, None, None),
+        (2, "etl_adlernest", 99, 2, 1, r2_winner, "0", "1:54", "2026-06-08", "231011",
+         "m-adler-1", 1749417011, 1, None, None, None),
+        (3, "supply", 99, 1, 2, 2, "0", "10:00", "2026-06-08", "232000",
+         "m-supply-1", 1749418000, 2, 600, None, 10),
+        (4, "supply", 99, 2, 1, None, "0", "9:00", "2026-06-08", "233500",
+         "m-supply-1", 1749418900, 2, 540, None, 10),
+    ]
+
+
+class OutcomeDB:
+    """Rounds + R1 player sides + an in-memory stopwatch_map_outcomes table."""
+
+    def __init__(self, rounds):
+        self.rounds = rounds
+        self.sides = (("AAA", 1), ("BBB", 2))
+        self.table: dict[tuple, tuple] = {}
+        self.side_queries = 0
+        self.deleted_other_versions = False
+
+    async def fetch_all(self, query, params=()):
+        if "FROM stopwatch_map_outcomes" in query:
+            version, r1_ids = params
+            return [(r1, r2, fp, outcome) for (r1, r2, v), (fp, outcome) in self.table.items()
+                    if v == version and r1 in r1_ids]
+        if "FROM player_comprehensive_stats" in query:
+            self.side_queries += 1
+            return [(rid, guid, side) for rid in params for guid, side in self.sides]
+        return self.rounds
+
+    async def executemany(self, query, params_list):
+        for r1, r2, version, fp, outcome in params_list:
+            self.table[(r1, r2, version)] = (fp, outcome)
+
+    async def execute(self, query, params=()):
+        (version,) = params
+        self.table = {k: v for k, v in self.table.items() if k[2] == version}
+        self.deleted_other_versions = True
+
+
+async def _score(db):
+    return await StopwatchScoringService(db).calculate_session_scores_with_teams(
+        "2026-06-08", [1, 2, 3, 4], ROSTERS)
+
+
+@pytest.mark.asyncio
+async def test_second_score_folds_stored_outcomes_without_rescoring():
+    db = OutcomeDB(_rounds())
+    first = await _score(db)
+
+    assert db.side_queries == 1  # one batched query for both R1s, not one per map
+    assert set(db.table) == {(1, 2, sw.SCORING_VERSION), (3, 4, sw.SCORING_VERSION)}
+    # stored as JSON text, like the JSONB column hands it back
+    assert all(isinstance(outcome, str) for _, outcome in db.table.values())
+    assert all("r1_sides" not in json.loads(outcome) for _, outcome in db.table.values())
+
+    stored = dict(db.table)
+    second = await _score(db)
+    assert db.side_queries == 2  # sides are read per call, never stored
+    assert db.table == stored
+    assert second == first
+    assert (first["team_a_maps"], first["team_b_maps"]) == (2, 2)
+    # R2 has no header winner on supply: time fallback, which never sets a side
+    supply = first["maps"][1]
+    assert supply["scoring_source"] == "time" and supply["winner_side"] is None
+
+
+@pytest.mark.asyncio
+async def test_changed_round_is_rescored():
+    db = OutcomeDB(_rounds())
+    await _score(db)
+
+    db.rounds = _rounds(r2_winner=1)  # header winner corrected after storage
+    rescored = await _score(db)
+
+    adler = rescored["maps"][0]
+    assert adler["winner_side"] == 1  # Team A played side 2 in R2
+    assert (adler["team_a_points"], adler["team_b_points"]) == (0, 2)
+    fp, _ = db.table[(1, 2, sw.SCORING_VERSION)]
+    assert json.loads(fp)[1][1] == 1
+
+
+@pytest.mark.asyncio
+async def test_corrected_r1_sides_change_the_attribution_of_a_stored_outcome():
+    db = OutcomeDB(_rounds())
+    first = await _score(db)
+    stored = dict(db.table)
+
+    db.sides = (("AAA", 2), ("BBB", 1))  # team column corrected after storage
+    corrected = await _score(db)
+
+    assert db.table == stored
+    assert corrected["maps"][0]["team_a_r1_side"] == 2
+    assert first["maps"][0]["team_a_r1_side"] == 1
+    assert (corrected["maps"][0]["team_a_points"], corrected["maps"][0]["team_b_points"]) == (
+        first["maps"][0]["team_b_points"], first["maps"][0]["team_a_points"])
+
+
+@pytest.mark.asyncio
+async def test_plain_session_score_uses_the_same_outcomes():
+    db = OutcomeDB(_rounds())
+    await _score(db)
+    _, stored = db.table[(3, 4, sw.SCORING_VERSION)]
+    stored = json.loads(stored)
+
+    service = StopwatchScoringService(db)
+    outcomes = await service._map_outcomes([  # noqa: SLF001
+        {"map_name": "supply",
+         "round1": dict(zip(("round_id", "defender_team", "winner_team", "time_limit",
+                             "actual_time", "actual_duration_seconds", "surrender_team",
+                             "lua_time_limit_minutes"),
+                            (3, 2, 2, "0", "10:00", 600, None, 10), strict=True)),
+         "round2": dict(zip(("round_id", "defender_team", "winner_team", "time_limit",
+                             "actual_time", "actual_duration_seconds", "surrender_team",
+                             "lua_time_limit_minutes"),
+                            (4, 1, None, "0", "9:00", 540, None, 10), strict=True))},
+    ])
+    assert outcomes == [stored]
+    assert db.side_queries == 1  # only the team-aware first score reads sides
+
+
+@pytest.mark.asyncio
+async def test_rebuild_rescores_history_and_drops_old_versions():
+    db = OutcomeDB(_rounds())
+    db.table[(1, 2, sw.SCORING_VERSION - 1)] = ("old", "{}")
+
+    stored = await StopwatchScoringService(db).rebuild_map_outcomes(chunk_size=1)
+
+    assert stored == 2
+    assert db.side_queries == 0  # outcomes never depend on player sides
+    assert db.deleted_other_versions
+    assert set(db.table) == {(1, 2, sw.SCORING_VERSION), (3, 4, sw.SCORING_VERSION)}
@@ -0,0 +1,73 @@
+"""Independent storytelling reads go out as one ``db.fetch_many`` batch.
+
+The trade and medic axes divide a numerator by the scope's deaths: both
+sides must come from the same batch (one snapshot), and the objective
+timeline merges three event tables from one batch.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from website.backend.services.session_scope import GamingSessionScope
+from website.backend.services.storytelling.service import StorytellingService
+
+_SCOPE = GamingSessionScope(
+    gaming_session_id=88,
+    dates=("2026-04-21",),
+    round_keys=((1_700_000_000, "supply", 1),),
+    accepted_round_count=1,
+    distinct_map_names=("supply",),
+)
+
+
+class BatchDB:
+    """Answers each fetch_many with the next canned batch; no single reads."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.calls: list[list] = []
+
+    async def fetch_many(self, queries, **_kwargs):
+        self.calls.append(list(queries))
+        return self.batches.pop(0)
+
+    async def fetch_all(self, query, params=None):  # pragma: no cover - regression guard
+        raise AssertionError("independent reads must be batched")
+
+
+@pytest.mark.asyncio
+async def test_trade_coverage_reads_numerator_and_deaths_in_one_batch():
+    db = BatchDB([
+        [("AAAAAAAA" + "0" * 24, 3), ("BBBBBBBB" + "0" * 24, 1)],
+        [("AAAAAAAA", 6), ("BBBBBBBB", 4)],
+    ])
+    svc = StorytellingService(db)
+    result = await svc._synergy_trade(  # noqa: SLF001
+        _SCOPE, {"AAAAAAAA": "group_a", "BBBBBBBB": "group_b"},
+    )
+
+    assert len(db.calls) == 1 and len(db.calls[0]) == 2
+    assert "proximity_lua_trade_kill" in db.calls[0][0][0]
+    assert "player_comprehensive_stats" in db.calls[0][1][0]
+    assert result == {"group_a": 50.0, "group_b": 25.0}
+
+
+@pytest.mark.asyncio
+async def test_objective_event_times_merge_one_batch():
+    key = (1_700_000_000, 1)
+    db = BatchDB([
+        [(*key, 30)],
+        [(*key, 90), (*key, 0)],  # non-positive times are dropped
+        [(*key, 60)],
+    ])
+    svc = StorytellingService(db)
+    result = await svc._load_objective_event_times(_SCOPE)  # noqa: SLF001
+
+    assert len(db.calls) == 1 and len(db.calls[0]) == 3
+    assert sorted(result[key]) == [30, 60, 90]
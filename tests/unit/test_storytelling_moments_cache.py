@@ -1,11 +1,12 @@
-"""Regression tests for detect_moments module-level cache.
+"""Regression tests for the detect_moments artifact-store cache.
 
 The 11 moment detectors fire 11 parallel DB queries + an objective-event
 loader on every request. Story page typically triggers both /moments
 and /narrative (which internally calls detect_moments(limit=1)) on the
 same session — without caching we recompute the whole batch twice.
 
-Cache is keyed by (gaming_session_id, limit) with TTL that adapts:
+Entries are scoped by (gaming_session_id, limit), fingerprinted on the
+accepted round keys, with a TTL that adapts:
 - today → 5 min (new rounds may still arrive)
 - historical → 1 h (stable, bounded for retro-corrections)
 """
@@ -14,7 +15,6 @@ from __future__ import annotations
 
 import asyncio
 import sys
-import time
 from datetime import date, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock
@@ -23,20 +23,22 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+from website.backend.services import artifact_store as artifact_store_module
+from website.backend.services.artifact_store import artifact_store
 from website.backend.services.session_scope import GamingSessionScope
 from website.backend.services.storytelling import moments as moments_module
 from website.backend.services.storytelling.service import StorytellingService
 
 
-def _scope(gsid: int, d: date) -> GamingSessionScope:
-    """A scope whose latest date is `d` (drives cache TTL) and whose id is
-    `gsid` (the cache key). round_keys are irrelevant here — the detectors
-    are stubbed — so a single placeholder key suffices."""
+def _scope(gsid: int, d: date, round_keys=((1000, "supply", 1),)) -> GamingSessionScope:
+    """A scope whose latest date is `d` (drives cache TTL), whose id is
+    `gsid` (the cache scope) and whose round_keys are the fingerprint. The
+    detectors are stubbed, so a single placeholder key suffices."""
     return GamingSessionScope(
         gaming_session_id=gsid,
         dates=(d.isoformat(),),
-        round_keys=((1000, "supply", 1),),
-        accepted_round_count=1,
+        round_keys=round_keys,
+        accepted_round_count=len(round_keys),
         distinct_map_names=("supply",),
     )
 
@@ -44,9 +46,9 @@ def _scope(gsid: int, d: date) -> GamingSessionScope:
 @pytest.fixture(autouse=True)
 def _clear_moments_cache():
     """Each test starts with an empty cache so cross-test state doesn't leak."""
-    moments_module._MOMENTS_CACHE.clear()
+    artifact_store.invalidate(moments_module.MOMENTS_ARTIFACT_KIND)
     yield
-    moments_module._MOMENTS_CACHE.clear()
+    artifact_store.invalidate(moments_module.MOMENTS_ARTIFACT_KIND)
 
 
 def _service_with_stub_detectors():
@@ -99,26 +101,42 @@ async def test_different_limit_recomputes():
 
 
 @pytest.mark.asyncio
-async def test_ttl_expiry_recomputes():
+async def test_ttl_expiry_recomputes(monkeypatch):
     """After TTL passes, the next call re-runs the detectors."""
     svc, calls = _service_with_stub_detectors()
     scope = _scope(1, date.today() - timedelta(days=30))
 
     await svc.detect_moments(scope, limit=10)
-    # Force the cached entry to look stale (>1h for historical TTL).
-    cached_list, _ = moments_module._MOMENTS_CACHE[(1, 10)]
-    moments_module._MOMENTS_CACHE[(1, 10)] = (cached_list, time.monotonic() - 4000)
+    # Jump the store's clock past the 1h historical TTL.
+    real_monotonic = artifact_store_module.time.monotonic
+    monkeypatch.setattr(
+        artifact_store_module.time, "monotonic", lambda: real_monotonic() + 4000,
+    )
 
     await svc.detect_moments(scope, limit=10)
 
     assert calls["n"] == 2
 
 
+@pytest.mark.asyncio
+async def test_newly_accepted_round_recomputes():
+    """The round keys are the fingerprint — a new round misses at once."""
+    svc, calls = _service_with_stub_detectors()
+    day = date.today() - timedelta(days=30)
+
+    await svc.detect_moments(_scope(1, day), limit=10)
+    await svc.detect_moments(
+        _scope(1, day, round_keys=((1000, "supply", 1), (2000, "supply", 2))), limit=10,
+    )
+
+    assert calls["n"] == 2
+
+
 @pytest.mark.asyncio
 async def test_concurrent_callers_collapse_to_one_compute():
     """N coroutines all awaiting the same (sd, limit) should trigger
-    exactly one underlying compute — the lock in _compute_locks guards
-    the double-check pattern."""
+    exactly one underlying compute — the store's single-flight shares
+    the leader's result."""
     db = AsyncMock()
     svc = StorytellingService(db)
     call_count = {"n": 0}
@@ -147,23 +165,3 @@ async def test_today_ttl_is_shorter_than_historical():
     today = date.today()
     yesterday = today - timedelta(days=1)
     assert moments_module._moments_cache_ttl(today) < moments_module._moments_cache_ttl(yesterday)
-
-
-@pytest.mark.asyncio
-async def test_lru_eviction_when_cache_full():
-    """Oldest entry is evicted when cache exceeds max size."""
-    svc, _ = _service_with_stub_detectors()
-    original_max = moments_module._MOMENTS_CACHE_MAX
-    moments_module._MOMENTS_CACHE_MAX = 3
-    try:
-        base = date.today() - timedelta(days=100)
-        await svc.detect_moments(_scope(10, base + timedelta(days=0)), limit=10)
-        await svc.detect_moments(_scope(11, base + timedelta(days=1)), limit=10)
-        await svc.detect_moments(_scope(12, base + timedelta(days=2)), limit=10)
-        assert len(moments_module._MOMENTS_CACHE) == 3
-        # Adding a 4th evicts the oldest (gsid 10)
-        await svc.detect_moments(_scope(13, base + timedelta(days=3)), limit=10)
-        assert len(moments_module._MOMENTS_CACHE) == 3
-        assert (10, 10) not in moments_module._MOMENTS_CACHE
-    finally:
-        moments_module._MOMENTS_CACHE_MAX = original_max
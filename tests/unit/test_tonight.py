@@ -49,7 +49,8 @@ async def test_tonight_resolves_logical_teams_through_side_swap():
     ]
     holdprob_rows = [(120,), (180,), (240,), (300,)]
     db = AsyncMock()
-    db.fetch_all = AsyncMock(side_effect=[tonight_rows, holdprob_rows])
+    db.fetch_all = AsyncMock(return_value=tonight_rows)
+    db.fetch_many = AsyncMock(return_value=[holdprob_rows])
     res = await PR.get_tonight(db)
 
     assert res["active"] is True
@@ -86,7 +87,8 @@ async def test_tonight_current_map_r2_chase():
         _cols("radar", 1, 1, A, B, axis_sc=1, allies_sc=0, start=now - 300, end=now - 45, cap=now - 20),
     ]
     db = AsyncMock()
-    db.fetch_all = AsyncMock(side_effect=[rows, [(120,), (180,), (240,)]])
+    db.fetch_all = AsyncMock(return_value=rows)
+    db.fetch_many = AsyncMock(return_value=[[(120,), (180,), (240,)]])
     res = await PR.get_tonight(db)
     cur = res["current"]
     assert cur["map"] == "radar" and cur["round"] == 1
@@ -94,6 +96,49 @@ async def test_tonight_current_map_r2_chase():
     assert cur["beat_seconds"] == 255  # end-start of the radar R1
 
 
+def _gsid_rows(now, gsid):
+    A = [{"guid": "AAAAAAAA1111", "name": "alice"}]
+    B = [{"guid": "BBBBBBBB2222", "name": "carl"}]
+    return [
+        _cols("supply", 1, 1, A, B, axis_sc=1, allies_sc=0,
+              start=now - 400, end=now - 100, cap=now - 60, gsid=gsid),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tonight_batches_team_names_with_the_hold_curve():
+    """session_teams and the hold curve are one fetch_many, names mapped by GUID."""
+    now = int(datetime.now(timezone.utc).timestamp())
+    db = AsyncMock()
+    db.fetch_all = AsyncMock(return_value=_gsid_rows(now, 42))
+    db.fetch_many = AsyncMock(return_value=[
+        [("puppets", ["BBBBBBBB"]), ("slomix", ["AAAAAAAA"])],
+        [(120,), (180,), (240,)],
+    ])
+    res = await PR.get_tonight(db)
+
+    db.fetch_many.assert_awaited_once()
+    (queries,), _ = db.fetch_many.await_args
+    assert "session_teams" in queries[0][0] and queries[0][1] == (42,)
+    assert queries[1][1] == ("supply",)
+    assert db.fetch_all.await_count == 1  # only the lua feed itself
+    assert res["teams"]["a"]["name"] == "slomix"
+    assert res["teams"]["b"]["name"] == "puppets"
+    assert res["hold_probability"]["map"] == "supply"
+
+
+@pytest.mark.asyncio
+async def test_tonight_batch_failure_keeps_the_curve_and_generic_names():
+    now = int(datetime.now(timezone.utc).timestamp())
+    db = AsyncMock()
+    db.fetch_all = AsyncMock(side_effect=[_gsid_rows(now, 42), [(120,), (180,), (240,)]])
+    db.fetch_many = AsyncMock(side_effect=RuntimeError("session_teams missing"))
+    res = await PR.get_tonight(db)
+
+    assert (res["teams"]["a"]["name"], res["teams"]["b"]["name"]) == ("Team A", "Team B")
+    assert res["hold_probability"]["curve"]
+
+
 @pytest.mark.asyncio
 async def test_hold_probability_curve_is_monotonic():
     db = AsyncMock()
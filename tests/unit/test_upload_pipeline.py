@@ -0,0 +1,141 @@
+"""Off-loop upload write-and-hash pipeline.
+
+The pipeline moves disk writes and SHA-256 off the event loop, so the tests pin
+that the bytes and digest are exactly what an inline write produced, that a
+writer failure still fails the upload, and that resumable sessions hash as
+chunks land instead of re-reading the assembled file at finalize.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import threading
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from website.backend.services.upload_pipeline import HashingFileWriter, ResumableDigests
+from website.backend.services.upload_store import UploadStorageService
+
+
+async def test_writer_matches_inline_write_and_hash(tmp_path):
+    path = tmp_path / "out.bin"
+    chunks = [bytes([i]) * (1000 + i) for i in range(20)]
+    writer = HashingFileWriter(path, store="uploads", max_queued_chunks=2)
+    writer.start()
+    for chunk in chunks:
+        await writer.write(chunk)
+    throughput = await writer.close()
+
+    payload = b"".join(chunks)
+    assert path.read_bytes() == payload
+    assert writer.hexdigest() == hashlib.sha256(payload).hexdigest()
+    assert throughput.bytes_written == len(payload)
+    assert 1 <= throughput.max_queue_depth <= 2
+
+
+async def test_writer_error_surfaces_on_close(tmp_path):
+    writer = HashingFileWriter(tmp_path / "missing-dir" / "out.bin", store="uploads")
+    writer.start()
+    with pytest.raises(OSError):
+        await writer.write(b"x" * 10)
+        await writer.close()
+    await writer.abort()
+
+
+async def test_save_upload_hash_and_throughput(tmp_path):
+    svc = UploadStorageService(tmp_path)
+    body = b"seta cg_fov 100\n" * 5000
+    saved = await svc.save_upload(UploadFile(io.BytesIO(body), filename="my.cfg"), "config")
+
+    assert saved.content_hash_sha256 == hashlib.sha256(body).hexdigest()
+    assert (tmp_path / saved.stored_path).read_bytes() == body
+    assert saved.throughput is not None
+    assert saved.throughput.bytes_written == len(body)
+
+
+async def test_save_upload_over_limit_leaves_no_file(tmp_path, monkeypatch):
+    import website.backend.services.upload_store as store
+
+    monkeypatch.setattr(store, "get_size_limit", lambda category: 100)
+    svc = UploadStorageService(tmp_path)
+    with pytest.raises(HTTPException) as ei:
+        await svc.save_upload(UploadFile(io.BytesIO(b"a" * 500), filename="my.cfg"), "config")
+    assert ei.value.status_code == 413
+    assert not list((tmp_path / "config").rglob("original*"))
+
+
+async def test_a_cancelled_upload_releases_the_writer_and_the_file(tmp_path):
+    class _Disconnecting(UploadFile):
+        reads = 0
+
+        async def read(self, size=-1):
+            self.reads += 1
+            if self.reads > 2:
+                raise asyncio.CancelledError  # the client went away mid-stream
+            return b"seta cg_fov 100\n" * 64
+
+    svc = UploadStorageService(tmp_path)
+    with pytest.raises(asyncio.CancelledError):
+        await svc.save_upload(_Disconnecting(io.BytesIO(), filename="my.cfg"), "config")
+    assert not list((tmp_path / "config").rglob("original*"))
+    assert not [t for t in threading.enumerate() if "upload" in t.name.lower()]
+
+
+def _mp4(size: int) -> bytes:
+    head = b"\x00\x00\x00\x20ftypisom" + b"\x00" * 8
+    return (head + b"\x01" * max(0, size - len(head)))[:size]
+
+
+def _open(svc, size):
+    return svc.create_resumable_session(
+        filename="clip.mp4", category="clip", size=size, uploader_discord_id=42,
+        title="", description="", tags="", retention_days=None,
+    )
+
+
+def test_resumable_finalize_uses_running_digest(tmp_path, monkeypatch):
+    svc = UploadStorageService(tmp_path)
+    data = _mp4(1000)
+    session = _open(svc, len(data))
+    sid = session["session_id"]
+    svc.append_chunk(sid, 0, data[:400])
+    svc.append_chunk(sid, 400, data[400:])
+    assert svc.get_resumable_session(sid)["hashed_offset"] == len(data)
+
+    reads = []
+    real_open = type(tmp_path).open
+
+    def spy_open(self, mode="r", *args, **kwargs):
+        if self.suffix == ".part" and "r" in mode:
+            reads.append(mode)
+        return real_open(self, mode, *args, **kwargs)
+
+    monkeypatch.setattr(type(tmp_path), "open", spy_open)
+    saved, _ = svc.finalize_resumable(sid)
+
+    assert saved.content_hash_sha256 == hashlib.sha256(data).hexdigest()
+    assert reads == ["rb"]  # the 512-byte magic sniff, no full re-read
+
+
+def test_resumable_finalize_rehashes_after_restart(tmp_path):
+    data = _mp4(1000)
+    first = UploadStorageService(tmp_path)
+    sid = _open(first, len(data))["session_id"]
+    first.append_chunk(sid, 0, data[:400])
+
+    restarted = UploadStorageService(tmp_path)  # running digest lost
+    restarted.append_chunk(sid, 400, data[400:])
+    assert restarted.get_resumable_session(sid)["hashed_offset"] is None
+
+    saved, _ = restarted.finalize_resumable(sid)
+    assert saved.content_hash_sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_resumable_digests_reject_out_of_order_offsets():
+    digests = ResumableDigests()
+    assert digests.advance("s", 0, b"abc") == 3
+    assert digests.advance("s", 5, b"def") is None
+    assert digests.take("s", 6) is None
@@ -1,8 +1,9 @@
 """Tests for WebhookEventQueue (dedup + producer/consumer).
 
 Pins the 2026-04-22 restructure that moves STATS_READY processing from
-fire-and-forget `asyncio.create_task()` into a bounded queue with a
-single dedicated worker. Goals:
+fire-and-forget `asyncio.create_task()` into a bounded queue, and the
+follow-up that partitions it by gaming session over a small worker pool and
+persists accepted rounds. Goals:
 
 - Dedup on `(map, round_number, round_end_unix)` — Lua retries after a
   Discord blip collapse to one fetch.
@@ -10,11 +11,14 @@ single dedicated worker. Goals:
   `_stats_ready_rate_limit` dropped silently).
 - Worker exceptions do not kill the loop and clear dedup for retry.
 - Graceful shutdown drains the queue before exiting.
+- Rounds of one session stay ordered; different sessions run concurrently.
+- With a store, rounds are persisted, claimed, finished and replayed.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 from unittest.mock import AsyncMock
@@ -24,6 +28,8 @@ import pytest
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from bot.services.webhook_event_queue import (
+    STATUS_DONE,
+    STATUS_FAILED,
     WebhookEventQueue,
     WebhookHandlerSoftFail,
     _dedup_key,
@@ -248,3 +254,167 @@ async def test_soft_fail_clears_dedup_but_is_not_a_handler_failure():
     assert q.stats()["handler_failures"] == 0  # NOT counted as a failure
     assert q.stats()["processed"] == 1
     assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_sessions_run_in_parallel_but_one_sessions_rounds_stay_ordered():
+    events: list[str] = []
+    gate = asyncio.Event()
+
+    async def handler(metadata, _message):
+        tag = f"{metadata['map_name']}:R{metadata['round_number']}"
+        events.append(f"start {tag}")
+        if metadata["map_name"] == "slow":
+            await gate.wait()
+        events.append(f"end {tag}")
+
+    q = WebhookEventQueue(bot=None, handler=handler, workers=2, session_gap_seconds=3600)
+    q.enqueue(_meta("slow", 1, end=1_000_000), object())
+    q.enqueue(_meta("slow", 2, end=1_000_600), object())
+    # A round from another night: its own partition.
+    q.enqueue(_meta("fast", 1, end=2_000_000), object())
+    q.start()
+    await asyncio.sleep(0.05)
+
+    # "fast" finished while "slow" R1 is still held; "slow" R2 has not started.
+    assert "end fast:R1" in events
+    assert "start slow:R2" not in events
+    lag = q.stats()["partitions"]
+    assert list(lag) == ["session@1000000"]
+    assert lag["session@1000000"]["depth"] == 1 and lag["session@1000000"]["busy"] is True
+
+    gate.set()
+    await q.stop(timeout=2.0)
+    slow = [e for e in events if "slow" in e]
+    assert slow == ["start slow:R1", "end slow:R1", "start slow:R2", "end slow:R2"]
+    assert q.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_two_maps_of_one_session_never_import_concurrently():
+    """The import assigns gaming_session_id from the previous round, so two
+    maps of one night must not run side by side even with idle workers."""
+    running = 0
+    peak = 0
+    order: list[str] = []
+
+    async def handler(metadata, _message):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        order.append(metadata["map_name"])
+        running -= 1
+
+    q = WebhookEventQueue(bot=None, handler=handler, workers=4, session_gap_seconds=3600)
+    q.enqueue(_meta("supply", 1, end=1_000_000), object())
+    q.enqueue(_meta("radar", 1, end=1_000_900), object())
+    q.start()
+    await asyncio.sleep(0.005)
+    # Arrives while the session's partition is busy: joins it.
+    q.enqueue(_meta("goldrush", 1, end=1_001_800), object())
+    await q.stop(timeout=2.0)
+
+    assert peak == 1
+    assert order == ["supply", "radar", "goldrush"]
+
+
+class FakeStore:
+    def __init__(self, unfinished=(), claimable=True):
+        self.rows: dict[int, dict] = {}
+        self.finished: list[tuple] = []
+        self.claims: list[int] = []
+        self._unfinished = list(unfinished)
+        self.claimable = claimable
+
+    async def insert(self, item):
+        row_id = len(self.rows) + 1
+        self.rows[row_id] = item.metadata
+        return row_id
+
+    async def claim(self, row_id):
+        self.claims.append(row_id)
+        return self.claimable
+
+    async def finish(self, row_id, status, error=None):
+        self.finished.append((row_id, status, error))
+
+    async def unfinished(self):
+        return self._unfinished
+
+
+@pytest.mark.asyncio
+async def test_store_persists_claims_and_finishes_each_round():
+    handler = AsyncMock(side_effect=[None, RuntimeError("ssh down")])
+    store = FakeStore()
+    q = WebhookEventQueue(bot=None, handler=handler, store=store, workers=1)
+    q.enqueue(_meta(end=1), object())
+    q.enqueue(_meta(end=2), object())
+    q.start()
+    await q.stop(timeout=2.0)
+
+    assert store.claims == [1, 2]
+    assert store.finished[0] == (1, STATUS_DONE, None)
+    assert store.finished[1][:2] == (2, STATUS_FAILED)
+    assert "ssh down" in store.finished[1][2]
+
+
+@pytest.mark.asyncio
+async def test_round_claimed_by_another_process_is_skipped():
+    handler = AsyncMock()
+    q = WebhookEventQueue(bot=None, handler=handler, store=FakeStore(claimable=False))
+    q.enqueue(_meta(), object())
+    q.start()
+    await q.stop(timeout=2.0)
+
+    handler.assert_not_awaited()
+    assert q.stats()["claimed_elsewhere"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_reenqueues_unfinished_rows_with_dedup_and_message():
+    class Channel:
+        def get_partial_message(self, message_id):
+            return ("partial", message_id)
+
+    class Bot:
+        def get_channel(self, channel_id):
+            return Channel() if channel_id == 10 else None
+
+    store = FakeStore(unfinished=[
+        (7, json.dumps(_meta(end=5)), 10, 99),
+        (8, "{not json", None, None),
+        (9, json.dumps(_meta("other", end=6)), 11, 100),
+    ])
+    handler = AsyncMock()
+    q = WebhookEventQueue(bot=Bot(), handler=handler, store=store)
+
+    assert await q.replay() == 2
+    assert q.enqueue(_meta(end=5), object()) == (False, "duplicate")
+    q.start()
+    await q.stop(timeout=2.0)
+
+    messages = {call.args[0]["map_name"]: call.args[1] for call in handler.await_args_list}
+    assert messages == {"te_escape2": ("partial", 99), "other": None}
+    assert sorted(store.claims) == [7, 9]
+    assert q.stats()["replayed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_store_failures_fall_back_to_in_memory_processing():
+    class BrokenStore(FakeStore):
+        async def insert(self, item):
+            raise ConnectionError("db gone")
+
+        async def unfinished(self):
+            raise ConnectionError("db gone")
+
+    handler = AsyncMock()
+    q = WebhookEventQueue(bot=None, handler=handler, store=BrokenStore())
+    assert await q.replay() == 0
+    q.enqueue(_meta(), object())
+    q.start()
+    await q.stop(timeout=2.0)
+
+    handler.assert_awaited_once()
+    assert q.stats()["store_errors"] == 2
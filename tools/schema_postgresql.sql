@@ -9071,3 +9071,148 @@ CREATE TABLE IF NOT EXISTS player_aim_summary (
     payload          JSONB       NOT NULL,
     computed_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
+
+-- 079: post_session_jobs — the post-session precompute pipeline's ledger, one
+-- row per (session, stage). Bookkeeping only: safe to TRUNCATE. Migration 079
+-- creates it; mirrored here so a fresh bootstrap matches the ledger.
+CREATE TABLE IF NOT EXISTS post_session_jobs (
+    session_key  TEXT        NOT NULL,
+    stage        TEXT        NOT NULL,
+    status       TEXT        NOT NULL,
+    context      TEXT        NOT NULL,
+    attempts     INTEGER     NOT NULL DEFAULT 0,
+    duration_ms  INTEGER     NULL,
+    error        TEXT        NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (session_key, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_post_session_jobs_unfinished
+    ON post_session_jobs (updated_at)
+    WHERE status <> 'done';
+
+-- 080: webhook_round_queue — durable log of accepted STATS_READY rounds,
+-- replayed on bot start. Operational state. Migration 080 creates it; mirrored
+-- here so a fresh bootstrap matches the ledger.
+CREATE TABLE IF NOT EXISTS webhook_round_queue (
+    id            BIGSERIAL   PRIMARY KEY,
+    partition_key TEXT        NOT NULL,
+    dedup_key     TEXT        NULL,
+    metadata      TEXT        NOT NULL,
+    channel_id    BIGINT      NULL,
+    message_id    BIGINT      NULL,
+    status        TEXT        NOT NULL DEFAULT 'pending',
+    attempts      INTEGER     NOT NULL DEFAULT 0,
+    last_error    TEXT        NULL,
+    enqueued_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    claimed_at    TIMESTAMPTZ NULL,
+    finished_at   TIMESTAMPTZ NULL
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_round_queue_unfinished
+    ON webhook_round_queue (id)
+    WHERE status IN ('pending', 'processing');
+CREATE INDEX IF NOT EXISTS idx_webhook_round_queue_finished
+    ON webhook_round_queue (finished_at)
+    WHERE finished_at IS NOT NULL;
+
+-- 081: stopwatch_map_outcomes — stored stopwatch outcome per map pair, keyed
+-- on the round columns it derives from (fingerprint) and SCORING_VERSION.
+-- Derived data: safe to TRUNCATE. Migration 081 creates it; mirrored here so a
+-- fresh bootstrap matches the ledger.
+CREATE TABLE IF NOT EXISTS stopwatch_map_outcomes (
+    r1_round_id      INTEGER     NOT NULL,
+    r2_round_id      INTEGER     NOT NULL,
+    scoring_version  INTEGER     NOT NULL,
+    fingerprint      TEXT        NOT NULL,
+    outcome          JSONB       NOT NULL,
+    computed_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (r1_round_id, r2_round_id, scoring_version)
+);
+
+-- 082: derived_artifacts — database tier of the shared artifact store
+-- (website/backend/services/artifact_store.py), one row per (kind, scope),
+-- served only while input_fingerprint and formula_version match. Derived data:
+-- safe to TRUNCATE. Migration 082 creates it; mirrored here so a fresh
+-- bootstrap matches the ledger.
+CREATE TABLE IF NOT EXISTS derived_artifacts (
+    kind               TEXT        NOT NULL,
+    scope              TEXT        NOT NULL,
+    formula_version    INTEGER     NOT NULL,
+    input_fingerprint  TEXT        NOT NULL,
+    payload            JSONB       NOT NULL,
+    compute_ms         INTEGER     NULL,
+    computed_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (kind, scope)
+);
+
+-- 083: round_reinforcement_clocks — stored reinforcement-clock verdicts per
+-- round (website/backend/services/reinforcement_clock_batch.py), served only
+-- while protocol_version equals CLOCK_PROTOCOL_VERSION. Derived data: safe to
+-- TRUNCATE. Migration 083 creates it; mirrored here so a fresh bootstrap
+-- matches the ledger.
+CREATE TABLE IF NOT EXISTS round_reinforcement_clocks (
+    round_id          INTEGER     NOT NULL PRIMARY KEY,
+    protocol_version  TEXT        NOT NULL,
+    clocks            JSONB       NOT NULL,
+    computed_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- 084: processed_files.file_size / file_mtime — the stat file_hash was taken
+-- from, so the startup sync rehashes only new or changed files. Migration 084
+-- adds them; mirrored here so a fresh bootstrap matches the ledger.
+ALTER TABLE public.processed_files
+    ADD COLUMN IF NOT EXISTS file_size BIGINT,
+    ADD COLUMN IF NOT EXISTS file_mtime DOUBLE PRECISION;
+
+-- 085: proximity_round_features + proximity_player_round_features — the
+-- per-round, per-player proximity features
+-- (website/backend/services/proximity_features.py), served only while
+-- feature_version and source_rows match. Derived data: safe to TRUNCATE.
+-- Migration 085 creates them; mirrored here so a fresh bootstrap matches the
+-- ledger.
+CREATE TABLE IF NOT EXISTS proximity_round_features (
+    round_id          INTEGER     NOT NULL PRIMARY KEY,
+    feature_version   TEXT        NOT NULL,
+    source_rows       INTEGER     NOT NULL,
+    round_start_unix  INTEGER     DEFAULT 0,
+    has_lives         BOOLEAN     NOT NULL DEFAULT FALSE,
+    has_kills         BOOLEAN     NOT NULL DEFAULT FALSE,
+    has_clocks        BOOLEAN     NOT NULL DEFAULT FALSE,
+    first_blood_team  VARCHAR(10),
+    winner_team       VARCHAR(10),
+    advantage         JSONB       NOT NULL DEFAULT '{}'::jsonb,
+    computed_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS proximity_player_round_features (
+    round_id               INTEGER          NOT NULL,
+    player_guid            VARCHAR(32)      NOT NULL,
+    feature_version        TEXT             NOT NULL,
+    player_name            VARCHAR(64),
+    first_picks            INTEGER          NOT NULL DEFAULT 0,
+    first_deaths           INTEGER          NOT NULL DEFAULT 0,
+    first_pick_converted   INTEGER          NOT NULL DEFAULT 0,
+    trade_events           INTEGER          NOT NULL DEFAULT 0,
+    trade_opportunities    INTEGER          NOT NULL DEFAULT 0,
+    trade_attempts         INTEGER          NOT NULL DEFAULT 0,
+    trade_successes        INTEGER          NOT NULL DEFAULT 0,
+    trade_missed           INTEGER          NOT NULL DEFAULT 0,
+    isolation_deaths       INTEGER          NOT NULL DEFAULT 0,
+    avenged_count          INTEGER          NOT NULL DEFAULT 0,
+    avenger_events         INTEGER          NOT NULL DEFAULT 0,
+    avenger_damage         DOUBLE PRECISION NOT NULL DEFAULT 0,
+    advantage_conversions  INTEGER          NOT NULL DEFAULT 0,
+    clutch_situations      INTEGER          NOT NULL DEFAULT 0,
+    clutch_wins            INTEGER          NOT NULL DEFAULT 0,
+    clutch_best_enemies    INTEGER,
+    clutch_best_kills      INTEGER,
+    clutch_best_survived   BOOLEAN,
+    PRIMARY KEY (round_id, player_guid)
+);
+
+-- 086: greatshot_demos / greatshot_renders.claim_attempts — worker-pool claims
+-- per job, so a job that keeps killing its worker is dead-lettered. Migration
+-- 086 adds them; mirrored here so a fresh bootstrap matches the ledger.
+ALTER TABLE public.greatshot_demos
+    ADD COLUMN IF NOT EXISTS claim_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE public.greatshot_renders
+    ADD COLUMN IF NOT EXISTS claim_attempts INTEGER NOT NULL DEFAULT 0;
@@ -18,6 +18,7 @@ from shared.database_adapter import (
 
 # Import local SQLite adapter
 from website.backend.local_database_adapter import create_local_adapter
+from website.backend.metrics import observe_db_query
 
 # Add project root to sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
@@ -49,6 +50,10 @@ async def init_db_pool():
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
+    profiler = getattr(_db_pool, "profiler", None)
+    if profiler is not None:
+        profiler.add_observer(observe_db_query)
+
     await _db_pool.connect()
     logger.info("Database pool initialized (%s)", db_type)
     return _db_pool
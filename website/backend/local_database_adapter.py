@@ -68,21 +68,23 @@ class SQLiteAdapter(DatabaseAdapter):
             await conn.commit()
 
     async def fetch_one(
-        self, query: str, params: tuple | None = None
+        self, query: str, params: tuple | None = None, *, cache_ttl: float | None = None
     ) -> Any | None:
-        """Fetch single row from SQLite."""
+        """Fetch single row from SQLite (``cache_ttl`` is accepted and ignored)."""
         async with self.connection() as conn, conn.execute(query, params or ()) as cursor:
             row = await cursor.fetchone()
             return row
 
-    async def fetch_all(self, query: str, params: tuple | None = None) -> list[Any]:
-        """Fetch all rows from SQLite."""
+    async def fetch_all(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> list[Any]:
+        """Fetch all rows from SQLite (``cache_ttl`` is accepted and ignored)."""
         async with self.connection() as conn, conn.execute(query, params or ()) as cursor:
             rows = await cursor.fetchall()
             return rows
 
-    async def fetch_val(self, query: str, params: tuple | None = None) -> Any:
-        """Fetch single value from SQLite."""
+    async def fetch_val(self, query: str, params: tuple | None = None, *,
+                        cache_ttl: float | None = None) -> Any:
+        """Fetch single value from SQLite (``cache_ttl`` is accepted and ignored)."""
         async with self.connection() as conn, conn.execute(query, params or ()) as cursor:
             row = await cursor.fetchone()
             return row[0] if row else None
@@ -527,6 +527,7 @@ async def startup_event():
                 job_service.start(
                     analysis_workers=GREATSHOT_CONFIG.analysis_queue_workers,
                     render_workers=GREATSHOT_CONFIG.render_queue_workers,
+                    job_mode=GREATSHOT_CONFIG.job_mode,
                 ),
                 timeout=startup_timeout,
             )
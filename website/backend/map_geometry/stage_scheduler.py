@@ -3014,6 +3014,35 @@ def _source_ordered_suspended_index(
     )
 
 
+class _InternedScheduleKeys:
+    """Dense integer ids for canonical scheduler keys, hashed once per successor.
+
+    Ancestry sets become integer bitsets over these ids, so extending a path is
+    one ``|`` and a cycle check is one shift instead of copying and rehashing a
+    frozenset of deep state tuples for every queued successor.
+    """
+
+    __slots__ = ("_ids",)
+
+    def __init__(self) -> None:
+        self._ids: dict[tuple[object, ...], int] = {}
+
+    def intern(self, key: tuple[object, ...]) -> int:
+        key_id = self._ids.get(key)
+        if key_id is None:
+            key_id = len(self._ids)
+            self._ids[key] = key_id
+        return key_id
+
+
+class _ScheduleFrontierEntry:
+    __slots__ = ("state", "ancestry")
+
+    def __init__(self, state: SymbolicScheduleState, ancestry: int) -> None:
+        self.state = state
+        self.ancestry = ancestry
+
+
 def search_symbolic_schedule(
     index: OrderedStageProgramIndex,
     initial_state: SymbolicScheduleState,
@@ -3029,15 +3058,13 @@ def search_symbolic_schedule(
 
     _state_for_index(index, initial_state)
     budget = SymbolicScheduleWorkBudget(work_limit)
-    initial_key = initial_state.canonical_key
-    queue: deque[
-        tuple[
-            SymbolicScheduleState,
-            frozenset[tuple[object, ...]],
-        ]
-    ] = deque(((initial_state, frozenset((initial_key,))),))
-    initial_ancestry = frozenset((initial_key,))
-    visited = {(initial_key, initial_ancestry)}
+    keys = _InternedScheduleKeys()
+    initial_id = keys.intern(initial_state.canonical_key)
+    initial_ancestry = 1 << initial_id
+    queue: deque[_ScheduleFrontierEntry] = deque(
+        (_ScheduleFrontierEntry(initial_state, initial_ancestry),)
+    )
+    visited = {(initial_id, initial_ancestry)}
     terminal: list[SymbolicScheduleDecision] = []
     states_created = 1
     deduplicated_states = 0
@@ -3059,7 +3086,7 @@ def search_symbolic_schedule(
         reason: SymbolicScheduleExhaustion,
     ) -> None:
         nonlocal states_created, exhausted, exhaustion_reason
-        pending = (frontier_state,) + tuple(item[0] for item in queue)
+        pending = (frontier_state,) + tuple(entry.state for entry in queue)
         queue.clear()
         for pending_state in pending:
             decision = _terminal_frontier_decision(
@@ -3075,7 +3102,8 @@ def search_symbolic_schedule(
         exhaustion_reason = reason
 
     while queue and not exhausted:
-        state, ancestry = queue.popleft()
+        entry = queue.popleft()
+        state, ancestry = entry.state, entry.ancestry
         if not state.runnable and not state.suspended:
             terminal.append(
                 SymbolicScheduleDecision(SymbolicScheduleDecisionKind.COMPLETE, state)
@@ -3150,8 +3178,8 @@ def search_symbolic_schedule(
                 }:
                     terminal.append(decision)
                     continue
-                successor_key = successor.canonical_key
-                if successor_key in ancestry:
+                successor_id = keys.intern(successor.canonical_key)
+                if ancestry >> successor_id & 1:
                     cycle = _terminal_frontier_decision(
                         index,
                         successor,
@@ -3162,13 +3190,13 @@ def search_symbolic_schedule(
                     states_created += 1
                     observe(cycle.state)
                     continue
-                successor_ancestry = ancestry | {successor_key}
-                visit_context = (successor_key, successor_ancestry)
+                successor_ancestry = ancestry | (1 << successor_id)
+                visit_context = (successor_id, successor_ancestry)
                 if visit_context in visited:
                     deduplicated_states += 1
                     continue
                 visited.add(visit_context)
-                queue.append((successor, successor_ancestry))
+                queue.append(_ScheduleFrontierEntry(successor, successor_ancestry))
 
     ordered_terminal = tuple(sorted(set(terminal), key=_decision_sort_key))
     budget_frontiers = sum(
@@ -69,3 +69,101 @@ PROX_DEGRADED = Gauge(
     "Whether the last proximity scoring compute for this scope was degraded",
     ["scope"],
 )
+
+# Upload write-and-hash pipeline (services/upload_pipeline.py). `store` is
+# low-cardinality: uploads | greatshot | resumable.
+UPLOAD_BYTES = Counter(
+    "slomix_upload_bytes_total",
+    "Bytes written to disk by the upload pipeline",
+    ["store"],
+)
+
+UPLOAD_THROUGHPUT = Histogram(
+    "slomix_upload_throughput_bytes_per_second",
+    "Per-upload write-and-hash throughput",
+    ["store"],
+    buckets=(256e3, 1e6, 4e6, 16e6, 64e6, 256e6, 1e9),
+)
+
+UPLOAD_QUEUE_WAIT = Histogram(
+    "slomix_upload_queue_wait_seconds",
+    "Time an upload handler waited on a full writer queue (disk slower than client)",
+    ["store"],
+)
+
+# Greatshot worker pool (greatshot/worker/pool.py). `job_class` is
+# analysis | render; `outcome` is success | failure.
+GREATSHOT_JOBS = Counter(
+    "slomix_greatshot_jobs_total",
+    "Greatshot jobs finished by a worker-pool process",
+    ["job_class", "outcome"],
+)
+
+GREATSHOT_JOB_DURATION = Histogram(
+    "slomix_greatshot_job_duration_seconds",
+    "Wall-clock duration of one claimed Greatshot job, retries included",
+    ["job_class"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600),
+)
+
+GREATSHOT_JOBS_IN_PROGRESS = Gauge(
+    "slomix_greatshot_jobs_in_progress",
+    "Greatshot jobs currently running in this worker process",
+    ["job_class"],
+)
+
+GREATSHOT_QUEUE_DEPTH = Gauge(
+    "slomix_greatshot_queue_depth",
+    "Greatshot rows per job class and status, as last polled",
+    ["job_class", "status"],
+)
+
+# Derived-artifact store (services/artifact_store.py). `kind` is the artifact
+# kind — a fixed set named in code (objective_pressure, moments, ...), never a
+# session, scope or player id. `outcome` is memory_hit | db_hit | coalesced |
+# computed.
+ARTIFACT_LOOKUPS = Counter(
+    "slomix_artifact_lookups_total",
+    "Derived-artifact store lookups per kind and outcome",
+    ["kind", "outcome"],
+)
+
+ARTIFACT_COMPUTE_DURATION = Histogram(
+    "slomix_artifact_compute_duration_seconds",
+    "Wall-clock duration of each derived-artifact compute (store misses)",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# Per-query-fingerprint latency from the DB adapter's QueryProfiler
+# (bot/core/query_profiler.py). `fingerprint` is a short hash capped at the
+# profiler's first DB_PROFILER_METRIC_FINGERPRINTS shapes — the rest share
+# "other" — so label cardinality stays bounded; the hash resolves to SQL text
+# via the query_profile section of /api/diagnostics.
+DB_QUERY_DURATION = Histogram(
+    "slomix_db_query_duration_seconds",
+    "Adapter query latency (pool wait included) per query fingerprint",
+    ["fingerprint", "op"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 3, 10),
+)
+
+DB_QUERY_ERRORS = Counter(
+    "slomix_db_query_errors_total",
+    "Adapter queries that raised, per query fingerprint",
+    ["fingerprint", "op"],
+)
+
+DB_POOL_WAIT = Histogram(
+    "slomix_db_pool_wait_seconds",
+    "Time adapter calls waited to acquire a pooled connection",
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+
+def observe_db_query(fingerprint: str, op: str, duration_s: float,
+                     pool_wait_s: float, error: bool) -> None:
+    """QueryProfiler observer: export one adapter call to Prometheus."""
+    DB_QUERY_DURATION.labels(fingerprint=fingerprint, op=op).observe(duration_s)
+    DB_POOL_WAIT.observe(pool_wait_s)
+    if error:
+        DB_QUERY_ERRORS.labels(fingerprint=fingerprint, op=op).inc()
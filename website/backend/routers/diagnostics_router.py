@@ -308,10 +308,16 @@ async def get_system_overview(db: DatabaseAdapter = Depends(get_db)):
 async def get_diagnostics(
     db: DatabaseAdapter = Depends(get_db),
     _user: dict = Depends(require_admin_user),
+    query_top: int = 20,
+    explain: int = 0,
 ):
     """
     Run comprehensive diagnostics on the website backend.
     Checks database connectivity, table permissions, and data availability.
+
+    ``query_top`` sizes the per-fingerprint query profile; ``explain=N`` also
+    runs EXPLAIN (ANALYZE, BUFFERS) on up to N sampled slow read-only queries
+    (needs DB_PROFILER_EXPLAIN_MS set so samples are retained).
     """
     results = {
         "status": "ok",
@@ -514,6 +520,20 @@ async def get_diagnostics(
     else:
         results["pool"] = {"connected": False, "reason": "adapter has no pool_stats"}
 
+    # Same getattr pattern: only the PostgreSQL adapter carries a profiler.
+    profiler = getattr(db, "profiler", None)
+    if profiler is not None:
+        try:
+            profile = profiler.snapshot(max(1, min(int(query_top), 200)))
+            explain_n = max(0, min(int(explain), 10))
+            if explain_n and callable(getattr(db, "capture_query_plans", None)):
+                await db.capture_query_plans(limit=explain_n)
+            profile["plans"] = profiler.plans()
+            results["query_profile"] = profile
+        except Exception as e:
+            logger.warning("query profile failed: %s", e, exc_info=True)
+            results["query_profile"] = {"error": str(e)}
+
     return results
 
 
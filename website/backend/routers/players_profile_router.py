@@ -22,7 +22,6 @@ GUID handling (verified against live schema):
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import re
 from datetime import datetime, timezone
@@ -37,6 +36,7 @@ from website.backend.routers.api_helpers import (
     resolve_player_guid,
 )
 from website.backend.routers.proximity_positions import _circular_yaw_stats
+from website.backend.services.artifact_store import get_or_compute
 from website.backend.services.player_profile_metrics import (
     bait_score,
     compute_streaks,
@@ -734,6 +734,7 @@ async def _fetch_recent_matches(db, guid8: str, limit: int = 10) -> dict:
 
 # Bump when the aim maths changes: every cached row from an older version is
 # ignored and recomputed, so a formula change can never be served from the cache.
+AIM_ARTIFACT_KIND = "player_aim_summary"
 _AIM_FORMULA_VERSION = 1
 
 
@@ -766,84 +767,24 @@ async def _aim_fingerprint(db, guid8: str) -> tuple[int, int | None, int | None]
     )
 
 
-async def _read_aim_cache(db, guid8: str, fingerprint) -> dict | None:
-    """Cached summary, or None when it is absent, stale or unreadable.
-
-    Every failure path returns None: a cache is an optimisation, and a profile
-    that 500s because a derived table is missing would be a worse product than a
-    slow one. The table is created by migration 077 but the endpoint predates it.
-    """
-    shots, last_event, round_sum = fingerprint
-    try:
-        row = await db.fetch_one(
-            """
-            SELECT payload, shot_count, last_event_time, round_id_sum
-            FROM player_aim_summary
-            WHERE guid_canonical = $1 AND formula_version = $2
-            """,
-            (guid8, _AIM_FORMULA_VERSION),
-        )
-    except Exception as exc:                      # noqa: BLE001 — see docstring
-        logger.debug("aim cache unreadable for %s: %s", guid8, exc)
-        return None
-    if not row:
-        return None
-
-    stored = (_i(row[1]), int(row[2]) if row[2] is not None else None,
-              int(row[3]) if row[3] is not None else None)
-    if stored != (shots, last_event, round_sum):
-        return None
-
-    payload = row[0]
-    if isinstance(payload, str):                  # asyncpg hands JSONB back as text
-        try:
-            payload = json.loads(payload)
-        except ValueError:
-            return None
-    return payload if isinstance(payload, dict) else None
-
-
-async def _write_aim_cache(db, guid8: str, fingerprint, summary: dict) -> None:
-    """Store the freshly computed summary. Never raises into the request."""
-    shots, last_event, round_sum = fingerprint
-    try:
-        await db.execute(
-            """
-            INSERT INTO player_aim_summary
-                (guid_canonical, formula_version, shot_count, last_event_time,
-                 round_id_sum, payload, computed_at)
-            VALUES ($1, $2, $3, $4, $5, $6, NOW())
-            ON CONFLICT (guid_canonical) DO UPDATE SET
-                formula_version = EXCLUDED.formula_version,
-                shot_count      = EXCLUDED.shot_count,
-                last_event_time = EXCLUDED.last_event_time,
-                round_id_sum    = EXCLUDED.round_id_sum,
-                payload         = EXCLUDED.payload,
-                computed_at     = NOW()
-            """,
-            (guid8, _AIM_FORMULA_VERSION, shots, last_event, round_sum,
-             json.dumps(summary)),
-        )
-    except Exception as exc:                      # noqa: BLE001 — see _read_aim_cache
-        logger.debug("aim cache not written for %s: %s", guid8, exc)
-
-
 async def _fetch_aim_summary(db, guid8: str) -> dict:
-    """True-aim lifetime summary, served from player_aim_summary when it is current.
+    """True-aim lifetime summary, served from the artifact store when it is current.
 
     The computation below is the most expensive thing on the profile — 2,770 ms
     warm, 16,887 ms cold for the heaviest player — and its inputs only change
     when rounds import. So it is computed once and cached, keyed on a fingerprint
-    of exactly those inputs rather than on a TTL. See migration 077.
+    of exactly those inputs rather than on a TTL. See migration 082.
     """
     fingerprint = await _aim_fingerprint(db, guid8)
-    cached = await _read_aim_cache(db, guid8, fingerprint)
-    if cached is not None:
-        return cached
-
-    summary = await _compute_aim_summary(db, guid8)
-    await _write_aim_cache(db, guid8, fingerprint, summary)
-    return summary
+    return await get_or_compute(
+        AIM_ARTIFACT_KIND,
+        guid8,
+        fingerprint,
+        lambda: _compute_aim_summary(db, guid8),
+        db=db,
+        formula_version=_AIM_FORMULA_VERSION,
+        validate=lambda value: isinstance(value, dict),
+    )
 
 
 async def _compute_aim_summary(db, guid8: str) -> dict:
@@ -218,12 +218,10 @@ async def get_live_session(db: DatabaseAdapter = Depends(get_db)):
 _TONIGHT_ACTIVE_SECONDS = 40 * 60  # session is "live" if a round landed in 40 min
 
 
-async def _hold_prob_curve(db, map_name: str) -> list[dict]:
-    """Historical attack-completion curve for a map: P(attack done by time t),
-    from MEASURED round durations across valid rounds (actual_time alone is
-    the stopwatch target and is inflated on surrenders — RCA 2026-08-18)."""
+def _hold_prob_query(map_name: str) -> tuple[str, tuple]:
+    """Measured durations of a map's completed attacks, for `_hold_prob_points`."""
     dur = round_duration_sql("rounds")
-    rows = await db.fetch_all(
+    return (
         f"""
         SELECT {dur} AS secs
         FROM rounds
@@ -242,6 +240,12 @@ async def _hold_prob_curve(db, map_name: str) -> list[dict]:
         """,
         (map_name,),
     )
+
+
+def _hold_prob_points(rows) -> list[dict]:
+    """Historical attack-completion curve for a map: P(attack done by time t),
+    from MEASURED round durations across valid rounds (actual_time alone is
+    the stopwatch target and is inflated on surrenders — RCA 2026-08-18)."""
     secs = sorted(int(r[0]) for r in (rows or []))
     if len(secs) < 3:
         return []
@@ -258,6 +262,10 @@ async def _hold_prob_curve(db, map_name: str) -> list[dict]:
     return points
 
 
+async def _hold_prob_curve(db, map_name: str) -> list[dict]:
+    return _hold_prob_points(await db.fetch_all(*_hold_prob_query(map_name)))
+
+
 @router.get("/stats/hold-probability")
 async def get_hold_probability(map_name: str = Query(alias="map"),
                                db: DatabaseAdapter = Depends(get_db)):
@@ -285,11 +293,14 @@ def _lua_players(val) -> list[dict]:
     return [p for p in (val or []) if isinstance(p, dict)]
 
 
-async def _tonight_team_names(db, gaming_session_id, anchor_a: set, anchor_b: set):
+_TONIGHT_TEAMS_SQL = "SELECT team_name, player_guids FROM session_teams WHERE gaming_session_id = ?"
+
+
+def _tonight_team_names(rows, anchor_a: set, anchor_b: set):
     """Best-effort logical-team display names. In stopwatch mode the Axis/Allies
     labels swap every round, so the only stable identity is the roster. If the
-    bot has already written session_teams for this session, map those names onto
-    the alpha/beta anchors by GUID overlap; otherwise fall back to Team A/Team B.
+    bot has already written session_teams for this session (*rows*, from
+    _TONIGHT_TEAMS_SQL), map those names onto the alpha/beta anchors by GUID overlap; otherwise fall back to Team A/Team B.
 
     Defensive on purpose: names are cosmetic (the rosters are the real identity),
     so any schema/data surprise falls back to the generic labels rather than
@@ -297,15 +308,9 @@ async def _tonight_team_names(db, gaming_session_id, anchor_a: set, anchor_b: se
     the lua feed has full 32-char GUIDs — compare on the 8-char prefix.
     """
     default = ("Team A", "Team B")
-    if not gaming_session_id:
-        return default
     short_a = {g[:8] for g in anchor_a if g}
     short_b = {g[:8] for g in anchor_b if g}
     try:
-        rows = await db.fetch_all(
-            "SELECT team_name, player_guids FROM session_teams WHERE gaming_session_id = ?",
-            (gaming_session_id,),
-        )
         by_team: dict[str, set] = {}
         for name, guids in (rows or []):
             if not name:
@@ -616,8 +621,24 @@ async def get_tonight(db: DatabaseAdapter = Depends(get_db)):
         else:
             roster_b[guid] = name_by_guid.get(guid, "?")
 
-    name_a, name_b = await _tonight_team_names(db, last_gsid, set(roster_a), set(roster_b))
-    hold = await _hold_prob_curve(db, current_map) if current_map else []
+    # Team names and the hold curve are independent reads: one batch, one
+    # acquire. Names stay best-effort — if session_teams fails the batch, the
+    # curve is fetched on its own and the generic labels stand in.
+    queries = []
+    if last_gsid:
+        queries.append((_TONIGHT_TEAMS_SQL, (last_gsid,)))
+    if current_map:
+        queries.append(_hold_prob_query(current_map))
+    try:
+        results = await db.fetch_many(queries)
+    except Exception:
+        logger.warning("tonight batch failed; using generic team names", exc_info=True)
+        results = [None] * len(queries)
+        if current_map:
+            results[-1] = await db.fetch_all(*_hold_prob_query(current_map))
+    team_rows = results.pop(0) if last_gsid else None
+    name_a, name_b = _tonight_team_names(team_rows, set(roster_a), set(roster_b))
+    hold = _hold_prob_points(results[0]) if current_map else []
 
     def _roster(d):
         return sorted(d.values(), key=str.lower)
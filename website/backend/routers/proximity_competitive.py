@@ -13,6 +13,10 @@ Implements the top S/M items from docs/ANALYTICS_BENCHMARK_2026-06.md:
 - /proximity/competitive/personal-bests — Leetify-style PB session cards
   (new per-session records vs the player's own history).
 
+First blood, man-advantage and clutch aggregate the stored per-round feature
+rows (services/proximity_features.py) whenever every round in scope is linked;
+the raw-table code under each is the fallback and the parity reference.
+
 killer_reinf is deliberately NOT used (historical rows lack the CS_REINFSEEDS
 offset — bug F1, docs/PROXIMITY_E2E_AUDIT_2026-06-10.md). Victim-side fields
 provide candidate offsets, but only exact internal unanimity plus independent
@@ -21,7 +25,6 @@ normal-spawn validation makes a clock usable.
 
 import re
 from collections import defaultdict
-from itertools import groupby
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
@@ -44,14 +47,33 @@ from website.backend.services.clock_inputs import (
 from website.backend.services.clock_inputs import (
     strict_clock_round_gate_sql as _strict_clock_round_gate_sql,
 )
+from website.backend.services.proximity_features import (
+    advantage_bucket as _advantage_bucket,
+)
+from website.backend.services.proximity_features import (
+    advantage_windows as _advantage_windows,
+)
+from website.backend.services.proximity_features import (
+    detect_clutches as _detect_clutches,
+)
+from website.backend.services.proximity_features import (
+    latest_kill_names,
+    load_player_features,
+    load_round_features,
+    round_winners,
+    scoped_feature_round_ids,
+    timeline_end_ms,
+)
 from website.backend.services.reinforcement_clock import (
     CLOCK_PROTOCOL_VERSION,
-    PlayerLife,
-    ReviveObservation,
     TimingObservation,
     validate_round_clocks,
     validated_clock_tuple,
 )
+from website.backend.services.reinforcement_clock_batch import (
+    load_stored_round_clocks,
+    refresh_round_clocks,
+)
 from website.backend.utils.et_constants import strip_et_colors
 
 router = APIRouter()
@@ -61,8 +83,6 @@ router = APIRouter()
 # moment of the cycle (Quake "spawn control" / OW "stagger" concept).
 STAGGER_THRESHOLD = 0.8
 
-_TEAM_BY_NUM = {1: "AXIS", 2: "ALLIES"}
-
 
 @router.get("/proximity/competitive/stagger")
 async def get_stagger_index(
@@ -135,6 +155,9 @@ async def get_first_blood_conversion(
     where_sql, params, scope = _build_proximity_where_clause(
         range_days, session_date, map_name, round_number, round_start_unix,
     )
+    round_ids = await scoped_feature_round_ids(db, where_sql, params)
+    if round_ids is not None:
+        return await _first_blood_from_features(db, round_ids, scope)
     # First kill of every round in scope (round identity = round_start_unix).
     rows = await db.fetch_all(
         f"""
@@ -152,21 +175,17 @@ async def get_first_blood_conversion(
         return {"status": "ok", "scope": scope, "rounds": 0, "players": []}
 
     # Round winners for the same scope (exclude filler/invalid + draws).
-    win_params: list = [list(first_bloods.keys())]
-    win_sql = "SELECT round_start_unix, winner_team FROM rounds WHERE round_start_unix = ANY($1)"
-    win_sql += " AND is_valid IS DISTINCT FROM FALSE AND winner_team IN (1, 2)"
-    win_rows = await db.fetch_all(win_sql, tuple(win_params))
-    winner_by_rsu = {int(r[0]): _TEAM_BY_NUM.get(int(r[1])) for r in (win_rows or [])}
+    winner_by_rsu = await round_winners(db, first_bloods)
+    names = await _latest_kill_names_in_scope(db, where_sql, params)
 
     converted = 0
     decided = 0
     picks: dict[str, dict] = defaultdict(lambda: {"name": "", "first_picks": 0, "first_deaths": 0, "fp_converted": 0})
     for rsu, fb in first_bloods.items():
-        killer_guid, killer_name, killer_team = fb[1], fb[2], fb[3]
-        victim_guid, victim_name = fb[4], fb[5]
-        picks[killer_guid]["name"] = strip_et_colors(killer_name or killer_guid[:8])
+        killer_guid, killer_team, victim_guid = fb[1], fb[3], fb[4]
+        picks[killer_guid]["name"] = strip_et_colors(names.get(killer_guid) or killer_guid[:8])
         picks[killer_guid]["first_picks"] += 1
-        picks[victim_guid]["name"] = strip_et_colors(victim_name or victim_guid[:8])
+        picks[victim_guid]["name"] = strip_et_colors(names.get(victim_guid) or victim_guid[:8])
         picks[victim_guid]["first_deaths"] += 1
         winner = winner_by_rsu.get(rsu)
         if winner is None:
@@ -175,7 +194,33 @@ async def get_first_blood_conversion(
         if winner == killer_team:
             converted += 1
             picks[killer_guid]["fp_converted"] += 1
+    return _first_blood_payload(scope, len(first_bloods), decided, converted, picks)
+
+
+async def _first_blood_from_features(db: DatabaseAdapter, round_ids: list[int], scope: dict) -> dict:
+    """get_first_blood_conversion over the stored per-round features."""
+    rounds = [r for r in await load_round_features(db, round_ids) if r.first_blood_team]
+    if not rounds:
+        return {"status": "ok", "scope": scope, "rounds": 0, "players": []}
+    decided = sum(1 for r in rounds if r.winner_team)
+    converted = sum(1 for r in rounds if r.winner_team == r.first_blood_team)
+    picks: dict[str, dict] = defaultdict(lambda: {"name": "", "first_picks": 0, "first_deaths": 0, "fp_converted": 0})
+    names: dict[str, str] = {}
+    for p in await load_player_features(db, round_ids):
+        if p.player_name:
+            names[p.player_guid] = p.player_name
+        if not (p.first_picks or p.first_deaths):
+            continue
+        stats = picks[p.player_guid]
+        stats["first_picks"] += p.first_picks
+        stats["first_deaths"] += p.first_deaths
+        stats["fp_converted"] += p.first_pick_converted
+    for guid, stats in picks.items():
+        stats["name"] = strip_et_colors(names.get(guid) or guid[:8])
+    return _first_blood_payload(scope, len(rounds), decided, converted, picks)
+
 
+def _first_blood_payload(scope: dict, rounds: int, decided: int, converted: int, picks: dict) -> dict:
     players = [
         {"guid": g, **stats}
         for g, stats in sorted(
@@ -187,7 +232,7 @@ async def get_first_blood_conversion(
     return {
         "status": "ok",
         "scope": scope,
-        "rounds": len(first_bloods),
+        "rounds": rounds,
         "decided_rounds": decided,
         "converted": converted,
         "conversion_pct": round(converted / decided * 100, 1) if decided else None,
@@ -523,154 +568,6 @@ async def get_v7_status(db: DatabaseAdapter = Depends(get_db)):
 # ===== Wave 2: man-advantage / clutch / side splits =====
 # (docs/ANALYTICS_BENCHMARK_2026-06.md proposals #4, #5, #6)
 
-# A window only counts once both teams have spawned at least once (filters
-# the spurious "advantage" of staggered initial spawns).
-ADV_KILL_EPSILON_MS = 100  # the window-opening kill itself is not a conversion
-CLUTCH_MIN_ENEMIES = 2
-CLUTCH_MIN_WAVE_WAIT_MS = 5000
-
-_OTHER_TEAM = {"AXIS": "ALLIES", "ALLIES": "AXIS"}
-
-
-def _advantage_windows(lives: list, kills: list, round_end_ms: int) -> list[dict]:
-    """Man-advantage windows from the alive-count differential timeline.
-
-    lives: (guid, team, spawn_ms, death_ms_or_None)
-    kills: (kill_time, killer_team, killer_guid, killer_name, victim_team)
-    Window = contiguous span where one team has more players alive; converted
-    when the advantaged team lands a further kill inside the window.
-    """
-    events: list[tuple[int, int, str]] = []
-    first_spawn: dict[str, int] = {}
-    for _guid, team, spawn_ms, death_ms in lives:
-        if team not in _OTHER_TEAM:
-            continue
-        end = death_ms if death_ms and death_ms > spawn_ms else round_end_ms
-        events.append((int(spawn_ms), 0, team))
-        events.append((int(end), 1, team))
-        if team not in first_spawn or spawn_ms < first_spawn[team]:
-            first_spawn[team] = int(spawn_ms)
-    if len(first_spawn) < 2:
-        return []
-    ready_ms = max(first_spawn.values())
-    events.sort()
-
-    alive = {"AXIS": 0, "ALLIES": 0}
-    windows: list[dict] = []
-    current: dict | None = None
-    # Evaluate the differential once per timestamp — simultaneous events
-    # (paired wave spawns, multikills) must not create transient windows.
-    for t, group in groupby(events, key=lambda e: e[0]):
-        for _, kind, team in group:
-            alive[team] += 1 if kind == 0 else -1
-        diff = alive["AXIS"] - alive["ALLIES"]
-        leader = "AXIS" if diff > 0 else ("ALLIES" if diff < 0 else None)
-        if current is not None and leader != current["team"]:
-            current["end"] = t
-            windows.append(current)
-            current = None
-        if current is None and leader is not None and t >= ready_ms:
-            current = {"team": leader, "start": t, "max_size": abs(diff)}
-        elif current is not None:
-            current["max_size"] = max(current["max_size"], abs(diff))
-    if current is not None:
-        current["end"] = round_end_ms
-        windows.append(current)
-
-    for w in windows:
-        # Half-open [start, end): events at `end` are what removed the edge,
-        # so a kill at exactly `end` happened with the edge already gone.
-        converter = next(
-            (
-                k for k in kills
-                if k[1] == w["team"]
-                and k[4] == _OTHER_TEAM[w["team"]]
-                and w["start"] + ADV_KILL_EPSILON_MS < k[0] < w["end"]
-            ),
-            None,
-        )
-        w["converted"] = converter is not None
-        w["converter_guid"] = converter[2] if converter else None
-        w["converter_name"] = converter[3] if converter else None
-    return windows
-
-
-def _detect_clutches(
-    lives: list, kills: list, clocks: dict, round_end_ms: int,
-) -> list[dict]:
-    """Fight-scoped 1vN clutches (no round-end elimination state in ET).
-
-    Situation: a death leaves exactly one player alive on their team while
-    >=CLUTCH_MIN_ENEMIES enemies live and the friendly wave is
-    >=CLUTCH_MIN_WAVE_WAIT_MS away. Won if the survivor gets a kill and
-    lives to the wave, or trades up (kills >= enemies - 1).
-    """
-    events: list[tuple[int, int, str, str]] = []
-    for guid, team, spawn_ms, death_ms in lives:
-        if team not in _OTHER_TEAM:
-            continue
-        end = death_ms if death_ms and death_ms > spawn_ms else round_end_ms
-        events.append((int(spawn_ms), 0, team, guid))
-        events.append((int(end), 1, team, guid))
-    events.sort(key=lambda e: (e[0], e[1]))
-
-    alive: dict[str, set] = {"AXIS": set(), "ALLIES": set()}
-    situations: list[dict] = []
-    busy_until: dict[str, int] = {}
-    # Evaluate once per timestamp (a multikill must not fire intermediate
-    # "last alive" states mid-group).
-    for t, group in groupby(events, key=lambda e: e[0]):
-        died_teams: set[str] = set()
-        for _, kind, team, guid in group:
-            if kind == 0:
-                alive[team].add(guid)
-            else:
-                alive[team].discard(guid)
-                died_teams.add(team)
-        for team in died_teams:
-            if len(alive[team]) != 1:
-                continue
-            survivor = next(iter(alive[team]))
-            enemies = len(alive[_OTHER_TEAM[team]])
-            clock = clocks.get(team)
-            if enemies < CLUTCH_MIN_ENEMIES or clock is None:
-                continue
-            if t < busy_until.get(survivor, 0):
-                continue
-            offset, interval = clock
-            # Ceiling wave landing (>= t): a death exactly on a wave landing
-            # means reinforcements are immediate, not a full interval away.
-            t_wave = -((-(t + offset)) // interval) * interval - offset
-            if t_wave - t < CLUTCH_MIN_WAVE_WAIT_MS:
-                continue
-            t_wave = min(t_wave, round_end_ms)
-            # The survivor's current life bounds the situation.
-            life_end = round_end_ms
-            for life_guid, life_team, spawn_ms, death_ms in lives:
-                d = death_ms if death_ms and death_ms > spawn_ms else round_end_ms
-                if life_guid == survivor and life_team == team and spawn_ms <= t < d:
-                    life_end = d
-                    break
-            end = min(t_wave, life_end)
-            sit_kills = sum(
-                1 for k in kills
-                if k[2] == survivor and k[4] == _OTHER_TEAM[team] and t < k[0] <= end
-            )
-            survived = life_end >= t_wave
-            won = (sit_kills >= 1 and survived) or sit_kills >= enemies - 1
-            situations.append({
-                "guid": survivor,
-                "team": team,
-                "start": t,
-                "enemies": enemies,
-                "kills": sit_kills,
-                "survived": survived,
-                "won": won,
-            })
-            busy_until[survivor] = end
-    return situations
-
-
 async def _fetch_round_lives_and_kills(
     db: DatabaseAdapter,
     where_sql: str,
@@ -699,111 +596,78 @@ async def _fetch_round_lives_and_kills(
         """,  # nosec B608 - where_sql is $N-parameterized by _build_proximity_where_clause; no user data interpolated
         tuple(params),
     )
-    clock_track_rows = []
-    revive_rows = []
-    if include_clocks:
-        clock_track_rows = await db.fetch_all(
-            f"""
-            SELECT round_id, id, player_guid, player_name, team, spawn_time_ms,
-                   death_time_ms, path -> -1 ->> 'event' AS death_type
-            FROM player_track
-            {where_sql} AND round_id IS NOT NULL
-              AND {_strict_clock_round_gate_sql()}
-            """,  # nosec B608 - where_sql is $N-parameterized by _build_proximity_where_clause; no user data interpolated
-            tuple(params),
-        )
-        revive_rows = await db.fetch_all(
-            f"""
-            SELECT round_id, revived_guid, revived_name, revive_time
-            FROM proximity_revive
-            {where_sql} AND round_id IS NOT NULL
-              AND {_strict_clock_round_gate_sql()}
-            """,  # nosec B608 - where_sql is $N-parameterized by _build_proximity_where_clause; no user data interpolated
-            tuple(params),
-        )
     rounds: dict[tuple, dict] = defaultdict(
-        lambda: {
-            "lives": [],
-            "kills": [],
-            "timings": [],
-            "clock_lives": [],
-            "revives": [],
-            "clock_validation": {},
-        }
+        lambda: {"lives": [], "kills": [], "clock_validation": {}}
     )
     for r in (track_rows or []):
         key = _timeline_round_key(r[0], r[1], r[2], r[3], r[4])
         rounds[key]["lives"].append((r[5], r[6], int(r[7] or 0), r[8]))
+        rounds[key]["order"] = (int(r[4] or 0), int(r[0] or 0))
     for r in (kill_rows or []):
         key = _timeline_round_key(r[0], r[1], r[2], r[3], r[4])
+        rounds[key]["order"] = (int(r[4] or 0), int(r[0] or 0))
         if r[7] != r[12]:
             rounds[key]["kills"].append(
-                (int(r[5] or 0), r[6], r[7], r[8], r[9])
+                (int(r[5] or 0), r[6], r[7], r[8], r[9], r[12], r[13])
             )
 
-    eligible_round_ids = {int(r[0]) for r in (clock_track_rows or [])}
-    for r in (clock_track_rows or []):
-        key = ("round_id", int(r[0]))
-        if not _is_bot_player(r[2], r[3]):
-            rounds[key]["clock_lives"].append(
-                PlayerLife(
-                    row_id=int(r[1]),
-                    player_guid=str(r[2]),
-                    team=str(r[4] or ""),
-                    spawn_time_ms=int(r[5]),
-                    death_time_ms=int(r[6]) if r[6] is not None else None,
-                    death_type=r[7],
-                )
-            )
-    for r in (kill_rows or []):
-        if (
-            include_clocks
-            and r[0] is not None
-            and int(r[0]) in eligible_round_ids
-            and not _is_bot_player(r[12], r[13])
-        ):
-            key = ("round_id", int(r[0]))
-            rounds[key]["timings"].append(
-                TimingObservation(
-                    team=str(r[9] or ""),
-                    kill_time_ms=int(r[5] or 0),
-                    interval_ms=int(r[10] or 0),
-                    time_to_next_spawn_ms=int(r[11]) if r[11] is not None else None,
-                    spawn_timing_score=float(r[14]) if r[14] is not None else None,
-                )
-            )
-    for r in (revive_rows or []):
-        if not _is_bot_player(r[1], r[2]):
-            rounds[("round_id", int(r[0]))]["revives"].append(
-                ReviveObservation(player_guid=str(r[1]), time_ms=int(r[3]))
-            )
+    if include_clocks:
+        # Stored per round (migration 083); only rounds without a current
+        # stored clock are reconstructed, in one batched pass, and stored.
+        round_ids = sorted({int(key[1]) for key in rounds if key[0] == "round_id"})
+        validations = await load_stored_round_clocks(db, round_ids)
+        missing = [rid for rid in round_ids if rid not in validations]
+        if missing:
+            validations.update(await refresh_round_clocks(db, missing))
+        for round_id, clocks in validations.items():
+            if ("round_id", round_id) in rounds:
+                rounds[("round_id", round_id)]["clock_validation"] = clocks
+
     for data in rounds.values():
         # Round end from spawns AND deaths (a survivor's death_ms is None) AND
         # kill times — death-only would truncate windows on survivor-heavy
         # rounds. Kills sorted so the converter pick is deterministic.
         data["kills"].sort(key=lambda k: k[0])
-        ends = (
-            [s for _, _, s, _ in data["lives"]]
-            + [d for _, _, _, d in data["lives"] if d]
-            + [k[0] for k in data["kills"]]
-        )
-        data["end_ms"] = max(ends) if ends else 0
-        data["clocks"] = {}
-        if include_clocks:
-            validations = validate_round_clocks(
-                data["timings"],
-                data["clock_lives"],
-                data["revives"],
-            )
-            data["clock_validation"] = validations
-            data["clocks"] = {
-                team: clock
-                for team, validation in validations.items()
-                if (clock := validated_clock_tuple(validation)) is not None
-            }
+        data["end_ms"] = timeline_end_ms(data["lives"], data["kills"])
+        data["clocks"] = {
+            team: clock
+            for team, validation in data["clock_validation"].items()
+            if (clock := validated_clock_tuple(validation)) is not None
+        }
     return rounds
 
 
+def _round_kill_names(rounds: dict[tuple, dict]) -> dict[str, str]:
+    """latest_kill_names over the fetched rounds, oldest round first."""
+    names: dict[str, str] = {}
+    for data in sorted(rounds.values(), key=lambda data: data["order"]):
+        latest_kill_names(data["kills"], names)
+    return names
+
+
+async def _latest_kill_names_in_scope(
+    db: DatabaseAdapter, where_sql: str, params: list,
+) -> dict[str, str]:
+    """latest_kill_names over every kill row in scope, in one query."""
+    rows = await db.fetch_all(
+        f"""
+        SELECT DISTINCT ON (guid) guid, name FROM (
+            SELECT round_start_unix, round_id, kill_time,
+                   killer_guid AS guid, killer_name AS name
+            FROM proximity_spawn_timing {where_sql} AND killer_guid <> victim_guid
+            UNION ALL
+            SELECT round_start_unix, round_id, kill_time, victim_guid, victim_name
+            FROM proximity_spawn_timing {where_sql} AND killer_guid <> victim_guid
+        ) named
+        WHERE name <> ''
+        ORDER BY guid, COALESCE(round_start_unix, 0) DESC, COALESCE(round_id, 0) DESC,
+                 kill_time DESC
+        """,  # nosec B608 - where_sql is $N-parameterized by _build_proximity_where_clause; no user data interpolated
+        tuple(params),
+    )
+    return {row[0]: row[1] for row in (rows or [])}
+
+
 def _timeline_round_key(
     round_id,
     session_date,
@@ -835,12 +699,13 @@ async def get_man_advantage(
     where_sql, params, scope = _build_proximity_where_clause(
         range_days, session_date, map_name, round_number, round_start_unix,
     )
+    round_ids = await scoped_feature_round_ids(db, where_sql, params)
+    if round_ids is not None:
+        return await _man_advantage_from_features(db, round_ids, scope)
     rounds = await _fetch_round_lives_and_kills(db, where_sql, params)
+    names = _round_kill_names(rounds)
 
-    teams = {
-        t: {"windows": 0, "converted": 0, "by_size": {"1": [0, 0], "2": [0, 0], "3+": [0, 0]}}
-        for t in ("AXIS", "ALLIES")
-    }
+    teams = _advantage_teams()
     converters: dict[str, dict] = defaultdict(lambda: {"name": "", "conversions": 0})
     total_windows = 0
     for data in rounds.values():
@@ -848,7 +713,7 @@ async def get_man_advantage(
             continue
         for w in _advantage_windows(data["lives"], data["kills"], data["end_ms"]):
             team = teams[w["team"]]
-            bucket = "1" if w["max_size"] == 1 else ("2" if w["max_size"] == 2 else "3+")
+            bucket = _advantage_bucket(w["max_size"])
             team["windows"] += 1
             team["by_size"][bucket][0] += 1
             total_windows += 1
@@ -856,8 +721,48 @@ async def get_man_advantage(
                 team["converted"] += 1
                 team["by_size"][bucket][1] += 1
                 c = converters[w["converter_guid"]]
-                c["name"] = strip_et_colors(w["converter_name"] or w["converter_guid"][:8])
+                c["name"] = strip_et_colors(names.get(w["converter_guid"]) or w["converter_guid"][:8])
                 c["conversions"] += 1
+    return _man_advantage_payload(scope, len(rounds), teams, total_windows, converters)
+
+
+def _advantage_teams() -> dict:
+    return {
+        t: {"windows": 0, "converted": 0, "by_size": {"1": [0, 0], "2": [0, 0], "3+": [0, 0]}}
+        for t in ("AXIS", "ALLIES")
+    }
+
+
+async def _man_advantage_from_features(db: DatabaseAdapter, round_ids: list[int], scope: dict) -> dict:
+    """get_man_advantage over the stored per-round features."""
+    round_rows = await load_round_features(db, round_ids)
+    teams = _advantage_teams()
+    total_windows = 0
+    for r in round_rows:
+        for team_name, buckets in r.advantage.items():
+            team = teams[team_name]
+            for bucket, (windows, converted) in buckets.items():
+                team["windows"] += windows
+                team["converted"] += converted
+                team["by_size"][bucket][0] += windows
+                team["by_size"][bucket][1] += converted
+                total_windows += windows
+    converters: dict[str, dict] = defaultdict(lambda: {"name": "", "conversions": 0})
+    names: dict[str, str] = {}
+    for p in await load_player_features(db, round_ids):
+        if p.player_name:
+            names[p.player_guid] = p.player_name
+        if p.advantage_conversions:
+            converters[p.player_guid]["conversions"] += p.advantage_conversions
+    for guid, c in converters.items():
+        c["name"] = strip_et_colors(names.get(guid) or guid[:8])
+    rounds = sum(1 for r in round_rows if r.has_lives or r.has_kills)
+    return _man_advantage_payload(scope, rounds, teams, total_windows, converters)
+
+
+def _man_advantage_payload(
+    scope: dict, rounds: int, teams: dict, total_windows: int, converters: dict,
+) -> dict:
     for t in teams.values():
         t["conversion_pct"] = round(t["converted"] / t["windows"] * 100, 1) if t["windows"] else 0.0
         t["by_size"] = {
@@ -870,7 +775,7 @@ async def get_man_advantage(
     return {
         "status": "ok",
         "scope": scope,
-        "rounds": len(rounds),
+        "rounds": rounds,
         "description": (
             "Advantage window = one team has more players alive (counted once "
             "both teams have spawned). Converted = a further kill lands while "
@@ -895,6 +800,9 @@ async def get_clutches(
     where_sql, params, scope = _build_proximity_where_clause(
         range_days, session_date, map_name, round_number, round_start_unix,
     )
+    round_ids = await scoped_feature_round_ids(db, where_sql, params)
+    if round_ids is not None:
+        return await _clutches_from_features(db, round_ids, scope)
     rounds = await _fetch_round_lives_and_kills(
         db,
         where_sql,
@@ -902,10 +810,7 @@ async def get_clutches(
         include_clocks=True,
     )
 
-    names: dict[str, str] = {}
-    for data in rounds.values():
-        for k in data["kills"]:
-            names.setdefault(k[2], k[3])
+    names = _round_kill_names(rounds)
     players: dict[str, dict] = defaultdict(
         lambda: {"situations": 0, "wins": 0, "best": None}
     )
@@ -926,6 +831,41 @@ async def get_clutches(
                 best = p["best"]
                 if best is None or (sit["enemies"], sit["kills"]) > (best["enemies"], best["kills"]):
                     p["best"] = {"enemies": sit["enemies"], "kills": sit["kills"], "survived": sit["survived"]}
+    return _clutch_payload(scope, len(rounds), skipped_no_clock, players, names)
+
+
+async def _clutches_from_features(db: DatabaseAdapter, round_ids: list[int], scope: dict) -> dict:
+    """get_clutches over the stored per-round features."""
+    round_rows = await load_round_features(db, round_ids)
+    names: dict[str, str] = {}
+    players: dict[str, dict] = defaultdict(
+        lambda: {"situations": 0, "wins": 0, "best": None}
+    )
+    for row in await load_player_features(db, round_ids):
+        if row.player_name:
+            names[row.player_guid] = row.player_name
+        if not row.clutch_situations:
+            continue
+        p = players[row.player_guid]
+        p["situations"] += row.clutch_situations
+        p["wins"] += row.clutch_wins
+        if row.clutch_best_enemies is None:
+            continue
+        best = p["best"]
+        if best is None or (row.clutch_best_enemies, row.clutch_best_kills) > (best["enemies"], best["kills"]):
+            p["best"] = {
+                "enemies": row.clutch_best_enemies,
+                "kills": row.clutch_best_kills,
+                "survived": row.clutch_best_survived,
+            }
+    rounds = sum(1 for r in round_rows if r.has_lives or r.has_kills)
+    skipped_no_clock = sum(1 for r in round_rows if r.has_lives and not r.has_clocks)
+    return _clutch_payload(scope, rounds, skipped_no_clock, players, names)
+
+
+def _clutch_payload(
+    scope: dict, rounds: int, skipped_no_clock: int, players: dict, names: dict,
+) -> dict:
     out = [
         {
             "guid": g,
@@ -943,7 +883,7 @@ async def get_clutches(
         "status": "ok",
         "scope": scope,
         "clock_protocol": CLOCK_PROTOCOL_VERSION,
-        "rounds": len(rounds),
+        "rounds": rounds,
         "skipped_rounds_no_clock": skipped_no_clock,
         "description": (
             "Clutch = last player alive of their wave group vs 2+ enemies with "
@@ -3,6 +3,7 @@
 import asyncio
 import time
 from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -59,6 +60,12 @@ from website.backend.routers.proximity_teamplay import (
     get_proximity_teamplay,
 )
 from website.backend.routers.proximity_trades import get_proximity_trade_events, get_proximity_trades_summary
+from website.backend.services.proximity_day_partials import (
+    DayPartial,
+    DayWindow,
+    day_window,
+    window_totals,
+)
 
 router = APIRouter()
 
@@ -384,6 +391,73 @@ async def get_proximity_scopes(
     return payload
 
 
+# ===== PER-DAY PARTIALS =====
+# The summary and kill-outcome aggregates of a plain date window are served
+# from per-day partials (services/proximity_day_partials.py); exact-round and
+# player scopes keep the raw queries below. Averages are carried as sums and
+# divided here, with AVG's own types: numeric for integer columns, float8 for
+# real ones.
+
+_REAL_ENGAGEMENT = "killer_guid IS DISTINCT FROM target_guid"
+
+_ENGAGEMENT_DAYS = DayPartial(
+    "summary_engagements",
+    "combat_engagement",
+    f"COUNT(*) FILTER (WHERE {_REAL_ENGAGEMENT}), "
+    f"SUM(distance_traveled::float8) FILTER (WHERE {_REAL_ENGAGEMENT}), "
+    f"(SUM(duration_ms) FILTER (WHERE {_REAL_ENGAGEMENT}))::bigint, "
+    f"(SUM(num_attackers) FILTER (WHERE {_REAL_ENGAGEMENT}))::bigint, "
+    f"COUNT(*) FILTER (WHERE {_REAL_ENGAGEMENT} AND is_crossfire), "
+    f"COUNT(*) FILTER (WHERE {_REAL_ENGAGEMENT} AND outcome = 'escaped'), "
+    f"COUNT(*) FILTER (WHERE {_REAL_ENGAGEMENT} AND outcome = 'killed'), "
+    "COUNT(DISTINCT (session_date, round_number, round_start_unix))",
+)
+
+# Plain row counts stay raw queries: a day's fingerprint is the same
+# COUNT(*) over the same rows, so a cached partial could only add a query.
+_V5_COUNT_TABLES = (
+    'proximity_spawn_timing', 'proximity_team_cohesion',
+    'proximity_crossfire_opportunity', 'proximity_team_push',
+    'proximity_lua_trade_kill',
+)
+
+_KILL_OUTCOME_DAYS = DayPartial(
+    "kill_outcomes",
+    "proximity_kill_outcome",
+    "COUNT(*), SUM(delta_ms)::bigint, SUM(effective_denied_ms)::bigint",
+    keys=("outcome",),
+)
+
+
+async def _engagement_totals_by_day(db: DatabaseAdapter, window: DayWindow) -> tuple[tuple, int]:
+    """The summary's engagement row and sample-round count, from day partials."""
+    totals = await window_totals(db, _ENGAGEMENT_DAYS, window)
+    if not totals:
+        return (0, None, None, None, None, None, None), 0
+    n, distance, duration, attackers, crossfire, escapes, kills, rounds = totals[()]
+    if not n:
+        return (0, None, None, None, crossfire, escapes, kills), rounds
+    return (
+        n, distance / n, Decimal(duration) / n, Decimal(attackers) / n,
+        crossfire, escapes, kills,
+    ), rounds
+
+
+async def _kill_outcome_totals_by_day(db: DatabaseAdapter, window: DayWindow) -> list[tuple]:
+    """The kill-outcome summary rows (outcome, count, avg delta, avg denied)."""
+    totals = await window_totals(db, _KILL_OUTCOME_DAYS, window)
+
+    def _rounded_avg(total, n):
+        # ROUND(AVG(int)::numeric, 0): exact, halves away from zero
+        return (Decimal(total) / n).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+
+    rows = [
+        (outcome, n, _rounded_avg(delta, n), _rounded_avg(denied, n))
+        for (outcome,), (n, delta, denied) in totals.items()
+    ]
+    return sorted(rows, key=lambda r: (-r[1], r[0]))
+
+
 @router.get("/proximity/summary")
 async def get_proximity_summary(
     range_days: int = 30,
@@ -405,22 +479,31 @@ async def get_proximity_summary(
         round_start_unix,
     )
     query_params = tuple(params)
+    window = day_window(params, scope)
 
     try:
-        engagement_row = await db.fetch_one(
-            "SELECT COUNT(*) AS total_engagements, "
-            "AVG(distance_traveled) AS avg_distance, "
-            "AVG(duration_ms) AS avg_duration_ms, "
-            "AVG(num_attackers) AS avg_attackers, "
-            "SUM(CASE WHEN is_crossfire THEN 1 ELSE 0 END) AS crossfire_events, "
-            "SUM(CASE WHEN outcome = 'escaped' THEN 1 ELSE 0 END) AS escapes, "
-            "SUM(CASE WHEN outcome = 'killed' THEN 1 ELSE 0 END) AS kills "
-            f"FROM combat_engagement {where_sql} "
-            # self-rows (world/self-kill artifacts, ~12% of the table) are
-            # not real engagements — they deflated escape/kill rates (S14)
-            "AND killer_guid IS DISTINCT FROM target_guid",
-            query_params,
-        )
+        if window is not None:
+            engagement_row, sample_rounds = await _engagement_totals_by_day(db, window)
+        else:
+            engagement_row = await db.fetch_one(
+                "SELECT COUNT(*) AS total_engagements, "
+                "AVG(distance_traveled) AS avg_distance, "
+                "AVG(duration_ms) AS avg_duration_ms, "
+                "AVG(num_attackers) AS avg_attackers, "
+                "SUM(CASE WHEN is_crossfire THEN 1 ELSE 0 END) AS crossfire_events, "
+                "SUM(CASE WHEN outcome = 'escaped' THEN 1 ELSE 0 END) AS escapes, "
+                "SUM(CASE WHEN outcome = 'killed' THEN 1 ELSE 0 END) AS kills "
+                f"FROM combat_engagement {where_sql} "
+                # self-rows (world/self-kill artifacts, ~12% of the table) are
+                # not real engagements — they deflated escape/kill rates (S14)
+                "AND killer_guid IS DISTINCT FROM target_guid",
+                query_params,
+            )
+            sample_rounds = await db.fetch_val(
+                "SELECT COUNT(DISTINCT (session_date, round_number, round_start_unix)) "
+                f"FROM combat_engagement {where_sql}",
+                query_params,
+            )
         total_engagements = engagement_row[0] if engagement_row else 0
         avg_distance = engagement_row[1] if engagement_row else None
         avg_duration = engagement_row[2] if engagement_row else None
@@ -429,12 +512,6 @@ async def get_proximity_summary(
         escapes = engagement_row[5] if engagement_row else 0
         kills = engagement_row[6] if engagement_row else 0
 
-        sample_rounds = await db.fetch_val(
-            "SELECT COUNT(DISTINCT (session_date, round_number, round_start_unix)) "
-            f"FROM combat_engagement {where_sql}",
-            query_params,
-        )
-
         hotzones = await db.fetch_val(
             """
             SELECT COUNT(*)
@@ -489,9 +566,7 @@ async def get_proximity_summary(
         # "no events" (S15 / DEEP_RCA A5).
         v5_counts = {}
         v5_counts_unknown: list[str] = []
-        for tbl in ['proximity_spawn_timing', 'proximity_team_cohesion',
-                     'proximity_crossfire_opportunity', 'proximity_team_push',
-                     'proximity_lua_trade_kill']:
+        for tbl in _V5_COUNT_TABLES:
             try:
                 cnt = await db.fetch_val(
                     f"SELECT COUNT(*) FROM {tbl} {where_sql}", query_params
@@ -585,19 +660,23 @@ async def get_proximity_kill_outcomes(
         player_guid=player_guid, player_guid_columns=["victim_guid", "killer_guid"],
     )
     query_params = tuple(params)
+    window = day_window(params, scope)
     try:
         # Summary by outcome type
-        summary_rows = await db.fetch_all(
-            f"""
-            SELECT outcome, COUNT(*) AS cnt,
-                   ROUND(AVG(delta_ms)::numeric, 0) AS avg_delta,
-                   ROUND(AVG(effective_denied_ms)::numeric, 0) AS avg_denied
-            FROM proximity_kill_outcome {where_sql}
-            GROUP BY outcome
-            ORDER BY cnt DESC
-            """,
-            query_params,
-        )
+        if window is not None:
+            summary_rows = await _kill_outcome_totals_by_day(db, window)
+        else:
+            summary_rows = await db.fetch_all(
+                f"""
+                SELECT outcome, COUNT(*) AS cnt,
+                       ROUND(AVG(delta_ms)::numeric, 0) AS avg_delta,
+                       ROUND(AVG(effective_denied_ms)::numeric, 0) AS avg_denied
+                FROM proximity_kill_outcome {where_sql}
+                GROUP BY outcome
+                ORDER BY cnt DESC
+                """,
+                query_params,
+            )
         total = sum(int(r[1] or 0) for r in (summary_rows or []))
         outcome_map = {}
         for r in (summary_rows or []):
@@ -10,6 +10,10 @@ from website.backend.routers.proximity_helpers import (
     _table_column_exists,
     logger,
 )
+from website.backend.services.proximity_features import (
+    load_player_features,
+    scoped_feature_round_ids,
+)
 
 router = APIRouter()
 
@@ -36,16 +40,20 @@ async def get_proximity_trades_summary(
     )
     query_params = tuple(params)
     try:
-        row = await db.fetch_one(
-            "SELECT COUNT(*) AS events, "
-            "SUM(opportunity_count) AS opportunities, "
-            "SUM(attempt_count) AS attempts, "
-            "SUM(success_count) AS successes, "
-            "SUM(missed_count) AS missed, "
-            "SUM(CASE WHEN is_isolation_death THEN 1 ELSE 0 END) AS isolation_deaths "
-            f"FROM proximity_trade_event {where_sql}",
-            query_params,
-        )
+        round_ids = await scoped_feature_round_ids(db, where_sql, params)
+        if round_ids is not None:
+            row = _trade_totals(await load_player_features(db, round_ids))
+        else:
+            row = await db.fetch_one(
+                "SELECT COUNT(*) AS events, "
+                "SUM(opportunity_count) AS opportunities, "
+                "SUM(attempt_count) AS attempts, "
+                "SUM(success_count) AS successes, "
+                "SUM(missed_count) AS missed, "
+                "SUM(CASE WHEN is_isolation_death THEN 1 ELSE 0 END) AS isolation_deaths "
+                f"FROM proximity_trade_event {where_sql}",
+                query_params,
+            )
         events = row[0] if row else 0
         support_row = await db.fetch_one(
             "SELECT SUM(support_samples) AS support_samples, "
@@ -116,40 +124,16 @@ async def get_proximity_trades_player_stats(
     )
     query_params = tuple(params)
     try:
-        # Victim-side stats: how often were this player's deaths traded by teammates
-        victim_query = f"""
-            SELECT victim_guid AS guid, victim_name AS name,
-                   SUM(opportunity_count) AS trade_opps,
-                   SUM(attempt_count) AS trade_attempts,
-                   SUM(success_count) AS trade_success,
-                   SUM(missed_count) AS trade_missed,
-                   SUM(CASE WHEN is_isolation_death THEN 1 ELSE 0 END) AS isolation_deaths
-            FROM proximity_trade_event {where_sql}
-            GROUP BY victim_guid, victim_name
-        """
-        victim_rows = await db.fetch_all(victim_query, query_params)
-
-        # Avenger-side stats: how often did this player avenge a teammate's death
-        # successes JSON array contains trader info: each element has trader_guid
-        avenger_where, avenger_params, _ = _build_proximity_where_clause(
-            range_days, session_date, map_name, round_number, round_start_unix,
-            alias="e",
-        )
-        avenger_query = f"""
-            SELECT
-                s->>'guid' AS guid,
-                s->>'name' AS name,
-                COUNT(*) AS avenged_count,
-                COUNT(DISTINCT e.id) AS avenger_attempt_events,
-                COALESCE(SUM(CASE WHEN s->>'damage' IS NOT NULL THEN (s->>'damage')::numeric ELSE 0 END), 0) AS avenger_attempt_damage
-            FROM proximity_trade_event e
-            CROSS JOIN LATERAL jsonb_array_elements(
-                COALESCE(e.successes, '[]'::jsonb)
-            ) AS s
-            {avenger_where}
-            GROUP BY s->>'guid', s->>'name'
-        """
-        avenger_rows = await db.fetch_all(avenger_query, tuple(avenger_params))
+        round_ids = await scoped_feature_round_ids(db, where_sql, params)
+        if round_ids is not None:
+            victim_rows, avenger_rows = _trade_player_rows(
+                await load_player_features(db, round_ids)
+            )
+        else:
+            victim_rows, avenger_rows = await _raw_trade_player_rows(
+                db, where_sql, query_params,
+                range_days, session_date, map_name, round_number, round_start_unix,
+            )
 
         # Merge victim + avenger stats per player
         players_map = {}
@@ -209,6 +193,87 @@ async def get_proximity_trades_player_stats(
     return payload
 
 
+def _trade_totals(players) -> tuple:
+    """The trade-summary SUM row, folded from stored player features."""
+    return (
+        sum(p.trade_events for p in players),
+        sum(p.trade_opportunities for p in players),
+        sum(p.trade_attempts for p in players),
+        sum(p.trade_successes for p in players),
+        sum(p.trade_missed for p in players),
+        sum(p.isolation_deaths for p in players),
+    )
+
+
+def _trade_player_rows(players) -> tuple[list, list]:
+    """The raw victim/avenger GROUP BY rows, folded from stored player features."""
+    victims: dict[str, list] = {}
+    avengers: dict[str, list] = {}
+    for p in players:
+        if p.trade_events:
+            v = victims.setdefault(p.player_guid, [p.player_guid, p.player_name, 0, 0, 0, 0, 0])
+            v[1] = p.player_name or v[1]
+            v[2] += p.trade_opportunities
+            v[3] += p.trade_attempts
+            v[4] += p.trade_successes
+            v[5] += p.trade_missed
+            v[6] += p.isolation_deaths
+        if p.avenged_count:
+            a = avengers.setdefault(p.player_guid, [p.player_guid, p.player_name, 0, 0, 0.0])
+            a[1] = p.player_name or a[1]
+            a[2] += p.avenged_count
+            a[3] += p.avenger_events
+            a[4] += p.avenger_damage
+    return list(victims.values()), list(avengers.values())
+
+
+async def _raw_trade_player_rows(
+    db: DatabaseAdapter,
+    where_sql: str,
+    query_params: tuple,
+    range_days: int,
+    session_date: str | None,
+    map_name: str | None,
+    round_number: int | None,
+    round_start_unix: int | None,
+) -> tuple[list, list]:
+    # Victim-side stats: how often were this player's deaths traded by teammates
+    victim_query = f"""
+        SELECT victim_guid AS guid, victim_name AS name,
+               SUM(opportunity_count) AS trade_opps,
+               SUM(attempt_count) AS trade_attempts,
+               SUM(success_count) AS trade_success,
+               SUM(missed_count) AS trade_missed,
+               SUM(CASE WHEN is_isolation_death THEN 1 ELSE 0 END) AS isolation_deaths
+        FROM proximity_trade_event {where_sql}
+        GROUP BY victim_guid, victim_name
+    """
+    victim_rows = await db.fetch_all(victim_query, query_params)
+
+    # Avenger-side stats: how often did this player avenge a teammate's death
+    # successes JSON array contains trader info: each element has trader_guid
+    avenger_where, avenger_params, _ = _build_proximity_where_clause(
+        range_days, session_date, map_name, round_number, round_start_unix,
+        alias="e",
+    )
+    avenger_query = f"""
+        SELECT
+            s->>'guid' AS guid,
+            s->>'name' AS name,
+            COUNT(*) AS avenged_count,
+            COUNT(DISTINCT e.id) AS avenger_attempt_events,
+            COALESCE(SUM(CASE WHEN s->>'damage' IS NOT NULL THEN (s->>'damage')::numeric ELSE 0 END), 0) AS avenger_attempt_damage
+        FROM proximity_trade_event e
+        CROSS JOIN LATERAL jsonb_array_elements(
+            COALESCE(e.successes, '[]'::jsonb)
+        ) AS s
+        {avenger_where}
+        GROUP BY s->>'guid', s->>'name'
+    """
+    avenger_rows = await db.fetch_all(avenger_query, tuple(avenger_params))
+    return victim_rows, avenger_rows
+
+
 @router.get("/proximity/trades/events")
 async def get_proximity_trade_events(
     range_days: int = 30,
@@ -1515,7 +1515,61 @@ async def get_stats_session_detail(
         FROM lua_round_teams
         WHERE round_id IN ({placeholders})
     """
-    lua_rows = await db.fetch_all(lua_query, tuple(round_ids))
+    # 3. Per-player stats aggregated across session
+    player_query = f"""
+        SELECT
+            p.player_guid,
+            MAX(p.player_name) as player_name,
+            SUM(p.kills) as kills,
+            SUM(p.deaths) as deaths,
+            SUM(p.damage_given) as damage_given,
+            SUM(p.damage_received) as damage_received,
+            CASE
+                WHEN SUM(p.time_played_seconds) > 0
+                THEN (SUM(p.damage_given) * 60.0) / SUM(p.time_played_seconds)
+                ELSE 0
+            END as dpm,
+            CASE
+                WHEN SUM(p.deaths) > 0
+                THEN ROUND(SUM(p.kills)::numeric / SUM(p.deaths), 2)
+                ELSE SUM(p.kills)::numeric
+            END as kd,
+            SUM(p.headshot_kills) as headshot_kills,
+            SUM(p.kills) as total_kills_for_hs,
+            SUM(p.gibs) as gibs,
+            SUM(p.self_kills) as self_kills,
+            SUM(COALESCE(p.most_useful_kills, 0)) as useful_kills,
+            SUM(COALESCE(p.full_selfkills, 0)) as full_selfkills,
+            SUM(p.revives_given) as revives_given,
+            SUM(p.times_revived) as times_revived,
+            SUM(p.time_played_seconds) as time_played_seconds,
+            SUM(p.kill_assists) as kill_assists,
+            SUM(LEAST(COALESCE(p.time_dead_minutes, 0), p.time_played_seconds / 60.0)) as time_dead_minutes,
+            SUM(p.denied_playtime) as denied_playtime,
+            COALESCE(SUM(w.hits), 0) as total_hits,
+            COALESCE(SUM(w.shots), 0) as total_shots,
+            COALESCE(SUM(w.headshots), 0) as weapon_headshots,
+            SUM(p.time_played_percent * p.time_played_seconds) as tpp_weighted_sum,
+            SUM(CASE WHEN p.time_played_percent > 0 THEN p.time_played_seconds ELSE 0 END) as tpp_weight
+        FROM player_comprehensive_stats p
+        LEFT JOIN (
+            SELECT round_id, player_guid,
+                SUM(hits) as hits, SUM(shots) as shots, SUM(headshots) as headshots
+            FROM weapon_comprehensive_stats
+            WHERE weapon_name NOT IN ('WS_GRENADE', 'WS_SYRINGE', 'WS_DYNAMITE',
+                                      'WS_AIRSTRIKE', 'WS_ARTILLERY', 'WS_SATCHEL', 'WS_LANDMINE')
+            GROUP BY round_id, player_guid
+        ) w ON p.round_id = w.round_id AND p.player_guid = w.player_guid
+        WHERE p.round_id IN ({placeholders})
+        GROUP BY p.player_guid
+        ORDER BY dpm DESC
+    """
+    # Both reads depend only on round_ids: one connection, one snapshot.
+    lua_rows, player_rows = await db.fetch_many([
+        (lua_query, tuple(round_ids)),
+        (player_query, tuple(round_ids)),
+    ])
+
     lua_by_round = {}
     for lr in lua_rows:
         lua_by_round[lr[0]] = {
@@ -1526,7 +1580,7 @@ async def get_stats_session_detail(
             "winner_team": lr[5],
         }
 
-    # 3. Build matches (group rounds by map in order of play)
+    # 4. Build matches (group rounds by map in order of play)
     matches = []
     current_map = None
     current_rounds = []
@@ -1591,56 +1645,6 @@ async def get_stats_session_detail(
             "rounds": current_rounds,
         })
 
-    # 4. Get per-player stats aggregated across session
-    player_query = f"""
-        SELECT
-            p.player_guid,
-            MAX(p.player_name) as player_name,
-            SUM(p.kills) as kills,
-            SUM(p.deaths) as deaths,
-            SUM(p.damage_given) as damage_given,
-            SUM(p.damage_received) as damage_received,
-            CASE
-                WHEN SUM(p.time_played_seconds) > 0
-                THEN (SUM(p.damage_given) * 60.0) / SUM(p.time_played_seconds)
-                ELSE 0
-            END as dpm,
-            CASE
-                WHEN SUM(p.deaths) > 0
-                THEN ROUND(SUM(p.kills)::numeric / SUM(p.deaths), 2)
-                ELSE SUM(p.kills)::numeric
-            END as kd,
-            SUM(p.headshot_kills) as headshot_kills,
-            SUM(p.kills) as total_kills_for_hs,
-            SUM(p.gibs) as gibs,
-            SUM(p.self_kills) as self_kills,
-            SUM(COALESCE(p.most_useful_kills, 0)) as useful_kills,
-            SUM(COALESCE(p.full_selfkills, 0)) as full_selfkills,
-            SUM(p.revives_given) as revives_given,
-            SUM(p.times_revived) as times_revived,
-            SUM(p.time_played_seconds) as time_played_seconds,
-            SUM(p.kill_assists) as kill_assists,
-            SUM(LEAST(COALESCE(p.time_dead_minutes, 0), p.time_played_seconds / 60.0)) as time_dead_minutes,
-            SUM(p.denied_playtime) as denied_playtime,
-            COALESCE(SUM(w.hits), 0) as total_hits,
-            COALESCE(SUM(w.shots), 0) as total_shots,
-            COALESCE(SUM(w.headshots), 0) as weapon_headshots,
-            SUM(p.time_played_percent * p.time_played_seconds) as tpp_weighted_sum,
-            SUM(CASE WHEN p.time_played_percent > 0 THEN p.time_played_seconds ELSE 0 END) as tpp_weight
-        FROM player_comprehensive_stats p
-        LEFT JOIN (
-            SELECT round_id, player_guid,
-                SUM(hits) as hits, SUM(shots) as shots, SUM(headshots) as headshots
-            FROM weapon_comprehensive_stats
-            WHERE weapon_name NOT IN ('WS_GRENADE', 'WS_SYRINGE', 'WS_DYNAMITE',
-                                      'WS_AIRSTRIKE', 'WS_ARTILLERY', 'WS_SATCHEL', 'WS_LANDMINE')
-            GROUP BY round_id, player_guid
-        ) w ON p.round_id = w.round_id AND p.player_guid = w.player_guid
-        WHERE p.round_id IN ({placeholders})
-        GROUP BY p.player_guid
-        ORDER BY dpm DESC
-    """
-    player_rows = await db.fetch_all(player_query, tuple(round_ids))
 
     # Use duration from matches (lua fallback to actual_time) for all rounds
     total_session_duration_seconds = sum(
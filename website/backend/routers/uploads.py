@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 import time
 from collections import defaultdict
@@ -410,7 +411,8 @@ async def resumable_patch(session_id: str, request: Request,
         if len(buf) > _MAX_PATCH_BYTES:
             raise HTTPException(status_code=413, detail="Chunk too large")
 
-    new_offset = storage.append_chunk(session_id, upload_offset, bytes(buf))
+    # Disk write + running hash happen off the event loop.
+    new_offset = await asyncio.to_thread(storage.append_chunk, session_id, upload_offset, bytes(buf))
     return Response(status_code=204, headers={"Upload-Offset": str(new_offset)})
 
 
@@ -426,7 +428,8 @@ async def finalize_resumable_upload(session_id: str, request: Request, db=Depend
         raise HTTPException(status_code=404, detail="Unknown or expired upload session")
     _require_session_owner(session, discord_id)
 
-    saved, meta = storage.finalize_resumable(session_id)  # validates completeness + magic bytes
+    # validates completeness + magic bytes
+    saved, meta = await asyncio.to_thread(storage.finalize_resumable, session_id)
     try:
         return await _persist_upload(
             db, storage, saved,
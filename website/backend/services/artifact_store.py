@@ -0,0 +1,425 @@
+"""Derived-artifact store — one ``get_or_compute`` for every analytic that is a
+pure function of its inputs.
+
+WHY. The website grew a hand-rolled cache per expensive view, each with its own
+eviction rule and none of them shared: objective pressure kept a 32-entry dict
+on a 5-minute clock, moments a FIFO keyed on (session, limit) with its own lock
+table, and the aim summary its own table (migration 077) with its own read /
+write / fingerprint helpers. Two of the three lost everything on every web
+restart, and only one knew when its inputs had actually changed.
+
+    value = await get_or_compute(
+        "objective_pressure", session_date, fingerprint, compute,
+        db=db, formula_version=OBJECTIVE_PRESSURE_VERSION,
+    )
+
+A caller that needs many scopes of one kind at once (the per-day partials in
+``proximity_day_partials``) uses ``get_many_or_compute``: one read and one
+write for the batch, and one compute for all of its misses.
+
+TWO TIERS, one rule. An entry is served only when BOTH the caller's
+``input_fingerprint`` and ``formula_version`` match what it was computed from;
+anything else is a miss, and the fresh answer replaces the old one for that
+(kind, scope).
+
+  memory    per-process LRU, ARTIFACT_STORE_MAX_ENTRIES (default 512) entries
+  database  ``derived_artifacts`` (migration 082) — survives a restart and is
+            shared by every worker; skipped when no ``db`` is passed
+
+The fingerprint is the caller's to choose and should be a cheap aggregate over
+exactly the rows the artifact is derived from (see ``_aim_fingerprint`` — the
+pattern 077 proved). ``ttl`` exists for kinds whose fingerprint cannot see
+every input, such as moments of a session that may still be importing; it
+bounds both tiers.
+
+Concurrent misses for one (kind, scope, fingerprint, version) share one
+compute. Every failure of the database tier is a miss logged at debug, never an
+error: a cache is an optimisation, and a page that 500s over a derived table is
+a worse product than a slow one. Payloads must be JSON-serialisable to persist;
+one that is not stays in memory only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from website.backend.logging_config import get_app_logger
+from website.backend.metrics import ARTIFACT_COMPUTE_DURATION, ARTIFACT_LOOKUPS
+
+logger = get_app_logger("services.artifact_store")
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("ARTIFACT_STORE_MAX_ENTRIES", "512"))
+
+
+def canonical(value: Any) -> str:
+    """Stable text for a scope or fingerprint: strings as-is, the rest as JSON.
+
+    Tuples and lists serialise alike and dict keys are sorted, so the same
+    inputs always produce the same key in every process.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+@dataclass(slots=True)
+class _Entry:
+    fingerprint: str
+    formula_version: int
+    expires_at: float | None
+    value: Any
+
+
+@dataclass(slots=True)
+class KindStats:
+    memory_hits: int = 0
+    db_hits: int = 0
+    coalesced: int = 0
+    computes: int = 0
+    compute_seconds: float = 0.0
+    db_errors: int = 0
+
+
+class ArtifactStore:
+    """Bounded LRU over an optional Postgres tier, with single-flight computes."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._stats: dict[str, KindStats] = defaultdict(KindStats)
+
+    async def get_or_compute(
+        self,
+        kind: str,
+        scope: Any,
+        input_fingerprint: Any,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        db=None,
+        formula_version: int = 1,
+        ttl: float | None = None,
+        validate: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """The artifact for (kind, scope) as of ``input_fingerprint``.
+
+        ``validate`` screens values read back from the database (a payload
+        written by an older build, or edited by hand); one it rejects is a miss.
+        """
+        scope_key = canonical(scope)
+        fingerprint = canonical(input_fingerprint)
+        stats = self._stats[kind]
+
+        found, value = self._memory_get((kind, scope_key), fingerprint, formula_version)
+        if found:
+            stats.memory_hits += 1
+            ARTIFACT_LOOKUPS.labels(kind=kind, outcome="memory_hit").inc()
+            return value
+
+        flight = (kind, scope_key, fingerprint, formula_version)
+        inflight = self._inflight.get(flight)
+        if inflight is not None:
+            stats.coalesced += 1
+            ARTIFACT_LOOKUPS.labels(kind=kind, outcome="coalesced").inc()
+            # shield: a cancelled follower must not cancel the leader's compute
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                return await compute()  # the leader was cancelled; compute for ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight] = future
+        try:
+            value = await self._load_or_compute(
+                db, kind, scope_key, fingerprint, formula_version, ttl, validate, compute,
+            )
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when no follower is waiting
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(flight, None)
+
+    async def get_many_or_compute(
+        self,
+        kind: str,
+        fingerprints: dict[Any, Any],
+        compute: Callable[[list[Any]], Awaitable[dict[Any, Any]]],
+        *,
+        db=None,
+        formula_version: int = 1,
+        ttl: float | None = None,
+    ) -> dict[Any, Any]:
+        """``get_or_compute`` for many scopes of one kind in one round trip.
+
+        ``fingerprints`` maps each scope to its input fingerprint. ``compute``
+        receives the scopes that missed both tiers, all at once, and returns
+        their values (a scope it leaves out is stored as ``None``). The
+        database tier is read with one query and written with one executemany.
+        There is no single-flight here: concurrent batches over overlapping
+        scopes each compute their own misses.
+        """
+        stats = self._stats[kind]
+        keys = {scope: (canonical(scope), canonical(fp)) for scope, fp in fingerprints.items()}
+        values: dict[Any, Any] = {}
+        for scope, (scope_key, fingerprint) in keys.items():
+            found, value = self._memory_get((kind, scope_key), fingerprint, formula_version)
+            if found:
+                values[scope] = value
+        stats.memory_hits += len(values)
+        ARTIFACT_LOOKUPS.labels(kind=kind, outcome="memory_hit").inc(len(values))
+
+        missing = [scope for scope in keys if scope not in values]
+        if missing and db is not None:
+            stored = await self._db_get_many(
+                db, kind, {keys[s][0]: keys[s][1] for s in missing}, formula_version, ttl,
+            )
+            for scope in missing:
+                scope_key, fingerprint = keys[scope]
+                if scope_key in stored:
+                    values[scope] = stored[scope_key]
+                    self._memory_put((kind, scope_key), fingerprint, formula_version, ttl,
+                                     values[scope])
+                    stats.db_hits += 1
+                    ARTIFACT_LOOKUPS.labels(kind=kind, outcome="db_hit").inc()
+            missing = [scope for scope in missing if scope not in values]
+        if not missing:
+            return values
+
+        started = time.perf_counter()
+        computed = await compute(missing)
+        elapsed = time.perf_counter() - started
+        stats.computes += len(missing)
+        stats.compute_seconds += elapsed
+        ARTIFACT_LOOKUPS.labels(kind=kind, outcome="computed").inc(len(missing))
+        ARTIFACT_COMPUTE_DURATION.labels(kind=kind).observe(elapsed)
+
+        for scope in missing:
+            values[scope] = computed.get(scope)
+            self._memory_put((kind, keys[scope][0]), keys[scope][1], formula_version, ttl,
+                             values[scope])
+        if db is not None:
+            await self._db_put_many(
+                db, kind, [(*keys[scope], values[scope]) for scope in missing],
+                formula_version, elapsed,
+            )
+        return values
+
+    async def _load_or_compute(self, db, kind, scope_key, fingerprint, version, ttl,
+                               validate, compute) -> Any:
+        stats = self._stats[kind]
+        if db is not None:
+            found, value = await self._db_get(db, kind, scope_key, fingerprint, version, ttl)
+            if found and (validate is None or validate(value)):
+                stats.db_hits += 1
+                ARTIFACT_LOOKUPS.labels(kind=kind, outcome="db_hit").inc()
+                self._memory_put((kind, scope_key), fingerprint, version, ttl, value)
+                return value
+
+        started = time.perf_counter()
+        value = await compute()
+        elapsed = time.perf_counter() - started
+        stats.computes += 1
+        stats.compute_seconds += elapsed
+        ARTIFACT_LOOKUPS.labels(kind=kind, outcome="computed").inc()
+        ARTIFACT_COMPUTE_DURATION.labels(kind=kind).observe(elapsed)
+
+        self._memory_put((kind, scope_key), fingerprint, version, ttl, value)
+        if db is not None:
+            await self._db_put(db, kind, scope_key, fingerprint, version, value, elapsed)
+        return value
+
+    # ── memory tier ─────────────────────────────────────────────────────────
+
+    def _memory_get(self, key, fingerprint, version) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if (entry.fingerprint != fingerprint or entry.formula_version != version
+                or (entry.expires_at is not None and entry.expires_at <= time.monotonic())):
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def _memory_put(self, key, fingerprint, version, ttl, value) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = _Entry(fingerprint, version, expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ── database tier ───────────────────────────────────────────────────────
+
+    async def _db_get(self, db, kind, scope_key, fingerprint, version, ttl) -> tuple[bool, Any]:
+        query = """
+            SELECT payload FROM derived_artifacts
+            WHERE kind = $1 AND scope = $2 AND formula_version = $3
+              AND input_fingerprint = $4
+        """
+        params: tuple = (kind, scope_key, version, fingerprint)
+        if ttl is not None:
+            query += " AND computed_at >= NOW() - make_interval(secs => $5)"
+            params += (float(ttl),)
+        try:
+            row = await db.fetch_one(query, params)
+        except Exception as exc:                      # noqa: BLE001 — see module docstring
+            self._stats[kind].db_errors += 1
+            logger.debug("artifact %s/%s unreadable: %s", kind, scope_key, exc)
+            return False, None
+        if not row:
+            return False, None
+
+        payload = row[0]
+        if isinstance(payload, str):                  # asyncpg hands JSONB back as text
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                return False, None
+        # Stored wrapped, so any JSON value (a list, a bare number, null) round-
+        # trips and a row without the wrapper reads as corrupt, not as data.
+        if not isinstance(payload, dict) or "value" not in payload:
+            return False, None
+        return True, payload["value"]
+
+    async def _db_put(self, db, kind, scope_key, fingerprint, version, value,
+                      elapsed: float) -> None:
+        try:
+            payload = json.dumps({"value": value})
+        except (TypeError, ValueError) as exc:
+            logger.debug("artifact %s/%s not persisted, not JSON: %s", kind, scope_key, exc)
+            return
+        try:
+            await db.execute(
+                """
+                INSERT INTO derived_artifacts
+                    (kind, scope, formula_version, input_fingerprint, payload,
+                     compute_ms, computed_at)
+                VALUES ($1, $2, $3, $4, $5, $6, NOW())
+                ON CONFLICT (kind, scope) DO UPDATE SET
+                    formula_version   = EXCLUDED.formula_version,
+                    input_fingerprint = EXCLUDED.input_fingerprint,
+                    payload           = EXCLUDED.payload,
+                    compute_ms        = EXCLUDED.compute_ms,
+                    computed_at       = NOW()
+                """,
+                (kind, scope_key, version, fingerprint, payload, int(elapsed * 1000)),
+            )
+        except Exception as exc:                      # noqa: BLE001 — see module docstring
+            self._stats[kind].db_errors += 1
+            logger.debug("artifact %s/%s not written: %s", kind, scope_key, exc)
+
+    async def _db_get_many(self, db, kind, fingerprints: dict[str, str], version,
+                           ttl) -> dict[str, Any]:
+        """Stored values by scope key, for the scopes whose fingerprint matches."""
+        query = """
+            SELECT scope, input_fingerprint, payload FROM derived_artifacts
+            WHERE kind = $1 AND formula_version = $2 AND scope = ANY($3::text[])
+        """
+        params: tuple = (kind, version, list(fingerprints))
+        if ttl is not None:
+            query += " AND computed_at >= NOW() - make_interval(secs => $4)"
+            params += (float(ttl),)
+        try:
+            rows = await db.fetch_all(query, params)
+        except Exception as exc:                      # noqa: BLE001 — see module docstring
+            self._stats[kind].db_errors += 1
+            logger.debug("artifacts %s (%d scopes) unreadable: %s", kind, len(fingerprints), exc)
+            return {}
+
+        stored: dict[str, Any] = {}
+        for scope_key, fingerprint, payload in rows or []:
+            if fingerprints.get(scope_key) != fingerprint:
+                continue
+            if isinstance(payload, str):
+                try:
+                    payload = json.loads(payload)
+                except ValueError:
+                    continue
+            if isinstance(payload, dict) and "value" in payload:
+                stored[scope_key] = payload["value"]
+        return stored
+
+    async def _db_put_many(self, db, kind, entries: list[tuple[str, str, Any]], version,
+                           elapsed: float) -> None:
+        """Upsert (scope key, fingerprint, value) rows; ``elapsed`` is the batch's."""
+        rows = []
+        for scope_key, fingerprint, value in entries:
+            try:
+                payload = json.dumps({"value": value})
+            except (TypeError, ValueError) as exc:
+                logger.debug("artifact %s/%s not persisted, not JSON: %s", kind, scope_key, exc)
+                continue
+            rows.append((kind, scope_key, version, fingerprint, payload, int(elapsed * 1000)))
+        if not rows:
+            return
+        try:
+            await db.executemany(
+                """
+                INSERT INTO derived_artifacts
+                    (kind, scope, formula_version, input_fingerprint, payload,
+                     compute_ms, computed_at)
+                VALUES ($1, $2, $3, $4, $5, $6, NOW())
+                ON CONFLICT (kind, scope) DO UPDATE SET
+                    formula_version   = EXCLUDED.formula_version,
+                    input_fingerprint = EXCLUDED.input_fingerprint,
+                    payload           = EXCLUDED.payload,
+                    compute_ms        = EXCLUDED.compute_ms,
+                    computed_at       = NOW()
+                """,
+                rows,
+            )
+        except Exception as exc:                      # noqa: BLE001 — see module docstring
+            self._stats[kind].db_errors += 1
+            logger.debug("artifacts %s (%d scopes) not written: %s", kind, len(rows), exc)
+
+    # ── housekeeping ────────────────────────────────────────────────────────
+
+    def invalidate(self, kind: str | None = None) -> int:
+        """Drop memory entries (of one kind, or all). The database tier needs no
+        invalidation: a changed input changes the fingerprint."""
+        doomed = [k for k in self._entries if kind is None or k[0] == kind]
+        for key in doomed:
+            del self._entries[key]
+        return len(doomed)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "kinds": {kind: asdict(s) for kind, s in sorted(self._stats.items())},
+        }
+
+
+#: The process-wide store every service shares.
+artifact_store = ArtifactStore()
+
+
+async def get_or_compute(kind: str, scope: Any, input_fingerprint: Any,
+                         compute: Callable[[], Awaitable[Any]], **kwargs) -> Any:
+    """``artifact_store.get_or_compute`` — see ArtifactStore.get_or_compute."""
+    return await artifact_store.get_or_compute(
+        kind, scope, input_fingerprint, compute, **kwargs,
+    )
+
+
+async def get_many_or_compute(kind: str, fingerprints: dict[Any, Any],
+                              compute: Callable[[list[Any]], Awaitable[dict[Any, Any]]],
+                              **kwargs) -> dict[Any, Any]:
+    """``artifact_store.get_many_or_compute`` — see ArtifactStore.get_many_or_compute."""
+    return await artifact_store.get_many_or_compute(kind, fingerprints, compute, **kwargs)
@@ -19,6 +19,17 @@ from website.backend.services.greatshot_store import GreatshotStorageService
 
 logger = get_app_logger("greatshot.jobs")
 
+# inline: analysis/render workers run as tasks in the web process (default).
+# pool: the web process only inserts rows; `python -m greatshot.worker`
+# processes claim and run them.
+JOB_MODE_INLINE = "inline"
+JOB_MODE_POOL = "pool"
+
+# Pool claims per job before an expired lease dead-letters it instead of
+# handing it back: a job that keeps killing its worker process would
+# otherwise be re-claimed forever.
+MAX_CLAIM_ATTEMPTS = 3
+
 
 class GreatshotJobService:
     def __init__(self, db, storage: GreatshotStorageService):
@@ -28,15 +39,29 @@ class GreatshotJobService:
         self.render_queue: asyncio.Queue[str] = asyncio.Queue()
         self.analysis_workers: list[asyncio.Task] = []
         self.render_workers: list[asyncio.Task] = []
+        self.job_mode = JOB_MODE_INLINE
         self.started = False
 
-    async def start(self, analysis_workers: int = 1, render_workers: int = 1) -> None:
+    async def start(
+        self,
+        analysis_workers: int = 1,
+        render_workers: int = 1,
+        job_mode: str = JOB_MODE_INLINE,
+    ) -> None:
         if self.started:
             return
 
         self.storage.ensure_storage_tree()
         await self.storage.ensure_schema(self.db)
 
+        if job_mode == JOB_MODE_POOL:
+            # The rows' status IS the queue: `python -m greatshot.worker`
+            # processes claim them with SKIP LOCKED and own stall recovery.
+            self.job_mode = JOB_MODE_POOL
+            self.started = True
+            logger.info("✅ Greatshot job service started in pool mode (enqueue only)")
+            return
+
         try:
             await self._recover_stalled_jobs()
         except Exception:
@@ -113,108 +138,259 @@ class GreatshotJobService:
             )
 
     async def enqueue_analysis(self, demo_id: str) -> None:
+        if self.job_mode == JOB_MODE_POOL:
+            return  # the 'uploaded' row is already claimable by the pool
         await self.analysis_queue.put(demo_id)
 
     async def enqueue_render(self, render_id: str) -> None:
+        if self.job_mode == JOB_MODE_POOL:
+            return  # the 'queued' row is already claimable by the pool
         await self.render_queue.put(render_id)
 
+    # ── Worker-pool claiming (greatshot/worker/pool.py) ────────────────────
+
+    async def claim_next_analysis(self) -> tuple[str, Path] | None:
+        """Claim the oldest uploaded demo for this process, or None.
+
+        SKIP LOCKED lets N worker processes poll the same table without
+        blocking on, or double-claiming, a row another worker is flipping.
+        """
+        async with self.db.connection() as conn, conn.transaction():
+            row = await conn.fetchrow(
+                """
+                SELECT id, stored_path
+                FROM greatshot_demos
+                WHERE status = 'uploaded'
+                ORDER BY created_at, id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+                """
+            )
+            if not row:
+                return None
+            await conn.execute(
+                """
+                UPDATE greatshot_demos
+                SET status = 'scanning',
+                    error = NULL,
+                    claim_attempts = claim_attempts + 1,
+                    processing_started_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = $1
+                """,
+                row["id"],
+            )
+        return str(row["id"]), Path(row["stored_path"])
+
+    async def claim_next_render(self) -> str | None:
+        """Claim the oldest queued render for this process, or None."""
+        async with self.db.connection() as conn, conn.transaction():
+            row = await conn.fetchrow(
+                """
+                SELECT id
+                FROM greatshot_renders
+                WHERE status = 'queued'
+                ORDER BY created_at, id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+                """
+            )
+            if not row:
+                return None
+            await conn.execute(
+                """
+                UPDATE greatshot_renders
+                SET status = 'rendering',
+                    error = NULL,
+                    claim_attempts = claim_attempts + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = $1
+                """,
+                row["id"],
+            )
+        return str(row["id"])
+
+    async def requeue_expired_claims(
+        self,
+        analysis_lease_seconds: float,
+        render_lease_seconds: float,
+    ) -> tuple[int, int]:
+        """Hand back claims whose worker process died mid-job.
+
+        The inline service can reset every mid-flight row at startup because
+        nothing else is running; in pool mode other workers are, so only rows
+        held longer than the job's worst-case duration are reclaimed. A row
+        already claimed MAX_CLAIM_ATTEMPTS times is dead-lettered as 'failed'
+        instead. Returns the (analysis, render) rows handed back.
+        """
+        demos = await self.db.fetch_all(
+            """
+            UPDATE greatshot_demos
+            SET status = CASE WHEN claim_attempts >= $2 THEN 'failed' ELSE 'uploaded' END,
+                error = CASE WHEN claim_attempts >= $2
+                             THEN 'Worker process died on this demo ' || claim_attempts || ' times'
+                             ELSE error END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'scanning'
+              AND processing_started_at < CURRENT_TIMESTAMP - ($1::double precision * INTERVAL '1 second')
+            RETURNING id, status
+            """,
+            (float(analysis_lease_seconds), MAX_CLAIM_ATTEMPTS),
+        )
+        renders = await self.db.fetch_all(
+            """
+            UPDATE greatshot_renders
+            SET status = CASE WHEN claim_attempts >= $2 THEN 'failed' ELSE 'queued' END,
+                error = CASE WHEN claim_attempts >= $2
+                             THEN 'Worker process died on this render ' || claim_attempts || ' times'
+                             ELSE error END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'rendering'
+              AND updated_at < CURRENT_TIMESTAMP - ($1::double precision * INTERVAL '1 second')
+            RETURNING id, status
+            """,
+            (float(render_lease_seconds), MAX_CLAIM_ATTEMPTS),
+        )
+        requeued = [
+            sum(1 for row in rows or [] if row[1] != "failed") for rows in (demos, renders)
+        ]
+        dead = len(demos or []) + len(renders or []) - sum(requeued)
+        if demos or renders:
+            logger.warning(
+                "♻️ Greatshot pool: reclaimed %d expired analysis and %d render claim(s), "
+                "dead-lettered %d after %d claims",
+                requeued[0], requeued[1], dead, MAX_CLAIM_ATTEMPTS,
+            )
+        return requeued[0], requeued[1]
+
+    async def queue_depths(self) -> dict[str, dict[str, int]]:
+        """Row counts per status for both job classes (for the depth gauges)."""
+        depths: dict[str, dict[str, int]] = {"analysis": {}, "render": {}}
+        for job_class, table in (("analysis", "greatshot_demos"), ("render", "greatshot_renders")):
+            rows = await self.db.fetch_all(
+                f"SELECT status, COUNT(*) FROM {table} GROUP BY status"  # nosec B608 - fixed table names
+            )
+            depths[job_class] = {str(row[0]): int(row[1]) for row in rows or []}
+        return depths
+
+    async def run_claimed_analysis(self, worker_id: int, demo_id: str, demo_path: Path) -> bool:
+        """Run one pool-claimed analysis with the inline worker's retry policy."""
+        return await self._analysis_attempts(
+            worker_id,
+            demo_id,
+            first_attempt=lambda: self._run_analysis(demo_id, demo_path),
+        )
+
+    async def run_claimed_render(self, worker_id: int, render_id: str) -> bool:
+        """Run one pool-claimed render with the inline worker's retry policy."""
+        return await self._render_attempts(worker_id, render_id)
+
     async def _analysis_worker(self, worker_id: int) -> None:
+        while True:
+            demo_id = await self.analysis_queue.get()
+            await self._analysis_attempts(worker_id, demo_id)
+            self.analysis_queue.task_done()
+
+    async def _analysis_attempts(self, worker_id: int, demo_id: str, first_attempt=None) -> bool:
         MAX_RETRIES = 2  # Retry failed jobs up to 2 times
         retry_delay = 5  # seconds
 
-        while True:
-            demo_id = await self.analysis_queue.get()
-            retries = 0
-            success = False
+        retries = 0
+        success = False
 
-            while retries <= MAX_RETRIES and not success:
-                try:
-                    logger.info("[analysis:%s] Processing demo_id=%s (attempt %d/%d)",
-                               worker_id, demo_id, retries + 1, MAX_RETRIES + 1)
+        while retries <= MAX_RETRIES and not success:
+            try:
+                logger.info("[analysis:%s] Processing demo_id=%s (attempt %d/%d)",
+                           worker_id, demo_id, retries + 1, MAX_RETRIES + 1)
+                if retries == 0 and first_attempt is not None:
+                    success = await first_attempt()
+                else:
                     success = await self._process_analysis_job(demo_id)
-                    if success:
-                        break
-                    retries += 1
-                    if retries <= MAX_RETRIES:
-                        logger.info("Retrying demo_id=%s in %ds...", demo_id, retry_delay)
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        logger.error(
-                            "Analysis failed for demo_id=%s after %d attempts",
-                            demo_id,
-                            MAX_RETRIES + 1,
-                        )
-                except TimeoutError:
-                    # Don't retry timeouts - these are likely corrupted demos
-                    logger.error("Analysis timeout for demo_id=%s - not retrying", demo_id)
+                if success:
                     break
-                except Exception:
+                retries += 1
+                if retries <= MAX_RETRIES:
+                    logger.info("Retrying demo_id=%s in %ds...", demo_id, retry_delay)
+                    await asyncio.sleep(retry_delay)
+                else:
                     logger.error(
-                        "Analysis worker failure for demo_id=%s (attempt %d/%d)\n%s",
+                        "Analysis failed for demo_id=%s after %d attempts",
                         demo_id,
-                        retries + 1,
                         MAX_RETRIES + 1,
-                        traceback.format_exc(),
                     )
-                    retries += 1
-                    if retries <= MAX_RETRIES:
-                        logger.info("Retrying demo_id=%s in %ds...", demo_id, retry_delay)
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        # Mark as failed after all retries exhausted
-                        await self.db.execute(
-                            """
-                            UPDATE greatshot_demos
-                            SET status = 'failed',
-                                error = 'Analysis failed after retries',
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = $1
-                            """,
-                            (demo_id,),
-                        )
-
-            self.analysis_queue.task_done()
+            except TimeoutError:
+                # Don't retry timeouts - these are likely corrupted demos
+                logger.error("Analysis timeout for demo_id=%s - not retrying", demo_id)
+                break
+            except Exception:
+                logger.error(
+                    "Analysis worker failure for demo_id=%s (attempt %d/%d)\n%s",
+                    demo_id,
+                    retries + 1,
+                    MAX_RETRIES + 1,
+                    traceback.format_exc(),
+                )
+                retries += 1
+                if retries <= MAX_RETRIES:
+                    logger.info("Retrying demo_id=%s in %ds...", demo_id, retry_delay)
+                    await asyncio.sleep(retry_delay)
+                else:
+                    # Mark as failed after all retries exhausted
+                    await self.db.execute(
+                        """
+                        UPDATE greatshot_demos
+                        SET status = 'failed',
+                            error = 'Analysis failed after retries',
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = $1
+                        """,
+                        (demo_id,),
+                    )
+        return success
 
     async def _render_worker(self, worker_id: int) -> None:
+        while True:
+            render_id = await self.render_queue.get()
+            await self._render_attempts(worker_id, render_id)
+            self.render_queue.task_done()
+
+    async def _render_attempts(self, worker_id: int, render_id: str) -> bool:
         MAX_RETRIES = 1  # Retry failed renders once (rendering is expensive)
         retry_delay = 10  # seconds
 
-        while True:
-            render_id = await self.render_queue.get()
-            retries = 0
-            success = False
+        retries = 0
+        success = False
 
-            while retries <= MAX_RETRIES and not success:
-                try:
-                    logger.info("[render:%s] Processing render_id=%s (attempt %d/%d)",
-                               worker_id, render_id, retries + 1, MAX_RETRIES + 1)
-                    success = await self._process_render_job(render_id)
-                    if success:
-                        break
-                    retries += 1
-                    if retries <= MAX_RETRIES:
-                        logger.info("Retrying render_id=%s in %ds...", render_id, retry_delay)
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        logger.error(
-                            "Render failed for render_id=%s after %d attempts",
-                            render_id,
-                            MAX_RETRIES + 1,
-                        )
-                except Exception:
+        while retries <= MAX_RETRIES and not success:
+            try:
+                logger.info("[render:%s] Processing render_id=%s (attempt %d/%d)",
+                           worker_id, render_id, retries + 1, MAX_RETRIES + 1)
+                success = await self._process_render_job(render_id)
+                if success:
+                    break
+                retries += 1
+                if retries <= MAX_RETRIES:
+                    logger.info("Retrying render_id=%s in %ds...", render_id, retry_delay)
+                    await asyncio.sleep(retry_delay)
+                else:
                     logger.error(
-                        "Render worker failure for render_id=%s (attempt %d/%d)\n%s",
+                        "Render failed for render_id=%s after %d attempts",
                         render_id,
-                        retries + 1,
                         MAX_RETRIES + 1,
-                        traceback.format_exc(),
                     )
-                    retries += 1
-                    if retries <= MAX_RETRIES:
-                        logger.info("Retrying render_id=%s in %ds...", render_id, retry_delay)
-                        await asyncio.sleep(retry_delay)
-
-            self.render_queue.task_done()
+            except Exception:
+                logger.error(
+                    "Render worker failure for render_id=%s (attempt %d/%d)\n%s",
+                    render_id,
+                    retries + 1,
+                    MAX_RETRIES + 1,
+                    traceback.format_exc(),
+                )
+                retries += 1
+                if retries <= MAX_RETRIES:
+                    logger.info("Retrying render_id=%s in %ds...", render_id, retry_delay)
+                    await asyncio.sleep(retry_delay)
+        return success
 
     async def _process_analysis_job(self, demo_id: str) -> bool:
         # F-05: Use FOR UPDATE inside a transaction to prevent concurrent
@@ -248,8 +424,18 @@ class GreatshotJobService:
                 demo_id,
             )
 
+        return await self._run_analysis(demo_id, demo_path)
+
+    async def _run_analysis(self, demo_id: str, demo_path: Path) -> bool:
+        """Analyse a demo already flipped to 'scanning' by one of the claims."""
         try:
             artifacts_dir = self.storage.artifacts_dir(demo_id)
+            # The upload already hashed the bytes; keying the timeline cache
+            # on that hash spares the scanner a second full read of the demo.
+            content_hash = await self.db.fetch_val(
+                "SELECT content_hash_sha256 FROM greatshot_demos WHERE id = $1",
+                (demo_id,),
+            )
 
             # Enforce timeout to prevent analysis from hanging forever
             timeout_seconds = getattr(GREATSHOT_CONFIG, 'scanner_timeout_seconds', 300)  # Default 5 min
@@ -266,7 +452,10 @@ class GreatshotJobService:
                 result = run_analysis_job(
                     demo_path,
                     artifacts_dir,
-                    None,
+                    {
+                        "timeline_cache_dir": self.storage.timeline_cache_dir(),
+                        "content_hash_sha256": content_hash,
+                    },
                     cancel_event=cancel_event,
                 )
                 return result
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import os
 import uuid
 from dataclasses import dataclass
@@ -13,6 +12,7 @@ from fastapi import HTTPException, UploadFile
 from greatshot.config import CONFIG
 from greatshot.scanner.api import sniff_demo_header_bytes
 from website.backend.logging_config import get_app_logger
+from website.backend.services.upload_pipeline import HashingFileWriter, UploadThroughput
 
 logger = get_app_logger("greatshot.store")
 
@@ -25,6 +25,7 @@ class SavedGreatshotUpload:
     stored_path: str
     file_size_bytes: int
     content_hash_sha256: str
+    throughput: UploadThroughput | None = None
 
 
 class GreatshotStorageService:
@@ -60,6 +61,10 @@ class GreatshotStorageService:
     def artifacts_dir(self, demo_id: str) -> Path:
         return self.demo_dir(demo_id) / "artifacts"
 
+    def timeline_cache_dir(self) -> Path:
+        """Parsed-timeline artifacts, shared across demos and keyed by SHA-256."""
+        return self.root / "timeline_cache"
+
     def clips_dir(self, demo_id: str) -> Path:
         return self.demo_dir(demo_id) / "clips"
 
@@ -121,18 +126,21 @@ class GreatshotStorageService:
 
         stored_path = originals_dir / f"original{extension}"
 
-        digest = hashlib.sha256()
         total_bytes = 0
         header_bytes = b""
 
-        with stored_path.open("wb") as handle:
+        # Write + hash on the pipeline's thread so a large demo never blocks
+        # the event loop that also serves the API.
+        writer = HashingFileWriter(stored_path, store="greatshot")
+        writer.start()
+        try:
             while True:
                 chunk = await upload.read(1024 * 1024)
                 if not chunk:
                     break
                 total_bytes += len(chunk)
                 if total_bytes > self.max_upload_bytes:
-                    handle.close()
+                    await writer.abort()
                     try:
                         stored_path.unlink(missing_ok=True)
                     except OSError:
@@ -149,8 +157,17 @@ class GreatshotStorageService:
                     need = 64 - len(header_bytes)
                     header_bytes += chunk[:need]
 
-                digest.update(chunk)
-                handle.write(chunk)
+                await writer.write(chunk)
+            throughput = await writer.close()
+        except HTTPException:
+            raise
+        except BaseException:
+            await writer.abort()
+            try:
+                stored_path.unlink(missing_ok=True)
+            except OSError:
+                logger.debug("Could not clean up file after error")
+            raise
 
         if total_bytes == 0:
             try:
@@ -174,7 +191,8 @@ class GreatshotStorageService:
             extension=extension,
             stored_path=str(stored_path.resolve()),
             file_size_bytes=total_bytes,
-            content_hash_sha256=digest.hexdigest(),
+            content_hash_sha256=writer.hexdigest(),
+            throughput=throughput,
         )
 
     def safe_relative(self, absolute_path: str | Path) -> str | None:
@@ -428,6 +446,17 @@ class GreatshotStorageService:
             """
         )
 
+        # Migration 086: pool claim counter (dead-letters a job that keeps
+        # killing its worker process).
+        for table in ("greatshot_demos", "greatshot_renders"):
+            try:
+                await db.execute(
+                    f"ALTER TABLE {table} "  # nosec B608 - fixed table names
+                    "ADD COLUMN IF NOT EXISTS claim_attempts INTEGER NOT NULL DEFAULT 0"
+                )
+            except Exception as e:
+                logger.debug("claim_attempts column migration skipped on %s: %s", table, e)
+
         await db.execute(
             "CREATE INDEX IF NOT EXISTS idx_greatshot_demos_user_created_at ON greatshot_demos(user_id, created_at DESC)"
         )
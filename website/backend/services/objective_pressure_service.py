@@ -17,14 +17,17 @@ excluded. Proven with scripts/backtest_objective_pressure.py before shipping.
 """
 from __future__ import annotations
 
+import hashlib
 import json
-import time
 from collections import defaultdict
 from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 from shared.guid_utils import short_guid
 from website.backend.logging_config import get_app_logger
+from website.backend.services.artifact_store import get_or_compute
 from website.backend.utils.et_constants import strip_et_colors
 
 logger = get_app_logger("services.objective_pressure")
@@ -39,11 +42,12 @@ _ZONES_PATH = (
     / "assets" / "maps" / "proximity" / "objective_zones.json"
 )
 
-# session_date -> (result, monotonic_ts). Pressure is a pure function of the
-# session's tracks; Session Detail can request it repeatedly, so memoize briefly.
-_CACHE: dict[str, tuple[dict, float]] = {}
-_CACHE_TTL = 300
-_CACHE_MAX = 32
+# Pressure is a pure function of the session's tracks, kills and the zones
+# file, so the full leaderboard is an artifact-store entry keyed on a
+# fingerprint of exactly those (see _pressure_fingerprint). Bump the version
+# when the credit rule changes; every stored leaderboard then recomputes.
+ARTIFACT_KIND = "objective_pressure"
+FORMULA_VERSION = 2  # the v0.2 definition in the module docstring
 
 @lru_cache(maxsize=1)
 def _load_zones() -> dict[str, list]:
@@ -65,6 +69,16 @@ def _load_zones() -> dict[str, list]:
     return out
 
 
+@lru_cache(maxsize=1)
+def _zones_digest() -> str:
+    """Content hash of objective_zones.json — part of the fingerprint, so a
+    deploy that moves a zone recomputes every stored leaderboard."""
+    try:
+        return hashlib.sha256(_ZONES_PATH.read_bytes()).hexdigest()[:16]
+    except OSError:
+        return "missing"
+
+
 def _zone_index(x: float, y: float, z: float, zones: list) -> int:
     """Index of the first objective whose 3D sphere contains the point, else -1."""
     for i, (zx, zy, zz, r) in enumerate(zones):
@@ -73,67 +87,149 @@ def _zone_index(x: float, y: float, z: float, zones: list) -> int:
     return -1
 
 
+def _zone_membership(points: np.ndarray, zones: list) -> np.ndarray:
+    """`_zone_index` for every row of an (N, 3) array at once, by broadcasting.
+
+    The squared distance is summed in the same order as `_zone_index`
+    (dx² + dy² + dz²) so a point sitting exactly on a sphere's surface lands on
+    the same side of it, and argmax over the (N, zones) mask picks the FIRST
+    containing sphere, as the loop does.
+    """
+    if not zones or not len(points):
+        return np.full(len(points), -1, dtype=np.int64)
+    spheres = np.asarray(zones, dtype=np.float64)
+    d = points[:, None, :] - spheres[None, :, :3]
+    dist2 = d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1] + d[..., 2] * d[..., 2]
+    inside = dist2 <= spheres[:, 3] * spheres[:, 3]
+    return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+
+def _decode_samples(path: list) -> np.ndarray:
+    """(N, 4) float array of (time_ms, x, y, z), sorted like the tuples were.
+
+    Samples without time/x/y are dropped and a missing z is 0.0, as before; the
+    lexsort over (t, x, y, z) reproduces `sorted()` on the tuples, which
+    matters for duplicate timestamps — the order decides which twin carries
+    the forward gap.
+    """
+    rows = [
+        (int(s["time"]), float(s["x"]), float(s["y"]), float(s.get("z", 0.0)))
+        for s in path if "time" in s and "x" in s and "y" in s
+    ]
+    arr = np.array(rows, dtype=np.float64).reshape(-1, 4)
+    return arr[np.lexsort((arr[:, 3], arr[:, 2], arr[:, 1], arr[:, 0]))]
+
+
 def _accumulate_round(rtracks: list, zones: list, pressure: dict) -> None:
     """Add each player's contested+supported objective seconds for one round.
 
     rtracks: list of (team, key, samples) where key is the per-player aggregation
-    key (a player_guid in production) and samples is a sorted list of
-    (time_ms, x, y, z). Mutates `pressure` (key -> seconds).
+    key (a player_guid in production) and samples is a time-sorted sequence of
+    (time_ms, x, y, z) — tuples or an (N, 4) array. Mutates `pressure`
+    (key -> seconds).
 
     Presence counts DISTINCT players (keys), so one player's two records in the
     same 200ms bucket can't fake teammate support. Credit is the forward gap to
     the NEXT sample only — the terminal sample (a life ends on a death /
     round_end record) contributes no time after the player is gone.
+
+    Array kernel: every sample of the round is flattened into one set of
+    columns, zone membership is one broadcast against all spheres, and the
+    per-(bucket, zone) presence is counted with np.unique/bincount instead of
+    nested sets — a session is millions of samples at 200ms, and the Python
+    loop over them was the whole cost of the leaderboard.
     """
-    # Pass 1: distinct player keys present per (bucket, zone_idx) per team.
-    presence: dict[tuple, dict] = defaultdict(lambda: defaultdict(set))
-    marked = []
-    for team, key, samples in rtracks:
-        zis = []
-        for tm, x, y, z in samples:
-            zi = _zone_index(x, y, z, zones)
-            zis.append(zi)
-            if zi >= 0:
-                presence[(tm // BUCKET_MS, zi)][team].add(key)
-        marked.append((team, key, samples, zis))
-
-    # Pass 2: credit the forward gap of each non-terminal in-zone sample that is
-    # in a contested (enemy present) and supported (>=2 distinct teammates) bucket.
-    for team, key, samples, zis in marked:
-        for i in range(len(samples) - 1):  # last sample has no forward duration
-            zi = zis[i]
-            if zi < 0:
-                continue
-            here = presence[(samples[i][0] // BUCKET_MS, zi)]
-            enemy = any(keys for tm2, keys in here.items() if tm2 != team and keys)
-            mates = len(here.get(team, ()))
-            if not enemy or mates < 2:
-                continue
-            dt = samples[i + 1][0] - samples[i][0]
-            pressure[key] += min(max(dt, 0), SAMPLE_CAP_MS) / 1000.0
+    tracks = [(team, key, np.asarray(samples, dtype=np.float64).reshape(-1, 4))
+              for team, key, samples in rtracks]
+    tracks = [t for t in tracks if len(t[2])]
+    if not tracks or not zones:
+        return
 
+    team_codes: dict = {}
+    key_codes: dict = {}
+    data = np.concatenate([t[2] for t in tracks])
+    lengths = [len(t[2]) for t in tracks]
+    team = np.repeat([team_codes.setdefault(t[0], len(team_codes)) for t in tracks], lengths)
+    key = np.repeat([key_codes.setdefault(t[1], len(key_codes)) for t in tracks], lengths)
+    terminal = np.zeros(len(data), dtype=bool)
+    terminal[np.cumsum(lengths) - 1] = True
 
-def _evict_oldest() -> None:
-    if len(_CACHE) <= _CACHE_MAX:
+    zone = _zone_membership(data[:, 1:4], zones)
+    in_zone = zone >= 0
+    if not in_zone.any():
         return
-    oldest = min(_CACHE, key=lambda k: _CACHE[k][1])
-    _CACHE.pop(oldest, None)
+
+    # One cell per (200ms bucket, objective) that anyone occupied. Pairs and
+    # triples are packed into single int64 codes: 1-D unique is a sort, the
+    # axis= form is far slower.
+    bucket = np.floor_divide(data[in_zone, 0], BUCKET_MS).astype(np.int64)
+    cell_code = (bucket - bucket.min()) * len(zones) + zone[in_zone]
+    _, cell = np.unique(cell_code, return_inverse=True)
+    n_cells, n_teams, n_keys = int(cell.max()) + 1, len(team_codes), len(key_codes)
+
+    # Distinct players per (cell, team), then distinct teams per cell.
+    occupants = np.unique((cell * n_teams + team[in_zone]) * n_keys + key[in_zone])
+    cell_team = occupants // n_keys
+    mates = np.bincount(cell_team, minlength=n_cells * n_teams)
+    teams_present = np.bincount(np.unique(cell_team) // n_teams, minlength=n_cells)
+
+    here = cell * n_teams + team[in_zone]
+    credited = np.zeros(len(data), dtype=bool)
+    # Contested: some OTHER team is in the cell (this sample's team always is).
+    credited[in_zone] = (teams_present[cell] > 1) & (mates[here] >= 2)
+    credited &= ~terminal
+    if not credited.any():
+        return
+
+    idx = np.flatnonzero(credited)
+    dt = data[idx + 1, 0] - data[idx, 0]
+    seconds = np.minimum(np.maximum(dt, 0), SAMPLE_CAP_MS) / 1000.0
+    totals = np.bincount(key[idx], weights=seconds, minlength=len(key_codes))
+    keys = list(key_codes)
+    for code in np.unique(key[idx]).tolist():
+        pressure[keys[code]] += float(totals[code])
+
+
+async def _pressure_fingerprint(db, session_date) -> list:
+    """Everything the leaderboard is derived from, in one indexed round trip.
+
+    Track count and max id catch a late or re-imported proximity file; the
+    kill count covers the kills column. The zones digest covers the geometry.
+    """
+    row = await db.fetch_one(
+        """
+        SELECT (SELECT COUNT(*) FROM player_track WHERE session_date = $1),
+               (SELECT MAX(id) FROM player_track WHERE session_date = $1),
+               (SELECT COUNT(*) FROM proximity_combat_position
+                WHERE session_date = $1 AND event_type = 'kill')
+        """,
+        (session_date,),
+    )
+    counts = [int(v) if v is not None else None for v in (row or (None, None, None))]
+    return [*counts, _zones_digest()]
 
 
 async def compute_objective_pressure(db, session_date, limit: int = 10) -> dict:
-    """Objective-pressure leaderboard for one session. Read-only, cached 5 min.
+    """Objective-pressure leaderboard for one session. Read-only.
 
     session_date may be a datetime.date (from the router's _parse_iso_date) or a
     'YYYY-MM-DD' string; it is passed straight to asyncpg for the DATE column.
+
+    The FULL leaderboard is computed once per input change through the artifact
+    store and sliced per request, so a probe with a different limit can't
+    poison later requests for the same session.
     """
     n = max(1, min(limit, 50))
-    cache_key = str(session_date)
-    cached = _CACHE.get(cache_key)
-    if cached and (time.monotonic() - cached[1]) < _CACHE_TTL:
-        # Cache holds the FULL leaderboard; slice per request so a probe with a
-        # different limit can't poison later requests for the same session.
-        return {**cached[0], "players": cached[0]["players"][:n]}
+    full = await get_or_compute(
+        ARTIFACT_KIND, str(session_date), await _pressure_fingerprint(db, session_date),
+        lambda: _compute_leaderboard(db, session_date),
+        db=db, formula_version=FORMULA_VERSION,
+    )
+    return {**full, "players": full["players"][:n]}
 
+
+async def _compute_leaderboard(db, session_date) -> dict:
+    """The full leaderboard, uncached."""
     zones_by_map = _load_zones()
 
     tracks = await db.fetch_all(
@@ -160,11 +256,8 @@ async def compute_objective_pressure(db, session_date, limit: int = 10) -> dict:
         if not zones:
             continue
         path = t["path"] if isinstance(t["path"], list) else json.loads(t["path"])
-        samples = sorted(
-            (int(s["time"]), float(s["x"]), float(s["y"]), float(s.get("z", 0.0)))
-            for s in path if "time" in s and "x" in s and "y" in s
-        )
-        if not samples:
+        samples = _decode_samples(path)
+        if not len(samples):
             continue
         guid = t["player_guid"]
         # last seen name wins (tracks come out in row order; good enough for a label)
@@ -214,14 +307,10 @@ async def compute_objective_pressure(db, session_date, limit: int = 10) -> dict:
         for guid, secs in ranked if secs > 0
     ]
 
-    # Cache the FULL leaderboard (see the cache-hit slice above), return a slice.
-    full = {
+    return {
         "status": "ok",
-        "session_date": cache_key,
+        "session_date": str(session_date),
         "maps_counted": len(maps_counted),
         "top_fragger_guids": top_fragger_guids,
         "players": all_players,
     }
-    _CACHE[cache_key] = (full, time.monotonic())
-    _evict_oldest()
-    return {**full, "players": all_players[:n]}
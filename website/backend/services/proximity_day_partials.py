@@ -0,0 +1,191 @@
+"""Per-day partial aggregates behind the windowed proximity endpoints.
+
+WHY. Nearly every proximity endpoint scopes through
+`_build_proximity_where_clause`, and its default scope is a `range_days=30`
+window: the dashboard summary and the kill-outcome card re-aggregated a month
+of raw rows on every request, once per map filter and once per widget, although
+only the newest days can still change.
+
+HOW. A `DayPartial` is one endpoint's additive aggregate (counts and sums,
+never averages) grouped by (session_date, map_name, its own keys). Each day's
+rows are one artifact of kind ``proximity_day:<name>`` in the shared artifact
+store (memory LRU + ``derived_artifacts``):
+
+  closed days   older than OPEN_DAYS — served from the store while the day's
+                fingerprint (row count, linked-row count) is unchanged and at
+                most CLOSED_DAY_TTL old; the TTL bounds what a count cannot
+                see, such as a round flagged as a bot round after the fact
+  open days     today and yesterday (a session runs past midnight and its
+                imports keep landing under its date) — recomputed on every
+                request and never stored
+
+The misses and the open days come from ONE grouped query. A window's answer is
+`fold_partials` over its days, filtered to the map in Python, so every map
+filter shares the same partials.
+
+`day_window` admits only the scopes that decompose: a `range_days` window or a
+single `session_date`, optionally with a map, under the default round-quality
+gate. An exact round or a player keeps the caller's raw query, as do
+COUNT(DISTINCT …) over players, rankings and event listings — none of them sums
+across days. So does a bare COUNT(*): the day fingerprints already scan those
+rows, so its partial could never save a query.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from website.backend.routers.proximity_helpers import _round_quality_gate_sql
+from website.backend.services.artifact_store import get_many_or_compute
+
+OPEN_DAYS = 2
+CLOSED_DAY_TTL = 3600
+
+
+@dataclass(frozen=True)
+class DayPartial:
+    """``SELECT session_date, map_name, <keys>, <columns> FROM <table>`` per day.
+
+    ``columns`` must add up across days — COUNT, SUM, or a COUNT(DISTINCT …)
+    over something that includes the day — and be cast to JSON-friendly types
+    (``::bigint``, ``::float8``), since the rows round-trip through
+    derived_artifacts. Bump ``version`` whenever the SQL changes.
+    """
+
+    name: str
+    table: str
+    columns: str
+    keys: tuple[str, ...] = ()
+    condition: str = ""
+    version: int = 1
+
+    @property
+    def kind(self) -> str:
+        return f"proximity_day:{self.name}"
+
+
+@dataclass(frozen=True)
+class DayWindow:
+    first_day: date
+    last_day: date | None  # None: open-ended, like range_days' ``>=``
+    map_name: str | None
+
+
+def day_window(params: Sequence[Any], scope: dict[str, Any]) -> DayWindow | None:
+    """The days of a `_build_proximity_where_clause` scope, or None when the
+    scope does not decompose into them.
+
+    The builder's first parameter is always its session clause's: the
+    ``session_date`` itself, or the first day of the ``range_days`` window.
+    Only valid for clauses built with the default round-quality gate.
+    """
+    if any(scope.get(k) is not None for k in ("round_number", "round_start_unix", "player_guid")):
+        return None
+    first_day = params[0]
+    return DayWindow(
+        first_day, first_day if scope.get("session_date") else None, scope.get("map_name"),
+    )
+
+
+def _today() -> date:
+    # The builder's clock: range_days counts back from the UTC date.
+    return datetime.now(timezone.utc).replace(tzinfo=None).date()
+
+
+async def _day_fingerprints(db, table: str, first: date, last: date) -> dict[date, list[int]]:
+    rows = await db.fetch_all(
+        f"SELECT session_date, COUNT(*), COUNT(round_id) FROM {table} "  # nosec B608 - DayPartial tables are constants
+        "WHERE session_date >= $1 AND session_date <= $2 GROUP BY session_date",
+        (first, last),
+    )
+    return {row[0]: [int(row[1]), int(row[2])] for row in rows or []}
+
+
+async def _query_days(db, partial: DayPartial, days: list[date],
+                      tail_from: date | None) -> dict[date, list[list]]:
+    """The partial's rows for ``days`` and every day from ``tail_from`` on."""
+    params: list[Any] = []
+    spans = []
+    if days:
+        params.append(sorted(days))
+        spans.append(f"session_date = ANY(${len(params)}::date[])")
+    if tail_from is not None:
+        params.append(tail_from)
+        spans.append(f"session_date >= ${len(params)}")
+    clauses = [f"({' OR '.join(spans)})", _round_quality_gate_sql("")]
+    if partial.condition:
+        clauses.append(partial.condition)
+    group = ", ".join(("session_date", "map_name", *partial.keys))
+    rows = await db.fetch_all(
+        f"SELECT {group}, {partial.columns} FROM {partial.table} "  # nosec B608 - DayPartial SQL is constant
+        f"WHERE {' AND '.join(clauses)} GROUP BY {group}",
+        tuple(params),
+    )
+    by_day: dict[date, list[list]] = {}
+    for row in rows or []:
+        by_day.setdefault(row[0], []).append(list(row[1:]))
+    return by_day
+
+
+async def load_day_partials(db, partial: DayPartial, window: DayWindow, *,
+                            today: date | None = None) -> dict[date, list[list]]:
+    """Each day's ``[map_name, *keys, *columns]`` rows, for every day with rows."""
+    open_from = (today or _today()) - timedelta(days=OPEN_DAYS - 1)
+    wants_open = window.last_day is None or window.last_day >= open_from
+    closed_last = open_from - timedelta(days=1)
+    if window.last_day is not None:
+        closed_last = min(closed_last, window.last_day)
+
+    partials: dict[date, list[list]] = {}
+    fresh: dict[date, list[list]] | None = None
+
+    async def compute(days: list[date]) -> dict[date, list[list]]:
+        nonlocal fresh
+        tail = None
+        if wants_open:
+            tail = open_from if window.last_day is None else None
+            days = [*days, window.last_day] if window.last_day is not None else days
+        fresh = await _query_days(db, partial, days, tail)
+        return {day: fresh.get(day, []) for day in days if day < open_from}
+
+    if window.first_day <= closed_last:
+        fingerprints = await _day_fingerprints(db, partial.table, window.first_day, closed_last)
+        if fingerprints:
+            partials.update(await get_many_or_compute(
+                partial.kind, fingerprints, compute,
+                db=db, formula_version=partial.version, ttl=CLOSED_DAY_TTL,
+            ))
+    if wants_open:
+        if fresh is None:
+            await compute([])
+        partials.update({day: rows for day, rows in fresh.items() if day >= open_from})
+    return partials
+
+
+def fold_partials(partials: dict[date, list[list]], map_name: str | None,
+                  keys: int = 0) -> dict[tuple, list]:
+    """Sum the days' rows per key, over one map or all of them.
+
+    A None is SQL's SUM over nothing: it adds as nothing, and a column that
+    never had a value stays None.
+    """
+    totals: dict[tuple, list] = {}
+    for rows in partials.values():
+        for row in rows or []:
+            if map_name is not None and row[0] != map_name:
+                continue
+            acc = totals.setdefault(tuple(row[1:1 + keys]), [None] * (len(row) - 1 - keys))
+            for i, value in enumerate(row[1 + keys:]):
+                if value is not None:
+                    acc[i] = value if acc[i] is None else acc[i] + value
+    return totals
+
+
+async def window_totals(db, partial: DayPartial, window: DayWindow, *,
+                        today: date | None = None) -> dict[tuple, list]:
+    """`load_day_partials` folded over the window's map, per ``partial.keys``."""
+    partials = await load_day_partials(db, partial, window, today=today)
+    return fold_partials(partials, window.map_name, len(partial.keys))
@@ -0,0 +1,649 @@
+"""Per-round, per-player proximity features, computed once and stored.
+
+First blood, man-advantage, clutch and the trade endpoints derived the same
+numbers from the raw event tables on every request: every life and kill in
+range pulled into Python for the timelines, every kill re-sorted for first
+blood, every trade's JSON successes re-expanded. None of it changes until the
+round's proximity data does, so it is computed here once per round and stored
+in `proximity_round_features` / `proximity_player_round_features` (migration
+085) under `FEATURE_VERSION`; the routers aggregate the stored rows.
+
+    rebuild   scripts/rebuild_proximity_features.py (all rounds, or a range)
+    refresh   refresh_round_features(db, [round_id]) after a proximity import
+    read      scoped_feature_round_ids(db, where_sql, params), then
+              load_round_features / load_player_features
+
+`compute_round_features` is the raw endpoints' arithmetic restated per round;
+tests/unit/test_proximity_features.py holds each rerouted endpoint equal to its
+raw-table path. A stored round is served only while its version is current,
+its source row count is unchanged (a re-import or a relink reads as a miss) and
+its stored winner still matches the rounds table (a backfill flipping
+`is_valid` or correcting `winner_team` changes no proximity row).
+Players are named by `latest_kill_names` on both paths: the name on their latest
+kill row in scope, as killer or victim.
+Scopes with unlinked (NULL round_id) rows keep the raw path — there is no round
+to key them by. Reads and writes are best-effort: a missing table degrades to
+the raw path.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import astuple, dataclass, field, fields
+from itertools import groupby
+from typing import Any
+
+from website.backend.logging_config import get_app_logger
+from website.backend.services.reinforcement_clock import (
+    CLOCK_PROTOCOL_VERSION,
+    validated_clock_tuple,
+)
+from website.backend.services.reinforcement_clock_batch import (
+    load_stored_round_clocks,
+    refresh_round_clocks,
+)
+
+logger = get_app_logger("services.proximity_features")
+
+# Bump the prefix when compute_round_features changes. The clutch features
+# depend on the reinforcement clock, so a protocol change invalidates them too.
+FEATURE_VERSION = f"proximity-features-v2+{CLOCK_PROTOCOL_VERSION}"
+
+TEAM_BY_NUM = {1: "AXIS", 2: "ALLIES"}
+ADVANTAGE_BUCKETS = ("1", "2", "3+")
+
+# A window only counts once both teams have spawned at least once (filters
+# the spurious "advantage" of staggered initial spawns).
+ADV_KILL_EPSILON_MS = 100  # the window-opening kill itself is not a conversion
+CLUTCH_MIN_ENEMIES = 2
+CLUTCH_MIN_WAVE_WAIT_MS = 5000
+
+OTHER_TEAM = {"AXIS": "ALLIES", "ALLIES": "AXIS"}
+
+
+def advantage_windows(lives: list, kills: list, round_end_ms: int) -> list[dict]:
+    """Man-advantage windows from the alive-count differential timeline.
+
+    lives: (guid, team, spawn_ms, death_ms_or_None)
+    kills: (kill_time, killer_team, killer_guid, killer_name, victim_team)
+    Window = contiguous span where one team has more players alive; converted
+    when the advantaged team lands a further kill inside the window.
+    """
+    events: list[tuple[int, int, str]] = []
+    first_spawn: dict[str, int] = {}
+    for _guid, team, spawn_ms, death_ms in lives:
+        if team not in OTHER_TEAM:
+            continue
+        end = death_ms if death_ms and death_ms > spawn_ms else round_end_ms
+        events.append((int(spawn_ms), 0, team))
+        events.append((int(end), 1, team))
+        if team not in first_spawn or spawn_ms < first_spawn[team]:
+            first_spawn[team] = int(spawn_ms)
+    if len(first_spawn) < 2:
+        return []
+    ready_ms = max(first_spawn.values())
+    events.sort()
+
+    alive = {"AXIS": 0, "ALLIES": 0}
+    windows: list[dict] = []
+    current: dict | None = None
+    # Evaluate the differential once per timestamp — simultaneous events
+    # (paired wave spawns, multikills) must not create transient windows.
+    for t, group in groupby(events, key=lambda e: e[0]):
+        for _, kind, team in group:
+            alive[team] += 1 if kind == 0 else -1
+        diff = alive["AXIS"] - alive["ALLIES"]
+        leader = "AXIS" if diff > 0 else ("ALLIES" if diff < 0 else None)
+        if current is not None and leader != current["team"]:
+            current["end"] = t
+            windows.append(current)
+            current = None
+        if current is None and leader is not None and t >= ready_ms:
+            current = {"team": leader, "start": t, "max_size": abs(diff)}
+        elif current is not None:
+            current["max_size"] = max(current["max_size"], abs(diff))
+    if current is not None:
+        current["end"] = round_end_ms
+        windows.append(current)
+
+    for w in windows:
+        # Half-open [start, end): events at `end` are what removed the edge,
+        # so a kill at exactly `end` happened with the edge already gone.
+        converter = next(
+            (
+                k for k in kills
+                if k[1] == w["team"]
+                and k[4] == OTHER_TEAM[w["team"]]
+                and w["start"] + ADV_KILL_EPSILON_MS < k[0] < w["end"]
+            ),
+            None,
+        )
+        w["converted"] = converter is not None
+        w["converter_guid"] = converter[2] if converter else None
+        w["converter_name"] = converter[3] if converter else None
+    return windows
+
+
+def detect_clutches(
+    lives: list, kills: list, clocks: dict, round_end_ms: int,
+) -> list[dict]:
+    """Fight-scoped 1vN clutches (no round-end elimination state in ET).
+
+    Situation: a death leaves exactly one player alive on their team while
+    >=CLUTCH_MIN_ENEMIES enemies live and the friendly wave is
+    >=CLUTCH_MIN_WAVE_WAIT_MS away. Won if the survivor gets a kill and
+    lives to the wave, or trades up (kills >= enemies - 1).
+    """
+    events: list[tuple[int, int, str, str]] = []
+    for guid, team, spawn_ms, death_ms in lives:
+        if team not in OTHER_TEAM:
+            continue
+        end = death_ms if death_ms and death_ms > spawn_ms else round_end_ms
+        events.append((int(spawn_ms), 0, team, guid))
+        events.append((int(end), 1, team, guid))
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    alive: dict[str, set] = {"AXIS": set(), "ALLIES": set()}
+    situations: list[dict] = []
+    busy_until: dict[str, int] = {}
+    # Evaluate once per timestamp (a multikill must not fire intermediate
+    # "last alive" states mid-group).
+    for t, group in groupby(events, key=lambda e: e[0]):
+        died_teams: set[str] = set()
+        for _, kind, team, guid in group:
+            if kind == 0:
+                alive[team].add(guid)
+            else:
+                alive[team].discard(guid)
+                died_teams.add(team)
+        for team in died_teams:
+            if len(alive[team]) != 1:
+                continue
+            survivor = next(iter(alive[team]))
+            enemies = len(alive[OTHER_TEAM[team]])
+            clock = clocks.get(team)
+            if enemies < CLUTCH_MIN_ENEMIES or clock is None:
+                continue
+            if t < busy_until.get(survivor, 0):
+                continue
+            offset, interval = clock
+            # Ceiling wave landing (>= t): a death exactly on a wave landing
+            # means reinforcements are immediate, not a full interval away.
+            t_wave = -((-(t + offset)) // interval) * interval - offset
+            if t_wave - t < CLUTCH_MIN_WAVE_WAIT_MS:
+                continue
+            t_wave = min(t_wave, round_end_ms)
+            # The survivor's current life bounds the situation.
+            life_end = round_end_ms
+            for life_guid, life_team, spawn_ms, death_ms in lives:
+                d = death_ms if death_ms and death_ms > spawn_ms else round_end_ms
+                if life_guid == survivor and life_team == team and spawn_ms <= t < d:
+                    life_end = d
+                    break
+            end = min(t_wave, life_end)
+            sit_kills = sum(
+                1 for k in kills
+                if k[2] == survivor and k[4] == OTHER_TEAM[team] and t < k[0] <= end
+            )
+            survived = life_end >= t_wave
+            won = (sit_kills >= 1 and survived) or sit_kills >= enemies - 1
+            situations.append({
+                "guid": survivor,
+                "team": team,
+                "start": t,
+                "enemies": enemies,
+                "kills": sit_kills,
+                "survived": survived,
+                "won": won,
+            })
+            busy_until[survivor] = end
+    return situations
+
+
+def timeline_end_ms(lives: list, kills: list) -> int:
+    """Round end from spawns AND deaths (a survivor's death_ms is None) AND
+    kill times — death-only would truncate windows on survivor-heavy rounds."""
+    ends = (
+        [s for _, _, s, _ in lives]
+        + [d for _, _, _, d in lives if d]
+        + [k[0] for k in kills]
+    )
+    return max(ends) if ends else 0
+
+
+def latest_kill_names(kills: Iterable, names: dict[str, str] | None = None) -> dict[str, str]:
+    """Each player's name on their latest kill row, as killer or victim.
+
+    The one naming rule of the proximity endpoints: stored per round as
+    ``player_name``, and folded over rounds oldest first (pass the same
+    ``names``) by the raw-table paths. ``kills`` are time-ordered rows in the
+    RoundInputs shape; players with no kill row in scope stay unnamed.
+    """
+    names = {} if names is None else names
+    for kill in kills:
+        if kill[3]:
+            names[kill[2]] = kill[3]
+        if kill[6]:
+            names[kill[5]] = kill[6]
+    return names
+
+
+def advantage_bucket(max_size: int) -> str:
+    return "1" if max_size == 1 else ("2" if max_size == 2 else "3+")
+
+
+@dataclass
+class RoundInputs:
+    """One linked round's raw rows, in the routers' timeline shapes.
+
+    lives:  (guid, team, spawn_ms, death_ms_or_None)
+    kills:  (kill_time, killer_team, killer_guid, killer_name, victim_team,
+             victim_guid, victim_name) — self-kills dropped, sorted by time
+    trades: (event_id, victim_guid, victim_name, opportunities, attempts,
+             successes, missed, is_isolation_death, successes_json)
+    clocks: validated (offset, interval) per team
+    """
+
+    round_id: int
+    round_start_unix: int = 0
+    lives: list = field(default_factory=list)
+    kills: list = field(default_factory=list)
+    trades: list = field(default_factory=list)
+    clocks: dict = field(default_factory=dict)
+    winner: str | None = None
+    source_rows: int = 0
+
+
+@dataclass
+class RoundFeatures:
+    """One proximity_round_features row; field order is the column order."""
+
+    round_id: int
+    feature_version: str
+    source_rows: int
+    round_start_unix: int
+    has_lives: bool
+    has_kills: bool
+    has_clocks: bool
+    first_blood_team: str | None
+    winner_team: str | None
+    advantage: dict  # team -> size bucket -> [windows, converted]
+
+
+@dataclass
+class PlayerRoundFeatures:
+    """One proximity_player_round_features row; field order is the column order."""
+
+    round_id: int
+    player_guid: str
+    feature_version: str = FEATURE_VERSION
+    player_name: str | None = None    # latest_kill_names: kill rows only
+    first_picks: int = 0
+    first_deaths: int = 0
+    first_pick_converted: int = 0
+    trade_events: int = 0            # victim side: proximity_trade_event rows
+    trade_opportunities: int = 0
+    trade_attempts: int = 0
+    trade_successes: int = 0
+    trade_missed: int = 0
+    isolation_deaths: int = 0
+    avenged_count: int = 0           # avenger side: entries in others' successes
+    avenger_events: int = 0
+    avenger_damage: float = 0.0
+    advantage_conversions: int = 0
+    clutch_situations: int = 0
+    clutch_wins: int = 0
+    clutch_best_enemies: int | None = None
+    clutch_best_kills: int | None = None
+    clutch_best_survived: bool | None = None
+
+
+_ROUND_COLUMNS = tuple(f.name for f in fields(RoundFeatures))
+_PLAYER_COLUMNS = tuple(f.name for f in fields(PlayerRoundFeatures))
+
+
+def _json_list(payload: Any) -> list:
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    return payload if isinstance(payload, list) else []
+
+
+def compute_round_features(inputs: RoundInputs) -> tuple[RoundFeatures, list[PlayerRoundFeatures]]:
+    """The round's feature row and one feature vector per player seen in it."""
+    players: dict[str, PlayerRoundFeatures] = {}
+
+    def player(guid: str) -> PlayerRoundFeatures:
+        p = players.get(guid)
+        if p is None:
+            p = players[guid] = PlayerRoundFeatures(inputs.round_id, guid)
+        return p
+
+    for guid, *_ in inputs.lives:
+        player(guid)
+
+    # Trades: victim-side sums, and avenger credit from the successes array
+    # (one avenger event per trade event, however many entries it has).
+    for (_event_id, victim_guid, _victim_name, opportunities, attempts,
+         successes, missed, isolated, success_entries) in inputs.trades:
+        victim = player(victim_guid)
+        victim.trade_events += 1
+        victim.trade_opportunities += int(opportunities or 0)
+        victim.trade_attempts += int(attempts or 0)
+        victim.trade_successes += int(successes or 0)
+        victim.trade_missed += int(missed or 0)
+        victim.isolation_deaths += 1 if isolated else 0
+        avengers = set()
+        for entry in _json_list(success_entries):
+            guid = entry.get("guid") if isinstance(entry, dict) else None
+            if not guid:
+                continue
+            avenger = player(guid)
+            avenger.avenged_count += 1
+            if entry.get("damage") is not None:
+                avenger.avenger_damage += float(entry["damage"])
+            avengers.add(guid)
+        for guid in avengers:
+            players[guid].avenger_events += 1
+
+    for kill in inputs.kills:
+        player(kill[2])
+        player(kill[5])
+    for guid, name in latest_kill_names(inputs.kills).items():
+        players[guid].player_name = name
+
+    first_blood_team = None
+    if inputs.kills and inputs.round_start_unix > 0:
+        first = inputs.kills[0]
+        first_blood_team = first[1]
+        players[first[2]].first_picks += 1
+        players[first[5]].first_deaths += 1
+        if inputs.winner is not None and inputs.winner == first_blood_team:
+            players[first[2]].first_pick_converted += 1
+
+    end_ms = timeline_end_ms(inputs.lives, inputs.kills)
+    advantage = {team: {b: [0, 0] for b in ADVANTAGE_BUCKETS} for team in OTHER_TEAM}
+    if inputs.lives:
+        for w in advantage_windows(inputs.lives, inputs.kills, end_ms):
+            bucket = advantage[w["team"]][advantage_bucket(w["max_size"])]
+            bucket[0] += 1
+            if w["converted"]:
+                bucket[1] += 1
+                player(w["converter_guid"]).advantage_conversions += 1
+
+    if inputs.lives and inputs.clocks:
+        for sit in detect_clutches(inputs.lives, inputs.kills, inputs.clocks, end_ms):
+            p = player(sit["guid"])
+            p.clutch_situations += 1
+            if not sit["won"]:
+                continue
+            p.clutch_wins += 1
+            if p.clutch_best_enemies is None or (
+                (sit["enemies"], sit["kills"]) > (p.clutch_best_enemies, p.clutch_best_kills)
+            ):
+                p.clutch_best_enemies = sit["enemies"]
+                p.clutch_best_kills = sit["kills"]
+                p.clutch_best_survived = sit["survived"]
+
+    round_features = RoundFeatures(
+        round_id=inputs.round_id,
+        feature_version=FEATURE_VERSION,
+        source_rows=inputs.source_rows,
+        round_start_unix=inputs.round_start_unix,
+        has_lives=bool(inputs.lives),
+        has_kills=bool(inputs.kills),
+        has_clocks=bool(inputs.clocks),
+        first_blood_team=first_blood_team,
+        winner_team=inputs.winner,
+        advantage=advantage,
+    )
+    return round_features, sorted(players.values(), key=lambda p: p.player_guid)
+
+
+async def fetch_round_inputs(db: Any, round_ids: Iterable[int]) -> dict[int, RoundInputs]:
+    """Every feature input for ``round_ids``: three row queries, winners, clocks."""
+    ids = sorted({int(r) for r in round_ids})
+    if not ids:
+        return {}
+    params = (ids,)
+    track_rows = await db.fetch_all(
+        """
+        SELECT round_id, round_start_unix, player_guid, team, spawn_time_ms, death_time_ms
+        FROM player_track WHERE round_id = ANY($1::int[])
+        """,
+        params,
+    )
+    kill_rows = await db.fetch_all(
+        """
+        SELECT round_id, round_start_unix, kill_time, killer_team, killer_guid,
+               killer_name, victim_team, victim_guid, victim_name
+        FROM proximity_spawn_timing WHERE round_id = ANY($1::int[])
+        """,
+        params,
+    )
+    trade_rows = await db.fetch_all(
+        """
+        SELECT round_id, round_start_unix, id, victim_guid, victim_name,
+               opportunity_count, attempt_count, success_count, missed_count,
+               is_isolation_death, successes
+        FROM proximity_trade_event WHERE round_id = ANY($1::int[])
+        ORDER BY id
+        """,
+        params,
+    )
+
+    rounds: dict[int, RoundInputs] = {}
+
+    def round_of(row) -> RoundInputs:
+        round_id = int(row[0])
+        inputs = rounds.get(round_id)
+        if inputs is None:
+            inputs = rounds[round_id] = RoundInputs(round_id, int(row[1] or 0))
+        inputs.source_rows += 1
+        return inputs
+
+    for row in track_rows or []:
+        round_of(row).lives.append((row[2], row[3], int(row[4] or 0), row[5]))
+    for row in kill_rows or []:
+        inputs = round_of(row)
+        if row[4] != row[7]:
+            inputs.kills.append(
+                (int(row[2] or 0), row[3], row[4], row[5], row[6], row[7], row[8])
+            )
+    for row in trade_rows or []:
+        round_of(row).trades.append(tuple(row[2:11]))
+    for inputs in rounds.values():
+        inputs.kills.sort(key=lambda k: k[0])
+
+    winner_by_rsu = await round_winners(db, [r.round_start_unix for r in rounds.values()])
+    for inputs in rounds.values():
+        inputs.winner = winner_by_rsu.get(inputs.round_start_unix)
+
+    with_lives = [rid for rid, inputs in rounds.items() if inputs.lives]
+    validations = await load_stored_round_clocks(db, with_lives)
+    missing = [rid for rid in with_lives if rid not in validations]
+    if missing:
+        validations.update(await refresh_round_clocks(db, missing))
+    for round_id, clocks in validations.items():
+        if round_id in rounds:
+            rounds[round_id].clocks = {
+                team: clock
+                for team, validation in clocks.items()
+                if (clock := validated_clock_tuple(validation)) is not None
+            }
+    return rounds
+
+
+async def round_winners(db: Any, starts: Iterable[int]) -> dict[int, str | None]:
+    """Decided winners by round_start_unix, exactly as the first-blood endpoint
+    matches them (filler/invalid rounds and draws excluded)."""
+    starts = sorted({int(s) for s in starts if s and s > 0})
+    if not starts:
+        return {}
+    rows = await db.fetch_all(
+        "SELECT round_start_unix, winner_team FROM rounds WHERE round_start_unix = ANY($1)"
+        " AND is_valid IS DISTINCT FROM FALSE AND winner_team IN (1, 2)",
+        (starts,),
+    )
+    return {int(r[0]): TEAM_BY_NUM.get(int(r[1])) for r in (rows or [])}
+
+
+def _upsert_sql(table: str, columns: tuple[str, ...], key: tuple[str, ...], touch: str = "") -> str:
+    placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in key)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        f" ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}{touch}"
+    )
+
+
+_UPSERT_ROUND = _upsert_sql(
+    "proximity_round_features", _ROUND_COLUMNS, ("round_id",), ", computed_at = NOW()",
+)
+_UPSERT_PLAYER = _upsert_sql(
+    "proximity_player_round_features", _PLAYER_COLUMNS, ("round_id", "player_guid"),
+)
+
+
+async def store_round_features(
+    db: Any, computed: list[tuple[RoundFeatures, list[PlayerRoundFeatures]]],
+) -> int:
+    """Replace the rounds' rows; returns how many rounds were written (0 on failure).
+
+    One transaction, so a failure leaves the previous rows untouched. Rows are
+    upserted: the bot's post-import refresh and a website miss can store the
+    same round at once, and the later writer then updates instead of failing
+    on the primary key.
+    """
+    if not computed:
+        return 0
+    ids = [round_features.round_id for round_features, _ in computed]
+    player_rows = [astuple(p) for _, players in computed for p in players]
+    round_rows = [
+        (*astuple(rf)[:-1], json.dumps(rf.advantage, sort_keys=True))
+        for rf, _ in computed
+    ]
+    try:
+        async with db.transaction():
+            # Players no longer seen in a round must not survive the rewrite.
+            await db.execute(
+                "DELETE FROM proximity_player_round_features WHERE round_id = ANY($1::int[])",
+                (ids,),
+            )
+            if player_rows:
+                await db.executemany(_UPSERT_PLAYER, player_rows)
+            await db.executemany(_UPSERT_ROUND, round_rows)
+    except Exception as exc:                      # noqa: BLE001 — see module docstring
+        logger.warning("proximity features not stored for %d rounds: %s", len(ids), exc)
+        return 0
+    return len(ids)
+
+
+async def refresh_round_features(db: Any, round_ids: Iterable[int]) -> dict[int, RoundFeatures]:
+    """Recompute and store ``round_ids``; returns the rounds stored."""
+    computed = [
+        compute_round_features(inputs)
+        for inputs in (await fetch_round_inputs(db, round_ids)).values()
+    ]
+    if not await store_round_features(db, computed):
+        return {}
+    return {rf.round_id: rf for rf, _ in computed}
+
+
+async def scoped_feature_round_ids(db: Any, where_sql: str, params) -> list[int] | None:
+    """The linked rounds in scope, each refreshed if missing or stale.
+
+    Stale means an old version, a changed source row count, or a stored
+    winner the rounds table no longer agrees with (first_pick_converted
+    depends on it). ``where_sql`` is a _build_proximity_where_clause clause
+    without an alias.
+    Returns None when the scope must be answered from the raw tables: it has
+    unlinked rows, or the feature tables are unavailable.
+    """
+    try:
+        rows = await db.fetch_all(
+            f"""
+            SELECT round_id, COUNT(*) FROM (
+                SELECT round_id FROM player_track {where_sql}
+                UNION ALL
+                SELECT round_id FROM proximity_spawn_timing {where_sql}
+                UNION ALL
+                SELECT round_id FROM proximity_trade_event {where_sql}
+            ) scoped
+            GROUP BY round_id
+            """,  # nosec B608 - where_sql is $N-parameterized by _build_proximity_where_clause; no user data interpolated
+            tuple(params),
+        )
+        counts: dict[int, int] = {}
+        for row in rows or []:
+            if row[0] is None:
+                return None
+            counts[int(row[0])] = int(row[1])
+        if not counts:
+            return []
+        stored = await db.fetch_all(
+            """
+            SELECT round_id, source_rows, round_start_unix, winner_team
+            FROM proximity_round_features
+            WHERE round_id = ANY($1::int[]) AND feature_version = $2
+            """,
+            (sorted(counts), FEATURE_VERSION),
+        )
+        stored = stored or []
+        winners = await round_winners(db, [int(row[2] or 0) for row in stored])
+        current = {
+            int(row[0]): int(row[1])
+            for row in stored
+            if row[3] == winners.get(int(row[2] or 0))
+        }
+        stale = [rid for rid, n in counts.items() if current.get(rid) != n]
+        if stale:
+            refreshed = await refresh_round_features(db, stale)
+            if any(
+                rid not in refreshed or refreshed[rid].source_rows != counts[rid]
+                for rid in stale
+            ):
+                return None
+    except Exception as exc:                      # noqa: BLE001 — see module docstring
+        logger.debug("proximity features unavailable, using the raw tables: %s", exc)
+        return None
+    return sorted(counts)
+
+
+async def load_round_features(db: Any, round_ids: list[int]) -> list[RoundFeatures]:
+    """Current-version round rows for ``round_ids``, oldest round first."""
+    if not round_ids:
+        return []
+    rows = await db.fetch_all(
+        f"""
+        SELECT {', '.join(_ROUND_COLUMNS)} FROM proximity_round_features
+        WHERE round_id = ANY($1::int[]) AND feature_version = $2
+        ORDER BY round_start_unix, round_id
+        """,  # nosec B608 - column list is the RoundFeatures field names
+        (list(round_ids), FEATURE_VERSION),
+    )
+    out = []
+    for row in rows or []:
+        values = list(row)
+        advantage = values[-1]
+        values[-1] = json.loads(advantage) if isinstance(advantage, str) else (advantage or {})
+        out.append(RoundFeatures(*values))
+    return out
+
+
+async def load_player_features(db: Any, round_ids: list[int]) -> list[PlayerRoundFeatures]:
+    """Current-version player rows for ``round_ids``, oldest round first."""
+    if not round_ids:
+        return []
+    rows = await db.fetch_all(
+        f"""
+        SELECT {', '.join('p.' + c for c in _PLAYER_COLUMNS)}
+        FROM proximity_player_round_features p
+        JOIN proximity_round_features r
+          ON r.round_id = p.round_id AND r.feature_version = p.feature_version
+        WHERE p.round_id = ANY($1::int[]) AND p.feature_version = $2
+        ORDER BY r.round_start_unix, p.round_id, p.player_guid
+        """,  # nosec B608 - column list is the PlayerRoundFeatures field names
+        (list(round_ids), FEATURE_VERSION),
+    )
+    return [PlayerRoundFeatures(*row) for row in (rows or [])]
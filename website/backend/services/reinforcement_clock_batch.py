@@ -0,0 +1,505 @@
+"""Every round's reinforcement clock in one columnar pass, stored per round.
+
+`reinforcement_clock` answers for one round at a time from dataclasses, and its
+callers used to ask on every request: the round web snapshot, the man-advantage
+and clutch timelines (one `validate_round_clocks` per round in range, after
+reading every life's whole path to find its last event). The answer only
+changes when proximity data for the round is imported, so it is computed once,
+here, and stored in `round_reinforcement_clocks` (migration 083) under
+`CLOCK_PROTOCOL_VERSION`.
+
+The protocol itself is not restated. `reconstruct_round_clocks` is the same
+`validate_round_clocks`, rule for rule, over NumPy columns for all rounds at
+once — tests/unit/test_reinforcement_clock_batch.py holds the two equal on
+randomised rounds. Where a rule is subtle, the comment points at the scalar
+function that defines it.
+
+    rebuild   scripts/rebuild_reinforcement_clocks.py (all rounds, or a range)
+    refresh   refresh_round_clocks(db, [round_id]) after a proximity import
+    read      round_clock_validations(db, round_id) / load_stored_round_clocks
+
+A stored row from another protocol version is ignored, never served. Reads and
+writes are best-effort: a missing table degrades to computing on the fly.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+
+from website.backend.logging_config import get_app_logger
+from website.backend.services.clock_inputs import (
+    fetch_clock_lives_and_revives,
+    fetch_timing_observations,
+    is_bot_player,
+    strict_clock_round_gate_sql,
+)
+from website.backend.services.reinforcement_clock import (
+    CLOCK_PROTOCOL_VERSION,
+    LANDING_CLUSTER_JITTER_MS,
+    MIN_INTERNAL_OBSERVATIONS,
+    MIN_VALIDATION_LANDINGS,
+    MIN_VALIDATION_PASS_RATIO,
+    NORMAL_DEATH_EVENTS,
+    PLAYING_TEAMS,
+    VALIDATION_RESIDUAL_TOLERANCE_MS,
+    ClockValidation,
+    PlayerLife,
+    ReviveObservation,
+    TimingObservation,
+    validate_round_clocks,
+)
+
+logger = get_app_logger("services.reinforcement_clock_batch")
+
+RoundClocks = dict[str, ClockValidation]
+
+# Composite sort keys pack (segment, time) into one int64. Times are shifted by
+# _TIME_SHIFT so a negative spawn or death time still sorts inside its segment.
+_TIME_SHIFT = 1 << 31
+_SEGMENT_STRIDE = 1 << 33
+
+
+@dataclass
+class ClockColumns:
+    """Timing rows, lives and revives for many rounds, one array per field.
+
+    Bots are already removed and NULLs already resolved the way the scalar
+    fetchers resolve them: a missing ``time_to_next_spawn`` is flagged in
+    ``timing_ttn_null``, a missing score is NaN, a missing death is flagged in
+    ``life_death_null``.
+    """
+
+    timing_round: np.ndarray
+    timing_team: np.ndarray
+    timing_kill_ms: np.ndarray
+    timing_interval_ms: np.ndarray
+    timing_ttn_ms: np.ndarray
+    timing_ttn_null: np.ndarray
+    timing_score: np.ndarray
+    life_round: np.ndarray
+    life_row_id: np.ndarray
+    life_guid: np.ndarray
+    life_team: np.ndarray
+    life_spawn_ms: np.ndarray
+    life_death_ms: np.ndarray
+    life_death_null: np.ndarray
+    life_death_type: np.ndarray
+    revive_round: np.ndarray
+    revive_guid: np.ndarray
+    revive_ms: np.ndarray
+
+    @classmethod
+    def from_rounds(
+        cls,
+        rounds: dict[int, tuple[Iterable[TimingObservation], Iterable[PlayerLife],
+                                Iterable[ReviveObservation]]],
+    ) -> ClockColumns:
+        """Columns from the scalar dataclasses, keyed by round id."""
+        t_rows, l_rows, r_rows = [], [], []
+        for round_id, (timings, lives, revives) in rounds.items():
+            t_rows += [(round_id, o.team, o.kill_time_ms, o.interval_ms,
+                        o.time_to_next_spawn_ms, o.spawn_timing_score) for o in timings]
+            l_rows += [(round_id, life.row_id, life.player_guid, life.team,
+                        life.spawn_time_ms, life.death_time_ms, life.death_type)
+                       for life in lives]
+            r_rows += [(round_id, r.player_guid, r.time_ms) for r in revives]
+        return cls.from_rows(t_rows, l_rows, r_rows)
+
+    @classmethod
+    def from_rows(cls, timing_rows, life_rows, revive_rows) -> ClockColumns:
+        """Columns from plain tuples.
+
+        timing: (round_id, team, kill_ms, interval_ms, ttn_ms | None, score | None)
+        life:   (round_id, row_id, guid, team, spawn_ms, death_ms | None, death_type)
+        revive: (round_id, guid, time_ms)
+        """
+        t = list(zip(*timing_rows)) or [()] * 6
+        lv = list(zip(*life_rows)) or [()] * 7
+        rv = list(zip(*revive_rows)) or [()] * 3
+        return cls(
+            timing_round=np.array(t[0], dtype=np.int64),
+            timing_team=np.array(t[1], dtype=np.str_),
+            timing_kill_ms=np.array(t[2], dtype=np.int64),
+            timing_interval_ms=np.array(t[3], dtype=np.int64),
+            timing_ttn_ms=np.array([v if v is not None else 0 for v in t[4]], dtype=np.int64),
+            timing_ttn_null=np.array([v is None for v in t[4]], dtype=bool),
+            timing_score=np.array([np.nan if v is None else v for v in t[5]], dtype=np.float64),
+            life_round=np.array(lv[0], dtype=np.int64),
+            life_row_id=np.array(lv[1], dtype=np.int64),
+            life_guid=np.array(lv[2], dtype=np.str_),
+            life_team=np.array(lv[3], dtype=np.str_),
+            life_spawn_ms=np.array(lv[4], dtype=np.int64),
+            life_death_ms=np.array([v if v is not None else 0 for v in lv[5]], dtype=np.int64),
+            life_death_null=np.array([v is None for v in lv[5]], dtype=bool),
+            life_death_type=np.array([v or "" for v in lv[6]], dtype=np.str_),
+            revive_round=np.array(rv[0], dtype=np.int64),
+            revive_guid=np.array(rv[1], dtype=np.str_),
+            revive_ms=np.array(rv[2], dtype=np.int64),
+        )
+
+
+# ── the protocol, columnar ───────────────────────────────────────────────────
+
+
+def reconstruct_round_clocks(cols: ClockColumns) -> dict[int, RoundClocks]:
+    """`validate_round_clocks` for every round in ``cols`` at once.
+
+    Rounds without a timing row for any team map to ``{}``, exactly as the
+    scalar function returns for them.
+    """
+    rounds = np.union1d(cols.timing_round, cols.life_round)
+    out: dict[int, RoundClocks] = {int(r): {} for r in rounds}
+    if not len(cols.timing_round):
+        return out
+
+    teams = np.unique(np.concatenate([cols.timing_team, cols.life_team]))
+    t_team = np.searchsorted(teams, cols.timing_team)
+    l_team = np.searchsorted(teams, cols.life_team)
+
+    # The (round, team) pairs a verdict is owed for: every team named on a
+    # timing row, usable or not (validate_round_clocks: `if observation.team`).
+    named = cols.timing_team != ""
+    pair_key = cols.timing_round * len(teams) + t_team
+    pairs = np.unique(pair_key[named])
+    inference = _infer(cols, t_team, teams, pair_key, pairs)
+    landings = _landings(cols, l_team, len(teams))
+    names = [str(teams[key % len(teams)]) for key in pairs.tolist()]
+    verdicts = _validate(inference, landings, pairs, names)
+
+    for key, name, verdict in zip(pairs.tolist(), names, verdicts):
+        out[key // len(teams)][name] = verdict
+    return out
+
+
+def _infer(cols, t_team, teams, pair_key, pairs) -> dict[str, np.ndarray]:
+    """infer_clock per pair: counts, the unanimous interval and offset, status."""
+    playing = np.isin(teams, list(PLAYING_TEAMS))[t_team]
+    interval = cols.timing_interval_ms
+    ttn = cols.timing_ttn_ms
+    # timing_exclusion_reason, every clause
+    usable = (
+        playing
+        & (cols.timing_kill_ms >= 0)
+        & (interval > 0)
+        & ~cols.timing_ttn_null
+        & (ttn > 0) & (ttn <= interval)
+        & (np.isnan(cols.timing_score) | (cols.timing_score > 0.0))
+    )
+    pair = np.searchsorted(pairs, pair_key[usable])
+    interval = interval[usable]
+    candidate = np.mod(interval - ttn[usable] - cols.timing_kill_ms[usable], interval)
+
+    n = len(pairs)
+    count = np.bincount(pair, minlength=n)
+    distinct_intervals = _distinct_per_pair(pair, interval, n)
+    distinct_candidates = _distinct_per_pair(pair, candidate, n)
+    single_interval = _min_per_pair(pair, interval, n)
+    single_candidate = _min_per_pair(pair, candidate, n)
+
+    status = np.full(n, "internally_consistent_unvalidated", dtype=object)
+    status[(distinct_intervals != 1) | (distinct_candidates != 1)] = "inconsistent"
+    status[count < MIN_INTERNAL_OBSERVATIONS] = "insufficient"
+    return {
+        "status": status,
+        "count": count,
+        "interval": np.where(distinct_intervals == 1, single_interval, -1),
+        "offset": np.where(status == "internally_consistent_unvalidated", single_candidate, -1),
+    }
+
+
+def _distinct_per_pair(pair: np.ndarray, value: np.ndarray, n: int) -> np.ndarray:
+    if not len(pair):
+        return np.zeros(n, dtype=np.int64)
+    unique_pairs = np.unique(np.stack([pair, value]), axis=1)[0]
+    return np.bincount(unique_pairs, minlength=n)
+
+
+def _min_per_pair(pair: np.ndarray, value: np.ndarray, n: int) -> np.ndarray:
+    out = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(out, pair, value)
+    return out
+
+
+def _landings(cols: ClockColumns, l_team: np.ndarray, n_teams: int) -> dict[str, np.ndarray]:
+    """qualify_normal_spawns + cluster_spawn_landings over every round."""
+    guids, l_guid = np.unique(cols.life_guid, return_inverse=True)
+    # lives ordered per (round, player) by (spawn, row id), as the scalar sorts
+    order = np.lexsort((cols.life_row_id, cols.life_spawn_ms, l_guid, cols.life_round))
+    rnd, guid = cols.life_round[order], l_guid[order]
+    team, spawn = l_team[order], cols.life_spawn_ms[order]
+    death, death_null = cols.life_death_ms[order], cols.life_death_null[order]
+    death_type = cols.life_death_type[order]
+
+    player = rnd * max(len(guids), 1) + guid
+    same = player[1:] == player[:-1]               # (previous, current) pairs
+    prev, cur = np.arange(len(order) - 1), np.arange(1, len(order))
+    overlapping = same & (death_null[prev] | (spawn[cur] < death[prev]))
+    # any overlap makes the whole player-round ambiguous
+    _, player_of = np.unique(player, return_inverse=True)
+    ambiguous = np.zeros(player_of.max() + 1 if len(player_of) else 0, dtype=bool)
+    ambiguous[player_of[cur][overlapping]] = True
+
+    qualified = (
+        same
+        & ~ambiguous[player_of[cur]]
+        & (spawn[cur] >= 0)
+        & ~death_null[prev]
+        & np.isin(death_type[prev], list(NORMAL_DEATH_EVENTS))
+        & (team[prev] == team[cur])
+    )
+    prev, cur = prev[qualified], cur[qualified]
+
+    # follows_post_revive_gap: a revive of this player in [prior death, spawn)
+    revive_guid = np.searchsorted(guids, cols.revive_guid)
+    known = (revive_guid < len(guids))
+    known[known] = guids[revive_guid[known]] == cols.revive_guid[known]
+    revive_key = np.sort(
+        (cols.revive_round[known] * max(len(guids), 1) + revive_guid[known]) * _SEGMENT_STRIDE
+        + cols.revive_ms[known] + _TIME_SHIFT
+    )
+    base = player[cur] * _SEGMENT_STRIDE + _TIME_SHIFT
+    follows = (np.searchsorted(revive_key, base + spawn[cur])
+               - np.searchsorted(revive_key, base + death[prev])) > 0
+
+    # cluster_spawn_landings per (round, team), anchored and non-transitive
+    seg_of = rnd[cur] * n_teams + team[cur]
+    s_order = np.lexsort((spawn[cur], seg_of))
+    seg_of, time = seg_of[s_order], spawn[cur][s_order]
+    s_guid, follows = guid[cur][s_order], follows[s_order]
+    segments, seg_start = np.unique(seg_of, return_index=True)
+    seg_end = np.append(seg_start[1:], len(seg_of))
+    seg_idx = np.searchsorted(segments, seg_of)
+    key = seg_idx * _SEGMENT_STRIDE + time + _TIME_SHIFT
+
+    starts, ends = [], []
+    anchor = seg_start.copy()
+    live = anchor < seg_end
+    while live.any():
+        a = anchor[live]
+        end = np.minimum(np.searchsorted(key, key[a] + LANDING_CLUSTER_JITTER_MS, "right"),
+                         seg_end[live])
+        starts.append(a)
+        ends.append(end)
+        anchor[live] = end
+        live = anchor < seg_end
+    empty = np.empty(0, dtype=np.int64)
+    if not starts:
+        return {"pair": empty, "time": empty, "spawns": empty, "post_revive": empty}
+    c_start = np.concatenate(starts)
+    c_end = np.concatenate(ends)
+    by_position = np.argsort(c_start)
+    c_start, c_end = c_start[by_position], c_end[by_position]
+
+    size = c_end - c_start
+    cluster_of = np.repeat(np.arange(len(c_start)), size)
+    # _make_landing: a player twice in one cluster voids the whole cluster
+    distinct = np.bincount(np.unique(np.stack([cluster_of, s_guid]), axis=1)[0],
+                           minlength=len(c_start))
+    keep = distinct == size
+    # the median callback, even clusters taking the floored midpoint
+    mid = c_start + size // 2
+    median = np.where(size % 2 == 1, time[mid], (time[mid - 1] + time[mid]) // 2)
+    post_revive = np.add.reduceat(follows.astype(np.int64), c_start)
+    return {
+        "pair": seg_of[c_start][keep],
+        "time": median[keep],
+        "spawns": size[keep],
+        "post_revive": post_revive[keep],
+    }
+
+
+def _validate(inference, landings, pairs, names) -> list[ClockValidation]:
+    """validate_clock for each pair against its own team's landings."""
+    order = np.lexsort((landings["time"], landings["pair"]))
+    l_pair = landings["pair"][order]
+    l_time = landings["time"][order]
+    l_spawns = landings["spawns"][order]
+    l_post = landings["post_revive"][order]
+    lo = np.searchsorted(l_pair, pairs, "left")
+    hi = np.searchsorted(l_pair, pairs, "right")
+
+    verdicts = []
+    for i in range(len(pairs)):
+        status = str(inference["status"][i])
+        interval = int(inference["interval"][i])
+        offset = int(inference["offset"][i])
+        span = slice(lo[i], hi[i])
+        common = {
+            "team": names[i],
+            "interval_ms": interval if interval >= 0 else None,
+            "offset_ms": offset if offset >= 0 else None,
+            "timing_observation_count": int(inference["count"][i]),
+            "landing_count": int(hi[i] - lo[i]),
+            "spawn_observation_count": int(l_spawns[span].sum()),
+            "post_revive_spawn_count": int(l_post[span].sum()),
+        }
+        if status != "internally_consistent_unvalidated":
+            verdicts.append(ClockValidation(status=status, passing_landing_count=0,
+                                            pass_ratio=None, residuals_ms=(), **common))
+            continue
+        phase = np.mod(l_time[span] + offset, interval)
+        residuals = np.minimum(phase, interval - phase)
+        passing = int((residuals <= VALIDATION_RESIDUAL_TOLERANCE_MS).sum())
+        if len(residuals) < MIN_VALIDATION_LANDINGS:
+            status = "internally_consistent_unvalidated"
+        elif passing / len(residuals) >= MIN_VALIDATION_PASS_RATIO:
+            status = "validated"
+        else:
+            status = "validation_failed"
+        verdicts.append(ClockValidation(
+            status=status, passing_landing_count=passing,
+            pass_ratio=passing / len(residuals) if len(residuals) else None,
+            residuals_ms=tuple(int(r) for r in residuals), **common,
+        ))
+    return verdicts
+
+
+# ── database ─────────────────────────────────────────────────────────────────
+
+
+def _round_filter(round_ids: list[int] | None, column: str = "round_id") -> tuple[str, tuple]:
+    if round_ids is None:
+        return f"{column} IS NOT NULL", ()
+    return f"{column} = ANY($1::int[])", (list(round_ids),)
+
+
+async def fetch_clock_columns(db: Any, round_ids: list[int] | None = None) -> ClockColumns:
+    """The three clock inputs for ``round_ids`` (None: every linked round).
+
+    Three queries in all, whatever the number of rounds; the rows and the bot
+    and NULL handling are the scalar fetchers' in `clock_inputs`.
+    """
+    where, params = _round_filter(round_ids)
+    timing_rows = await db.fetch_all(
+        f"""
+        SELECT round_id, victim_team, kill_time, enemy_spawn_interval,
+               time_to_next_spawn, spawn_timing_score, killer_guid, killer_name
+        FROM proximity_spawn_timing
+        WHERE {where} AND {strict_clock_round_gate_sql()}
+        """,  # nosec B608 - literals only; round ids are a bound parameter
+        params,
+    )
+    life_rows = await db.fetch_all(
+        f"""
+        SELECT round_id, id, player_guid, player_name, team, spawn_time_ms,
+               death_time_ms, path -> -1 ->> 'event' AS death_type
+        FROM player_track
+        WHERE {where} AND spawn_time_ms IS NOT NULL
+        """,  # nosec B608 - literals only; round ids are a bound parameter
+        params,
+    )
+    revive_rows = await db.fetch_all(
+        f"""
+        SELECT round_id, revived_guid, revived_name, revive_time
+        FROM proximity_revive
+        WHERE {where}
+        """,  # nosec B608 - literals only; round ids are a bound parameter
+        params,
+    )
+    return ClockColumns.from_rows(
+        [
+            (int(r[0]), str(r[1] or ""), int(r[2] or 0), int(r[3] or 0),
+             int(r[4]) if r[4] is not None else None,
+             float(r[5]) if r[5] is not None else None)
+            for r in (timing_rows or [])
+            if not is_bot_player(r[6], r[7])
+        ],
+        [
+            (int(r[0]), int(r[1]), str(r[2]), str(r[4] or ""), int(r[5]),
+             int(r[6]) if r[6] is not None else None, r[7])
+            for r in (life_rows or [])
+            if not is_bot_player(r[2], r[3])
+        ],
+        [
+            (int(r[0]), str(r[1]), int(r[3]))
+            for r in (revive_rows or [])
+            if not is_bot_player(r[1], r[2])
+        ],
+    )
+
+
+def _to_json(clocks: RoundClocks) -> str:
+    return json.dumps({team: asdict(v) for team, v in sorted(clocks.items())})
+
+
+def _from_json(payload: Any) -> RoundClocks:
+    if isinstance(payload, str):                  # asyncpg hands JSONB back as text
+        payload = json.loads(payload)
+    return {
+        team: ClockValidation(**{**fields, "residuals_ms": tuple(fields["residuals_ms"])})
+        for team, fields in payload.items()
+    }
+
+
+async def store_round_clocks(db: Any, clocks_by_round: dict[int, RoundClocks]) -> int:
+    """Upsert one row per round; returns how many were written (0 on failure)."""
+    rows = [
+        (round_id, CLOCK_PROTOCOL_VERSION, _to_json(clocks))
+        for round_id, clocks in sorted(clocks_by_round.items())
+    ]
+    if not rows:
+        return 0
+    try:
+        await db.executemany(
+            """
+            INSERT INTO round_reinforcement_clocks (round_id, protocol_version, clocks,
+                                                    computed_at)
+            VALUES ($1, $2, $3, NOW())
+            ON CONFLICT (round_id) DO UPDATE SET
+                protocol_version = EXCLUDED.protocol_version,
+                clocks           = EXCLUDED.clocks,
+                computed_at      = NOW()
+            """,
+            rows,
+        )
+    except Exception as exc:                      # noqa: BLE001 — see module docstring
+        logger.debug("reinforcement clocks not stored for %d rounds: %s", len(rows), exc)
+        return 0
+    return len(rows)
+
+
+async def load_stored_round_clocks(db: Any, round_ids: Iterable[int]) -> dict[int, RoundClocks]:
+    """Stored clocks of the current protocol for ``round_ids``; absent ids are misses."""
+    ids = sorted({int(r) for r in round_ids})
+    if not ids:
+        return {}
+    try:
+        rows = await db.fetch_all(
+            """
+            SELECT round_id, clocks FROM round_reinforcement_clocks
+            WHERE round_id = ANY($1::int[]) AND protocol_version = $2
+            """,
+            (ids, CLOCK_PROTOCOL_VERSION),
+        )
+        return {int(row[0]): _from_json(row[1]) for row in (rows or [])}
+    except Exception as exc:                      # noqa: BLE001 — see module docstring
+        logger.debug("stored reinforcement clocks unreadable: %s", exc)
+        return {}
+
+
+async def refresh_round_clocks(db: Any, round_ids: list[int] | None = None) -> dict[int, RoundClocks]:
+    """Recompute and store clocks for ``round_ids`` (None: every round)."""
+    clocks = reconstruct_round_clocks(await fetch_clock_columns(db, round_ids))
+    for round_id in round_ids or ():
+        clocks.setdefault(int(round_id), {})       # a round with no rows is still answered
+    await store_round_clocks(db, clocks)
+    return clocks
+
+
+async def round_clock_validations(db: Any, round_id: int) -> RoundClocks:
+    """One round's verdicts: stored when current, else computed and stored."""
+    stored = await load_stored_round_clocks(db, [round_id])
+    if round_id in stored:
+        return stored[round_id]
+    observations = await fetch_timing_observations(db, round_id)
+    if not observations:
+        return {}
+    lives, revives, _track_end = await fetch_clock_lives_and_revives(db, round_id)
+    clocks = validate_round_clocks(observations, lives, revives)
+    await store_round_clocks(db, {round_id: clocks})
+    return clocks
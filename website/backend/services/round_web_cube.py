@@ -0,0 +1,439 @@
+"""Layer 1 for a whole round at once — every player at every tick of a grid.
+
+⛔ RECONSTRUCTION ONLY, exactly like `round_web_service` (spec §4.6). This
+module changes how often the work is done, never what the work decides.
+
+WHY IT EXISTS. `build_snapshot` answers one moment, and everything that asks
+many moments paid for each one from scratch: the validators sample 40 to
+several hundred ticks per round, and every tick re-ran `select_life` over each
+player's lives, re-parsed every chosen `path` from JSON text, rebuilt the time
+list for the bisect and walked back for a velocity predecessor. Nothing of that
+depends on `t` except the final lookup. Here the paths are parsed once, every
+sample's velocity is derived once, and the floor lookups for a whole grid are
+one `searchsorted` per life — the result is a set of (ticks × players) arrays
+that snapshots slice instead of recompute.
+
+THE RULES ARE NOT RE-DECIDED HERE. Spec §4.1: "Do not re-implement slicing."
+The life rule (half-open, latest spawn, ties on the greatest id, the first of
+exact duplicates as `max` would pick), floor-never-nearest with the LAST sample
+of a duplicate-time run, staleness measured against `t` even for a dead
+player's death-time lookup, and velocity from the same life only — all of it is
+`round_web_service`'s, vectorised. `build_snapshot` stays the reference, and
+`tests/unit/test_round_web_cube.py` holds the two equal on a grid that
+exercises every gap reason and every velocity refusal.
+
+⚠️ A path whose times go backwards is not something `bisect` or the
+step-back in `derive_velocity` are defined on; they still answer, just not as a
+sorted search would. Such a life is routed through those scalar functions so
+the answer stays the reference's, not a "better" one nobody validated.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from website.backend.services.replay_service import _ensure_path_list, _safe_float
+from website.backend.services.round_web_service import (
+    VELOCITY_SANITY_CAP_UPS,
+    VELOCITY_SPEED_TOLERANCE,
+    Edge,
+    PlayerState,
+    Snapshot,
+    _contested_guids,
+    derive_velocity,
+)
+from website.backend.utils.et_constants import strip_et_colors
+
+#: Row columns, in the order `load_round_tracks` returns them.
+_NAME, _TEAM, _CLASS, _SPAWN, _DEATH, _PATH, _ID = 1, 2, 3, 4, 5, 6, 8
+
+
+def _coordinate(value: Any) -> tuple[float, bool]:
+    """The float `derive_velocity` would compute, and whether it would succeed.
+
+    NaN stands in for "absent" in the arrays; the flag keeps that distinct from
+    a coordinate that genuinely is NaN, the same way `_has_position` keeps
+    None distinct from 0.0.
+    """
+    if value is None:
+        return math.nan, False
+    try:
+        return float(value), True
+    except (TypeError, ValueError):
+        return math.nan, False
+
+
+def _first_max_order(primary: np.ndarray, secondary: np.ndarray) -> np.ndarray:
+    """Ascending by (primary, secondary); among exact ties the EARLIEST row last.
+
+    `max()` returns the first of several equal keys, so the row that has to win
+    a "take the last one" pick is the one that appeared first in the list.
+    """
+    return np.lexsort((-np.arange(len(primary)), secondary, primary))
+
+
+def _life_velocity(
+    path: list, times: np.ndarray, xyz: np.ndarray, coord_ok: np.ndarray,
+    speed: np.ndarray, max_dt_ms: int | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`derive_velocity` for every sample of one life: (vxyz, dt_ms, reason).
+
+    Refusals are assigned in `derive_velocity`'s own order, each one only to
+    samples no earlier check has already refused, so a sample carries the same
+    single reason it would get from the scalar function.
+    """
+    n = len(path)
+    vxyz = np.full((n, 3), np.nan)
+    dt_out = np.full(n, -1, dtype=np.int64)
+    reason = np.full(n, None, dtype=object)
+    if n == 0:
+        return vxyz, dt_out, reason
+
+    if np.any(np.diff(times) < 0):
+        for i in range(n):
+            vx, vy, vz, dt_ms, why = derive_velocity(path, i, max_dt_ms)
+            reason[i] = why
+            if why is None:
+                vxyz[i] = (vx, vy, vz)
+                dt_out[i] = dt_ms
+        return vxyz, dt_out, reason
+
+    # Sorted times: the step back over a duplicate run lands on the last
+    # sample strictly earlier than this one, which is exactly a left search.
+    prev = np.searchsorted(times, times, side="left") - 1
+    prev_safe = np.maximum(prev, 0)
+    dt = np.trunc(times - times[prev_safe]).astype(np.int64)
+    pending = np.ones(n, dtype=bool)
+
+    def refuse(mask: np.ndarray, label) -> None:
+        hit = pending & mask
+        for i in np.flatnonzero(hit):
+            reason[i] = label(i) if callable(label) else label
+        pending[hit] = False
+
+    refuse(np.arange(n) == 0, "no_causal_predecessor")
+    refuse(prev < 0, "no_strictly_earlier_sample")
+    refuse(dt <= 0, "non_monotonic_samples")
+    if max_dt_ms is not None:
+        refuse(dt > max_dt_ms, lambda i: f"gap_exceeds_max_dt_{int(dt[i])}ms")
+    refuse(~(coord_ok & coord_ok[prev_safe]), "incomplete_coordinates")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derived = (xyz - xyz[prev_safe]) / (dt / 1000.0)[:, None]
+    horizontal = np.hypot(derived[:, 0], derived[:, 1])
+    refuse(horizontal > VELOCITY_SANITY_CAP_UPS,
+           lambda i: f"exceeds_sanity_cap_{horizontal[i]:.0f}ups")
+
+    # A stored speed of None or <= 0 is skipped, NaN compares false — both as
+    # in the scalar loop over (prev, cur).
+    with np.errstate(invalid="ignore"):
+        disagrees = np.zeros(n, dtype=bool)
+        for stored in (speed[prev_safe], speed):
+            checked = stored > 0
+            disagrees |= checked & (
+                np.abs(horizontal - stored)
+                > VELOCITY_SPEED_TOLERANCE * np.maximum(stored, 1.0)
+            )
+    refuse(disagrees, "disagrees_with_stored_speed")
+
+    vxyz[pending] = derived[pending]
+    dt_out[pending] = dt[pending]
+    return vxyz, dt_out, reason
+
+
+def _floor_indices(path: list, times: np.ndarray, lookup: np.ndarray) -> np.ndarray:
+    """`find_position_floor`'s index for each lookup time, -1 where none."""
+    if len(times) == 0:
+        return np.full(len(lookup), -1, dtype=np.int64)
+    if np.any(np.diff(times) < 0):
+        raw = [s.get("time", 0) for s in path]
+        return np.array([bisect_right(raw, v) - 1 for v in lookup.tolist()], dtype=np.int64)
+    return np.searchsorted(times, lookup, side="right").astype(np.int64) - 1
+
+
+@dataclass(slots=True)
+class RoundCube:
+    """Layer 1 state for every player at every tick of `t_grid`.
+
+    Every (T, P) array is indexed [tick, player] with players in `guids`
+    order — the order `tracks_by_guid` was given in, which is also the order a
+    snapshot lists them. Where a player has no state at a tick, floats are NaN
+    and indices are -1; `gap_reason` says why, with the same strings
+    `build_snapshot` uses (before any `max_stale_ms`, which is the caller's).
+    """
+
+    t_grid: np.ndarray
+    guids: list[str]
+    life: np.ndarray
+    alive: np.ndarray
+    overlap_conflict: np.ndarray
+    sample: np.ndarray
+    stale_ms: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+    placeable: np.ndarray
+    team_code: np.ndarray
+    vx: np.ndarray
+    vy: np.ndarray
+    vz: np.ndarray
+    velocity_dt_ms: np.ndarray
+    velocity_reason: np.ndarray
+    gap_reason: np.ndarray
+    lives: list[list]
+    samples: list[dict]
+
+    def tick(self, t_ms: int) -> int:
+        """Index of `t_ms` in the grid. A cube never answers between its ticks."""
+        i = int(np.searchsorted(self.t_grid, t_ms))
+        if i >= len(self.t_grid) or self.t_grid[i] != t_ms:
+            raise KeyError(f"t_ms={t_ms} is not on this cube's grid")
+        return i
+
+    def _placed(self, ti: int, max_stale_ms: int | None) -> np.ndarray:
+        placed = self.sample[ti] >= 0
+        if max_stale_ms is not None:
+            placed &= self.stale_ms[ti] <= max_stale_ms
+        return placed
+
+    def snapshot(
+        self, t_ms: int, *, engagements: list | None = None,
+        max_stale_ms: int | None = None,
+    ) -> Snapshot:
+        """The `build_snapshot` answer for `t_ms`, sliced out of the cube."""
+        ti = self.tick(t_ms)
+        players: dict[str, PlayerState] = {}
+        gaps: dict[str, str] = {}
+        placed = self._placed(ti, max_stale_ms)
+
+        for p, guid in enumerate(self.guids):
+            if not placed[p]:
+                stale = int(self.stale_ms[ti, p])
+                gaps[guid] = (self.gap_reason[ti, p] if self.sample[ti, p] < 0
+                              else f"exceeds_max_stale_{stale}ms")
+                continue
+            alive = bool(self.alive[ti, p])
+            track = self.lives[p][self.life[ti, p]]
+            sample = self.samples[self.sample[ti, p]]
+            velocity_ok = alive and self.velocity_reason[ti, p] is None
+            players[guid] = PlayerState(
+                guid=guid,
+                name=strip_et_colors(track[_NAME]),
+                team=track[_TEAM],
+                player_class=track[_CLASS],
+                x=_safe_float(sample.get("x")),
+                y=_safe_float(sample.get("y")),
+                z=_safe_float(sample.get("z")),
+                health=int(sample.get("health", 0) or 0) if alive else 0,
+                weapon=sample.get("weapon"),
+                stance=sample.get("stance"),
+                speed=_safe_float(sample.get("speed")),
+                alive=alive,
+                track_id=track[_ID],
+                stale_ms=int(self.stale_ms[ti, p]),
+                overlap_conflict=bool(self.overlap_conflict[ti, p]),
+                vx=float(self.vx[ti, p]) if velocity_ok else None,
+                vy=float(self.vy[ti, p]) if velocity_ok else None,
+                vz=float(self.vz[ti, p]) if velocity_ok else None,
+                velocity_stale_ms=int(self.velocity_dt_ms[ti, p]) if velocity_ok else None,
+                velocity_reason=self.velocity_reason[ti, p],
+            )
+
+        contested = _contested_guids(engagements or [], t_ms)
+        members, distance, teammate = self.pairwise(t_ms, max_stale_ms=max_stale_ms)
+        rows, cols = np.triu_indices(len(members), k=1)
+        edges = [
+            Edge(
+                a_guid=members[i],
+                b_guid=members[j],
+                kind="teammate" if teammate[i, j] else "opponent",
+                distance=float(distance[i, j]),
+                recently_contested=(members[i] in contested or members[j] in contested),
+            )
+            for i, j in zip(rows.tolist(), cols.tolist(), strict=True)
+        ]
+        return Snapshot(
+            t_ms=t_ms,
+            players=players,
+            edges=edges,
+            # Counted before the sample and tolerance checks, like build_snapshot.
+            overlap_conflicts=int(self.overlap_conflict[ti].sum()),
+            gaps=gaps,
+        )
+
+    def pairwise(
+        self, t_ms: int, *, max_stale_ms: int | None = None,
+    ) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """(guids, distance matrix, teammate matrix) among edge-eligible players.
+
+        Eligible means what `build_edges` requires: in the snapshot, alive and
+        with all three coordinates. The guid order is the snapshot's, so the
+        upper triangle read row by row is `build_edges`'s pair order.
+        """
+        ti = self.tick(t_ms)
+        eligible = self._placed(ti, max_stale_ms) & self.alive[ti] & self.placeable[ti]
+        idx = np.flatnonzero(eligible)
+        pos = np.stack((self.x[ti, idx], self.y[ti, idx], self.z[ti, idx]), axis=1)
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.sqrt((delta * delta).sum(axis=2))
+        codes = self.team_code[ti, idx]
+        return [self.guids[i] for i in idx], distance, codes[:, None] == codes[None, :]
+
+    def nearest_teammate_separation(
+        self, t_ms: int, *, max_stale_ms: int | None = None,
+    ) -> dict[str, float | None]:
+        """`nearest_teammate_separation` for `t_ms`, as a masked row minimum."""
+        members, distance, teammate = self.pairwise(t_ms, max_stale_ms=max_stale_ms)
+        mates = teammate & ~np.eye(len(members), dtype=bool)
+        nearest = np.where(mates, distance, np.inf).min(axis=1, initial=np.inf)
+        return {
+            guid: (float(d) if np.isfinite(d) else None)
+            for guid, d in zip(members, nearest.tolist(), strict=True)
+        }
+
+
+def build_round_cube(
+    tracks_by_guid: dict[str, list],
+    t_grid,
+    *,
+    velocity_max_dt_ms: int | None = None,
+) -> RoundCube:
+    """Every player's Layer 1 state at every tick of `t_grid`, in one pass.
+
+    `t_grid` may be in any order and repeat itself; the cube keeps it sorted and
+    unique, and `RoundCube.tick` maps a moment back to its row.
+    `velocity_max_dt_ms` is fixed per cube because velocity is derived per
+    SAMPLE here, once, rather than per lookup.
+    """
+    grid = np.unique(np.asarray([int(t) for t in t_grid], dtype=np.int64))
+    guids = list(tracks_by_guid)
+    shape = (len(grid), len(guids))
+    t_col = grid.astype(np.float64)[:, None]
+
+    life = np.full(shape, -1, dtype=np.int64)
+    alive = np.zeros(shape, dtype=bool)
+    conflict = np.zeros(shape, dtype=bool)
+    sample = np.full(shape, -1, dtype=np.int64)
+    stale = np.full(shape, -1, dtype=np.int64)
+    team_code = np.full(shape, -1, dtype=np.int64)
+    gap_reason = np.full(shape, "no_life_at_or_before_t", dtype=object)
+
+    lives: list[list] = []
+    samples: list[dict] = []
+    sample_time: list[np.ndarray] = []
+    sample_xyz: list[np.ndarray] = []
+    sample_placeable: list[np.ndarray] = []
+    sample_v: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    teams: dict[Any, int] = {}
+
+    for p, guid in enumerate(guids):
+        track_list = list(tracks_by_guid[guid])
+        lives.append(track_list)
+        if not track_list or not len(grid):
+            continue
+        spawn = np.array([float(t[_SPAWN] or 0) for t in track_list])
+        death = np.array([math.inf if t[_DEATH] is None else float(t[_DEATH])
+                          for t in track_list])
+        ids = np.array([float(t[_ID] or 0) for t in track_list])
+
+        # Live candidates, then the (spawn, id) maximum among them.
+        order = _first_max_order(spawn, ids)
+        live = (spawn[order] <= t_col) & (t_col < death[order])
+        n_live = live.sum(axis=1)
+        last_live = order[live.shape[1] - 1 - np.argmax(live[:, ::-1], axis=1)]
+
+        # No live candidate: the most recently ended life. Sorted by death, the
+        # lives ended by `t` are a prefix, so the pick is the prefix's last row.
+        ended = np.flatnonzero(np.isfinite(death))
+        by_death = ended[_first_max_order(death[ended], ids[ended])]
+        n_ended = np.searchsorted(death[by_death], grid, side="right")
+        last_ended = (by_death[np.maximum(n_ended - 1, 0)] if len(by_death)
+                      else np.zeros_like(n_ended))
+
+        chosen = np.where(n_live > 0, last_live, np.where(n_ended > 0, last_ended, -1))
+        life[:, p] = chosen
+        alive[:, p] = n_live > 0
+        conflict[:, p] = n_live > 1
+
+        for li in np.unique(chosen[chosen >= 0]).tolist():
+            track = track_list[li]
+            path = _ensure_path_list(track[_PATH])
+            offset = len(samples)
+            samples.extend(path)
+            times = np.array([float(s.get("time", 0) or 0) for s in path])
+            coords = [[_coordinate(s.get(axis)) for axis in ("x", "y", "z")] for s in path]
+            xyz = np.array([[c[0] for c in row] for row in coords]).reshape(-1, 3)
+            coord_ok = np.array([all(c[1] for c in row) for row in coords], dtype=bool)
+            speed = np.array([
+                math.nan if (v := _safe_float(s.get("speed"))) is None else v for s in path
+            ])
+            sample_time.append(times)
+            sample_xyz.append(xyz)
+            sample_placeable.append(np.array(
+                [all(s.get(axis) is not None for axis in ("x", "y", "z")) for s in path],
+                dtype=bool,
+            ))
+            sample_v.append(_life_velocity(path, times, xyz, coord_ok, speed,
+                                           velocity_max_dt_ms))
+            rows = np.flatnonzero(chosen == li)
+            team_code[rows, p] = teams.setdefault(track[_TEAM], len(teams))
+            # A dead player is looked up at their death time, staleness still
+            # against t; see build_snapshot.
+            death_ms = int(track[_DEATH] or 0)
+            lookup = (np.where(alive[rows, p], grid[rows], death_ms) if death_ms
+                      else grid[rows])
+            floor = _floor_indices(path, times, lookup)
+            found = floor >= 0
+            sample[rows[found], p] = offset + floor[found]
+            stale[rows[found], p] = np.trunc(
+                grid[rows[found]] - times[floor[found]]
+            ).astype(np.int64)
+            gap_reason[rows, p] = np.where(found, None, "no_sample_at_or_before_t")
+
+    def flat(parts: list[np.ndarray], empty: np.ndarray) -> np.ndarray:
+        return np.concatenate(parts) if parts else empty
+
+    all_xyz = flat(sample_xyz, np.empty((0, 3)))
+    all_placeable = flat(sample_placeable, np.empty(0, dtype=bool))
+    all_v = flat([v[0] for v in sample_v], np.empty((0, 3)))
+    all_dt = flat([v[1] for v in sample_v], np.empty(0, dtype=np.int64))
+    all_reason = flat([v[2] for v in sample_v], np.empty(0, dtype=object))
+
+    has = sample >= 0
+    at = np.where(has, sample, 0)
+
+    def gather(values: np.ndarray, fill, mask: np.ndarray = has) -> np.ndarray:
+        if not len(values):
+            return np.full(shape, fill, dtype=values.dtype)
+        return np.where(mask, values[at], fill)
+
+    living = has & alive
+    return RoundCube(
+        t_grid=grid,
+        guids=guids,
+        life=life,
+        alive=alive,
+        overlap_conflict=conflict,
+        sample=sample,
+        stale_ms=stale,
+        x=gather(all_xyz[:, 0], np.nan),
+        y=gather(all_xyz[:, 1], np.nan),
+        z=gather(all_xyz[:, 2], np.nan),
+        placeable=gather(all_placeable, False),
+        team_code=team_code,
+        vx=gather(all_v[:, 0], np.nan, living),
+        vy=gather(all_v[:, 1], np.nan, living),
+        vz=gather(all_v[:, 2], np.nan, living),
+        velocity_dt_ms=gather(all_dt, -1, living),
+        velocity_reason=np.where(
+            has & ~alive, "not_alive", gather(all_reason, None, living)
+        ).astype(object),
+        gap_reason=gap_reason,
+        lives=lives,
+        samples=samples,
+    )
@@ -64,8 +64,6 @@ from proximity.parser.capability_manifest import is_declared
 from website.backend.logging_config import get_app_logger
 from website.backend.services.clock_inputs import (
     clock_validation_payload,
-    fetch_clock_lives_and_revives,
-    fetch_timing_observations,
     wave_position,
 )
 from website.backend.services.reconstruction_accuracy import (
@@ -77,7 +75,7 @@ from website.backend.services.reconstruction_accuracy import (
 from website.backend.services.reconstruction_accuracy import (
     to_dict as accuracy_to_dict,
 )
-from website.backend.services.reinforcement_clock import validate_round_clocks
+from website.backend.services.reinforcement_clock_batch import round_clock_validations
 from website.backend.services.replay_service import (
     _TRACK_ROUND_JOIN,
     _ensure_path_list,
@@ -347,6 +345,10 @@ def build_snapshot(
     §1: "It never fills a missing active player with silence." Dropping someone
     silently IS that silence, and the tolerance path makes it the caller's own
     parameter that erases them.
+
+    This is the reference for one moment. A caller asking many moments of the
+    same round should build `round_web_cube.build_round_cube` once and slice
+    it; the cube is tested equal to this function, tick by tick.
     """
     players: dict[str, PlayerState] = {}
     gaps: dict[str, str] = {}
@@ -687,10 +689,12 @@ async def load_round_clock(db, round_id: int, t_ms: int) -> dict:
     "we could not verify one", and §5.2 draws precisely that line. `phase_ms`
     and `time_to_next_wave_ms` appear only for a **validated** clock, because
     they are computed from the offset the protocol refuses to publish otherwise.
+
+    The verdicts are the round's stored clock (migration 083) when one of the
+    current protocol exists, and are computed and stored otherwise.
     """
-    observations = await fetch_timing_observations(db, round_id)
-    lives, revives, _track_end = await fetch_clock_lives_and_revives(db, round_id)
-    if not observations:
+    validations = await round_clock_validations(db, round_id)
+    if not validations:
         # No eligible spawn-timing rows: either the round fails the strict gate
         # (bot round, invalid, not a played half) or nobody died. Both are
         # "unavailable", never a silently absent clock.
@@ -700,7 +704,6 @@ async def load_round_clock(db, round_id: int, t_ms: int) -> dict:
             for team in ("AXIS", "ALLIES")
         }
 
-    validations = validate_round_clocks(observations, lives, revives)
     clock: dict[str, dict] = {}
     for team in ("AXIS", "ALLIES"):
         validation = validations.get(team)
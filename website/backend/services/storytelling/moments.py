@@ -5,9 +5,10 @@ Imports all module-level names (constants, helpers) from .base.
 """
 from __future__ import annotations
 
-import time
 from typing import TYPE_CHECKING
 
+from website.backend.services.artifact_store import get_or_compute
+
 from .base import (
     CARRIER_RETURN_WINDOW_MS,
     KILL_STREAK_WINDOW_MS,
@@ -15,7 +16,6 @@ from .base import (
     MULTIKILL_SHORT_WINDOW_MS,
     OBJECTIVE_EVENT_WINDOW_MS,
     TRADE_KILL_DELTA_MS,
-    _compute_locks,
     _format_time_ms,
     _safe_short,
     asyncio,
@@ -29,21 +29,21 @@ from .base import (
 if TYPE_CHECKING:
     from website.backend.services.session_scope import GamingSessionScope
 
-# Module-level cache for `detect_moments` results. The 11 detectors fire
+# `detect_moments` results are artifact-store entries. The 11 detectors fire
 # 11 parallel DB queries + objective-event loader on every request; story
 # page typically triggers both `/moments` (limit=N from user) and
 # `/narrative` (internal call with limit=1) on the same session, so
 # without caching we recompute identically twice.
 #
-# Keyed by (gaming_session_id, limit) — moments are a pure function of the
+# Scoped by (gaming_session_id, limit) — moments are a pure function of the
 # data in the DB for that gaming session (deep SS-C: a midnight-crossing
 # session is one gsid, not two dates), and the limit determines
 # type-diversity truncation so we cache per-limit to preserve exact behavior.
-#
-# Timestamp column uses `time.monotonic()` — wall-clock jumps (NTP, DST,
-# manual adjustment) would otherwise corrupt TTL math.
-_MOMENTS_CACHE: dict[tuple[int, int], tuple[list, float]] = {}
-_MOMENTS_CACHE_MAX = 32  # 16 sessions × 2 typical limits
+# The fingerprint is the scope's accepted round keys, so a newly accepted
+# round recomputes at once; the TTL still bounds proximity data that lands
+# for rounds already accepted.
+MOMENTS_ARTIFACT_KIND = "session_moments"
+MOMENTS_FORMULA_VERSION = 1  # bump when a detector or the director cut changes
 _MOMENTS_TTL_TODAY = 300    # 5 min — new rounds may still arrive
 _MOMENTS_TTL_HISTORICAL = 3600  # 1 h — stable, bounded for retro-corrections
 
@@ -140,53 +140,30 @@ def _select_director_cut(moments: list, limit: int) -> list:
     return result[:limit]
 
 
-def _moments_cache_evict_oldest_computed() -> None:
-    """Evict the entry with the oldest computed-at timestamp when full.
-
-    This is FIFO-by-compute-time, not true LRU — we don't track
-    last-access. For this cache the distinction barely matters: entries
-    expire by TTL (5 min / 1 h) long before eviction pressure reaches
-    32 entries in typical use.
-    """
-    if len(_MOMENTS_CACHE) <= _MOMENTS_CACHE_MAX:
-        return
-    oldest = min(_MOMENTS_CACHE, key=lambda k: _MOMENTS_CACHE[k][1])
-    _MOMENTS_CACHE.pop(oldest, None)
-
-
 class _MomentsMixin:
     """Moments methods for StorytellingService."""
 
     async def detect_moments(self, scope: GamingSessionScope, limit: int = 10) -> list:
         """Detect highlight-reel moments for a session across 11 detectors.
 
-        Results are memoized at module level per (gaming_session_id, limit) —
-        TTL 5 min for today, 1 h for historical. First caller computes,
-        subsequent callers hit the cache. Scoped by the full gaming session
+        Results go through the artifact store per (gaming_session_id, limit),
+        fingerprinted on the accepted round keys — TTL 5 min for today, 1 h
+        for historical. First caller computes, concurrent and later callers
+        share it, across web restarts too. Scoped by the full gaming session
         (deep SS-C): a midnight-crossing session detects moments across ALL
         its rounds, not just one date's fragment.
         """
-        now = time.monotonic()
         # TTL "recency" keys off the session's LATEST date — a session that
         # ran past midnight is still "today" the morning after.
-        ttl = _moments_cache_ttl(date.fromisoformat(scope.dates[-1]))
-        key = (scope.gaming_session_id, limit)
-        cached = _MOMENTS_CACHE.get(key)
-        if cached and (now - cached[1]) < ttl:
-            return cached[0]
-
-        # Double-check under lock to prevent concurrent recompute when
-        # several coroutines all miss the cache before any of them writes.
-        lock = _compute_locks.get(f"moments:{scope.gaming_session_id}:{limit}")
-        async with lock:
-            cached = _MOMENTS_CACHE.get(key)
-            if cached and (time.monotonic() - cached[1]) < ttl:
-                return cached[0]
-
-            result = await self._detect_moments_uncached(scope, limit)
-            _MOMENTS_CACHE[key] = (result, time.monotonic())
-            _moments_cache_evict_oldest_computed()
-            return result
+        return await get_or_compute(
+            MOMENTS_ARTIFACT_KIND,
+            [scope.gaming_session_id, limit],
+            [list(key) for key in scope.round_keys],
+            lambda: self._detect_moments_uncached(scope, limit),
+            db=self.db,
+            formula_version=MOMENTS_FORMULA_VERSION,
+            ttl=_moments_cache_ttl(date.fromisoformat(scope.dates[-1])),
+        )
 
     async def _collect_moments(self, scope: GamingSessionScope) -> list:
         """Run all 11 detectors and return the raw, UNCUT union of moments for a
@@ -322,32 +299,22 @@ class _MomentsMixin:
         dates = [date.fromisoformat(d) for d in scope.dates]
         starts, maps, rnums = scope.round_key_arrays()
 
-        # Carrier pickups/drops/secures
-        rows = await self.db.fetch_all(
-            f"SELECT round_start_unix, round_number, pickup_time FROM proximity_carrier_event "
-            f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}",
-            (dates, starts, maps, rnums))
-        for r in (rows or []):
-            if r[2] and r[2] > 0:
-                result.setdefault((r[0], r[1]), []).append(r[2])
-
-        # Objective runs (plants, constructions, defuses)
-        rows = await self.db.fetch_all(
-            f"SELECT round_start_unix, round_number, action_time FROM proximity_objective_run "
-            f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}",
-            (dates, starts, maps, rnums))
-        for r in (rows or []):
-            if r[2] and r[2] > 0:
-                result.setdefault((r[0], r[1]), []).append(r[2])
-
-        # Construction events
-        rows = await self.db.fetch_all(
-            f"SELECT round_start_unix, round_number, event_time FROM proximity_construction_event "
-            f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}",
-            (dates, starts, maps, rnums))
-        for r in (rows or []):
-            if r[2] and r[2] > 0:
-                result.setdefault((r[0], r[1]), []).append(r[2])
+        # Carrier pickups/drops/secures, objective runs (plants, constructions,
+        # defuses) and construction events: three independent reads, one
+        # acquire and one snapshot.
+        params = (dates, starts, maps, rnums)
+        batches = await self.db.fetch_many([
+            (f"SELECT round_start_unix, round_number, pickup_time FROM proximity_carrier_event "
+             f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}", params),
+            (f"SELECT round_start_unix, round_number, action_time FROM proximity_objective_run "
+             f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}", params),
+            (f"SELECT round_start_unix, round_number, event_time FROM proximity_construction_event "
+             f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}", params),
+        ])
+        for rows in batches:
+            for r in (rows or []):
+                if r[2] and r[2] > 0:
+                    result.setdefault((r[0], r[1]), []).append(r[2])
 
         return result
 
@@ -640,8 +607,10 @@ class _MomentsMixin:
         dates = [date.fromisoformat(d) for d in scope.dates]
         starts, maps, rnums = scope.round_key_arrays()
 
-        # H1: Carrier killed before extraction (outcome = 'killed')
-        carrier_rows = await self.db.fetch_all(f"""
+        # H1: Carrier killed before extraction (outcome = 'killed'), and
+        # H2: dynamite defused (enemy planted, defender defused) — independent
+        # reads, fetched together.
+        carrier_rows, defuse_rows = await self.db.fetch_many([(f"""
             SELECT ce.carrier_guid, ce.carrier_name, ce.killer_guid, ce.killer_name,
                    ce.carry_distance, ce.duration_ms, ce.map_name, ce.round_number,
                    ce.pickup_time
@@ -651,7 +620,15 @@ class _MomentsMixin:
                 AND ce.killer_guid IS NOT NULL AND ce.killer_guid != ''
             ORDER BY ce.carry_distance DESC
             LIMIT 10
-        """, (dates, starts, maps, rnums))
+        """, (dates, starts, maps, rnums)), (f"""
+            SELECT engineer_guid, engineer_name, track_name, map_name,
+                   round_number, action_time, enemies_nearby
+            FROM proximity_objective_run
+            WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}
+                AND action_type = 'dynamite_defuse'
+            ORDER BY action_time
+            LIMIT 10
+        """, (dates, starts, maps, rnums))])
 
         for r in (carrier_rows or []):
             carrier_name = strip_et_colors(r[1] or _safe_short(r[0]))
@@ -675,17 +652,6 @@ class _MomentsMixin:
                 },
             })
 
-        # H2: Dynamite defused (enemy planted, defender defused)
-        defuse_rows = await self.db.fetch_all(f"""
-            SELECT engineer_guid, engineer_name, track_name, map_name,
-                   round_number, action_time, enemies_nearby
-            FROM proximity_objective_run
-            WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)}
-                AND action_type = 'dynamite_defuse'
-            ORDER BY action_time
-            LIMIT 10
-        """, (dates, starts, maps, rnums))
-
         for r in (defuse_rows or []):
             name = strip_et_colors(r[1] or _safe_short(r[0]))
             track = r[2] or 'the dynamite'
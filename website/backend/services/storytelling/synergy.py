@@ -337,27 +337,34 @@ class _SynergyMixin:
         return {g: min(100, executed[g] / max(totals[g], 1) * 100)
                 for g in ('group_a', 'group_b')}
 
+    @staticmethod
+    def _deaths_by_guid_sql(scope: GamingSessionScope) -> str:
+        """Per-player deaths over the scope's accepted rounds ($1..$3 = round keys)."""
+        return (
+            f"SELECT pcs.player_guid, SUM(pcs.deaths) FROM player_comprehensive_stats pcs "
+            f"JOIN rounds r ON r.id = pcs.round_id "
+            f"WHERE {scope.round_key_filter_sql(1, alias='r')} "
+            f"AND pcs.round_number IN (1, 2) AND pcs.team IN (1, 2) "
+            f"GROUP BY pcs.player_guid"
+        )
+
     async def _synergy_trade(self, scope: GamingSessionScope, guid_to_group: dict) -> dict:
         """Trade coverage per player group: % of team deaths avenged (0-100)."""
         dates = [date.fromisoformat(d) for d in scope.dates]
         starts, maps, rnums = scope.round_key_arrays()
-        trades = await self.db.fetch_all(
-            f"SELECT original_victim_guid, COUNT(*) "
-            f"FROM proximity_lua_trade_kill "
-            f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)} "
-            f"GROUP BY original_victim_guid", (dates, starts, maps, rnums))
-
         # Deaths denominator MUST use the same accepted-round set as the trade
-        # numerator above — gate on scope.round_keys, not bare gsid (which would
+        # numerator — gate on scope.round_keys, not bare gsid (which would
         # count deaths from is_valid=false / non-completed rounds the proximity
         # axis excludes, understating the trade %). Same fix as
-        # _build_player_groups (Codex PR #539).
-        deaths_rows = await self.db.fetch_all(
-            f"SELECT pcs.player_guid, SUM(pcs.deaths) FROM player_comprehensive_stats pcs "
-            f"JOIN rounds r ON r.id = pcs.round_id "
-            f"WHERE {scope.round_key_filter_sql(1, alias='r')} "
-            f"AND pcs.round_number IN (1, 2) AND pcs.team IN (1, 2) "
-            f"GROUP BY pcs.player_guid", (starts, maps, rnums))
+        # _build_player_groups (Codex PR #539). Both sides come from one
+        # snapshot, so an import landing mid-request cannot skew the ratio.
+        trades, deaths_rows = await self.db.fetch_many([
+            (f"SELECT original_victim_guid, COUNT(*) "
+             f"FROM proximity_lua_trade_kill "
+             f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)} "
+             f"GROUP BY original_victim_guid", (dates, starts, maps, rnums)),
+            (self._deaths_by_guid_sql(scope), (starts, maps, rnums)),
+        ])
 
         tt: dict[str, int] = {'group_a': 0, 'group_b': 0}
         for r in (trades or []):
@@ -437,23 +444,18 @@ class _SynergyMixin:
         """Medic bond per player group: revive rate scaled to 0-100."""
         dates = [date.fromisoformat(d) for d in scope.dates]
         starts, maps, rnums = scope.round_key_arrays()
-        revives = await self.db.fetch_all(
-            f"SELECT victim_guid, COUNT(*) "
-            f"FROM proximity_kill_outcome "
-            f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)} "
-            f"AND outcome = 'revived' "
-            f"GROUP BY victim_guid", (dates, starts, maps, rnums))
-
         # Deaths denominator gated on the accepted round keys (same as the
         # revive numerator) — not bare gsid — so invalid/non-completed rounds
         # don't inflate the denominator and understate the medic %
         # (Codex PR #539).
-        deaths_rows = await self.db.fetch_all(
-            f"SELECT pcs.player_guid, SUM(pcs.deaths) FROM player_comprehensive_stats pcs "
-            f"JOIN rounds r ON r.id = pcs.round_id "
-            f"WHERE {scope.round_key_filter_sql(1, alias='r')} "
-            f"AND pcs.round_number IN (1, 2) AND pcs.team IN (1, 2) "
-            f"GROUP BY pcs.player_guid", (starts, maps, rnums))
+        revives, deaths_rows = await self.db.fetch_many([
+            (f"SELECT victim_guid, COUNT(*) "
+             f"FROM proximity_kill_outcome "
+             f"WHERE session_date = ANY($1) AND {scope.round_key_filter_sql(2)} "
+             f"AND outcome = 'revived' "
+             f"GROUP BY victim_guid", (dates, starts, maps, rnums)),
+            (self._deaths_by_guid_sql(scope), (starts, maps, rnums)),
+        ])
 
         tr: dict[str, int] = {'group_a': 0, 'group_b': 0}
         for r in (revives or []):
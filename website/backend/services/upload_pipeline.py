@@ -0,0 +1,216 @@
+"""Off-loop write-and-hash pipeline for streamed uploads.
+
+The single uvicorn worker that accepts a 500 MB demo or clip also serves the
+API, so the bytes must never be written or hashed on the event loop. The
+request handler only reads chunks from the client and hands them to a
+dedicated writer thread through a bounded queue; the thread writes and feeds
+SHA-256 (hashlib releases the GIL for large buffers). A full queue means the
+disk is slower than the client — the handler then waits off-loop instead of
+buffering the upload in memory.
+
+Used by both ``UploadStorageService.save_upload`` and
+``GreatshotStorageService.save_upload``. Resumable sessions keep their
+running digest in ``ResumableDigests`` so finalize needs no second read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from website.backend.logging_config import get_app_logger
+from website.backend.metrics import UPLOAD_BYTES, UPLOAD_QUEUE_WAIT, UPLOAD_THROUGHPUT
+
+logger = get_app_logger("upload.pipeline")
+
+# 8 x 1 MB chunks in flight is enough to keep the disk busy while the client
+# sends the next one, and bounds per-upload memory at ~8 MB.
+DEFAULT_MAX_QUEUED_CHUNKS = 8
+
+_END = object()
+
+
+@dataclass(frozen=True)
+class UploadThroughput:
+    """Per-upload pipeline measurements, logged and exported as metrics."""
+    bytes_written: int
+    elapsed_seconds: float
+    queue_wait_seconds: float  # time the handler spent waiting on a full queue
+    max_queue_depth: int
+
+    @property
+    def mib_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_written / (1024 * 1024) / self.elapsed_seconds
+
+
+class HashingFileWriter:
+    """Write and SHA-256 one upload on a dedicated thread.
+
+    Usage::
+
+        writer = HashingFileWriter(path, store="uploads")
+        writer.start()
+        try:
+            await writer.write(chunk)  # repeatedly
+        except BaseException:
+            await writer.abort()
+            raise
+        throughput = await writer.close()
+        writer.hexdigest()
+
+    ``close`` re-raises any error the writer thread hit, so a full disk fails
+    the upload exactly like an inline ``handle.write`` did.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        store: str,
+        max_queued_chunks: int = DEFAULT_MAX_QUEUED_CHUNKS,
+    ):
+        self.path = path
+        self.store = store
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queued_chunks))
+        self._digest = hashlib.sha256()
+        self._thread = threading.Thread(
+            target=self._run, name=f"upload-writer-{store}", daemon=True
+        )
+        self._error: BaseException | None = None
+        self._started_at = 0.0
+        self._queue_wait = 0.0
+        self._max_depth = 0
+        self._bytes = 0
+        self._closed = False
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            with self.path.open("wb") as handle:
+                while True:
+                    chunk = self._queue.get()
+                    if chunk is _END:
+                        return
+                    self._digest.update(chunk)
+                    handle.write(chunk)
+        except BaseException as exc:  # noqa: BLE001 — surfaced by close()
+            self._error = exc
+            # Keep draining so a producer blocked on a full queue is released.
+            while self._queue.get() is not _END:
+                pass
+
+    async def _put(self, item: object) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            waited_from = time.perf_counter()
+            await asyncio.to_thread(self._queue.put, item)
+            self._queue_wait += time.perf_counter() - waited_from
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    async def write(self, chunk: bytes) -> None:
+        if self._error is not None:
+            raise self._error
+        self._bytes += len(chunk)
+        await self._put(chunk)
+
+    async def _finish(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        await self._put(_END)
+        await asyncio.to_thread(self._thread.join)
+
+    async def abort(self) -> None:
+        """Stop the writer thread and wait for it; the caller removes the file."""
+        await self._finish()
+
+    async def close(self) -> UploadThroughput:
+        await self._finish()
+        if self._error is not None:
+            raise self._error
+        throughput = UploadThroughput(
+            bytes_written=self._bytes,
+            elapsed_seconds=time.perf_counter() - self._started_at,
+            queue_wait_seconds=self._queue_wait,
+            max_queue_depth=self._max_depth,
+        )
+        record_throughput(self.store, throughput)
+        return throughput
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def record_throughput(store: str, throughput: UploadThroughput) -> None:
+    UPLOAD_BYTES.labels(store=store).inc(throughput.bytes_written)
+    UPLOAD_QUEUE_WAIT.labels(store=store).observe(throughput.queue_wait_seconds)
+    if throughput.elapsed_seconds > 0:
+        UPLOAD_THROUGHPUT.labels(store=store).observe(
+            throughput.bytes_written / throughput.elapsed_seconds
+        )
+    logger.info(
+        "upload pipeline %s: %d bytes in %.3fs (%.1f MiB/s, queue wait %.3fs, max depth %d)",
+        store,
+        throughput.bytes_written,
+        throughput.elapsed_seconds,
+        throughput.mib_per_second,
+        throughput.queue_wait_seconds,
+        throughput.max_queue_depth,
+    )
+
+
+class ResumableDigests:
+    """Running SHA-256 per resumable session, advanced as each chunk lands.
+
+    CPython cannot serialise a hashlib object, so the live digest stays in this
+    process and the session sidecar records ``hashed_offset`` — how far it got.
+    Finalize uses the running digest when it covers the whole file and falls
+    back to one full read only when the web process restarted mid-upload.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._digests: dict[str, tuple[int, hashlib._Hash]] = {}
+
+    def advance(self, session_id: str, offset: int, data: bytes) -> int | None:
+        """Feed ``data`` written at ``offset``; return the new hashed offset.
+
+        Returns None when the digest lost continuity (unknown session past
+        offset 0), after which the session is hashed at finalize instead.
+        """
+        with self._lock:
+            entry = self._digests.get(session_id)
+            if entry is None:
+                if offset != 0:
+                    return None
+                entry = (0, hashlib.sha256())
+            hashed, digest = entry
+            if hashed != offset:
+                self._digests.pop(session_id, None)
+                return None
+            digest.update(data)
+            self._digests[session_id] = (hashed + len(data), digest)
+            return hashed + len(data)
+
+    def take(self, session_id: str, size: int) -> str | None:
+        """Hex digest if the running hash covers exactly ``size`` bytes."""
+        with self._lock:
+            entry = self._digests.pop(session_id, None)
+        if entry is None or entry[0] != size:
+            return None
+        return entry[1].hexdigest()
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._digests.pop(session_id, None)
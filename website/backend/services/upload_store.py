@@ -20,6 +20,12 @@ from pathlib import Path
 from fastapi import HTTPException, UploadFile
 
 from website.backend.logging_config import get_app_logger
+from website.backend.services.upload_pipeline import (
+    HashingFileWriter,
+    ResumableDigests,
+    UploadThroughput,
+    record_throughput,
+)
 from website.backend.services.upload_validators import (
     get_size_limit,
     sanitize_filename,
@@ -72,6 +78,7 @@ class SavedUpload:
     file_size_bytes: int
     content_hash_sha256: str
     category: str
+    throughput: UploadThroughput | None = None
 
 
 class UploadStorageService:
@@ -94,6 +101,7 @@ class UploadStorageService:
             storage_root = storage_root.resolve()
 
         self.root = storage_root
+        self._resumable_digests = ResumableDigests()
         logger.info(f"Upload storage root: {self.root}")
 
     def ensure_storage_tree(self) -> None:
@@ -223,50 +231,60 @@ class UploadStorageService:
         stored_path = upload_dir / f"original{extension}"
         relative_path = f"{category}/{upload_id}/original{extension}"
 
-        digest = hashlib.sha256()
         total_bytes = 0
         header_bytes = b""
 
-        # Stream file to disk
+        # Stream file to disk. Writing and hashing happen on the pipeline's
+        # writer thread; this coroutine only reads from the client, enforces
+        # the size limit and keeps the header for the magic-byte check.
+        writer = HashingFileWriter(stored_path, store="uploads")
+        writer.start()
         try:
-            with stored_path.open("wb") as handle:
-                while True:
-                    chunk = await upload.read(UPLOAD_CHUNK_SIZE)
-                    if not chunk:
-                        break
-
-                    total_bytes += len(chunk)
-
-                    # Enforce size limit during streaming
-                    if total_bytes > size_limit:
-                        handle.close()
-                        self._cleanup_failed_upload(stored_path)
-                        raise HTTPException(
-                            status_code=413,
-                            detail=(
-                                f"Upload too large ({total_bytes} bytes). "
-                                f"Max allowed is {size_limit} bytes "
-                                f"({size_limit / (1024 * 1024):.1f} MB) for category '{category}'."
-                            ),
-                        )
-
-                    # Collect header bytes for magic byte validation (first 512 bytes)
-                    if len(header_bytes) < 512:
-                        need = 512 - len(header_bytes)
-                        header_bytes += chunk[:need]
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
 
-                    digest.update(chunk)
-                    handle.write(chunk)
+                total_bytes += len(chunk)
+
+                # Enforce size limit during streaming
+                if total_bytes > size_limit:
+                    await writer.abort()
+                    self._cleanup_failed_upload(stored_path)
+                    raise HTTPException(
+                        status_code=413,
+                        detail=(
+                            f"Upload too large ({total_bytes} bytes). "
+                            f"Max allowed is {size_limit} bytes "
+                            f"({size_limit / (1024 * 1024):.1f} MB) for category '{category}'."
+                        ),
+                    )
+
+                # Collect header bytes for magic byte validation (first 512 bytes)
+                if len(header_bytes) < 512:
+                    need = 512 - len(header_bytes)
+                    header_bytes += chunk[:need]
+
+                await writer.write(chunk)
+
+            throughput = await writer.close()
 
         except HTTPException:
             raise
         except Exception as e:
+            await writer.abort()
             self._cleanup_failed_upload(stored_path)
             logger.error(f"Failed to write upload: {e}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to save upload: {e}"
             ) from e
+        except BaseException:
+            # Client disconnect (CancelledError): release the writer thread
+            # and the partial file, then let the cancellation propagate.
+            await writer.abort()
+            self._cleanup_failed_upload(stored_path)
+            raise
 
         # Validate non-empty file
         if total_bytes == 0:
@@ -291,7 +309,7 @@ class UploadStorageService:
             ) from e
 
         # Success! Return metadata
-        content_hash = digest.hexdigest()
+        content_hash = writer.hexdigest()
         logger.info(
             f"Upload saved: {upload_id} ({category}) - "
             f"{original_filename} ({total_bytes} bytes, SHA256: {content_hash[:16]}...)"
@@ -305,6 +323,7 @@ class UploadStorageService:
             file_size_bytes=total_bytes,
             content_hash_sha256=content_hash,
             category=category,
+            throughput=throughput,
         )
 
     async def save_poster(self, upload_id: str, category: str, poster: UploadFile) -> str | None:
@@ -397,6 +416,7 @@ class UploadStorageService:
             "extension": extension,
             "size": int(size),
             "offset": 0,
+            "hashed_offset": 0,
             "uploader_discord_id": int(uploader_discord_id),
             "title": title,
             "description": description,
@@ -421,7 +441,9 @@ class UploadStorageService:
 
         The client's offset must equal the server's current offset (409 with the
         authoritative offset otherwise, so a client that lost track can resync),
-        and the running total can never exceed the declared size.
+        and the running total can never exceed the declared size. The chunk
+        also advances the session's running SHA-256 while it is still in hand,
+        so finalize does not have to read the assembled file back.
         """
         part, meta = self._session_paths(session_id)
         session = self.get_resumable_session(session_id)
@@ -448,9 +470,11 @@ class UploadStorageService:
                 handle.write(data)
                 handle.flush()
                 new_offset = current + len(data)
+                hashed_offset = self._resumable_digests.advance(session_id, current, data)
             finally:
                 fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
         session["offset"] = new_offset
+        session["hashed_offset"] = hashed_offset
         self._write_session(meta, session)
         return new_offset
 
@@ -458,7 +482,9 @@ class UploadStorageService:
         """Validate a completed session and move it into the library.
 
         Verifies the byte count matches the declaration, re-checks magic bytes on
-        the assembled file (never trust per-chunk), hashes it, and atomically
+        the assembled file (never trust per-chunk), takes the running hash built
+        by append_chunk (re-reading the file only if this process lost it to a
+        restart mid-upload), and atomically
         moves the .part into {category}/{upload_id}/. Returns (SavedUpload,
         session-metadata) so the router can INSERT the row exactly as the
         single-shot path does. The session sidecar is removed on success.
@@ -483,10 +509,16 @@ class UploadStorageService:
             self.abort_resumable(session_id)
             raise HTTPException(status_code=400, detail=str(e)) from e
 
-        digest = hashlib.sha256()
-        with part.open("rb") as handle:
-            for chunk in iter(lambda: handle.read(UPLOAD_CHUNK_SIZE), b""):
-                digest.update(chunk)
+        content_hash = None
+        if session.get("hashed_offset") == size:
+            content_hash = self._resumable_digests.take(session_id, size)
+        if content_hash is None:
+            logger.info("resumable %s: running digest unavailable, hashing assembled file", session_id)
+            digest = hashlib.sha256()
+            with part.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(UPLOAD_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            content_hash = digest.hexdigest()
 
         upload_id = uuid.uuid4().hex
         upload_dir = self.root / category / upload_id
@@ -501,13 +533,16 @@ class UploadStorageService:
             extension=extension,
             stored_path=f"{category}/{upload_id}/original{extension}",
             file_size_bytes=size,
-            content_hash_sha256=digest.hexdigest(),
+            content_hash_sha256=content_hash,
             category=category,
+            throughput=_session_throughput(session, size),
         )
+        record_throughput("resumable", saved.throughput)
         return saved, session
 
     def abort_resumable(self, session_id: str) -> None:
         part, meta = self._session_paths(session_id)
+        self._resumable_digests.discard(session_id)
         part.unlink(missing_ok=True)
         meta.unlink(missing_ok=True)
 
@@ -522,6 +557,7 @@ class UploadStorageService:
         for part in inc.glob("*.part"):
             try:
                 if part.stat().st_mtime < cutoff:
+                    self._resumable_digests.discard(part.stem)
                     part.unlink(missing_ok=True)
                     part.with_suffix(".json").unlink(missing_ok=True)
                     removed += 1
@@ -646,6 +682,21 @@ class UploadStorageService:
             return False
 
 
+def _session_throughput(session: dict, size: int) -> UploadThroughput:
+    """Wall-clock throughput of a resumable session, from open to finalize."""
+    try:
+        opened = datetime.fromisoformat(session["created_at"])
+        elapsed = max(0.0, (datetime.now(timezone.utc) - opened).total_seconds())
+    except (KeyError, TypeError, ValueError):
+        elapsed = 0.0
+    return UploadThroughput(
+        bytes_written=size,
+        elapsed_seconds=elapsed,
+        queue_wait_seconds=0.0,
+        max_queue_depth=0,
+    )
+
+
 # Module-level singleton
 _storage: UploadStorageService | None = None
 